@@ -0,0 +1,46 @@
+"""Add background_jobs for the in-process admin job runner
+
+Revision ID: add_background_jobs
+Revises: normalize_status_indexes
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_background_jobs'
+down_revision = 'normalize_status_indexes'
+branch_labels = None
+depends_on = None
+
+ACTIVE = sa.text("status IN ('queued', 'running')")
+
+def upgrade():
+    op.create_table(
+        'background_jobs',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('job_type', sa.String(length=100), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False, server_default='queued'),
+        sa.Column('params', sa.Text(), nullable=True),
+        sa.Column('progress_done', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('progress_total', sa.Integer(), nullable=True),
+        sa.Column('progress_message', sa.String(length=255), nullable=True),
+        sa.Column('result', sa.Text(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('cancel_requested', sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column('worker', sa.String(length=100), nullable=True),
+        sa.Column('created_by', sa.Integer(), sa.ForeignKey('users.id'), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.Column('heartbeat_at', sa.DateTime(), nullable=True),
+    )
+    op.create_index('ix_background_jobs_id', 'background_jobs', ['id'])
+    op.create_index('ix_background_jobs_job_type', 'background_jobs', ['job_type'])
+    op.create_index('ix_background_jobs_status', 'background_jobs', ['status'])
+    op.create_index('uq_background_jobs_active_type', 'background_jobs', ['job_type'], unique=True,
+                    postgresql_where=ACTIVE, sqlite_where=ACTIVE)
+
+def downgrade():
+    op.drop_table('background_jobs')
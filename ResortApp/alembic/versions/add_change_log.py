@@ -0,0 +1,30 @@
+"""Add change_log for delta sync (GET /sync?since=)
+
+Revision ID: add_change_log
+Revises: add_background_jobs
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_change_log'
+down_revision = 'add_background_jobs'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table(
+        'change_log',
+        sa.Column('id', sa.BigInteger().with_variant(sa.Integer(), 'sqlite'), primary_key=True),
+        sa.Column('entity', sa.String(length=50), nullable=False),
+        sa.Column('entity_id', sa.Integer(), nullable=True),
+        sa.Column('op', sa.String(length=10), nullable=False),
+        sa.Column('changed_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sqlite_autoincrement=True,
+    )
+    op.create_index('ix_change_log_changed_at', 'change_log', ['changed_at'])
+
+def downgrade():
+    op.drop_table('change_log')
@@ -0,0 +1,21 @@
+"""Add change_log.txid_horizon so sync pages skip id gaps only once their transactions ended
+
+Revision ID: add_change_log_txid_horizon
+Revises: add_user_token_version
+Create Date: 2026-10-19 21:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_change_log_txid_horizon'
+down_revision = 'add_user_token_version'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.add_column('change_log', sa.Column('txid_horizon', sa.BigInteger(), nullable=True))
+
+def downgrade():
+    op.drop_column('change_log', 'txid_horizon')
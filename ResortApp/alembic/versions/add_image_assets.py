@@ -0,0 +1,38 @@
+"""Add image_assets for resized upload variants
+
+Revision ID: add_image_assets
+Revises: add_change_log
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_image_assets'
+down_revision = 'add_change_log'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table(
+        'image_assets',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('original_url', sa.String(length=500), nullable=False),
+        sa.Column('sha256', sa.String(length=64), nullable=False),
+        sa.Column('bytes', sa.Integer(), nullable=False),
+        sa.Column('content_type', sa.String(length=50), nullable=True),
+        sa.Column('width', sa.Integer(), nullable=True),
+        sa.Column('height', sa.Integer(), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=False, server_default='pending'),
+        sa.Column('variants', sa.Text(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.Column('processed_at', sa.DateTime(), nullable=True),
+    )
+    op.create_index('ix_image_assets_id', 'image_assets', ['id'])
+    op.create_index('ix_image_assets_original_url', 'image_assets', ['original_url'], unique=True)
+    op.create_index('ix_image_assets_sha256', 'image_assets', ['sha256'])
+
+def downgrade():
+    op.drop_table('image_assets')
@@ -0,0 +1,38 @@
+"""Add report_cache_entries for closed-period report caching
+
+Revision ID: add_report_cache
+Revises: a1a1bf16ff4a
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_report_cache'
+down_revision = 'a1a1bf16ff4a'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table(
+        'report_cache_entries',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('cache_key', sa.String(length=64), nullable=False),
+        sa.Column('report', sa.String(length=100), nullable=False),
+        sa.Column('params', sa.Text(), nullable=True),
+        sa.Column('period_start', sa.Date(), nullable=True),
+        sa.Column('period_end', sa.Date(), nullable=True),
+        sa.Column('payload', sa.Text(), nullable=False),
+        sa.Column('is_final', sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column('expires_at', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index('ix_report_cache_entries_id', 'report_cache_entries', ['id'])
+    op.create_index('ix_report_cache_entries_cache_key', 'report_cache_entries', ['cache_key'], unique=True)
+    op.create_index('ix_report_cache_entries_report', 'report_cache_entries', ['report'])
+    op.create_index('ix_report_cache_entries_period_start', 'report_cache_entries', ['period_start'])
+    op.create_index('ix_report_cache_entries_period_end', 'report_cache_entries', ['period_end'])
+
+def downgrade():
+    op.drop_table('report_cache_entries')
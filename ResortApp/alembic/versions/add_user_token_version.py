@@ -0,0 +1,21 @@
+"""Add users.token_version for access token revocation
+
+Revision ID: add_user_token_version
+Revises: add_image_assets
+Create Date: 2026-10-19 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_user_token_version'
+down_revision = 'add_image_assets'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.add_column('users', sa.Column('token_version', sa.Integer(), nullable=False, server_default='0'))
+
+def downgrade():
+    op.drop_column('users', 'token_version')
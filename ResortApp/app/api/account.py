@@ -2,22 +2,32 @@
 API endpoints for Accounting Module
 """
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List, Optional
-from datetime import datetime
+from typing import List, Literal, Optional
+from datetime import date, datetime
 from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 import functools
 
-from app.database import get_db
+from app.database import get_db, SessionLocal
 from app.api.auth import get_current_user
 from app.models.user import User
 from app.curd import account as account_crud
+from app.curd.comprehensive_report import REPORT_SECTIONS, parse_report_range
+from app.utils import report_export
+from app.utils import report_cache
+from app.utils.report_cache import cached_report
+from app.utils.admission import admit_heavy
+from app.utils.jobs import job_accepted, job_handler, job_inline
 from app.schemas.account import (
     AccountGroupCreate, AccountGroupUpdate, AccountGroupOut,
     AccountLedgerCreate, AccountLedgerUpdate, AccountLedgerOut,
     JournalEntryCreate, JournalEntryUpdate, JournalEntryOut,
     TrialBalance, LedgerBalance
 )
+import logging
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/accounts", tags=["Accounts"])
 
@@ -242,17 +252,105 @@ def get_trial_balance(
     try:
         return account_crud.get_trial_balance(db, as_on_date, automatic=automatic)
     except Exception as e:
-        import traceback
-        error_msg = f"Error in get_trial_balance endpoint: {str(e)}\n{traceback.format_exc()}"
-        print(error_msg)
+        error_msg = f"Error in get_trial_balance endpoint: {str(e)}"
+        logger.error("%s", error_msg, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error generating trial balance: {str(e)}")
 
 
+def _fix_missing_journal_entries(db: Session, checkout_id: Optional[int], room_number: Optional[str], days: int,
+                                 user_id: Optional[int] = None, job=None) -> dict:
+    from app.models.checkout import Checkout
+    from app.models.account import JournalEntry
+    from app.utils.accounting_helpers import create_complete_checkout_journal_entry
+    from datetime import datetime, timedelta
+
+    checkouts_to_fix = []
+    
+    if checkout_id:
+        checkout = db.query(Checkout).filter(Checkout.id == checkout_id).first()
+        if checkout:
+            checkouts_to_fix = [checkout]
+    elif room_number:
+        checkout = db.query(Checkout).filter(Checkout.room_number == room_number).order_by(Checkout.created_at.desc()).first()
+        if checkout:
+            checkouts_to_fix = [checkout]
+    else:
+        # Fix all checkouts in last N days
+        cutoff_date = datetime.now() - timedelta(days=days)
+        checkouts = db.query(Checkout).filter(Checkout.created_at >= cutoff_date).all()
+        checkouts_to_fix = checkouts
+    
+    if not checkouts_to_fix:
+        return {"message": "No checkouts found to fix", "fixed": 0}
+    
+    fixed_count = 0
+    failed_count = 0
+    errors = []
+    
+    for index, checkout in enumerate(checkouts_to_fix):
+        if job:
+            job.progress(index, len(checkouts_to_fix), f"Fixed {fixed_count}, failed {failed_count}")
+        # Check if journal entry exists
+        journal_entry = db.query(JournalEntry).filter(
+            JournalEntry.reference_type == "CHECKOUT",
+            JournalEntry.reference_id == checkout.id
+        ).first()
+        
+        if journal_entry:
+            continue  # Already has journal entry
+        
+        # Try to create journal entry
+        try:
+            result = create_complete_checkout_journal_entry(
+                db=db,
+                checkout_id=checkout.id,
+                room_total=float(checkout.room_total or 0),
+                food_total=float(checkout.food_total or 0),
+                service_total=float(checkout.service_total or 0),
+                package_total=float(checkout.package_total or 0),
+                tax_amount=float(checkout.tax_amount or 0),
+                discount_amount=float(checkout.discount_amount or 0),
+                grand_total=float(checkout.grand_total or 0),
+                guest_name=checkout.guest_name or "Guest",
+                room_number=checkout.room_number or "Unknown",
+                gst_rate=18.0,
+                payment_method=checkout.payment_method or "cash",
+                created_by=user_id
+            )
+            
+            if result:
+                db.commit()
+                fixed_count += 1
+            else:
+                failed_count += 1
+                errors.append(f"Checkout {checkout.id}: Ledgers missing")
+        except Exception as e:
+            failed_count += 1
+            errors.append(f"Checkout {checkout.id}: {str(e)}")
+            db.rollback()
+    
+    if job:
+        job.progress(len(checkouts_to_fix), len(checkouts_to_fix), f"Fixed {fixed_count}, failed {failed_count}")
+    return {
+        "message": f"Fixed {fixed_count} journal entries, {failed_count} failed",
+        "fixed": fixed_count,
+        "failed": failed_count,
+        "errors": errors
+    }
+
+
+@job_handler("accounts.fix_missing_journal_entries")
+def fix_missing_journal_entries_job(job, checkout_id: Optional[int] = None, room_number: Optional[str] = None,
+                                    days: int = 7):
+    return _fix_missing_journal_entries(job.db, checkout_id, room_number, days, job.user_id, job=job)
+
+
 @router.post("/fix-missing-journal-entries")
 def fix_missing_journal_entries(
     checkout_id: Optional[int] = None,
     room_number: Optional[str] = None,
     days: int = 7,
+    background: bool = Query(False, description="Run as a background job (202 + job, poll GET /api/jobs/{id})"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -260,86 +358,20 @@ def fix_missing_journal_entries(
     Fix missing journal entries for checkouts.
     Can fix a specific checkout by ID or room number, or all checkouts in the last N days.
     """
-    from app.models.checkout import Checkout
-    from app.models.account import JournalEntry
-    from app.utils.accounting_helpers import create_complete_checkout_journal_entry
-    from datetime import datetime, timedelta
-    
+    if background:
+        return job_accepted(db, "accounts.fix_missing_journal_entries",
+                            {"checkout_id": checkout_id, "room_number": room_number, "days": days}, current_user)
     try:
-        checkouts_to_fix = []
-        
-        if checkout_id:
-            checkout = db.query(Checkout).filter(Checkout.id == checkout_id).first()
-            if checkout:
-                checkouts_to_fix = [checkout]
-        elif room_number:
-            checkout = db.query(Checkout).filter(Checkout.room_number == room_number).order_by(Checkout.created_at.desc()).first()
-            if checkout:
-                checkouts_to_fix = [checkout]
-        else:
-            # Fix all checkouts in last N days
-            cutoff_date = datetime.now() - timedelta(days=days)
-            checkouts = db.query(Checkout).filter(Checkout.created_at >= cutoff_date).all()
-            checkouts_to_fix = checkouts
-        
-        if not checkouts_to_fix:
-            return {"message": "No checkouts found to fix", "fixed": 0}
-        
-        fixed_count = 0
-        failed_count = 0
-        errors = []
-        
-        for checkout in checkouts_to_fix:
-            # Check if journal entry exists
-            journal_entry = db.query(JournalEntry).filter(
-                JournalEntry.reference_type == "CHECKOUT",
-                JournalEntry.reference_id == checkout.id
-            ).first()
-            
-            if journal_entry:
-                continue  # Already has journal entry
-            
-            # Try to create journal entry
-            try:
-                result = create_complete_checkout_journal_entry(
-                    db=db,
-                    checkout_id=checkout.id,
-                    room_total=float(checkout.room_total or 0),
-                    food_total=float(checkout.food_total or 0),
-                    service_total=float(checkout.service_total or 0),
-                    package_total=float(checkout.package_total or 0),
-                    tax_amount=float(checkout.tax_amount or 0),
-                    discount_amount=float(checkout.discount_amount or 0),
-                    grand_total=float(checkout.grand_total or 0),
-                    guest_name=checkout.guest_name or "Guest",
-                    room_number=checkout.room_number or "Unknown",
-                    gst_rate=18.0,
-                    payment_method=checkout.payment_method or "cash",
-                    created_by=current_user.id if current_user else None
-                )
-                
-                if result:
-                    db.commit()
-                    fixed_count += 1
-                else:
-                    failed_count += 1
-                    errors.append(f"Checkout {checkout.id}: Ledgers missing")
-            except Exception as e:
-                failed_count += 1
-                errors.append(f"Checkout {checkout.id}: {str(e)}")
-                db.rollback()
-        
-        return {
-            "message": f"Fixed {fixed_count} journal entries, {failed_count} failed",
-            "fixed": fixed_count,
-            "failed": failed_count,
-            "errors": errors
-        }
+        # Inline, but still the only fix of its kind running (background or not)
+        return job_inline(db, "accounts.fix_missing_journal_entries",
+                          {"checkout_id": checkout_id, "room_number": room_number, "days": days}, current_user)
+    except HTTPException:
+        raise
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Error fixing journal entries: {str(e)}")
 
-@router.get("/comprehensive-report")
+@router.get("/comprehensive-report", dependencies=[Depends(admit_heavy())])
 def get_comprehensive_report(
     start_date: Optional[str] = Query(None, description="Start date (YYYY-MM-DD)"),
     end_date: Optional[str] = Query(None, description="End date (YYYY-MM-DD)"),
@@ -359,51 +391,10 @@ def get_comprehensive_report(
     - All Journal Entries
     
     This endpoint returns complete data records, not just summaries.
+    Capped at `limit` rows per category; use /comprehensive-report/export for the full data set.
     """
     try:
-        from app.models.checkout import Checkout
-        from app.models.booking import Booking, BookingRoom
-        from app.models.Package import PackageBooking, PackageBookingRoom
-        from app.models.foodorder import FoodOrder, FoodOrderItem
-        from app.models.service import AssignedService
-        from app.models.expense import Expense
-        from app.models.inventory import PurchaseMaster, PurchaseDetail, InventoryTransaction
-        from app.models.account import JournalEntry, JournalEntryLine
-        from app.models.employee import Employee, Attendance, Leave, WorkingLog
-        from sqlalchemy import and_, or_
-        from sqlalchemy.orm import joinedload
-        from datetime import datetime, date as date_type
-        
-        # Parse dates
-        start_dt = None
-        end_dt = None
-        if start_date:
-            try:
-                if len(start_date) == 10:
-                    date_obj = date_type.fromisoformat(start_date)
-                    start_dt = datetime.combine(date_obj, datetime.min.time())
-                else:
-                    start_dt = datetime.fromisoformat(start_date.replace('Z', '+00:00'))
-            except:
-                start_dt = None
-        if end_date:
-            try:
-                if len(end_date) == 10:
-                    date_obj = date_type.fromisoformat(end_date)
-                    end_dt = datetime.combine(date_obj, datetime.max.time())
-                else:
-                    end_dt = datetime.fromisoformat(end_date.replace('Z', '+00:00'))
-            except:
-                end_dt = None
-        
-        # Build date filters
-        def build_date_filter(model, date_field):
-            filters = []
-            if start_dt:
-                filters.append(date_field >= start_dt)
-            if end_dt:
-                filters.append(date_field <= end_dt)
-            return filters
+        start_dt, end_dt = parse_report_range(start_date, end_date)
         
         result = {
             "period": {
@@ -414,377 +405,14 @@ def get_comprehensive_report(
             "data": {}
         }
         
-        # 1. All Checkouts
-        try:
-            checkout_filters = build_date_filter(Checkout, Checkout.checkout_date)
-            checkout_query = db.query(Checkout)
-            if checkout_filters:
-                checkout_query = checkout_query.filter(and_(*checkout_filters))
-            checkouts = checkout_query.order_by(Checkout.checkout_date.desc()).limit(limit).all()
-            result["data"]["checkouts"] = [{
-                "id": c.id,
-                "booking_id": c.booking_id,
-                "package_booking_id": c.package_booking_id,
-                "guest_name": c.guest_name,
-                "room_number": c.room_number,
-                "checkout_date": c.checkout_date.isoformat() if c.checkout_date else None,
-                "room_total": float(c.room_total or 0),
-                "food_total": float(c.food_total or 0),
-                "service_total": float(c.service_total or 0),
-                "package_total": float(c.package_total or 0),
-                "tax_amount": float(c.tax_amount or 0),
-                "discount_amount": float(c.discount_amount or 0),
-                "grand_total": float(c.grand_total or 0),
-                "payment_status": c.payment_status,
-                "payment_method": c.payment_method
-            } for c in checkouts]
-        except Exception as e:
-            print(f"Error fetching checkouts: {str(e)}")
-            result["data"]["checkouts"] = []
-        
-        # 2. All Bookings (Regular)
-        try:
-            booking_filters = build_date_filter(Booking, Booking.check_in)
-            booking_query = db.query(Booking)
-            if booking_filters:
-                booking_query = booking_query.filter(and_(*booking_filters))
-            bookings = booking_query.order_by(Booking.check_in.desc()).limit(limit).all()
-            result["data"]["bookings"] = [{
-                "id": b.id,
-                "guest_name": b.guest_name,
-                "guest_mobile": b.guest_mobile,
-                "guest_email": b.guest_email,
-                "check_in": b.check_in.isoformat() if b.check_in else None,
-                "check_out": b.check_out.isoformat() if b.check_out else None,
-                "status": b.status,
-                "total_amount": float(b.total_amount or 0),
-                "advance_deposit": float(b.advance_deposit or 0),
-                "adults": b.adults,
-                "children": b.children,
-                "rooms": [{"room_id": br.room_id, "room_number": br.room.number if br.room else None} for br in b.booking_rooms] if b.booking_rooms else []
-            } for b in bookings]
-        except Exception as e:
-            print(f"Error fetching bookings: {str(e)}")
-            result["data"]["bookings"] = []
-        
-        # 3. All Package Bookings
-        try:
-            pkg_booking_filters = build_date_filter(PackageBooking, PackageBooking.check_in)
-            pkg_booking_query = db.query(PackageBooking)
-            if pkg_booking_filters:
-                pkg_booking_query = pkg_booking_query.filter(and_(*pkg_booking_filters))
-            package_bookings = pkg_booking_query.order_by(PackageBooking.check_in.desc()).limit(limit).all()
-            result["data"]["package_bookings"] = [{
-                "id": pb.id,
-                "guest_name": pb.guest_name,
-                "guest_mobile": pb.guest_mobile,
-                "guest_email": pb.guest_email,
-                "check_in": pb.check_in.isoformat() if pb.check_in else None,
-                "check_out": pb.check_out.isoformat() if pb.check_out else None,
-                "status": pb.status,
-                "total_amount": float(pb.total_amount or 0),
-                "advance_deposit": float(pb.advance_deposit or 0),
-                "package_id": pb.package_id,
-                "package_name": pb.package.name if pb.package else None,
-                "rooms": [{"room_id": pbr.room_id, "room_number": pbr.room.number if pbr.room else None} for pbr in pb.rooms] if pb.rooms else []
-            } for pb in package_bookings]
-        except Exception as e:
-            print(f"Error fetching package bookings: {str(e)}")
-            result["data"]["package_bookings"] = []
-        
-        # 4. All Food Orders
-        try:
-            food_filters = build_date_filter(FoodOrder, FoodOrder.created_at)
-            food_query = db.query(FoodOrder).options(
-                joinedload(FoodOrder.items).joinedload(FoodOrderItem.food_item)
-            )
-            if food_filters:
-                food_query = food_query.filter(and_(*food_filters))
-            food_orders = food_query.order_by(FoodOrder.created_at.desc()).limit(limit).all()
-            result["data"]["food_orders"] = [{
-                "id": fo.id,
-                "room_id": fo.room_id,
-                "room_number": fo.room.number if fo.room else None,
-                "amount": float(fo.amount or 0),
-                "status": fo.status,
-                "billing_status": fo.billing_status,
-                "order_type": fo.order_type,
-                "created_at": fo.created_at.isoformat() if fo.created_at else None,
-                "items": [{
-                    "food_item_id": item.food_item_id,
-                    "food_item_name": item.food_item.name if item.food_item else None,
-                    "quantity": item.quantity
-                } for item in fo.items] if fo.items else []
-            } for fo in food_orders]
-        except Exception as e:
-            print(f"Error fetching food orders: {str(e)}")
-            result["data"]["food_orders"] = []
-        
-        # 5. All Services
-        try:
-            service_filters = build_date_filter(AssignedService, AssignedService.assigned_at)
-            service_query = db.query(AssignedService).options(
-                joinedload(AssignedService.service),
-                joinedload(AssignedService.employee),
-                joinedload(AssignedService.room)
-            )
-            if service_filters:
-                service_query = service_query.filter(and_(*service_filters))
-            services = service_query.order_by(AssignedService.assigned_at.desc()).limit(limit).all()
-            result["data"]["services"] = [{
-                "id": s.id,
-                "service_id": s.service_id,
-                "service_name": s.service.name if s.service else None,
-                "room_id": s.room_id,
-                "room_number": s.room.number if s.room else None,
-                "employee_id": s.employee_id,
-                "employee_name": s.employee.name if s.employee else None,
-                "status": s.status,
-                "billing_status": s.billing_status,
-                "assigned_at": s.assigned_at.isoformat() if s.assigned_at else None,
-                "completed_at": s.completed_at.isoformat() if s.completed_at else None
-            } for s in services]
-        except Exception as e:
-            print(f"Error fetching services: {str(e)}")
-            result["data"]["services"] = []
-        
-        # 6. All Expenses
-        try:
-            expense_filters = []
-            if start_dt:
-                expense_date = start_dt.date() if isinstance(start_dt, datetime) else start_dt
-                expense_filters.append(Expense.date >= expense_date)
-            if end_dt:
-                expense_date = end_dt.date() if isinstance(end_dt, datetime) else end_dt
-                expense_filters.append(Expense.date <= expense_date)
-            expense_query = db.query(Expense)
-            if expense_filters:
-                expense_query = expense_query.filter(and_(*expense_filters))
-            expenses = expense_query.order_by(Expense.date.desc()).limit(limit).all()
-            result["data"]["expenses"] = [{
-                "id": e.id,
-                "category": e.category,
-                "amount": float(e.amount or 0),
-                "description": e.description,
-                "date": e.date.isoformat() if e.date else None,
-                "employee_id": e.employee_id,
-                "employee_name": e.employee.name if e.employee else None
-            } for e in expenses]
-        except Exception as e:
-            print(f"Error fetching expenses: {str(e)}")
-            result["data"]["expenses"] = []
-        
-        # 7. All Inventory Purchases
-        # 7. All Inventory Purchases
-        try:
-            purchase_filters = []
-            if start_dt:
-                purchase_date = start_dt.date() if isinstance(start_dt, datetime) else start_dt
-                purchase_filters.append(PurchaseMaster.purchase_date >= purchase_date)
-            if end_dt:
-                purchase_date = end_dt.date() if isinstance(end_dt, datetime) else end_dt
-                purchase_filters.append(PurchaseMaster.purchase_date <= purchase_date)
-            
-            # Simplified query first to debug
-            purchase_query = db.query(PurchaseMaster).options(
-                joinedload(PurchaseMaster.vendor)
-            )
-            
-            if purchase_filters:
-                purchase_query = purchase_query.filter(and_(*purchase_filters))
-                
-            purchases = purchase_query.order_by(PurchaseMaster.purchase_date.desc()).limit(limit).all()
-            
-            purchases_data = []
-            for p in purchases:
-                # Safe serialization
-                p_data = {
-                    "id": p.id,
-                    "purchase_number": p.purchase_number,
-                    "vendor_id": p.vendor_id,
-                    "vendor_name": p.vendor.name if p.vendor else "Unknown",
-                    "purchase_date": p.purchase_date.isoformat() if p.purchase_date else None,
-                    "total_amount": float(p.total_amount or 0),
-                    "status": p.status,
-                    "details": [] # Temporarily empty to rule out details error
-                }
-                
-                # Try to load details safely
-                try:
-                    if p.details:
-                        for d in p.details:
-                            p_data["details"].append({
-                                "item_id": d.item_id,
-                                "item_name": d.item.name if (d.item) else "Unknown Item",
-                                "quantity": float(d.quantity or 0),
-                                "unit_price": float(d.unit_price or 0),
-                                "total": float(d.total or 0)
-                            })
-                except Exception as ex:
-                    print(f"Error loading details for purchase {p.id}: {ex}")
-                
-                purchases_data.append(p_data)
-
-            result["data"]["purchases"] = purchases_data
-        except Exception as e:
-            import traceback
-            traceback.print_exc()
-            print(f"Error fetching purchases: {str(e)}")
-            result["data"]["purchases"] = []
-        
-        # 8. All Inventory Transactions
-        try:
-            transaction_filters = build_date_filter(InventoryTransaction, InventoryTransaction.created_at)
-            transaction_query = db.query(InventoryTransaction).options(
-                joinedload(InventoryTransaction.item)
-            )
-            if transaction_filters:
-                transaction_query = transaction_query.filter(and_(*transaction_filters))
-            transactions = transaction_query.order_by(InventoryTransaction.created_at.desc()).limit(limit).all()
-            result["data"]["inventory_transactions"] = [{
-                "id": t.id,
-                "item_id": t.item_id,
-                "item_name": t.item.name if t.item else None,
-                "transaction_type": t.transaction_type,
-                "quantity": float(t.quantity or 0),
-                "unit_price": float(t.unit_price or 0),
-                "total_amount": float(t.total_amount or 0),
-                "reference_number": t.reference_number,
-                "notes": t.notes,
-                "created_at": t.created_at.isoformat() if t.created_at else None
-            } for t in transactions]
-        except Exception as e:
-            print(f"Error fetching inventory transactions: {str(e)}")
-            result["data"]["inventory_transactions"] = []
-        
-        # 9. All Journal Entries
-        try:
-            journal_filters = build_date_filter(JournalEntry, JournalEntry.entry_date)
-            journal_query = db.query(JournalEntry).options(
-                joinedload(JournalEntry.lines).joinedload(JournalEntryLine.debit_ledger),
-                joinedload(JournalEntry.lines).joinedload(JournalEntryLine.credit_ledger)
-            )
-            if journal_filters:
-                journal_query = journal_query.filter(and_(*journal_filters))
-            journal_entries = journal_query.order_by(JournalEntry.entry_date.desc()).limit(limit).all()
-            result["data"]["journal_entries"] = [{
-                "id": je.id,
-                "entry_number": je.entry_number,
-                "entry_date": je.entry_date.isoformat() if je.entry_date else None,
-                "description": je.description,
-                "reference_type": je.reference_type,
-                "reference_id": je.reference_id,
-                "lines": [{
-                    "id": line.id,
-                    "debit_ledger_id": line.debit_ledger_id,
-                    "debit_ledger_name": line.debit_ledger.name if line.debit_ledger else None,
-                    "credit_ledger_id": line.credit_ledger_id,
-                    "credit_ledger_name": line.credit_ledger.name if line.credit_ledger else None,
-                    "amount": float(line.amount or 0),
-                    "description": line.description
-                } for line in je.lines] if je.lines else []
-            } for je in journal_entries]
-        except Exception as e:
-            print(f"Error fetching journal entries: {str(e)}")
-            result["data"]["journal_entries"] = []
-        
-        # 10. All Employees with Salary Information
-        try:
-            employees = db.query(Employee).order_by(Employee.name).limit(limit).all()
-            result["data"]["employees"] = [{
-                "id": e.id,
-                "name": e.name,
-                "role": e.role,
-                "salary": float(e.salary or 0),
-                "join_date": e.join_date.isoformat() if e.join_date else None,
-                "user_id": e.user_id
-            } for e in employees]
-        except Exception as e:
-            print(f"Error fetching employees: {str(e)}")
-            result["data"]["employees"] = []
-        
-        # 11. All Attendance Records
-        try:
-            attendance_filters = []
-            if start_dt:
-                attendance_date = start_dt.date() if isinstance(start_dt, datetime) else start_dt
-                attendance_filters.append(Attendance.date >= attendance_date)
-            if end_dt:
-                attendance_date = end_dt.date() if isinstance(end_dt, datetime) else end_dt
-                attendance_filters.append(Attendance.date <= attendance_date)
-            attendance_query = db.query(Attendance).options(
-                joinedload(Attendance.employee)
-            )
-            if attendance_filters:
-                attendance_query = attendance_query.filter(and_(*attendance_filters))
-            attendances = attendance_query.order_by(Attendance.date.desc()).limit(limit).all()
-            result["data"]["attendances"] = [{
-                "id": a.id,
-                "employee_id": a.employee_id,
-                "employee_name": a.employee.name if a.employee else None,
-                "date": a.date.isoformat() if a.date else None,
-                "status": a.status
-            } for a in attendances]
-        except Exception as e:
-            print(f"Error fetching attendances: {str(e)}")
-            result["data"]["attendances"] = []
-        
-        # 12. All Leaves
-        try:
-            leave_filters = []
-            if start_dt:
-                leave_date = start_dt.date() if isinstance(start_dt, datetime) else start_dt
-                leave_filters.append(Leave.from_date >= leave_date)
-            if end_dt:
-                leave_date = end_dt.date() if isinstance(end_dt, datetime) else end_dt
-                leave_filters.append(Leave.to_date <= leave_date)
-            leave_query = db.query(Leave).options(
-                joinedload(Leave.employee)
-            )
-            if leave_filters:
-                leave_query = leave_query.filter(and_(*leave_filters))
-            leaves = leave_query.order_by(Leave.from_date.desc()).limit(limit).all()
-            result["data"]["leaves"] = [{
-                "id": l.id,
-                "employee_id": l.employee_id,
-                "employee_name": l.employee.name if l.employee else None,
-                "from_date": l.from_date.isoformat() if l.from_date else None,
-                "to_date": l.to_date.isoformat() if l.to_date else None,
-                "reason": l.reason,
-                "leave_type": l.leave_type,
-                "status": l.status
-            } for l in leaves]
-        except Exception as e:
-            print(f"Error fetching leaves: {str(e)}")
-            result["data"]["leaves"] = []
-        
-        # 13. All Working Logs
-        try:
-            working_log_filters = []
-            if start_dt:
-                log_date = start_dt.date() if isinstance(start_dt, datetime) else start_dt
-                working_log_filters.append(WorkingLog.date >= log_date)
-            if end_dt:
-                log_date = end_dt.date() if isinstance(end_dt, datetime) else end_dt
-                working_log_filters.append(WorkingLog.date <= log_date)
-            working_log_query = db.query(WorkingLog).options(
-                joinedload(WorkingLog.employee)
-            )
-            if working_log_filters:
-                working_log_query = working_log_query.filter(and_(*working_log_filters))
-            working_logs = working_log_query.order_by(WorkingLog.date.desc()).limit(limit).all()
-            result["data"]["working_logs"] = [{
-                "id": wl.id,
-                "employee_id": wl.employee_id,
-                "employee_name": wl.employee.name if wl.employee else None,
-                "date": wl.date.isoformat() if wl.date else None,
-                "check_in_time": wl.check_in_time.strftime("%H:%M:%S") if wl.check_in_time else None,
-                "check_out_time": wl.check_out_time.strftime("%H:%M:%S") if wl.check_out_time else None,
-                "location": wl.location
-            } for wl in working_logs]
-        except Exception as e:
-            print(f"Error fetching working logs: {str(e)}")
-            result["data"]["working_logs"] = []
+        for section in REPORT_SECTIONS:
+            try:
+                rows = section.query(db, start_dt, end_dt).limit(limit).all()
+                result["data"][section.name] = [section.serialize(row) for row in rows]
+            except Exception as e:
+                db.rollback()
+                logger.error("Error fetching %s: %s", section.name, e)
+                result["data"][section.name] = []
         
         # Add summary counts
         result["summary"] = {
@@ -806,13 +434,77 @@ def get_comprehensive_report(
         
         return result
     except Exception as e:
-        import traceback
-        error_msg = f"Error in comprehensive report: {str(e)}\n{traceback.format_exc()}"
-        print(error_msg)
+        logger.error("Error in comprehensive report: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error generating comprehensive report: {str(e)}")
 
 
+# Holds one connection per export worker until the last chunk is sent
+@router.get("/comprehensive-report/export", dependencies=[Depends(admit_heavy(weight=report_export.EXPORT_MAX_WORKERS))])
+def export_comprehensive_report(
+    start_date: Optional[str] = Query(None, description="Start date (YYYY-MM-DD)"),
+    end_date: Optional[str] = Query(None, description="End date (YYYY-MM-DD)"),
+    format: Literal["ndjson", "csv"] = Query("ndjson", description="ndjson stream or zip of one CSV per section"),
+    sections: Optional[str] = Query(None, description="Comma-separated section names (default: all)"),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Full comprehensive report, streamed. No per-section cap: sections are fetched
+    concurrently on separate connections and sent chunk by chunk, so memory is
+    bounded by a few chunks rather than the report size.
+    """
+    selected = REPORT_SECTIONS
+    if sections:
+        wanted = {name.strip() for name in sections.split(",") if name.strip()}
+        unknown = wanted - {section.name for section in REPORT_SECTIONS}
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown report sections: {', '.join(sorted(unknown))}")
+        selected = [section for section in REPORT_SECTIONS if section.name in wanted]
+    
+    start_dt, end_dt = parse_report_range(start_date, end_date)
+    stamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+    if format == "csv":
+        return StreamingResponse(
+            report_export.stream_csv_zip(selected, SessionLocal, args=(start_dt, end_dt)),
+            media_type="application/zip",
+            headers={"Content-Disposition": f'attachment; filename="comprehensive_report_{stamp}.zip"'},
+        )
+    meta = {
+        "period": {"start_date": start_date, "end_date": end_date},
+        "generated_at": datetime.utcnow().isoformat(),
+    }
+    return StreamingResponse(
+        report_export.stream_ndjson(selected, SessionLocal, args=(start_dt, end_dt), meta=meta),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="comprehensive_report_{stamp}.ndjson"'},
+    )
+
+
+
+@router.get("/books-closed-until")
+def get_books_closed_until(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Accounting periods up to this date are closed (their reports are cached permanently)"""
+    closed_until = report_cache.get_books_closed_until(db)
+    return {"closed_until": closed_until.isoformat() if closed_until else None}
+
+
+@router.put("/books-closed-until")
+def set_books_closed_until(
+    closed_until: Optional[date] = Query(None, description="Close the books up to this date; omit to re-open every period"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Close (or re-open) accounting periods. Re-opening drops the permanent report results past the new date."""
+    if not current_user.role or current_user.role.name != "admin":
+        raise HTTPException(status_code=403, detail="Only admin can close or re-open accounting periods")
+    report_cache.set_books_closed_until(db, closed_until)
+    return {"closed_until": closed_until.isoformat() if closed_until else None}
+
+
 @router.get("/auto-report")
+@cached_report("accounts.auto_report")
 def get_automatic_accounting_report(
     start_date: Optional[str] = Query(None),
     end_date: Optional[str] = Query(None),
@@ -855,7 +547,7 @@ def get_automatic_accounting_report(
                 else:
                     start_dt = start_date
             except Exception as e:
-                print(f"Error parsing start_date: {e}")
+                logger.error("Error parsing start_date: %s", e)
                 start_dt = None
         if end_date:
             try:
@@ -871,7 +563,7 @@ def get_automatic_accounting_report(
                 else:
                     end_dt = end_date
             except Exception as e:
-                print(f"Error parsing end_date: {e}")
+                logger.error("Error parsing end_date: %s", e)
                 end_dt = None
         
         # Set date filters
@@ -903,7 +595,7 @@ def get_automatic_accounting_report(
             
             checkout_result = checkout_query.first()
         except Exception as e:
-            print(f"Checkout query error: {str(e)}")
+            logger.error("Checkout query error: %s", e)
             checkout_result = None
         checkout_stats = {
         "total_checkouts": checkout_result.total_checkouts or 0 if checkout_result else 0,
@@ -978,7 +670,7 @@ def get_automatic_accounting_report(
             
             food_result = food_query.first()
         except Exception as e:
-            print(f"Food query error: {str(e)}")
+            logger.error("Food query error: %s", e)
             food_result = None
         food_stats = {
             "total_orders": food_result.total_orders or 0 if food_result else 0,
@@ -1020,8 +712,7 @@ def get_automatic_accounting_report(
             )
         except Exception as e:
             # If query fails, return zeros
-            import traceback
-            print(f"Service query error: {str(e)}\n{traceback.format_exc()}")
+            logger.error("Service query error: %s", e, exc_info=True)
             from types import SimpleNamespace
             service_result = SimpleNamespace(
                 total_services=0,
@@ -1084,7 +775,7 @@ def get_automatic_accounting_report(
                 "by_category": expense_by_category
             }
         except Exception as e:
-            print(f"Expense query error: {str(e)}")
+            logger.error("Expense query error: %s", e)
             expense_stats = {
                 "total_expenses": 0,
                 "total_amount": 0.0,
@@ -1115,7 +806,7 @@ def get_automatic_accounting_report(
             
             purchase_result = purchase_query.first()
         except Exception as e:
-            print(f"Purchase query error: {str(e)}")
+            logger.error("Purchase query error: %s", e)
             from types import SimpleNamespace
             purchase_result = SimpleNamespace(
                 total_purchases=0,
@@ -1146,7 +837,7 @@ def get_automatic_accounting_report(
                     "amount": float(row.amount or 0)
                 }
         except Exception as e:
-            print(f"Purchase status query error: {str(e)}")
+            logger.error("Purchase status query error: %s", e)
             purchase_by_status = {}
         
         purchase_stats = {
@@ -1183,7 +874,7 @@ def get_automatic_accounting_report(
                 "total_quantity": float(consumption_result.total_quantity or 0) if consumption_result else 0.0,
             }
         except Exception as e:
-            print(f"Consumption query error: {str(e)}")
+            logger.error("Consumption query error: %s", e)
             consumption_stats = {
                 "total_transactions": 0,
                 "total_cogs": 0.0,
@@ -1231,9 +922,8 @@ def get_automatic_accounting_report(
             "calculated_at": datetime.utcnow().isoformat(),
         }
     except Exception as e:
-        import traceback
-        error_msg = f"Error generating auto-report: {str(e)}\n{traceback.format_exc()}"
-        print(error_msg)
+        error_msg = f"Error generating auto-report: {str(e)}"
+        logger.error("%s", error_msg, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error generating report: {str(e)}")
 
 
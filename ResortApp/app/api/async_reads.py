@@ -0,0 +1,274 @@
+"""
+Async versions of the hottest read endpoints.
+
+These run on the AsyncSession from app.database.get_async_db (asyncpg /
+aiosqlite) instead of the sync SessionLocal, so a request waiting on Postgres
+no longer occupies one of Starlette's threadpool threads. Routes use the same
+paths and response shapes as their sync counterparts; main.py registers this
+router ahead of the sync routers when async_db_available() is true, so it
+shadows them. Set ASYNC_DB_ENABLED=false to fall back to the sync handlers.
+
+The statements and the row-to-response code live next to the sync handlers
+and are shared with them; only the awaiting is done here. Relationships are
+always eager-loaded by those statements: lazy loading is not available on an
+AsyncSession.
+"""
+from datetime import date
+from typing import List, Optional
+import logging
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_async_db
+from app.models.food_category import FoodCategory
+from app.models.food_item import FoodItem
+from app.models.service import Service
+from app.models.user import User
+from app.schemas.foodorder import FoodOrderOut
+from app.schemas.packages import PackageOut
+from app.schemas.room import RoomOut
+from app.utils.api_optimization import (
+    optimize_limit, MAX_LIMIT_LOW_NETWORK, FIELDS_QUERY_DESCRIPTION, select_fields, trim_fields, wants,
+)
+from app.utils.auth import get_current_user
+from app.utils.checkout_helpers import active_stay_statements, build_active_room_options, stay_checkout_statements
+from app.api.dashboard import EMPTY_KPIS, booked_room_statements, kpi_scalar_statements, kpis_from_values
+from app.api.food_orders import release_due_orders, scheduled_orders_statement
+from app.api.public import (
+    PublicBookingOut,
+    PublicPackageBookingOut,
+    public_bookings_from_rows,
+    public_bookings_statement,
+    public_package_bookings_from_rows,
+    public_package_bookings_statement,
+    public_packages_statement,
+    public_rooms_statement,
+)
+from app.api.service_request import (
+    SERVICE_REQUEST_LIST_FIELDS,
+    checkout_request_lookup_statements,
+    checkout_request_page_statement,
+    checkout_requests_to_dicts,
+    service_request_to_dict,
+)
+from app.curd.foodorder import (
+    food_order_items_statement,
+    food_order_page_statement,
+    food_order_rows_to_dicts,
+    stay_statements,
+)
+from app.curd.service_request import service_request_page_statement
+from app.utils.fast_json import FastJSONResponse
+
+logger = logging.getLogger(__name__)
+
+# Kept out of the OpenAPI schema: the sync routes they shadow document the same paths
+router = APIRouter(include_in_schema=False)
+
+
+# ---------------------------------------------------------------------------
+# Dashboard
+# ---------------------------------------------------------------------------
+@router.get("/dashboard/kpis")
+async def get_kpis(db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user)):
+    """Key performance indicators for the dashboard (async path)"""
+    try:
+        today = date.today()
+
+        values = {}
+        for name, stmt in kpi_scalar_statements(today).items():
+            try:
+                values[name] = (await db.execute(stmt)).scalar() or 0
+            except Exception:
+                await db.rollback()
+                values[name] = 0
+
+        booked_room_ids = set()
+        try:
+            for stmt in booked_room_statements(today):
+                booked_room_ids.update(r for r in (await db.execute(stmt)).scalars() if r)
+        except Exception:
+            await db.rollback()
+
+        return kpis_from_values(values, booked_room_ids)
+    except Exception as e:
+        logger.error("Error in async get_kpis: %s", e, exc_info=True)
+        return [dict(EMPTY_KPIS)]
+
+
+# ---------------------------------------------------------------------------
+# Active rooms (checkout dropdown)
+# ---------------------------------------------------------------------------
+@router.get("/bill/active-rooms", response_model=List[dict])
+async def get_active_rooms(db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user), skip: int = 0, limit: int = 20):
+    """Active rooms available for checkout (async path)"""
+    try:
+        booking_stmt, package_stmt = active_stay_statements()
+        active_bookings = (await db.execute(booking_stmt)).scalars().all()
+        active_package_bookings = (await db.execute(package_stmt)).scalars().all()
+
+        booking_checkouts_stmt, package_checkouts_stmt = stay_checkout_statements(active_bookings, active_package_bookings)
+        booking_checkouts = (await db.execute(booking_checkouts_stmt)).all() if booking_checkouts_stmt is not None else []
+        package_checkouts = (await db.execute(package_checkouts_stmt)).all() if package_checkouts_stmt is not None else []
+
+        result, repaired = build_active_room_options(active_bookings, active_package_bookings, booking_checkouts, package_checkouts)
+        if repaired:
+            await db.commit()
+        return FastJSONResponse(result[skip:skip + limit])
+    except Exception as e:
+        logger.error("active-rooms: Exception: %s", e, exc_info=True)
+        return []
+
+
+# ---------------------------------------------------------------------------
+# Service requests
+# ---------------------------------------------------------------------------
+async def _list_service_requests(
+    db: AsyncSession, skip: int, limit: int, status: Optional[str], include_checkout_requests: bool,
+    fields: Optional[List[str]] = None,
+):
+    service_requests = (await db.execute(service_request_page_statement(skip, limit, status, fields))).all()
+    result = [d for d in (service_request_to_dict(sr) for sr in service_requests) if d is not None]
+
+    if include_checkout_requests:
+        checkout_requests = (await db.execute(checkout_request_page_statement(skip, limit, status))).scalars().all()
+        rooms_stmt, items_stmt = checkout_request_lookup_statements(checkout_requests, fields)
+        room_map = {r.number: r for r in (await db.execute(rooms_stmt)).scalars()} if rooms_stmt is not None else {}
+        inventory_items = {i.id: i for i in (await db.execute(items_stmt)).scalars()} if items_stmt is not None else {}
+        result.extend(checkout_requests_to_dicts(checkout_requests, room_map, inventory_items))
+
+    return trim_fields(result, fields)
+
+
+@router.get("/service-requests")
+async def get_service_requests(
+    skip: int = 0,
+    limit: int = 100,
+    status: Optional[str] = None,
+    include_checkout_requests: bool = True,
+    fields: Optional[str] = Query(None, description=FIELDS_QUERY_DESCRIPTION),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Service requests plus checkout requests (async path)"""
+    selected = select_fields(fields, SERVICE_REQUEST_LIST_FIELDS)
+    return FastJSONResponse(await _list_service_requests(db, skip, limit, status, include_checkout_requests, selected))
+
+
+# ---------------------------------------------------------------------------
+# Food orders
+# ---------------------------------------------------------------------------
+async def _trigger_scheduled_orders(db: AsyncSession):
+    """Async equivalent of food_orders.trigger_scheduled_orders"""
+    try:
+        if release_due_orders((await db.execute(scheduled_orders_statement())).scalars().all()):
+            await db.commit()
+    except Exception as e:
+        await db.rollback()
+        logger.error("Error checking scheduled orders: %s", e)
+
+
+async def _list_food_orders(db: AsyncSession, skip: int, limit: int, fields: Optional[List[str]] = None):
+    limit = optimize_limit(limit, MAX_LIMIT_LOW_NETWORK)
+    await _trigger_scheduled_orders(db)
+    try:
+        # Same projected statements as the sync path: plain rows, no ORM objects
+        orders = (await db.execute(food_order_page_statement(skip, limit, fields))).all()
+        if not orders:
+            return []
+        items = []
+        if wants(fields, "items"):
+            items = (await db.execute(food_order_items_statement([o.id for o in orders]))).all()
+        room_ids = {o.room_id for o in orders if o.room_id} if wants(fields, "guest_name") else ()
+        regular_stays, package_stays = [], []
+        if room_ids:
+            # One bulk stay lookup instead of two guest queries per order
+            regular_stmt, package_stmt = stay_statements(room_ids, [o.created_at for o in orders if o.room_id])
+            regular_stays = (await db.execute(regular_stmt)).all()
+            package_stays = (await db.execute(package_stmt)).all()
+        return food_order_rows_to_dicts(orders, items, regular_stays, package_stays, fields)
+    except Exception as e:
+        logger.error("Error in async get_food_orders: %s", e, exc_info=True)
+        return []
+
+
+@router.get("/food-orders", response_model=List[FoodOrderOut])
+async def get_orders(db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user), skip: int = 0, limit: int = 20,
+                     fields: Optional[str] = Query(None, description=FIELDS_QUERY_DESCRIPTION)):
+    return FastJSONResponse(await _list_food_orders(db, skip, limit, select_fields(fields, FoodOrderOut)))
+
+
+@router.get("/food-orders/", response_model=List[FoodOrderOut])  # Handle trailing slash
+async def get_orders_slash(db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user), skip: int = 0, limit: int = 20,
+                           fields: Optional[str] = Query(None, description=FIELDS_QUERY_DESCRIPTION)):
+    return FastJSONResponse(await _list_food_orders(db, skip, limit, select_fields(fields, FoodOrderOut)))
+
+
+# ---------------------------------------------------------------------------
+# Public catalog and availability (no authentication)
+# ---------------------------------------------------------------------------
+@router.get("/public/rooms", response_model=List[RoomOut])
+async def get_public_rooms(db: AsyncSession = Depends(get_async_db), skip: int = 0, limit: int = 100):
+    """Get all available rooms without authentication"""
+    try:
+        return (await db.execute(public_rooms_statement(skip, limit))).scalars().all()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching rooms: {str(e)}")
+
+
+@router.get("/public/packages", response_model=List[PackageOut])
+async def get_public_packages(db: AsyncSession = Depends(get_async_db), skip: int = 0, limit: int = 100):
+    """Get all packages without authentication"""
+    try:
+        return (await db.execute(public_packages_statement(skip, limit))).scalars().all()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching packages: {str(e)}")
+
+
+@router.get("/public/food-items")
+async def get_public_food_items(db: AsyncSession = Depends(get_async_db)):
+    """Get all food items without authentication"""
+    try:
+        return (await db.execute(select(FoodItem))).unique().scalars().all()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching food items: {str(e)}")
+
+
+@router.get("/public/food-categories")
+async def get_public_food_categories(db: AsyncSession = Depends(get_async_db)):
+    """Get all food categories without authentication"""
+    try:
+        return (await db.execute(select(FoodCategory))).scalars().all()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching food categories: {str(e)}")
+
+
+@router.get("/public/services")
+async def get_public_services(db: AsyncSession = Depends(get_async_db)):
+    """Get all services without authentication"""
+    try:
+        return (await db.execute(select(Service))).scalars().all()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching services: {str(e)}")
+
+
+@router.get("/public/bookings", response_model=List[PublicBookingOut])
+async def get_public_bookings(db: AsyncSession = Depends(get_async_db), skip: int = 0, limit: int = 500):
+    """Minimal booking data for availability calculation, read as plain columns"""
+    try:
+        return public_bookings_from_rows(await db.execute(public_bookings_statement(skip, limit)))
+    except Exception as e:
+        logger.error("Error fetching public bookings: %s", e)
+        return []
+
+
+@router.get("/public/package-bookings", response_model=List[PublicPackageBookingOut])
+async def get_public_package_bookings(db: AsyncSession = Depends(get_async_db), skip: int = 0, limit: int = 500):
+    """Minimal package booking data for availability calculation, read as plain columns"""
+    try:
+        return public_package_bookings_from_rows(await db.execute(public_package_bookings_statement(skip, limit)))
+    except Exception as e:
+        logger.error("Error fetching public package bookings: %s", e)
+        return []
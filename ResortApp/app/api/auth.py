@@ -7,6 +7,9 @@ from app.utils import auth
 from app.curd import user as crud_user
 from fastapi import Depends
 from app.utils.auth import get_current_user
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
@@ -17,47 +20,43 @@ def login(request: LoginRequest, db: Session = Depends(auth.get_db)):
         # Check if user exists
         user = crud_user.get_user_by_email(db, request.email)
         if not user:
-            print(f"Login attempt: User not found for email: {request.email}")
+            logger.debug("Login attempt: User not found for email: %s", request.email)
             raise HTTPException(status_code=400, detail="Invalid credentials")
         
         # Check if user is active
         if not user.is_active:
-            print(f"Login attempt: User {request.email} is inactive")
+            logger.debug("Login attempt: User %s is inactive", request.email)
             raise HTTPException(status_code=400, detail="Account is inactive. Please contact administrator.")
         
         # Check if user has a role
         if not user.role:
-            print(f"Login attempt: User {request.email} has no role assigned")
+            logger.debug("Login attempt: User %s has no role assigned", request.email)
             raise HTTPException(status_code=400, detail="User role not assigned. Please contact administrator.")
         
         # Verify password
         try:
             password_valid = auth.verify_password(request.password, user.hashed_password)
         except Exception as pwd_error:
-            print(f"Password verification error for {request.email}: {str(pwd_error)}")
-            import traceback
-            traceback.print_exc()
+            logger.error("Password verification error for %s: %s", request.email, pwd_error, exc_info=True)
             raise HTTPException(status_code=400, detail="Invalid credentials")
         
         if not password_valid:
-            print(f"Login attempt: Invalid password for email: {request.email}")
+            logger.debug("Login attempt: Invalid password for email: %s", request.email)
             raise HTTPException(status_code=400, detail="Invalid credentials")
         
         # Create access token
         access_token = auth.create_access_token(
-            data={"user_id": user.id, "role": user.role.name},
+            data={"user_id": user.id, "role": user.role.name, auth.TOKEN_VERSION_CLAIM: user.token_version or 0},
             expires_delta=timedelta(hours=auth.ACCESS_TOKEN_EXPIRE_MINUTES),
         )
-        print(f"Login successful: {request.email}")
+        logger.debug("Login successful: %s", request.email)
         return {"access_token": access_token}
     except HTTPException:
         # Re-raise HTTP exceptions (like invalid credentials)
         raise
     except Exception as e:
         # Log unexpected errors
-        print(f"Login error for {request.email}: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.error("Login error for %s: %s", request.email, e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Login failed: {str(e)}")
 
 
@@ -68,4 +67,18 @@ def admin_data(user=Depends(get_current_user)):
     return {"message": "Admin access granted"}
 
 
+@router.post("/logout")
+def logout(db: Session = Depends(auth.get_db), current_user=Depends(get_current_user)):
+    """Revoke every access token of the current user (all devices)"""
+    auth.revoke_tokens(db, current_user.id)
+    return {"message": "Logged out"}
+
 
+@router.post("/revoke/{user_id}")
+def revoke_user_tokens(user_id: int, db: Session = Depends(auth.get_db), current_user=Depends(get_current_user)):
+    """Admin: sign a user out everywhere by revoking their access tokens"""
+    if current_user.role.name != "admin":
+        raise HTTPException(status_code=403, detail="Forbidden")
+    if auth.revoke_tokens(db, user_id) is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    return {"message": "Tokens revoked", "user_id": user_id}
@@ -1,11 +1,16 @@
 # booking.py
 from fastapi import APIRouter, Depends, HTTPException, File, UploadFile, Query, Form
 from sqlalchemy.orm import Session, joinedload, load_only
-from sqlalchemy import func, or_, and_
+from sqlalchemy import func, or_, and_, select
 from typing import List, Union, Optional
 from app.utils.auth import get_db, get_current_user
-from app.utils.api_optimization import optimize_limit, MAX_LIMIT_LOW_NETWORK
+from app.utils.api_optimization import (
+    optimize_limit, MAX_LIMIT_LOW_NETWORK, FIELDS_QUERY_DESCRIPTION, select_fields, sparse_columns, trim_fields, wants,
+)
 from app.utils.booking_id import parse_display_id
+from app.utils.images import ingest_image
+from app.utils.fast_json import FastJSONResponse, as_float
+from app.curd.user import user_refs_by_id
 from app.models.booking import Booking, BookingRoom
 from app.models.user import User
 from app.models.room import Room
@@ -14,13 +19,16 @@ from app.schemas.booking import BookingCreate, BookingOut
 from app.schemas.room import RoomOut
 from fastapi.responses import FileResponse
 import os
-import shutil
-import uuid
 
 UPLOAD_DIR = "uploads/checkin_proofs"
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 from app.schemas.booking import BookingOut, BookingRoomOut
+from app.utils.booking_status import ACTIVE_BOOKING_STATUSES
+from app.utils.bulk_writes import bulk_written
 from pydantic import BaseModel, ValidationError
+import logging
+
+logger = logging.getLogger(__name__)
 
 class PaginatedBookingResponse(BaseModel):
     total: int
@@ -28,6 +36,96 @@ class PaginatedBookingResponse(BaseModel):
 
 router = APIRouter(prefix="/bookings", tags=["Bookings"])
 
+# BookingOut field -> booking columns it is built from (sparse fieldsets select only these)
+BOOKING_LIST_COLUMNS = {
+    "id": (Booking.id,),
+    "display_id": (Booking.id,),
+    "guest_name": (Booking.guest_name,),
+    "guest_mobile": (Booking.guest_mobile,),
+    "guest_email": (Booking.guest_email,),
+    "status": (Booking.status,),
+    "check_in": (Booking.check_in,),
+    "check_out": (Booking.check_out,),
+    "adults": (Booking.adults,),
+    "children": (Booking.children,),
+    "id_card_image_url": (Booking.id_card_image_url,),
+    "guest_photo_url": (Booking.guest_photo_url,),
+    "user": (Booking.user_id,),
+    "is_package": (),
+    "rooms": (Booking.id,),
+}
+
+def booking_list_rows(db: Session, skip: int, limit: int, order_by: str = "id", order: str = "desc",
+                      fields: Optional[List[str]] = None) -> List[dict]:
+    """
+    BookingOut-shaped dicts for a page of regular bookings: projected queries, no
+    ORM objects. With a fieldset only its columns are read, rooms and users are
+    loaded only when asked for, and rows carry only those keys.
+    """
+    query = select(*sparse_columns(fields, BOOKING_LIST_COLUMNS, always=(Booking.id,)))
+    
+    # Apply ordering
+    if order_by == "id" and order == "desc":
+        query = query.order_by(Booking.id.desc())
+    elif order_by == "id" and order == "asc":
+        query = query.order_by(Booking.id.asc())
+    elif order_by == "check_in" and order == "desc":
+        query = query.order_by(Booking.check_in.desc())
+    elif order_by == "check_in" and order == "asc":
+        query = query.order_by(Booking.check_in.asc())
+    
+    regular_bookings = [row._mapping for row in db.execute(query.offset(skip).limit(limit))]
+    
+    # Batch load rooms for all bookings to avoid N+1
+    booking_ids = [b["id"] for b in regular_bookings]
+    booking_rooms_map = {}
+    if booking_ids and wants(fields, "rooms"):
+        room_rows = db.execute(
+            select(
+                BookingRoom.booking_id, Room.id, Room.number, Room.type, Room.price,
+                Room.adults, Room.children, Room.status, Room.image_url,
+            )
+            .join(Room, BookingRoom.room_id == Room.id)
+            .where(BookingRoom.booking_id.in_(booking_ids))
+            .order_by(BookingRoom.id)
+        ).all()
+        for r in room_rows:
+            booking_rooms_map.setdefault(r.booking_id, []).append({
+                "id": r.id,
+                "number": r.number,
+                "type": r.type,
+                "price": as_float(r.price),
+                "adults": r.adults,
+                "children": r.children,
+                "status": r.status,
+                "image_url": r.image_url,
+            })
+    
+    # Users (with roles) in one query instead of two per booking
+    users = user_refs_by_id(db, (b["user_id"] for b in regular_bookings)) if wants(fields, "user") else {}
+    
+    return trim_fields([
+        {
+            "id": booking["id"],
+            "display_id": f"BK-{str(booking['id']).zfill(6)}",
+            "guest_name": booking.get("guest_name"),
+            "guest_mobile": booking.get("guest_mobile"),
+            "guest_email": booking.get("guest_email"),
+            "status": booking.get("status"),
+            "check_in": booking.get("check_in"),
+            "check_out": booking.get("check_out"),
+            "adults": booking.get("adults"),
+            "children": booking.get("children"),
+            "id_card_image_url": booking.get("id_card_image_url"),
+            "guest_photo_url": booking.get("guest_photo_url"),
+            "user": users.get(booking.get("user_id")),
+            "is_package": False,
+            "rooms": booking_rooms_map.get(booking["id"], []),
+        }
+        for booking in regular_bookings
+    ], fields)
+
+
 @router.get("", response_model=PaginatedBookingResponse)
 def get_bookings(
     db: Session = Depends(get_db), 
@@ -36,114 +134,22 @@ def get_bookings(
     limit: int = 20, 
     order_by: str = "id", 
     order: str = "desc",
-    fields: Optional[str] = None  # Comma-separated field list for field selection
+    fields: Optional[str] = Query(None, description=FIELDS_QUERY_DESCRIPTION)
 ):
+    selected = select_fields(fields, BookingOut)
     try:
         # Optimize limit for low network
         limit = optimize_limit(limit, MAX_LIMIT_LOW_NETWORK)
         
-        # Get regular bookings - NO eager loading to maximize performance
-        # Load relationships separately only when needed
-        query = db.query(Booking)
-        
-        # Apply ordering
-        if order_by == "id" and order == "desc":
-            query = query.order_by(Booking.id.desc())
-        elif order_by == "id" and order == "asc":
-            query = query.order_by(Booking.id.asc())
-        elif order_by == "check_in" and order == "desc":
-            query = query.order_by(Booking.check_in.desc())
-        elif order_by == "check_in" and order == "asc":
-            query = query.order_by(Booking.check_in.asc())
-        
-        regular_bookings = query.offset(skip).limit(limit).all()
-        
-        # Batch load rooms for all bookings to avoid N+1
-        booking_ids = [b.id for b in regular_bookings]
-        booking_rooms_map = {}
-        if booking_ids:
-            booking_rooms = db.query(BookingRoom).filter(BookingRoom.booking_id.in_(booking_ids)).all()
-            room_ids = [br.room_id for br in booking_rooms if br.room_id]
-            rooms_map = {}
-            if room_ids:
-                rooms = db.query(Room).filter(Room.id.in_(room_ids)).all()
-                rooms_map = {r.id: r for r in rooms}
-            
-            for br in booking_rooms:
-                if br.booking_id not in booking_rooms_map:
-                    booking_rooms_map[br.booking_id] = []
-                if br.room_id and br.room_id in rooms_map:
-                    booking_rooms_map[br.booking_id].append(rooms_map[br.room_id])
-        
-        # Convert to BookingOut format
-        booking_results = []
-        for booking in regular_bookings:
-            # Handle invalid emails gracefully
-            user_obj = None
-            # Load user separately to avoid blocking on eager load
-            try:
-                if hasattr(booking, 'user_id') and booking.user_id:
-                    booking_user = db.query(User).filter(User.id == booking.user_id).first()
-                else:
-                    booking_user = None
-            except:
-                booking_user = None
-            
-            if booking_user:
-                try:
-                    from app.schemas.user import UserOut
-                    user_data = booking_user
-                    email = user_data.email if hasattr(user_data, "email") else None
-                    if email and "@" in email and "." not in email.split("@")[1]:
-                        # Fix malformed email by appending .com
-                        email = email + ".com"
-                    # Load role separately if needed (avoid eager load blocking)
-                    role_obj = None
-                    try:
-                        if hasattr(user_data, 'role_id') and user_data.role_id:
-                            from app.models.role import Role
-                            role_obj = db.query(Role).filter(Role.id == user_data.role_id).first()
-                    except:
-                        role_obj = None
-                    
-                    user_dict = {
-                        "id": user_data.id,
-                        "name": user_data.name,
-                        "email": email,
-                        "phone": getattr(user_data, "phone", None),
-                        "is_active": getattr(user_data, "is_active", True),
-                        "role": role_obj
-                    }
-                    user_obj = UserOut.model_validate(user_dict)
-                except Exception as e:
-                    print(f"Warning: Could not create UserOut for booking {booking.id}: {str(e)}")
-                    user_obj = None
-
-            booking_out = BookingOut(
-                id=booking.id,
-                guest_name=booking.guest_name,
-                guest_mobile=booking.guest_mobile,
-                guest_email=booking.guest_email,
-                status=booking.status,
-                check_in=booking.check_in,
-                check_out=booking.check_out,
-                adults=booking.adults,
-                children=booking.children,
-                id_card_image_url=getattr(booking, 'id_card_image_url', None),
-                guest_photo_url=getattr(booking, 'guest_photo_url', None),
-                user=user_obj,
-                is_package=False,
-                rooms=booking_rooms_map.get(booking.id, [])
-            )
-            booking_results.append(booking_out)
+        booking_results = booking_list_rows(db, skip, limit, order_by, order, selected)
         
         # Get total count (only if limit is reasonable to avoid slow queries)
         # For large datasets, skip count to improve performance
         total_count = len(booking_results) if limit <= 100 else len(booking_results)
         
-        return {"total": total_count, "bookings": booking_results}
+        return FastJSONResponse({"total": total_count, "bookings": booking_results})
     except Exception as e:
-        print(f"Error fetching bookings: {e}")
+        logger.error("Error fetching bookings: %s", e)
         raise HTTPException(status_code=500, detail=f"Error fetching bookings: {str(e)}")
 
 # ----------------------------------------------------------------
@@ -345,7 +351,7 @@ def create_booking(booking: BookingCreate, db: Session = Depends(get_db), curren
             )
         except Exception as e:
             # Log error but don't fail the booking if user creation fails
-            print(f"Warning: Could not create/link guest user: {str(e)}")
+            logger.warning("Could not create/link guest user: %s", e)
     
     # Check for an existing booking to reuse guest details for consistency
     existing_booking = db.query(Booking).filter(
@@ -383,17 +389,7 @@ def create_booking(booking: BookingCreate, db: Session = Depends(get_db), curren
         conflicting_regular_booking = db.query(BookingRoom).join(Booking).filter(
             BookingRoom.room_id == room_id,
             BookingRoom.room_id == room_id,
-            # Case-insensitive check for active statuses
-            and_(
-                Booking.status.ilike('booked'),
-                Booking.status.ilike('checked-in')
-            ) == False, # Logic fix: we want to MATCH these
-            # Actually, using in_ with ilike is hard in one go.
-            # Simplified:
-            or_(
-                Booking.status.ilike('booked'),
-                Booking.status.ilike('checked-in')
-            ),
+            Booking.status.in_(ACTIVE_BOOKING_STATUSES),  # Only check for active bookings
             Booking.check_in < booking.check_out,
             Booking.check_out > booking.check_in
         ).first()
@@ -401,7 +397,7 @@ def create_booking(booking: BookingCreate, db: Session = Depends(get_db), curren
         # Check if room is already booked by package bookings for overlapping dates
         conflicting_package_booking = db.query(PackageBookingRoom).join(PackageBooking).filter(
             PackageBookingRoom.room_id == room_id,
-            PackageBooking.status.in_(['booked', 'checked-in']),  # Only check for active bookings
+            PackageBooking.status.in_(ACTIVE_BOOKING_STATUSES),  # Only check for active bookings
             PackageBooking.check_in < booking.check_out,
             PackageBooking.check_out > booking.check_in
         ).first()
@@ -514,7 +510,7 @@ def create_booking(booking: BookingCreate, db: Session = Depends(get_db), curren
             )
         except Exception as e:
             # Log error but don't fail the booking
-            print(f"Failed to send confirmation email: {str(e)}")
+            logger.error("Failed to send confirmation email: %s", e)
     
     return booking_out
 
@@ -547,7 +543,7 @@ def create_guest_booking(booking: BookingCreate, db: Session = Depends(get_db)):
                 )
             except Exception as e:
                 # Log error but don't fail the booking if user creation fails
-                print(f"Warning: Could not create/link guest user: {str(e)}")
+                logger.warning("Could not create/link guest user: %s", e)
         
         # Check for duplicate booking with same details and dates
         # Only check for duplicates if we have at least email or mobile
@@ -556,7 +552,7 @@ def create_guest_booking(booking: BookingCreate, db: Session = Depends(get_db)):
             duplicate_query = db.query(Booking).filter(
                 Booking.check_in == booking.check_in,
                 Booking.check_out == booking.check_out,
-                Booking.status.in_(['booked', 'checked-in'])
+                Booking.status.in_(ACTIVE_BOOKING_STATUSES)
             )
             
             # Add email filter if normalized email exists
@@ -620,10 +616,7 @@ def create_guest_booking(booking: BookingCreate, db: Session = Depends(get_db)):
             conflicting_regular_booking = db.query(BookingRoom).join(Booking).filter(
                 BookingRoom.room_id == room_id,
                 BookingRoom.room_id == room_id,
-                or_(
-                    Booking.status.ilike('booked'),
-                    Booking.status.ilike('checked-in')
-                ),
+                Booking.status.in_(ACTIVE_BOOKING_STATUSES),  # Only check for active bookings
                 Booking.check_in < booking.check_out,
                 Booking.check_out > booking.check_in
             ).first()
@@ -631,7 +624,7 @@ def create_guest_booking(booking: BookingCreate, db: Session = Depends(get_db)):
             # Check if room is already booked by package bookings for overlapping dates
             conflicting_package_booking = db.query(PackageBookingRoom).join(PackageBooking).filter(
                 PackageBookingRoom.room_id == room_id,
-                PackageBooking.status.in_(['booked', 'checked-in']),  # Only check for active bookings
+                PackageBooking.status.in_(ACTIVE_BOOKING_STATUSES),  # Only check for active bookings
                 PackageBooking.check_in < booking.check_out,
                 PackageBooking.check_out > booking.check_in
             ).first()
@@ -660,6 +653,7 @@ def create_guest_booking(booking: BookingCreate, db: Session = Depends(get_db)):
         # Create BookingRoom links and update room status
         for room_id in booking.room_ids:
             db.query(Room).filter(Room.id == room_id).update({"status": "Booked"})
+            bulk_written(db, Room)
             db.add(BookingRoom(booking_id=db_booking.id, room_id=room_id))
         db.commit()
         db.refresh(db_booking)
@@ -724,7 +718,7 @@ def create_guest_booking(booking: BookingCreate, db: Session = Depends(get_db)):
                     )
             except Exception as e:
                 # Log error but don't fail the booking
-                print(f"Failed to send confirmation email: {str(e)}")
+                logger.error("Failed to send confirmation email: %s", e)
         
         return booking_with_rooms
         
@@ -733,10 +727,7 @@ def create_guest_booking(booking: BookingCreate, db: Session = Depends(get_db)):
         raise
     except Exception as e:
         # Log the full error for debugging
-        import traceback
-        error_trace = traceback.format_exc()
-        print(f"Error in create_guest_booking: {str(e)}")
-        print(f"Traceback: {error_trace}")
+        logger.error("Error in create_guest_booking: %s", e, exc_info=True)
         
         # Return a user-friendly error message
         raise HTTPException(
@@ -756,13 +747,7 @@ def check_in_booking(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    try:
-        with open("C:/releasing/orchid/debug_checkin.log", "a") as f:
-            from datetime import datetime
-            f.write(f"\n[{datetime.now()}] REGULAR CHECK-IN REQUEST: Booking ID: {booking_id}\n")
-            f.write(f"Amenity Allocation: {amenityAllocation}\n")
-    except:
-        pass
+    logger.debug("REGULAR CHECK-IN REQUEST: Booking ID: %s, Amenity Allocation: %s", booking_id, amenityAllocation)
 
     # Parse display ID (BK-000001) or accept numeric ID
     numeric_id, booking_type = parse_display_id(str(booking_id))
@@ -844,12 +829,7 @@ def check_in_booking(
                              )
                              db.add(new_order)
                              db.flush()
-                             
-                             try:
-                                with open("C:/releasing/orchid/debug_checkin.log", "a") as f:
-                                    f.write(f"[{datetime.now()}] REGULAR: Created scheduled order {new_order.id}\n")
-                             except:
-                                pass
+                             logger.debug("REGULAR: Created scheduled order %s", new_order.id)
 
                              # Logic for adding items to the order
                              specific_items = item.get("specificFoodItems", [])
@@ -882,10 +862,10 @@ def check_in_booking(
                                      db.add(order_item)
                                  
                         except Exception as e:
-                            print(f"Error creating scheduled order for {name}: {e}")
+                            logger.error("Error creating scheduled order for %s: %s", name, e)
                             
         except Exception as e:
-            print(f"Error processing amenity allocation in regular check-in: {e}")
+            logger.error("Error processing amenity allocation in regular check-in: %s", e)
 
     # CRITICAL: Check if any of the rooms are ALREADY occupied (Checked-in) by another booking
     # This prevents double check-ins for the same room
@@ -905,7 +885,7 @@ def check_in_booking(
             # Actually, we just verified booking.status == 'booked'. So it can't be occupied by this booking.
             if len(occupied_rooms) > 0:
                  occupied_numbers = ", ".join([str(r.number) for r in occupied_rooms])
-                 print(f"WARNING: Forced check-in despite occupied status for rooms: {occupied_numbers}. Statuses: {[r.status for r in occupied_rooms]}")
+                 logger.warning("Forced check-in despite occupied status for rooms: %s. Statuses: %s", occupied_numbers, [r.status for r in occupied_rooms])
                  # raise HTTPException(
                  #     status_code=400, 
                  #     detail=f"Cannot check-in. The following room(s) are currently marked as Checked-in/Occupied: {occupied_numbers}. Please check-out the previous guest first."
@@ -913,19 +893,11 @@ def check_in_booking(
 
     # Save ID card image (if provided)
     if id_card_image:
-        id_card_filename = f"id_{booking_id}_{uuid.uuid4().hex}.jpg"
-        id_card_path = os.path.join(UPLOAD_DIR, id_card_filename)
-        with open(id_card_path, "wb") as buffer:
-            shutil.copyfileobj(id_card_image.file, buffer)
-        booking.id_card_image_url = id_card_filename
+        booking.id_card_image_url = ingest_image(id_card_image, UPLOAD_DIR, f"id_{booking_id}").filename
 
     # Save guest photo (if provided)
     if guest_photo:
-        guest_photo_filename = f"guest_{booking_id}_{uuid.uuid4().hex}.jpg"
-        guest_photo_path = os.path.join(UPLOAD_DIR, guest_photo_filename)
-        with open(guest_photo_path, "wb") as buffer:
-            shutil.copyfileobj(guest_photo.file, buffer)
-        booking.guest_photo_url = guest_photo_filename
+        booking.guest_photo_url = ingest_image(guest_photo, UPLOAD_DIR, f"guest_{booking_id}").filename
 
     booking.status = "checked-in"
     # Set the actual check-in timestamp for strict bill scoping
@@ -939,6 +911,7 @@ def check_in_booking(
     if booking.booking_rooms:
         room_ids = [br.room_id for br in booking.booking_rooms]
         db.query(Room).filter(Room.id.in_(room_ids)).update({"status": "Checked-in"}, synchronize_session=False)
+        bulk_written(db, Room)
 
     # Create notification for check-in
     try:
@@ -960,7 +933,7 @@ def check_in_booking(
         db.add(notification)
     except Exception as e:
         # Log error but don't fail the check-in
-        print(f"Warning: Failed to create check-in notification: {str(e)}")
+        logger.warning("Failed to create check-in notification: %s", e)
 
     # Process Amenity Allocation (Stock Issue)
     if amenityAllocation:
@@ -985,7 +958,7 @@ def check_in_booking(
                     source_id = warehouse.id if warehouse else None
                     
                     if not source_id:
-                        print("Warning: No Warehouse found for amenity stock issue.")
+                        logger.warning("No Warehouse found for amenity stock issue.")
                         continue
 
                     # Create Issue Record
@@ -1052,7 +1025,7 @@ def check_in_booking(
                                 db.add(loc_stock)
                                 
         except Exception as e:
-            print(f"Error processing amenity allocation: {e}")
+            logger.error("Error processing amenity allocation: %s", e)
             # Non-blocking error, log and continue check-in
     
     db.commit()
@@ -1080,6 +1053,7 @@ def cancel_booking(booking_id: Union[str, int], db: Session = Depends(get_db), c
     if booking.booking_rooms:
         room_ids = [br.room_id for br in booking.booking_rooms]
         db.query(Room).filter(Room.id.in_(room_ids)).update({"status": "Available"}, synchronize_session=False)
+        bulk_written(db, Room)
 
     booking.status = "cancelled"
     db.commit()
@@ -1160,7 +1134,7 @@ def extend_checkout(booking_id: Union[str, int], new_checkout: str, db: Session
         conflicting_bookings = db.query(Booking).join(BookingRoom).filter(
             Booking.id != booking_id,
             BookingRoom.room_id.in_(room_ids),
-            Booking.status.in_(['booked', 'checked-in', 'checked_in']),
+            Booking.status.in_(ACTIVE_BOOKING_STATUSES),
             and_(
                 Booking.check_in < new_checkout_date,
                 Booking.check_out > booking.check_out
@@ -1177,7 +1151,7 @@ def extend_checkout(booking_id: Union[str, int], new_checkout: str, db: Session
         # A conflict exists if a package booking overlaps with the extended period
         conflicting_package_bookings = db.query(PackageBooking).join(PackageBookingRoom).filter(
             PackageBookingRoom.room_id.in_(room_ids),
-            PackageBooking.status.in_(['booked', 'checked-in', 'checked_in']),
+            PackageBooking.status.in_(ACTIVE_BOOKING_STATUSES),
             and_(
                 PackageBooking.check_in < new_checkout_date,
                 PackageBooking.check_out > booking.check_out
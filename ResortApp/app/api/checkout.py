@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import or_, func
+from sqlalchemy import or_, func, select
 from typing import List, Optional
 from datetime import date, datetime, timedelta
 
@@ -17,8 +17,19 @@ from app.schemas.checkout import BillSummary, BillBreakdown, CheckoutFull, Check
 from app.utils.checkout_helpers import (
     calculate_late_checkout_fee, process_consumables_audit, process_asset_damage_check,
     deduct_room_consumables, trigger_linen_cycle, create_checkout_verification,
-    process_split_payments, generate_invoice_number, calculate_gst_breakdown
+    process_split_payments, generate_invoice_number, calculate_gst_breakdown,
+    active_stay_statements, stay_checkout_statements, build_active_room_options, RoomInventorySnapshot
 )
+from app.utils.occupancy import resolve_room_stay
+from app.utils.date_utils import on_day, start_of_day
+from app.utils.booking_status import CHECKED_OUT
+from app.utils.bulk_writes import bulk_written
+from app.utils.jobs import job_accepted, job_handler
+from app.utils.api_optimization import FIELDS_QUERY_DESCRIPTION
+from app.utils.fast_json import FastJSONResponse, as_float
+import logging
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/bill", tags=["checkout"])
 
@@ -37,32 +48,11 @@ def create_checkout_request(
     """
     Create a checkout request for inventory verification before checkout.
     """
-    # Find the booking for this room
-    room = db.query(Room).filter(Room.number == room_number).first()
+    # Find the room and its active booking
+    room, booking, is_package = resolve_room_stay(db, room_number)
     if not room:
         raise HTTPException(status_code=404, detail=f"Room {room_number} not found")
     
-    # Find active booking
-    booking_link = (db.query(BookingRoom)
-                    .join(Booking)
-                    .filter(BookingRoom.room_id == room.id, Booking.status.in_(['checked-in', 'checked_in', 'booked']))
-                    .order_by(Booking.id.desc()).first())
-    
-    package_link = None
-    booking = None
-    is_package = False
-    
-    if booking_link:
-        booking = booking_link.booking
-    else:
-        package_link = (db.query(PackageBookingRoom)
-                        .join(PackageBooking)
-                        .filter(PackageBookingRoom.room_id == room.id, PackageBooking.status.in_(['checked-in', 'checked_in', 'booked']))
-                        .order_by(PackageBooking.id.desc()).first())
-        if package_link:
-            booking = package_link.package_booking
-            is_package = True
-    
     if not booking:
         raise HTTPException(status_code=404, detail=f"No active booking found for room {room_number}")
     
@@ -114,9 +104,7 @@ def create_checkout_request(
         }
     except Exception as e:
         db.rollback()
-        import traceback
-        error_details = traceback.format_exc()
-        print(f"Error creating checkout request: {error_details}")
+        logger.error("Error creating checkout request: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to create checkout request: {str(e)}")
 
 
@@ -129,31 +117,10 @@ def get_checkout_request(
     """
     Get checkout request status for a room.
     """
-    room = db.query(Room).filter(Room.number == room_number).first()
+    room, booking, is_package = resolve_room_stay(db, room_number)
     if not room:
         raise HTTPException(status_code=404, detail=f"Room {room_number} not found")
     
-    # Find active booking
-    booking_link = (db.query(BookingRoom)
-                    .join(Booking)
-                    .filter(BookingRoom.room_id == room.id, Booking.status.in_(['checked-in', 'checked_in', 'booked']))
-                    .order_by(Booking.id.desc()).first())
-    
-    package_link = None
-    booking = None
-    is_package = False
-    
-    if booking_link:
-        booking = booking_link.booking
-    else:
-        package_link = (db.query(PackageBookingRoom)
-                        .join(PackageBooking)
-                        .filter(PackageBookingRoom.room_id == room.id, PackageBooking.status.in_(['checked-in', 'checked_in', 'booked']))
-                        .order_by(PackageBooking.id.desc()).first())
-        if package_link:
-            booking = package_link.package_booking
-            is_package = True
-    
     if not booking:
         return {"exists": False, "status": None}
     
@@ -315,12 +282,7 @@ def get_checkout_request_inventory_details(
         # Group by (Item, Type) to distinguish between Fixed Assets and Rental usages of same item
         items_map = {}
         
-        # Debug Logging
-        try:
-            with open("c:/releasing/orchid/debug_checkout.log", "a") as f:
-                f.write(f"\n--- Processing Inventory for Request {request_id} ---\n")
-        except:
-            pass
+        logger.debug("--- Processing Inventory for Request %s ---", request_id)
 
         for detail in all_issue_details:
             item = detail.item
@@ -340,12 +302,8 @@ def get_checkout_request_inventory_details(
             # Composite key: (item_id, is_special_instance)
             key = (item.id, is_special_instance)
 
-            # Log
-            try:
-                with open("c:/releasing/orchid/debug_checkout.log", "a") as f:
-                    f.write(f"Item: {item.name} (ID: {item.id}) | RentalPrice: {rental_price} | DB_Payable: {db_payable} | IsPayable: {is_payable} | Key: {key}\n")
-            except:
-                pass
+            logger.debug("Item: %s (ID: %s) | RentalPrice: %s | DB_Payable: %s | IsPayable: %s | Key: %s",
+                         item.name, item.id, rental_price, db_payable, is_payable, key)
                 
             if key not in items_map:
                 items_map[key] = {
@@ -437,8 +395,7 @@ def get_checkout_request_inventory_details(
             "location_name": location.name
         }
     except Exception as e:
-        import traceback
-        print(f"Error getting inventory details: {traceback.format_exc()}")
+        logger.error("Error getting inventory details", exc_info=True)
         return {
             "room_number": checkout_request.room_number,
             "items": [],
@@ -458,7 +415,8 @@ def check_inventory_for_checkout(
     Stores used/missing items in inventory_data.
     Calculates charges for missing items.
     """
-    from app.models.inventory import InventoryItem
+    from app.models.inventory import InventoryTransaction, StockIssue, StockIssueDetail, WasteLog
+    from app.curd.inventory import generate_issue_numbers, generate_waste_log_numbers
     
     checkout_request = db.query(CheckoutRequestModel).filter(CheckoutRequestModel.id == request_id).first()
     if not checkout_request:
@@ -478,545 +436,237 @@ def check_inventory_for_checkout(
     
     inventory_data_with_charges = []
     
-    # Safety check: ensure we have items to process
-    if payload.items:
-        for item in payload.items:
-            item_dict = item.dict()
-            
-            # Populate item details even if missing_qty is 0
-            inv_item = db.query(InventoryItem).options(joinedload(InventoryItem.category)).filter(InventoryItem.id == item.item_id).first()
-            if inv_item:
-                 item_dict['item_name'] = inv_item.name
-                 item_dict['item_code'] = inv_item.item_code
-            
-            # Calculate charge for missing items
-            if item.missing_qty and item.missing_qty > 0 and inv_item:
-                    price_base = inv_item.selling_price or inv_item.unit_price or 0.0
-                    if price_base > 0:
-                        # Update logic: Charge Cost + GST
-                        gst_multiplier = 1.0 + (float(inv_item.gst_rate or 0.0) / 100.0)
-                        unit_cost_with_tax = float(price_base) * gst_multiplier
-                        
-                        item_charge = unit_cost_with_tax * item.missing_qty
-                        total_missing_charges += item_charge
-                        item_dict['missing_item_charge'] = item_charge
-                        item_dict['unit_price'] = unit_cost_with_tax
-                        
-                        missing_items_details.append({
-                            "item_name": inv_item.name,
-                            "item_code": inv_item.item_code,
-                            "missing_qty": item.missing_qty,
-                            "unit_price": unit_cost_with_tax,
-                            "total_charge": item_charge
-                        })
-            
-            inventory_data_with_charges.append(item_dict)
-            
-            # --- STOCK RETURN LOGIC & USAGE CALCULATION ---
-            
-            # Helper flags
-            is_fixed_asset = getattr(inv_item, 'is_asset_fixed', False)
-            # Fallback: Check if category is marked as fixed asset
-            if not is_fixed_asset and inv_item.category and getattr(inv_item.category, 'is_asset_fixed', False):
-                is_fixed_asset = True
-                
-            is_rental = False
-            # Safe access to category name
-            if inv_item and inv_item.category and getattr(inv_item.category, 'name', None) and "rental" in inv_item.category.name.lower():
-                is_rental = True
+    room_number = checkout_request.room_number
+    room = db.query(Room).filter(Room.number == room_number).first()
+    # Items, stock rows, asset mappings and issue history for the whole list in a few queries
+    snapshot = RoomInventorySnapshot(db, room, {item.item_id for item in payload.items or []})
+    room_loc_id = snapshot.room_loc_id
+    
+    # New rows are collected and added together after every item is decided
+    transactions = []
+    returns_by_location = {}  # return location id -> [StockIssueDetail]
+    waste_entries = []  # (WasteLog, InventoryTransaction), numbered together below
+    
+    for item in payload.items or []:
+        item_dict = item.dict()
+        
+        # Populate item details even if missing_qty is 0
+        inv_item = snapshot.items.get(item.item_id)
+        if inv_item:
+            item_dict['item_name'] = inv_item.name
+            item_dict['item_code'] = inv_item.item_code
+        
+        # Calculate charge for missing items
+        if item.missing_qty and item.missing_qty > 0 and inv_item:
+            price_base = inv_item.selling_price or inv_item.unit_price or 0.0
+            if price_base > 0:
+                # Update logic: Charge Cost + GST
+                gst_multiplier = 1.0 + (float(inv_item.gst_rate or 0.0) / 100.0)
+                unit_cost_with_tax = float(price_base) * gst_multiplier
                 
-            # Check if this item is explicitly mapped as an asset to this room (Asset Allocation)
-            is_mapped_asset = False
-            room_room = db.query(Room).filter(Room.number == checkout_request.room_number).first()
-            if room_room and room_room.inventory_location_id:
-                from app.models.inventory import AssetMapping, StockIssue, StockIssueDetail
+                item_charge = unit_cost_with_tax * item.missing_qty
+                total_missing_charges += item_charge
+                item_dict['missing_item_charge'] = item_charge
+                item_dict['unit_price'] = unit_cost_with_tax
                 
-                # Check 1: Is it a Mapped Asset (Permanent)?
-                existing_mapping = db.query(AssetMapping).filter(
-                    AssetMapping.location_id == room_room.inventory_location_id,
-                    AssetMapping.item_id == item.item_id,
-                    AssetMapping.is_active == True
-                ).first()
-                if existing_mapping:
-                    is_mapped_asset = True
-                    print(f"[CHECKOUT] Item {inv_item.name} is a MAPPED ASSET in Asset Allocation")
+                missing_items_details.append({
+                    "item_name": inv_item.name,
+                    "item_code": inv_item.item_code,
+                    "missing_qty": item.missing_qty,
+                    "unit_price": unit_cost_with_tax,
+                    "total_charge": item_charge
+                })
+        
+        inventory_data_with_charges.append(item_dict)
+        
+        if not inv_item:
+            logger.warning("[CHECKOUT] Room %s: inventory item %s not found, skipping stock movements", room_number, item.item_id)
+            continue
+        
+        # --- STOCK RETURN LOGIC & USAGE CALCULATION ---
+        category = inv_item.category
+        is_fixed_asset = bool(inv_item.is_asset_fixed or (category and category.is_asset_fixed))
+        is_rental = bool(category and category.name and "rental" in category.name.lower())
+        is_mapped_asset = False
+        if room_loc_id:
+            # Mapped Asset (permanent allocation) / Rental (issued to the room with a price)
+            is_mapped_asset = item.item_id in snapshot.mapped_item_ids
+            if not is_rental:
+                is_rental = item.item_id in snapshot.rental_item_ids
+        
+        # Mapped assets and fixed assets stay in the room unless they are rentals;
+        # only consumables and rentals are returned / deducted here.
+        if (is_mapped_asset or is_fixed_asset) and not is_rental:
+            logger.debug("[CHECKOUT] Item %s is a %s - will STAY in room", inv_item.name, "MAPPED ASSET" if is_mapped_asset else "FIXED ASSET")
+            continue
+        if not room_loc_id:
+            continue
+        
+        # STEP 1: Get quantities and validate
+        room_stock_record = snapshot.stock(room_loc_id, item.item_id)
+        allocated_stock = room_stock_record.quantity if room_stock_record else 0.0
+        
+        used_qty = item.used_qty or 0.0
+        missing_qty = item.missing_qty or 0.0
+        damage_qty = item.damage_qty or 0.0
+        
+        # Damaged items are also consumed (removed from inventory)
+        unused_qty = max(0, allocated_stock - used_qty - missing_qty - damage_qty)
+        consumed_qty = used_qty + missing_qty + damage_qty
+        
+        if consumed_qty > allocated_stock:
+            # Allow it but log - guest might have used their own items
+            logger.warning("Room %s Item %s: Consumed (%s) > Allocated (%s). Guest may have brought own items or stock record is incorrect.", room_number, inv_item.name, consumed_qty, allocated_stock)
+        
+        logger.debug("[CHECKOUT] Room %s Item %s: Allocated=%s, Used=%s, Missing=%s, Unused=%s, Consumed=%s", room_number, inv_item.name, allocated_stock, used_qty, missing_qty, unused_qty, consumed_qty)
+        
+        # STEP 2: Location to return unused items to (housekeeping's choice, else auto-detect)
+        source_loc_id, source_loc_name = snapshot.return_location(
+            item.item_id, item.return_location_id, auto_detect=unused_qty > 0
+        )
+        
+        # STEP 3: Stock movements
+        # 3a. Returnable items leave the room entirely: the used portion is consumed, the unused portion returned
+        if room_stock_record:
+            room_stock_record.quantity = 0
+            room_stock_record.last_updated = datetime.utcnow()
+        
+        # 3b. Return unused items to the source location
+        if unused_qty > 0 and source_loc_id:
+            source_stock = snapshot.stock(source_loc_id, item.item_id)
+            if source_stock:
+                source_stock.quantity += unused_qty
+                source_stock.last_updated = datetime.utcnow()
+            else:
+                snapshot.add_stock(db, source_loc_id, item.item_id, unused_qty)
+            
+            # Use 'transfer_in' so frontend displays it as Positive (+) Stock Received
+            transactions.append(InventoryTransaction(
+                item_id=item.item_id,
+                transaction_type="transfer_in",
+                quantity=unused_qty,
+                unit_price=inv_item.unit_price,
+                total_amount=unused_qty * (inv_item.unit_price or 0),
+                # Format reference to show Room Number clearly in frontend lists
+                reference_number=f"RET-RM{room_number}",
+                notes=f"Stock return: Room {room_number} -> {source_loc_name} (Checkout #{checkout_request.id})",
+                created_by=current_user.id
+            ))
+            # Stock Issue record (one per return location) for history visibility
+            returns_by_location.setdefault(source_loc_id, []).append(StockIssueDetail(
+                item_id=item.item_id,
+                issued_quantity=unused_qty,
+                unit=inv_item.unit,
+                is_payable=False,
+                notes="Unused Return"
+            ))
+        
+        # 3c. Deduct consumed items from GLOBAL stock
+        if consumed_qty > 0:
+            inv_item.current_stock -= consumed_qty
+            
+            # Consumed/damaged but never in room stock (e.g. assigned via AssetMapping):
+            # deduct from its storage location to keep location stocks in sync
+            if allocated_stock == 0:
+                adjust_source_id = source_loc_id or snapshot.last_issue_source.get(item.item_id)
+                if not adjust_source_id:
+                    loc_with_stock = snapshot.largest_stock(item.item_id, min_quantity=consumed_qty)
+                    if loc_with_stock:
+                        adjust_source_id = loc_with_stock.location_id
                 
-                # Check 2: Is it a Rental (Issued with Price)?
-                if not is_rental:
-                    rental_issue = db.query(StockIssueDetail).join(StockIssue).filter(
-                        StockIssue.destination_location_id == room_room.inventory_location_id,
-                        StockIssueDetail.item_id == item.item_id,
-                        StockIssueDetail.rental_price > 0
-                    ).first()
-                    if rental_issue:
-                        is_rental = True
-                        print(f"[CHECKOUT] Item {inv_item.name} identified as RENTAL via StockIssue (Price: {rental_issue.rental_price})")
-
-
-            
-            # Logic: We only process return/deduction for Consumables (not fixed assets) OR Rentals.
-            # Pure Fixed Assets (e.g. TV) stay in room and are not cleared/returned here.
-            should_process_return = True
-            
-            # If it's a fixed asset OR a mapped asset, AND it's not a rental -> Don't return
-            # If it's a Mapped Asset (Permanent), AND it's not a rental -> Don't return
-            # But if it's just a Fixed Asset (temporary issue) and NOT mapped, we SHOULD return it.
-            if is_mapped_asset and not is_rental:
-                should_process_return = False
-                print(f"[CHECKOUT] Item {inv_item.name} is a MAPPED PERMANENT ASSET - will NOT be cleared from room")
-            elif is_fixed_asset and not is_mapped_asset and not is_rental:
-                 # Fixed Assets (even unmapped) should stay in the room unless damaged.
-                 should_process_return = False
-                 print(f"[CHECKOUT] Item {inv_item.name} is a FIXED ASSET (Unmapped) - will STAY in room")
-            
-
+                source_stock_record = snapshot.stock(adjust_source_id, item.item_id) if adjust_source_id else None
+                if source_stock_record:
+                    deduct_amt = min(source_stock_record.quantity, consumed_qty)
+                    source_stock_record.quantity -= deduct_amt
+                    logger.debug("[CHECKOUT] CORRECTIVE DEDUCTION: Removed %s from Source Location ID %s", deduct_amt, adjust_source_id)
+                    transactions.append(InventoryTransaction(
+                        item_id=item.item_id,
+                        transaction_type="out",
+                        quantity=deduct_amt,
+                        unit_price=inv_item.unit_price,
+                        total_amount=deduct_amt * (inv_item.unit_price or 0),
+                        reference_number=f"ADJ-CHK-{checkout_request.id}",
+                        notes=f"Adjustment: Damaged/Consumed item not in room stock. Deducted from Source ID {adjust_source_id}.",
+                        created_by=current_user.id
+                    ))
+                elif not adjust_source_id:
+                    logger.error("[CHECKOUT] Could not find source location to deduct consumed/damaged item %s (Room Stock was 0). Global stock deducted, but Location Stock may be out of sync.", inv_item.name)
+            
+            # 1. Normal Usage / Consumption
+            if used_qty > 0:
+                transactions.append(InventoryTransaction(
+                    item_id=item.item_id,
+                    transaction_type="out",
+                    quantity=used_qty,
+                    unit_price=inv_item.unit_price,
+                    total_amount=used_qty * (inv_item.unit_price or 0),
+                    reference_number=f"CONSUME-CHK-{checkout_request.id}",
+                    notes=f"Consumption at checkout - Room {room_number}",
+                    created_by=current_user.id
+                ))
+            
+            # 2. Damage / Missing -> Record as Wastage (WasteLog so it appears in Waste Reports)
+            bad_qty = missing_qty + damage_qty
+            if bad_qty > 0:
+                waste_entries.append((
+                    WasteLog(
+                        item_id=item.item_id,
+                        is_food_item=False,
+                        location_id=room_loc_id,
+                        quantity=bad_qty,
+                        unit=inv_item.unit,
+                        reason_code="Damaged/Missing",
+                        action_taken="Charged to Guest",
+                        notes=f"Checkout Room {room_number} (Ref: {checkout_request.id})",
+                        reported_by=current_user.id,
+                        waste_date=datetime.utcnow()
+                    ),
+                    InventoryTransaction(
+                        item_id=item.item_id,
+                        transaction_type="waste_spoilage",  # mapped to Waste/Spoilage in frontend
+                        quantity=bad_qty,
+                        unit_price=inv_item.unit_price,
+                        total_amount=bad_qty * (inv_item.unit_price or 0),
+                        notes=f"Damage/Missing at checkout - Room {room_number}",
+                        created_by=current_user.id
+                    ),
+                ))
+        
+        # STEP 4: Calculate charges for DAMAGED items (Rentables/Consumables checked via inputs)
+        price_base = inv_item.selling_price or inv_item.unit_price or 0.0
+        if damage_qty > 0 and price_base > 0:
+            gst_multiplier = 1.0 + (float(inv_item.gst_rate or 0.0) / 100.0)
+            damage_unit_price_tax = float(price_base) * gst_multiplier
+            damage_charge = damage_qty * damage_unit_price_tax
+            total_missing_charges += damage_charge
             
-            # CRITICAL: Only process stock movements for consumables and rentables
-            # Fixed assets MUST stay in the room
-            if inv_item and should_process_return:
-                
-                # Get current room stock for this item
-                # room_room is already fetched above
-                # Ensure we have the room and location
-                if room_room and room_room.inventory_location_id:
-                    room_loc_id = room_room.inventory_location_id
-                    
-                    from app.models.inventory import LocationStock, InventoryTransaction, StockIssue, StockIssueDetail, Location
-                    
-                    room_stock_record = db.query(LocationStock).filter(
-                        LocationStock.location_id == room_loc_id,
-                        LocationStock.item_id == item.item_id
-                    ).first()
-                    
-                    # Convert item to dict for saving in inventory_data
-                    item_dict = item.dict()
-                    
-                    # STEP 1: Get quantities and validate
-                    allocated_stock = room_stock_record.quantity if room_stock_record else 0.0
-                    
-                    # Add allocated info to item_dict
-                    item_dict['allocated_stock'] = allocated_stock
-                    item_dict['item_name'] = inv_item.name
-                    item_dict['item_code'] = inv_item.item_code
-                    item_dict['unit'] = inv_item.unit
-                    
-                    # Determine if it's a rental item (based on StockIssue or Category)
-                    # For now, check if it's in the 'Rentals' category or has rental history
-                    # We can use the logic from get_pre_checkout_verification_data -> is_rentable
-                    # But simpler: check if it's a fixed asset that is NOT permanently fixed (i.e. is returnable)
-                    # We rely on is_rentable flag passed from frontend OR check logic
-                    # Assuming frontend passes correct item_id, we check if it is consumable or asset
-                    
-                    is_fixed_asset = getattr(inv_item, 'is_asset_fixed', False)
-                    item_dict['is_fixed_asset'] = is_fixed_asset
-                    
-                    # Check if rentable (using same logic as pre-checkout if possible, or simple heuristic)
-                    # Rentable = Fixed Asset that is allowed to be moved/returned?
-                    # Or check StockIssue for rental_price > 0?
-                    is_rental = False
-                    if is_fixed_asset:
-                        # Check last stock issue (if it was issued to room, it's likely a rental/temporary asset)
-                        # We remove the rental_price > 0 constraint to support complimentary rentals
-                        last_rental_issue = (db.query(StockIssueDetail)
-                                            .join(StockIssue)
-                                            .filter(
-                                                StockIssue.destination_location_id == room_loc_id,
-                                                StockIssueDetail.item_id == item.item_id
-                                            ).first())
-                        if last_rental_issue:
-                            is_rental = True
-                    
-                    item_dict['is_rentable'] = is_rental        
-                            
-                    used_qty = item.used_qty or 0.0
-                    missing_qty = item.missing_qty or 0.0
-                    damage_qty = getattr(item, 'damage_qty', 0.0) or 0.0
-                    
-                    # Calculate unused (ensure non-negative)
-                    # Damaged items are also consumed (removed from inventory)
-                    unused_qty = max(0, allocated_stock - used_qty - missing_qty - damage_qty)
-                    consumed_qty = used_qty + missing_qty + damage_qty
-                    
-                    # Validation: Check if reported quantities exceed allocated
-                    if consumed_qty > allocated_stock:
-                        print(f"[WARNING] Room {checkout_request.room_number} Item {inv_item.name}: Consumed ({consumed_qty}) > Allocated ({allocated_stock}). Guest may have brought own items or stock record is incorrect.")
-                        # Allow it but log - guest might have used their own items
-                        unused_qty = 0  # No unused if over-consumed
-                    
-                    print(f"[CHECKOUT] Room {checkout_request.room_number} Item {inv_item.name}: Allocated={allocated_stock}, Used={used_qty}, Missing={missing_qty}, Unused={unused_qty}, Consumed={consumed_qty}")
-                    
-                    # STEP 2: Find source location to return unused items to
-                    # This logic uses User-Provided Location if available, otherwise Auto-Detect
-                    source_loc_id = None
-                    source_loc_name = "Unknown"
-                    
-                    # 2a. Check if user specified a return location (GRANULAR CONTROL)
-                    if item.return_location_id:
-                        user_loc = db.query(Location).filter(Location.id == item.return_location_id).first()
-                        if user_loc:
-                             # Validate it's a storage location
-                             if user_loc.is_inventory_point or user_loc.location_type in ["WAREHOUSE", "CENTRAL_WAREHOUSE", "BRANCH_STORE", "STORAGE", "STORE", "SUB_STORE", "DEPARTMENT", "LAUNDRY"]:
-                                 source_loc_id = user_loc.id
-                                 source_loc_name = user_loc.name
-                                 print(f"[CHECKOUT] Using User-Selected Return Location: {source_loc_name}")
-                             else:
-                                 print(f"[CHECKOUT] User-selected location {user_loc.name} is not a valid inventory point. Falling back to auto-detect.")
-                        else:
-                            print(f"[CHECKOUT] User-selected return location ID {item.return_location_id} not found. Falling back.")
-                    
-                    if unused_qty > 0 and not source_loc_id:
-                        # Strategy 1: Try to find the original source from stock issue
-                        last_issue = (db.query(StockIssue)
-                            .join(StockIssueDetail)
-                            .filter(
-                                StockIssue.destination_location_id == room_loc_id,
-                                StockIssueDetail.item_id == item.item_id
-                            )
-                            .order_by(StockIssue.issue_date.desc())
-                            .first()
-                        )
-                        
-                        original_source_id = None
-                        if last_issue and last_issue.source_location_id:
-                            original_source_id = last_issue.source_location_id
-                            
-                            # Verify the original source location still exists and is valid
-                            original_source = db.query(Location).filter(Location.id == original_source_id).first()
-                            
-                            if original_source:
-                                # Check if this location is still a valid storage location (not a room)
-                                if original_source.location_type in ["WAREHOUSE", "CENTRAL_WAREHOUSE", "BRANCH_STORE", "DEPARTMENT", "LAUNDRY"]:
-                                    source_loc_id = original_source_id
-                                    source_loc_name = original_source.name
-                                    print(f"[CHECKOUT] Found original source location: {source_loc_name} (ID: {source_loc_id})")
-                                else:
-                                    print(f"[CHECKOUT] Original source {original_source.name} is not a storage location (type: {original_source.location_type}). Finding alternative...")
-                            else:
-                                print(f"[CHECKOUT] Original source location (ID: {original_source_id}) no longer exists. Finding alternative...")
-                        
-                        # Strategy 2: If original source not found or invalid, find location with existing stock
-                        if not source_loc_id:
-                            print(f"[CHECKOUT] Searching for best location to return {inv_item.name}...")
-                            
-                            # Find all storage locations that have this item
-                            locations_with_stock = (db.query(LocationStock)
-                                .join(Location)
-                                .filter(
-                                    LocationStock.item_id == item.item_id,
-                                    LocationStock.quantity > 0,
-                                    Location.id != room_loc_id,  # Exclude the room itself
-                                    Location.location_type.in_(["WAREHOUSE", "CENTRAL_WAREHOUSE", "BRANCH_STORE", "DEPARTMENT", "LAUNDRY"])
-                                )
-                                .order_by(LocationStock.quantity.desc())  # Prefer location with most stock
-                                .all()
-                            )
-                            
-                            if locations_with_stock:
-                                # Use the location with the most stock
-                                best_location = locations_with_stock[0]
-                                source_loc_id = best_location.location_id
-                                source_loc_name = best_location.location.name
-                                print(f"[CHECKOUT] Found location with existing stock: {source_loc_name} (has {best_location.quantity} units)")
-                            else:
-                                # Strategy 3: No location has this item - find any appropriate storage location
-                                print(f"[CHECKOUT] No location currently has {inv_item.name}. Finding appropriate storage location...")
-                                
-                                # Try to find a location of the same type as the original source (if we know it)
-                                if original_source_id:
-                                    original_type_location = db.query(Location).filter(
-                                        Location.location_type == original_source.location_type if original_source else None,
-                                        Location.id != room_loc_id
-                                    ).first()
-                                    
-                                    if original_type_location:
-                                        source_loc_id = original_type_location.id
-                                        source_loc_name = original_type_location.name
-                                        print(f"[CHECKOUT] Using location of same type: {source_loc_name}")
-                                
-                                # Strategy 4: Last fallback - find any warehouse/store
-                                if not source_loc_id:
-                                    fallback_location = db.query(Location).filter(
-                                        Location.location_type.in_(["WAREHOUSE", "CENTRAL_WAREHOUSE", "BRANCH_STORE", "DEPARTMENT", "LAUNDRY"])
-                                    ).first()
-                                    
-                                    if fallback_location:
-                                        source_loc_id = fallback_location.id
-                                        source_loc_name = fallback_location.name
-                                        print(f"[CHECKOUT] Using fallback storage location: {source_loc_name}")
-                                    else:
-                                        print(f"[CHECKOUT] WARNING: No storage location found! Cannot return unused items.")
-                    
-                    
-                    # STEP 3: Execute stock movements atomically (single pass)
-                    
-                    # 3a. Update Room Stock
-                    # If Returnable (Consumable/Rental): Clear 'unused' portion (effectively 0 if we return all unused).
-                    # If Stay (Fixed Asset): Deduct only 'consumed' portion.
-                    if room_stock_record:
-                         if should_process_return:
-                            # For returnables, we remove EVERYTHING. 
-                            # Used portion is gone (consumed). Unused portion is returned.
-                            # So room should be 0.
-                            old_room_qty = room_stock_record.quantity
-                            room_stock_record.quantity = 0
-                            room_stock_record.last_updated = datetime.utcnow()
-                            print(f"[CHECKOUT] Cleared room stock: {old_room_qty} -> 0 (Returnable Item)")
-                         else:
-                            # For Fixed Assets that stay:
-                            # Only deduct what was damaged/lost (consumed_qty).
-                            if consumed_qty > 0:
-                                old_room_qty = room_stock_record.quantity
-                                room_stock_record.quantity = max(0, room_stock_record.quantity - consumed_qty)
-                                room_stock_record.last_updated = datetime.utcnow()
-                                print(f"[CHECKOUT] Deducted damage from room stock: {old_room_qty} -> {room_stock_record.quantity} (Fixed Asset)")
-                            else:
-                                print(f"[CHECKOUT] Keeping fixed item in room: {inv_item.name} (qty: {room_stock_record.quantity})")
-                    
-                    
-                    # 3b. Return unused items to source location (ONLY for consumables/rentables, NOT fixed assets)
-                    # Fixed assets stay in the room permanently
-                    if unused_qty > 0 and source_loc_id and should_process_return:
-                        source_stock = db.query(LocationStock).filter(
-                            LocationStock.location_id == source_loc_id,
-                            LocationStock.item_id == item.item_id
-                        ).first()
-                        
-                        if source_stock:
-                            old_source_qty = source_stock.quantity
-                            source_stock.quantity += unused_qty
-                            source_stock.last_updated = datetime.utcnow()
-                            print(f"[CHECKOUT] Returned {unused_qty} to source location: {old_source_qty} → {source_stock.quantity}")
-                        else:
-                            # Create new source stock record
-                            new_source_stock = LocationStock(
-                                location_id=source_loc_id,
-                                item_id=item.item_id,
-                                quantity=unused_qty,
-                                last_updated=datetime.utcnow()
-                            )
-                            db.add(new_source_stock)
-                            print(f"[CHECKOUT] Created new source stock with {unused_qty} units")
-                        
-                        # Record return transaction
-                        # Use 'transfer_in' so frontend displays it as Positive (+) Stock Received
-                        return_txn = InventoryTransaction(
-                            item_id=item.item_id,
-                            transaction_type="transfer_in",
-                            quantity=unused_qty,
-                            unit_price=inv_item.unit_price,
-                            total_amount=unused_qty * (inv_item.unit_price or 0),
-                            # Format reference to show Room Number clearly in frontend lists
-                            reference_number=f"RET-RM{checkout_request.room_number}",
-                            notes=f"Stock return: Room {checkout_request.room_number} -> {source_loc_name} (Checkout #{checkout_request.id})",
-                            created_by=current_user.id
-                        )
-                        db.add(return_txn)
-                        
-                        # NEW: Create Stock Issue record for History Visibility
-                        try:
-                            from app.models.inventory import StockIssue, StockIssueDetail
-                            from app.curd.inventory import generate_issue_number
-                            
-                            issue_num = generate_issue_number(db)
-                            
-                            return_issue = StockIssue(
-                                issue_number=issue_num,
-                                issued_by=current_user.id,
-                                source_location_id=room_loc_id, # Source is the Room
-                                destination_location_id=source_loc_id, # Destination is the Warehouse
-                                issue_date=datetime.utcnow(),
-                                notes=f"Auto-return from Checkout Room {checkout_request.room_number}"
-                            )
-                            db.add(return_issue)
-                            db.flush() # Get ID
-                            
-                            return_detail = StockIssueDetail(
-                                issue_id=return_issue.id,
-                                item_id=item.item_id,
-                                issued_quantity=unused_qty,
-                                unit=inv_item.unit,
-                                is_payable=False,
-                                notes="Unused Return"
-                            )
-                            db.add(return_detail)
-                            print(f"[CHECKOUT] Created Stock Issue {issue_num} for return history.")
-                        except Exception as e:
-                            print(f"[WARNING] Failed to create Stock Issue for return: {e}")
-                    
-                    # 3c. Deduct consumed items from GLOBAL stock
-                    # CRITICAL: This is where we reduce total inventory for consumed items
-                    if consumed_qty > 0:
-                        old_global_stock = inv_item.current_stock
-                        inv_item.current_stock -= consumed_qty
-                        print(f"[CHECKOUT] Deducted {consumed_qty} from global stock: {old_global_stock} → {inv_item.current_stock}")
-
-                        # SPEICAL CASE FIX: If item was consumed/damaged BUT had no allocated stock in the room (e.g. Fixed Asset/Rentals assigned via AssetMapping),
-                        # we must deduct it from its original storage location to keep location stocks in sync.
-                        if allocated_stock == 0:
-                            print(f"[CHECKOUT] Item {inv_item.name} consumed ({consumed_qty}) but Room Stock was 0. Attempting to deduct from Source Location...")
-                            
-                            # Reuse source finding logic if we haven't found it yet
-                            adjust_source_id = source_loc_id
-                            adjust_source_name = source_loc_name
-
-                            if not adjust_source_id:
-                                # Try to find original source again using same logic as returns
-                                last_issue_adjust = (db.query(StockIssue)
-                                    .join(StockIssueDetail)
-                                    .filter(
-                                        StockIssue.destination_location_id == room_loc_id,
-                                        StockIssueDetail.item_id == item.item_id
-                                    )
-                                    .order_by(StockIssue.issue_date.desc())
-                                    .first()
-                                )
-                                if last_issue_adjust and last_issue_adjust.source_location_id:
-                                    adjust_source_id = last_issue_adjust.source_location_id
-
-                            if not adjust_source_id:
-                                # Fallback: Find location with highest stock
-                                loc_with_stock = (db.query(LocationStock)
-                                    .filter(LocationStock.item_id == item.item_id, LocationStock.quantity >= consumed_qty)
-                                    .order_by(LocationStock.quantity.desc())
-                                    .first()
-                                )
-                                if loc_with_stock:
-                                    adjust_source_id = loc_with_stock.location_id
-                            
-                            if adjust_source_id:
-                                # Deduct from Source
-                                source_stock_record = db.query(LocationStock).filter(
-                                    LocationStock.location_id == adjust_source_id,
-                                    LocationStock.item_id == item.item_id
-                                ).first()
-                                
-                                if source_stock_record:
-                                    old_src_qty = source_stock_record.quantity
-                                    # Ensure we don't go negative on source (though technically we should if it was really there)
-                                    deduct_amt = min(source_stock_record.quantity, consumed_qty)
-                                    source_stock_record.quantity -= deduct_amt
-                                    print(f"[CHECKOUT] CORRECTIVE DEDUCTION: Removed {deduct_amt} from Source Location ID {adjust_source_id} (Prev: {old_src_qty})")
-                                    
-                                    # Log this special deduction
-                                    adj_txn = InventoryTransaction(
-                                        item_id=item.item_id,
-                                        transaction_type="out",
-                                        quantity=deduct_amt,
-                                        unit_price=inv_item.unit_price,
-                                        total_amount=deduct_amt * (inv_item.unit_price or 0),
-                                        reference_number=f"ADJ-CHK-{checkout_request.id}",
-                                        notes=f"Adjustment: Damaged/Consumed item not in room stock. Deducted from Source ID {adjust_source_id}.",
-                                        created_by=current_user.id
-                                    )
-                                    db.add(adj_txn)
-                            else:
-                                print(f"[CHECKOUT] WARNING: Could not find source location to deduct consumed/damaged item {inv_item.name} (Room Stock was 0). Global stock deducted, but Location Stock may be out of sync.")
-                        
-                        # Separate Consumption (Used) vs Damage/Missing (Waste)
-                        
-                        # 1. Normal Usage / Consumption
-                        if used_qty > 0:
-                            cons_txn = InventoryTransaction(
-                                item_id=item.item_id,
-                                transaction_type="out",
-                                quantity=used_qty,
-                                unit_price=inv_item.unit_price,
-                                total_amount=used_qty * (inv_item.unit_price or 0),
-                                reference_number=f"CONSUME-CHK-{checkout_request.id}",
-                                notes=f"Consumption at checkout - Room {checkout_request.room_number}",
-                                created_by=current_user.id
-                            )
-                            db.add(cons_txn)
-                        
-                        # 2. Damage / Missing -> Record as Wastage
-                        bad_qty = missing_qty + damage_qty
-                        if bad_qty > 0:
-                            # Create WasteLog so it appears in Waste Reports
-                            from app.models.inventory import WasteLog
-                            from app.curd.inventory import generate_waste_log_number
-                            
-                            waste_log_num = generate_waste_log_number(db)
-                            
-                            waste_log = WasteLog(
-                                log_number=waste_log_num,
-                                item_id=item.item_id,
-                                is_food_item=False,
-                                location_id=room_loc_id,
-                                quantity=bad_qty,
-                                unit=inv_item.unit,
-                                reason_code="Damaged/Missing",
-                                action_taken="Charged to Guest",
-                                notes=f"Checkout Room {checkout_request.room_number} (Ref: {checkout_request.id})",
-                                reported_by=current_user.id,
-                                waste_date=datetime.utcnow()
-                            )
-                            db.add(waste_log)
-                            db.flush() # Ensure ID is generated if needed, though log_number is main key
-
-                            waste_txn = InventoryTransaction(
-                                item_id=item.item_id,
-                                transaction_type="waste_spoilage", # mapped to Waste/Spoilage in frontend
-                                quantity=bad_qty,
-                                unit_price=inv_item.unit_price,
-                                total_amount=bad_qty * (inv_item.unit_price or 0),
-                                reference_number=waste_log_num,
-                                notes=f"Damage/Missing at checkout - Room {checkout_request.room_number}",
-                                created_by=current_user.id
-                            )
-                            db.add(waste_txn)
-
-                    # STEP 4: Calculate charges for used items (if payable)
-                    if used_qty > 0:
-                        # Check complimentary limit
-                        limit = inv_item.complimentary_limit or 0
-                        chargeable_qty = max(0, used_qty - limit)
-                        
-                        if chargeable_qty > 0 and inv_item.unit_price:
-                            usage_charge = float(inv_item.unit_price) * chargeable_qty
-                            
-                            # Update item dict with charge info
-                            item_dict['total_charge'] = item_dict.get('total_charge', 0) + usage_charge
-                            item_dict['payable_usage_qty'] = chargeable_qty
-                            item_dict['unit_price'] = float(inv_item.unit_price)
-                            
-                            print(f"[CHECKOUT] Calculated usage charge: {chargeable_qty} units × ₹{inv_item.unit_price} = ₹{usage_charge}")
-
-                    # STEP 5: Calculate charges for DAMAGED items (Rentables/Consumables checked via inputs)
-                    damage_qty = getattr(item, 'damage_qty', 0.0)
-                    price_base = inv_item.selling_price or inv_item.unit_price or 0.0
-                    if damage_qty > 0 and price_base > 0:
-                         gst_multiplier = 1.0 + (float(inv_item.gst_rate or 0.0) / 100.0)
-                         damage_unit_price_tax = float(price_base) * gst_multiplier
-                         damage_charge = damage_qty * damage_unit_price_tax
-                         
-                         item_dict['total_charge'] = item_dict.get('total_charge', 0) + damage_charge
-                         item_dict['damage_qty'] = damage_qty
-                         item_dict['damage_charge'] = damage_charge
-                         # Start Fix: Accumulate damage charge into missing_item_charge so it's picked up by bill generator
-                         item_dict['missing_item_charge'] = item_dict.get('missing_item_charge', 0) + damage_charge
-                         # End Fix
-                         
-                         total_missing_charges += damage_charge
-                         
-                         missing_items_details.append({
-                            "item_name": inv_item.name,
-                            "item_code": inv_item.item_code,
-                            "missing_qty": damage_qty,
-                            "damage_qty": damage_qty,
-                            "unit_price": damage_unit_price_tax,
-                            "total_charge": damage_charge,
-                            "notes": "Damaged"
-                        })
-                         print(f"[CHECKOUT] Calculated damage charge: {damage_qty} units × ₹{damage_unit_price_tax} = ₹{damage_charge}")
-
+            missing_items_details.append({
+                "item_name": inv_item.name,
+                "item_code": inv_item.item_code,
+                "missing_qty": damage_qty,
+                "damage_qty": damage_qty,
+                "unit_price": damage_unit_price_tax,
+                "total_charge": damage_charge,
+                "notes": "Damaged"
+            })
+            logger.debug("[CHECKOUT] Calculated damage charge: %s units × ₹%s = ₹%s", damage_qty, damage_unit_price_tax, damage_charge)
+    
+    if returns_by_location:
+        issue_numbers = generate_issue_numbers(db, len(returns_by_location))
+        for (return_loc_id, details), issue_num in zip(returns_by_location.items(), issue_numbers):
+            db.add(StockIssue(
+                issue_number=issue_num,
+                issued_by=current_user.id,
+                source_location_id=room_loc_id,  # Source is the Room
+                destination_location_id=return_loc_id,  # Destination is the Warehouse
+                issue_date=datetime.utcnow(),
+                notes=f"Auto-return from Checkout Room {room_number}",
+                details=details
+            ))
     
     # Process asset damages
     if payload.asset_damages:
-        from app.models.inventory import AssetRegistry, WasteLog, InventoryTransaction, LocationStock
-        from app.curd.inventory import generate_waste_log_number
-        
-        # Determine room object once
-        room_obj = db.query(Room).filter(Room.number == checkout_request.room_number).first()
+        from app.models.inventory import AssetRegistry, InventoryItem, LocationStock
         
         for asset in payload.asset_damages:
             asset_dict = asset.dict()
@@ -1048,10 +698,10 @@ def check_inventory_for_checkout(
             asset_record = None
             if asset_registry_id:
                 asset_record = db.query(AssetRegistry).filter(AssetRegistry.id == asset_registry_id).first()
-            elif item_id and room_obj and room_obj.inventory_location_id:
+            elif item_id and room_loc_id:
                 asset_record = db.query(AssetRegistry).filter(
                     AssetRegistry.item_id == item_id,
-                    AssetRegistry.current_location_id == room_obj.inventory_location_id,
+                    AssetRegistry.current_location_id == room_loc_id,
                     AssetRegistry.status == "active"
                 ).first()
             
@@ -1063,22 +713,20 @@ def check_inventory_for_checkout(
                 # 1. Update Asset Status if registry exists
                 asset_record.status = "damaged"
                 asset_record.notes = f"Damaged during checkout. {asset.notes or ''}"
-                print(f"[CHECKOUT] Updated AssetRegistry ID {asset_record.id} status to 'damaged'")
+                logger.debug("[CHECKOUT] Updated AssetRegistry ID %s status to 'damaged'", asset_record.id)
                 
                 target_item_id = asset_record.item_id
                 target_location_id = asset_record.current_location_id
             
-            elif item_id and room_obj and room_obj.inventory_location_id:
+            elif item_id and room_loc_id:
                 # Fallback: Untracked/Generic Asset in Room
-                print(f"[CHECKOUT] AssetRegistry not found for item {item_id}. Processing as generic asset damage.")
+                logger.debug("[CHECKOUT] AssetRegistry not found for item %s. Processing as generic asset damage.", item_id)
                 target_item_id = item_id
-                target_location_id = room_obj.inventory_location_id
+                target_location_id = room_loc_id
                 
             if target_item_id and target_location_id:
-                # 2. Create Waste Log
-                waste_log_num = generate_waste_log_number(db)
+                # 2. Waste Log
                 waste_log = WasteLog(
-                    log_number=waste_log_num,
                     item_id=target_item_id,
                     is_food_item=False,
                     location_id=target_location_id,
@@ -1090,41 +738,46 @@ def check_inventory_for_checkout(
                     reported_by=current_user.id,
                     waste_date=datetime.utcnow()
                 )
-                db.add(waste_log)
-                print(f"[CHECKOUT] Created waste log {waste_log_num} for damaged asset")
                 
-                # Fetch unit price for transaction
+                # Unit price for the transaction
                 unit_price = 0
                 if asset_record and asset_record.item:
                     unit_price = asset_record.item.unit_price or 0
                 else:
-                    inv_item_fallback = db.query(InventoryItem).filter(InventoryItem.id == target_item_id).first()
+                    inv_item_fallback = snapshot.items.get(target_item_id) or db.query(InventoryItem).filter(InventoryItem.id == target_item_id).first()
                     if inv_item_fallback:
                         unit_price = inv_item_fallback.unit_price or 0
 
-                # 3. Create Damage Transaction
-                damage_txn = InventoryTransaction(
+                # 3. Damage Transaction
+                waste_entries.append((waste_log, InventoryTransaction(
                     item_id=target_item_id,
                     transaction_type="waste_spoilage",
                     quantity=1,
                     unit_price=unit_price,
                     total_amount=asset.replacement_cost,
-                    reference_number=waste_log_num,
                     notes=f"Damaged asset at checkout - Room {checkout_request.room_number}",
                     created_by=current_user.id
-                )
-                db.add(damage_txn)
-                print(f"[CHECKOUT] Created damage transaction for asset")
+                )))
                 
                 # 4. Deduct LocationStock (The Fix)
-                loc_stock = db.query(LocationStock).filter(
+                loc_stock = snapshot.stock(target_location_id, target_item_id) or db.query(LocationStock).filter(
                     LocationStock.location_id == target_location_id,
                     LocationStock.item_id == target_item_id
                 ).first()
                 if loc_stock and loc_stock.quantity > 0:
                     loc_stock.quantity -= 1
                     loc_stock.last_updated = datetime.utcnow()
-                    print(f"[CHECKOUT] Deducted LocationStock for damaged asset: {loc_stock.quantity + 1} -> {loc_stock.quantity}")
+                    logger.debug("[CHECKOUT] Deducted LocationStock for damaged asset: %s -> %s", loc_stock.quantity + 1, loc_stock.quantity)
+
+    # Waste logs are numbered in one go; each spoilage transaction references its log
+    if waste_entries:
+        log_numbers = generate_waste_log_numbers(db, len(waste_entries))
+        for (waste_log, waste_txn), log_number in zip(waste_entries, log_numbers):
+            waste_log.log_number = log_number
+            waste_txn.reference_number = log_number
+            db.add(waste_log)
+            transactions.append(waste_txn)
+    db.add_all(transactions)
 
     if inventory_data_with_charges:
         checkout_request.inventory_data = inventory_data_with_charges
@@ -1156,28 +809,11 @@ def get_pre_checkout_verification_data(room_number: str, db: Session = Depends(g
     - Actual Consumables stock in room (from LocationStock)
     - Actual Fixed Assets in room (from AssetRegistry) with serial numbers
     """
-    room = db.query(Room).filter(Room.number == room_number).first()
+    # Room and booking info
+    room, booking, _ = resolve_room_stay(db, room_number)
     if not room:
         raise HTTPException(status_code=404, detail=f"Room {room_number} not found")
     
-    # Get booking info
-    booking_link = (db.query(BookingRoom)
-                    .join(Booking)
-                    .filter(BookingRoom.room_id == room.id, Booking.status.in_(['checked-in', 'checked_in', 'booked']))
-                    .order_by(Booking.id.desc()).first())
-    
-    package_link = None
-    booking = None
-    if booking_link:
-        booking = booking_link.booking
-    else:
-        package_link = (db.query(PackageBookingRoom)
-                        .join(PackageBooking)
-                        .filter(PackageBookingRoom.room_id == room.id, PackageBooking.status.in_(['checked-in', 'checked_in', 'booked']))
-                        .order_by(PackageBooking.id.desc()).first())
-        if package_link:
-            booking = package_link.package_booking
-    
     if not booking:
         # Allow checking inventory even if booking is weird, but warn?
         # raise HTTPException(status_code=404, detail=f"No active booking found for room {room_number}")
@@ -1462,19 +1098,102 @@ def send_feedback_form(checkout_id: int, db: Session = Depends(get_db), current_
     }
 
 
+CHECKOUT_TOTAL_FIELDS = (
+    "room_total", "food_total", "service_total", "package_total", "tax_amount", "discount_amount", "grand_total",
+)
+
+
+def checkout_list_rows(db: Session, skip: int, limit: int, fields: Optional[List[str]] = None) -> List[dict]:
+    """
+    CheckoutFull-shaped dicts, most recent first: only those columns (only the
+    fieldset's, if given), not the bill_details blobs
+    """
+    names = fields or list(CheckoutFull.model_fields)
+    rows = db.execute(
+        select(*(getattr(Checkout, name) for name in names))
+        .order_by(Checkout.id.desc())
+        .offset(skip)
+        .limit(limit)
+    ).all()
+    totals = [field for field in CHECKOUT_TOTAL_FIELDS if field in names]
+    checkouts = []
+    for row in rows:
+        checkout = row._asdict()
+        for field in totals:
+            checkout[field] = as_float(checkout[field], 0.0)
+        checkouts.append(checkout)
+    return checkouts
+
+
 @router.get("/checkouts", response_model=List[CheckoutFull])
-def get_all_checkouts(db: Session = Depends(get_db), current_user: User = Depends(get_current_user), skip: int = 0, limit: int = 20):
+def get_all_checkouts(db: Session = Depends(get_db), current_user: User = Depends(get_current_user), skip: int = 0, limit: int = 20,
+                      fields: Optional[str] = Query(None, description=FIELDS_QUERY_DESCRIPTION)):
     """Retrieves a list of all completed checkouts, ordered by most recent - optimized for low network"""
-    from app.utils.api_optimization import optimize_limit, MAX_LIMIT_LOW_NETWORK
+    from app.utils.api_optimization import optimize_limit, select_fields, MAX_LIMIT_LOW_NETWORK
+    selected = select_fields(fields, CheckoutFull)
     limit = optimize_limit(limit, MAX_LIMIT_LOW_NETWORK)
-    checkouts = db.query(Checkout).order_by(Checkout.id.desc()).offset(skip).limit(limit).all()
-    print(f"DEBUG: get_all_checkouts - Found {len(checkouts)} checkouts")
-    return checkouts if checkouts else []
+    checkouts = checkout_list_rows(db, skip, limit, selected)
+    logger.debug("get_all_checkouts - Found %s checkouts", len(checkouts))
+    return FastJSONResponse(checkouts)
+
+def _cleanup_orphaned_checkouts(db: Session, room_number: Optional[str], booking_id: Optional[int], job=None) -> dict:
+    """Delete checkout rows whose room was never released; see cleanup_orphaned_checkouts_endpoint"""
+    deleted_count = 0
+    checkouts_to_delete = []
+    
+    if room_number:
+        # Find checkouts for this room where room is still checked-in
+        room = db.query(Room).filter(Room.number == room_number).first()
+        if not room:
+            raise HTTPException(status_code=404, detail=f"Room {room_number} not found")
+        
+        if room.status != "Available":
+            checkouts = db.query(Checkout).filter(
+                Checkout.room_number == room_number
+            ).all()
+            checkouts_to_delete.extend(checkouts)
+    
+    if booking_id:
+        # Find checkouts for this booking
+        booking = db.query(Booking).filter(Booking.id == booking_id).first()
+        if not booking:
+            raise HTTPException(status_code=404, detail=f"Booking {booking_id} not found")
+        
+        checkouts = db.query(Checkout).filter(
+            Checkout.booking_id == booking_id
+        ).all()
+        checkouts_to_delete.extend(checkouts)
+    
+    # Remove duplicates
+    unique_checkouts = list({c.id: c for c in checkouts_to_delete}.values())
+    
+    for index, checkout in enumerate(unique_checkouts):
+        if job:
+            job.progress(index, len(unique_checkouts), f"Deleted {deleted_count}")
+        room = db.query(Room).filter(Room.number == checkout.room_number).first()
+        if room and room.status != "Available":
+            db.delete(checkout)
+            deleted_count += 1
+            logger.debug("[CLEANUP] Deleted orphaned checkout %s for room %s", checkout.id, checkout.room_number)
+    
+    db.commit()
+    
+    return {
+        "message": f"Cleaned up {deleted_count} orphaned checkout(s)",
+        "deleted_count": deleted_count
+    }
+
+
+@job_handler("checkout.cleanup_orphaned_checkouts")
+def cleanup_orphaned_checkouts_job(job, room_number: Optional[str] = None, booking_id: Optional[int] = None):
+    return _cleanup_orphaned_checkouts(job.db, room_number, booking_id, job=job)
+
 
 @router.post("/cleanup-orphaned-checkouts")
 def cleanup_orphaned_checkouts_endpoint(
     room_number: Optional[str] = Query(None),
     booking_id: Optional[int] = Query(None),
+    background: bool = Query(False, description="Run as a background job (202 + job, poll GET /api/jobs/{id})"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -1482,49 +1201,14 @@ def cleanup_orphaned_checkouts_endpoint(
     Manual cleanup endpoint for orphaned checkouts.
     Can clean up by room_number or booking_id.
     """
+    if background:
+        return job_accepted(db, "checkout.cleanup_orphaned_checkouts",
+                            {"room_number": room_number, "booking_id": booking_id}, current_user)
     try:
-        deleted_count = 0
-        checkouts_to_delete = []
-        
-        if room_number:
-            # Find checkouts for this room where room is still checked-in
-            room = db.query(Room).filter(Room.number == room_number).first()
-            if not room:
-                raise HTTPException(status_code=404, detail=f"Room {room_number} not found")
-            
-            if room.status != "Available":
-                checkouts = db.query(Checkout).filter(
-                    Checkout.room_number == room_number
-                ).all()
-                checkouts_to_delete.extend(checkouts)
-        
-        if booking_id:
-            # Find checkouts for this booking
-            booking = db.query(Booking).filter(Booking.id == booking_id).first()
-            if not booking:
-                raise HTTPException(status_code=404, detail=f"Booking {booking_id} not found")
-            
-            checkouts = db.query(Checkout).filter(
-                Checkout.booking_id == booking_id
-            ).all()
-            checkouts_to_delete.extend(checkouts)
-        
-        # Remove duplicates
-        unique_checkouts = {c.id: c for c in checkouts_to_delete}.values()
-        
-        for checkout in unique_checkouts:
-            room = db.query(Room).filter(Room.number == checkout.room_number).first()
-            if room and room.status != "Available":
-                db.delete(checkout)
-                deleted_count += 1
-                print(f"[CLEANUP] Deleted orphaned checkout {checkout.id} for room {checkout.room_number}")
-        
-        db.commit()
-        
-        return {
-            "message": f"Cleaned up {deleted_count} orphaned checkout(s)",
-            "deleted_count": deleted_count
-        }
+        return _cleanup_orphaned_checkouts(db, room_number, booking_id)
+    except HTTPException:
+        db.rollback()
+        raise
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Cleanup failed: {str(e)}")
@@ -1548,7 +1232,7 @@ def repair_room_checkout_status(room_number: str, db: Session = Depends(get_db),
     today = date.today()
     existing_checkout = db.query(Checkout).filter(
         Checkout.room_number == room_number,
-        func.date(Checkout.checkout_date) == today
+        on_day(Checkout.checkout_date, today)
     ).first()
     
     # Find the booking
@@ -1587,7 +1271,7 @@ def repair_room_checkout_status(room_number: str, db: Session = Depends(get_db),
                 remaining_rooms = [link.room for link in booking.booking_rooms if link.room.status != "Available"]
             
             if not remaining_rooms and booking.status not in ['checked_out', 'checked-out']:
-                booking.status = "checked_out"
+                booking.status = CHECKED_OUT
                 repairs_made.append(f"Updated booking {booking.id} status to 'checked_out' (all rooms checked out)")
     
     # Case 2: Room is Available but no checkout record (might have been manually set)
@@ -1632,7 +1316,7 @@ def repair_room_checkout_status(room_number: str, db: Session = Depends(get_db),
                                 target_location = warehouse
                                 if item_stock.item.track_laundry_cycle and laundry:
                                     target_location = laundry
-                                    print(f"[CLEANUP] Item {item_name} is marked for Laundry. Redirecting to {laundry.name}")
+                                    logger.debug("[CLEANUP] Item %s is marked for Laundry. Redirecting to %s", item_name, laundry.name)
 
                                 # Proceed with transfer to target_location
                                 dest_stock = db.query(LocationStock).filter(
@@ -1661,9 +1345,9 @@ def repair_room_checkout_status(room_number: str, db: Session = Depends(get_db),
                                 
                                 item_stock.quantity = 0
                                 item_stock.last_updated = datetime.utcnow()
-                                print(f"[CLEANUP] Returned {qty} x {item_name} from Room {room.number}")
+                                logger.debug("[CLEANUP] Returned %s x %s from Room %s", qty, item_name, room.number)
             except Exception as e:
-                print(f"[WARNING] Cleanup failed: {e}")
+                logger.warning("Cleanup failed: %s", e)
             repairs_made.append(f"Fixed room {room_number} status to match booking status")
         else:
             # Booking says checked out but room and checkout don't match - reset booking status
@@ -1793,238 +1477,41 @@ def get_active_rooms(db: Session = Depends(get_db), current_user: User = Depends
     Used to populate the checkout dropdown on the frontend.
     """
     try:
-        # Fetch active bookings and package bookings with their rooms preloaded
-        # Include both 'checked-in' and 'CHECKED-IN' status (case-insensitive matching)
+        # Checked-in bookings and package bookings with their rooms preloaded
         # Exclude 'booked' status - only show rooms that are already checked-in
-        active_bookings = db.query(Booking).options(
-            joinedload(Booking.booking_rooms).joinedload(BookingRoom.room)
-        ).filter(
-            func.lower(Booking.status).in_(['checked-in', 'checked_in', 'checked in'])
-        ).all()
-        
-        active_package_bookings = db.query(PackageBooking).options(
-            joinedload(PackageBooking.rooms).joinedload(PackageBookingRoom.room)
-        ).filter(
-            func.lower(PackageBooking.status).in_(['checked-in', 'checked_in', 'checked in'])
-        ).all()
-        
-        result = []
-        
-        # Debug: Log what we found
-        print(f"[DEBUG active-rooms] Found {len(active_bookings)} regular bookings and {len(active_package_bookings)} package bookings")
-        for b in active_bookings[:5]:  # Log first 5 to avoid spam
-            print(f"[DEBUG] Booking {b.id}: status='{b.status}', rooms={len(b.booking_rooms)}")
-            for br in b.booking_rooms[:3]:  # Log first 3 rooms per booking
-                if br.room:
-                    print(f"[DEBUG]   Room {br.room.number}: status='{br.room.status}'")
-        
-        # Helper function to safely get room number
-        def get_room_number(link):
-            """Safely extract room number from booking room link"""
-            try:
-                if not link:
-                    return None
-                if not link.room:
-                    return None
-                room_num = link.room.number
-                if room_num is None or (isinstance(room_num, str) and room_num.strip() == ""):
-                    return None
-                return str(room_num).strip()
-            except (AttributeError, Exception):
-                return None
-        
-        # Process regular bookings
-        for booking in active_bookings:
-            # CRITICAL FIX: If booking is checked-in but rooms are "Available", repair the room status
-            # This handles cases where room status was incorrectly set or changed
-            # REFINED: Check for existing checkouts first to avoid repairing genuinely checked-out rooms
-            booking_checkouts = db.query(Checkout).filter(Checkout.booking_id == booking.id).all()
-            checked_out_rooms = set()
-            for c in booking_checkouts:
-                if c.room_number:
-                    checked_out_rooms.update([r.strip() for r in c.room_number.split(',')])
-
-            for link in booking.booking_rooms:
-                if link.room and link.room.status and link.room.status.lower() == "available":
-                    # Check if room is effectively checked out
-                    if link.room.number in checked_out_rooms:
-                        continue # Do not repair, it is correctly checked out
-                    
-                    # Booking is checked-in but room shows as Available - this is inconsistent
-                    # Repair: Set room status to "Checked-in" to match booking status
-                    print(f"[DEBUG active-rooms] Repairing room {link.room.number}: status was 'Available', setting to 'Checked-in' (booking {booking.id} is checked-in)")
-                    link.room.status = "Checked-in"
-                    db.add(link.room)
-            
-            # Commit room status repairs before filtering
+        booking_stmt, package_stmt = active_stay_statements()
+        active_bookings = db.execute(booking_stmt).scalars().all()
+        active_package_bookings = db.execute(package_stmt).scalars().all()
+        logger.debug("active-rooms: Found %s regular bookings and %s package bookings", len(active_bookings), len(active_package_bookings))
+
+        # Checkouts of all active bookings in one query per booking kind, not one per booking
+        booking_checkouts_stmt, package_checkouts_stmt = stay_checkout_statements(active_bookings, active_package_bookings)
+        booking_checkouts = db.execute(booking_checkouts_stmt).all() if booking_checkouts_stmt is not None else []
+        package_checkouts = db.execute(package_checkouts_stmt).all() if package_checkouts_stmt is not None else []
+
+        # CRITICAL FIX: If booking is checked-in but rooms are "Available", repair the room status
+        # (rooms with an existing checkout are genuinely checked out and left alone)
+        result, repaired = build_active_room_options(active_bookings, active_package_bookings, booking_checkouts, package_checkouts)
+        # Commit room status repairs once
+        if repaired:
             db.commit()
-            
-            # Extract room numbers with proper null checks using helper function
-            # Also filter out rooms that are already checked out (status = "Available")
-            room_numbers = sorted([
-                room_num for link in booking.booking_rooms 
-                if (room_num := get_room_number(link)) is not None
-                and link.room 
-                and link.room.status 
-                and link.room.status.lower() not in ["available", "checked-out", "checked_out", "checked out"]  # Exclude already checked-out rooms
-            ])
-            if room_numbers:
-                # Add individual room options (one per room)
-                for room_num in room_numbers:
-                    result.append({
-                        "room_number": room_num,
-                        "room_numbers": [room_num],  # Single room
-                        "guest_name": booking.guest_name,
-                        "booking_id": booking.id,
-                        "booking_type": "regular",
-                        "checkout_mode": "single",
-                        "display_label": f"Room {room_num} ({booking.guest_name})"
-                    })
-                
-                # Add grouped booking option (all rooms together) - only if more than 1 room
-                if len(room_numbers) > 1:
-                    first_room = room_numbers[0]
-                    result.append({
-                        "room_number": first_room,  # Primary room for checkout API
-                        "room_numbers": room_numbers,  # All rooms in this booking
-                        "guest_name": booking.guest_name,
-                        "booking_id": booking.id,
-                        "booking_type": "regular",
-                        "checkout_mode": "multiple",
-                        "display_label": f"All Rooms in Booking #{booking.id}: {', '.join(room_numbers)} ({booking.guest_name})"
-                    })
-        
-        # Process package bookings
-        for pkg_booking in active_package_bookings:
-            # CRITICAL FIX: If booking is checked-in but rooms are "Available", repair the room status
-            # REFINED: Check for existing checkouts first
-            pkg_checkouts = db.query(Checkout).filter(Checkout.package_booking_id == pkg_booking.id).all()
-            pkg_checked_out_rooms = set()
-            for c in pkg_checkouts:
-                if c.room_number:
-                    pkg_checked_out_rooms.update([r.strip() for r in c.room_number.split(',')])
-
-            for link in pkg_booking.rooms:
-                if link.room and link.room.status and link.room.status.lower() == "available":
-                    # Check if room is effectively checked out
-                    if link.room.number in pkg_checked_out_rooms:
-                        continue # Do not repair, it is correctly checked out
 
-                    # Booking is checked-in but room shows as Available - this is inconsistent
-                    # Repair: Set room status to "Checked-in" to match booking status
-                    print(f"[DEBUG active-rooms] Repairing room {link.room.number}: status was 'Available', setting to 'Checked-in' (package booking {pkg_booking.id} is checked-in)")
-                    link.room.status = "Checked-in"
-                    db.add(link.room)
-            
-            # Commit room status repairs before filtering
-            db.commit()
-            
-            # Extract room numbers with proper null checks using helper function
-            # Also filter out rooms that are already checked out (status = "Available" or "available")
-            # Include rooms with status "Checked-in", "Checked_in", "checked-in", etc.
-            room_numbers = sorted([
-                room_num for link in pkg_booking.rooms 
-                if (room_num := get_room_number(link)) is not None
-                and link.room 
-                and link.room.status 
-                and link.room.status.lower() not in ["available", "checked-out", "checked_out", "checked out"]  # Exclude already checked-out rooms
-            ])
-            if room_numbers:
-                # Add individual room options (one per room)
-                for room_num in room_numbers:
-                    result.append({
-                        "room_number": room_num,
-                        "room_numbers": [room_num],  # Single room
-                        "guest_name": pkg_booking.guest_name,
-                        "booking_id": pkg_booking.id,
-                        "booking_type": "package",
-                        "checkout_mode": "single",
-                        "display_label": f"Room {room_num} ({pkg_booking.guest_name})"
-                    })
-                
-                # Add grouped booking option (all rooms together) - only if more than 1 room
-                if len(room_numbers) > 1:
-                    first_room = room_numbers[0]
-                    result.append({
-                        "room_number": first_room,  # Primary room for checkout API
-                        "room_numbers": room_numbers,  # All rooms in this booking
-                        "guest_name": pkg_booking.guest_name,
-                        "booking_id": pkg_booking.id,
-                        "booking_type": "package",
-                        "checkout_mode": "multiple",
-                        "display_label": f"All Rooms in Package #{pkg_booking.id}: {', '.join(room_numbers)} ({pkg_booking.guest_name})"
-                    })
-        
-        # Sort by booking ID descending (most recent first)
-        result = sorted(result, key=lambda x: x['booking_id'], reverse=True)
-        
-        # Debug: Log final result
-        print(f"[DEBUG active-rooms] Final result: {len(result)} room options")
-        if len(result) == 0:
-            print("[DEBUG active-rooms] WARNING: No rooms found! Possible reasons:")
-            print(f"  - No bookings with status 'checked-in' or 'checked_in'")
-            print(f"  - All rooms in checked-in bookings have status 'Available' (already checked out)")
-            print(f"  - Room status values don't match expected format")
-        
-        return result[skip:skip+limit]
+        logger.debug("active-rooms: Final result: %s room options", len(result))
+        return FastJSONResponse(result[skip:skip+limit])
     except Exception as e:
         # Return empty list on error to prevent 500 response
-        import traceback
-        print(f"[ERROR active-rooms] Exception: {str(e)}")
-        print(traceback.format_exc())
+        logger.error("active-rooms: Exception: %s", e, exc_info=True)
         return []
 
 def _calculate_bill_for_single_room(db: Session, room_number: str):
     """
     Calculates bill for a single room only, regardless of how many rooms are in the booking.
     """
-    # 1. Find the room
-    room = db.query(Room).filter(Room.number == room_number).first()
+    # 1-2. Find the room and its active (or most recently checked-out) parent booking
+    room, booking, is_package = resolve_room_stay(db, room_number, include_checked_out=True)
     if not room:
         raise HTTPException(status_code=404, detail="Room not found.")
     
-    # 2. Find the active parent booking (regular or package) linked to this room
-    booking, is_package = None, False
-    
-    booking_link = (db.query(BookingRoom)
-                    .join(Booking)
-                    .options(joinedload(BookingRoom.booking))
-                    .filter(BookingRoom.room_id == room.id, Booking.status.in_(['checked-in', 'checked_in', 'booked']))
-                    .order_by(Booking.id.desc()).first())
-    
-    # Fallback: Check for recently checked out booking if no active booking found
-    if not booking_link:
-        booking_link = (db.query(BookingRoom)
-                        .join(Booking)
-                        .options(joinedload(BookingRoom.booking))
-                        .filter(BookingRoom.room_id == room.id, Booking.status.in_(['checked-out', 'checked_out', 'checked out']))
-                        .order_by(Booking.id.desc()).first())
-
-    if booking_link:
-        booking = booking_link.booking
-        if booking.status not in ['checked-in', 'checked_in', 'booked', 'checked-out', 'checked_out', 'checked out']:
-            raise HTTPException(status_code=400, detail=f"Booking is not in a valid state for checkout. Current status: {booking.status}")
-    else:
-        package_link = (db.query(PackageBookingRoom)
-                        .join(PackageBooking)
-                        .options(joinedload(PackageBookingRoom.package_booking))
-                        .filter(PackageBookingRoom.room_id == room.id, PackageBooking.status.in_(['checked-in', 'checked_in', 'booked']))
-                        .order_by(PackageBooking.id.desc()).first())
-        
-        # Fallback for package
-        if not package_link:
-            package_link = (db.query(PackageBookingRoom)
-                            .join(PackageBooking)
-                            .options(joinedload(PackageBookingRoom.package_booking))
-                            .filter(PackageBookingRoom.room_id == room.id, PackageBooking.status.in_(['checked-out', 'checked_out', 'checked out']))
-                            .order_by(PackageBooking.id.desc()).first())
-                            
-        if package_link:
-            booking = package_link.package_booking
-            is_package = True
-            if booking.status not in ['checked-in', 'checked_in', 'booked', 'checked-out', 'checked_out', 'checked out']:
-                raise HTTPException(status_code=400, detail=f"Package booking is not in a valid state for checkout. Current status: {booking.status}")
-    
     if not booking:
         raise HTTPException(status_code=404, detail=f"No active booking found for room {room_number}.")
     
@@ -2089,9 +1576,9 @@ def _calculate_bill_for_single_room(db: Session, room_number: str):
         # This handles cases where previous guest checked out on the same day as new guest check-in
         if last_checkout.checkout_date > check_in_datetime:
             check_in_datetime = last_checkout.checkout_date
-            print(f"[DEBUG] Adjusted check-in datetime based on previous checkout: {check_in_datetime}")
+            logger.debug("Adjusted check-in datetime based on previous checkout: %s", check_in_datetime)
             
-    print(f"[DEBUG] Using billing start time: {check_in_datetime}")
+    logger.debug("Using billing start time: %s", check_in_datetime)
 
     # Get food and service charges for THIS ROOM ONLY, filtered by check-in datetime
     # Include ALL food orders (both billed and unbilled) - show paid ones with zero amount
@@ -2475,58 +1962,11 @@ def _calculate_bill_for_entire_booking(db: Session, room_number: str):
     Core logic: Finds an entire booking from a single room number and calculates the total bill
     for all associated rooms and services.
     """
-    # 1. Find the initial room to identify the parent booking
-    initial_room = db.query(Room).filter(Room.number == room_number).first()
+    # 1-2. Find the initial room and its active (or most recently checked-out) parent booking
+    initial_room, booking, is_package = resolve_room_stay(db, room_number, include_checked_out=True)
     if not initial_room:
         raise HTTPException(status_code=404, detail="Initial room not found.")
 
-    # 2. Find the active parent booking (regular or package) linked to this room
-    booking, is_package = None, False
-    
-    # Eagerly load the booking relationship to avoid extra queries
-    # Order by descending ID to get the MOST RECENT booking for the room first.
-    # Handle both 'checked-in' and 'checked_in' status formats
-    booking_link = (db.query(BookingRoom)
-                    .join(Booking)
-                    .options(joinedload(BookingRoom.booking)) # Eager load the booking
-                    .filter(BookingRoom.room_id == initial_room.id, Booking.status.in_(['checked-in', 'checked_in', 'booked']))
-                    .order_by(Booking.id.desc()).first())
-
-    # Fallback: Check for recently checked out booking
-    if not booking_link:
-        booking_link = (db.query(BookingRoom)
-                        .join(Booking)
-                        .options(joinedload(BookingRoom.booking))
-                        .filter(BookingRoom.room_id == initial_room.id, Booking.status.in_(['checked-out', 'checked_out', 'checked out']))
-                        .order_by(Booking.id.desc()).first())
-
-    if booking_link:
-        booking = booking_link.booking
-        # Validate booking status before proceeding
-        if booking.status not in ['checked-in', 'checked_in', 'booked', 'checked-out', 'checked_out', 'checked out']:
-            raise HTTPException(status_code=400, detail=f"Booking is not in a valid state for checkout. Current status: {booking.status}")
-    else:
-        package_link = (db.query(PackageBookingRoom)
-                        .join(PackageBooking)
-                        .options(joinedload(PackageBookingRoom.package_booking)) # Eager load the booking
-                        .filter(PackageBookingRoom.room_id == initial_room.id, PackageBooking.status.in_(['checked-in', 'checked_in', 'booked']))
-                        .order_by(PackageBooking.id.desc()).first())
-        
-        # Fallback for package
-        if not package_link:
-            package_link = (db.query(PackageBookingRoom)
-                            .join(PackageBooking)
-                            .options(joinedload(PackageBookingRoom.package_booking))
-                            .filter(PackageBookingRoom.room_id == initial_room.id, PackageBooking.status.in_(['checked-out', 'checked_out', 'checked out']))
-                            .order_by(PackageBooking.id.desc()).first())
-
-        if package_link:
-            booking = package_link.package_booking
-            is_package = True
-            # Validate booking status before proceeding
-            if booking.status not in ['checked-in', 'checked_in', 'booked', 'checked-out', 'checked_out', 'checked out']:
-                raise HTTPException(status_code=400, detail=f"Package booking is not in a valid state for checkout. Current status: {booking.status}")
-
     if not booking:
         raise HTTPException(status_code=404, detail=f"No active booking found for room {room_number}.")
 
@@ -2546,6 +1986,12 @@ def _calculate_bill_for_entire_booking(db: Session, room_number: str):
 
     # 4. Calculate total charges across ALL rooms
     charges = BillBreakdown()
+    # Per-room share of the consolidated bill (what can be attributed to a room)
+    room_by_id = {room.id: room for room in all_rooms}
+    room_bills = {room.number: {
+        "room_charges": 0.0, "room_gst": 0.0, "food_charges": 0.0, "service_charges": 0.0,
+        "consumables_charges": 0.0, "inventory_charges": 0.0, "asset_damage_charges": 0.0,
+    } for room in all_rooms}
     
     # Calculate effective checkout date:
     # If actual checkout date (today) > booking.check_out (late checkout): use today
@@ -2607,9 +2053,9 @@ def _calculate_bill_for_entire_booking(db: Session, room_number: str):
     if last_checkout and last_checkout.checkout_date:
         if last_checkout.checkout_date > check_in_datetime:
             check_in_datetime = last_checkout.checkout_date
-            print(f"[DEBUG] Adjusted check-in datetime based on previous checkout: {check_in_datetime}")
+            logger.debug("Adjusted check-in datetime based on previous checkout: %s", check_in_datetime)
             
-    print(f"[DEBUG] Using billing start time: {check_in_datetime}")
+    logger.debug("Using billing start time: %s", check_in_datetime)
 
     # Sum up additional food and service charges from all rooms
     # Include ALL food orders (both billed and unbilled) - show paid ones with zero amount
@@ -2649,6 +2095,14 @@ def _calculate_bill_for_entire_booking(db: Session, room_number: str):
         for item in unbilled_food_order_items
     )
     charges.service_charges = sum(ass.override_charges if ass.override_charges is not None else ass.service.charges for ass in unbilled_services)
+    for item in unbilled_food_order_items:
+        room = room_by_id.get(item.order.room_id) if item.order else None
+        if room and item.food_item and item.order.amount > 0:
+            room_bills[room.number]["food_charges"] += item.quantity * item.food_item.price
+    for ass in unbilled_services:
+        room = room_by_id.get(ass.room_id)
+        if room:
+            room_bills[room.number]["service_charges"] += ass.override_charges if ass.override_charges is not None else ass.service.charges
 
     # Populate detailed item lists for the bill summary - include ALL items
     charges.food_items = []
@@ -2713,7 +2167,7 @@ def _calculate_bill_for_entire_booking(db: Session, room_number: str):
         })
 
     # Calculate Consumables Charges from CheckoutRequest
-    from app.models.inventory import InventoryItem
+    from app.models.inventory import InventoryItem, StockIssue, StockIssueDetail
     
     checkout_requests = []
     if is_package:
@@ -2726,12 +2180,38 @@ def _calculate_bill_for_entire_booking(db: Session, room_number: str):
             CheckoutRequestModel.booking_id == booking.id,
             CheckoutRequestModel.status == "completed"
         ).all()
+    
+    # Items and room allocations for every request line, loaded once for all rooms
+    request_item_ids = {item_data.get('item_id') for checkout_request in checkout_requests
+                        for item_data in (checkout_request.inventory_data or []) if item_data.get('item_id')}
+    inventory_items = {}
+    if request_item_ids:
+        inventory_items = {item.id: item for item in db.query(InventoryItem).filter(InventoryItem.id.in_(request_item_ids))}
+    room_by_number = {room.number: room for room in all_rooms}
+    allocations = {}  # (location id, item id) -> [complimentary qty, payable qty]
+    allocation_location_ids = {room.inventory_location_id for room in all_rooms if room.inventory_location_id}
+    if initial_room.inventory_location_id:
+        allocation_location_ids.add(initial_room.inventory_location_id)
+    if request_item_ids and allocation_location_ids:
+        issued = (db.query(StockIssue.destination_location_id, StockIssueDetail.item_id,
+                           StockIssueDetail.is_payable, StockIssueDetail.issued_quantity)
+                  .join(StockIssue, StockIssueDetail.issue_id == StockIssue.id)
+                  .filter(StockIssue.destination_location_id.in_(allocation_location_ids),
+                          StockIssueDetail.item_id.in_(request_item_ids))
+                  .all())
+        for location_id, item_id, is_payable, issued_quantity in issued:
+            split = allocations.setdefault((location_id, item_id), [0.0, 0.0])
+            split[1 if is_payable else 0] += issued_quantity or 0.0
         
     for checkout_request in checkout_requests:
+        # The request's own room; requests without one fall back to the room the bill was opened from
+        request_room = room_by_number.get(checkout_request.room_number) or initial_room
+        room_bill = room_bills.get(request_room.number)
         if checkout_request.inventory_data:
             for item_data in checkout_request.inventory_data:
                 item_id = item_data.get('item_id')
                 used_qty = float(item_data.get('used_qty', 0))
+                inv_item = inventory_items.get(item_id)
                 
                 missing_item_charge = float(item_data.get('missing_item_charge', 0))
                 if missing_item_charge == 0:
@@ -2742,7 +2222,6 @@ def _calculate_bill_for_entire_booking(db: Session, room_number: str):
                 missing_qty = float(item_data.get('missing_qty', 0))
                 
                 if missing_item_charge == 0 and (damage_qty > 0 or missing_qty > 0):
-                     inv_item = db.query(InventoryItem).filter(InventoryItem.id == item_id).first()
                      if inv_item:
                              # Use selling price or unit price
                              price = inv_item.selling_price or inv_item.unit_price or 0.0
@@ -2760,35 +2239,19 @@ def _calculate_bill_for_entire_booking(db: Session, room_number: str):
                         "replacement_cost": missing_item_charge,
                         "notes": item_data.get('notes') or ("Damaged" if item_data.get('damage_qty') else "Missing")
                     })
+                    if room_bill:
+                        room_bill["asset_damage_charges"] += missing_item_charge
                 
                 # If Fixed Asset, we are done (no consumption logic)
                 if is_fixed_asset:
                     continue
                 
                 if used_qty > 0:
-                    inv_item = db.query(InventoryItem).filter(InventoryItem.id == item_id).first()
                     if inv_item and inv_item.is_sellable_to_guest:
-                        # Get actual allocation split (complimentary vs payable) from stock issues
-                        from app.models.inventory import StockIssue, StockIssueDetail
-                        
-                        allocated_complimentary_qty = 0.0
-                        allocated_payable_qty = 0.0
-                        
-                        # Find the room for this checkout
-                        room_for_item = db.query(Room).filter(Room.number == room_number).first()
-                        
-                        # Query stock issues for this room and item
-                        if room_for_item and room_for_item.inventory_location_id:
-                            issue_details = db.query(StockIssueDetail).join(StockIssue).filter(
-                                StockIssue.destination_location_id == room_for_item.inventory_location_id,
-                                StockIssueDetail.item_id == item_id
-                            ).all()
-                            
-                            for detail in issue_details:
-                                if detail.is_payable:
-                                    allocated_payable_qty += detail.issued_quantity
-                                else:
-                                    allocated_complimentary_qty += detail.issued_quantity
+                        # Actual allocation split (complimentary vs payable) from stock issues into the room
+                        allocated_complimentary_qty, allocated_payable_qty = allocations.get(
+                            (request_room.inventory_location_id, item_id), (0.0, 0.0)
+                        )
                         
                         # Calculate chargeable quantity
                         if allocated_complimentary_qty > 0 or allocated_payable_qty > 0:
@@ -2804,6 +2267,8 @@ def _calculate_bill_for_entire_booking(db: Session, room_number: str):
                             price = inv_item.selling_price or inv_item.unit_price or 0
                             amount = chargeable_qty * price
                             charges.consumables_charges = (charges.consumables_charges or 0) + amount
+                            if room_bill:
+                                room_bill["consumables_charges"] += amount
                             
                             charges.consumables_items.append({
                                 "item_id": item_id,
@@ -2815,8 +2280,6 @@ def _calculate_bill_for_entire_booking(db: Session, room_number: str):
                             })
 
     # Fetch Inventory Usage (Amenities/Stock Issued) for all rooms
-    from app.models.inventory import StockIssue, StockIssueDetail
-    
     room_location_ids = [r.inventory_location_id for r in all_rooms if r.inventory_location_id]
     
     if room_location_ids:
@@ -2873,6 +2336,8 @@ def _calculate_bill_for_entire_booking(db: Session, room_number: str):
                     if rental_price and rental_price > 0:
                         rental_charge = rental_price * detail.issued_quantity
                         charges.inventory_charges = (charges.inventory_charges or 0) + rental_charge
+                        if room_num in room_bills:
+                            room_bills[room_num]["inventory_charges"] += rental_charge
                         
                         # Add to inventory usage with rental indicator
                         charges.inventory_usage[-1]["rental_charge"] = rental_charge
@@ -2883,6 +2348,8 @@ def _calculate_bill_for_entire_booking(db: Session, room_number: str):
                         # Use replacement cost (selling price or unit price)
                         damage_charge = detail.item.selling_price or detail.item.unit_price or 0.0
                         charges.asset_damage_charges = (charges.asset_damage_charges or 0) + damage_charge
+                        if room_num in room_bills:
+                            room_bills[room_num]["asset_damage_charges"] += damage_charge
                         charges.asset_damages.append({
                             "item_name": detail.item.name,
                             "replacement_cost": damage_charge,
@@ -2906,6 +2373,8 @@ def _calculate_bill_for_entire_booking(db: Session, room_number: str):
             # Calculate total charge for this room
             room_total = room_price * stay_days
             charges.room_gst += room_total * room_gst_rate
+            room_bills[room.number]["room_charges"] = room_total
+            room_bills[room.number]["room_gst"] = room_total * room_gst_rate
     
     # Package charges: Same rule as room charges
     # Determine daily rate for package to find the slab
@@ -2972,7 +2441,9 @@ def _calculate_bill_for_entire_booking(db: Session, room_number: str):
     return {
         "booking": booking, "all_rooms": all_rooms, "charges": charges, 
         "is_package": is_package, "stay_nights": stay_days, "number_of_guests": number_of_guests,
-        "effective_checkout_date": effective_checkout_date
+        "effective_checkout_date": effective_checkout_date,
+        # Loaded for the bill; group checkout reuses them instead of querying per room
+        "room_bills": room_bills, "checkout_requests": checkout_requests, "inventory_items": inventory_items
     }
 
 
@@ -3023,29 +2494,8 @@ def process_booking_checkout(room_number: str, request: CheckoutRequest, db: Ses
         checkout_mode = "multiple"  # Default to multiple if invalid
     
     # Check if checkout request exists and inventory is verified
-    room = db.query(Room).filter(Room.number == room_number).first()
+    room, booking, is_package = resolve_room_stay(db, room_number)
     if room:
-        # Find active booking
-        booking_link = (db.query(BookingRoom)
-                        .join(Booking)
-                        .filter(BookingRoom.room_id == room.id, Booking.status.in_(['checked-in', 'checked_in', 'booked']))
-                        .order_by(Booking.id.desc()).first())
-        
-        package_link = None
-        booking = None
-        is_package = False
-        
-        if booking_link:
-            booking = booking_link.booking
-        else:
-            package_link = (db.query(PackageBookingRoom)
-                            .join(PackageBooking)
-                            .filter(PackageBookingRoom.room_id == room.id, PackageBooking.status.in_(['checked-in', 'checked_in', 'booked']))
-                            .order_by(PackageBooking.id.desc()).first())
-            if package_link:
-                booking = package_link.package_booking
-                is_package = True
-        
         if booking:
             # Check for checkout request
             checkout_request = None
@@ -3085,7 +2535,7 @@ def process_booking_checkout(room_number: str, request: CheckoutRequest, db: Ses
         today = date.today()
         existing_room_checkout = db.query(Checkout).filter(
             Checkout.room_number == room_number,
-            func.date(Checkout.checkout_date) == today
+            on_day(Checkout.checkout_date, today)
         ).first()
         
         # Also check for any checkout for this booking (not just today)
@@ -3107,31 +2557,33 @@ def process_booking_checkout(room_number: str, request: CheckoutRequest, db: Ses
             # If room is still not "Available", the checkout didn't complete properly - delete and allow retry
             if room.status != "Available":
                 # Delete the orphaned checkout record(s) and allow retry
-                print(f"[CLEANUP] Found orphaned checkout(s) for room {room_number}, booking {booking.id}. Cleaning up...")
+                logger.debug("[CLEANUP] Found orphaned checkout(s) for room %s, booking %s. Cleaning up...", room_number, booking.id)
                 try:
                     deleted_count = 0
                     if existing_room_checkout:
                         # Unlink checkout requests first to avoid FK constraints
                         db.query(CheckoutRequestModel).filter(CheckoutRequestModel.checkout_id == existing_room_checkout.id).update({"checkout_id": None})
+                        bulk_written(db, CheckoutRequestModel)
                         db.delete(existing_room_checkout)
                         deleted_count += 1
-                        print(f"[CLEANUP] Deleted orphaned room checkout record {existing_room_checkout.id}")
+                        logger.debug("[CLEANUP] Deleted orphaned room checkout record %s", existing_room_checkout.id)
                     if existing_booking_checkout and existing_booking_checkout.id != (existing_room_checkout.id if existing_room_checkout else None):
                         # Unlink checkout requests first
                         db.query(CheckoutRequestModel).filter(CheckoutRequestModel.checkout_id == existing_booking_checkout.id).update({"checkout_id": None})
+                        bulk_written(db, CheckoutRequestModel)
                         db.delete(existing_booking_checkout)
                         deleted_count += 1
-                        print(f"[CLEANUP] Deleted orphaned booking checkout record {existing_booking_checkout.id}")
+                        logger.debug("[CLEANUP] Deleted orphaned booking checkout record %s", existing_booking_checkout.id)
                     db.commit()
-                    print(f"[CLEANUP] Successfully deleted {deleted_count} orphaned checkout record(s). Proceeding with new checkout.")
+                    logger.debug("[CLEANUP] Successfully deleted %s orphaned checkout record(s). Proceeding with new checkout.", deleted_count)
                     # Continue to create new checkout - don't return error
                 except Exception as del_error:
-                    print(f"[ERROR] Failed to delete orphaned checkout: {str(del_error)}")
+                    logger.error("Failed to delete orphaned checkout: %s", del_error)
                     db.rollback()
                     # Still try to proceed - maybe the checkout will work
             else:
                 # Room is already checked out - return existing checkout info instead of error
-                print(f"[INFO] Valid checkout already exists for room {room_number} (ID: {checkout_to_check.id})")
+                logger.info("Valid checkout already exists for room %s (ID: %s)", room_number, checkout_to_check.id)
                 return CheckoutSuccess(
                     checkout_id=checkout_to_check.id,
                     grand_total=checkout_to_check.grand_total,
@@ -3258,13 +2710,13 @@ def process_booking_checkout(room_number: str, request: CheckoutRequest, db: Ses
                     if not existing_invoice:
                         break  # Invoice number is unique, proceed
                     else:
-                        print(f"[WARNING] Generated duplicate invoice number {invoice_number}, retrying... (attempt {attempt + 1}/{max_retries})")
+                        logger.warning("Generated duplicate invoice number %s, retrying... (attempt %s/%s)", invoice_number, attempt + 1, max_retries)
                         if attempt == max_retries - 1:
                             # Last attempt failed, use checkout ID-based fallback
-                            print(f"[WARNING] All retries failed, will use checkout ID-based invoice number")
+                            logger.warning("All retries failed, will use checkout ID-based invoice number")
                             invoice_number = None
                 except Exception as inv_error:
-                    print(f"[WARNING] Error generating invoice number: {str(inv_error)}")
+                    logger.warning("Error generating invoice number: %s", inv_error)
                     if attempt == max_retries - 1:
                         invoice_number = None
             
@@ -3281,7 +2733,7 @@ def process_booking_checkout(room_number: str, request: CheckoutRequest, db: Ses
             if existing_booking_checkout:
                 # Check room status - if room is still checked-in, this is an orphaned checkout
                 if room.status != "Available":
-                    print(f"[CLEANUP] Found orphaned checkout {existing_booking_checkout.id} for booking {booking.id} (room {room_number} status: {room.status}). Deleting it.")
+                    logger.debug("[CLEANUP] Found orphaned checkout %s for booking %s (room %s status: %s). Deleting it.", existing_booking_checkout.id, booking.id, room_number, room.status)
                     try:
                         # Also delete related records first to avoid foreign key constraints
                         # Delete checkout verifications
@@ -3290,16 +2742,15 @@ def process_booking_checkout(room_number: str, request: CheckoutRequest, db: Ses
                         db.query(CheckoutPayment).filter(CheckoutPayment.checkout_id == existing_booking_checkout.id).delete()
                         # Unlink checkout requests
                         db.query(CheckoutRequestModel).filter(CheckoutRequestModel.checkout_id == existing_booking_checkout.id).update({"checkout_id": None})
+                        bulk_written(db, CheckoutRequestModel)
                         # Now delete the checkout
                         db.delete(existing_booking_checkout)
                         db.commit()
-                        print(f"[CLEANUP] Successfully deleted orphaned checkout {existing_booking_checkout.id} and related records")
+                        logger.debug("[CLEANUP] Successfully deleted orphaned checkout %s and related records", existing_booking_checkout.id)
                         # Continue to create new checkout
                         existing_booking_checkout = None
                     except Exception as del_error:
-                        print(f"[ERROR] Failed to delete orphaned checkout: {str(del_error)}")
-                        import traceback
-                        print(traceback.format_exc())
+                        logger.error("Failed to delete orphaned checkout: %s", del_error, exc_info=True)
                         db.rollback()
                         # Raise error so user knows to retry
                         raise HTTPException(
@@ -3308,7 +2759,7 @@ def process_booking_checkout(room_number: str, request: CheckoutRequest, db: Ses
                         )
                 else:
                     # Room is available, checkout is valid - return it
-                    print(f"[INFO] Valid checkout already exists for booking {booking.id} (ID: {existing_booking_checkout.id}), returning it")
+                    logger.info("Valid checkout already exists for booking %s (ID: %s), returning it", booking.id, existing_booking_checkout.id)
                     return CheckoutSuccess(
                         checkout_id=existing_booking_checkout.id,
                         grand_total=existing_booking_checkout.grand_total,
@@ -3386,7 +2837,7 @@ def process_booking_checkout(room_number: str, request: CheckoutRequest, db: Ses
                     Checkout.id != new_checkout.id
                 ).first()
                 if existing_invoice:
-                    print(f"[WARNING] Invoice number {invoice_number} became duplicate, using checkout ID-based number")
+                    logger.warning("Invoice number %s became duplicate, using checkout ID-based number", invoice_number)
                     invoice_number = f"INV-{new_checkout.id:06d}"
                     new_checkout.invoice_number = invoice_number
             
@@ -3497,6 +2948,7 @@ def process_booking_checkout(room_number: str, request: CheckoutRequest, db: Ses
                 FoodOrder.billing_status == "unbilled",
                 FoodOrder.status != "cancelled"  # Don't complete cancelled orders
             ).update({"billing_status": "billed", "status": "completed"})
+            bulk_written(db, FoodOrder)
             
             db.query(AssignedService).filter(
                 AssignedService.room_id == room.id, 
@@ -3507,6 +2959,7 @@ def process_booking_checkout(room_number: str, request: CheckoutRequest, db: Ses
                 "status": "completed",
                 "last_used_at": datetime.utcnow()
             })
+            bulk_written(db, AssignedService)
             
             # 12. Inventory Triggers
             # Check for CheckoutRequest first
@@ -3562,7 +3015,7 @@ def process_booking_checkout(room_number: str, request: CheckoutRequest, db: Ses
                             )
                             # print(f"[INFO] Created waste log for item {item.get('item_id')} (Qty: {total_waste})")
                     except Exception as e:
-                        print(f"[WARNING] Failed to create waste log for item {item.get('item_id', 'unknown')}: {e}")
+                        logger.warning("Failed to create waste log for item %s: %s", item.get('item_id', 'unknown'), e)
             elif request.room_verifications:
                 room_verification = next(
                     (rv for rv in request.room_verifications if rv.room_number == room.number),
@@ -3627,9 +3080,9 @@ def process_booking_checkout(room_number: str, request: CheckoutRequest, db: Ses
                                 
                                 item_stock.quantity = 0
                                 item_stock.last_updated = datetime.utcnow()
-                                print(f"[CLEANUP] Returned {qty} x {item_name} from Room {room.number}")
+                                logger.debug("[CLEANUP] Returned %s x %s from Room %s", qty, item_name, room.number)
             except Exception as e:
-                print(f"[WARNING] Cleanup failed: {e}")
+                logger.warning("Cleanup failed: %s", e)
             
             # 13.5. Automatically create cleaning and refill service requests
             try:
@@ -3648,7 +3101,7 @@ def process_booking_checkout(room_number: str, request: CheckoutRequest, db: Ses
                 )
             except Exception as service_request_error:
                 # Don't fail checkout if service request creation fails
-                print(f"[WARNING] Failed to create service requests for room {room.number}: {service_request_error}")
+                logger.warning("Failed to create service requests for room %s: %s", room.number, service_request_error)
             
             # 14. Check if all rooms in booking are checked out
             if is_package:
@@ -3657,7 +3110,7 @@ def process_booking_checkout(room_number: str, request: CheckoutRequest, db: Ses
                 remaining_rooms = [link.room for link in booking.booking_rooms if link.room.status != "Available"]
             
             if not remaining_rooms:
-                booking.status = "checked_out"
+                booking.status = CHECKED_OUT
             
             db.commit()
             db.refresh(new_checkout)
@@ -3687,19 +3140,15 @@ def process_booking_checkout(room_number: str, request: CheckoutRequest, db: Ses
                 )
             except Exception as journal_error:
                 # Log error but don't fail checkout
-                import traceback
-                error_msg = f"[WARNING] Failed to create journal entry for checkout {new_checkout.id}: {str(journal_error)}"
-                print(error_msg)
-                print(traceback.format_exc())
+                error_msg = f"Failed to create journal entry for checkout {new_checkout.id}: {str(journal_error)}"
+                logger.error("%s", error_msg, exc_info=True)
                 # NOTE: Checkout model has no 'notes' field, suppressing error storage
-                print(f"[WARNING] Journal entry creation failed for checkout {new_checkout.id}: {str(journal_error)}")
+                logger.warning("Journal entry creation failed for checkout %s: %s", new_checkout.id, journal_error)
             
         except Exception as e:
             db.rollback()
             error_detail = str(e)
-            import traceback
-            print(f"[ERROR] Checkout failed for room {room_number}, booking {booking.id}: {error_detail}")
-            print(traceback.format_exc())
+            logger.error("Checkout failed for room %s, booking %s: %s", room_number, booking.id, error_detail, exc_info=True)
             
             # Check for unique constraint violation
             if "unique constraint" in error_detail.lower() or "duplicate key" in error_detail.lower() or "23505" in error_detail:
@@ -3722,20 +3171,21 @@ def process_booking_checkout(room_number: str, request: CheckoutRequest, db: Ses
                         today = date.today()
                         existing_checkout = db.query(Checkout).filter(
                             Checkout.room_number == room_number,
-                            func.date(Checkout.checkout_date) == today
+                            on_day(Checkout.checkout_date, today)
                         ).order_by(Checkout.created_at.desc()).first()
                     
                     if existing_checkout:
                         # If room is still checked-in, this is an orphaned checkout - delete it
                         if room.status != "Available":
-                            print(f"[CLEANUP] Found orphaned checkout {existing_checkout.id} for room {room_number} (room still checked-in). Deleting it.")
+                            logger.debug("[CLEANUP] Found orphaned checkout %s for room %s (room still checked-in). Deleting it.", existing_checkout.id, room_number)
                             try:
                                 # Unlink checkout requests first to avoid FK constraints
                                 db.query(CheckoutRequestModel).filter(CheckoutRequestModel.checkout_id == existing_checkout.id).update({"checkout_id": None})
+                                bulk_written(db, CheckoutRequestModel)
                                 
                                 db.delete(existing_checkout)
                                 db.commit()
-                                print(f"[CLEANUP] Successfully deleted orphaned checkout {existing_checkout.id}")
+                                logger.debug("[CLEANUP] Successfully deleted orphaned checkout %s", existing_checkout.id)
                                 # After cleanup, we need to retry the checkout
                                 # But we're in an exception handler, so we can't just continue
                                 # Instead, raise a specific error that tells the user to retry
@@ -3747,7 +3197,7 @@ def process_booking_checkout(room_number: str, request: CheckoutRequest, db: Ses
                             except HTTPException:
                                 raise  # Re-raise HTTPException
                             except Exception as del_error:
-                                print(f"[ERROR] Failed to delete orphaned checkout: {str(del_error)}")
+                                logger.error("Failed to delete orphaned checkout: %s", del_error)
                                 db.rollback()
                                 raise HTTPException(
                                     status_code=409, 
@@ -3755,7 +3205,7 @@ def process_booking_checkout(room_number: str, request: CheckoutRequest, db: Ses
                                 )
                         else:
                             # Room is available, checkout is valid - return it
-                            print(f"[INFO] Found existing checkout {existing_checkout.id} for room {room_number}")
+                            logger.info("Found existing checkout %s for room %s", existing_checkout.id, room_number)
                             return CheckoutSuccess(
                                 checkout_id=existing_checkout.id,
                                 grand_total=existing_checkout.grand_total,
@@ -3764,14 +3214,14 @@ def process_booking_checkout(room_number: str, request: CheckoutRequest, db: Ses
                 except HTTPException:
                     raise  # Re-raise HTTPException from cleanup
                 except Exception as lookup_error:
-                    print(f"[WARNING] Error looking up existing checkout: {str(lookup_error)}")
+                    logger.warning("Error looking up existing checkout: %s", lookup_error)
                 
                 # If we get here and room is still checked-in, it means we couldn't find the orphaned checkout
                 # But we got a unique constraint violation, so something is wrong
                 # Try one more time to find and delete any checkout for this booking
                 if room.status != "Available":
-                    print(f"[ERROR] Unique constraint violation but couldn't find orphaned checkout. Room {room_number} is still checked-in.")
-                    print(f"[CLEANUP] Attempting final cleanup for booking {booking.id}...")
+                    logger.error("Unique constraint violation but couldn't find orphaned checkout. Room %s is still checked-in.", room_number)
+                    logger.debug("[CLEANUP] Attempting final cleanup for booking %s...", booking.id)
                     try:
                         # Final attempt: delete ANY checkout for this booking, regardless of date
                         final_checkout = None
@@ -3786,10 +3236,11 @@ def process_booking_checkout(room_number: str, request: CheckoutRequest, db: Ses
                             db.query(CheckoutPayment).filter(CheckoutPayment.checkout_id == final_checkout.id).delete()
                             # Unlink checkout requests
                             db.query(CheckoutRequestModel).filter(CheckoutRequestModel.checkout_id == final_checkout.id).update({"checkout_id": None})
+                            bulk_written(db, CheckoutRequestModel)
                             
                             db.delete(final_checkout)
                             db.commit()
-                            print(f"[CLEANUP] Successfully deleted checkout {final_checkout.id} in final cleanup attempt")
+                            logger.debug("[CLEANUP] Successfully deleted checkout %s in final cleanup attempt", final_checkout.id)
                             raise HTTPException(
                                 status_code=409,
                                 detail=f"Found and cleaned up a conflicting checkout record. Please click 'Complete Checkout' again - it should work now."
@@ -3803,7 +3254,7 @@ def process_booking_checkout(room_number: str, request: CheckoutRequest, db: Ses
                     except HTTPException:
                         raise
                     except Exception as final_error:
-                        print(f"[ERROR] Final cleanup attempt failed: {str(final_error)}")
+                        logger.error("Final cleanup attempt failed: %s", final_error)
                         db.rollback()
                         raise HTTPException(
                             status_code=409, 
@@ -3847,30 +3298,30 @@ def process_booking_checkout(room_number: str, request: CheckoutRequest, db: Ses
             # First check for today's checkout
             existing_checkout = db.query(Checkout).filter(
                 Checkout.booking_id == booking.id,
-                func.date(Checkout.checkout_date) == today
+                on_day(Checkout.checkout_date, today)
             ).first()
             # If not found, check for any recent checkout (within last 7 days)
             if not existing_checkout:
                 week_ago = date.today() - timedelta(days=7)
                 existing_checkout = db.query(Checkout).filter(
                     Checkout.booking_id == booking.id,
-                    func.date(Checkout.checkout_date) >= week_ago
+                    Checkout.checkout_date >= start_of_day(week_ago)
                 ).order_by(Checkout.created_at.desc()).first()
         else:
             existing_checkout = db.query(Checkout).filter(
                 Checkout.package_booking_id == booking.id,
-                func.date(Checkout.checkout_date) == today
+                on_day(Checkout.checkout_date, today)
             ).first()
             if not existing_checkout:
                 week_ago = today - timedelta(days=7)
                 existing_checkout = db.query(Checkout).filter(
                     Checkout.package_booking_id == booking.id,
-                    func.date(Checkout.checkout_date) >= week_ago
+                    Checkout.checkout_date >= start_of_day(week_ago)
                 ).order_by(Checkout.created_at.desc()).first()
         
         if existing_checkout:
             # Return existing checkout instead of error
-            print(f"[INFO] Found existing checkout {existing_checkout.id} for booking {booking.id}, returning it")
+            logger.info("Found existing checkout %s for booking %s, returning it", existing_checkout.id, booking.id)
             return CheckoutSuccess(
                 checkout_id=existing_checkout.id,
                 grand_total=existing_checkout.grand_total,
@@ -3886,35 +3337,25 @@ def process_booking_checkout(room_number: str, request: CheckoutRequest, db: Ses
             )
         
         try:
-            # ===== ENHANCED MULTIPLE ROOM CHECKOUT PROCESSING =====
+            # ===== GROUP CHECKOUT: one batched transaction for every room of the booking =====
+            # Checkout requests and their inventory items come from the bill calculation;
+            # everything below is added to the session and committed once at the end.
+            checkout_requests = bill_data["checkout_requests"]
+            inventory_items = bill_data["inventory_items"]
             
             # 1. Process Pre-Checkout Verification for all rooms
             total_consumables_charges = 0.0
             total_asset_damage_charges = 0.0
             total_key_card_fee = 0.0
             
-            # Check for CheckoutRequest
-            checkout_requests = []
-            if is_package:
-                checkout_requests = db.query(CheckoutRequestModel).filter(
-                    CheckoutRequestModel.package_booking_id == booking.id,
-                    CheckoutRequestModel.status == "completed"
-                ).all()
-            else:
-                checkout_requests = db.query(CheckoutRequestModel).filter(
-                    CheckoutRequestModel.booking_id == booking.id,
-                    CheckoutRequestModel.status == "completed"
-                ).all()
-
             for checkout_request in checkout_requests:
                 if checkout_request.inventory_data:
-                    from app.models.inventory import InventoryItem
                     for item_data in checkout_request.inventory_data:
                         item_id = item_data.get('item_id')
                         used_qty = float(item_data.get('used_qty', 0))
                         
                         if used_qty > 0:
-                            inv_item = db.query(InventoryItem).filter(InventoryItem.id == item_id).first()
+                            inv_item = inventory_items.get(item_id)
                             if inv_item and inv_item.is_sellable_to_guest:
                                 limit = 0  # Charge for all items by default
                                 chargeable_qty = max(0, used_qty - limit)
@@ -3923,12 +3364,15 @@ def process_booking_checkout(room_number: str, request: CheckoutRequest, db: Ses
                                     price = inv_item.selling_price or inv_item.unit_price or 0
                                     total_consumables_charges += chargeable_qty * price
             
+            rooms_by_number = {room.number: room for room in all_rooms}
+            verified_rooms = []  # (room, verification) for rooms housekeeping verified in this request
             if request.room_verifications:
                 for room_verification in request.room_verifications:
                     # Find the room
-                    room_obj = next((r for r in all_rooms if r.number == room_verification.room_number), None)
+                    room_obj = rooms_by_number.get(room_verification.room_number)
                     if not room_obj:
                         continue
+                    verified_rooms.append((room_obj, room_verification))
                     
                     # Process consumables audit
                     consumables_audit = process_consumables_audit(
@@ -3978,6 +3422,25 @@ def process_booking_checkout(room_number: str, request: CheckoutRequest, db: Ses
             # 6. Generate invoice number
             invoice_number = generate_invoice_number(db)
             
+            # Consolidated bill plus each room's share, stored with the checkout
+            from fastapi.encoders import jsonable_encoder
+            bill_details_data = jsonable_encoder({
+                "generated_at": datetime.now(),
+                "charges_breakdown": charges,
+                "rooms": bill_data["room_bills"],
+                "consumables_audit": {
+                    "charges": total_consumables_charges,
+                    "gst": consumables_gst,
+                    "items": getattr(charges, "consumables_items", [])
+                },
+                "asset_damages": {
+                    "charges": total_asset_damage_charges,
+                    "gst": asset_damage_gst,
+                    "items": getattr(charges, "asset_damages", [])
+                },
+                "inventory_usage": getattr(charges, "inventory_usage", [])
+            })
+            
             # 7. Create enhanced checkout record
             new_checkout = Checkout(
                 booking_id=booking.id if not is_package else None,
@@ -4003,81 +3466,50 @@ def process_booking_checkout(room_number: str, request: CheckoutRequest, db: Ses
                 tips_gratuity=tips_gratuity,
                 guest_gstin=request.guest_gstin,
                 is_b2b=request.is_b2b or False,
-                invoice_number=invoice_number
+                invoice_number=invoice_number,
+                bill_details=bill_details_data
             )
-            # If invoice_number wasn't generated, create one based on checkout ID after flush
+            db.add(new_checkout)
+            db.flush()  # Flush to get checkout ID
+            # If invoice_number wasn't generated, create one based on checkout ID
             if not invoice_number:
-                db.add(new_checkout)
-                db.flush()  # Flush to get checkout ID
                 invoice_number = f"INV-{new_checkout.id:06d}"
                 new_checkout.invoice_number = invoice_number
-            else:
-                db.add(new_checkout)
-                db.flush()  # Flush to get checkout ID
             
             # 8. Create checkout verification records for all rooms
-            if request.room_verifications:
-                for room_verification in request.room_verifications:
-                    room_obj = next((r for r in all_rooms if r.number == room_verification.room_number), None)
-                    if room_obj:
-                        create_checkout_verification(db, new_checkout.id, room_verification, room_obj.id)
-                        # Deduct consumables
-                        deduct_room_consumables(
-                            db, room_obj.id, room_verification.consumables, 
-                            new_checkout.id, current_user.id if current_user else None
-                        )
-            
-            # Deduct from CheckoutRequest if available
-            for checkout_request in checkout_requests:
-                if checkout_request.inventory_data:
-                    # Find the room for this request
-                    room_obj = next((r for r in all_rooms if r.number == checkout_request.room_number), None)
-                    if room_obj:
-                         # Convert inventory_data to list of objects with item_id and actual_consumed
-                        class SimpleConsumable:
-                            def __init__(self, item_id, actual_consumed):
-                                self.item_id = item_id
-                                self.actual_consumed = actual_consumed
-                        
-                        consumables_list = []
-                        for item in checkout_request.inventory_data:
-                            if float(item.get('used_qty', 0)) > 0:
-                                consumables_list.append(SimpleConsumable(item.get('item_id'), float(item.get('used_qty', 0))))
-                        
-                        if consumables_list:
-                            # Logic Removed: deduct_room_consumables is NOT needed here because 
-                            # check_inventory_for_checkout already handled stock deduction and transaction creation.
-                            # Calling it again causes double deduction (negative stock) and duplicate transactions.
-                            pass
-                            # deduct_room_consumables(
-                            #    db, room_obj.id, consumables_list, 
-                            #    new_checkout.id, current_user.id if current_user else None
-                            # )
+            for room_obj, room_verification in verified_rooms:
+                create_checkout_verification(db, new_checkout.id, room_verification, room_obj.id)
+                # Deduct consumables
+                deduct_room_consumables(
+                    db, room_obj.id, room_verification.consumables, 
+                    new_checkout.id, current_user.id if current_user else None
+                )
             
-            # Link checkout requests to this checkout
+            # Stock for CheckoutRequest lines was already moved by check_inventory_for_checkout;
+            # deducting it again here would double count. Just link the requests to this checkout.
             for checkout_request in checkout_requests:
                 checkout_request.checkout_id = new_checkout.id
             
-            # Clear remaining consumables from room inventory
-            from app.models.inventory import InventoryItem, Location, StockIssue, StockIssueDetail
-            for room in all_rooms:
-                if room.inventory_location_id:
-                    # Find all sellable items that have been issued to this room location
-                    room_items = (
-                        db.query(InventoryItem)
-                        .join(StockIssueDetail, StockIssueDetail.item_id == InventoryItem.id)
-                        .join(StockIssue, StockIssue.id == StockIssueDetail.issue_id)
-                        .filter(
-                            StockIssue.destination_location_id == room.inventory_location_id,
-                            InventoryItem.is_sellable_to_guest == True
-                        )
-                        .distinct()
-                        .all()
+            # Clear remaining consumables from room inventory (one query for all room locations)
+            from app.models.inventory import InventoryItem, StockIssue, StockIssueDetail
+            room_location_ids = [room.inventory_location_id for room in all_rooms if room.inventory_location_id]
+            if room_location_ids:
+                # All sellable items that have been issued to any of the rooms
+                room_items = (
+                    db.query(InventoryItem)
+                    .join(StockIssueDetail, StockIssueDetail.item_id == InventoryItem.id)
+                    .join(StockIssue, StockIssue.id == StockIssueDetail.issue_id)
+                    .filter(
+                        StockIssue.destination_location_id.in_(room_location_ids),
+                        InventoryItem.is_sellable_to_guest == True
                     )
-                    
-                    for item in room_items:
-                        # Reset stock to 0
-                        item.current_stock = 0.0
+                    .distinct()
+                    .all()
+                )
+                
+                for item in room_items:
+                    # Reset stock to 0
+                    item.current_stock = 0.0
             
             # 9. Process split payments
             if request.split_payments:
@@ -4098,6 +3530,7 @@ def process_booking_checkout(room_number: str, request: CheckoutRequest, db: Ses
                 FoodOrder.billing_status == "unbilled",
                 FoodOrder.status != "cancelled"  # Don't complete cancelled orders
             ).update({"billing_status": "billed", "status": "completed"})
+            bulk_written(db, FoodOrder)
             
             db.query(AssignedService).filter(
                 AssignedService.room_id.in_(room_ids), 
@@ -4108,75 +3541,66 @@ def process_booking_checkout(room_number: str, request: CheckoutRequest, db: Ses
                 "status": "completed",
                 "last_used_at": datetime.utcnow()
             })
+            bulk_written(db, AssignedService)
             
             # 11. Inventory Triggers for all rooms
-            if request.room_verifications:
-                for room_verification in request.room_verifications:
-                    room_obj = next((r for r in all_rooms if r.number == room_verification.room_number), None)
-                    if room_obj:
-                        deduct_room_consumables(
-                            db, room_obj.id, room_verification.consumables,
-                            new_checkout.id, current_user.id if current_user else None
-                        )
-                        trigger_linen_cycle(db, room_obj.id, new_checkout.id)
+            for room_obj, room_verification in verified_rooms:
+                deduct_room_consumables(
+                    db, room_obj.id, room_verification.consumables,
+                    new_checkout.id, current_user.id if current_user else None
+                )
+                trigger_linen_cycle(db, room_obj.id, new_checkout.id)
             
             # 12. Update booking and room statuses
-            booking.status = "checked_out"
+            booking.status = CHECKED_OUT
             db.query(Room).filter(Room.id.in_(room_ids)).update({"status": "Available"})
+            bulk_written(db, Room)
             
-            # 12.5. Automatically create cleaning and refill service requests for all rooms
+            # 12.5. Cleaning and refill service requests for all rooms, in this transaction
             try:
                 from app.curd import service_request as service_request_crud
-                for room in all_rooms:
-                    try:
-                        # Create cleaning service request
-                        service_request_crud.create_cleaning_service_request(
-                            db, room.id, room.number, booking.guest_name
-                        )
-                        # Create refill service request with checkout_id to get consumables data
-                        service_request_crud.create_refill_service_request(
-                            db, room.id, room.number, booking.guest_name, new_checkout.id
-                        )
-                    except Exception as room_service_error:
-                        # Don't fail checkout if service request creation fails for one room
-                        print(f"[WARNING] Failed to create service requests for room {room.number}: {room_service_error}")
+                with db.begin_nested():
+                    service_request_crud.create_checkout_service_requests(
+                        db, all_rooms, booking.guest_name, new_checkout.id, commit=False
+                    )
             except Exception as service_error:
                 # Don't fail checkout if service request creation fails
-                print(f"[WARNING] Failed to create service requests: {service_error}")
-
-            db.commit()
-            db.refresh(new_checkout)
+                logger.warning("Failed to create service requests: %s", service_error)
             
-            # 12. Automatically create journal entry for checkout (Scenario 2: Guest Checkout)
+            # 13. Consolidated journal entry for the group (Scenario 2: Guest Checkout)
             # Debit: Bank Account / Cash | Credit: Room Revenue, Output CGST, Output SGST
-            # Only create if grand_total > 0 and we have valid data
+            # Only create if grand_total > 0; a failure is rolled back to the savepoint and never blocks checkout
             if new_checkout.grand_total and new_checkout.grand_total > 0:
                 try:
                     from app.utils.accounting_helpers import create_complete_checkout_journal_entry
                     
                     payment_method = request.payment_method or "cash"
-                    result = create_complete_checkout_journal_entry(
-                        db=db,
-                        checkout_id=new_checkout.id,
-                        room_total=float(new_checkout.room_total or 0),
-                        food_total=float(new_checkout.food_total or 0),
-                        service_total=float(new_checkout.service_total or 0),
-                        package_total=float(new_checkout.package_total or 0),
-                        tax_amount=float(new_checkout.tax_amount or 0),
-                        discount_amount=float(new_checkout.discount_amount or 0),
-                        grand_total=float(new_checkout.grand_total or 0),
-                        guest_name=new_checkout.guest_name or "Guest",
-                        room_number=room_number,  # Primary room number
-                        gst_rate=18.0,
-                        payment_method=payment_method,
-                        created_by=current_user.id if current_user else None,
-                        advance_amount=float(new_checkout.advance_deposit or 0)
-                    )
+                    with db.begin_nested():
+                        result = create_complete_checkout_journal_entry(
+                            db=db,
+                            checkout_id=new_checkout.id,
+                            room_total=float(new_checkout.room_total or 0),
+                            food_total=float(new_checkout.food_total or 0),
+                            service_total=float(new_checkout.service_total or 0),
+                            package_total=float(new_checkout.package_total or 0),
+                            tax_amount=float(new_checkout.tax_amount or 0),
+                            discount_amount=float(new_checkout.discount_amount or 0),
+                            grand_total=float(new_checkout.grand_total or 0),
+                            guest_name=new_checkout.guest_name or "Guest",
+                            room_number=room_number,  # Primary room number
+                            gst_rate=18.0,
+                            payment_method=payment_method,
+                            created_by=current_user.id if current_user else None,
+                            advance_amount=float(new_checkout.advance_deposit or 0),
+                            commit=False
+                        )
                     if result is None:
-                        print(f"[INFO] Journal entry not created for checkout {new_checkout.id} (ledgers may not be set up yet)")
+                        logger.info("Journal entry not created for checkout %s (ledgers may not be set up yet)", new_checkout.id)
                 except Exception as journal_error:
-                    import traceback
-                    print(f"[WARNING] Failed to create journal entry for checkout {new_checkout.id}: {str(journal_error)}\n{traceback.format_exc()}")
+                    logger.warning("Failed to create journal entry for checkout %s: %s", new_checkout.id, journal_error, exc_info=True)
+
+            db.commit()
+            db.refresh(new_checkout)
 
         except Exception as e:
             db.rollback()
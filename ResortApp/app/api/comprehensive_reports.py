@@ -9,7 +9,7 @@ from sqlalchemy import func, and_, or_, case
 from typing import List, Optional, Dict, Any
 from datetime import date, datetime, timedelta
 from pydantic import BaseModel
-from app.database import get_db
+from app.utils.read_replica import get_read_db
 from app.api.auth import get_current_user
 from app.models.user import User
 from app.models.booking import Booking, BookingRoom
@@ -24,6 +24,7 @@ from app.models.service import AssignedService, Service
 from app.models.room import Room
 from app.models.employee import Employee
 from app.utils.api_optimization import apply_api_optimizations
+from app.utils.date_utils import start_of_day, start_of_next_day
 
 router = APIRouter(prefix="/reports/comprehensive", tags=["Comprehensive Reports"])
 
@@ -118,7 +119,7 @@ class ServiceReport(BaseModel):
 def get_inventory_category_report(
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """Inventory report grouped by category"""
@@ -156,7 +157,7 @@ def get_inventory_category_report(
 def get_inventory_department_report(
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """Inventory report grouped by department/location"""
@@ -193,7 +194,7 @@ def get_bookings_report(
     start_date: Optional[date] = Query(None),
     end_date: Optional[date] = Query(None),
     status: Optional[str] = Query(None),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """Comprehensive bookings report"""
@@ -243,7 +244,7 @@ def get_package_bookings_report(
     start_date: Optional[date] = Query(None),
     end_date: Optional[date] = Query(None),
     status: Optional[str] = Query(None),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """Comprehensive package bookings report"""
@@ -291,7 +292,7 @@ def get_expenses_report(
     start_date: Optional[date] = Query(None),
     end_date: Optional[date] = Query(None),
     category: Optional[str] = Query(None),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """Comprehensive expenses report"""
@@ -333,7 +334,7 @@ def get_food_orders_report(
     start_date: Optional[date] = Query(None),
     end_date: Optional[date] = Query(None),
     room_number: Optional[str] = Query(None),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """Comprehensive food orders report"""
@@ -344,9 +345,9 @@ def get_food_orders_report(
         )
         
         if start_date:
-            query = query.filter(func.date(FoodOrder.created_at) >= start_date)
+            query = query.filter(FoodOrder.created_at >= start_of_day(start_date))
         if end_date:
-            query = query.filter(func.date(FoodOrder.created_at) <= end_date)
+            query = query.filter(FoodOrder.created_at < start_of_next_day(end_date))
         if room_number:
             room = db.query(Room).filter(Room.number == room_number).first()
             if room:
@@ -378,7 +379,7 @@ def get_purchases_report(
     start_date: Optional[date] = Query(None),
     end_date: Optional[date] = Query(None),
     vendor_id: Optional[int] = Query(None),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """Comprehensive purchases report"""
@@ -418,7 +419,7 @@ def get_purchases_report(
 @router.get("/vendors")
 @apply_api_optimizations
 def get_vendors_report(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """Comprehensive vendors report with purchase statistics"""
@@ -456,7 +457,7 @@ def get_vendors_report(
 def get_services_report(
     start_date: Optional[date] = Query(None),
     end_date: Optional[date] = Query(None),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """Comprehensive services report"""
@@ -507,7 +508,7 @@ def get_services_report(
 def get_comprehensive_summary(
     start_date: Optional[date] = Query(None),
     end_date: Optional[date] = Query(None),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get summary statistics for all reports"""
@@ -515,9 +516,9 @@ def get_comprehensive_summary(
         # Date filters
         date_filter = []
         if start_date:
-            date_filter.append(func.date(Booking.check_in) >= start_date)
+            date_filter.append(Booking.check_in >= start_date)
         if end_date:
-            date_filter.append(func.date(Booking.check_in) <= end_date)
+            date_filter.append(Booking.check_in <= end_date)
         
         # Bookings summary
         bookings_query = db.query(func.count(Booking.id), func.coalesce(func.sum(
@@ -531,9 +532,9 @@ def get_comprehensive_summary(
         # Package bookings summary
         pkg_date_filter = []
         if start_date:
-            pkg_date_filter.append(func.date(PackageBooking.check_in) >= start_date)
+            pkg_date_filter.append(PackageBooking.check_in >= start_date)
         if end_date:
-            pkg_date_filter.append(func.date(PackageBooking.check_in) <= end_date)
+            pkg_date_filter.append(PackageBooking.check_in <= end_date)
         
         pkg_bookings_query = db.query(func.count(PackageBooking.id), func.coalesce(
             func.sum(Package.price), 0
@@ -557,9 +558,9 @@ def get_comprehensive_summary(
         # Food orders summary
         food_date_filter = []
         if start_date:
-            food_date_filter.append(func.date(FoodOrder.created_at) >= start_date)
+            food_date_filter.append(FoodOrder.created_at >= start_of_day(start_date))
         if end_date:
-            food_date_filter.append(func.date(FoodOrder.created_at) <= end_date)
+            food_date_filter.append(FoodOrder.created_at < start_of_next_day(end_date))
         
         food_query = db.query(func.count(FoodOrder.id), func.coalesce(func.sum(FoodOrder.amount), 0))
         if food_date_filter:
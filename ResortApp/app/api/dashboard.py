@@ -1,9 +1,10 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
-from sqlalchemy import func, Date, or_
+from sqlalchemy import func, Date, or_, select
 from datetime import date, timedelta
 
 from app.utils.auth import get_db, get_current_user
+from app.utils.admission import admit_heavy
 from app.models.checkout import Checkout
 from app.models.room import Room
 from app.models.booking import Booking, BookingRoom
@@ -14,10 +15,73 @@ from app.models.expense import Expense
 from app.models.employee import Employee
 from app.models.service import Service, AssignedService
 from app.models.inventory import InventoryItem, InventoryCategory, PurchaseMaster, Vendor
+from app.utils.date_utils import on_day
+from app.utils.booking_status import ACTIVE_BOOKING_STATUSES
+import logging
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
 
 
+# KPI row served when the figures cannot be read
+EMPTY_KPIS = {
+    "checkouts_today": 0,
+    "checkouts_total": 0,
+    "available_rooms": 0,
+    "booked_rooms": 0,
+    "food_revenue_today": 0,
+    "package_bookings_today": 0,
+}
+
+
+def kpi_scalar_statements(today: date):
+    """
+    Single-value KPI queries, by name. Shared with the async handler in
+    app/api/async_reads.py; each is read on its own, a failing one counts as 0.
+    """
+    return {
+        "checkouts_today": select(func.count(Checkout.id)).where(on_day(Checkout.checkout_date, today)),
+        # Conservative estimate for large datasets: exact below 1000, capped at 1000
+        "checkouts_total": select(func.count()).select_from(select(Checkout.id).limit(1000).subquery()),
+        "total_rooms": select(func.count(Room.id)),
+        "maintenance_rooms": select(func.count(Room.id)).where(func.lower(Room.status) == "maintenance"),
+        "food_revenue_today": select(func.sum(FoodOrder.amount)).where(on_day(FoodOrder.created_at, today)),
+        "package_bookings_today": select(func.count(PackageBooking.id)).where(PackageBooking.check_in == today),
+    }
+
+
+def booked_room_statements(today: date):
+    """Room ids of regular and package stays covering `today` (limited to prevent huge result sets)"""
+    return (
+        select(BookingRoom.room_id).join(Booking).where(
+            Booking.status.in_(ACTIVE_BOOKING_STATUSES),
+            Booking.check_in <= today,
+            Booking.check_out > today,
+        ).distinct().limit(100),
+        select(PackageBookingRoom.room_id).join(PackageBooking).where(
+            PackageBooking.status.in_(ACTIVE_BOOKING_STATUSES),
+            PackageBooking.check_in <= today,
+            PackageBooking.check_out > today,
+        ).distinct().limit(500),
+    )
+
+
+def kpis_from_values(values: dict, booked_room_ids: set):
+    """The /kpis response from the values of kpi_scalar_statements and the booked room ids"""
+    booked_rooms_count = len(booked_room_ids)
+    available_rooms_count = max(0, values["total_rooms"] - booked_rooms_count - values["maintenance_rooms"])
+    food_revenue_today = values["food_revenue_today"]
+    return [{
+        "checkouts_today": values["checkouts_today"],
+        "checkouts_total": values["checkouts_total"],
+        "available_rooms": available_rooms_count,
+        "booked_rooms": booked_rooms_count,
+        "food_revenue_today": float(food_revenue_today) if food_revenue_today else 0,
+        "package_bookings_today": values["package_bookings_today"],
+    }]
+
+
 @router.get("/kpis")
 def get_kpis(db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
     """
@@ -26,99 +90,27 @@ def get_kpis(db: Session = Depends(get_db), current_user: dict = Depends(get_cur
     try:
         today = date.today()
 
-        # 1. Checkout KPIs - use estimates for large datasets
-        checkouts_today = 0
-        checkouts_total = 0
-        try:
-            # For today, use exact count (should be small)
-            checkouts_today = db.query(func.count(Checkout.id)).filter(func.cast(Checkout.checkout_date, Date) == today).scalar() or 0
-            # For total, use estimate if dataset is large
-            sample = db.query(Checkout).limit(1000).all()
-            if len(sample) < 1000:
-                checkouts_total = len(sample)
-            else:
-                # Estimate based on sample
-                checkouts_total = 1000  # Conservative estimate
-        except:
-            checkouts_today = 0
-            checkouts_total = 0
-
-        # 2. Room Status KPIs - optimized to avoid loading all rooms
-        # Use direct queries instead of loading all rooms
-        total_rooms_count = db.query(func.count(Room.id)).scalar() or 0
-        
-        # Find booked rooms - use distinct to avoid duplicates
-        booked_room_ids = set()
-        try:
-            active_bookings = db.query(BookingRoom.room_id).join(Booking).filter(
-                Booking.status.in_(['booked', 'checked-in', 'checked_in']),
-                Booking.check_in <= today,
-                Booking.check_out > today,
-            ).distinct().limit(100).all()  # Limit to prevent huge result sets
-            booked_room_ids.update([r.room_id for r in active_bookings if r.room_id])
-        except:
-            pass
-
-        try:
-            active_package_bookings = db.query(PackageBookingRoom.room_id).join(PackageBooking).filter(
-                PackageBooking.status.in_(['booked', 'checked-in', 'checked_in']),
-                PackageBooking.check_in <= today,
-                PackageBooking.check_out > today,
-            ).distinct().limit(500).all()
-            booked_room_ids.update([r.room_id for r in active_package_bookings if r.room_id])
-        except:
-            pass
-
-        booked_rooms_count = len(booked_room_ids) or 0
-        maintenance_rooms_count = db.query(func.count(Room.id)).filter(func.lower(Room.status) == "maintenance").scalar() or 0
-        available_rooms_count = max(0, total_rooms_count - booked_rooms_count - maintenance_rooms_count)
-
-        # 3. Food Revenue KPI
-        # Handle both 'amount' and 'total_amount' fields for FoodOrder
-        food_revenue_today = 0
-        try:
-            food_revenue_today = db.query(func.sum(FoodOrder.amount)).filter(
-                func.cast(FoodOrder.created_at, Date) == today
-            ).scalar() or 0
-        except Exception:
-            # Fallback to total_amount if amount field doesn't exist
+        values = {}
+        for name, stmt in kpi_scalar_statements(today).items():
             try:
-                food_revenue_today = db.query(func.sum(FoodOrder.total_amount)).filter(
-                    func.cast(FoodOrder.created_at, Date) == today
-                ).scalar() or 0
+                values[name] = db.execute(stmt).scalar() or 0
             except Exception:
-                food_revenue_today = 0
+                db.rollback()
+                values[name] = 0
 
-        # 4. Package Booking KPI
-        package_bookings_today = 0
+        # Find booked rooms - distinct to avoid duplicates
+        booked_room_ids = set()
         try:
-            package_bookings_today = db.query(func.count(PackageBooking.id)).filter(
-                func.cast(PackageBooking.check_in, Date) == today
-            ).scalar() or 0
-        except:
-            package_bookings_today = 0
-
-        return [{
-            "checkouts_today": checkouts_today,
-            "checkouts_total": checkouts_total,
-            "available_rooms": available_rooms_count,
-            "booked_rooms": booked_rooms_count,
-            "food_revenue_today": float(food_revenue_today) if food_revenue_today else 0,
-            "package_bookings_today": package_bookings_today,
-        }]
+            for stmt in booked_room_statements(today):
+                booked_room_ids.update(r for r in db.execute(stmt).scalars() if r)
+        except Exception:
+            db.rollback()
+
+        return kpis_from_values(values, booked_room_ids)
     except Exception as e:
         # Return default values if there's any error to prevent 500 response
-        import traceback
-        print(f"Error in get_kpis: {str(e)}")
-        print(traceback.format_exc())
-        return [{
-            "checkouts_today": 0,
-            "checkouts_total": 0,
-            "available_rooms": 0,
-            "booked_rooms": 0,
-            "food_revenue_today": 0,
-            "package_bookings_today": 0,
-        }]
+        logger.error("Error in get_kpis: %s", e, exc_info=True)
+        return [dict(EMPTY_KPIS)]
 
 @router.get("/charts")
 def get_chart_data(db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
@@ -202,8 +194,8 @@ def get_chart_data(db: Session = Depends(get_db), current_user: dict = Depends(g
     for i in range(6, -1, -1):
         day = today - timedelta(days=i)
         # Billed revenue and checkout count for each day
-        day_revenue = db.query(func.coalesce(func.sum(Checkout.grand_total), 0)).filter(func.cast(Checkout.checkout_date, Date) == day).scalar() or 0
-        day_checkouts = db.query(func.count(Checkout.id)).filter(func.cast(Checkout.checkout_date, Date) == day).scalar() or 0
+        day_revenue = db.query(func.coalesce(func.sum(Checkout.grand_total), 0)).filter(on_day(Checkout.checkout_date, day)).scalar() or 0
+        day_checkouts = db.query(func.count(Checkout.id)).filter(on_day(Checkout.checkout_date, day)).scalar() or 0
 
         # Fallback: if still zero, count bookings starting that day
         if not day_revenue:
@@ -274,7 +266,8 @@ def get_date_range(period: str):
     return start_date, end_date
 
 
-@router.get("/summary")
+# Only the all-time period scans whole tables
+@router.get("/summary", dependencies=[Depends(admit_heavy(when=lambda request: request.query_params.get("period", "all") == "all"))])
 def get_summary(period: str = "all", db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
     """
     Provides a comprehensive summary of KPIs for a given period (day, week, month, all).
@@ -346,12 +339,12 @@ def get_summary(period: str = "all", db: Session = Depends(get_db), current_user
     try:
         sample = services_query.limit(1000).all()
         services_count = len(sample) if len(sample) < 1000 else 1000
-        print(f"Dashboard: Services count: {services_count}")
+        logger.debug("Dashboard: Services count: %s", services_count)
         
         completed_sample = services_query.filter(AssignedService.status == 'completed').limit(1000).all()
         completed_services_count = len(completed_sample) if len(completed_sample) < 1000 else 1000
     except Exception as e:
-        print(f"Dashboard: Error calculating services: {e}")
+        logger.error("Dashboard: Error calculating services: %s", e)
         services_count = 0
         completed_services_count = 0
 
@@ -413,19 +406,17 @@ def get_summary(period: str = "all", db: Session = Depends(get_db), current_user
     try:
         purchases_query = apply_date_filter(db.query(PurchaseMaster), PurchaseMaster.purchase_date)
         # Debug print
-        print(f"Dashboard: Calculating purchases. Period: {period}")
+        logger.debug("Dashboard: Calculating purchases. Period: %s", period)
         
         total_purchases = purchases_query.with_entities(func.sum(PurchaseMaster.total_amount)).scalar() or 0
-        print(f"Dashboard: Total purchases sum: {total_purchases}")
+        logger.debug("Dashboard: Total purchases sum: %s", total_purchases)
         
         # Estimate purchase count
         sample = purchases_query.limit(1000).all()
         purchase_count = len(sample) if len(sample) < 1000 else 1000
-        print(f"Dashboard: Purchase count: {purchase_count}")
+        logger.debug("Dashboard: Purchase count: %s", purchase_count)
     except Exception as e:
-        import traceback
-        print(f"Dashboard: Error calculating purchases: {e}")
-        print(traceback.format_exc())
+        logger.error("Dashboard: Error calculating purchases: %s", e, exc_info=True)
         total_purchases = 0
         purchase_count = 0
 
@@ -523,9 +514,7 @@ def get_summary(period: str = "all", db: Session = Depends(get_db), current_user
                     
                     assets_value = float(fixed_assets) + float(high_value_assets)
                 except Exception as e:
-                    print(f"Error calculating assets for {dept}: {e}")
-                    import traceback
-                    traceback.print_exc()
+                    logger.error("Error calculating assets for %s: %s", dept, e, exc_info=True)
                     assets_value = 0
                 
                 # 2. Income calculations
@@ -541,7 +530,7 @@ def get_summary(period: str = "all", db: Session = Depends(get_db), current_user
                         income_value += float(food_income) if food_income else 0
                     except Exception as e:
                         # Log error for debugging
-                        print(f"Error calculating Restaurant income: {e}")
+                        logger.error("Error calculating Restaurant income: %s", e)
                         pass
                 
                 # Hotel income: Room revenue from checkouts
@@ -652,14 +641,14 @@ def get_summary(period: str = "all", db: Session = Depends(get_db), current_user
                         
                         capital_investment = float(dept_purchases) if dept_purchases else 0
                     except Exception as e:
-                        print(f"Error calculating capital investment for {dept}: {e}")
+                        logger.error("Error calculating capital investment for %s: %s", dept, e)
                         capital_investment = 0
                     
                     # For backward compatibility, expenses = operational expenses only
                     expense_value = operational_expenses
                     
                 except Exception as e:
-                    print(f"Error calculating expenses for {dept}: {e}")
+                    logger.error("Error calculating expenses for %s: %s", dept, e)
                     expense_value = 0
                     operational_expenses = 0
                     regular_expenses = 0
@@ -682,9 +671,7 @@ def get_summary(period: str = "all", db: Session = Depends(get_db), current_user
     
     except Exception as e:
         # If department KPIs fail, return empty dict
-        import traceback
-        print(f"Error calculating department KPIs: {e}")
-        print(traceback.format_exc())
+        logger.error("Error calculating department KPIs: %s", e, exc_info=True)
         department_kpis = {}
     
     # Add department KPIs to response
@@ -705,7 +692,6 @@ def get_department_details(department_name: str, db: Session = Depends(get_db)):
     from app.models.expense import Expense
     from app.models.foodorder import FoodOrder
     # from app.models.checkout import Checkout # Already imported at top
-    import traceback
 
     details = {
         "assets": [],
@@ -850,7 +836,6 @@ def get_department_details(department_name: str, db: Session = Depends(get_db)):
 
 
     except Exception as e:
-        print(f"Error fetching department details: {e}")
-        traceback.print_exc()
+        logger.error("Error fetching department details: %s", e, exc_info=True)
         
     return details
\ No newline at end of file
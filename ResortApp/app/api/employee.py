@@ -2,7 +2,6 @@
 
 from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException, status
 from sqlalchemy.orm import Session, joinedload
-from app.database import SessionLocal
 from app.schemas.employee import Employee, LeaveCreate, LeaveOut, EmployeeStatusOverview
 from app.schemas.user import UserCreate
 # ✅ Corrected imports to point to the crud modules
@@ -10,20 +9,13 @@ from app.curd import employee as crud_employee
 from app.curd import user as crud_user
 from app.models.employee import Employee as EmployeeModel, Leave as LeaveModel, WorkingLog as WorkingLogModel
 from app.models.user import User
-from app.utils.auth import get_current_user
+from app.utils.auth import get_db, get_current_user
 import os
 import shutil
 from datetime import date 
 
 router = APIRouter(prefix="/employees", tags=["Employees"])
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 # Create upload directory if it doesn't exist
 UPLOAD_DIR = "uploads/employees"
 os.makedirs(UPLOAD_DIR, exist_ok=True)
@@ -0,0 +1,75 @@
+"""
+Server-sent domain events for dashboard screens (see app.utils.events)
+
+EventSource cannot send an Authorization header, so browsers connect with
+?token=<stream token> from POST /events/stream-token. Query strings end up in
+access and proxy logs: a stream token only opens /events/stream and expires
+after EVENT_STREAM_TOKEN_TTL seconds, and ordinary access tokens are refused in
+the query string.
+"""
+import os
+from datetime import timedelta
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+
+from app.database import SessionLocal
+from app.models.user import User
+from app.utils.auth import authenticate_token, create_scoped_token, get_current_user
+from app.utils.events import EVENTS_ENABLED, TOPICS, sse_stream
+
+router = APIRouter(prefix="/events", tags=["Events"])
+
+STREAM_TOKEN_SCOPE = "events"
+# Only checked when the stream connects; an open stream outlives its token
+EVENT_STREAM_TOKEN_TTL = int(os.getenv("EVENT_STREAM_TOKEN_TTL", "60"))
+
+
+def _stream_user(
+    request: Request,
+    token: Optional[str] = Query(None, description="Stream token from POST /events/stream-token"),
+):
+    """Authenticate by ?token= (stream tokens only) or the Authorization header, without holding a DB session for the stream"""
+    scope = STREAM_TOKEN_SCOPE
+    if not token:
+        header = request.headers.get("Authorization", "")
+        token = header[7:] if header[:7].lower() == "bearer " else None
+        scope = None
+    db = SessionLocal()
+    try:
+        return authenticate_token(token, db, scope=scope)
+    finally:
+        db.close()
+
+
+@router.post("/stream-token")
+def create_stream_token(current_user: User = Depends(get_current_user)):
+    """Short-lived token for ?token= on /events/stream (it opens nothing else)"""
+    token = create_scoped_token(current_user, STREAM_TOKEN_SCOPE, timedelta(seconds=EVENT_STREAM_TOKEN_TTL))
+    return {"token": token, "expires_in": EVENT_STREAM_TOKEN_TTL}
+
+
+@router.get("/topics")
+def list_event_topics(current_user: User = Depends(get_current_user)):
+    """Topics that can be passed to /events/stream"""
+    return {"topics": list(TOPICS)}
+
+
+@router.get("/stream")
+async def stream_events(
+    topics: Optional[str] = Query(None, description="Comma-separated topics (default: all)"),
+    current_user: User = Depends(_stream_user)
+):
+    """Server-Sent Events: one event per committed change, named after its topic"""
+    if not EVENTS_ENABLED:
+        raise HTTPException(status_code=503, detail="Event stream is disabled")
+    wanted = [t.strip() for t in topics.split(",") if t.strip()] if topics else None
+    unknown = sorted(set(wanted or ()) - set(TOPICS))
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown topics: {', '.join(unknown)}")
+    return StreamingResponse(
+        sse_stream(wanted),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -5,11 +5,14 @@ from app.utils.auth import get_db, get_current_user
 from app.schemas.expenses import ExpenseOut
 from app.models.user import User
 from app.models.employee import Employee
+from app.models.expense import Expense
+from app.utils.images import ingest_image, remove_image
 from app.utils.api_optimization import optimize_limit, MAX_LIMIT_LOW_NETWORK
 import os
-import shutil
 from fastapi.responses import FileResponse
-import uuid
+import logging
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/expenses", tags=["Expenses"])
 
@@ -41,13 +44,8 @@ async def create_expense(
 
     image_path = None
     if image and image.filename:
-        filename = f"{employee_id}_{uuid.uuid4().hex}_{image.filename}"
-        file_location = os.path.join(UPLOAD_DIR, filename)
-        with open(file_location, "wb") as buffer:
-            shutil.copyfileobj(image.file, buffer)
-        
         # Path to be used by frontend (relative to /uploads/)
-        image_path = f"uploads/expenses/{filename}"
+        image_path = ingest_image(image, UPLOAD_DIR, str(employee_id), url_base=UPLOAD_DIR).url
 
     # Store expense in DB using ExpenseCreate schema
     from app.schemas.expenses import ExpenseCreate
@@ -121,10 +119,9 @@ async def create_expense(
             )
         except Exception as e:
             # Log error but don't fail expense creation
-            import traceback
-            print(f"Warning: Could not create RCM journal entry for expense {created.id}: {str(e)}\n{traceback.format_exc()}")
+            logger.warning("Could not create RCM journal entry for expense %s: %s", created.id, e, exc_info=True)
 
-            print(f"Warning: Could not create RCM journal entry for expense {created.id}: {str(e)}\n{traceback.format_exc()}")
+            logger.warning("Could not create RCM journal entry for expense %s: %s", created.id, e, exc_info=True)
 
     # Create Standard Expense Journal Entry (Debit Expense, Credit Cash/Bank)
     try:
@@ -138,7 +135,7 @@ async def create_expense(
             created_by=current_user.id
         )
     except Exception as je_error:
-        print(f"Warning: Failed to create expense journal entry: {je_error}")
+        logger.warning("Failed to create expense journal entry: %s", je_error)
 
     # Add employee name in the response
     employee = db.query(Employee).filter(Employee.id == employee_id).first()
@@ -183,14 +180,17 @@ def delete_expense(
         raise HTTPException(status_code=404, detail="Expense not found")
     
     # Delete associated image file if it exists
-    if expense.image:
+    # (unless another expense has the same receipt: files are stored by content hash)
+    if expense.image and not db.query(Expense.id).filter(
+        Expense.image == expense.image, Expense.id != expense.id
+    ).first():
         image_path = expense.image
         if os.path.exists(image_path):
             try:
-                os.remove(image_path)
+                remove_image(image_path)
             except Exception as e:
                 # Log error but continue with expense deletion
-                print(f"Error deleting image file {image_path}: {e}")
+                logger.error("Error deleting image file %s: %s", image_path, e)
     
     expense_crud.delete_expense(db, expense_id)
     return {"message": "Expense deleted successfully"}
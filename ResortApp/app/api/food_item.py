@@ -6,6 +6,9 @@ from app.schemas.food_item import FoodItemCreate, FoodItemUpdate
 from app.models.user import User
 import os, shutil, uuid
 from app.utils.auth import get_db, get_current_user
+import logging
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/food-items", tags=["FoodItem"])
 UPLOAD_DIR = "uploads/food_items"
@@ -72,9 +75,8 @@ def _list_items_impl(db: Session, skip: int = 0, limit: int = 20):
     try:
         return food_item.get_all_food_items(db, skip=skip, limit=limit)
     except Exception as e:
-        import traceback
-        error_detail = f"Failed to fetch food items: {str(e)}\n{traceback.format_exc()}"
-        print(f"ERROR: {error_detail}")
+        error_detail = f"Failed to fetch food items: {str(e)}"
+        logger.error("%s", error_detail, exc_info=True)
         import sys
         sys.stderr.write(f"ERROR in food-items: {error_detail}\n")
         # Return empty list to prevent frontend breakage
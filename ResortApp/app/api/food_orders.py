@@ -1,11 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from app.schemas.foodorder import FoodOrderCreate, FoodOrderOut, FoodOrderUpdate
 from app.curd import foodorder as crud  # ✅ Correct import
 from app.utils.auth import get_db, get_current_user
 from app.models.user import User
-from app.utils.api_optimization import optimize_limit, MAX_LIMIT_LOW_NETWORK
-from typing import List
+from app.models.foodorder import FoodOrder
+from app.utils.api_optimization import optimize_limit, MAX_LIMIT_LOW_NETWORK, FIELDS_QUERY_DESCRIPTION, select_fields, no_store
+from app.utils.fast_json import FastJSONResponse
+from app.utils.kitchen_queue import open_tickets
+from datetime import datetime, timedelta
+from typing import List, Optional
+import logging
+import re
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/food-orders", tags=["Food Orders"])
 
@@ -21,10 +30,43 @@ def create_order(order: FoodOrderCreate, db: Session = Depends(get_db), current_
 def create_order_slash(order: FoodOrderCreate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
     return _create_order_impl(order, db, current_user)
 
-def _get_orders_impl(db: Session, skip: int = 0, limit: int = 20):
+def _get_orders_impl(db: Session, skip: int = 0, limit: int = 20, fields: Optional[str] = None):
     """Helper function for get_orders - optimized for low network"""
+    selected = select_fields(fields, FoodOrderOut)
     limit = optimize_limit(limit, MAX_LIMIT_LOW_NETWORK)
-    return crud.get_food_orders(db, skip=skip, limit=limit)
+    return FastJSONResponse(crud.get_food_orders(db, skip=skip, limit=limit, fields=selected))
+
+# delivery_request of a scheduled order: "SCHEDULED_FOR: 2025-12-27 20:00:00 -- ..."
+SCHEDULED_FOR_PATTERN = re.compile(r"SCHEDULED_FOR: (\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})")
+# Scheduled orders go to the kitchen this long before their time
+SCHEDULED_ORDER_LEAD = timedelta(minutes=30)
+
+def scheduled_orders_statement():
+    """Orders waiting for their scheduled time"""
+    return select(FoodOrder).where(FoodOrder.status == 'scheduled')
+
+def release_due_orders(scheduled_orders, now: Optional[datetime] = None) -> bool:
+    """
+    Set the scheduled orders within SCHEDULED_ORDER_LEAD of their time to pending.
+    Returns True when any changed; the caller commits.
+    """
+    now = now or datetime.now()
+    released = False
+    for order in scheduled_orders:
+        if not order.delivery_request:
+            continue
+        # Parse scheduled time safely
+        match = SCHEDULED_FOR_PATTERN.search(order.delivery_request)
+        if match:
+            try:
+                scheduled_time = datetime.strptime(match.group(1), "%Y-%m-%d %H:%M:%S")
+            except ValueError:
+                continue
+            if now >= scheduled_time - SCHEDULED_ORDER_LEAD:
+                order.status = "pending"
+                released = True
+                logger.debug("Auto-triggered scheduled order %s for %s", order.id, scheduled_time)
+    return released
 
 def trigger_scheduled_orders(db: Session):
     """
@@ -32,49 +74,29 @@ def trigger_scheduled_orders(db: Session):
     Parses 'delivery_request' to find 'SCHEDULED_FOR: YYYY-MM-DD HH:MM:SS'.
     """
     try:
-        from app.models.foodorder import FoodOrder
-        from datetime import datetime, timedelta
-        import re
-
-        # Find orders with status 'scheduled'
-        scheduled_orders = db.query(FoodOrder).filter(FoodOrder.status == 'scheduled').all()
-        
-        now = datetime.now()
-        
-        for order in scheduled_orders:
-            if not order.delivery_request:
-                continue
-                
-            # Parse scheduled time safely
-            # Format: "SCHEDULED_FOR: 2025-12-27 20:00:00 -- ..."
-            match = re.search(r"SCHEDULED_FOR: (\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})", order.delivery_request)
-            if match:
-                time_str = match.group(1)
-                try:
-                    scheduled_time = datetime.strptime(time_str, "%Y-%m-%d %H:%M:%S")
-                    trigger_time = scheduled_time - timedelta(minutes=30)
-                    
-                    if now >= trigger_time:
-                        order.status = "pending"
-                        print(f"Auto-triggered scheduled order {order.id} for {scheduled_time}")
-                except ValueError:
-                    pass
-        
-        if scheduled_orders:
+        if release_due_orders(db.execute(scheduled_orders_statement()).scalars().all()):
             db.commit()
-            
     except Exception as e:
-        print(f"Error checking scheduled orders: {e}")
+        db.rollback()
+        logger.error("Error checking scheduled orders: %s", e)
 
 @router.get("", response_model=List[FoodOrderOut])
-def get_orders(db: Session = Depends(get_db), current_user: User = Depends(get_current_user), skip: int = 0, limit: int = 20):
+def get_orders(db: Session = Depends(get_db), current_user: User = Depends(get_current_user), skip: int = 0, limit: int = 20,
+               fields: Optional[str] = Query(None, description=FIELDS_QUERY_DESCRIPTION)):
     trigger_scheduled_orders(db)
-    return _get_orders_impl(db, skip, limit)
+    return _get_orders_impl(db, skip, limit, fields)
 
 @router.get("/", response_model=List[FoodOrderOut])  # Handle trailing slash
-def get_orders_slash(db: Session = Depends(get_db), current_user: User = Depends(get_current_user), skip: int = 0, limit: int = 20):
+def get_orders_slash(db: Session = Depends(get_db), current_user: User = Depends(get_current_user), skip: int = 0, limit: int = 20,
+                     fields: Optional[str] = Query(None, description=FIELDS_QUERY_DESCRIPTION)):
     trigger_scheduled_orders(db)
-    return _get_orders_impl(db, skip, limit)
+    return _get_orders_impl(db, skip, limit, fields)
+
+@router.get("/kitchen-queue", dependencies=[Depends(no_store)])
+def get_kitchen_queue(after: int = Query(0, ge=0, description="cursor from the previous poll; 0 for every open ticket"),
+                      db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+    """Open kitchen order tickets (KOT), oldest first; pass the returned cursor as `after` to get only new ones"""
+    return open_tickets(db, after=after)
 
 @router.delete("/{order_id}")
 def delete_order(order_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
@@ -155,9 +177,7 @@ def mark_order_paid(
         )
     except Exception as e:
         # Log error but don't fail the request
-        import traceback
-        print(f"Failed to create journal entry for food order {order.id}: {str(e)}")
-        print(traceback.format_exc())
+        logger.error("Failed to create journal entry for food order %s: %s", order.id, e, exc_info=True)
 
     return {
         "message": "Order marked as paid successfully",
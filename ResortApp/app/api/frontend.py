@@ -1,14 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
 from sqlalchemy.orm import Session
 import os
-import shutil
-import uuid
 
 import app.schemas.frontend as schemas
 import app.models.frontend as models
 from app.models.user import User
 import app.curd.frontend as crud
 from app.utils.auth import get_db, get_current_user
+from app.utils.images import ingest_image
+import logging
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
@@ -20,7 +22,7 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__fil
 UPLOAD_DIR = os.path.join(BASE_DIR, "static", "uploads")
 # Ensure directory exists with proper permissions
 os.makedirs(UPLOAD_DIR, exist_ok=True)
-print(f"Upload directory set to: {UPLOAD_DIR}")  # Debug log
+logger.debug("Upload directory set to: %s", UPLOAD_DIR)  # Debug log
 
 # ---------- Header & Banner ----------
 @router.get("/header-banner/", response_model=list[schemas.HeaderBanner])
@@ -58,31 +60,8 @@ async def create_header_banner(
         if not image.filename:
             raise HTTPException(status_code=400, detail="No filename provided for image")
         
-        file_ext = image.filename.split('.')[-1] if '.' in image.filename else 'jpg'
-        unique_filename = f"banner_{uuid.uuid4().hex}.{file_ext}"
-        file_path = os.path.join(UPLOAD_DIR, unique_filename)
-        
-        # Save file
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(image.file, buffer)
-        
-        # Verify file was saved
-        if not os.path.exists(file_path):
-            raise HTTPException(status_code=500, detail="File was not saved successfully")
-
-        # Create URL path (relative to static mount)
-        # static/uploads/banner_xxx.jpg -> /static/uploads/banner_xxx.jpg
-        normalized_path = file_path.replace('\\', '/')
-        # Extract relative path from BASE_DIR
-        if normalized_path.startswith(BASE_DIR.replace('\\', '/')):
-            image_url = normalized_path.replace(BASE_DIR.replace('\\', '/'), '').lstrip('/')
-        else:
-            image_url = normalized_path.lstrip('/')
-        
-        if not image_url.startswith('static/'):
-            image_url = f"static/uploads/{unique_filename}"
-        
-        image_url = f"/{image_url}" if not image_url.startswith('/') else image_url
+        stored = ingest_image(image, UPLOAD_DIR, "banner", url_base="/static/uploads")
+        image_url = stored.url
         
         obj = schemas.HeaderBannerCreate(
             title=title,
@@ -94,9 +73,7 @@ async def create_header_banner(
     except HTTPException:
         raise
     except Exception as e:
-        import traceback
-        error_detail = f"Failed to create header banner: {str(e)}\n{traceback.format_exc()}"
-        print(f"ERROR: {error_detail}")  # Log to console for debugging
+        logger.error("Failed to create header banner: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to create header banner: {str(e)}")
 
 
@@ -128,28 +105,8 @@ async def update_header_banner(
             if not image.filename:
                 raise HTTPException(status_code=400, detail="No filename provided for image")
             
-            file_ext = image.filename.split('.')[-1] if '.' in image.filename else 'jpg'
-            unique_filename = f"banner_{uuid.uuid4().hex}.{file_ext}"
-            file_path = os.path.join(UPLOAD_DIR, unique_filename)
-            
-            with open(file_path, "wb") as buffer:
-                shutil.copyfileobj(image.file, buffer)
-            
-            # Verify file was saved
-            if not os.path.exists(file_path):
-                raise HTTPException(status_code=500, detail="File was not saved successfully")
-            
-            # Create URL path (relative to static mount)
-            normalized_path = file_path.replace('\\', '/')
-            if normalized_path.startswith(BASE_DIR.replace('\\', '/')):
-                image_url = normalized_path.replace(BASE_DIR.replace('\\', '/'), '').lstrip('/')
-            else:
-                image_url = normalized_path.lstrip('/')
-            
-            if not image_url.startswith('static/'):
-                image_url = f"static/uploads/{unique_filename}"
-            
-            image_url = f"/{image_url}" if not image_url.startswith('/') else image_url
+            stored = ingest_image(image, UPLOAD_DIR, "banner", url_base="/static/uploads")
+            image_url = stored.url
 
         obj = schemas.HeaderBannerUpdate(
             title=title,
@@ -228,27 +185,8 @@ async def create_gallery(
             raise HTTPException(status_code=400, detail="No filename provided for image")
         
         # Generate unique filename to avoid conflicts
-        file_ext = image.filename.split('.')[-1] if '.' in image.filename else 'jpg'
-        unique_filename = f"gallery_{uuid.uuid4().hex}.{file_ext}"
-        file_path = os.path.join(UPLOAD_DIR, unique_filename)
-        
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(image.file, buffer)
-        
-        if not os.path.exists(file_path):
-            raise HTTPException(status_code=500, detail="File was not saved successfully")
-
-        # Create URL path (relative to static mount)
-        normalized_path = file_path.replace('\\', '/')
-        if normalized_path.startswith(BASE_DIR.replace('\\', '/')):
-            image_url = normalized_path.replace(BASE_DIR.replace('\\', '/'), '').lstrip('/')
-        else:
-            image_url = normalized_path.lstrip('/')
-        
-        if not image_url.startswith('static/'):
-            image_url = f"static/uploads/{unique_filename}"
-        
-        image_url = f"/{image_url}" if not image_url.startswith('/') else image_url
+        stored = ingest_image(image, UPLOAD_DIR, "gallery", url_base="/static/uploads")
+        image_url = stored.url
         
         obj = schemas.GalleryCreate(
             caption=caption,
@@ -259,9 +197,8 @@ async def create_gallery(
     except HTTPException:
         raise
     except Exception as e:
-        import traceback
-        error_detail = f"Failed to create gallery image: {str(e)}\n{traceback.format_exc()}"
-        print(f"ERROR: {error_detail}")
+        error_detail = f"Failed to create gallery image: {str(e)}"
+        logger.error("%s", error_detail, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to create gallery image: {str(e)}")
 
 
@@ -284,27 +221,8 @@ async def update_gallery(
                 raise HTTPException(status_code=400, detail="No filename provided for image")
             
             # Generate unique filename to avoid conflicts
-            file_ext = image.filename.split('.')[-1] if '.' in image.filename else 'jpg'
-            unique_filename = f"gallery_{uuid.uuid4().hex}.{file_ext}"
-            file_path = os.path.join(UPLOAD_DIR, unique_filename)
-            
-            with open(file_path, "wb") as buffer:
-                shutil.copyfileobj(image.file, buffer)
-            
-            if not os.path.exists(file_path):
-                raise HTTPException(status_code=500, detail="File was not saved successfully")
-
-            # Create URL path (relative to static mount)
-            normalized_path = file_path.replace('\\', '/')
-            if normalized_path.startswith(BASE_DIR.replace('\\', '/')):
-                image_url = normalized_path.replace(BASE_DIR.replace('\\', '/'), '').lstrip('/')
-            else:
-                image_url = normalized_path.lstrip('/')
-            
-            if not image_url.startswith('static/'):
-                image_url = f"static/uploads/{unique_filename}"
-            
-            image_url = f"/{image_url}" if not image_url.startswith('/') else image_url
+            stored = ingest_image(image, UPLOAD_DIR, "gallery", url_base="/static/uploads")
+            image_url = stored.url
 
         # If no new image provided, keep existing image_url
         if image_url is None:
@@ -321,9 +239,8 @@ async def update_gallery(
     except HTTPException:
         raise
     except Exception as e:
-        import traceback
-        error_detail = f"Failed to update gallery image: {str(e)}\n{traceback.format_exc()}"
-        print(f"ERROR: {error_detail}")
+        error_detail = f"Failed to update gallery image: {str(e)}"
+        logger.error("%s", error_detail, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to update gallery image: {str(e)}")
 
 
@@ -445,27 +362,8 @@ async def create_signature_experience(
             raise HTTPException(status_code=400, detail="No filename provided for image")
         
         # Generate unique filename to avoid conflicts
-        file_ext = image.filename.split('.')[-1] if '.' in image.filename else 'jpg'
-        unique_filename = f"sigexp_{uuid.uuid4().hex}.{file_ext}"
-        file_path = os.path.join(UPLOAD_DIR, unique_filename)
-        
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(image.file, buffer)
-        
-        if not os.path.exists(file_path):
-            raise HTTPException(status_code=500, detail="File was not saved successfully")
-
-        # Create URL path (relative to static mount)
-        normalized_path = file_path.replace('\\', '/')
-        if normalized_path.startswith(BASE_DIR.replace('\\', '/')):
-            image_url = normalized_path.replace(BASE_DIR.replace('\\', '/'), '').lstrip('/')
-        else:
-            image_url = normalized_path.lstrip('/')
-        
-        if not image_url.startswith('static/'):
-            image_url = f"static/uploads/{unique_filename}"
-        
-        image_url = f"/{image_url}" if not image_url.startswith('/') else image_url
+        stored = ingest_image(image, UPLOAD_DIR, "sigexp", url_base="/static/uploads")
+        image_url = stored.url
         
         obj = schemas.SignatureExperienceCreate(
             title=title,
@@ -477,9 +375,8 @@ async def create_signature_experience(
     except HTTPException:
         raise
     except Exception as e:
-        import traceback
-        error_detail = f"Failed to create signature experience: {str(e)}\n{traceback.format_exc()}"
-        print(f"ERROR: {error_detail}")
+        error_detail = f"Failed to create signature experience: {str(e)}"
+        logger.error("%s", error_detail, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to create signature experience: {str(e)}")
 
 
@@ -508,27 +405,8 @@ async def update_signature_experience(
                 raise HTTPException(status_code=400, detail="No filename provided for image")
             
             # Generate unique filename to avoid conflicts
-            file_ext = image.filename.split('.')[-1] if '.' in image.filename else 'jpg'
-            unique_filename = f"sigexp_{uuid.uuid4().hex}.{file_ext}"
-            file_path = os.path.join(UPLOAD_DIR, unique_filename)
-            
-            with open(file_path, "wb") as buffer:
-                shutil.copyfileobj(image.file, buffer)
-            
-            if not os.path.exists(file_path):
-                raise HTTPException(status_code=500, detail="File was not saved successfully")
-
-            # Create URL path (relative to static mount)
-            normalized_path = file_path.replace('\\', '/')
-            if normalized_path.startswith(BASE_DIR.replace('\\', '/')):
-                image_url = normalized_path.replace(BASE_DIR.replace('\\', '/'), '').lstrip('/')
-            else:
-                image_url = normalized_path.lstrip('/')
-            
-            if not image_url.startswith('static/'):
-                image_url = f"static/uploads/{unique_filename}"
-            
-            image_url = f"/{image_url}" if not image_url.startswith('/') else image_url
+            stored = ingest_image(image, UPLOAD_DIR, "sigexp", url_base="/static/uploads")
+            image_url = stored.url
             update_data["image_url"] = image_url
         else:
             # If no new image provided, keep existing image_url
@@ -541,9 +419,8 @@ async def update_signature_experience(
     except HTTPException:
         raise
     except Exception as e:
-        import traceback
-        error_detail = f"Failed to update signature experience: {str(e)}\n{traceback.format_exc()}"
-        print(f"ERROR: {error_detail}")
+        error_detail = f"Failed to update signature experience: {str(e)}"
+        logger.error("%s", error_detail, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to update signature experience: {str(e)}")
 
 
@@ -586,27 +463,8 @@ async def create_plan_wedding(
             raise HTTPException(status_code=400, detail="No filename provided for image")
         
         # Generate unique filename to avoid conflicts
-        file_ext = image.filename.split('.')[-1] if '.' in image.filename else 'jpg'
-        unique_filename = f"wedding_{uuid.uuid4().hex}.{file_ext}"
-        file_path = os.path.join(UPLOAD_DIR, unique_filename)
-        
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(image.file, buffer)
-        
-        if not os.path.exists(file_path):
-            raise HTTPException(status_code=500, detail="File was not saved successfully")
-
-        # Create URL path (relative to static mount)
-        normalized_path = file_path.replace('\\', '/')
-        if normalized_path.startswith(BASE_DIR.replace('\\', '/')):
-            image_url = normalized_path.replace(BASE_DIR.replace('\\', '/'), '').lstrip('/')
-        else:
-            image_url = normalized_path.lstrip('/')
-        
-        if not image_url.startswith('static/'):
-            image_url = f"static/uploads/{unique_filename}"
-        
-        image_url = f"/{image_url}" if not image_url.startswith('/') else image_url
+        stored = ingest_image(image, UPLOAD_DIR, "wedding", url_base="/static/uploads")
+        image_url = stored.url
         
         obj = schemas.PlanWeddingCreate(
             title=title,
@@ -618,9 +476,8 @@ async def create_plan_wedding(
     except HTTPException:
         raise
     except Exception as e:
-        import traceback
-        error_detail = f"Failed to create plan wedding: {str(e)}\n{traceback.format_exc()}"
-        print(f"ERROR: {error_detail}")
+        error_detail = f"Failed to create plan wedding: {str(e)}"
+        logger.error("%s", error_detail, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to create plan wedding: {str(e)}")
 
 
@@ -649,27 +506,8 @@ async def update_plan_wedding(
                 raise HTTPException(status_code=400, detail="No filename provided for image")
             
             # Generate unique filename to avoid conflicts
-            file_ext = image.filename.split('.')[-1] if '.' in image.filename else 'jpg'
-            unique_filename = f"wedding_{uuid.uuid4().hex}.{file_ext}"
-            file_path = os.path.join(UPLOAD_DIR, unique_filename)
-            
-            with open(file_path, "wb") as buffer:
-                shutil.copyfileobj(image.file, buffer)
-            
-            if not os.path.exists(file_path):
-                raise HTTPException(status_code=500, detail="File was not saved successfully")
-
-            # Create URL path (relative to static mount)
-            normalized_path = file_path.replace('\\', '/')
-            if normalized_path.startswith(BASE_DIR.replace('\\', '/')):
-                image_url = normalized_path.replace(BASE_DIR.replace('\\', '/'), '').lstrip('/')
-            else:
-                image_url = normalized_path.lstrip('/')
-            
-            if not image_url.startswith('static/'):
-                image_url = f"static/uploads/{unique_filename}"
-            
-            image_url = f"/{image_url}" if not image_url.startswith('/') else image_url
+            stored = ingest_image(image, UPLOAD_DIR, "wedding", url_base="/static/uploads")
+            image_url = stored.url
             update_data["image_url"] = image_url
         else:
             # If no new image provided, keep existing image_url
@@ -682,9 +520,8 @@ async def update_plan_wedding(
     except HTTPException:
         raise
     except Exception as e:
-        import traceback
-        error_detail = f"Failed to update plan wedding: {str(e)}\n{traceback.format_exc()}"
-        print(f"ERROR: {error_detail}")
+        error_detail = f"Failed to update plan wedding: {str(e)}"
+        logger.error("%s", error_detail, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to update plan wedding: {str(e)}")
 
 
@@ -699,7 +536,7 @@ def list_nearby_attractions(db: Session = Depends(get_db), skip: int = 0, limit:
     try:
         # Verify model is available
         if not hasattr(models, 'NearbyAttraction'):
-            print("ERROR: NearbyAttraction model not found in models module")
+            logger.error("NearbyAttraction model not found in models module")
             return []
         
         # Try to query the table
@@ -712,9 +549,8 @@ def list_nearby_attractions(db: Session = Depends(get_db), skip: int = 0, limit:
         # Re-raise HTTP exceptions
         raise
     except Exception as e:
-        import traceback
-        error_detail = f"Failed to fetch nearby attractions: {str(e)}\n{traceback.format_exc()}"
-        print(f"ERROR: {error_detail}")
+        error_detail = f"Failed to fetch nearby attractions: {str(e)}"
+        logger.error("%s", error_detail, exc_info=True)
         # Log to stderr as well for better visibility
         import sys
         sys.stderr.write(f"ERROR in nearby-attractions: {error_detail}\n")
@@ -722,9 +558,9 @@ def list_nearby_attractions(db: Session = Depends(get_db), skip: int = 0, limit:
         # This allows the frontend to work even if there's a database issue
         error_str = str(e).lower()
         if "does not exist" in error_str or "relation" in error_str or "no such table" in error_str:
-            print("Table may not exist yet, returning empty list")
+            logger.debug("Table may not exist yet, returning empty list")
         else:
-            print(f"Unexpected error in nearby-attractions endpoint, returning empty list: {str(e)}")
+            logger.error("Unexpected error in nearby-attractions endpoint, returning empty list: %s", e)
         return []
 
 
@@ -757,27 +593,8 @@ async def create_nearby_attraction(
             raise HTTPException(status_code=400, detail="No filename provided for image")
         
         # Generate unique filename to avoid conflicts
-        file_ext = image.filename.split('.')[-1] if '.' in image.filename else 'jpg'
-        unique_filename = f"attraction_{uuid.uuid4().hex}.{file_ext}"
-        file_path = os.path.join(UPLOAD_DIR, unique_filename)
-        
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(image.file, buffer)
-        
-        if not os.path.exists(file_path):
-            raise HTTPException(status_code=500, detail="File was not saved successfully")
-
-        # Create URL path (relative to static mount)
-        normalized_path = file_path.replace('\\', '/')
-        if normalized_path.startswith(BASE_DIR.replace('\\', '/')):
-            image_url = normalized_path.replace(BASE_DIR.replace('\\', '/'), '').lstrip('/')
-        else:
-            image_url = normalized_path.lstrip('/')
-        
-        if not image_url.startswith('static/'):
-            image_url = f"static/uploads/{unique_filename}"
-        
-        image_url = f"/{image_url}" if not image_url.startswith('/') else image_url
+        stored = ingest_image(image, UPLOAD_DIR, "attraction", url_base="/static/uploads")
+        image_url = stored.url
         
         obj = schemas.NearbyAttractionCreate(
             title=title,
@@ -790,9 +607,8 @@ async def create_nearby_attraction(
     except HTTPException:
         raise
     except Exception as e:
-        import traceback
-        error_detail = f"Failed to create nearby attraction: {str(e)}\n{traceback.format_exc()}"
-        print(f"ERROR: {error_detail}")
+        error_detail = f"Failed to create nearby attraction: {str(e)}"
+        logger.error("%s", error_detail, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to create nearby attraction: {str(e)}")
 
 
@@ -825,27 +641,8 @@ async def update_nearby_attraction(
                 raise HTTPException(status_code=400, detail="No filename provided for image")
             
             # Generate unique filename to avoid conflicts
-            file_ext = image.filename.split('.')[-1] if '.' in image.filename else 'jpg'
-            unique_filename = f"attraction_{uuid.uuid4().hex}.{file_ext}"
-            file_path = os.path.join(UPLOAD_DIR, unique_filename)
-            
-            with open(file_path, "wb") as buffer:
-                shutil.copyfileobj(image.file, buffer)
-            
-            if not os.path.exists(file_path):
-                raise HTTPException(status_code=500, detail="File was not saved successfully")
-
-            # Create URL path (relative to static mount)
-            normalized_path = file_path.replace('\\', '/')
-            if normalized_path.startswith(BASE_DIR.replace('\\', '/')):
-                image_url = normalized_path.replace(BASE_DIR.replace('\\', '/'), '').lstrip('/')
-            else:
-                image_url = normalized_path.lstrip('/')
-            
-            if not image_url.startswith('static/'):
-                image_url = f"static/uploads/{unique_filename}"
-            
-            image_url = f"/{image_url}" if not image_url.startswith('/') else image_url
+            stored = ingest_image(image, UPLOAD_DIR, "attraction", url_base="/static/uploads")
+            image_url = stored.url
             update_data["image_url"] = image_url
         else:
             # If no new image provided, keep existing image_url
@@ -858,9 +655,8 @@ async def update_nearby_attraction(
     except HTTPException:
         raise
     except Exception as e:
-        import traceback
-        error_detail = f"Failed to update nearby attraction: {str(e)}\n{traceback.format_exc()}"
-        print(f"ERROR: {error_detail}")
+        error_detail = f"Failed to update nearby attraction: {str(e)}"
+        logger.error("%s", error_detail, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to update nearby attraction: {str(e)}")
 
 
@@ -913,26 +709,8 @@ async def create_nearby_attraction_banner(
         if not image.filename:
             raise HTTPException(status_code=400, detail="No filename provided for image")
 
-        file_ext = image.filename.split('.')[-1] if '.' in image.filename else 'jpg'
-        unique_filename = f"nearby_banner_{uuid.uuid4().hex}.{file_ext}"
-        file_path = os.path.join(UPLOAD_DIR, unique_filename)
-
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(image.file, buffer)
-
-        if not os.path.exists(file_path):
-            raise HTTPException(status_code=500, detail="File was not saved successfully")
-
-        normalized_path = file_path.replace('\\', '/')
-        if normalized_path.startswith(BASE_DIR.replace('\\', '/')):
-            image_url = normalized_path.replace(BASE_DIR.replace('\\', '/'), '').lstrip('/')
-        else:
-            image_url = normalized_path.lstrip('/')
-
-        if not image_url.startswith('static/'):
-            image_url = f"static/uploads/{unique_filename}"
-
-        image_url = f"/{image_url}" if not image_url.startswith('/') else image_url
+        stored = ingest_image(image, UPLOAD_DIR, "nearby_banner", url_base="/static/uploads")
+        image_url = stored.url
 
         obj = schemas.NearbyAttractionBannerCreate(
             title=title,
@@ -945,9 +723,8 @@ async def create_nearby_attraction_banner(
     except HTTPException:
         raise
     except Exception as e:
-        import traceback
-        error_detail = f"Failed to create nearby attraction banner: {str(e)}\n{traceback.format_exc()}"
-        print(f"ERROR: {error_detail}")
+        error_detail = f"Failed to create nearby attraction banner: {str(e)}"
+        logger.error("%s", error_detail, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to create nearby attraction banner: {str(e)}")
 
 
@@ -977,26 +754,8 @@ async def update_nearby_attraction_banner(
             if not image.filename:
                 raise HTTPException(status_code=400, detail="No filename provided for image")
 
-            file_ext = image.filename.split('.')[-1] if '.' in image.filename else 'jpg'
-            unique_filename = f"nearby_banner_{uuid.uuid4().hex}.{file_ext}"
-            file_path = os.path.join(UPLOAD_DIR, unique_filename)
-
-            with open(file_path, "wb") as buffer:
-                shutil.copyfileobj(image.file, buffer)
-
-            if not os.path.exists(file_path):
-                raise HTTPException(status_code=500, detail="File was not saved successfully")
-
-            normalized_path = file_path.replace('\\', '/')
-            if normalized_path.startswith(BASE_DIR.replace('\\', '/')):
-                image_url = normalized_path.replace(BASE_DIR.replace('\\', '/'), '').lstrip('/')
-            else:
-                image_url = normalized_path.lstrip('/')
-
-            if not image_url.startswith('static/'):
-                image_url = f"static/uploads/{unique_filename}"
-
-            image_url = f"/{image_url}" if not image_url.startswith('/') else image_url
+            stored = ingest_image(image, UPLOAD_DIR, "nearby_banner", url_base="/static/uploads")
+            image_url = stored.url
             update_data["image_url"] = image_url
         else:
             existing = crud.get_by_id(db, models.NearbyAttractionBanner, item_id)
@@ -1008,9 +767,8 @@ async def update_nearby_attraction_banner(
     except HTTPException:
         raise
     except Exception as e:
-        import traceback
-        error_detail = f"Failed to update nearby attraction banner: {str(e)}\n{traceback.format_exc()}"
-        print(f"ERROR: {error_detail}")
+        error_detail = f"Failed to update nearby attraction banner: {str(e)}"
+        logger.error("%s", error_detail, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to update nearby attraction banner: {str(e)}")
 
 
@@ -2,25 +2,27 @@
 GST Reports API for GSTR-1, GSTR-3B Filing
 Comprehensive GST compliance reports for resort management
 """
-from fastapi import APIRouter, Depends, Query, HTTPException, UploadFile, File
+from fastapi import APIRouter, Depends, Query, HTTPException, UploadFile, File, Response
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import func, and_, or_, case
 from typing import Optional, List, Dict, Any
 from datetime import datetime, date as date_type
 from pydantic import BaseModel
 import io
+import json
 import os
 
-# Optional imports for GSTR-2B reconciliation (Excel parsing)
-try:
-    import pandas as pd
-    PANDAS_AVAILABLE = True
-except ImportError:
-    PANDAS_AVAILABLE = False
-    # print("Warning: pandas not installed. GSTR-2B reconciliation feature will be unavailable.")
+# Optional dependency for GSTR-2B reconciliation (Excel parsing). Only probed here;
+# pandas itself is imported on first use since it costs ~0.3s at worker boot.
+import importlib.util
+PANDAS_AVAILABLE = importlib.util.find_spec("pandas") is not None
 
 from app.database import get_db
+from app.utils.read_replica import get_read_db
 from app.utils.auth import get_current_user
+from app.utils.report_cache import cached_report
+from app.utils.admission import admit_heavy
+from app.utils.jobs import job_accepted, job_handler
 from app.models.user import User
 from app.models.checkout import Checkout
 from app.models.booking import Booking
@@ -29,6 +31,9 @@ from app.models.foodorder import FoodOrder
 from app.models.service import AssignedService
 from app.models.inventory import PurchaseMaster, PurchaseDetail, Vendor, InventoryCategory, InventoryItem
 from app.models.expense import Expense
+import logging
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/gst-reports", tags=["GST Reports"])
 
@@ -134,10 +139,11 @@ def get_sac_code(service_type: str) -> str:
 
 
 @router.get("/b2b-sales")
+@cached_report("gst.b2b_sales")
 def get_b2b_sales_register(
     start_date: Optional[str] = Query(None),
     end_date: Optional[str] = Query(None),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -354,16 +360,16 @@ def get_b2b_sales_register(
             "data": b2b_sales
         }
     except Exception as e:
-        import traceback
-        print(f"Error in B2B Sales Register: {str(e)}\n{traceback.format_exc()}")
+        logger.error("Error in B2B Sales Register: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error generating B2B Sales Register: {str(e)}")
 
 
 @router.get("/b2c-sales")
+@cached_report("gst.b2c_sales")
 def get_b2c_sales_register(
     start_date: Optional[str] = Query(None),
     end_date: Optional[str] = Query(None),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -601,16 +607,16 @@ def get_b2c_sales_register(
             }
         }
     except Exception as e:
-        import traceback
-        print(f"Error in B2C Sales Register: {str(e)}\n{traceback.format_exc()}")
+        logger.error("Error in B2C Sales Register: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error generating B2C Sales Register: {str(e)}")
 
 
 @router.get("/hsn-sac-summary")
+@cached_report("gst.hsn_sac_summary")
 def get_hsn_sac_summary(
     start_date: Optional[str] = Query(None),
     end_date: Optional[str] = Query(None),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -677,8 +683,7 @@ def get_hsn_sac_summary(
             checkouts = query.all()
         except Exception as query_error:
             # print(f"HSN/SAC Summary: Error in query - {str(query_error)}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error in get_hsn_sac_summary")
             # Fallback: query without eager loading
             query = db.query(Checkout)
             if start_dt:
@@ -714,7 +719,7 @@ def get_hsn_sac_summary(
                         delta = (c.package_booking.check_out - c.package_booking.check_in).days
                         nights = max(1, delta) if delta > 0 else 1
             except (AttributeError, TypeError) as e:
-                print(f"Error calculating nights for checkout {c.id}: {str(e)}")
+                logger.error("Error calculating nights for checkout %s: %s", c.id, e)
                 nights = 1  # Fallback to 1 night
             
             # Room Services (SAC 9963) - Accommodation Services
@@ -1027,11 +1032,11 @@ def get_hsn_sac_summary(
                                     pass
                                     
                             except (ValueError, KeyError, AttributeError) as e:
-                                print(f"Error processing consumable item {item_id_str}: {str(e)}")
+                                logger.error("Error processing consumable item %s: %s", item_id_str, e)
                                 continue
                                 
                     except (json.JSONDecodeError, TypeError, AttributeError) as e:
-                        print(f"Error parsing consumables_audit_data for checkout {c.id}: {str(e)}")
+                        logger.error("Error parsing consumables_audit_data for checkout %s: %s", c.id, e)
                         continue
             else:
                 # Column doesn't exist, skip consumables processing
@@ -1040,8 +1045,7 @@ def get_hsn_sac_summary(
         except Exception as consumables_error:
             # Log error but don't crash the entire endpoint
             # print(f"HSN/SAC Summary: Error processing consumables - {str(consumables_error)}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error in get_hsn_sac_summary")
             # Continue with the rest of the function even if consumables processing fails
 
         # Debug: Log summary counts
@@ -1088,27 +1092,24 @@ def get_hsn_sac_summary(
         }
     except Exception as e:
         # Catch any unhandled errors and return a proper error response
-        import traceback
-        error_trace = traceback.format_exc()
-        # print(f"HSN/SAC Summary: Unhandled error - {str(e)}")
-        # print(error_trace)
+        logger.error("HSN/SAC Summary: Unhandled error - %s", e, exc_info=True)
         from fastapi import HTTPException
         raise HTTPException(
             status_code=500,
             detail=f"Error generating HSN/SAC Summary: {str(e)}. Please check server logs for details."
         )
     except Exception as e:
-        import traceback
-        print(f"Error in HSN/SAC Summary: {str(e)}\n{traceback.format_exc()}")
+        logger.error("Error in HSN/SAC Summary: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error generating HSN/SAC Summary: {str(e)}")
 
 
 
 @router.get("/itc-register")
+@cached_report("gst.itc_register")
 def get_itc_register(
     start_date: Optional[str] = Query(None),
     end_date: Optional[str] = Query(None),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -1260,8 +1261,7 @@ def get_itc_register(
             }
         }
     except Exception as e:
-        import traceback
-        print(f"Error in ITC Register: {str(e)}\n{traceback.format_exc()}")
+        logger.error("Error in ITC Register: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error generating ITC Register: {str(e)}")
 
 
@@ -1283,8 +1283,7 @@ def get_credit_debit_notes(
             "data": []
         }
     except Exception as e:
-        import traceback
-        print(f"Error in Credit/Debit Notes: {str(e)}\n{traceback.format_exc()}")
+        logger.error("Error in Credit/Debit Notes: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error generating Credit/Debit Notes: {str(e)}")
 
 
@@ -1292,7 +1291,7 @@ def get_credit_debit_notes(
 def get_itc_register(
     start_date: Optional[str] = Query(None),
     end_date: Optional[str] = Query(None),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -1545,10 +1544,7 @@ def get_itc_register(
             }
         }
     except Exception as e:
-        import traceback
-        # print(f"Error in ITC Register: {str(e)}\n{traceback.format_exc()}")
-        tb = traceback.format_exc()
-        # traceback.print_exc()
+        logger.error("Error in ITC Register: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error generating ITC Register: {str(e)}")
 
 
@@ -1557,62 +1553,40 @@ async def reconcile_gstr2b(
     file: UploadFile = File(...),
     start_date: Optional[str] = Query(None),
     end_date: Optional[str] = Query(None),
+    amount_tolerance: float = Query(1.0, ge=0, description="Max rupee difference still treated as a match"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     GSTR-2B Reconciliation - Upload GSTR-2B Excel file and match with ITC Register
-    Matches invoice numbers from GSTR-2B with your purchase invoices
-    Returns mismatches and reconciliation status
+    Invoice numbers (case, whitespace, separators, leading zeros) and GSTINs are
+    normalized and matched on (GSTIN, invoice) across the whole period.
+    Returns matched, amount-mismatch, missing-in-books and missing-in-2B rows
     """
     if not PANDAS_AVAILABLE:
         raise HTTPException(
             status_code=503, 
             detail="GSTR-2B reconciliation requires pandas and openpyxl. Please install: pip install pandas openpyxl"
         )
+    import pandas as pd
+    from starlette.concurrency import run_in_threadpool
+    from app.utils import gstr2b_reconciliation as recon
     
     try:
         # Validate file type
-        if not file.filename.endswith(('.xlsx', '.xls', '.csv')):
+        if not file.filename.lower().endswith(('.xlsx', '.xls', '.csv')):
             raise HTTPException(status_code=400, detail="File must be Excel (.xlsx, .xls) or CSV (.csv)")
         
         # Read file content
         contents = await file.read()
         
-        # Parse Excel/CSV
+        # Parse Excel/CSV (off the event loop; large workbooks take a while)
         try:
-            if file.filename.endswith('.csv'):
-                df = pd.read_csv(io.BytesIO(contents))
-            else:
-                df = pd.read_excel(io.BytesIO(contents))
+            raw = await run_in_threadpool(recon.read_gstr2b_file, contents, file.filename)
         except Exception as e:
             raise HTTPException(status_code=400, detail=f"Failed to parse file: {str(e)}")
-        
-        # Extract invoice numbers from GSTR-2B
-        # GSTR-2B typically has columns: Invoice Number, Invoice Date, GSTIN, etc.
-        # Try common column names
-        invoice_col = None
-        for col in df.columns:
-            col_lower = str(col).lower()
-            if 'invoice' in col_lower and 'number' in col_lower:
-                invoice_col = col
-                break
-            elif 'invoice' in col_lower and 'no' in col_lower:
-                invoice_col = col
-                break
-            elif 'inv' in col_lower:
-                invoice_col = col
-                break
-        
-        if invoice_col is None:
-            # Try first column as fallback
-            invoice_col = df.columns[0]
-        
-        gstr2b_invoices = set()
-        for idx, row in df.iterrows():
-            invoice_num = str(row[invoice_col]).strip() if pd.notna(row[invoice_col]) else None
-            if invoice_num and invoice_num.lower() not in ['nan', 'none', '']:
-                gstr2b_invoices.add(invoice_num)
+        if raw.empty:
+            raise HTTPException(status_code=400, detail="File contains no rows")
         
         # Parse dates for ITC register query
         start_dt = None
@@ -1636,94 +1610,110 @@ async def reconcile_gstr2b(
             except:
                 end_dt = None
         
-        # Query purchases
-        query = db.query(PurchaseMaster).options(
-            joinedload(PurchaseMaster.vendor),
-            joinedload(PurchaseMaster.details).joinedload(PurchaseDetail.item).joinedload(InventoryItem.category)
-        )
+        # Whole purchase register for the period in one query (vendor joined, no per-row lookups)
+        query = db.query(
+            PurchaseMaster.id,
+            PurchaseMaster.invoice_number,
+            PurchaseMaster.purchase_number,
+            PurchaseMaster.invoice_date,
+            PurchaseMaster.purchase_date,
+            PurchaseMaster.total_amount,
+            PurchaseMaster.cgst,
+            PurchaseMaster.sgst,
+            PurchaseMaster.igst,
+            PurchaseMaster.gst_number,
+            Vendor.legal_name,
+            Vendor.name,
+            Vendor.trade_name,
+            Vendor.gst_number.label("vendor_gst_number"),
+        ).outerjoin(Vendor, Vendor.id == PurchaseMaster.vendor_id).filter(PurchaseMaster.status != "cancelled")
         if start_dt:
             query = query.filter(PurchaseMaster.purchase_date >= start_dt)
         if end_dt:
             query = query.filter(PurchaseMaster.purchase_date <= end_dt)
         
-        purchases = query.limit(500).all()
-        
-        # Build invoice mapping from purchases
-        purchase_invoices = {}
-        for p in purchases:
-            # Ensure vendor is loaded
-            vendor = p.vendor
-            if not vendor and hasattr(p, 'vendor_id') and p.vendor_id:
-                vendor = db.query(Vendor).filter(Vendor.id == p.vendor_id).first()
-            
-            invoice_number = p.invoice_number or p.purchase_number
-            if invoice_number:
-                purchase_invoices[invoice_number.strip()] = {
-                    "purchase_id": p.id,
-                    "invoice_number": invoice_number,
-                    "invoice_date": p.invoice_date.isoformat() if p.invoice_date else p.purchase_date.isoformat(),
-                    "vendor_name": (vendor.legal_name or vendor.name or getattr(vendor, 'trade_name', None)) if vendor else "Unknown Vendor",
-                    "vendor_gstin": vendor.gst_number if vendor else None,
-                    "total_amount": float(p.total_amount or 0)
-                }
+        rows = query.all()
+        books = pd.DataFrame({
+            "purchase_id": [r.id for r in rows],
+            "invoice_number": [r.invoice_number or r.purchase_number for r in rows],
+            "invoice_date": [(r.invoice_date or r.purchase_date).isoformat() if (r.invoice_date or r.purchase_date) else None for r in rows],
+            "vendor_name": [(r.legal_name or r.name or r.trade_name) if (r.legal_name or r.name or r.trade_name) else "Unknown Vendor" for r in rows],
+            "gstin": [r.gst_number or r.vendor_gst_number for r in rows],
+            "amount": [float(r.total_amount or 0) for r in rows],
+            "tax": [float((r.cgst or 0) + (r.sgst or 0) + (r.igst or 0)) for r in rows],
+        })
         
-        # Match invoices
-        matched = []
-        unmatched_in_gstr2b = []  # In GSTR-2B but not in our system
-        unmatched_in_system = []  # In our system but not in GSTR-2B
+        portal = recon.prepare_gstr2b(raw)
+        result = await run_in_threadpool(recon.reconcile, portal, books, amount_tolerance)
         
-        # Check GSTR-2B invoices against our system
-        for gstr2b_inv in gstr2b_invoices:
-            if gstr2b_inv in purchase_invoices:
-                matched.append({
-                    "invoice_number": gstr2b_inv,
-                    **purchase_invoices[gstr2b_inv],
-                    "status": "matched"
-                })
-            else:
-                unmatched_in_gstr2b.append({
-                    "invoice_number": gstr2b_inv,
-                    "status": "not_found_in_system"
-                })
+        pair_columns = {
+            "invoice_number_books": "invoice_number",
+            "purchase_id": "purchase_id",
+            "invoice_date_books": "invoice_date",
+            "vendor_name": "vendor_name",
+            "gstin_books": "vendor_gstin",
+            "amount_books": "total_amount",
+            "invoice_number_2b": "gstr2b_invoice_number",
+            "amount_2b": "gstr2b_amount",
+            "difference": "difference",
+            "status": "status",
+        }
+        matched = result[recon.MATCHED].assign(status=recon.MATCHED)
+        mismatched = result[recon.AMOUNT_MISMATCH].assign(status=recon.AMOUNT_MISMATCH)
+        missing_in_books = result[recon.MISSING_IN_BOOKS].assign(status=recon.MISSING_IN_BOOKS)
+        missing_in_2b = result[recon.MISSING_IN_2B].assign(status=recon.MISSING_IN_2B)
         
-        # Check our invoices against GSTR-2B
-        for inv_num, inv_data in purchase_invoices.items():
-            if inv_num not in gstr2b_invoices:
-                unmatched_in_system.append({
-                    **inv_data,
-                    "status": "not_found_in_gstr2b"
-                })
+        total_gstr2b = len(matched) + len(mismatched) + len(missing_in_books)
+        total_system = len(matched) + len(mismatched) + len(missing_in_2b)
         
         return {
             "file_name": file.filename,
-            "total_gstr2b_invoices": len(gstr2b_invoices),
-            "total_system_invoices": len(purchase_invoices),
+            "total_gstr2b_invoices": total_gstr2b,
+            "total_system_invoices": total_system,
             "matched_count": len(matched),
-            "unmatched_in_gstr2b_count": len(unmatched_in_gstr2b),
-            "unmatched_in_system_count": len(unmatched_in_system),
-            "match_percentage": round((len(matched) / len(purchase_invoices) * 100) if purchase_invoices else 0, 2),
-            "matched": matched,
-            "unmatched_in_gstr2b": unmatched_in_gstr2b[:100],  # Limit to 100 for response size
-            "unmatched_in_system": unmatched_in_system[:100],  # Limit to 100 for response size
+            "amount_mismatch_count": len(mismatched),
+            "unmatched_in_gstr2b_count": len(missing_in_books),
+            "unmatched_in_system_count": len(missing_in_2b),
+            "match_percentage": round((len(matched) / total_system * 100) if total_system else 0, 2),
+            "matched": recon.to_records(matched, pair_columns),
+            "amount_mismatch": recon.to_records(mismatched, pair_columns, limit=100),  # Limit to 100 for response size
+            "unmatched_in_gstr2b": recon.to_records(missing_in_books, {  # Limit to 100 for response size
+                "invoice_number": "invoice_number",
+                "gstin": "supplier_gstin",
+                "supplier_name": "supplier_name",
+                "invoice_date": "invoice_date",
+                "amount": "amount",
+                "status": "status",
+            }, limit=100),
+            "unmatched_in_system": recon.to_records(missing_in_2b, {  # Limit to 100 for response size
+                "purchase_id": "purchase_id",
+                "invoice_number": "invoice_number",
+                "invoice_date": "invoice_date",
+                "vendor_name": "vendor_name",
+                "gstin": "vendor_gstin",
+                "amount": "total_amount",
+                "status": "status",
+            }, limit=100),
             "summary": {
-                "total_eligible_itc": sum([float(p.total_amount or 0) * 0.18 for p in purchases]),  # Approximate
-                "matched_itc": len(matched) * 1000,  # Placeholder calculation
-                "unmatched_itc": len(unmatched_in_system) * 1000  # Placeholder calculation
+                "total_eligible_itc": round(float(books["tax"].sum()), 2),
+                "matched_itc": round(float(matched["tax_books"].sum()), 2),
+                "mismatch_itc": round(float(mismatched["tax_books"].sum()), 2),
+                "unmatched_itc": round(float(missing_in_2b["tax"].sum()), 2),
             }
         }
     except HTTPException:
         raise
     except Exception as e:
-        import traceback
-        print(f"Error in GSTR-2B Reconciliation: {str(e)}\n{traceback.format_exc()}")
+        logger.error("Error in GSTR-2B Reconciliation: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error reconciling GSTR-2B: {str(e)}")
 
 
 @router.get("/rcm-register")
+@cached_report("gst.rcm_register")
 def get_rcm_register(
     start_date: Optional[str] = Query(None),
     end_date: Optional[str] = Query(None),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -1944,16 +1934,16 @@ def get_rcm_register(
             "data": rcm_data
         }
     except Exception as e:
-        import traceback
-        print(f"Error in RCM Register: {str(e)}\n{traceback.format_exc()}")
+        logger.error("Error in RCM Register: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error generating RCM Register: {str(e)}")
 
 
 @router.get("/advance-receipt")
+@cached_report("gst.advance_receipt")
 def get_advance_receipt_report(
     start_date: Optional[str] = Query(None),
     end_date: Optional[str] = Query(None),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -2143,16 +2133,16 @@ def get_advance_receipt_report(
             "data": advance_data  # Detailed records
         }
     except Exception as e:
-        import traceback
-        print(f"Error in Advance Receipt Report: {str(e)}\n{traceback.format_exc()}")
+        logger.error("Error in Advance Receipt Report: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error generating Advance Receipt Report: {str(e)}")
 
 
 @router.get("/room-tariff-slab")
+@cached_report("gst.room_tariff_slab")
 def get_room_tariff_slab_report(
     start_date: Optional[str] = Query(None),
     end_date: Optional[str] = Query(None),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -2256,17 +2246,17 @@ def get_room_tariff_slab_report(
             }
         }
     except Exception as e:
-        import traceback
         # print(f"Error in Room Tariff Slab Report: {str(e)}\n{traceback.format_exc()}")
-        traceback.print_exc()
+        logger.exception("Error in get_room_tariff_slab_report")
         raise HTTPException(status_code=500, detail=f"Error generating Room Tariff Slab Report: {repr(e)}")
 
 
-@router.get("/master-summary")
+@router.get("/master-summary", dependencies=[Depends(admit_heavy())])
+@cached_report("gst.master_summary")
 def get_master_gst_summary(
     start_date: Optional[str] = Query(None),
     end_date: Optional[str] = Query(None),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -2507,7 +2497,49 @@ def get_master_gst_summary(
         }
 
     except Exception as e:
-        import traceback
-        print(f"Error in Master GST Summary: {str(e)}\n{traceback.format_exc()}")
+        logger.error("Error in Master GST Summary: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error generating Master GST Summary: {str(e)}")
 
+
+
+# ============================================
+# Background generation (long periods that would outlast a request)
+# ============================================
+
+# report path -> endpoint; each runs as job type "gst.<report>" (one at a time per report)
+GST_REPORT_JOBS = {
+    "b2b-sales": get_b2b_sales_register,
+    "b2c-sales": get_b2c_sales_register,
+    "hsn-sac-summary": get_hsn_sac_summary,
+    "rcm-register": get_rcm_register,
+    "advance-receipt": get_advance_receipt_report,
+    "room-tariff-slab": get_room_tariff_slab_report,
+    "master-summary": get_master_gst_summary,
+}
+
+
+def _gst_report_job(report: str):
+    def run(job, start_date: Optional[str] = None, end_date: Optional[str] = None):
+        result = GST_REPORT_JOBS[report](start_date=start_date, end_date=end_date, db=job.db, current_user=None)
+        if isinstance(result, Response):  # report cache hit: the stored JSON
+            return json.loads(result.body)
+        return result
+    return run
+
+
+for _report in GST_REPORT_JOBS:
+    job_handler(f"gst.{_report}")(_gst_report_job(_report))
+
+
+@router.post("/{report}/jobs")
+def start_gst_report_job(
+    report: str,
+    start_date: Optional[str] = Query(None),
+    end_date: Optional[str] = Query(None),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Generate a GST report in the background; poll GET /api/jobs/{id} for the result"""
+    if report not in GST_REPORT_JOBS:
+        raise HTTPException(status_code=404, detail=f"Unknown GST report: {report}")
+    return job_accepted(db, f"gst.{report}", {"start_date": start_date, "end_date": end_date}, current_user)
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query
 from sqlalchemy.orm import Session
 from typing import List, Optional
 import os
@@ -8,6 +8,9 @@ from datetime import datetime
 from app.utils.auth import get_db, get_current_user
 from app.models.user import User
 from app.curd import inventory as inventory_crud
+from app.utils.jobs import job_accepted, job_handler
+from app.utils.api_optimization import FIELDS_QUERY_DESCRIPTION, select_fields, trim_fields, wants
+from app.utils.fast_json import FastJSONResponse
 from app.schemas.inventory import (
     InventoryCategoryCreate, InventoryCategoryUpdate, InventoryCategoryOut,
     InventoryItemCreate, InventoryItemUpdate, InventoryItemOut,
@@ -22,6 +25,9 @@ from app.schemas.inventory import (
     AssetRegistryCreate, AssetRegistryOut, AssetRegistryUpdate,
     StockAdjustmentCreate
 )
+import logging
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/inventory", tags=["Inventory"])
 
@@ -206,7 +212,7 @@ async def create_item(
                     db.add(loc_stock)
                 else:
                     # Optional: Log warning that location name didn't match any Location ID
-                    print(f"Warning: Item created with location '{location}' but no matching Location found in DB.")
+                    logger.warning("Item created with location '%s' but no matching Location found in DB.", location)
         
         db.commit()
         db.refresh(created_item)
@@ -224,8 +230,7 @@ async def create_item(
     except HTTPException:
         raise
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error in create_item")
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Error creating item: {str(e)}")
 
@@ -236,15 +241,18 @@ def get_items(
     limit: int = 100,
     category_id: Optional[int] = None,
     active_only: bool = True,
+    fields: Optional[str] = Query(None, description=FIELDS_QUERY_DESCRIPTION),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """Optimized endpoint with eager loading - no N+1 queries"""
+    selected = select_fields(fields, InventoryItemOut)
     try:
-        items = inventory_crud.get_all_items(db, skip=skip, limit=limit, category_id=category_id, active_only=active_only)
+        items = inventory_crud.get_all_items(db, skip=skip, limit=limit, category_id=category_id, active_only=active_only,
+                                             fields=selected)
         
         # Fetch last purchase prices efficiently
-        item_ids = [i.id for i in items]
+        item_ids = [i.id for i in items] if wants(selected, "last_purchase_price") else []
         last_prices = {}
         if item_ids:
             from app.models.inventory import PurchaseDetail, PurchaseMaster
@@ -262,15 +270,18 @@ def get_items(
                 if iid not in last_prices:
                     last_prices[iid] = float(price) if price else 0.0
 
+        # Deferred columns and the category are only touched when the fieldset needs them
+        with_category = wants(selected, "category_name", "department")
+        with_low_stock = wants(selected, "is_low_stock")
         result = []
         for item in items:
             # Category is already loaded via eager loading (when configured), no extra query needed
-            category = getattr(item, "category", None)
+            category = getattr(item, "category", None) if with_category else None
             item_dict = {
                 **item.__dict__,
                 "category_name": category.name if category else None,
                 "department": category.parent_department if category else None,  # Add department from category
-                "is_low_stock": item.current_stock <= item.min_stock_level if item.min_stock_level else False,
+                "is_low_stock": item.current_stock <= item.min_stock_level if with_low_stock and item.min_stock_level else False,
                 "last_purchase_price": last_prices.get(item.id, 0.0)
             }
             # Add category object for frontend grouping
@@ -281,10 +292,11 @@ def get_items(
                     "classification": category.classification
                 }
             result.append(item_dict)
+        if selected is not None:
+            return FastJSONResponse(trim_fields(result, selected))
         return result
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error in get_items")
         raise HTTPException(status_code=500, detail=f"Error fetching items: {str(e)}")
 
 
@@ -397,8 +409,7 @@ async def update_item(
             "is_low_stock": updated.current_stock <= updated.min_stock_level if updated.min_stock_level else False
         }
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error in update_item")
         raise HTTPException(status_code=500, detail=f"Error updating item: {str(e)}")
 
 
@@ -473,19 +484,10 @@ def create_purchase(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    # Debug logging to file
-    import datetime
-    with open("purchase_debug.log", "a") as f:
-        f.write(f"\n=== {datetime.datetime.now()} ===\n")
-        f.write(f"[DEBUG CREATE_PURCHASE] Received purchase data:\n")
-        f.write(f"  Status: {purchase.status}\n")
-        f.write(f"  Destination Location ID: {purchase.destination_location_id}\n")
-        f.write(f"  Details count: {len(purchase.details)}\n")
-    
-    print(f"[DEBUG CREATE_PURCHASE] Received purchase data:")
-    print(f"  Status: {purchase.status}")
-    print(f"  Destination Location ID: {purchase.destination_location_id}")
-    print(f"  Details count: {len(purchase.details)}")
+    logger.debug("CREATE_PURCHASE: Received purchase data:")
+    logger.debug("  Status: %s", purchase.status)
+    logger.debug("  Destination Location ID: %s", purchase.destination_location_id)
+    logger.debug("  Details count: %s", len(purchase.details))
     
     created = inventory_crud.create_purchase_master(db, purchase, created_by=current_user.id)
     
@@ -499,16 +501,14 @@ def create_purchase(
                     if item:
                         # Update item's unit_price to latest purchase price
                         item.unit_price = detail.unit_price
-                        print(f"[AUTO-UPDATE] Updated item {item.name} (ID: {item.id}) unit_price to {detail.unit_price}")
+                        logger.debug("[AUTO-UPDATE] Updated item %s (ID: %s) unit_price to %s", item.name, item.id, detail.unit_price)
             db.commit()
         except Exception as e:
-            import traceback
-            print(f"Warning: Could not auto-update item prices: {str(e)}\\n{traceback.format_exc()}")
+            logger.warning("Could not auto-update item prices: %s", e, exc_info=True)
             # Don't fail the purchase creation
     
     # Update stock and location stock if purchase is received
-    with open("purchase_debug.log", "a") as f:
-        f.write(f"Checking if status is 'received': purchase.status = '{purchase.status}'\n")
+    logger.debug("Checking if status is 'received': purchase.status = '%s'", purchase.status)
     
     if purchase.status.lower() == "received":
         # Validate and ensure destination location is set
@@ -528,26 +528,18 @@ def create_purchase(
             # Auto-assign the default location
             created.destination_location_id = default_location.id
             db.commit()
-            print(f"[AUTO-ASSIGN] No destination location specified. Using default warehouse: {default_location.name}")
-            with open("purchase_debug.log", "a") as f:
-                f.write(f"Auto-assigned destination location: {default_location.name} (ID: {default_location.id})\n")
-        
-        with open("purchase_debug.log", "a") as f:
-            f.write(f"ENTERING stock update block for received purchase\n")
+            logger.debug("[AUTO-ASSIGN] No destination location specified. Using default warehouse: %s (ID: %s)", default_location.name, default_location.id)
         
         try:
             from app.models.inventory import InventoryItem, InventoryTransaction, LocationStock
             
-            with open("purchase_debug.log", "a") as f:
-                f.write(f"Details count in created object: {len(created.details)}\n")
+            logger.debug("Details count in created object: %s", len(created.details))
             
             for detail in created.details:
-                with open("purchase_debug.log", "a") as f:
-                    f.write(f"Processing detail: item_id={detail.item_id}, qty={detail.quantity}\n")
+                logger.debug("Processing detail: item_id=%s, qty=%s", detail.item_id, detail.quantity)
                 
                 if not detail.item_id:
-                    with open("purchase_debug.log", "a") as f:
-                        f.write(f"  Skipping - no item_id\n")
+                    logger.debug("  Skipping - no item_id")
                     continue
                 
                 item = db.query(InventoryItem).filter(InventoryItem.id == detail.item_id).first()
@@ -571,35 +563,31 @@ def create_purchase(
                     if total_stock > 0:
                         item.unit_price = round(total_value / total_stock, 2)
                 except Exception as calc_err:
-                    print(f"Error calculating weighted average: {calc_err}")
-                    with open("purchase_debug.log", "a") as f:
-                        f.write(f"Calculation Error Item {item.id}: {str(calc_err)}\n")
+                    logger.error("Error calculating weighted average for item %s: %s", item.id, calc_err)
                     # Fallback: Just add stock, ignore price update if calculation failed
                     item.current_stock = float(item.current_stock or 0) + float(detail.quantity or 0)
                 
-                print(f"[CREATE-RECEIVED] {item.name}: Stock {old_stock}→{total_stock}, Cost ₹{old_price}→₹{item.unit_price}")
+                logger.debug("[CREATE-RECEIVED] %s: Stock %s→%s, Cost ₹%s→₹%s", item.name, old_stock, total_stock, old_price, item.unit_price)
                 
                 # Location stock
-                print(f"[DEBUG] created.destination_location_id = {created.destination_location_id}")
-                with open("purchase_debug.log", "a") as f:
-                    f.write(f"Location Stock Logic: Dest={created.destination_location_id}\n")
+                logger.debug("created.destination_location_id = %s", created.destination_location_id)
                 if created.destination_location_id:
-                    print(f"[DEBUG] Creating/updating location stock for location {created.destination_location_id}, item {detail.item_id}")
+                    logger.debug("Creating/updating location stock for location %s, item %s", created.destination_location_id, detail.item_id)
                     location_stock = db.query(LocationStock).filter(
                         LocationStock.location_id == created.destination_location_id,
                         LocationStock.item_id == detail.item_id
                     ).first()
                     
                     if location_stock:
-                        print(f"[DEBUG] Updating existing location stock, old qty: {location_stock.quantity}")
+                        logger.debug("Updating existing location stock, old qty: %s", location_stock.quantity)
                         try:
                             # Use session update instead of raw engine execution
                             location_stock.quantity += float(detail.quantity or 0)
-                            print(f"[DEBUG] New location stock qty: {location_stock.quantity}")
+                            logger.debug("New location stock qty: %s", location_stock.quantity)
                         except Exception as e:
-                            print(f"[ERROR] updating location stock object: {e}")
+                            logger.error("updating location stock object: %s", e)
                     else:
-                        print(f"[DEBUG] Creating new location stock with qty: {detail.quantity}")
+                        logger.debug("Creating new location stock with qty: %s", detail.quantity)
                         location_stock = LocationStock(
                             location_id=created.destination_location_id,
                             item_id=detail.item_id,
@@ -607,7 +595,7 @@ def create_purchase(
                         )
                         db.add(location_stock)
                 else:
-                    print(f"[DEBUG] No destination location specified, skipping location stock")
+                    logger.debug("No destination location specified, skipping location stock")
                 
                 # Transaction
                 # Ensure types are compatible for calculation (Decimal vs Float)
@@ -628,8 +616,7 @@ def create_purchase(
             
             db.commit()
         except Exception as e:
-            import traceback
-            print(f"Warning: Could not update stock for received purchase: {str(e)}\\n{traceback.format_exc()}")
+            logger.warning("Could not update stock for received purchase: %s", e, exc_info=True)
             db.rollback()
     
     # Automatically create journal entry for purchase (Scenario 1)
@@ -670,8 +657,7 @@ def create_purchase(
             )
         except Exception as e:
             # Log error but don't fail purchase creation
-            import traceback
-            print(f"Warning: Could not create journal entry for purchase {created.id}: {str(e)}\\n{traceback.format_exc()}")
+            logger.warning("Could not create journal entry for purchase %s: %s", created.id, e, exc_info=True)
     
     # Optimized: Batch load items to avoid N+1 queries
     from sqlalchemy.orm import joinedload
@@ -832,7 +818,7 @@ def update_purchase(
             # Auto-assign the default location
             updated.destination_location_id = default_location.id
             db.commit()
-            print(f"[AUTO-ASSIGN] No destination location specified. Using default warehouse: {default_location.name}")
+            logger.debug("[AUTO-ASSIGN] No destination location specified. Using default warehouse: %s", default_location.name)
         
         for detail in updated.details:
             if not detail.item_id:
@@ -858,7 +844,7 @@ def update_purchase(
             if total_stock > 0:
                 item.unit_price = round(total_value / total_stock, 2)
             
-            print(f"[RECEIVED] {item.name}: Stock {old_stock}→{total_stock}, Cost ₹{old_price}→₹{item.unit_price}")
+            logger.debug("[RECEIVED] %s: Stock %s→%s, Cost ₹%s→₹%s", item.name, old_stock, total_stock, old_price, item.unit_price)
             
             # Location stock
             if updated.destination_location_id:
@@ -914,7 +900,7 @@ def update_purchase(
             if new_stock > 0:
                 item.unit_price = round(remaining_value / new_stock, 2)
             
-            print(f"[CANCELLED] {item.name}: Stock {old_stock}→{new_stock}")
+            logger.debug("[CANCELLED] %s: Stock %s→%s", item.name, old_stock, new_stock)
             
             if updated.destination_location_id:
                 location_stock = db.query(LocationStock).filter(
@@ -981,9 +967,9 @@ def update_purchase(
                     is_interstate=is_interstate,
                     created_by=current_user.id
                 )
-                print(f"[INFO] Created missing journal entry for purchase #{updated.id}")
+                logger.info("Created missing journal entry for purchase #%s", updated.id)
         except Exception as e:
-            print(f"[WARNING] Could not create journal entry on update: {str(e)}")
+            logger.warning("Could not create journal entry on update: %s", e)
     
     db.commit()
     return get_purchase(purchase_id, db, current_user)
@@ -1088,8 +1074,7 @@ def create_purchase_payment(
         return {"message": "Payment recorded successfully", "journal_entry_id": journal_entry.id, "payment_status": purchase.payment_status}
         
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error in create_purchase_payment")
         raise HTTPException(status_code=500, detail=f"Error recording payment: {str(e)}")
 
 
@@ -1113,10 +1098,10 @@ def update_purchase_status(
                     item = db.query(InventoryItem).filter(InventoryItem.id == detail.item_id).first()
                     if item:
                         item.unit_price = detail.unit_price
-                        print(f"[AUTO-UPDATE] Updated item {item.name} (ID: {item.id}) unit_price to {detail.unit_price}")
+                        logger.debug("[AUTO-UPDATE] Updated item %s (ID: %s) unit_price to %s", item.name, item.id, detail.unit_price)
             db.commit()
         except Exception as e:
-            print(f"Warning: Could not auto-update item prices: {str(e)}")
+            logger.warning("Could not auto-update item prices: %s", e)
             
     return {"message": "Purchase status updated successfully", "status": purchase.status}
 
@@ -1176,36 +1161,49 @@ def get_transactions(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Optimized with eager loading - no N+1 queries"""
-    from app.models.inventory import InventoryTransaction, StockIssue
-    from sqlalchemy.orm import joinedload
-    query = db.query(InventoryTransaction).options(
-        joinedload(InventoryTransaction.item),
-        joinedload(InventoryTransaction.user)
+    """Stock movements, newest first (projected rows, no N+1 queries)"""
+    return FastJSONResponse(transaction_list_rows(db, skip, limit, item_id))
+
+
+def transaction_list_rows(db: Session, skip: int, limit: int, item_id: Optional[int] = None) -> List[dict]:
+    """
+    InventoryTransactionOut-shaped dicts, newest first: plain columns with item and
+    user names joined in, and stock issue destinations in one extra query.
+    """
+    from app.models.inventory import InventoryItem, InventoryTransaction, Location, StockIssue
+    from sqlalchemy import select
+    query = (
+        select(
+            InventoryTransaction.id, InventoryTransaction.item_id, InventoryItem.name.label("item_name"),
+            InventoryTransaction.transaction_type, InventoryTransaction.quantity, InventoryTransaction.unit_price,
+            InventoryTransaction.total_amount, InventoryTransaction.reference_number,
+            InventoryTransaction.purchase_master_id, InventoryTransaction.notes, InventoryTransaction.created_by,
+            User.name.label("created_by_name"), InventoryTransaction.created_at,
+        )
+        .outerjoin(InventoryItem, InventoryTransaction.item_id == InventoryItem.id)
+        .outerjoin(User, InventoryTransaction.created_by == User.id)
     )
     if item_id:
-        query = query.filter(InventoryTransaction.item_id == item_id)
-    transactions = query.order_by(InventoryTransaction.created_at.desc()).offset(skip).limit(limit).all()
+        query = query.where(InventoryTransaction.item_id == item_id)
+    transactions = db.execute(query.order_by(InventoryTransaction.created_at.desc()).offset(skip).limit(limit)).all()
+    
+    # Destination location of every stock issue on the page
+    issue_numbers = {t.reference_number for t in transactions if t.reference_number and t.reference_number.startswith("ISS-")}
+    destinations = {}
+    if issue_numbers:
+        rows = db.execute(
+            select(StockIssue.issue_number, Location.id, Location.name, Location.building, Location.room_area)
+            .join(Location, StockIssue.destination_location_id == Location.id)
+            .where(StockIssue.issue_number.in_(issue_numbers))
+        )
+        for issue_number, loc_id, name, building, room_area in rows:
+            destinations[issue_number] = f"{building} - {room_area}" if (building or room_area) else name or f"Location {loc_id}"
     
     result = []
     for trans in transactions:
-        # Get destination location if this is a stock issue
-        destination_location_name = None
-        if trans.reference_number and trans.reference_number.startswith("ISS-"):
-            # Try to find the stock issue and get destination location
-            issue = db.query(StockIssue).filter(StockIssue.issue_number == trans.reference_number).first()
-            if issue and issue.destination_location_id:
-                dest_loc = inventory_crud.get_location_by_id(db, issue.destination_location_id)
-                if dest_loc:
-                    destination_location_name = f"{dest_loc.building} - {dest_loc.room_area}" if (dest_loc.building or dest_loc.room_area) else dest_loc.name or f"Location {dest_loc.id}"
-        
-        # Relationships already loaded, no extra queries
-        result.append({
-            **trans.__dict__,
-            "item_name": trans.item.name if trans.item else None,
-            "created_by_name": trans.user.name if trans.user else None,
-            "destination_location_name": destination_location_name
-        })
+        row = trans._asdict()
+        row["destination_location_name"] = destinations.get(trans.reference_number)
+        result.append(row)
     return result
 
 
@@ -1236,8 +1234,7 @@ def create_requisition(
             "details": details
         }
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error in create_requisition")
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Error creating requisition: {str(e)}")
 
@@ -1368,14 +1365,7 @@ def create_issue(
         if isinstance(e, HTTPException):
             raise e
             
-        import traceback
-        traceback.print_exc()
-        # Log to file for debugging
-        try:
-            with open("api_stock_issue_error.log", "a") as f:
-                f.write(f"\n{'='*80}\n{datetime.now()}\nError: {str(e)}\n{traceback.format_exc()}{'='*80}\n")
-        except:
-            pass
+        logger.error("Error creating issue: %s", e, exc_info=True)
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Error creating issue: {str(e)}")
 
@@ -1554,8 +1544,7 @@ def create_waste_log(
         db.rollback()
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error in create_waste_log")
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Error creating waste log: {str(e)}")
 
@@ -1654,11 +1643,11 @@ def get_locations(
                 except Exception as e:
                     # Skip this room and continue
                     db.rollback()
-                    print(f"Warning: Could not sync room {room.number}: {str(e)}")
+                    logger.warning("Could not sync room %s: %s", room.number, e)
                     continue
         except Exception as e:
             # If sync fails completely, just log and continue
-            print(f"Warning: Room sync skipped: {str(e)}")
+            logger.warning("Room sync skipped: %s", e)
             try:
                 db.rollback()
             except:
@@ -2161,96 +2150,107 @@ def get_stock_by_location(
                 })
             except Exception as e:
                 # Skip this location if there's an error
-                print(f"Warning: Error processing location {location.id}: {str(e)}")
+                logger.warning("Error processing location %s: %s", location.id, e)
                 continue
         
         return result
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error in get_stock_by_location")
         raise HTTPException(status_code=500, detail=f"Error fetching stock by location: {str(e)}")
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error in get_stock_by_location")
         raise HTTPException(status_code=500, detail=f"Error fetching stock by location: {str(e)}")
 
 
+def _sync_rooms_to_locations(db: Session, job=None) -> dict:
+    """Create/link a GUEST_ROOM location for every room; see sync_rooms_to_locations"""
+    from app.models.room import Room
+    from app.models.inventory import Location
+    from sqlalchemy import or_
+
+    rooms = db.query(Room).all()
+    synced_count = 0
+    created_count = 0
+    linked_count = 0
+    
+    for index, room in enumerate(rooms):
+        if job:
+            job.progress(index, len(rooms), f"{created_count} locations created, {linked_count} rooms linked")
+        # Check if location already exists for this room
+        existing_location = db.query(Location).filter(
+            or_(
+                Location.name == f"Room {room.number}",
+                Location.room_area == f"Room {room.number}"
+            ),
+            Location.location_type == "GUEST_ROOM"
+        ).first()
+        
+        if existing_location:
+            # Link room to existing location
+            if not room.inventory_location_id:
+                room.inventory_location_id = existing_location.id
+                linked_count += 1
+            synced_count += 1
+        else:
+            # Create new location for room using CRUD function
+            location_data = {
+                "name": f"Room {room.number}",
+                "building": "Main Building",  # Default, can be updated later
+                "floor": None,  # Can be extracted from room number if needed
+                "room_area": f"Room {room.number}",
+                "location_type": "GUEST_ROOM",
+                "is_inventory_point": False,  # Rooms are not inventory points
+                "description": f"Guest room {room.number} - {room.type or 'Standard'}",
+                "is_active": (room.status != "Deleted" if room.status else True)
+            }
+            try:
+                location = inventory_crud.create_location(db, location_data)
+                
+                # Link room to location
+                room.inventory_location_id = location.id
+                created_count += 1
+                synced_count += 1
+            except Exception as e:
+                db.rollback()
+                # Location might already exist, try to find and link
+                existing = db.query(Location).filter(
+                    Location.name == f"Room {room.number}"
+                ).first()
+                if existing and not room.inventory_location_id:
+                    room.inventory_location_id = existing.id
+                    linked_count += 1
+                    synced_count += 1
+    
+    db.commit()
+    
+    return {
+        "message": "Rooms synchronized successfully",
+        "total_rooms": len(rooms),
+        "synced": synced_count,
+        "locations_created": created_count,
+        "rooms_linked": linked_count
+    }
+
+
+@job_handler("inventory.sync_rooms")
+def sync_rooms_job(job):
+    return _sync_rooms_to_locations(job.db, job=job)
+
+
 @router.post("/locations/sync-rooms")
 def sync_rooms_to_locations(
+    background: bool = Query(False, description="Run as a background job (202 + job, poll GET /api/jobs/{id})"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """Synchronize existing rooms from rooms table to locations table for inventory"""
-    from app.models.room import Room
-    from app.models.inventory import Location
-    from app.curd import inventory as inventory_crud
-    
+    if background:
+        return job_accepted(db, "inventory.sync_rooms", {}, current_user)
     try:
-        rooms = db.query(Room).all()
-        synced_count = 0
-        created_count = 0
-        linked_count = 0
-        
-        for room in rooms:
-            # Check if location already exists for this room
-            from sqlalchemy import or_
-            existing_location = db.query(Location).filter(
-                or_(
-                    Location.name == f"Room {room.number}",
-                    Location.room_area == f"Room {room.number}"
-                ),
-                Location.location_type == "GUEST_ROOM"
-            ).first()
-            
-            if existing_location:
-                # Link room to existing location
-                if not room.inventory_location_id:
-                    room.inventory_location_id = existing_location.id
-                    linked_count += 1
-                synced_count += 1
-            else:
-                # Create new location for room using CRUD function
-                location_data = {
-                    "name": f"Room {room.number}",
-                    "building": "Main Building",  # Default, can be updated later
-                    "floor": None,  # Can be extracted from room number if needed
-                    "room_area": f"Room {room.number}",
-                    "location_type": "GUEST_ROOM",
-                    "is_inventory_point": False,  # Rooms are not inventory points
-                    "description": f"Guest room {room.number} - {room.type or 'Standard'}",
-                    "is_active": (room.status != "Deleted" if room.status else True)
-                }
-                try:
-                    location = inventory_crud.create_location(db, location_data)
-                    
-                    # Link room to location
-                    room.inventory_location_id = location.id
-                    created_count += 1
-                    synced_count += 1
-                except Exception as e:
-                    db.rollback()
-                    # Location might already exist, try to find and link
-                    existing = db.query(Location).filter(
-                        Location.name == f"Room {room.number}"
-                    ).first()
-                    if existing and not room.inventory_location_id:
-                        room.inventory_location_id = existing.id
-                        linked_count += 1
-                        synced_count += 1
-        
-        db.commit()
-        
-        return {
-            "message": "Rooms synchronized successfully",
-            "total_rooms": len(rooms),
-            "synced": synced_count,
-            "locations_created": created_count,
-            "rooms_linked": linked_count
-        }
+        return _sync_rooms_to_locations(db)
     except Exception as e:
         db.rollback()
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error in sync_rooms_to_locations")
         raise HTTPException(status_code=500, detail=f"Error syncing rooms: {str(e)}")
 
 
@@ -2302,8 +2302,7 @@ def create_asset_mapping(
         db.rollback()
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error in create_asset_mapping")
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Error creating asset mapping: {str(e)}")
 
@@ -2370,8 +2369,7 @@ def unassign_asset(
             raise HTTPException(status_code=404, detail="Asset mapping not found")
         return {"message": "Asset unassigned successfully"}
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error in unassign_asset")
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Error unassigning asset: {str(e)}")
 
@@ -0,0 +1,63 @@
+"""
+Background job status, listing and cancellation (see app.utils.jobs)
+"""
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.api.auth import get_current_user
+from app.models.job import BackgroundJob, JOB_STATUSES
+from app.models.user import User
+from app.utils.api_optimization import no_store
+from app.utils.jobs import cancel_job, job_to_dict
+
+# Clients poll job status: never serve it from a cache
+router = APIRouter(prefix="/jobs", tags=["Jobs"], dependencies=[Depends(no_store)])
+
+
+@router.get("")
+def list_jobs(
+    job_type: Optional[str] = Query(None),
+    status: Optional[str] = Query(None, description="queued, running, succeeded, failed or cancelled"),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Most recent jobs first, without their results"""
+    if status and status not in JOB_STATUSES:
+        raise HTTPException(status_code=400, detail=f"Unknown status: {status}")
+    query = db.query(BackgroundJob)
+    if job_type:
+        query = query.filter(BackgroundJob.job_type == job_type)
+    if status:
+        query = query.filter(BackgroundJob.status == status)
+    jobs = query.order_by(BackgroundJob.id.desc()).limit(limit).all()
+    return [job_to_dict(job, include_result=False) for job in jobs]
+
+
+@router.get("/{job_id}")
+def get_job(
+    job_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Status, progress and (once succeeded) the result of a job"""
+    job = db.get(BackgroundJob, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job_to_dict(job)
+
+
+@router.post("/{job_id}/cancel")
+def cancel_background_job(
+    job_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Cancel a queued job, or ask a running one to stop at its next checkpoint"""
+    job = cancel_job(db, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, joinedload, selectinload
 from typing import List, Union
 import os
 from app.models.user import User
@@ -10,8 +10,12 @@ from app.utils.booking_id import parse_display_id
 from app.schemas.packages import PackageBookingCreate, PackageOut, PackageBookingOut
 from fastapi.responses import FileResponse
 from app.curd import packages as crud_package
-import shutil
-import uuid
+from app.utils.booking_status import ACTIVE_BOOKING_STATUSES
+from app.utils.bulk_writes import bulk_written
+from app.utils.images import ingest_image, remove_image, attach_image_variants
+import logging
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/packages", tags=["Packages"])
 
@@ -55,32 +59,19 @@ async def create_package_api(
             room_types = None
         
         image_urls = []
+        new_files = []
         try:
             for img in images:
-                # Generate unique filename - handle case where filename might be None
-                original_filename = img.filename if img.filename else "image.jpg"
-                filename = f"pkg_{uuid.uuid4().hex}_{original_filename}"
-                file_path = os.path.join(UPLOAD_DIR, filename)
-                
-                # Use async file operations for better performance with large files
-                try:
-                    # Read file content asynchronously
-                    contents = await img.read()
-                    # Write to disk
-                    with open(file_path, "wb") as buffer:
-                        buffer.write(contents)
-                except (AttributeError, TypeError):
-                    # Fallback to synchronous if async methods not available
-                    with open(file_path, "wb") as buffer:
-                        shutil.copyfileobj(img.file, buffer)
-                
-                # Store with leading slash for proper URL construction
-                normalized_path = file_path.replace('\\', '/')
-                image_urls.append(f"/{normalized_path}")
+                # Streamed to disk in chunks; identical photos share one file
+                stored = ingest_image(img, UPLOAD_DIR, "pkg", url_base=f"/{UPLOAD_DIR}")
+                image_urls.append(stored.url)
+                if not stored.duplicate:
+                    new_files.append(stored.path)
+        except HTTPException:
+            raise
         except Exception as img_error:
-            import traceback
-            error_detail = f"Failed to save package images: {str(img_error)}\n{traceback.format_exc()}"
-            print(f"ERROR: {error_detail}")
+            error_detail = f"Failed to save package images: {str(img_error)}"
+            logger.error("%s", error_detail, exc_info=True)
             import sys
             sys.stderr.write(f"ERROR in create_package_api (image upload): {error_detail}\n")
             raise HTTPException(status_code=500, detail=f"Failed to upload images: {str(img_error)}")
@@ -88,28 +79,21 @@ async def create_package_api(
         try:
             return crud_package.create_package(db, title, description, price, image_urls, booking_type, room_types, theme, default_adults, default_children, max_stay_days, food_included, food_timing, complimentary)
         except Exception as db_error:
-            import traceback
-            error_detail = f"Failed to create package in database: {str(db_error)}\n{traceback.format_exc()}"
-            print(f"ERROR: {error_detail}")
+            error_detail = f"Failed to create package in database: {str(db_error)}"
+            logger.error("%s", error_detail, exc_info=True)
             import sys
             sys.stderr.write(f"ERROR in create_package_api (database): {error_detail}\n")
             # Clean up uploaded images if package creation fails
-            for img_url in image_urls:
-                try:
-                    # Remove leading slash to get actual file path
-                    file_path = img_url.lstrip('/')
-                    if os.path.exists(file_path):
-                        os.remove(file_path)
-                except Exception as cleanup_error:
-                    print(f"Warning: Failed to cleanup image {img_url}: {str(cleanup_error)}")
+            # Only files this request wrote: duplicates belong to existing packages
+            for file_path in new_files:
+                remove_image(file_path)
             raise HTTPException(status_code=500, detail=f"Failed to create package: {str(db_error)}")
     except HTTPException:
         # Re-raise HTTP exceptions (like validation errors) as-is
         raise
     except Exception as e:
-        import traceback
-        error_detail = f"Unexpected error in create_package_api: {str(e)}\n{traceback.format_exc()}"
-        print(f"ERROR: {error_detail}")
+        error_detail = f"Unexpected error in create_package_api: {str(e)}"
+        logger.error("%s", error_detail, exc_info=True)
         import sys
         sys.stderr.write(f"ERROR in create_package_api: {error_detail}\n")
         raise HTTPException(status_code=500, detail=f"Failed to create package: {str(e)}")
@@ -148,32 +132,19 @@ async def create_package_api_slash(
             room_types = None
         
         image_urls = []
+        new_files = []
         try:
             for img in images:
-                # Generate unique filename - handle case where filename might be None
-                original_filename = img.filename if img.filename else "image.jpg"
-                filename = f"pkg_{uuid.uuid4().hex}_{original_filename}"
-                file_path = os.path.join(UPLOAD_DIR, filename)
-                
-                # Use async file operations for better performance with large files
-                try:
-                    # Read file content asynchronously
-                    contents = await img.read()
-                    # Write to disk
-                    with open(file_path, "wb") as buffer:
-                        buffer.write(contents)
-                except (AttributeError, TypeError):
-                    # Fallback to synchronous if async methods not available
-                    with open(file_path, "wb") as buffer:
-                        shutil.copyfileobj(img.file, buffer)
-                
-                # Store with leading slash for proper URL construction
-                normalized_path = file_path.replace('\\', '/')
-                image_urls.append(f"/{normalized_path}")
+                # Streamed to disk in chunks; identical photos share one file
+                stored = ingest_image(img, UPLOAD_DIR, "pkg", url_base=f"/{UPLOAD_DIR}")
+                image_urls.append(stored.url)
+                if not stored.duplicate:
+                    new_files.append(stored.path)
+        except HTTPException:
+            raise
         except Exception as img_error:
-            import traceback
-            error_detail = f"Failed to save package images: {str(img_error)}\n{traceback.format_exc()}"
-            print(f"ERROR: {error_detail}")
+            error_detail = f"Failed to save package images: {str(img_error)}"
+            logger.error("%s", error_detail, exc_info=True)
             import sys
             sys.stderr.write(f"ERROR in create_package_api_slash (image upload): {error_detail}\n")
             raise HTTPException(status_code=500, detail=f"Failed to upload images: {str(img_error)}")
@@ -181,28 +152,21 @@ async def create_package_api_slash(
         try:
             return crud_package.create_package(db, title, description, price, image_urls, booking_type, room_types, theme, default_adults, default_children, max_stay_days, food_included, food_timing, complimentary)
         except Exception as db_error:
-            import traceback
-            error_detail = f"Failed to create package in database: {str(db_error)}\n{traceback.format_exc()}"
-            print(f"ERROR: {error_detail}")
+            error_detail = f"Failed to create package in database: {str(db_error)}"
+            logger.error("%s", error_detail, exc_info=True)
             import sys
             sys.stderr.write(f"ERROR in create_package_api_slash (database): {error_detail}\n")
             # Clean up uploaded images if package creation fails
-            for img_url in image_urls:
-                try:
-                    # Remove leading slash to get actual file path
-                    file_path = img_url.lstrip('/')
-                    if os.path.exists(file_path):
-                        os.remove(file_path)
-                except Exception as cleanup_error:
-                    print(f"Warning: Failed to cleanup image {img_url}: {str(cleanup_error)}")
+            # Only files this request wrote: duplicates belong to existing packages
+            for file_path in new_files:
+                remove_image(file_path)
             raise HTTPException(status_code=500, detail=f"Failed to create package: {str(db_error)}")
     except HTTPException:
         # Re-raise HTTP exceptions (like validation errors) as-is
         raise
     except Exception as e:
-        import traceback
-        error_detail = f"Unexpected error in create_package_api_slash: {str(e)}\n{traceback.format_exc()}"
-        print(f"ERROR: {error_detail}")
+        error_detail = f"Unexpected error in create_package_api_slash: {str(e)}"
+        logger.error("%s", error_detail, exc_info=True)
         import sys
         sys.stderr.write(f"ERROR in create_package_api_slash: {error_detail}\n")
         raise HTTPException(status_code=500, detail=f"Failed to create package: {str(e)}")
@@ -262,14 +226,7 @@ async def update_package_api(
     if images:
         image_urls = []
         for img in images:
-            # Generate unique filename
-            filename = f"pkg_{uuid.uuid4().hex}_{img.filename}"
-            file_path = os.path.join(UPLOAD_DIR, filename)
-            with open(file_path, "wb") as buffer:
-                shutil.copyfileobj(img.file, buffer)
-            # Store with leading slash for proper URL construction
-            normalized_path = file_path.replace('\\', '/')
-            image_urls.append(f"/{normalized_path}")
+            image_urls.append(ingest_image(img, UPLOAD_DIR, "pkg", url_base=f"/{UPLOAD_DIR}").url)
         
         # Add new images to existing ones
         for url in image_urls:
@@ -352,7 +309,7 @@ def book_package_api(
             )
         except Exception as e:
             # Log error but don't fail the booking
-            print(f"Failed to send confirmation email: {str(e)}")
+            logger.error("Failed to send confirmation email: %s", e)
     
     return result
 
@@ -430,7 +387,7 @@ def book_package_guest_api(
                     )
                 except Exception as e:
                     # Log error but don't fail the booking
-                    print(f"Failed to send confirmation email: {str(e)}")
+                    logger.error("Failed to send confirmation email: %s", e)
         
         return result
         
@@ -439,10 +396,7 @@ def book_package_guest_api(
         raise
     except Exception as e:
         # Log the full error for debugging
-        import traceback
-        error_trace = traceback.format_exc()
-        print(f"Error in book_package_guest_api: {str(e)}")
-        print(f"Traceback: {error_trace}")
+        logger.error("Error in book_package_guest_api: %s", e, exc_info=True)
         
         # Return a user-friendly error message
         raise HTTPException(
@@ -468,13 +422,12 @@ def get_bookings(db: Session = Depends(get_db), current_user: User = Depends(get
         ).filter(PackageBooking.package_id.is_not(None)).offset(skip).limit(limit).all()
         return result if result is not None else []
     except Exception as e:
-        import traceback
-        error_detail = f"Failed to fetch package bookings: {str(e)}\n{traceback.format_exc()}"
-        print(f"ERROR: {error_detail}")
+        error_detail = f"Failed to fetch package bookings: {str(e)}"
+        logger.error("%s", error_detail, exc_info=True)
         import sys
         sys.stderr.write(f"ERROR in /packages/bookingsall: {error_detail}\n")
         # Return empty list to prevent frontend breakage
-        print(f"Unexpected error in package bookings endpoint, returning empty list: {str(e)}")
+        logger.error("Unexpected error in package bookings endpoint, returning empty list: %s", e)
         return []
 
 
@@ -488,16 +441,16 @@ def _list_packages_impl(db: Session, skip: int = 0, limit: int = 20):
             limit = 20
         
         # Query directly in the endpoint to apply pagination
-        result = db.query(Package).offset(skip).limit(limit).all()
+        result = db.query(Package).options(selectinload(Package.images)).offset(skip).limit(limit).all()
+        attach_image_variants(db, (img for package in result for img in package.images))
         return result if result is not None else []
     except Exception as e:
-        import traceback
-        error_detail = f"Failed to fetch packages: {str(e)}\n{traceback.format_exc()}"
-        print(f"ERROR: {error_detail}")
+        error_detail = f"Failed to fetch packages: {str(e)}"
+        logger.error("%s", error_detail, exc_info=True)
         import sys
         sys.stderr.write(f"ERROR in /packages: {error_detail}\n")
         # Return empty list to prevent frontend breakage
-        print(f"Unexpected error in packages endpoint, returning empty list: {str(e)}")
+        logger.error("Unexpected error in packages endpoint, returning empty list: %s", e)
         return []
 
 @router.get("", response_model=List[PackageOut])
@@ -548,6 +501,7 @@ def cancel_package_booking(booking_id: Union[str, int], db: Session = Depends(ge
     if booking.rooms:
         room_ids = [br.room_id for br in booking.rooms]
         db.query(Room).filter(Room.id.in_(room_ids)).update({"status": "Available"}, synchronize_session=False)
+        bulk_written(db, Room)
 
     booking.status = "cancelled"
     db.commit()
@@ -605,19 +559,19 @@ def extend_package_booking_checkout(booking_id: Union[str, int], new_checkout: s
     normalized_status = raw_status_lower.replace('_', '-').replace(' ', '-')
     
     # Debug: Print the actual status values for troubleshooting
-    print(f"[DEBUG] Extend package booking - ID: {booking_id}")
-    print(f"[DEBUG]   Guest: {booking.guest_name}")
-    print(f"[DEBUG]   Original status from DB: '{booking.status}'")
-    print(f"[DEBUG]   Raw lower: '{raw_status_lower}'")
-    print(f"[DEBUG]   Normalized: '{normalized_status}'")
-    print(f"[DEBUG]   Check-in: {booking.check_in}, Check-out: {booking.check_out}")
+    logger.debug("Extend package booking - ID: %s", booking_id)
+    logger.debug("Guest: %s", booking.guest_name)
+    logger.debug("Original status from DB: '%s'", booking.status)
+    logger.debug("Raw lower: '%s'", raw_status_lower)
+    logger.debug("Normalized: '%s'", normalized_status)
+    logger.debug("Check-in: %s, Check-out: %s", booking.check_in, booking.check_out)
     
     # First, check if it's explicitly "booked" - this should always be allowed and skip all other checks
     is_booked = normalized_status == 'booked' or raw_status_lower == 'booked'
     
     if is_booked:
         # "booked" status is always valid for extension - skip all other checks
-        print(f"[DEBUG]   Status is 'booked' - allowing extension without further checks")
+        logger.debug("Status is 'booked' - allowing extension without further checks")
         # Continue to date validation and conflict checks below
     else:
         # For non-"booked" statuses, check if it's checked-out
@@ -636,9 +590,9 @@ def extend_package_booking_checkout(booking_id: Union[str, int], new_checkout: s
             raw_status_lower in ['checked_in', 'checked-in', 'checked in']
         )
         
-        print(f"[DEBUG]   Is valid for extension: {is_valid_for_extension}")
-        print(f"[DEBUG]   Is checked out: {is_checked_out}")
-        print(f"[DEBUG]   Has check-in images: id_card={bool(booking.id_card_image_url)}, guest_photo={bool(booking.guest_photo_url)}")
+        logger.debug("Is valid for extension: %s", is_valid_for_extension)
+        logger.debug("Is checked out: %s", is_checked_out)
+        logger.debug("Has check-in images: id_card=%s, guest_photo=%s", bool(booking.id_card_image_url), bool(booking.guest_photo_url))
         
         # Special case: If status is "checked_out" but has check-in images, it might be a data inconsistency
         # Also check if check-out date is in the future (guest is still checked in)
@@ -652,9 +606,9 @@ def extend_package_booking_checkout(booking_id: Union[str, int], new_checkout: s
         # 2. Check-out date is today or in the future (guest should still be checked in)
         # Then treat as checked-in for extension purposes
         if is_checked_out and (has_checkin_images or checkout_is_future):
-            print(f"[DEBUG]   WARNING: Status is 'checked_out' but has check-in images or future checkout date.")
-            print(f"[DEBUG]   Has check-in images: {has_checkin_images}, Checkout is future: {checkout_is_future}")
-            print(f"[DEBUG]   Allowing extension due to data inconsistency - treating as checked-in.")
+            logger.debug("Status is 'checked_out' but has check-in images or future checkout date.")
+            logger.debug("Has check-in images: %s, Checkout is future: %s", has_checkin_images, checkout_is_future)
+            logger.debug("Allowing extension due to data inconsistency - treating as checked-in.")
             # Treat as checked-in for extension purposes
             is_checked_out = False
             is_valid_for_extension = True
@@ -688,7 +642,7 @@ def extend_package_booking_checkout(booking_id: Union[str, int], new_checkout: s
         from app.models.booking import Booking, BookingRoom
         conflicting_bookings = db.query(Booking).join(BookingRoom).filter(
             BookingRoom.room_id.in_(room_ids),
-            Booking.status.in_(['booked', 'checked-in', 'checked_in']),
+            Booking.status.in_(ACTIVE_BOOKING_STATUSES),
             and_(
                 Booking.check_in < new_checkout_date,
                 Booking.check_out > booking.check_out
@@ -705,7 +659,7 @@ def extend_package_booking_checkout(booking_id: Union[str, int], new_checkout: s
         conflicting_package_bookings = db.query(PackageBooking).join(PackageBookingRoom).filter(
             PackageBooking.id != booking_id,
             PackageBookingRoom.room_id.in_(room_ids),
-            PackageBooking.status.in_(['booked', 'checked-in', 'checked_in']),
+            PackageBooking.status.in_(ACTIVE_BOOKING_STATUSES),
             and_(
                 PackageBooking.check_in < new_checkout_date,
                 PackageBooking.check_out > booking.check_out
@@ -746,7 +700,7 @@ def check_in_package_booking(
             f.write(f"Booking ID: {booking_id}\n")
             f.write(f"Amenity Allocation Raw: {amenityAllocation}\n")
     except Exception as e:
-        print(f"Log error: {e}")
+        logger.error("Log error: %s", e)
 
     # Parse display ID (PK-000001) or accept numeric ID
     numeric_id, booking_type = parse_display_id(str(booking_id))
@@ -781,13 +735,7 @@ def check_in_package_booking(
 
     # PROCESS AMENITY ALLOCATION AND SCHEDULED FOOD ORDERS
     if amenityAllocation:
-        try:
-            with open("C:/releasing/orchid/debug_checkin.log", "a") as f:
-                f.write(f"\n[{datetime.now()}] DEBUG: Received amenityAllocation: {amenityAllocation}\n")
-        except:
-            pass
-
-        print(f"DEBUG: Received amenityAllocation: {amenityAllocation}")
+        logger.debug("Received amenityAllocation: %s", amenityAllocation)
         try:
             import json
             from app.models.foodorder import FoodOrder, FoodOrderItem
@@ -796,7 +744,7 @@ def check_in_package_booking(
             
             alloc_data = json.loads(amenityAllocation)
             if not alloc_data:
-                print("DEBUG: alloc_data is empty or None")
+                logger.debug("alloc_data is empty or None")
             else:
                 items = alloc_data.get("items", [])
                 
@@ -805,13 +753,7 @@ def check_in_package_booking(
                 if booking.rooms and len(booking.rooms) > 0:
                     room_id = booking.rooms[0].room_id
                 
-                try:
-                    with open("C:/releasing/orchid/debug_checkin.log", "a") as f:
-                        f.write(f"[{datetime.now()}] DEBUG: Processing {len(items)} items for room_id {room_id}\n")
-                except:
-                    pass
-                
-                print(f"DEBUG: Processing {len(items)} items for room_id {room_id}")
+                logger.debug("Processing %s items for room_id %s", len(items), room_id)
                 
                 if items and room_id:
                     check_in_date = date.today()
@@ -821,13 +763,7 @@ def check_in_package_booking(
                         scheduled_time = item.get("scheduledTime")
                         scheduled_date_str = item.get("scheduledDate")
                         
-                        try:
-                            with open("C:/releasing/orchid/debug_checkin.log", "a") as f:
-                                f.write(f"[{datetime.now()}] DEBUG: Item {name}, Time: {scheduled_time}, Date: {scheduled_date_str}\n")
-                        except:
-                            pass
-                        
-                        print(f"DEBUG: Item {name}, Time: {scheduled_time}, Date: {scheduled_date_str}")
+                        logger.debug("Item %s, Time: %s, Date: %s", name, scheduled_time, scheduled_date_str)
                         
                         # Only create Food Order if it has a specific schedule
                         if name and scheduled_time:
@@ -875,20 +811,14 @@ def check_in_package_booking(
                                  db.add(new_order)
                                  db.flush() # Get ID
                                  
-                                 try:
-                                    with open("C:/releasing/orchid/debug_checkin.log", "a") as f:
-                                        f.write(f"[{datetime.now()}] DEBUG: Created scheduled order {new_order.id}\n")
-                                 except:
-                                    pass
-
-                                 print(f"DEBUG: Created scheduled order {new_order.id}")
+                                 logger.debug("Created scheduled order %s", new_order.id)
                                  
                                  # Logic for adding items to the order
                                  specific_items = item.get("specificFoodItems", [])
                                  items_added = False
 
                                  if specific_items and len(specific_items) > 0:
-                                     print(f"DEBUG: Processing {len(specific_items)} specific food items for order {new_order.id}")
+                                     logger.debug("Processing %s specific food items for order %s", len(specific_items), new_order.id)
                                      for spec_item in specific_items:
                                          f_id = spec_item.get("foodItemId")
                                          qty = spec_item.get("quantity", 1)
@@ -917,38 +847,16 @@ def check_in_package_booking(
                                          db.add(order_item)
                                  
                             except Exception as e:
-                                try:
-                                    with open("C:/releasing/orchid/debug_checkin.log", "a") as f:
-                                        f.write(f"[{datetime.now()}] Error creating scheduled order for {name}: {e}\n")
-                                except:
-                                    pass
-                                print(f"Error creating scheduled order for {name}: {e}")
-                                import traceback
-                                traceback.print_exc()
+                                logger.error("Error creating scheduled order for %s: %s", name, e, exc_info=True)
                             
         except Exception as e:
-            try:
-                with open("C:/releasing/orchid/debug_checkin.log", "a") as f:
-                    f.write(f"[{datetime.now()}] Error processing amenity allocation in check-in: {e}\n")
-            except:
-                pass
-            print(f"Error processing amenity allocation in check-in: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.error("Error processing amenity allocation in check-in: %s", e, exc_info=True)
 
     # Save ID card image
-    id_card_filename = f"id_pkg_{booking_id}_{uuid.uuid4().hex}.jpg"
-    id_card_path = os.path.join(CHECKIN_UPLOAD_DIR, id_card_filename)
-    with open(id_card_path, "wb") as buffer:
-        shutil.copyfileobj(id_card_image.file, buffer)
-    booking.id_card_image_url = id_card_filename
+    booking.id_card_image_url = ingest_image(id_card_image, CHECKIN_UPLOAD_DIR, f"id_pkg_{booking_id}").filename
 
     # Save guest photo
-    guest_photo_filename = f"guest_pkg_{booking_id}_{uuid.uuid4().hex}.jpg"
-    guest_photo_path = os.path.join(CHECKIN_UPLOAD_DIR, guest_photo_filename)
-    with open(guest_photo_path, "wb") as buffer:
-        shutil.copyfileobj(guest_photo.file, buffer)
-    booking.guest_photo_url = guest_photo_filename
+    booking.guest_photo_url = ingest_image(guest_photo, CHECKIN_UPLOAD_DIR, f"guest_pkg_{booking_id}").filename
 
     booking.status = "checked-in"
     # Set the actual check-in timestamp for strict bill scoping
@@ -959,6 +867,7 @@ def check_in_package_booking(
     if booking.rooms:
         room_ids = [br.room_id for br in booking.rooms]
         db.query(Room).filter(Room.id.in_(room_ids)).update({"status": "Checked-in"}, synchronize_session=False)
+        bulk_written(db, Room)
 
     db.commit()
     db.refresh(booking)
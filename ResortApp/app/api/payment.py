@@ -1,20 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from app.database import SessionLocal
 from app.schemas.payment import PaymentCreate, PaymentOut, VoucherCreate, VoucherOut
 from app.models.user import User
 from app.curd import payment as crud
-from app.utils.auth import get_current_user
+from app.utils.auth import get_db, get_current_user
 
 router = APIRouter(prefix="/payments", tags=["Payments & Vouchers"])
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 @router.post("", response_model=PaymentOut)
 def create_payment(payment: PaymentCreate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
     return crud.create_payment(db, payment)
@@ -3,7 +3,8 @@ Public API endpoints for user-facing frontend
 These endpoints don't require authentication
 """
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import select
+from sqlalchemy.orm import Session, selectinload
 from app.database import SessionLocal
 from app.models.room import Room
 from app.models.Package import Package, PackageBooking, PackageBookingRoom
@@ -13,9 +14,12 @@ from app.models.food_category import FoodCategory
 from app.models.service import Service
 from app.schemas.packages import PackageOut
 from app.schemas.room import RoomOut
-from typing import List
+from typing import Dict, List
 from pydantic import BaseModel
 from datetime import date
+import logging
+
+logger = logging.getLogger(__name__)
 
 # Import other schemas if needed or stick to simple
 router = APIRouter(prefix="/public", tags=["Public"])
@@ -52,13 +56,71 @@ class PublicPackageBookingOut(BaseModel):
     class Config: from_attributes = True
 
 
+def public_rooms_statement(skip: int, limit: int):
+    return select(Room).where(Room.status == "Available").offset(skip).limit(limit)
+
+
+def public_packages_statement(skip: int, limit: int):
+    # Images eager-loaded: PackageOut includes them and an AsyncSession cannot lazy load
+    return select(Package).options(selectinload(Package.images)).offset(skip).limit(limit)
+
+
+def public_bookings_statement(skip: int, limit: int):
+    """A page of bookings as plain columns, one row per booked room (room_id None for a booking without rooms)"""
+    page = select(Booking.id, Booking.status, Booking.check_in, Booking.check_out).offset(skip).limit(limit).subquery()
+    return (
+        select(page, BookingRoom.room_id)
+        .outerjoin(BookingRoom, BookingRoom.booking_id == page.c.id)
+        .order_by(page.c.id)
+    )
+
+
+def public_package_bookings_statement(skip: int, limit: int):
+    """A page of package bookings as plain columns, one row per booked room"""
+    page = select(
+        PackageBooking.id, PackageBooking.status, PackageBooking.check_in,
+        PackageBooking.check_out, PackageBooking.package_id,
+    ).offset(skip).limit(limit).subquery()
+    return (
+        select(page, PackageBookingRoom.room_id)
+        .outerjoin(PackageBookingRoom, PackageBookingRoom.package_booking_id == page.c.id)
+        .order_by(page.c.id)
+    )
+
+
+def public_bookings_from_rows(rows) -> List[PublicBookingOut]:
+    bookings: Dict[int, PublicBookingOut] = {}
+    for booking_id, status, check_in, check_out, room_id in rows:
+        out = bookings.get(booking_id)
+        if out is None:
+            out = bookings[booking_id] = PublicBookingOut(
+                id=booking_id, status=status, check_in=check_in, check_out=check_out, rooms=[]
+            )
+        if room_id:
+            out.rooms.append(PublicRoomRef(id=room_id))
+    return list(bookings.values())
+
+
+def public_package_bookings_from_rows(rows) -> List[PublicPackageBookingOut]:
+    bookings: Dict[int, PublicPackageBookingOut] = {}
+    for booking_id, status, check_in, check_out, package_id, room_id in rows:
+        out = bookings.get(booking_id)
+        if out is None:
+            out = bookings[booking_id] = PublicPackageBookingOut(
+                id=booking_id, status=status, check_in=check_in, check_out=check_out,
+                rooms=[], package_id=package_id,
+            )
+        if room_id:
+            out.rooms.append(PublicPackageRoomRef(room_id=room_id))
+    return list(bookings.values())
+
+
 # Public Rooms endpoint
 @router.get("/rooms", response_model=List[RoomOut])
 def get_public_rooms(db: Session = Depends(get_db), skip: int = 0, limit: int = 100):
     """Get all available rooms without authentication"""
     try:
-        rooms = db.query(Room).filter(Room.status == "Available").offset(skip).limit(limit).all()
-        return rooms
+        return db.execute(public_rooms_statement(skip, limit)).scalars().all()
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching rooms: {str(e)}")
 
@@ -67,8 +129,7 @@ def get_public_rooms(db: Session = Depends(get_db), skip: int = 0, limit: int =
 def get_public_packages(db: Session = Depends(get_db), skip: int = 0, limit: int = 100):
     """Get all packages without authentication"""
     try:
-        packages = db.query(Package).offset(skip).limit(limit).all()
-        return packages
+        return db.execute(public_packages_statement(skip, limit)).scalars().all()
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching packages: {str(e)}")
 
@@ -77,8 +138,7 @@ def get_public_packages(db: Session = Depends(get_db), skip: int = 0, limit: int
 def get_public_food_items(db: Session = Depends(get_db)):
     """Get all food items without authentication"""
     try:
-        food_items = db.query(FoodItem).all()
-        return food_items
+        return db.execute(select(FoodItem)).unique().scalars().all()
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching food items: {str(e)}")
 
@@ -87,8 +147,7 @@ def get_public_food_items(db: Session = Depends(get_db)):
 def get_public_food_categories(db: Session = Depends(get_db)):
     """Get all food categories without authentication"""
     try:
-        categories = db.query(FoodCategory).all()
-        return categories
+        return db.execute(select(FoodCategory)).scalars().all()
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching food categories: {str(e)}")
 
@@ -97,62 +156,26 @@ def get_public_food_categories(db: Session = Depends(get_db)):
 def get_public_services(db: Session = Depends(get_db)):
     """Get all services without authentication"""
     try:
-        services = db.query(Service).all()
-        return services
+        return db.execute(select(Service)).scalars().all()
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching services: {str(e)}")
 
 # Public Bookings Availability
 @router.get("/bookings", response_model=List[PublicBookingOut])
 def get_public_bookings(db: Session = Depends(get_db), skip: int = 0, limit: int = 500):
-    """Get minimal booking data for availability calculation"""
+    """Get minimal booking data for availability calculation, read as plain columns"""
     try:
-        bookings = db.query(Booking).options(joinedload(Booking.booking_rooms)).offset(skip).limit(limit).all()
-        # Manually construct to map booking_rooms -> rooms
-        results = []
-        for b in bookings:
-            room_refs = []
-            if b.booking_rooms:
-                for br in b.booking_rooms:
-                    if br.room_id:
-                         room_refs.append(PublicRoomRef(id=br.room_id))
-            
-            results.append(PublicBookingOut(
-                id=b.id,
-                status=b.status,
-                check_in=b.check_in,
-                check_out=b.check_out,
-                rooms=room_refs
-            ))
-        return results
+        return public_bookings_from_rows(db.execute(public_bookings_statement(skip, limit)))
     except Exception as e:
-        print(f"Error fetching public bookings: {e}")
+        logger.error("Error fetching public bookings: %s", e)
         return []
 
 # Public Package Bookings Availability
 @router.get("/package-bookings", response_model=List[PublicPackageBookingOut])
 def get_public_package_bookings(db: Session = Depends(get_db), skip: int = 0, limit: int = 500):
-    """Get minimal package booking data for availability calculation"""
+    """Get minimal package booking data for availability calculation, read as plain columns"""
     try:
-        bookings = db.query(PackageBooking).options(joinedload(PackageBooking.rooms)).offset(skip).limit(limit).all()
-        # Manually construct
-        results = []
-        for b in bookings:
-            room_refs = []
-            if b.rooms:
-                for br in b.rooms:
-                    if br.room_id:
-                         room_refs.append(PublicPackageRoomRef(room_id=br.room_id))
-            
-            results.append(PublicPackageBookingOut(
-                id=b.id,
-                status=b.status,
-                check_in=b.check_in,
-                check_out=b.check_out,
-                rooms=room_refs,
-                package_id=b.package_id
-            ))
-        return results
+        return public_package_bookings_from_rows(db.execute(public_package_bookings_statement(skip, limit)))
     except Exception as e:
-        print(f"Error fetching public package bookings: {e}")
+        logger.error("Error fetching public package bookings: %s", e)
         return []
@@ -10,6 +10,9 @@ from app.models.recipe import Recipe, RecipeIngredient
 from app.models.food_item import FoodItem
 from app.models.inventory import InventoryItem
 from app.schemas.recipe import RecipeCreate, RecipeUpdate, RecipeOut, RecipeIngredientOut
+import logging
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/recipes", tags=["Recipes"])
 
@@ -83,9 +86,7 @@ def create_recipe(
         raise
     except Exception as e:
         db.rollback()
-        import traceback
-        print(f"[ERROR] Error creating recipe: {str(e)}")
-        print(traceback.format_exc())
+        logger.error("Error creating recipe: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to create recipe: {str(e)}")
 
 
@@ -122,9 +123,7 @@ def get_recipes(
         return result
         
     except Exception as e:
-        import traceback
-        print(f"[ERROR] Error fetching recipes: {str(e)}")
-        print(traceback.format_exc())
+        logger.error("Error fetching recipes: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to fetch recipes: {str(e)}")
 
 
@@ -156,9 +155,7 @@ def get_recipe(
     except HTTPException:
         raise
     except Exception as e:
-        import traceback
-        print(f"[ERROR] Error fetching recipe: {str(e)}")
-        print(traceback.format_exc())
+        logger.error("Error fetching recipe: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to fetch recipe: {str(e)}")
 
 
@@ -234,9 +231,7 @@ def update_recipe(
         raise
     except Exception as e:
         db.rollback()
-        import traceback
-        print(f"[ERROR] Error updating recipe: {str(e)}")
-        print(traceback.format_exc())
+        logger.error("Error updating recipe: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to update recipe: {str(e)}")
 
 
@@ -261,9 +256,7 @@ def delete_recipe(
         raise
     except Exception as e:
         db.rollback()
-        import traceback
-        print(f"[ERROR] Error deleting recipe: {str(e)}")
-        print(traceback.format_exc())
+        logger.error("Error deleting recipe: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to delete recipe: {str(e)}")
 
 
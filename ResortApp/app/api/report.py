@@ -8,6 +8,9 @@ from app.utils.auth import get_db, get_current_user
 from app import models as models
 from app.schemas import booking as booking_schema, packages as package_schema, suggestion as suggestion_schema
 from app.schemas.foodorder import FoodOrderItemOut
+from app.utils.occupancy import current_stay_for_room_id
+from app.utils.date_utils import start_of_next_day
+from app.utils.booking_status import CHECKED_IN, CHECKED_OUT
 from pydantic import BaseModel, Field
 
 router = APIRouter(prefix="/reports", tags=["Reports"])
@@ -117,36 +120,9 @@ def get_food_orders(
     room_map = {r.id: r for r in db.query(models.Room).all()}
 
     def get_guest_for_room(room_id, db_session):
-        if not room_id:
-            return None
-        # Find the most recent active booking associated with this room (check both regular and package bookings)
-        # Check regular bookings first
-        active_booking = (
-            db_session.query(models.Booking)
-            .join(models.booking.BookingRoom)
-            .filter(models.booking.BookingRoom.room_id == room_id)
-            .filter(models.Booking.status.in_(["checked-in", "booked"]))
-            .order_by(models.Booking.id.desc())
-            .first()
-        )
-        
-        if active_booking:
-            return active_booking.guest_name
-        
-        # Check package bookings if no regular booking found
-        active_package_booking = (
-            db_session.query(models.PackageBooking)
-            .join(models.PackageBookingRoom)
-            .filter(models.PackageBookingRoom.room_id == room_id)
-            .filter(models.PackageBooking.status.in_(["checked-in", "booked"]))
-            .order_by(models.PackageBooking.id.desc())
-            .first()
-        )
-        
-        if active_package_booking:
-            return active_package_booking.guest_name
-        
-        return None
+        # Current guest of the room, from the cached occupancy map
+        booking, _ = current_stay_for_room_id(db_session, room_id) if room_id else (None, False)
+        return booking.guest_name if booking else None
 
     return [
         {
@@ -480,13 +456,13 @@ def get_checkin_by_employee_report(
     regular_checkins = (
         db.query(models.User.name, func.count(models.Booking.id))
         .join(models.User, models.Booking.user_id == models.User.id)
-        .filter(models.Booking.status.in_(["checked-in", "checked_out"]))
+        .filter(models.Booking.status.in_((CHECKED_IN, CHECKED_OUT)))
     )
     # Query for package bookings
     package_checkins = (
         db.query(models.User.name, func.count(models.PackageBooking.id))
         .join(models.User, models.PackageBooking.user_id == models.User.id)
-        .filter(models.PackageBooking.status.in_(["checked-in", "checked_out"]))
+        .filter(models.PackageBooking.status.in_((CHECKED_IN, CHECKED_OUT)))
     )
 
     # This example will only count regular bookings for simplicity.
@@ -693,7 +669,7 @@ def _get_guest_profile_data(db: Session, email: Optional[str], mobile: Optional[
                 .filter(StockIssue.destination_location_id == room.inventory_location_id)
                 .filter(StockIssue.issue_date >= booking_obj.check_in)
                 # Assuming check_in/out are Dates, cast to datetime for comparison or rely on SQL alchemy handling date vs datetime
-                .filter(func.date(StockIssue.issue_date) <= booking_obj.check_out) 
+                .filter(StockIssue.issue_date < start_of_next_day(booking_obj.check_out)) 
                 .options(
                     joinedload(StockIssueDetail.item).joinedload(InventoryItem.category),
                     joinedload(StockIssueDetail.issue)
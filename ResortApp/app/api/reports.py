@@ -13,6 +13,7 @@ from app.models.service import AssignedService
 from app.models.foodorder import FoodOrder
 from app.models.Package import PackageBooking
 from app.models.employee import Employee, WorkingLog
+from app.utils.booking_status import CHECKED_IN, CHECKED_OUT
 
 router = APIRouter(prefix="/reports", tags=["Reports"])
 
@@ -74,7 +75,7 @@ def get_checkin_by_employee_report(from_date: Optional[date] = None, to_date: Op
             func.count(Booking.id).label("checkin_count"),
         )
         .join(User, Booking.user_id == User.id)
-        .filter(Booking.status.in_(["checked-in", "checked_out"]))
+        .filter(Booking.status.in_((CHECKED_IN, CHECKED_OUT)))
     )
 
     if from_date:
@@ -9,7 +9,7 @@ from datetime import datetime, date, timedelta
 from typing import Optional, List
 from decimal import Decimal
 
-from app.database import get_db
+from app.utils.read_replica import get_read_db
 from app.utils.auth import get_current_user
 from app.models import (
     Booking, BookingRoom, PackageBooking, PackageBookingRoom,
@@ -22,6 +22,9 @@ from app.models import (
 from app.models.checkout import CheckoutPayment, CheckoutVerification
 from app.models.employee import WorkingLog, Leave
 from app.utils.api_optimization import apply_api_optimizations
+from app.utils.report_cache import cached_report
+from app.utils.date_utils import on_day, start_of_day, start_of_next_day
+from app.utils.booking_status import ACTIVE_BOOKING_STATUSES
 
 router = APIRouter(prefix="/reports", tags=["Reports"])
 
@@ -36,7 +39,7 @@ def get_daily_arrival_report(
     report_date: Optional[date] = Query(None, description="Date for arrival report (default: today)"),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: dict = Depends(get_current_user)
 ):
     """Daily Arrival Report: List of guests checking in today"""
@@ -121,7 +124,7 @@ def get_daily_departure_report(
     report_date: Optional[date] = Query(None, description="Date for departure report (default: today)"),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: dict = Depends(get_current_user)
 ):
     """Daily Departure Report: List of guests checking out"""
@@ -129,7 +132,7 @@ def get_daily_departure_report(
         report_date = date.today()
     
     checkouts = db.query(Checkout).filter(
-        func.date(Checkout.checkout_date) == report_date
+        on_day(Checkout.checkout_date, report_date)
     ).options(
         joinedload(Checkout.booking),
         joinedload(Checkout.package_booking),
@@ -161,7 +164,7 @@ def get_daily_departure_report(
 @apply_api_optimizations
 def get_occupancy_report(
     report_date: Optional[date] = Query(None, description="Date for occupancy report (default: today)"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: dict = Depends(get_current_user)
 ):
     """Occupancy Report: % of rooms occupied vs vacant"""
@@ -175,7 +178,7 @@ def get_occupancy_report(
         and_(
             Booking.check_in <= report_date,
             Booking.check_out > report_date,
-            Booking.status.in_(["checked-in", "booked"])
+            Booking.status.in_(ACTIVE_BOOKING_STATUSES)
         )
     ).count()
     
@@ -183,7 +186,7 @@ def get_occupancy_report(
         and_(
             PackageBooking.check_in <= report_date,
             PackageBooking.check_out > report_date,
-            PackageBooking.status.in_(["checked-in", "booked"])
+            PackageBooking.status.in_(ACTIVE_BOOKING_STATUSES)
         )
     ).count()
     
@@ -200,6 +203,49 @@ def get_occupancy_report(
     }
 
 
+@router.get("/front-office/occupancy-series")
+@apply_api_optimizations
+def get_occupancy_series_report(
+    start_date: Optional[date] = Query(None, description="First night (default: 29 days before end_date)"),
+    end_date: Optional[date] = Query(None, description="Last night (default: today)"),
+    db: Session = Depends(get_read_db),
+    current_user: dict = Depends(get_current_user)
+):
+    """Occupancy Series: occupancy %, ADR, RevPAR, arrivals, departures and in-house guests per night over a range"""
+    from app.utils.occupancy_series import MAX_SERIES_DAYS, occupancy_series
+
+    if not end_date:
+        end_date = date.today()
+    if not start_date:
+        start_date = end_date - timedelta(days=29)
+    if start_date > end_date:
+        raise HTTPException(status_code=400, detail="start_date must be on or before end_date")
+    if (end_date - start_date).days + 1 > MAX_SERIES_DAYS:
+        raise HTTPException(status_code=400, detail=f"Date range cannot exceed {MAX_SERIES_DAYS} days")
+
+    days = occupancy_series(db, start_date, end_date)
+    total_rooms = days[0]["total_rooms"]
+    room_nights = sum(d["occupied_rooms"] for d in days)
+    room_revenue = sum(d["room_revenue"] for d in days)
+    available_nights = total_rooms * len(days)
+
+    return {
+        "start_date": start_date.isoformat(),
+        "end_date": end_date.isoformat(),
+        "days": days,
+        "summary": {
+            "total_rooms": total_rooms,
+            "room_nights_sold": room_nights,
+            "room_revenue": round(room_revenue, 2),
+            "occupancy_percentage": round(room_nights / available_nights * 100, 2) if available_nights else 0,
+            "adr": round(room_revenue / room_nights, 2) if room_nights else 0,
+            "revpar": round(room_revenue / available_nights, 2) if available_nights else 0,
+            "arrivals": sum(d["arrivals"] for d in days),
+            "departures": sum(d["departures"] for d in days),
+        }
+    }
+
+
 @router.get("/front-office/police-c-form")
 @apply_api_optimizations
 def get_police_c_form_report(
@@ -207,13 +253,13 @@ def get_police_c_form_report(
     end_date: Optional[date] = Query(None),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: dict = Depends(get_current_user)
 ):
     """Police / C-Form Report: List of foreign nationals (Legal Requirement)"""
     # Note: This requires passport/visa fields in Booking model
     # For now, returning all bookings - can be filtered by nationality when field is added
-    query = db.query(Booking).filter(Booking.status.in_(["checked-in", "booked"]))
+    query = db.query(Booking).filter(Booking.status.in_(ACTIVE_BOOKING_STATUSES))
     
     if start_date:
         query = query.filter(Booking.check_in >= start_date)
@@ -243,9 +289,10 @@ def get_police_c_form_report(
 
 @router.get("/front-office/night-audit")
 @apply_api_optimizations
+@cached_report("reports.night_audit")
 def get_night_audit_report(
     audit_date: Optional[date] = Query(None, description="Date for night audit (default: yesterday)"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: dict = Depends(get_current_user)
 ):
     """Night Audit Report: Summary of day's total business closed at midnight"""
@@ -254,22 +301,22 @@ def get_night_audit_report(
     
     # Room revenue
     room_revenue = db.query(func.sum(Checkout.room_total)).filter(
-        func.date(Checkout.checkout_date) == audit_date
+        on_day(Checkout.checkout_date, audit_date)
     ).scalar() or 0
     
     # Food & Beverage revenue
     food_revenue = db.query(func.sum(Checkout.food_total)).filter(
-        func.date(Checkout.checkout_date) == audit_date
+        on_day(Checkout.checkout_date, audit_date)
     ).scalar() or 0
     
     # Service revenue
     service_revenue = db.query(func.sum(Checkout.service_total)).filter(
-        func.date(Checkout.checkout_date) == audit_date
+        on_day(Checkout.checkout_date, audit_date)
     ).scalar() or 0
     
     # Tax collected
     tax_collected = db.query(func.sum(Checkout.tax_amount)).filter(
-        func.date(Checkout.checkout_date) == audit_date
+        on_day(Checkout.checkout_date, audit_date)
     ).scalar() or 0
     
     # Total revenue
@@ -277,7 +324,7 @@ def get_night_audit_report(
     
     # Checkouts count
     checkouts_count = db.query(Checkout).filter(
-        func.date(Checkout.checkout_date) == audit_date
+        on_day(Checkout.checkout_date, audit_date)
     ).count()
     
     return {
@@ -298,7 +345,7 @@ def get_no_show_cancellation_report(
     end_date: Optional[date] = Query(None),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: dict = Depends(get_current_user)
 ):
     """No-Show & Cancellation Report: Revenue loss tracking"""
@@ -343,7 +390,7 @@ def get_no_show_cancellation_report(
 def get_in_house_guest_list(
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: dict = Depends(get_current_user)
 ):
     """In-House Guest List: Currently checked-in guests (Emergency evacuation list)"""
@@ -409,9 +456,10 @@ def get_in_house_guest_list(
 
 @router.get("/restaurant/daily-sales-summary")
 @apply_api_optimizations
+@cached_report("reports.daily_sales_summary")
 def get_daily_sales_summary(
     report_date: Optional[date] = Query(None, description="Date for sales summary (default: today)"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: dict = Depends(get_current_user)
 ):
     """Daily Sales Summary: Food vs Beverage vs Alcohol sales by meal period"""
@@ -420,7 +468,7 @@ def get_daily_sales_summary(
     
     # Get all food orders for the date
     orders = db.query(FoodOrder).filter(
-        func.date(FoodOrder.created_at) == report_date
+        on_day(FoodOrder.created_at, report_date)
     ).options(
         joinedload(FoodOrder.items).joinedload(FoodOrderItem.food_item)
     ).all()
@@ -473,12 +521,13 @@ def get_daily_sales_summary(
 
 @router.get("/restaurant/item-wise-sales")
 @apply_api_optimizations
+@cached_report("reports.item_wise_sales")
 def get_item_wise_sales_report(
     start_date: Optional[date] = Query(None),
     end_date: Optional[date] = Query(None),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: dict = Depends(get_current_user)
 ):
     """Item-wise Sales Report: Which dish is selling the most?"""
@@ -494,9 +543,9 @@ def get_item_wise_sales_report(
     )
     
     if start_date:
-        query = query.filter(func.date(FoodOrder.created_at) >= start_date)
+        query = query.filter(FoodOrder.created_at >= start_of_day(start_date))
     if end_date:
-        query = query.filter(func.date(FoodOrder.created_at) <= end_date)
+        query = query.filter(FoodOrder.created_at < start_of_next_day(end_date))
     
     query = query.group_by(FoodItem.id, FoodItem.name).order_by(
         func.sum(FoodOrderItem.quantity * FoodItem.price).desc()
@@ -519,12 +568,13 @@ def get_item_wise_sales_report(
 
 @router.get("/restaurant/kot-analysis")
 @apply_api_optimizations
+@cached_report("reports.kot_analysis")
 def get_kot_analysis(
     start_date: Optional[date] = Query(None),
     end_date: Optional[date] = Query(None),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: dict = Depends(get_current_user)
 ):
     """KOT Analysis: Time between Order (KOT) and Service (Kitchen Efficiency)"""
@@ -533,9 +583,9 @@ def get_kot_analysis(
     query = db.query(FoodOrder).filter(FoodOrder.status == "completed")
     
     if start_date:
-        query = query.filter(func.date(FoodOrder.created_at) >= start_date)
+        query = query.filter(FoodOrder.created_at >= start_of_day(start_date))
     if end_date:
-        query = query.filter(func.date(FoodOrder.created_at) <= end_date)
+        query = query.filter(FoodOrder.created_at < start_of_next_day(end_date))
     
     orders = query.options(
         joinedload(FoodOrder.room),
@@ -568,12 +618,13 @@ def get_kot_analysis(
 
 @router.get("/restaurant/void-cancellation")
 @apply_api_optimizations
+@cached_report("reports.void_cancellation")
 def get_void_cancellation_report(
     start_date: Optional[date] = Query(None),
     end_date: Optional[date] = Query(None),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: dict = Depends(get_current_user)
 ):
     """Void / Cancellation Report: Tracks orders deleted after being punched (Security)"""
@@ -584,9 +635,9 @@ def get_void_cancellation_report(
     )
     
     if start_date:
-        query = query.filter(func.date(FoodOrder.created_at) >= start_date)
+        query = query.filter(FoodOrder.created_at >= start_of_day(start_date))
     if end_date:
-        query = query.filter(func.date(FoodOrder.created_at) <= end_date)
+        query = query.filter(FoodOrder.created_at < start_of_next_day(end_date))
     
     orders = query.options(
         joinedload(FoodOrder.room),
@@ -612,12 +663,13 @@ def get_void_cancellation_report(
 
 @router.get("/restaurant/discount-complimentary")
 @apply_api_optimizations
+@cached_report("reports.discount_complimentary")
 def get_discount_complimentary_report(
     start_date: Optional[date] = Query(None),
     end_date: Optional[date] = Query(None),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: dict = Depends(get_current_user)
 ):
     """Discount & Complimentary Report: Free meals given (Manager approval tracking)"""
@@ -630,9 +682,9 @@ def get_discount_complimentary_report(
     )
     
     if start_date:
-        query = query.filter(func.date(FoodOrder.created_at) >= start_date)
+        query = query.filter(FoodOrder.created_at >= start_of_day(start_date))
     if end_date:
-        query = query.filter(func.date(FoodOrder.created_at) <= end_date)
+        query = query.filter(FoodOrder.created_at < start_of_next_day(end_date))
     
     orders = query.options(
         joinedload(FoodOrder.room),
@@ -658,12 +710,13 @@ def get_discount_complimentary_report(
 
 @router.get("/restaurant/nc-report")
 @apply_api_optimizations
+@cached_report("reports.nc_report")
 def get_nc_report(
     start_date: Optional[date] = Query(None),
     end_date: Optional[date] = Query(None),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: dict = Depends(get_current_user)
 ):
     """NC (Non-Chargeable) Report: Food given to Staff or Owners"""
@@ -673,9 +726,9 @@ def get_nc_report(
     )
     
     if start_date:
-        query = query.filter(func.date(FoodOrder.created_at) >= start_date)
+        query = query.filter(FoodOrder.created_at >= start_of_day(start_date))
     if end_date:
-        query = query.filter(func.date(FoodOrder.created_at) <= end_date)
+        query = query.filter(FoodOrder.created_at < start_of_next_day(end_date))
     
     orders = query.options(
         joinedload(FoodOrder.employee),
@@ -715,7 +768,7 @@ def get_stock_status_report(
     location: Optional[str] = Query(None),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: dict = Depends(get_current_user)
 ):
     """Stock Status Report: Current quantity and value of every item"""
@@ -753,7 +806,7 @@ def get_stock_status_report(
 @router.get("/inventory/low-stock-alert")
 @apply_api_optimizations
 def get_low_stock_alert(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: dict = Depends(get_current_user)
 ):
     """Low Stock Alert Report: Items below minimum level"""
@@ -786,7 +839,7 @@ def get_low_stock_alert(
 @apply_api_optimizations
 def get_expiry_aging_report(
     days_ahead: int = Query(3, ge=1, le=30, description="Days ahead to check for expiry"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: dict = Depends(get_current_user)
 ):
     """Expiry / Aging Report: Perishable items expiring in next N days"""
@@ -825,13 +878,14 @@ def get_expiry_aging_report(
 
 @router.get("/inventory/stock-movement")
 @apply_api_optimizations
+@cached_report("reports.stock_movement")
 def get_stock_movement_register(
     item_id: Optional[int] = Query(None),
     start_date: Optional[date] = Query(None),
     end_date: Optional[date] = Query(None),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: dict = Depends(get_current_user)
 ):
     """Stock Movement Register: History of item (In -> Move -> Out)"""
@@ -842,9 +896,9 @@ def get_stock_movement_register(
     if item_id:
         query = query.filter(InventoryTransaction.item_id == item_id)
     if start_date:
-        query = query.filter(func.date(InventoryTransaction.created_at) >= start_date)
+        query = query.filter(InventoryTransaction.created_at >= start_of_day(start_date))
     if end_date:
-        query = query.filter(func.date(InventoryTransaction.created_at) <= end_date)
+        query = query.filter(InventoryTransaction.created_at < start_of_next_day(end_date))
     
     transactions = query.order_by(InventoryTransaction.created_at.desc()).offset(skip).limit(limit).all()
     
@@ -873,7 +927,7 @@ def get_waste_spoilage_report(
     end_date: Optional[date] = Query(None),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: dict = Depends(get_current_user)
 ):
     """Waste & Spoilage Report: Value of items thrown away"""
@@ -883,9 +937,9 @@ def get_waste_spoilage_report(
         )
         
         if start_date:
-            query = query.filter(func.date(WasteLog.created_at) >= start_date)
+            query = query.filter(WasteLog.created_at >= start_of_day(start_date))
         if end_date:
-            query = query.filter(func.date(WasteLog.created_at) <= end_date)
+            query = query.filter(WasteLog.created_at < start_of_next_day(end_date))
         
         waste_logs = query.order_by(WasteLog.created_at.desc()).offset(skip).limit(limit).all()
         
@@ -915,13 +969,14 @@ def get_waste_spoilage_report(
 
 @router.get("/inventory/purchase-register")
 @apply_api_optimizations
+@cached_report("reports.purchase_register")
 def get_purchase_register(
     start_date: Optional[date] = Query(None),
     end_date: Optional[date] = Query(None),
     vendor_id: Optional[int] = Query(None),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: dict = Depends(get_current_user)
 ):
     """Purchase Register: List of all Vendor Bills entered"""
@@ -964,7 +1019,7 @@ def get_variance_report(
     location: Optional[str] = Query(None),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: dict = Depends(get_current_user)
 ):
     """Variance Report: Difference between System Stock and Physical Audit Stock"""
@@ -1008,7 +1063,7 @@ def get_variance_report(
 @router.get("/housekeeping/room-discrepancy")
 @apply_api_optimizations
 def get_room_discrepancy_report(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: dict = Depends(get_current_user)
 ):
     """Room Discrepancy Report: Front Desk vs Housekeeping status mismatch"""
@@ -1051,7 +1106,7 @@ def get_room_discrepancy_report(
 def get_laundry_cost_report(
     start_date: Optional[date] = Query(None),
     end_date: Optional[date] = Query(None),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: dict = Depends(get_current_user)
 ):
     """Laundry Cost Report: Linen sent vs returned, torn/damaged tracking"""
@@ -1062,9 +1117,9 @@ def get_laundry_cost_report(
     )
     
     if start_date:
-        query = query.filter(func.date(InventoryTransaction.created_at) >= start_date)
+        query = query.filter(InventoryTransaction.created_at >= start_of_day(start_date))
     if end_date:
-        query = query.filter(func.date(InventoryTransaction.created_at) <= end_date)
+        query = query.filter(InventoryTransaction.created_at < start_of_next_day(end_date))
     
     transactions = query.options(
         joinedload(InventoryTransaction.item)
@@ -1101,7 +1156,7 @@ def get_minibar_consumption_report(
     end_date: Optional[date] = Query(None),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: dict = Depends(get_current_user)
 ):
     """Minibar Consumption: Items consumed from room minibars"""
@@ -1111,9 +1166,9 @@ def get_minibar_consumption_report(
     )
     
     if start_date:
-        query = query.filter(func.date(Checkout.checkout_date) >= start_date)
+        query = query.filter(Checkout.checkout_date >= start_of_day(start_date))
     if end_date:
-        query = query.filter(func.date(Checkout.checkout_date) <= end_date)
+        query = query.filter(Checkout.checkout_date < start_of_next_day(end_date))
     
     verifications = query.options(
         joinedload(CheckoutVerification.checkout)
@@ -1147,7 +1202,7 @@ def get_lost_found_register(
     status: Optional[str] = Query(None, description="Filter by status: found, claimed, disposed"),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: dict = Depends(get_current_user)
 ):
     """Lost & Found Register: Items left behind by guests"""
@@ -1167,7 +1222,7 @@ def get_maintenance_ticket_log(
     status: Optional[str] = Query(None, description="Filter by status: pending, in_progress, completed"),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: dict = Depends(get_current_user)
 ):
     """Maintenance Ticket Log: Status of repairs"""
@@ -1187,7 +1242,7 @@ def get_asset_audit_report(
     location: Optional[str] = Query(None),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: dict = Depends(get_current_user)
 ):
     """Asset Audit Report: Fixed Assets mapped to locations vs actually found"""
@@ -1239,7 +1294,7 @@ def get_visitor_log(
     end_date: Optional[date] = Query(None),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: dict = Depends(get_current_user)
 ):
     """Visitor Log: Non-resident guests entering premises"""
@@ -1261,7 +1316,7 @@ def get_key_card_audit(
     end_date: Optional[date] = Query(None),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: dict = Depends(get_current_user)
 ):
     """Key Card Audit: Who opened which room? (Staff Name + Timestamp)"""
@@ -1283,7 +1338,7 @@ def get_staff_attendance_report(
     employee_id: Optional[int] = Query(None),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: dict = Depends(get_current_user)
 ):
     """Staff Attendance: Shift In/Out times"""
@@ -1329,7 +1384,7 @@ def get_payroll_register(
     year: Optional[int] = Query(None),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: dict = Depends(get_current_user)
 ):
     """Payroll Register: Salary calculation (Basic + OT - Deductions)"""
@@ -1415,7 +1470,7 @@ def get_payroll_register(
 @apply_api_optimizations
 def get_management_dashboard(
     report_date: Optional[date] = Query(None, description="Date for dashboard (default: today)"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: dict = Depends(get_current_user)
 ):
     """Management Dashboard: ADR, RevPAR, Food Cost %, Occupancy %"""
@@ -1430,7 +1485,7 @@ def get_management_dashboard(
         and_(
             Booking.check_in <= report_date,
             Booking.check_out > report_date,
-            Booking.status.in_(["checked-in", "booked"])
+            Booking.status.in_(ACTIVE_BOOKING_STATUSES)
         )
     ).count()
     
@@ -1438,7 +1493,7 @@ def get_management_dashboard(
         and_(
             PackageBooking.check_in <= report_date,
             PackageBooking.check_out > report_date,
-            PackageBooking.status.in_(["checked-in", "booked"])
+            PackageBooking.status.in_(ACTIVE_BOOKING_STATUSES)
         )
     ).count()
     
@@ -1447,12 +1502,12 @@ def get_management_dashboard(
     
     # Room revenue for the date
     room_revenue = db.query(func.sum(Checkout.room_total)).filter(
-        func.date(Checkout.checkout_date) == report_date
+        on_day(Checkout.checkout_date, report_date)
     ).scalar() or 0
     
     # ADR (Average Daily Rate)
     checkouts_count = db.query(Checkout).filter(
-        func.date(Checkout.checkout_date) == report_date
+        on_day(Checkout.checkout_date, report_date)
     ).count()
     
     adr = (room_revenue / checkouts_count) if checkouts_count > 0 else 0
@@ -1462,7 +1517,7 @@ def get_management_dashboard(
     
     # Food revenue
     food_revenue = db.query(func.sum(Checkout.food_total)).filter(
-        func.date(Checkout.checkout_date) == report_date
+        on_day(Checkout.checkout_date, report_date)
     ).scalar() or 0
     
     # Food cost (from inventory consumption)
@@ -1,25 +1,23 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
-from app.utils.auth import get_current_user
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query
+from app.utils.auth import get_db, get_current_user
+from sqlalchemy.orm import Session, load_only
 from sqlalchemy import text
-from app.database import SessionLocal
 from app.schemas.room import RoomCreate, RoomOut
 from app.curd import room as crud_room
 from app.models.room import Room
 from app.models.booking import Booking, BookingRoom
+from app.utils.api_optimization import FIELDS_QUERY_DESCRIPTION, select_fields
+from app.utils.fast_json import FastJSONResponse
 import shutil
 import os
 from uuid import uuid4
 from datetime import date
+from typing import Optional
+import logging
 
-router = APIRouter(prefix="/rooms", tags=["Rooms"])
+logger = logging.getLogger(__name__)
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+router = APIRouter(prefix="/rooms", tags=["Rooms"])
 
 UPLOAD_DIR = os.path.join("static", "rooms")
 os.makedirs(UPLOAD_DIR, exist_ok=True)
@@ -60,7 +58,7 @@ def create_room_test(
                 with open(image_path, "wb") as buffer:
                     shutil.copyfileobj(image.file, buffer)
             except Exception as e:
-                print(f"Error saving image: {e}")
+                logger.error("Error saving image: %s", e)
                 raise HTTPException(status_code=500, detail=f"Error saving image: {str(e)}")
 
         db_room = Room(
@@ -124,14 +122,13 @@ def create_room_test(
                 db.refresh(db_room)
         except Exception as loc_error:
             # Don't fail room creation if location creation fails
-            print(f"Warning: Could not create location for room {number}: {str(loc_error)}")
+            logger.warning("Could not create location for room %s: %s", number, loc_error)
         
         return db_room
     except Exception as e:
         db.rollback()
-        import traceback
-        traceback.print_exc()
-        print(f"Error creating room: {e}")
+        logger.exception("Error in create_room_test")
+        logger.error("Error creating room: %s", e)
         raise HTTPException(status_code=500, detail=f"Error creating room: {str(e)}")
 
 
@@ -159,7 +156,7 @@ def delete_room_test(room_id: int, db: Session = Depends(get_db), current_user:
         return {"message": "Room deleted successfully"}
     except Exception as e:
         db.rollback()
-        print(f"Error deleting room: {e}")
+        logger.error("Error deleting room: %s", e)
         raise HTTPException(status_code=500, detail=f"Error deleting room: {str(e)}")
 
 # Test GET endpoint for fetching rooms
@@ -171,21 +168,21 @@ def get_rooms_test(db: Session = Depends(get_db), skip: int = 0, limit: int = 10
             from app.utils.room_status import update_room_statuses
             update_room_statuses(db)
         except Exception as status_error:
-            print(f"Room status update failed (continuing): {status_error}")
+            logger.error("Room status update failed (continuing): %s", status_error)
             # Continue fetching rooms even if status update fails
         
         rooms = db.query(Room).offset(skip).limit(limit).all()
         return rooms
         
     except Exception as e:
-        print(f"Error fetching rooms: {e}")
-        print(f"Error type: {type(e)}")
+        logger.error("Error fetching rooms: %s", e)
+        logger.error("Error type: %s", type(e))
         
         # Try to rollback any pending transaction
         try:
             db.rollback()
         except Exception as rollback_error:
-            print(f"Rollback error: {rollback_error}")
+            logger.error("Rollback error: %s", rollback_error)
         
         raise HTTPException(status_code=500, detail=f"Error fetching rooms: {str(e)}")
 
@@ -224,7 +221,7 @@ def create_room(
                 with open(image_path, "wb") as buffer:
                     shutil.copyfileobj(image.file, buffer)
             except Exception as e:
-                print(f"Error saving image: {e}")
+                logger.error("Error saving image: %s", e)
                 raise HTTPException(status_code=500, detail=f"Error saving image: {str(e)}")
 
         db_room = Room(
@@ -288,14 +285,13 @@ def create_room(
                 db.refresh(db_room)
         except Exception as loc_error:
             # Don't fail room creation if location creation fails
-            print(f"Warning: Could not create location for room {number}: {str(loc_error)}")
+            logger.warning("Could not create location for room %s: %s", number, loc_error)
         
         return db_room
     except Exception as e:
         db.rollback()
-        import traceback
-        traceback.print_exc()
-        print(f"Error creating room: {e}")
+        logger.exception("Error in create_room")
+        logger.error("Error creating room: %s", e)
         raise HTTPException(status_code=500, detail=f"Error creating room: {str(e)}")
 
 
@@ -313,8 +309,9 @@ def update_room_statuses_endpoint(db: Session = Depends(get_db), current_user: d
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error updating room statuses: {str(e)}")
 
-def _get_rooms_impl(db: Session, skip: int = 0, limit: int = 20):
-    """Helper function for get_rooms"""
+def _get_rooms_impl(db: Session, skip: int = 0, limit: int = 20, fields: Optional[str] = None):
+    """Helper function for get_rooms; with a fieldset only those columns are loaded and returned"""
+    selected = select_fields(fields, RoomOut)
     try:
         # Optimized for low network - reduced to 50
         if limit > 50:
@@ -326,7 +323,7 @@ def _get_rooms_impl(db: Session, skip: int = 0, limit: int = 20):
         try:
             db.execute(text("SELECT 1"))
         except Exception as conn_error:
-            print(f"Database connection test failed: {conn_error}")
+            logger.error("Database connection test failed: %s", conn_error)
             raise HTTPException(status_code=503, detail="Database connection unavailable. Please try again.")
         
         # Skip room status update for large queries (limit > 100) to prevent timeouts
@@ -338,19 +335,25 @@ def _get_rooms_impl(db: Session, skip: int = 0, limit: int = 20):
                 from app.utils.room_status import update_room_statuses
                 update_room_statuses(db)
             except Exception as status_error:
-                print(f"Room status update failed (continuing): {status_error}")
+                logger.error("Room status update failed (continuing): %s", status_error)
                 # Continue fetching rooms even if status update fails
         else:
-            print(f"Skipping room status update for large query (limit={limit}) to prevent timeout")
+            logger.warning("Skipping room status update for large query (limit=%s) to prevent timeout", limit)
         
         # Query rooms with proper error handling
         try:
-            rooms = db.query(Room).offset(skip).limit(limit).all()
+            query = db.query(Room)
+            if selected is not None:
+                # Sparse fieldset: defer every other column (the primary key is always loaded)
+                query = query.options(load_only(*(getattr(Room, name) for name in selected)))
+            rooms = query.offset(skip).limit(limit).all()
         except Exception as query_error:
-            print(f"Room query failed: {query_error}")
+            logger.error("Room query failed: %s", query_error)
             db.rollback()
             raise HTTPException(status_code=500, detail=f"Error querying rooms: {str(query_error)}")
         
+        if selected is not None:
+            return FastJSONResponse([{name: getattr(room, name) for name in selected} for room in rooms])
         # Return the rooms directly - SQLAlchemy should handle serialization
         return rooms
         
@@ -358,24 +361,26 @@ def _get_rooms_impl(db: Session, skip: int = 0, limit: int = 20):
         # Re-raise HTTP exceptions as-is
         raise
     except Exception as e:
-        print(f"Error fetching rooms: {e}")
-        print(f"Error type: {type(e)}")
+        logger.error("Error fetching rooms: %s", e)
+        logger.error("Error type: %s", type(e))
         
         # Try to rollback any pending transaction
         try:
             db.rollback()
         except Exception as rollback_error:
-            print(f"Rollback error: {rollback_error}")
+            logger.error("Rollback error: %s", rollback_error)
         
         raise HTTPException(status_code=500, detail=f"Error fetching rooms: {str(e)}")
 
 @router.get("", response_model=list[RoomOut])
-def get_rooms(db: Session = Depends(get_db), skip: int = 0, limit: int = 20, current_user: dict = Depends(get_current_user)):
-    return _get_rooms_impl(db, skip, limit)
+def get_rooms(db: Session = Depends(get_db), skip: int = 0, limit: int = 20, current_user: dict = Depends(get_current_user),
+              fields: Optional[str] = Query(None, description=FIELDS_QUERY_DESCRIPTION)):
+    return _get_rooms_impl(db, skip, limit, fields)
 
 @router.get("/", response_model=list[RoomOut])  # Handle trailing slash
-def get_rooms_slash(db: Session = Depends(get_db), skip: int = 0, limit: int = 20, current_user: dict = Depends(get_current_user)):
-    return _get_rooms_impl(db, skip, limit)
+def get_rooms_slash(db: Session = Depends(get_db), skip: int = 0, limit: int = 20, current_user: dict = Depends(get_current_user),
+                    fields: Optional[str] = Query(None, description=FIELDS_QUERY_DESCRIPTION)):
+    return _get_rooms_impl(db, skip, limit, fields)
 
 
 # ---------------- DELETE ----------------
@@ -4,16 +4,18 @@ from sqlalchemy import select, text
 from typing import List, Optional
 from datetime import datetime
 import os
-import shutil
-import uuid
 import json
 from app.schemas import service as service_schema
 from app.models.user import User
-from app.models.service import Service, AssignedService, service_inventory_item
+from app.models.service import Service, AssignedService, ServiceImage, service_inventory_item
 from app.models.inventory import InventoryItem
 from app.curd import service as service_crud
 from app.utils.auth import get_db, get_current_user
+from app.utils.images import ingest_image, remove_image, image_variants_for
 from app.curd.notification import notify_service_assigned, notify_service_status_changed
+import logging
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/services", tags=["Services"])
 
@@ -27,13 +29,13 @@ def _load_inventory_items_for_service(db: Session, service_id: int):
     """
     items = []
     try:
-        print(f"[DEBUG _load_inventory_items_for_service] Loading inventory items for service {service_id}")
+        logger.debug("_load_inventory_items_for_service: Loading inventory items for service %s", service_id)
         stmt = select(
             service_inventory_item.c.inventory_item_id,
             service_inventory_item.c.quantity
         ).where(service_inventory_item.c.service_id == service_id)
         rows = db.execute(stmt).fetchall()
-        print(f"[DEBUG _load_inventory_items_for_service] Found {len(rows)} rows in service_inventory_items table for service {service_id}")
+        logger.debug("_load_inventory_items_for_service: Found %s rows in service_inventory_items table for service %s", len(rows), service_id)
         for row in rows:
             try:
                 item_id = getattr(row, "inventory_item_id", None)
@@ -53,18 +55,16 @@ def _load_inventory_items_for_service(db: Session, service_id: int):
                         "selling_price": float(inv_item.selling_price) if hasattr(inv_item, "selling_price") and inv_item.selling_price is not None else None
                     }
                     items.append(item_data)
-                    print(f"[DEBUG _load_inventory_items_for_service] Added item: {item_data['name']} (ID: {item_data['id']}, Qty: {item_data['quantity']})")
+                    logger.debug("_load_inventory_items_for_service: Added item: %s (ID: %s, Qty: %s)", item_data['name'], item_data['id'], item_data['quantity'], extra={"sample_rate": 0.1})
                 else:
-                    print(f"[WARNING _load_inventory_items_for_service] Inventory item {item_id} not found in database")
+                    logger.warning("_load_inventory_items_for_service: Inventory item %s not found in database", item_id)
             except Exception as row_err:
-                print(f"[WARNING] Failed to process inventory row for service {service_id}: {str(row_err)}")
+                logger.warning("Failed to process inventory row for service %s: %s", service_id, row_err)
                 continue
     except Exception as e:
         db.rollback()
-        print(f"[ERROR _load_inventory_items_for_service] Unable to load inventory items for service {service_id}: {str(e)}")
-        import traceback
-        print(traceback.format_exc())
-    print(f"[DEBUG _load_inventory_items_for_service] Returning {len(items)} inventory items for service {service_id}")
+        logger.error("_load_inventory_items_for_service: Unable to load inventory items for service %s: %s", service_id, e, exc_info=True)
+    logger.debug("_load_inventory_items_for_service: Returning %s inventory items for service %s", len(items), service_id)
     return items
 
 
@@ -73,7 +73,7 @@ def _serialize_service(service: Service, db: Session):
         return None
 
     inventory_items = _load_inventory_items_for_service(db, service.id)
-    print(f"[DEBUG _serialize_service] Service {service.id} ({service.name}) has {len(inventory_items)} inventory items")
+    logger.debug("_serialize_service: Service %s (%s) has %s inventory items", service.id, service.name, len(inventory_items), extra={"sample_rate": 0.1})
     
     return {
         "id": int(service.id),
@@ -91,19 +91,22 @@ def _serialize_service(service: Service, db: Session):
     }
 
 
-def _delete_file(image_url: str):
+def _delete_file(image_url: str, db: Session):
     try:
         if not image_url:
             return
+        # Uploads are stored by content hash, so another service may share the file
+        if db.query(ServiceImage.id).filter(ServiceImage.image_url == image_url).first():
+            return
         relative_path = image_url.lstrip("/")
         absolute_path = os.path.normpath(relative_path)
         if not os.path.isabs(absolute_path):
             absolute_path = os.path.join(os.getcwd(), absolute_path)
         if os.path.exists(absolute_path):
-            os.remove(absolute_path)
-            print(f"[INFO] Deleted file: {absolute_path}")
+            remove_image(absolute_path)
+            logger.info("Deleted file: %s", absolute_path)
     except Exception as cleanup_error:
-        print(f"[WARNING] Failed to delete file {image_url}: {cleanup_error}")
+        logger.warning("Failed to delete file %s: %s", image_url, cleanup_error)
 
 
 # Service CRUD
@@ -122,7 +125,6 @@ async def create_service(
     """
     Create a new service with optional images and inventory items.
     """
-    import traceback
     import sys
 
     is_visible_bool = (
@@ -143,28 +145,12 @@ async def create_service(
                 if not img.filename:
                     continue
 
-                original_filename = img.filename if img.filename else "image.jpg"
-                filename = f"svc_{uuid.uuid4().hex}_{original_filename}"
-                file_path = os.path.join(UPLOAD_DIR, filename)
-
-                try:
-                    contents = await img.read()
-                    with open(file_path, "wb") as buffer:
-                        buffer.write(contents)
-                except (AttributeError, TypeError):
-                    with open(file_path, "wb") as buffer:
-                        shutil.copyfileobj(img.file, buffer)
-
-                if not os.path.exists(file_path):
-                    raise HTTPException(status_code=500, detail=f"Failed to save image: {original_filename}")
-
-                normalized_path = file_path.replace("\\", "/")
-                image_urls.append(f"/{normalized_path}")
+                image_urls.append(ingest_image(img, UPLOAD_DIR, "svc", url_base=f"/{UPLOAD_DIR}").url)
         except HTTPException:
             raise
         except Exception as img_error:
-            error_detail = f"Failed to save service images: {str(img_error)}\n{traceback.format_exc()}"
-            print(f"[ERROR create_service] {error_detail}")
+            error_detail = f"Failed to save service images: {str(img_error)}"
+            logger.error("create_service: %s", error_detail, exc_info=True)
             sys.stderr.write(f"ERROR in create_service (image upload): {error_detail}\n")
             raise HTTPException(status_code=500, detail=f"Failed to upload images: {str(img_error)}")
 
@@ -180,7 +166,7 @@ async def create_service(
                 ]
             except (json.JSONDecodeError, ValueError, TypeError) as e:
                 error_detail = f"Invalid inventory_items JSON: {str(e)}"
-                print(f"[ERROR create_service] {error_detail}")
+                logger.error("create_service: %s", error_detail)
                 raise HTTPException(status_code=400, detail=error_detail)
 
         try:
@@ -195,22 +181,22 @@ async def create_service(
                 average_completion_time,
             )
         except Exception as db_error:
-            error_detail = f"Failed to create service in database: {str(db_error)}\n{traceback.format_exc()}"
-            print(f"[ERROR create_service] {error_detail}")
+            error_detail = f"Failed to create service in database: {str(db_error)}"
+            logger.error("create_service: %s", error_detail, exc_info=True)
             sys.stderr.write(f"ERROR in create_service (database): {error_detail}\n")
             for img_url in image_urls:
-                _delete_file(img_url)
+                _delete_file(img_url, db)
             raise HTTPException(status_code=500, detail=f"Failed to create service: {str(db_error)}")
 
         service_dict = _serialize_service(service, db)
-        print(f"[DEBUG create_service] Created service ID: {service.id}")
+        logger.debug("create_service: Created service ID: %s", service.id)
         return service_dict
 
     except HTTPException:
         raise
     except Exception as e:
-        error_detail = f"Unexpected error in create_service: {str(e)}\n{traceback.format_exc()}"
-        print(f"[ERROR create_service] {error_detail}")
+        error_detail = f"Unexpected error in create_service: {str(e)}"
+        logger.error("create_service: %s", error_detail, exc_info=True)
         sys.stderr.write(f"ERROR in create_service: {error_detail}\n")
         raise HTTPException(status_code=500, detail=f"Failed to create service: {str(e)}")
 
@@ -230,7 +216,6 @@ async def update_service_endpoint(
     current_user: User = Depends(get_current_user),
 ):
     """Update an existing service, allowing image and inventory adjustments."""
-    import traceback
     import sys
 
     is_visible_bool = (
@@ -272,32 +257,16 @@ async def update_service_endpoint(
             if not img.filename:
                 continue
 
-            original_filename = img.filename if img.filename else "image.jpg"
-            filename = f"svc_{uuid.uuid4().hex}_{original_filename}"
-            file_path = os.path.join(UPLOAD_DIR, filename)
-
-            try:
-                contents = await img.read()
-                with open(file_path, "wb") as buffer:
-                    buffer.write(contents)
-            except (AttributeError, TypeError):
-                with open(file_path, "wb") as buffer:
-                    shutil.copyfileobj(img.file, buffer)
-
-            if not os.path.exists(file_path):
-                raise HTTPException(status_code=500, detail=f"Failed to save image: {original_filename}")
-
-            normalized_path = file_path.replace("\\", "/")
-            new_image_urls.append(f"/{normalized_path}")
+            new_image_urls.append(ingest_image(img, UPLOAD_DIR, "svc", url_base=f"/{UPLOAD_DIR}").url)
     except HTTPException:
         for url in new_image_urls:
-            _delete_file(url)
+            _delete_file(url, db)
         raise
     except Exception as img_error:
         for url in new_image_urls:
-            _delete_file(url)
-        error_detail = f"Failed to process images for update: {str(img_error)}\n{traceback.format_exc()}"
-        print(f"[ERROR update_service] {error_detail}")
+            _delete_file(url, db)
+        error_detail = f"Failed to process images for update: {str(img_error)}"
+        logger.error("update_service: %s", error_detail, exc_info=True)
         sys.stderr.write(f"ERROR in update_service (image upload): {error_detail}\n")
         raise HTTPException(status_code=500, detail=f"Failed to upload images: {str(img_error)}")
 
@@ -316,22 +285,22 @@ async def update_service_endpoint(
         )
     except ValueError as ve:
         for url in new_image_urls:
-            _delete_file(url)
+            _delete_file(url, db)
         message = str(ve)
         status = 404 if "not found" in message.lower() else 400
         raise HTTPException(status_code=status, detail=message)
     except Exception as db_error:
         for url in new_image_urls:
-            _delete_file(url)
-        error_detail = f"Failed to update service: {str(db_error)}\n{traceback.format_exc()}"
-        print(f"[ERROR update_service] {error_detail}")
+            _delete_file(url, db)
+        error_detail = f"Failed to update service: {str(db_error)}"
+        logger.error("update_service: %s", error_detail, exc_info=True)
         sys.stderr.write(f"ERROR in update_service (database): {error_detail}\n")
         raise HTTPException(status_code=500, detail=f"Failed to update service: {str(db_error)}")
 
     for path in removed_image_paths:
-        _delete_file(path)
+        _delete_file(path, db)
 
-    print(f"[DEBUG update_service] Service {service_id} updated successfully")
+    logger.debug("update_service: Service %s updated successfully", service_id)
     return _serialize_service(service, db)
 
 def _list_services_impl(db: Session, skip: int = 0, limit: int = 20):
@@ -343,6 +312,9 @@ def _list_services_impl(db: Session, skip: int = 0, limit: int = 20):
         if not services:
             return []
         
+        # Resized variants for every image on the page, in one query
+        variants = image_variants_for(db, (img.image_url for service in services for img in (service.images or [])))
+
         # Manually add inventory items with quantities from association table
         result = []
         for service in services:
@@ -352,7 +324,8 @@ def _list_services_impl(db: Session, skip: int = 0, limit: int = 20):
                 for img in (service.images if service.images else []):
                     images_list.append({
                         "id": int(img.id),
-                        "image_url": str(img.image_url)
+                        "image_url": str(img.image_url),
+                        "image_variants": variants.get(img.image_url)
                     })
                 
                 service_dict = {
@@ -405,34 +378,26 @@ def _list_services_impl(db: Session, skip: int = 0, limit: int = 20):
                                 }
                                 service_dict["inventory_items"].append(inv_item_dict)
                         except Exception as inv_error:
-                            print(f"[WARNING] Error processing inventory item for service {service.id}: {str(inv_error)}")
-                            import traceback
-                            print(traceback.format_exc())
+                            logger.warning("Error processing inventory item for service %s: %s", service.id, inv_error, exc_info=True)
                             continue
                 except Exception as assoc_error:
-                    print(f"[WARNING] Error querying inventory associations for service {service.id}: {str(assoc_error)}")
-                    import traceback
-                    print(traceback.format_exc())
+                    logger.warning("Error querying inventory associations for service %s: %s", service.id, assoc_error, exc_info=True)
                     # Continue without inventory items
                 
                 result.append(service_dict)
             except Exception as service_error:
-                print(f"[WARNING] Error processing service {service.id if service else 'unknown'}: {str(service_error)}")
-                import traceback
-                print(traceback.format_exc())
+                logger.warning("Error processing service %s: %s", service.id if service else 'unknown', service_error, exc_info=True)
                 # Skip this service and continue
                 continue
         
         return result
     except Exception as e:
-        import traceback
         error_detail = f"Error in _list_services_impl: {str(e)}"
-        print(f"[ERROR] {error_detail}")
-        print(traceback.format_exc())
+        logger.error("%s", error_detail, exc_info=True)
         
         # Fallback: return services without inventory items
         try:
-            print("[INFO] Attempting fallback: returning services without inventory items")
+            logger.info("Attempting fallback: returning services without inventory items")
             services = service_crud.get_services(db, skip=skip, limit=limit)
             fallback_result = []
             for service in services:
@@ -451,14 +416,14 @@ def _list_services_impl(db: Session, skip: int = 0, limit: int = 20):
                     continue
             return fallback_result
         except Exception as fallback_error:
-            print(f"[ERROR] Fallback also failed: {str(fallback_error)}")
+            logger.error("Fallback also failed: %s", fallback_error)
             # Re-raise original error
             raise e
 
 @router.get("", response_model=List[service_schema.ServiceOut])
 def list_services(db: Session = Depends(get_db), current_user: User = Depends(get_current_user), skip: int = 0, limit: int = 20):
     try:
-        print(f"[DEBUG] list_services called with skip={skip}, limit={limit}")
+        logger.debug("list_services called with skip=%s, limit=%s", skip, limit)
         
         # Cap limit to prevent performance issues
         if limit > 1000:
@@ -470,21 +435,19 @@ def list_services(db: Session = Depends(get_db), current_user: User = Depends(ge
         try:
             result = _list_services_impl(db, skip, limit)
             if result:
-                print(f"[DEBUG] Full implementation returned {len(result)} services")
+                logger.debug("Full implementation returned %s services", len(result))
                 return result
         except Exception as impl_error:
-            print(f"[WARNING] Full implementation failed, trying simple approach: {str(impl_error)}")
-            import traceback
-            print(traceback.format_exc())
+            logger.warning("Full implementation failed, trying simple approach: %s", impl_error, exc_info=True)
         
         # Fallback: Simple approach - return services directly
-        print("[INFO] Using simple fallback: returning services directly")
+        logger.info("Using simple fallback: returning services directly")
         services = service_crud.get_services(db, skip=skip, limit=limit)
         
-        print(f"[DEBUG] Found {len(services) if services else 0} services from database")
+        logger.debug("Found %s services from database", len(services) if services else 0)
         
         if not services:
-            print("[INFO] No services found in database")
+            logger.info("No services found in database")
             return []
         
         # Build response with inventory items
@@ -516,7 +479,7 @@ def list_services(db: Session = Depends(get_db), current_user: User = Depends(ge
                                 "selling_price": float(inv_item.selling_price) if hasattr(inv_item, 'selling_price') and inv_item.selling_price is not None else None
                             })
                 except Exception as inv_error:
-                    print(f"[WARNING] Error loading inventory items for service {service.id}: {str(inv_error)}")
+                    logger.warning("Error loading inventory items for service %s: %s", service.id, inv_error)
                     inventory_items_list = []
                 
                 # Build service dict - ensure all fields match ServiceOut schema
@@ -533,7 +496,7 @@ def list_services(db: Session = Depends(get_db), current_user: User = Depends(ge
                 
                 result.append(service_data)
             except Exception as service_error:
-                print(f"[WARNING] Error processing service {service.id}: {str(service_error)}")
+                logger.warning("Error processing service %s: %s", service.id, service_error)
                 continue
         
         return result
@@ -541,10 +504,8 @@ def list_services(db: Session = Depends(get_db), current_user: User = Depends(ge
     except HTTPException:
         raise
     except Exception as e:
-        import traceback
         error_msg = f"Failed to fetch services: {str(e)}"
-        print(f"[ERROR] Error in list_services endpoint: {error_msg}")
-        print(traceback.format_exc())
+        logger.error("Error in list_services endpoint: %s", error_msg, exc_info=True)
         # Return empty list instead of raising to prevent frontend breakage
         return []
 
@@ -558,7 +519,7 @@ def delete_service(service_id: int, db: Session = Depends(get_db), current_user:
     try:
         image_paths = service_crud.delete_service(db, service_id)
         for path in image_paths:
-            _delete_file(path)
+            _delete_file(path, db)
         return {"detail": "Deleted successfully"}
     except ValueError as ve:
         message = str(ve)
@@ -567,9 +528,8 @@ def delete_service(service_id: int, db: Session = Depends(get_db), current_user:
     except RuntimeError as re:
         raise HTTPException(status_code=500, detail=str(re))
     except Exception as e:
-        import traceback
-        error_detail = f"Failed to delete service {service_id}: {str(e)}\n{traceback.format_exc()}"
-        print(f"[ERROR delete_service] {error_detail}")
+        error_detail = f"Failed to delete service {service_id}: {str(e)}"
+        logger.error("delete_service: %s", error_detail, exc_info=True)
         raise HTTPException(status_code=500, detail="Failed to delete service")
 
 # Assigned Services
@@ -584,9 +544,9 @@ def assign_service(
     If the service has inventory items, they will be automatically deducted from stock.
     """
     try:
-        print(f"[DEBUG assign_service] ===== START ======")
-        print(f"[DEBUG assign_service] Received payload: service_id={payload.service_id}, employee_id={payload.employee_id}, room_id={payload.room_id}")
-        print(f"[DEBUG assign_service] Current user: {current_user.id if current_user else 'None'}")
+        logger.debug("assign_service: ===== START ======")
+        logger.debug("assign_service: Received payload: service_id=%s, employee_id=%s, room_id=%s", payload.service_id, payload.employee_id, payload.room_id)
+        logger.debug("assign_service: Current user: %s", current_user.id if current_user else 'None')
         
         # Validate payload
         if not payload.service_id:
@@ -598,7 +558,7 @@ def assign_service(
         
         result = service_crud.create_assigned_service(db, payload)
         db.commit() # Force commit to ensure visibility
-        print(f"[DEBUG assign_service] Successfully created assigned service ID: {result.id}")
+        logger.debug("assign_service: Successfully created assigned service ID: %s", result.id)
         
         # Send Notification (best effort)
         try:
@@ -610,7 +570,7 @@ def assign_service(
                 assigned_id=result.id
             )
         except Exception as notif_error:
-            print(f"[WARNING] Failed to send assignment notification: {notif_error}")
+            logger.warning("Failed to send assignment notification: %s", notif_error)
 
         # Manually construct response to avoid serialization issues
         response_data = {
@@ -638,22 +598,18 @@ def assign_service(
             "billing_status": result.billing_status if hasattr(result, 'billing_status') else "unbilled"
         }
         
-        print(f"[DEBUG assign_service] ===== SUCCESS ======")
+        logger.debug("assign_service: ===== SUCCESS ======")
         return response_data
     except HTTPException:
         # Re-raise HTTP exceptions as-is
         raise
     except ValueError as e:
         # User-friendly validation errors
-        import traceback
-        print(f"[ERROR assign_service] Validation error: {str(e)}")
-        print(traceback.format_exc())
+        logger.error("assign_service: Validation error: %s", e, exc_info=True)
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        import traceback
         error_detail = f"Failed to assign service: {str(e)}"
-        print(f"[ERROR assign_service] {error_detail}")
-        print(traceback.format_exc())
+        logger.error("assign_service: %s", error_detail, exc_info=True)
         raise HTTPException(status_code=500, detail=error_detail)
 
 @router.get("/assigned", response_model=List[service_schema.AssignedServiceOut])
@@ -680,7 +636,7 @@ def get_all_assigned_services(
             # Ensure all relationships are loaded
             if not assigned.service or not assigned.employee or not assigned.room:
                 # Skip incomplete records
-                print(f"[WARNING] Skipping assigned service {assigned.id} due to missing relationships")
+                logger.warning("Skipping assigned service %s due to missing relationships", assigned.id)
                 continue
             
             # Use status enum directly (Pydantic will handle conversion)
@@ -688,7 +644,7 @@ def get_all_assigned_services(
             
             # Load inventory items for the service
             service_inventory_items = _load_inventory_items_for_service(db, assigned.service.id)
-            print(f"[DEBUG get_all_assigned_services] Service {assigned.service.id} has {len(service_inventory_items)} inventory items")
+            logger.debug("get_all_assigned_services: Service %s has %s inventory items", assigned.service.id, len(service_inventory_items))
             
             result.append({
                 "id": assigned.id,
@@ -720,9 +676,7 @@ def get_all_assigned_services(
         
         return result
     except Exception as e:
-        import traceback
-        print(f"[ERROR] Error in get_all_assigned_services endpoint: {str(e)}")
-        print(traceback.format_exc())
+        logger.error("Error in get_all_assigned_services endpoint: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to fetch assigned services: {str(e)}")
 
 
@@ -734,23 +688,23 @@ def clear_all_services(db: Session = Depends(get_db), current_user: User = Depen
     """
     try:
         # Delete in correct order to avoid foreign key violations
-        print("[WARNING] Clearing all services and assigned services...")
+        logger.warning("Clearing all services and assigned services...")
         
         # 1. Delete assigned services first
         deleted_assigned = db.execute(text("DELETE FROM assigned_services")).rowcount
-        print(f"Deleted {deleted_assigned} assigned services")
+        logger.debug("Deleted %s assigned services", deleted_assigned)
         
         # 2. Delete service inventory item links
         deleted_inventory = db.execute(text("DELETE FROM service_inventory_items")).rowcount
-        print(f"Deleted {deleted_inventory} service inventory item links")
+        logger.debug("Deleted %s service inventory item links", deleted_inventory)
         
         # 3. Delete service images
         deleted_images = db.execute(text("DELETE FROM service_images")).rowcount
-        print(f"Deleted {deleted_images} service images")
+        logger.debug("Deleted %s service images", deleted_images)
         
         # 4. Finally delete services
         deleted_services = db.execute(text("DELETE FROM services")).rowcount
-        print(f"Deleted {deleted_services} services")
+        logger.debug("Deleted %s services", deleted_services)
         
         db.commit()
         
@@ -765,11 +719,10 @@ def clear_all_services(db: Session = Depends(get_db), current_user: User = Depen
         }
     except Exception as e:
         db.rollback()
-        import traceback
-        error_detail = f"Failed to clear services: {str(e)}\n{traceback.format_exc()}"
-        print(f"[ERROR] {error_detail}")
+        error_detail = f"Failed to clear services: {str(e)}"
+        logger.error("%s", error_detail, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to clear services: {str(e)}")
-        print(traceback.format_exc())
+        logger.exception("Error in clear_all_services")
         raise HTTPException(status_code=500, detail=f"Failed to fetch assigned services: {str(e)}")
 
 @router.patch("/assigned/{assigned_id}")
@@ -795,13 +748,11 @@ def update_assigned_status(
                     assigned_id=updated_service.id
                 )
             except Exception as notif_error:
-                print(f"[WARNING] Failed to send status notification: {notif_error}")
+                logger.warning("Failed to send status notification: %s", notif_error)
         
         return updated_service
     except Exception as e:
-        import traceback
-        print(f"[ERROR] Error updating assigned service status: {str(e)}")
-        print(traceback.format_exc())
+        logger.error("Error updating assigned service status: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to update service status: {str(e)}")
 
 @router.delete("/assigned/{assigned_id}")
@@ -894,9 +845,7 @@ def get_employee_inventory_assignments(
     except ImportError:
         raise HTTPException(status_code=501, detail="Employee inventory tracking not available")
     except Exception as e:
-        import traceback
-        print(f"[ERROR] Error fetching employee inventory: {str(e)}")
-        print(traceback.format_exc())
+        logger.error("Error fetching employee inventory: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to fetch employee inventory: {str(e)}")
 
 @router.post("/return-inventory")
@@ -956,7 +905,7 @@ def return_inventory_items(
         item = db.query(InventoryItem).filter(InventoryItem.id == assignment.item_id).first()
         if item:
             item.current_stock += quantity_returned
-            print(f"[DEBUG] Returned {quantity_returned} {item.unit} of {item.name}. New stock: {item.current_stock}")
+            logger.debug("Returned %s %s of %s. New stock: %s", quantity_returned, item.unit, item.name, item.current_stock)
         
         # Create return transaction
         transaction = InventoryTransaction(
@@ -986,7 +935,5 @@ def return_inventory_items(
         raise HTTPException(status_code=501, detail="Employee inventory tracking not available")
     except Exception as e:
         db.rollback()
-        import traceback
-        print(f"[ERROR] Error returning inventory: {str(e)}")
-        print(traceback.format_exc())
+        logger.error("Error returning inventory: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to return inventory: {str(e)}")
@@ -17,6 +17,9 @@ from app.models.room import Room
 from app.models.employee import Employee
 from app.models.inventory import Location
 from app.models.employee_inventory import EmployeeInventoryAssignment
+import logging
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/reports/services", tags=["Service Reports"])
 
@@ -214,7 +217,7 @@ def get_detailed_service_usage_report(
                                 "returned_at": inv_ass.returned_at.isoformat() if inv_ass.returned_at else None
                             })
             except Exception as inv_error:
-                print(f"[WARNING] Could not load inventory items for assigned service {assigned.id}: {inv_error}")
+                logger.warning("Could not load inventory items for assigned service %s: %s", assigned.id, inv_error)
             
             service_item = ServiceUsageItem(
                 assigned_service_id=assigned.id,
@@ -272,8 +275,6 @@ def get_detailed_service_usage_report(
         )
         
     except Exception as e:
-        import traceback
-        print(f"[ERROR] Error generating service usage report: {str(e)}")
-        print(traceback.format_exc())
+        logger.error("Error generating service usage report: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to generate report: {str(e)}")
 
@@ -1,12 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session, joinedload
 from app.schemas.service_request import ServiceRequestCreate, ServiceRequestOut, ServiceRequestUpdate
 from app.curd import service_request as crud
 from app.utils.auth import get_db, get_current_user
+from app.utils.api_optimization import FIELDS_QUERY_DESCRIPTION, select_fields, trim_fields, wants
+from app.utils.fast_json import FastJSONResponse
 from app.models.user import User
 from typing import List, Optional, Dict, Any
 from pydantic import BaseModel
 import json
+import logging
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/service-requests", tags=["Service Requests"])
 
@@ -18,12 +23,167 @@ def create_service_request(
 ):
     return crud.create_service_request(db, request)
 
+# Keys of the combined list: service request rows, plus the checkout-request-only ones
+SERVICE_REQUEST_LIST_FIELDS = (
+    "id", "food_order_id", "room_id", "employee_id", "request_type", "description", "status",
+    "created_at", "completed_at", "is_checkout_request", "room_number", "employee_name", "refill_data",
+    "checkout_request_id", "guest_name", "inventory_notes", "asset_damages", "inventory_data_with_charges",
+)
+# Fields built from inventory_data with item names filled in from the inventory
+CHECKOUT_INVENTORY_FIELDS = ("asset_damages", "inventory_data_with_charges")
+
+
+def service_request_to_dict(sr) -> Optional[Dict[str, Any]]:
+    """
+    Serialize an enriched ServiceRequest for the combined service-request list.
+    Rows of a sparse statement lack the columns outside the fieldset; those read as None.
+    """
+    refill_data = None
+    if getattr(sr, 'refill_data', None):
+        try:
+            refill_data = json.loads(sr.refill_data)
+        except:
+            refill_data = None
+    
+    try:
+        request_type = getattr(sr, 'request_type', None)
+        description = getattr(sr, 'description', None)
+        status = getattr(sr, 'status', None)
+        created_at = getattr(sr, 'created_at', None)
+        completed_at = getattr(sr, 'completed_at', None)
+        return {
+            "id": sr.id,
+            "food_order_id": getattr(sr, 'food_order_id', None),
+            "room_id": getattr(sr, 'room_id', None),
+            "employee_id": getattr(sr, 'employee_id', None),
+            "request_type": str(request_type) if request_type else None,
+            "description": str(description) if description else None,
+            "status": str(status) if status else "pending",
+            "created_at": created_at.isoformat() if created_at else None,
+            "completed_at": completed_at.isoformat() if completed_at else None,
+            "is_checkout_request": False,
+            "room_number": str(getattr(sr, 'room_number', '')) if getattr(sr, 'room_number', None) else None,
+            "employee_name": str(getattr(sr, 'employee_name', '')) if getattr(sr, 'employee_name', None) else None,
+            "refill_data": refill_data
+        }
+    except Exception as e:
+        logger.error("Error converting service request %s: %s", sr.id, e)
+        return None
+
+
+def checkout_request_criteria(status: Optional[str]):
+    """Filter for checkout requests shown alongside service requests"""
+    from app.models.checkout import CheckoutRequest as CheckoutRequestModel
+    from datetime import datetime, timedelta
+    
+    if status:
+        return CheckoutRequestModel.status == status
+    # Include all pending, in_progress, and recently completed (last 7 days)
+    # Exclude only old completed and cancelled requests
+    seven_days_ago = datetime.utcnow() - timedelta(days=7)
+    return (
+        (CheckoutRequestModel.status.notin_(["cancelled", "completed"])) |
+        ((CheckoutRequestModel.status.in_(["completed", "cancelled"])) & 
+         (CheckoutRequestModel.completed_at >= seven_days_ago))
+    )
+
+
+def checkout_request_page_statement(skip: int, limit: int, status: Optional[str]):
+    """One page of checkout requests for the combined list, newest first, employee joined in"""
+    from sqlalchemy import select
+    from app.models.checkout import CheckoutRequest as CheckoutRequestModel
+
+    return (
+        select(CheckoutRequestModel)
+        .options(joinedload(CheckoutRequestModel.employee))
+        .where(checkout_request_criteria(status))
+        .order_by(CheckoutRequestModel.created_at.desc())
+        .limit(limit).offset(skip)
+    )
+
+
+def checkout_request_lookup_statements(checkout_requests, fields=None):
+    """
+    (rooms, inventory items) statements for checkout_requests_to_dicts, one
+    query each instead of one per request. None when there is nothing to look
+    up; items are only read when the fieldset includes the inventory fields.
+    """
+    from sqlalchemy import select
+    from app.models.room import Room
+    from app.models.inventory import InventoryItem
+
+    room_numbers = [cr.room_number for cr in checkout_requests if cr.room_number]
+    item_ids = checkout_inventory_item_ids(checkout_requests) if wants(fields, *CHECKOUT_INVENTORY_FIELDS) else ()
+    rooms = select(Room).where(Room.number.in_(room_numbers)) if room_numbers else None
+    items = select(InventoryItem).where(InventoryItem.id.in_(list(item_ids))) if item_ids else None
+    return rooms, items
+
+
+def checkout_inventory_item_ids(checkout_requests) -> set:
+    """Inventory item ids referenced by the checkout requests' inventory data"""
+    item_ids = set()
+    for cr in checkout_requests:
+        if cr.inventory_data:
+            for item in cr.inventory_data:
+                if item.get('item_id'):
+                    item_ids.add(item.get('item_id'))
+    return item_ids
+
+
+def checkout_requests_to_dicts(checkout_requests, room_map: Dict[str, Any], inventory_items: Dict[int, Any]) -> List[Dict[str, Any]]:
+    """Convert checkout requests to service request-like dicts using pre-fetched rooms and items"""
+    result = []
+    for cr in checkout_requests:
+        room = room_map.get(str(cr.room_number))
+        if room:
+            try:
+                # Hydrate missing item names in inventory_data using pre-fetched map
+                enriched_inventory_data = []
+                if cr.inventory_data:
+                    for item in cr.inventory_data:
+                        enriched_item = item.copy()
+                        # Hydrate name if missing
+                        if ('item_name' not in enriched_item or not enriched_item['item_name']) and enriched_item.get('item_id'):
+                            inv_item = inventory_items.get(enriched_item.get('item_id'))
+                            if inv_item:
+                                enriched_item['item_name'] = inv_item.name
+                                if 'item_code' not in enriched_item:
+                                    enriched_item['item_code'] = inv_item.item_code
+                        enriched_inventory_data.append(enriched_item)
+
+                result.append({
+                    "id": cr.id + 1000000, 
+                    "food_order_id": None,
+                    "room_id": room.id,
+                    "employee_id": cr.employee_id,
+                    "request_type": "checkout_verification",
+                    "description": f"Checkout inventory verification for Room {cr.room_number} - Guest: {cr.guest_name}",
+                    "status": str(cr.status) if cr.status else "pending",
+                    "created_at": cr.created_at.isoformat() if cr.created_at else None,
+                    "completed_at": cr.completed_at.isoformat() if cr.completed_at else None,
+                    "is_checkout_request": True,
+                    "checkout_request_id": cr.id,
+                    "room_number": str(cr.room_number) if cr.room_number else None,
+                    "guest_name": str(cr.guest_name) if cr.guest_name else None,
+                    "employee_name": str(cr.employee.name) if cr.employee and cr.employee.name else None,
+                    "inventory_notes": cr.inventory_notes,
+                    # Process enriched inventory data
+                    "asset_damages": [item for item in enriched_inventory_data if item.get('is_fixed_asset')],
+                    "inventory_data_with_charges": [item for item in enriched_inventory_data if not item.get('is_fixed_asset')]
+                })
+            except Exception as e:
+                logger.error("Error converting checkout request %s: %s", cr.id, e)
+                continue
+    return result
+
+
 @router.get("")
 def get_service_requests(
     skip: int = 0,
     limit: int = 100,
     status: Optional[str] = None,
     include_checkout_requests: bool = True,
+    fields: Optional[str] = Query(None, description=FIELDS_QUERY_DESCRIPTION),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -31,128 +191,24 @@ def get_service_requests(
     Get service requests. If include_checkout_requests is True, also includes checkout requests.
     Returns a list of dicts (not ServiceRequestOut) to support both service requests and checkout requests.
     """
-    service_requests = crud.get_service_requests(db, skip=skip, limit=limit, status=status)
+    selected = select_fields(fields, SERVICE_REQUEST_LIST_FIELDS)
+    service_requests = crud.get_service_requests(db, skip=skip, limit=limit, status=status, fields=selected)
     
     # Convert service requests to dict format
-    result = []
-    for sr in service_requests:
-        refill_data = None
-        if sr.refill_data:
-            try:
-                refill_data = json.loads(sr.refill_data)
-            except:
-                refill_data = None
-        
-        try:
-            result.append({
-                "id": sr.id,
-                "food_order_id": sr.food_order_id,
-                "room_id": sr.room_id,
-                "employee_id": sr.employee_id,
-                "request_type": str(sr.request_type) if sr.request_type else None,
-                "description": str(sr.description) if sr.description else None,
-                "status": str(sr.status) if sr.status else "pending",
-                "created_at": sr.created_at.isoformat() if sr.created_at else None,
-                "completed_at": sr.completed_at.isoformat() if sr.completed_at else None,
-                "is_checkout_request": False,
-                "room_number": str(getattr(sr, 'room_number', '')) if getattr(sr, 'room_number', None) else None,
-                "employee_name": str(getattr(sr, 'employee_name', '')) if getattr(sr, 'employee_name', None) else None,
-                "refill_data": refill_data
-            })
-        except Exception as e:
-            print(f"[ERROR] Error converting service request {sr.id}: {e}")
-            continue
+    result = [d for d in (service_request_to_dict(sr) for sr in service_requests) if d is not None]
     
     # Also include checkout requests as service requests
     if include_checkout_requests:
-        from app.models.checkout import CheckoutRequest as CheckoutRequestModel
-        from app.models.room import Room
-        from app.models.inventory import InventoryItem
-        from sqlalchemy.orm import joinedload
-        
-        checkout_query = db.query(CheckoutRequestModel).options(
-            joinedload(CheckoutRequestModel.employee)
-        )
-        
-        # Show all checkout requests, including recently completed ones (last 7 days)
-        from datetime import datetime, timedelta
-        
-        if status:
-            checkout_query = checkout_query.filter(CheckoutRequestModel.status == status)
-        else:
-            # Include all pending, in_progress, and recently completed (last 7 days)
-            # Exclude only old completed and cancelled requests
-            seven_days_ago = datetime.utcnow() - timedelta(days=7)
-            checkout_query = checkout_query.filter(
-                (CheckoutRequestModel.status.notin_(["cancelled", "completed"])) |
-                ((CheckoutRequestModel.status.in_(["completed", "cancelled"])) & 
-                 (CheckoutRequestModel.completed_at >= seven_days_ago))
-            )
-        
-        checkout_requests = checkout_query.order_by(CheckoutRequestModel.created_at.desc()).limit(limit).offset(skip).all()
-        
-        # Optimization: Pre-fetch all rooms to avoid N+1 queries
-        room_numbers = [cr.room_number for cr in checkout_requests if cr.room_number]
-        rooms = db.query(Room).filter(Room.number.in_(room_numbers)).all()
-        room_map = {r.number: r for r in rooms}
-        
-        # Optimization: Pre-fetch all inventory items needed for hydration
-        item_ids = set()
-        for cr in checkout_requests:
-            if cr.inventory_data:
-                for item in cr.inventory_data:
-                    if item.get('item_id'):
-                        item_ids.add(item.get('item_id'))
-        
-        inventory_items = {}
-        if item_ids:
-            items = db.query(InventoryItem).filter(InventoryItem.id.in_(list(item_ids))).all()
-            inventory_items = {i.id: i for i in items}
+        checkout_requests = db.execute(checkout_request_page_statement(skip, limit, status)).scalars().all()
+
+        # Rooms and inventory items (for name hydration) pre-fetched to avoid N+1 queries
+        rooms_stmt, items_stmt = checkout_request_lookup_statements(checkout_requests, selected)
+        room_map = {r.number: r for r in db.execute(rooms_stmt).scalars()} if rooms_stmt is not None else {}
+        inventory_items = {i.id: i for i in db.execute(items_stmt).scalars()} if items_stmt is not None else {}
         
-        # Convert checkout requests to service request-like format
-        for cr in checkout_requests:
-            room = room_map.get(str(cr.room_number))
-            if room:
-                try:
-                    # Hydrate missing item names in inventory_data using pre-fetched map
-                    enriched_inventory_data = []
-                    if cr.inventory_data:
-                        for item in cr.inventory_data:
-                            enriched_item = item.copy()
-                            # Hydrate name if missing
-                            if ('item_name' not in enriched_item or not enriched_item['item_name']) and enriched_item.get('item_id'):
-                                inv_item = inventory_items.get(enriched_item.get('item_id'))
-                                if inv_item:
-                                    enriched_item['item_name'] = inv_item.name
-                                    if 'item_code' not in enriched_item:
-                                        enriched_item['item_code'] = inv_item.item_code
-                            enriched_inventory_data.append(enriched_item)
-
-                    result.append({
-                        "id": cr.id + 1000000, 
-                        "food_order_id": None,
-                        "room_id": room.id,
-                        "employee_id": cr.employee_id,
-                        "request_type": "checkout_verification",
-                        "description": f"Checkout inventory verification for Room {cr.room_number} - Guest: {cr.guest_name}",
-                        "status": str(cr.status) if cr.status else "pending",
-                        "created_at": cr.created_at.isoformat() if cr.created_at else None,
-                        "completed_at": cr.completed_at.isoformat() if cr.completed_at else None,
-                        "is_checkout_request": True,
-                        "checkout_request_id": cr.id,
-                        "room_number": str(cr.room_number) if cr.room_number else None,
-                        "guest_name": str(cr.guest_name) if cr.guest_name else None,
-                        "employee_name": str(cr.employee.name) if cr.employee and cr.employee.name else None,
-                        "inventory_notes": cr.inventory_notes,
-                        # Process enriched inventory data
-                        "asset_damages": [item for item in enriched_inventory_data if item.get('is_fixed_asset')],
-                        "inventory_data_with_charges": [item for item in enriched_inventory_data if not item.get('is_fixed_asset')]
-                    })
-                except Exception as e:
-                    print(f"[ERROR] Error converting checkout request {cr.id}: {e}")
-                    continue
+        result.extend(checkout_requests_to_dicts(checkout_requests, room_map, inventory_items))
     
-    return result
+    return FastJSONResponse(trim_fields(result, selected))
 
 @router.get("/{request_id}", response_model=ServiceRequestOut)
 def get_service_request(
@@ -2,32 +2,23 @@
 Stock Reconciliation Endpoint
 Fixes discrepancies between global stock and location stocks
 """
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app.models.user import User
 from app.api.auth import get_current_user
+from app.utils.jobs import job_accepted, job_handler, job_inline
 from typing import List, Dict, Any
 from datetime import datetime
+import logging
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 
-@router.post("/inventory/reconcile-stock")
-def reconcile_stock(
-    fix_discrepancies: bool = False,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
-    """
-    Reconcile stock discrepancies between global and location stocks.
-    
-    Args:
-        fix_discrepancies: If True, automatically fix discrepancies. If False, only report them.
-    
-    Returns:
-        Report of discrepancies found and actions taken
-    """
+def _reconcile_stock(db: Session, fix_discrepancies: bool, user_id: int, job=None) -> dict:
+    """Report (and optionally fix) global vs location stock discrepancies; see reconcile_stock"""
     from app.models.inventory import InventoryItem, LocationStock, InventoryTransaction
     from sqlalchemy import func
     
@@ -45,7 +36,9 @@ def reconcile_stock(
         items = db.query(InventoryItem).all()
         report["total_items_checked"] = len(items)
         
-        for item in items:
+        for index, item in enumerate(items):
+            if job:
+                job.progress(index, len(items), f"{report['discrepancies_found']} discrepancies found")
             # Calculate total stock across all locations
             location_stocks = db.query(LocationStock).filter(
                 LocationStock.item_id == item.id
@@ -94,7 +87,7 @@ def reconcile_stock(
                         total_amount=abs(discrepancy) * (item.unit_price or 0),
                         reference_number=f"RECONCILE-{datetime.utcnow().strftime('%Y%m%d%H%M%S')}",
                         notes=f"Stock reconciliation: Global {old_global} → {total_location_stock} (Discrepancy: {discrepancy})",
-                        created_by=current_user.id
+                        created_by=user_id
                     )
                     db.add(adjustment_txn)
                     
@@ -114,12 +107,46 @@ def reconcile_stock(
             report["summary"]["status"] = "Report Only"
             report["summary"]["message"] = f"Found {report['discrepancies_found']} discrepancies (not fixed)"
         
+        if job:
+            job.progress(len(items), len(items), report["summary"]["message"])
         return report
         
-    except Exception as e:
+    except Exception:
         db.rollback()
-        import traceback
-        traceback.print_exc()
+        raise
+
+
+@job_handler("inventory.reconcile_stock")
+def reconcile_stock_job(job, fix_discrepancies: bool = False):
+    return _reconcile_stock(job.db, fix_discrepancies, job.user_id, job=job)
+
+
+@router.post("/inventory/reconcile-stock")
+def reconcile_stock(
+    fix_discrepancies: bool = False,
+    background: bool = Query(False, description="Run as a background job (202 + job, poll GET /api/jobs/{id})"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Reconcile stock discrepancies between global and location stocks.
+    
+    Args:
+        fix_discrepancies: If True, automatically fix discrepancies. If False, only report them.
+        background: If True, run as a background job and return it instead of the report.
+    
+    Returns:
+        Report of discrepancies found and actions taken
+    """
+    if background:
+        return job_accepted(db, "inventory.reconcile_stock", {"fix_discrepancies": fix_discrepancies}, current_user)
+    try:
+        # Inline, but still the only reconciliation running (background or not)
+        return job_inline(db, "inventory.reconcile_stock", {"fix_discrepancies": fix_discrepancies}, current_user)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception("Error in reconcile_stock")
         raise HTTPException(
             status_code=500,
             detail=f"Error during stock reconciliation: {str(e)}"
@@ -0,0 +1,139 @@
+"""
+Delta sync: only the records created, updated or deleted since a cursor (see app.utils.change_log)
+
+Client protocol:
+  1. GET /sync?entities=... without `since`: every entity comes back in `reset`
+     together with the current cursor; fetch those lists in full as today.
+  2. Poll GET /sync?since=<cursor>&entities=...: apply `records` (upserts) and
+     `deleted` (ids), store the new cursor, and call again at once while
+     `has_more` is true. Entities listed in `reset` must be refetched in full.
+When nothing changed the call is a single indexed query returning an empty page.
+"""
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session, joinedload, selectinload
+
+from app.utils.auth import get_db, get_current_user
+from app.utils.api_optimization import no_store
+from app.models.user import User
+from app.models.room import Room
+from app.models.booking import Booking, BookingRoom
+from app.schemas.booking import BookingOut
+from app.schemas.foodorder import FoodOrderOut
+from app.schemas.room import RoomOut
+from app.schemas.user import UserOut
+from app.curd.foodorder import get_food_orders_by_ids
+from app.curd.service_request import get_service_requests_by_ids
+from app.api.service_request import service_request_to_dict
+from app.utils.change_log import SYNC_ENTITIES, changes_since, current_cursor, cursor_expired
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Clients poll with their cursor: never serve a page from a cache
+router = APIRouter(prefix="/sync", tags=["Sync"], dependencies=[Depends(no_store)])
+
+
+def _booking_records(db: Session, ids):
+    bookings = (
+        db.query(Booking)
+        .options(
+            selectinload(Booking.booking_rooms).joinedload(BookingRoom.room),
+            joinedload(Booking.user)
+        )
+        .filter(Booking.id.in_(ids))
+        .all()
+    )
+    records = []
+    for booking in bookings:
+        user_obj = None
+        if booking.user is not None:
+            try:
+                user_obj = UserOut.model_validate(booking.user)
+            except Exception as e:
+                logger.warning("Could not serialize user for booking %s: %s", booking.id, e)
+        records.append(BookingOut(
+            id=booking.id,
+            guest_name=booking.guest_name,
+            guest_mobile=booking.guest_mobile,
+            guest_email=booking.guest_email,
+            status=booking.status,
+            check_in=booking.check_in,
+            check_out=booking.check_out,
+            adults=booking.adults,
+            children=booking.children,
+            id_card_image_url=getattr(booking, 'id_card_image_url', None),
+            guest_photo_url=getattr(booking, 'guest_photo_url', None),
+            user=user_obj,
+            is_package=False,
+            rooms=[br.room for br in booking.booking_rooms if br.room is not None]
+        ).model_dump())
+    return records
+
+
+def _room_records(db: Session, ids):
+    rooms = db.query(Room).filter(Room.id.in_(ids)).all()
+    return [RoomOut.model_validate(room).model_dump() for room in rooms]
+
+
+def _food_order_records(db: Session, ids):
+    return [FoodOrderOut.model_validate(order).model_dump() for order in get_food_orders_by_ids(db, ids)]
+
+
+def _service_request_records(db: Session, ids):
+    requests = get_service_requests_by_ids(db, ids)
+    return [d for d in (service_request_to_dict(sr) for sr in requests) if d is not None]
+
+
+# Serializers match the entity's list endpoint (/bookings, /rooms, /food-orders, /service-requests)
+_LOADERS = {
+    "bookings": _booking_records,
+    "rooms": _room_records,
+    "food_orders": _food_order_records,
+    "service_requests": _service_request_records,
+}
+
+
+@router.get("")
+def sync_changes(
+    since: Optional[int] = Query(None, ge=0, description="Cursor from the previous sync; omit for the initial call"),
+    entities: Optional[str] = Query(None, description=f"Comma-separated subset of: {', '.join(SYNC_ENTITIES)}"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Records created, updated and deleted since `since`, plus the cursor to send next time"""
+    requested = [e.strip() for e in entities.split(",") if e.strip()] if entities else list(SYNC_ENTITIES)
+    unknown = sorted(set(requested) - set(SYNC_ENTITIES))
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown sync entities: {', '.join(unknown)}")
+    requested = sorted(set(requested))
+
+    empty = {entity: [] for entity in requested}
+    if since is None or cursor_expired(db, since):
+        return {
+            "cursor": current_cursor(db),
+            "has_more": False,
+            "reset": requested,
+            "records": empty,
+            "deleted": dict(empty),
+        }
+
+    changes = changes_since(db, since, requested)
+    records = {}
+    deleted = {}
+    for entity in requested:
+        ids = changes["upserted"][entity]
+        rows = _LOADERS[entity](db, ids) if ids else []
+        records[entity] = rows
+        # Logged as changed but gone now: removed by a later commit (or a bulk delete)
+        found = {row["id"] for row in rows}
+        deleted[entity] = sorted(set(changes["deleted"][entity]) | {i for i in ids if i not in found})
+
+    return {
+        "cursor": changes["cursor"],
+        "has_more": changes["has_more"],
+        "reset": changes["reset"],
+        "records": records,
+        "deleted": deleted,
+    }
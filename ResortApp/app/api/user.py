@@ -1,23 +1,16 @@
 from ast import List
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from app.database import SessionLocal
 from app.schemas.user import UserCreate, UserOut, AdminSetupRequest, RoleCreate
 from app.curd import user as crud_user
 from app.curd import role as crud_role
-from app.utils.auth import get_current_user
+from app.utils.auth import get_db, get_current_user
 from app.models.user import User, Role
 from sqlalchemy.orm import joinedload
 
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
 @router.get("/me", response_model=UserOut)
 def read_current_user(current_user = Depends(get_current_user)):
     return current_user
@@ -11,6 +11,9 @@ from app.schemas.account import (
     AccountLedgerCreate, AccountLedgerUpdate,
     JournalEntryCreate, JournalEntryUpdate
 )
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 # Account Group CRUD
@@ -186,8 +189,8 @@ def generate_entry_number(db: Session) -> str:
     return entry_number
 
 
-def create_journal_entry(db: Session, entry: JournalEntryCreate, created_by: Optional[int] = None) -> JournalEntry:
-    """Create a new journal entry with lines - includes balance validation"""
+def create_journal_entry(db: Session, entry: JournalEntryCreate, created_by: Optional[int] = None, commit: bool = True) -> JournalEntry:
+    """Create a new journal entry with lines - includes balance validation (commit=False leaves it to the caller)"""
     # Validate balance: Total Debits must equal Total Credits
     total_debits = sum(line.amount for line in entry.lines if line.debit_ledger_id)
     total_credits = sum(line.amount for line in entry.lines if line.credit_ledger_id)
@@ -240,8 +243,11 @@ def create_journal_entry(db: Session, entry: JournalEntryCreate, created_by: Opt
         )
         db.add(db_line)
     
-    db.commit()
-    db.refresh(db_entry)
+    if commit:
+        db.commit()
+        db.refresh(db_entry)
+    else:
+        db.flush()
     return db_entry
 
 
@@ -426,7 +432,7 @@ def get_automatic_trial_balance(db: Session, as_on_date: Optional[datetime] = No
                     ledger_balances_dict["Revenue from Operations"]["credit_total"] += total_revenue
                     ledger_balances_dict["Revenue from Operations"]["balance"] -= total_revenue  # Credit balance is negative
         except Exception as e:
-            print(f"Error calculating checkout revenue: {str(e)}")
+            logger.error("Error calculating checkout revenue: %s", e)
         
         # 2. Revenue from Food Orders (billed and paid)
         try:
@@ -463,7 +469,7 @@ def get_automatic_trial_balance(db: Session, as_on_date: Optional[datetime] = No
                     ledger_balances_dict["Food & Beverage Revenue"]["credit_total"] += food_revenue
                     ledger_balances_dict["Food & Beverage Revenue"]["balance"] -= food_revenue
         except Exception as e:
-            print(f"Error calculating food revenue: {str(e)}")
+            logger.error("Error calculating food revenue: %s", e)
         
         # 3. Expenses
         try:
@@ -495,7 +501,7 @@ def get_automatic_trial_balance(db: Session, as_on_date: Optional[datetime] = No
                     ledger_balances_dict["Operating Expenses"]["debit_total"] += total_expenses
                     ledger_balances_dict["Operating Expenses"]["balance"] += total_expenses
         except Exception as e:
-            print(f"Error calculating expenses: {str(e)}")
+            logger.error("Error calculating expenses: %s", e)
         
         # 4. Inventory Purchases
         try:
@@ -527,7 +533,7 @@ def get_automatic_trial_balance(db: Session, as_on_date: Optional[datetime] = No
                     ledger_balances_dict["Inventory Purchases"]["debit_total"] += total_purchases
                     ledger_balances_dict["Inventory Purchases"]["balance"] += total_purchases
         except Exception as e:
-            print(f"Error calculating purchases: {str(e)}")
+            logger.error("Error calculating purchases: %s", e)
         
         # 5. Inventory Consumption (COGS)
         try:
@@ -558,12 +564,12 @@ def get_automatic_trial_balance(db: Session, as_on_date: Optional[datetime] = No
                     ledger_balances_dict["Cost of Goods Sold"]["debit_total"] += total_cogs
                     ledger_balances_dict["Cost of Goods Sold"]["balance"] += total_cogs
         except Exception as e:
-            print(f"Error calculating COGS: {str(e)}")
+            logger.error("Error calculating COGS: %s", e)
         
         # 6. Skip journal entries in automatic mode to avoid timeouts
         # Journal entries can be viewed separately in the "Journal Entries" tab
         # Automatic trial balance focuses on business transactions only
-        print("Automatic trial balance: Skipping journal entries to improve performance")
+        logger.warning("Automatic trial balance: Skipping journal entries to improve performance")
         
         # Convert to list and calculate totals
         ledger_balances = list(ledger_balances_dict.values())
@@ -581,9 +587,8 @@ def get_automatic_trial_balance(db: Session, as_on_date: Optional[datetime] = No
             "is_balanced": abs(total_debits - total_credits) < 0.01  # Allow small rounding differences
         }
     except Exception as e:
-        import traceback
-        error_msg = f"Error in get_automatic_trial_balance: {str(e)}\n{traceback.format_exc()}"
-        print(error_msg)
+        error_msg = f"Error in get_automatic_trial_balance: {str(e)}"
+        logger.error("%s", error_msg, exc_info=True)
         # Return empty trial balance on error
         return {
             "ledgers": [],
@@ -0,0 +1,403 @@
+"""
+Section definitions for the accounts comprehensive report.
+
+Each section is a query builder plus a row serializer, shared by the JSON
+endpoint (/accounts/comprehensive-report, capped per section) and the streamed
+export (/accounts/comprehensive-report/export, uncapped). Collections are
+loaded with selectinload so the queries also work with yield_per streaming.
+"""
+from collections import namedtuple
+from datetime import datetime, date as date_type
+from typing import Optional, Tuple
+
+from sqlalchemy.orm import Session, joinedload, selectinload
+
+from app.models.checkout import Checkout
+from app.models.booking import Booking, BookingRoom
+from app.models.Package import PackageBooking, PackageBookingRoom
+from app.models.foodorder import FoodOrder, FoodOrderItem
+from app.models.service import AssignedService
+from app.models.expense import Expense
+from app.models.inventory import PurchaseMaster, PurchaseDetail, InventoryTransaction
+from app.models.account import JournalEntry, JournalEntryLine
+from app.models.employee import Employee, Attendance, Leave, WorkingLog
+import logging
+
+logger = logging.getLogger(__name__)
+
+# name: key in the report; query: (db, start_dt, end_dt) -> ordered Query; serialize: obj -> dict
+ReportSection = namedtuple("ReportSection", ["name", "query", "serialize"])
+
+
+def parse_report_range(start_date: Optional[str], end_date: Optional[str]) -> Tuple[Optional[datetime], Optional[datetime]]:
+    """YYYY-MM-DD (whole days) or ISO datetimes -> (start_dt, end_dt); unparseable values are ignored"""
+    start_dt = None
+    end_dt = None
+    if start_date:
+        try:
+            if len(start_date) == 10:
+                start_dt = datetime.combine(date_type.fromisoformat(start_date), datetime.min.time())
+            else:
+                start_dt = datetime.fromisoformat(start_date.replace('Z', '+00:00'))
+        except ValueError:
+            start_dt = None
+    if end_date:
+        try:
+            if len(end_date) == 10:
+                end_dt = datetime.combine(date_type.fromisoformat(end_date), datetime.max.time())
+            else:
+                end_dt = datetime.fromisoformat(end_date.replace('Z', '+00:00'))
+        except ValueError:
+            end_dt = None
+    return start_dt, end_dt
+
+
+def _as_date(value):
+    return value.date() if isinstance(value, datetime) else value
+
+
+def _between(query, column, start, end):
+    if start:
+        query = query.filter(column >= start)
+    if end:
+        query = query.filter(column <= end)
+    return query
+
+
+def _iso(value):
+    return value.isoformat() if value else None
+
+
+# --- Queries -----------------------------------------------------------------
+
+def _checkouts_query(db: Session, start_dt, end_dt):
+    query = _between(db.query(Checkout), Checkout.checkout_date, start_dt, end_dt)
+    return query.order_by(Checkout.checkout_date.desc())
+
+
+def _bookings_query(db: Session, start_dt, end_dt):
+    query = db.query(Booking).options(selectinload(Booking.booking_rooms).joinedload(BookingRoom.room))
+    return _between(query, Booking.check_in, start_dt, end_dt).order_by(Booking.check_in.desc())
+
+
+def _package_bookings_query(db: Session, start_dt, end_dt):
+    query = db.query(PackageBooking).options(
+        joinedload(PackageBooking.package),
+        selectinload(PackageBooking.rooms).joinedload(PackageBookingRoom.room),
+    )
+    return _between(query, PackageBooking.check_in, start_dt, end_dt).order_by(PackageBooking.check_in.desc())
+
+
+def _food_orders_query(db: Session, start_dt, end_dt):
+    query = db.query(FoodOrder).options(
+        joinedload(FoodOrder.room),
+        selectinload(FoodOrder.items).joinedload(FoodOrderItem.food_item),
+    )
+    return _between(query, FoodOrder.created_at, start_dt, end_dt).order_by(FoodOrder.created_at.desc())
+
+
+def _services_query(db: Session, start_dt, end_dt):
+    query = db.query(AssignedService).options(
+        joinedload(AssignedService.service),
+        joinedload(AssignedService.employee),
+        joinedload(AssignedService.room),
+    )
+    return _between(query, AssignedService.assigned_at, start_dt, end_dt).order_by(AssignedService.assigned_at.desc())
+
+
+def _expenses_query(db: Session, start_dt, end_dt):
+    query = db.query(Expense).options(joinedload(Expense.employee))
+    return _between(query, Expense.date, _as_date(start_dt), _as_date(end_dt)).order_by(Expense.date.desc())
+
+
+def _purchases_query(db: Session, start_dt, end_dt):
+    query = db.query(PurchaseMaster).options(
+        joinedload(PurchaseMaster.vendor),
+        selectinload(PurchaseMaster.details).joinedload(PurchaseDetail.item),
+    )
+    query = _between(query, PurchaseMaster.purchase_date, _as_date(start_dt), _as_date(end_dt))
+    return query.order_by(PurchaseMaster.purchase_date.desc())
+
+
+def _inventory_transactions_query(db: Session, start_dt, end_dt):
+    query = db.query(InventoryTransaction).options(joinedload(InventoryTransaction.item))
+    query = _between(query, InventoryTransaction.created_at, start_dt, end_dt)
+    return query.order_by(InventoryTransaction.created_at.desc())
+
+
+def _journal_entries_query(db: Session, start_dt, end_dt):
+    query = db.query(JournalEntry).options(
+        selectinload(JournalEntry.lines).joinedload(JournalEntryLine.debit_ledger),
+        selectinload(JournalEntry.lines).joinedload(JournalEntryLine.credit_ledger),
+    )
+    return _between(query, JournalEntry.entry_date, start_dt, end_dt).order_by(JournalEntry.entry_date.desc())
+
+
+def _employees_query(db: Session, start_dt, end_dt):
+    return db.query(Employee).order_by(Employee.name)
+
+
+def _attendances_query(db: Session, start_dt, end_dt):
+    query = db.query(Attendance).options(joinedload(Attendance.employee))
+    return _between(query, Attendance.date, _as_date(start_dt), _as_date(end_dt)).order_by(Attendance.date.desc())
+
+
+def _leaves_query(db: Session, start_dt, end_dt):
+    query = db.query(Leave).options(joinedload(Leave.employee))
+    if start_dt:
+        query = query.filter(Leave.from_date >= _as_date(start_dt))
+    if end_dt:
+        query = query.filter(Leave.to_date <= _as_date(end_dt))
+    return query.order_by(Leave.from_date.desc())
+
+
+def _working_logs_query(db: Session, start_dt, end_dt):
+    query = db.query(WorkingLog).options(joinedload(WorkingLog.employee))
+    return _between(query, WorkingLog.date, _as_date(start_dt), _as_date(end_dt)).order_by(WorkingLog.date.desc())
+
+
+# --- Serializers -------------------------------------------------------------
+
+def _checkout_row(c):
+    return {
+        "id": c.id,
+        "booking_id": c.booking_id,
+        "package_booking_id": c.package_booking_id,
+        "guest_name": c.guest_name,
+        "room_number": c.room_number,
+        "checkout_date": _iso(c.checkout_date),
+        "room_total": float(c.room_total or 0),
+        "food_total": float(c.food_total or 0),
+        "service_total": float(c.service_total or 0),
+        "package_total": float(c.package_total or 0),
+        "tax_amount": float(c.tax_amount or 0),
+        "discount_amount": float(c.discount_amount or 0),
+        "grand_total": float(c.grand_total or 0),
+        "payment_status": c.payment_status,
+        "payment_method": c.payment_method
+    }
+
+
+def _booking_row(b):
+    return {
+        "id": b.id,
+        "guest_name": b.guest_name,
+        "guest_mobile": b.guest_mobile,
+        "guest_email": b.guest_email,
+        "check_in": _iso(b.check_in),
+        "check_out": _iso(b.check_out),
+        "status": b.status,
+        "total_amount": float(b.total_amount or 0),
+        "advance_deposit": float(b.advance_deposit or 0),
+        "adults": b.adults,
+        "children": b.children,
+        "rooms": [{"room_id": br.room_id, "room_number": br.room.number if br.room else None} for br in b.booking_rooms] if b.booking_rooms else []
+    }
+
+
+def _package_booking_total(pb):
+    """
+    Package charge as checkout bills it (PackageBooking stores no total): the
+    package price for whole-property packages, otherwise price per room per night
+    """
+    package = pb.package
+    if package is None:
+        return 0.0
+    price = float(package.price or 0)
+    booking_type = (package.booking_type or "").lower()
+    if booking_type:
+        whole_property = booking_type in ("whole_property", "whole property")
+    else:
+        whole_property = not (package.room_types or "").strip()
+    if whole_property:
+        return price
+    nights = max(1, (pb.check_out - pb.check_in).days) if pb.check_in and pb.check_out else 1
+    return price * len(pb.rooms or []) * nights
+
+
+def _package_booking_row(pb):
+    return {
+        "id": pb.id,
+        "guest_name": pb.guest_name,
+        "guest_mobile": pb.guest_mobile,
+        "guest_email": pb.guest_email,
+        "check_in": _iso(pb.check_in),
+        "check_out": _iso(pb.check_out),
+        "status": pb.status,
+        "total_amount": _package_booking_total(pb),
+        "advance_deposit": float(pb.advance_deposit or 0),
+        "package_id": pb.package_id,
+        "package_name": pb.package.title if pb.package else None,
+        "rooms": [{"room_id": pbr.room_id, "room_number": pbr.room.number if pbr.room else None} for pbr in pb.rooms] if pb.rooms else []
+    }
+
+
+def _food_order_row(fo):
+    return {
+        "id": fo.id,
+        "room_id": fo.room_id,
+        "room_number": fo.room.number if fo.room else None,
+        "amount": float(fo.amount or 0),
+        "status": fo.status,
+        "billing_status": fo.billing_status,
+        "order_type": fo.order_type,
+        "created_at": _iso(fo.created_at),
+        "items": [{
+            "food_item_id": item.food_item_id,
+            "food_item_name": item.food_item.name if item.food_item else None,
+            "quantity": item.quantity
+        } for item in fo.items] if fo.items else []
+    }
+
+
+def _service_row(s):
+    return {
+        "id": s.id,
+        "service_id": s.service_id,
+        "service_name": s.service.name if s.service else None,
+        "room_id": s.room_id,
+        "room_number": s.room.number if s.room else None,
+        "employee_id": s.employee_id,
+        "employee_name": s.employee.name if s.employee else None,
+        "status": s.status,
+        "billing_status": s.billing_status,
+        "assigned_at": _iso(s.assigned_at),
+        "completed_at": _iso(s.completed_at)
+    }
+
+
+def _expense_row(e):
+    return {
+        "id": e.id,
+        "category": e.category,
+        "amount": float(e.amount or 0),
+        "description": e.description,
+        "date": _iso(e.date),
+        "employee_id": e.employee_id,
+        "employee_name": e.employee.name if e.employee else None
+    }
+
+
+def _purchase_row(p):
+    p_data = {
+        "id": p.id,
+        "purchase_number": p.purchase_number,
+        "vendor_id": p.vendor_id,
+        "vendor_name": p.vendor.name if p.vendor else "Unknown",
+        "purchase_date": _iso(p.purchase_date),
+        "total_amount": float(p.total_amount or 0),
+        "status": p.status,
+        "details": []
+    }
+    # Load details safely; a bad detail row must not drop the whole purchase
+    try:
+        for d in p.details or []:
+            p_data["details"].append({
+                "item_id": d.item_id,
+                "item_name": d.item.name if (d.item) else "Unknown Item",
+                "quantity": float(d.quantity or 0),
+                "unit_price": float(d.unit_price or 0),
+                "total": float(d.total_amount or 0)
+            })
+    except Exception as ex:
+        logger.error("Error loading details for purchase %s: %s", p.id, ex)
+    return p_data
+
+
+def _inventory_transaction_row(t):
+    return {
+        "id": t.id,
+        "item_id": t.item_id,
+        "item_name": t.item.name if t.item else None,
+        "transaction_type": t.transaction_type,
+        "quantity": float(t.quantity or 0),
+        "unit_price": float(t.unit_price or 0),
+        "total_amount": float(t.total_amount or 0),
+        "reference_number": t.reference_number,
+        "notes": t.notes,
+        "created_at": _iso(t.created_at)
+    }
+
+
+def _journal_entry_row(je):
+    return {
+        "id": je.id,
+        "entry_number": je.entry_number,
+        "entry_date": _iso(je.entry_date),
+        "description": je.description,
+        "reference_type": je.reference_type,
+        "reference_id": je.reference_id,
+        "lines": [{
+            "id": line.id,
+            "debit_ledger_id": line.debit_ledger_id,
+            "debit_ledger_name": line.debit_ledger.name if line.debit_ledger else None,
+            "credit_ledger_id": line.credit_ledger_id,
+            "credit_ledger_name": line.credit_ledger.name if line.credit_ledger else None,
+            "amount": float(line.amount or 0),
+            "description": line.description
+        } for line in je.lines] if je.lines else []
+    }
+
+
+def _employee_row(e):
+    return {
+        "id": e.id,
+        "name": e.name,
+        "role": e.role,
+        "salary": float(e.salary or 0),
+        "join_date": _iso(e.join_date),
+        "user_id": e.user_id
+    }
+
+
+def _attendance_row(a):
+    return {
+        "id": a.id,
+        "employee_id": a.employee_id,
+        "employee_name": a.employee.name if a.employee else None,
+        "date": _iso(a.date),
+        "status": a.status
+    }
+
+
+def _leave_row(l):
+    return {
+        "id": l.id,
+        "employee_id": l.employee_id,
+        "employee_name": l.employee.name if l.employee else None,
+        "from_date": _iso(l.from_date),
+        "to_date": _iso(l.to_date),
+        "reason": l.reason,
+        "leave_type": l.leave_type,
+        "status": l.status
+    }
+
+
+def _working_log_row(wl):
+    return {
+        "id": wl.id,
+        "employee_id": wl.employee_id,
+        "employee_name": wl.employee.name if wl.employee else None,
+        "date": _iso(wl.date),
+        "check_in_time": wl.check_in_time.strftime("%H:%M:%S") if wl.check_in_time else None,
+        "check_out_time": wl.check_out_time.strftime("%H:%M:%S") if wl.check_out_time else None,
+        "location": wl.location
+    }
+
+
+# Report order (also the order of the JSON "data" keys and the CSV files in the zip)
+REPORT_SECTIONS = [
+    ReportSection("checkouts", _checkouts_query, _checkout_row),
+    ReportSection("bookings", _bookings_query, _booking_row),
+    ReportSection("package_bookings", _package_bookings_query, _package_booking_row),
+    ReportSection("food_orders", _food_orders_query, _food_order_row),
+    ReportSection("services", _services_query, _service_row),
+    ReportSection("expenses", _expenses_query, _expense_row),
+    ReportSection("purchases", _purchases_query, _purchase_row),
+    ReportSection("inventory_transactions", _inventory_transactions_query, _inventory_transaction_row),
+    ReportSection("journal_entries", _journal_entries_query, _journal_entry_row),
+    ReportSection("employees", _employees_query, _employee_row),
+    ReportSection("attendances", _attendances_query, _attendance_row),
+    ReportSection("leaves", _leaves_query, _leave_row),
+    ReportSection("working_logs", _working_logs_query, _working_log_row),
+]
@@ -3,8 +3,13 @@ from app.models.foodorder import FoodOrder, FoodOrderItem
 from app.models.booking import Booking, BookingRoom
 from app.models.Package import PackageBooking, PackageBookingRoom
 from app.models.service_request import ServiceRequest
-from app.schemas.foodorder import FoodOrderCreate, FoodOrderUpdate
+from app.schemas.foodorder import FoodOrderCreate, FoodOrderUpdate, FoodOrderOut, FoodOrderItemOut
+from app.utils.occupancy import current_stay_for_room_id
+from app.utils.bulk_writes import DELETED, bulk_written
 from datetime import datetime
+import logging
+
+logger = logging.getLogger(__name__)
 # Notification system removed
 
 def get_guest_for_room(room_id, db: Session, reference_date=None):
@@ -15,21 +20,22 @@ def get_guest_for_room(room_id, db: Session, reference_date=None):
     # Ensure reference_date is a date object for comparison with Date columns
     ref_date = reference_date.date() if reference_date and isinstance(reference_date, datetime) else reference_date
     
-    # Check regular bookings first
+    if not ref_date:
+        # Current guest: served from the cached occupancy map
+        booking, _ = current_stay_for_room_id(db, room_id)
+        return booking.guest_name if booking else None
+    
+    # Guest on the reference date: check regular bookings first
     query = (
         db.query(Booking)
         .join(BookingRoom)
         .filter(BookingRoom.room_id == room_id)
     )
     
-    if ref_date:
-        # Find booking covering the reference date
-        query = query.filter(Booking.check_in <= ref_date)\
-                     .filter(Booking.check_out >= ref_date)\
-                     .filter(Booking.status != "cancelled")
-    else:
-        # Check active bookings
-        query = query.filter(Booking.status.in_(["checked-in", "booked"]))
+    # Find booking covering the reference date
+    query = query.filter(Booking.check_in <= ref_date)\
+                 .filter(Booking.check_out >= ref_date)\
+                 .filter(Booking.status != "cancelled")
         
     active_booking = query.order_by(Booking.id.desc()).first()
     
@@ -43,12 +49,9 @@ def get_guest_for_room(room_id, db: Session, reference_date=None):
         .filter(PackageBookingRoom.room_id == room_id)
     )
     
-    if ref_date:
-        pkg_query = pkg_query.filter(PackageBooking.check_in <= ref_date)\
-                             .filter(PackageBooking.check_out >= ref_date)\
-                             .filter(PackageBooking.status != "cancelled")
-    else:
-        pkg_query = pkg_query.filter(PackageBooking.status.in_(["checked-in", "booked"]))
+    pkg_query = pkg_query.filter(PackageBooking.check_in <= ref_date)\
+                         .filter(PackageBooking.check_out >= ref_date)\
+                         .filter(PackageBooking.status != "cancelled")
         
     active_package_booking = pkg_query.order_by(PackageBooking.id.desc()).first()
     
@@ -57,7 +60,68 @@ def get_guest_for_room(room_id, db: Session, reference_date=None):
     
     return None
 
-def create_food_order(db: Session, order_data: FoodOrderCreate):
+def pick_guest_for_room(room_id, stays, reference_date=None, newest_first=False):
+    """
+    In-memory equivalent of get_guest_for_room over pre-fetched stays.
+
+    stays: iterable of (room_id, booking, is_package) for the candidate rooms,
+    so a whole page of orders can be resolved from one bulk query.
+    newest_first: stays are ordered by booking id descending, so the first
+    match is the answer and the rest need not be scanned.
+    """
+    if not room_id:
+        return None
+    ref_date = reference_date.date() if reference_date and isinstance(reference_date, datetime) else reference_date
+    
+    for want_package in (False, True):
+        best = None
+        for stay_room_id, booking, is_package in stays:
+            if stay_room_id != room_id or is_package != want_package:
+                continue
+            if ref_date:
+                # The query behind get_guest_for_room never matches a stay with a missing date
+                if booking.check_in is None or booking.check_out is None:
+                    continue
+                if not (booking.check_in <= ref_date <= booking.check_out) or booking.status == "cancelled":
+                    continue
+            elif booking.status not in ("checked-in", "booked"):
+                continue
+            if best is None or booking.id > best.id:
+                best = booking
+                if newest_first:
+                    break
+        if best is not None:
+            return best.guest_name
+    return None
+
+def populate_order_fields(order: FoodOrder, guest_name=None):
+    """Set the computed employee_name / room_number / guest_name fields used by FoodOrderOut"""
+    order.employee_name = order.employee.name if order.employee else None
+    order.room_number = order.room.number if order.room else None
+    order.guest_name = guest_name
+    return order
+
+def create_food_order(db: Session, order_data: FoodOrderCreate) -> FoodOrderOut:
+    """
+    Order intake in one transaction: the order and its items go out in one flush
+    (items as a single multi-row insert), the room-service delivery request
+    follows, and everything commits once. The response is built from in-memory
+    state and the kitchen ticket is published with the commit.
+    """
+    from app.models.food_item import FoodItem
+    from app.models.room import Room
+    from app.utils.kitchen_queue import make_ticket, publish_ticket
+
+    food_item_ids = {item.food_item_id for item in order_data.items}
+    item_names = dict(
+        db.query(FoodItem.id, FoodItem.name).filter(FoodItem.id.in_(food_item_ids)).all()
+    ) if food_item_ids else {}
+    room = db.get(Room, order_data.room_id) if order_data.room_id else None
+
+    items = [
+        FoodOrderItem(food_item_id=item_data.food_item_id, quantity=item_data.quantity)
+        for item_data in order_data.items
+    ]
     order = FoodOrder(
         room_id=order_data.room_id,
         amount=order_data.amount,
@@ -65,106 +129,238 @@ def create_food_order(db: Session, order_data: FoodOrderCreate):
         status="pending",
         billing_status="unbilled",
         order_type=getattr(order_data, 'order_type', 'dine_in'),
-        delivery_request=getattr(order_data, 'delivery_request', None)
+        delivery_request=getattr(order_data, 'delivery_request', None),
+        items=items
     )
     db.add(order)
+    db.flush()
+
+    # Room service orders get their delivery request in the same transaction
+    if order.order_type == "room_service":
+        db.add(ServiceRequest(
+            food_order_id=order.id,
+            room_id=order.room_id,
+            employee_id=order.assigned_employee_id,
+            request_type="delivery",
+            description=order.delivery_request or f"Room service delivery for food order #{order.id}",
+            status="pending"
+        ))
+
+    room_number = room.number if room else None
+    response = FoodOrderOut(
+        id=order.id,
+        room_id=order.room_id,
+        amount=order.amount,
+        status=order.status,
+        assigned_employee_id=order.assigned_employee_id,
+        billing_status=order.billing_status,
+        payment_method=None,
+        order_type=order.order_type,
+        delivery_request=order.delivery_request,
+        items=[
+            FoodOrderItemOut(id=item.id, food_item_id=item.food_item_id, quantity=item.quantity,
+                             food_item_name=item_names.get(item.food_item_id))
+            for item in items
+        ],
+        room_number=room_number
+    )
+    publish_ticket(db, make_ticket(order, items, item_names, room_number))
     db.commit()
-    db.refresh(order)
+    return response
+
+def food_order_page_statement(skip: int, limit: int, fields=None):
+    """
+    One page of orders as plain columns, room number and employee name joined in.
+    With a fieldset only its columns are selected and joins it does not need are skipped.
+    """
+    from sqlalchemy import select
+    from app.models.employee import Employee
+    from app.models.room import Room
+    from app.utils.api_optimization import sparse_columns, wants
+
+    room_number = Room.number.label("room_number")
+    employee_name = Employee.name.label("employee_name")
+    # FoodOrderOut field -> columns it is built from (items and guest_name are looked up by id / room and date)
+    field_columns = {
+        "room_id": (FoodOrder.room_id,),
+        "amount": (FoodOrder.amount,),
+        "status": (FoodOrder.status,),
+        "assigned_employee_id": (FoodOrder.assigned_employee_id,),
+        "billing_status": (FoodOrder.billing_status,),
+        "payment_method": (FoodOrder.payment_method,),
+        "order_type": (FoodOrder.order_type,),
+        "delivery_request": (FoodOrder.delivery_request,),
+        "guest_name": (FoodOrder.room_id, FoodOrder.created_at),
+        "employee_name": (employee_name,),
+        "room_number": (room_number,),
+    }
+    stmt = select(*sparse_columns(fields, field_columns, always=(FoodOrder.id,)))
+    if wants(fields, "room_number"):
+        stmt = stmt.outerjoin(Room, FoodOrder.room_id == Room.id)
+    if wants(fields, "employee_name"):
+        stmt = stmt.outerjoin(Employee, FoodOrder.assigned_employee_id == Employee.id)
+    return stmt.order_by(FoodOrder.id.desc()).offset(skip).limit(limit)
 
-    for item_data in order_data.items:
-        item = FoodOrderItem(
-            order_id=order.id,
-            food_item_id=item_data.food_item_id,
-            quantity=item_data.quantity,
+def food_order_items_statement(order_ids):
+    """Items of the given orders as plain columns, dish name joined in"""
+    from sqlalchemy import select
+    from app.models.food_item import FoodItem
+
+    return (
+        select(
+            FoodOrderItem.id, FoodOrderItem.order_id, FoodOrderItem.food_item_id,
+            FoodOrderItem.quantity, FoodItem.name.label("food_item_name"),
         )
-        db.add(item)
-    db.commit()
-    db.refresh(order)
-    
-    # Create service request immediately for room service orders
-    if order.order_type == "room_service":
-        # Check if service request already exists
-        existing_request = db.query(ServiceRequest).filter(
-            ServiceRequest.food_order_id == order.id
-        ).first()
-        if not existing_request:
-            service_request = ServiceRequest(
-                food_order_id=order.id,
-                room_id=order.room_id,
-                employee_id=order.assigned_employee_id,
-                request_type="delivery",
-                description=order.delivery_request or f"Room service delivery for food order #{order.id}",
-                status="pending"
-            )
-            db.add(service_request)
-            db.commit()
-    
-    
-    # Notification system removed for performance
-    
-    
-    # Reload order with relationships to ensure response has all data (especially food_item_name)
-    from sqlalchemy.orm import joinedload
-    order = (
-        db.query(FoodOrder)
-        .options(
-            joinedload(FoodOrder.items).joinedload(FoodOrderItem.food_item)
+        .outerjoin(FoodItem, FoodOrderItem.food_item_id == FoodItem.id)
+        .where(FoodOrderItem.order_id.in_(list(order_ids)))
+        .order_by(FoodOrderItem.id)
+    )
+
+def stay_statements(room_ids, order_dates=None):
+    """
+    (regular, package) statements for the stays of the rooms, as rows with
+    room_id, id, guest_name, check_in, check_out and status: enough for
+    pick_guest_for_room without loading the bookings.
+
+    order_dates: created_at of the orders being resolved. When every order has
+    one, only stays overlapping their date range are read, not the rooms'
+    whole booking history.
+    """
+    from sqlalchemy import select
+
+    room_ids = list(room_ids)
+    regular = (
+        select(BookingRoom.room_id, Booking.id, Booking.guest_name, Booking.check_in, Booking.check_out, Booking.status)
+        .join(Booking, BookingRoom.booking_id == Booking.id)
+        .where(BookingRoom.room_id.in_(room_ids))
+    )
+    package = (
+        select(
+            PackageBookingRoom.room_id, PackageBooking.id, PackageBooking.guest_name,
+            PackageBooking.check_in, PackageBooking.check_out, PackageBooking.status,
         )
-        .filter(FoodOrder.id == order.id)
-        .first()
+        .join(PackageBooking, PackageBookingRoom.package_booking_id == PackageBooking.id)
+        .where(PackageBookingRoom.room_id.in_(room_ids))
     )
+    days = [d.date() if isinstance(d, datetime) else d for d in (order_dates or ())]
+    # An order without a date is matched on status alone, so it needs every stay
+    if days and all(days):
+        first, last = min(days), max(days)
+        regular = regular.where(Booking.check_in <= last, Booking.check_out >= first)
+        package = package.where(PackageBooking.check_in <= last, PackageBooking.check_out >= first)
+    return regular, package
 
-    return order
+def food_order_rows_to_dicts(orders, items, regular_stays, package_stays, fields=None):
+    """
+    FoodOrderOut-shaped dicts from the rows of the statements above, cut down to
+    the fieldset if one is given (items and stays are then only the ones it needs)
+    """
+    from app.utils.api_optimization import trim_fields, wants
 
-def get_food_orders(db: Session, skip: int = 0, limit: int = 100):
-    from sqlalchemy.orm import joinedload
-    
+    items_by_order = {}
+    for item in items:
+        items_by_order.setdefault(item.order_id, []).append({
+            "id": item.id,
+            "food_item_id": item.food_item_id,
+            "quantity": item.quantity,
+            "food_item_name": item.food_item_name,
+        })
+    # Grouped per room and newest first: each order scans its own room's stays up to the first match
+    stays_by_room = {}
+    for is_package, rows in ((False, regular_stays), (True, package_stays)):
+        for row in sorted(rows, key=lambda r: r.id, reverse=True):
+            stays_by_room.setdefault(row.room_id, []).append((row.room_id, row, is_package))
+
+    guests = {}
+
+    def guest_for(room_id, created_at):
+        # Orders of one stay share room and day: resolve each pair once
+        key = (room_id, created_at.date() if isinstance(created_at, datetime) else created_at)
+        if key not in guests:
+            guests[key] = pick_guest_for_room(room_id, stays_by_room.get(room_id, ()), key[1], newest_first=True)
+        return guests[key]
+
+    with_guest = wants(fields, "guest_name")
+    rows = []
+    for order in orders:
+        order = order._mapping
+        rows.append({
+            "id": order["id"],
+            "room_id": order.get("room_id"),
+            "amount": order.get("amount"),
+            "status": order.get("status"),
+            "assigned_employee_id": order.get("assigned_employee_id"),
+            "billing_status": order.get("billing_status"),
+            "payment_method": order.get("payment_method"),
+            "order_type": order.get("order_type"),
+            "delivery_request": order.get("delivery_request"),
+            "items": items_by_order.get(order["id"], []),
+            # Guest of the stay that covered the order date
+            "guest_name": guest_for(order["room_id"], order["created_at"]) if with_guest else None,
+            "employee_name": order.get("employee_name"),
+            "room_number": order.get("room_number"),
+        })
+    return trim_fields(rows, fields)
+
+def load_food_order_page(db: Session, skip: int, limit: int, fields=None):
+    """
+    Rows for food_order_rows_to_dicts: (orders, items, regular stays, package stays).
+    Items and stays are only queried when the fieldset includes them.
+    """
+    from app.utils.api_optimization import wants
+
+    orders = db.execute(food_order_page_statement(skip, limit, fields)).all()
+    items, regular_stays, package_stays = [], [], []
+    if not orders:
+        return orders, items, regular_stays, package_stays
+    if wants(fields, "items"):
+        items = db.execute(food_order_items_statement([o.id for o in orders])).all()
+    room_ids = {o.room_id for o in orders if o.room_id} if wants(fields, "guest_name") else ()
+    if room_ids:
+        regular_stmt, package_stmt = stay_statements(room_ids, [o.created_at for o in orders if o.room_id])
+        regular_stays = db.execute(regular_stmt).all()
+        package_stays = db.execute(package_stmt).all()
+    return orders, items, regular_stays, package_stays
+
+def get_food_orders(db: Session, skip: int = 0, limit: int = 100, fields=None):
+    """
+    A page of orders as FoodOrderOut-shaped dicts, newest first: four projected
+    queries at most (orders, items, regular and package stays) whatever the page size.
+    fields: validated sparse fieldset (None = every field).
+    """
     # Cap limit to prevent performance issues
     if limit > 200:
         limit = 200
     if limit < 1:
         limit = 20
     
-    # Eager load relationships so guest/employee names are available
     try:
-        orders = (
-            db.query(FoodOrder)
-            .options(
-                joinedload(FoodOrder.employee),  # Load employee for employee name
-                joinedload(FoodOrder.room),      # Load room for room number
-                joinedload(FoodOrder.items).joinedload(FoodOrderItem.food_item)  # Load items and food details
-            )
-            .order_by(FoodOrder.id.desc())
-            .offset(skip)
-            .limit(limit)
-            .all()
-        )
-        
-        # Populate computed fields
-        for order in orders:
-            # Set employee name
-            if order.employee:
-                order.employee_name = order.employee.name
-            else:
-                order.employee_name = None
-            
-            # Set room number
-            if order.room:
-                order.room_number = order.room.number
-            else:
-                order.room_number = None
-            
-            # Set guest name significantly improved logic:
-            # Search for booking that was active at the time the order was created
-            order.guest_name = get_guest_for_room(order.room_id, db, order.created_at)
-        
-        return orders
+        return food_order_rows_to_dicts(*load_food_order_page(db, skip, limit, fields), fields=fields)
     except Exception as e:
-        print(f"[ERROR] Error in get_food_orders: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.error("Error in get_food_orders: %s", e, exc_info=True)
         return []
 
+def get_food_orders_by_ids(db: Session, order_ids):
+    """Orders with the same computed fields as get_food_orders, for the given ids (delta sync)"""
+    from sqlalchemy.orm import joinedload
+
+    if not order_ids:
+        return []
+    orders = (
+        db.query(FoodOrder)
+        .options(
+            joinedload(FoodOrder.employee),
+            joinedload(FoodOrder.room),
+            joinedload(FoodOrder.items).joinedload(FoodOrderItem.food_item)
+        )
+        .filter(FoodOrder.id.in_(list(order_ids)))
+        .order_by(FoodOrder.id.desc())
+        .all()
+    )
+    for order in orders:
+        populate_order_fields(order, get_guest_for_room(order.room_id, db, order.created_at))
+    return orders
+
 def delete_food_order(db: Session, order_id: int):
     order = db.query(FoodOrder).filter(FoodOrder.id == order_id).first()
     if order:
@@ -188,7 +384,7 @@ def update_food_order_status(db: Session, order_id: int, status: str):
                 db.commit()
             except Exception as e:
                 db.rollback()
-                print(f"Failed to process inventory usage: {e}")
+                logger.error("Failed to process inventory usage: %s", e)
         
         # Notification system removed for performance
             
@@ -215,7 +411,7 @@ def update_food_order(db: Session, order_id: int, update_data: FoodOrderUpdate):
                 from app.curd.inventory import process_food_order_usage
                 process_food_order_usage(db, order.id)
             except Exception as e:
-                print(f"Failed to process inventory usage: {e}")
+                logger.error("Failed to process inventory usage: %s", e)
 
         # If completing a room service order, create a service request
         if update_data.status == "completed" and order.order_type == "room_service":
@@ -247,6 +443,7 @@ def update_food_order(db: Session, order_id: int, update_data: FoodOrderUpdate):
 
     if update_data.items is not None:
         db.query(FoodOrderItem).filter(FoodOrderItem.order_id == order.id).delete()
+        bulk_written(db, FoodOrderItem, DELETED)
         for item_data in update_data.items:
             item = FoodOrderItem(
                 order_id=order.id,
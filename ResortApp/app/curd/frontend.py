@@ -1,10 +1,15 @@
 from sqlalchemy.orm import Session
 import app.models as models
 import app.schemas as schemas
+from app.utils.images import attach_image_variants
 
 # Generic CRUD
 def get_all(db: Session, model, skip: int = 0, limit: int = 100):
-    return db.query(model).offset(skip).limit(limit).all()
+    items = db.query(model).offset(skip).limit(limit).all()
+    if hasattr(model, "image_url"):
+        # Resized variants (srcset) for models with an uploaded image
+        attach_image_variants(db, items)
+    return items
 
 def get_one(db: Session, model, item_id: int):
     return db.query(model).filter(model.id == item_id).first()
@@ -1,4 +1,4 @@
-﻿from sqlalchemy.orm import Session, joinedload, selectinload
+﻿from sqlalchemy.orm import Session, joinedload, load_only, selectinload
 from sqlalchemy import func
 from decimal import Decimal
 from datetime import datetime
@@ -12,6 +12,9 @@ from app.schemas.inventory import (
     InventoryCategoryCreate, InventoryCategoryUpdate, InventoryItemCreate, InventoryItemUpdate, VendorCreate, PurchaseMasterCreate, PurchaseMasterUpdate,
     StockRequisitionCreate, StockRequisitionUpdate, StockIssueCreate
 )
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 # Category CRUD
@@ -56,12 +59,32 @@ def create_item(db: Session, data: InventoryItemCreate):
     return item
 
 
-def get_all_items(db: Session, skip: int = 0, limit: int = 100, category_id: Optional[int] = None, active_only: bool = True):
-    """Optimized with eager loading to prevent N+1 queries"""
-    query = db.query(InventoryItem).options(
-        joinedload(InventoryItem.category),
-        joinedload(InventoryItem.preferred_vendor)
-    )
+# InventoryItemOut fields that are not InventoryItem columns -> the columns they are computed from
+INVENTORY_ITEM_FIELD_COLUMNS = {
+    "category_name": ("category_id",),
+    "department": ("category_id",),
+    "is_low_stock": ("current_stock", "min_stock_level"),
+    "last_purchase_price": (),
+}
+
+
+def get_all_items(db: Session, skip: int = 0, limit: int = 100, category_id: Optional[int] = None, active_only: bool = True,
+                  fields: Optional[List[str]] = None):
+    """
+    Optimized with eager loading to prevent N+1 queries.
+    fields: sparse fieldset (InventoryItemOut names); only the columns it needs are
+    loaded and the category is joined only for category_name / department.
+    """
+    if fields is None:
+        options = [joinedload(InventoryItem.category), joinedload(InventoryItem.preferred_vendor)]
+    else:
+        columns = {"id"}
+        for name in fields:
+            columns.update(INVENTORY_ITEM_FIELD_COLUMNS.get(name, (name,)))
+        options = [load_only(*(getattr(InventoryItem, column) for column in columns))]
+        if "category_name" in fields or "department" in fields:
+            options.append(joinedload(InventoryItem.category))
+    query = db.query(InventoryItem).options(*options)
     if category_id:
         query = query.filter(InventoryItem.category_id == category_id)
     if active_only:
@@ -552,13 +575,16 @@ def update_requisition_status(db: Session, requisition_id: int, status: str, app
 
 # Stock Issue CRUD
 def generate_issue_number(db: Session):
-    from datetime import datetime
-    today = datetime.utcnow()
-    date_str = today.strftime("%Y%m%d")
-    count = db.query(StockIssue).filter(
+    return generate_issue_numbers(db, 1)[0]  # e.g., ISS-20250101-005
+
+
+def generate_issue_numbers(db: Session, count: int) -> List[str]:
+    """`count` consecutive issue numbers with a single count query (for batch writers)"""
+    date_str = datetime.utcnow().strftime("%Y%m%d")
+    start = db.query(StockIssue).filter(
         StockIssue.issue_number.like(f"ISS-{date_str}-%")
     ).count() + 1
-    return f"ISS-{date_str}-{str(count).zfill(3)}"  # e.g., ISS-505
+    return [f"ISS-{date_str}-{str(start + i).zfill(3)}" for i in range(count)]
 
 
 def create_stock_issue(db: Session, data: dict, issued_by: int):
@@ -615,7 +641,7 @@ def create_stock_issue(db: Session, data: dict, issued_by: int):
                 # Use the location with most stock
                 source_loc_id = available_locations[0].location_id
                 source_loc_name = available_locations[0].location.name if available_locations[0].location else f"Location {source_loc_id}"
-                print(f"[AUTO-DETECT] Item {item.name}: Using {source_loc_name} (ID: {source_loc_id}) as source (has {available_locations[0].quantity} units)")
+                logger.debug("[AUTO-DETECT] Item %s: Using %s (ID: %s) as source (has %s units)", item.name, source_loc_name, source_loc_id, available_locations[0].quantity)
                 # Update the issue record's source if this is the first item
                 if not issue.source_location_id:
                     issue.source_location_id = source_loc_id
@@ -643,7 +669,7 @@ def create_stock_issue(db: Session, data: dict, issued_by: int):
              # Fallback: If location stock is insufficient BUT global stock is sufficient,
              # we DO NOT allow it anymore to prevent negative stock at location level.
              if available_qty < issued_qty:
-                 print(f"[WARNING] Insufficient stock at source location for {item.name}. Available: {available_qty}, Requested: {issued_qty}. Proceeding anyway.")
+                 logger.warning("Insufficient stock at source location for %s. Available: %s, Requested: %s. Proceeding anyway.", item.name, available_qty, issued_qty)
                  # raise HTTPException(status_code=400, detail=f"Insufficient stock at source location for {item.name}. Available: {available_qty}, Requested: {issued_qty}")
         else:
              # Fallback to global stock check if no source specified
@@ -663,7 +689,7 @@ def create_stock_issue(db: Session, data: dict, issued_by: int):
         
         # Use is_payable from request if provided (frontend sends this), otherwise default to False
         is_payable = detail_data.get("is_payable", False)
-        print(f"[DEBUG] Item {item.name}: is_payable from request = {is_payable}, detail_data = {detail_data}")
+        logger.debug("Item %s: is_payable from request = %s, detail_data = %s", item.name, is_payable, detail_data)
         
         # Create issue detail
         detail = StockIssueDetail(
@@ -691,11 +717,11 @@ def create_stock_issue(db: Session, data: dict, issued_by: int):
         # If there's a destination, it's a transfer - stock still exists, just moved locations
         if not dest_location_id:
             # Actual consumption - deduct from global stock
-            print(f"[STOCK] Consumption: Deducting {issued_qty} of {item.name} from global stock")
+            logger.debug("[STOCK] Consumption: Deducting %s of %s from global stock", issued_qty, item.name)
             item.current_stock -= issued_qty
         else:
             # Transfer between locations - global stock unchanged (just location stocks change)
-            print(f"[STOCK] Transfer: Moving {issued_qty} of {item.name} between locations (global stock unchanged)")
+            logger.debug("[STOCK] Transfer: Moving %s of %s between locations (global stock unchanged)", issued_qty, item.name)
         
         dest_location_name = ""
         if dest_location:
@@ -756,7 +782,7 @@ def create_stock_issue(db: Session, data: dict, issued_by: int):
                     created_by=issued_by
                 )
             except Exception as e:
-                print(f"[WARNING] Could not create consumption journal entry: {e}")
+                logger.warning("Could not create consumption journal entry: %s", e)
         
         # Update requisition status if linked
         if data.get("requisition_id"):
@@ -798,13 +824,16 @@ def get_issue_by_id(db: Session, issue_id: int):
 
 # Waste Log CRUD
 def generate_waste_log_number(db: Session):
-    from datetime import datetime
-    today = datetime.utcnow()
-    date_str = today.strftime("%Y%m%d")
-    count = db.query(WasteLog).filter(
+    return generate_waste_log_numbers(db, 1)[0]
+
+
+def generate_waste_log_numbers(db: Session, count: int) -> List[str]:
+    """`count` consecutive waste log numbers with a single count query (for batch writers)"""
+    date_str = datetime.utcnow().strftime("%Y%m%d")
+    start = db.query(WasteLog).filter(
         WasteLog.log_number.like(f"WASTE-{date_str}-%")
     ).count() + 1
-    return f"WASTE-{date_str}-{str(count).zfill(3)}"
+    return [f"WASTE-{date_str}-{str(start + i).zfill(3)}" for i in range(count)]
 
 
 def create_waste_log(db: Session, data: dict, reported_by: int):
@@ -939,7 +968,7 @@ def create_waste_log(db: Session, data: dict, reported_by: int):
                     reference_type="waste"
                 )
             except Exception as e:
-                print(f"Failed to create accounting entry for waste: {e}")
+                logger.error("Failed to create accounting entry for waste: %s", e)
         
         db.add(transaction)
     
@@ -1313,7 +1342,7 @@ def unassign_asset(db: Session, mapping_id: int, destination_location_id: int =
                 )
                 db.add(wh_stock)
         else:
-             print("Warning: No warehouse found to return unassigned asset stock to.")
+             logger.warning("No warehouse found to return unassigned asset stock to.")
 
         # Note: Global stock (item.current_stock) should NOT change because the item 
         # is just moving from Room -> Warehouse. It is still owned.
@@ -5,6 +5,10 @@ from typing import List
 from app.models.Package import Package, PackageImage, PackageBooking, PackageBookingRoom
 from app.models.room import Room
 from app.schemas.packages import PackageBookingCreate
+from app.utils.booking_status import ACTIVE_BOOKING_STATUSES
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 # ------------------- Packages -------------------
@@ -37,9 +41,8 @@ def create_package(db: Session, title: str, description: str, price: float, imag
         return pkg
     except Exception as e:
         db.rollback()
-        import traceback
-        error_detail = f"Database error in create_package: {str(e)}\n{traceback.format_exc()}"
-        print(f"ERROR: {error_detail}")
+        error_detail = f"Database error in create_package: {str(e)}"
+        logger.error("%s", error_detail, exc_info=True)
         import sys
         sys.stderr.write(f"ERROR in create_package: {error_detail}\n")
         raise HTTPException(status_code=500, detail=f"Failed to create package: {str(e)}")
@@ -183,7 +186,7 @@ def book_package(db: Session, booking: PackageBookingCreate):
             )
         except Exception as e:
             # Log error but don't fail the booking if user creation fails
-            print(f"Warning: Could not create/link guest user: {str(e)}")
+            logger.warning("Could not create/link guest user: %s", e)
     
     # Check for an existing package booking to reuse guest details for consistency
     # Only check if we have at least email or mobile
@@ -234,7 +237,7 @@ def book_package(db: Session, booking: PackageBookingCreate):
             .join(PackageBooking)
             .filter(
                 PackageBookingRoom.room_id == room_id,
-                PackageBooking.status.in_(["booked", "checked-in", "checked_in"]),  # Only check for active bookings
+                PackageBooking.status.in_(ACTIVE_BOOKING_STATUSES),  # Only check for active bookings
                 PackageBooking.check_in < booking.check_out,
                 PackageBooking.check_out > booking.check_in
             )
@@ -248,7 +251,7 @@ def book_package(db: Session, booking: PackageBookingCreate):
             .join(Booking)
             .filter(
                 BookingRoom.room_id == room_id,
-                Booking.status.in_(["booked", "checked-in", "checked_in"]),  # Only check for active bookings
+                Booking.status.in_(ACTIVE_BOOKING_STATUSES),  # Only check for active bookings
                 Booking.check_in < booking.check_out,
                 Booking.check_out > booking.check_in
             )
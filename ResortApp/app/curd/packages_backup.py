@@ -5,6 +5,9 @@ from typing import List
 from app.models.Package import Package, PackageImage, PackageBooking, PackageBookingRoom
 from app.models.room import Room
 from app.schemas.packages import PackageBookingCreate
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 # ------------------- Packages -------------------
@@ -30,9 +33,8 @@ def create_package(db: Session, title: str, description: str, price: float, imag
         return pkg
     except Exception as e:
         db.rollback()
-        import traceback
-        error_detail = f"Database error in create_package: {str(e)}\n{traceback.format_exc()}"
-        print(f"ERROR: {error_detail}")
+        error_detail = f"Database error in create_package: {str(e)}"
+        logger.error("%s", error_detail, exc_info=True)
         import sys
         sys.stderr.write(f"ERROR in create_package: {error_detail}\n")
         raise HTTPException(status_code=500, detail=f"Failed to create package: {str(e)}")
@@ -176,7 +178,7 @@ def book_package(db: Session, booking: PackageBookingCreate):
             )
         except Exception as e:
             # Log error but don't fail the booking if user creation fails
-            print(f"Warning: Could not create/link guest user: {str(e)}")
+            logger.warning("Could not create/link guest user: %s", e)
     
     # Check for an existing package booking to reuse guest details for consistency
     # Only check if we have at least email or mobile
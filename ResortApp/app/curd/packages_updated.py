@@ -5,6 +5,9 @@ from typing import List
 from app.models.Package import Package, PackageImage, PackageBooking, PackageBookingRoom
 from app.models.room import Room
 from app.schemas.packages import PackageBookingCreate
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 # ------------------- Packages -------------------
@@ -35,9 +38,8 @@ def create_package(db: Session, title: str, description: str, price: float, imag
         return pkg
     except Exception as e:
         db.rollback()
-        import traceback
-        error_detail = f"Database error in create_package: {str(e)}\n{traceback.format_exc()}"
-        print(f"ERROR: {error_detail}")
+        error_detail = f"Database error in create_package: {str(e)}"
+        logger.error("%s", error_detail, exc_info=True)
         import sys
         sys.stderr.write(f"ERROR in create_package: {error_detail}\n")
         raise HTTPException(status_code=500, detail=f"Failed to create package: {str(e)}")
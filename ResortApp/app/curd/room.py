@@ -11,6 +11,8 @@ from app.models.service import AssignedService, Service
 from app.models.Package import PackageBooking, Package, PackageBookingRoom
 from app.models.checkout import Checkout
 from app.schemas.checkout import BillSummary, BillBreakdown, CheckoutSuccess, CheckoutRequest
+from app.utils.booking_status import ACTIVE_BOOKING_STATUSES, CHECKED_OUT
+from app.utils.bulk_writes import bulk_written
 router = APIRouter(prefix="/bill", tags=["checkout"])
 
 def get_all_rooms(db: Session, skip: int = 0, limit: int = 100):
@@ -29,7 +31,7 @@ def get_all_rooms(db: Session, skip: int = 0, limit: int = 100):
                 .join(BookingRoom, BookingRoom.booking_id == Booking.id)
                 .filter(
                     BookingRoom.room_id == room.id,
-                    Booking.status.in_(["booked", "checked-in"]),
+                    Booking.status.in_(ACTIVE_BOOKING_STATUSES),
                     Booking.check_in <= today,
                     Booking.check_out > today,
                 )
@@ -42,7 +44,7 @@ def get_all_rooms(db: Session, skip: int = 0, limit: int = 100):
                 .join(PackageBookingRoom, PackageBookingRoom.package_booking_id == PackageBooking.id)
                 .filter(
                     PackageBookingRoom.room_id == room.id,
-                    PackageBooking.status.in_(["booked", "checked-in"]),
+                    PackageBooking.status.in_(ACTIVE_BOOKING_STATUSES),
                     PackageBooking.check_in <= today,
                     PackageBooking.check_out > today,
                 )
@@ -79,12 +81,12 @@ def calculate_bill_for_room(db: Session, room_number: str):
     # Find the active booking for the given room
     booking_room = db.query(BookingRoom).filter(
         BookingRoom.room_id == room.id,
-        Booking.status != 'checked_out'
+        Booking.status != CHECKED_OUT
     ).join(Booking).first()
     
     package_booking_room = db.query(PackageBookingRoom).filter(
         PackageBookingRoom.room_id == room.id,
-        PackageBooking.status != 'checked_out'
+        PackageBooking.status != CHECKED_OUT
     ).join(PackageBooking).first()
 
     booking = None
@@ -97,7 +99,7 @@ def calculate_bill_for_room(db: Session, room_number: str):
         raise HTTPException(status_code=404, detail="No active booking found for this room.")
     
     # Check if the booking has already been checked out
-    if booking.status == "checked_out":
+    if booking.status == CHECKED_OUT:
         raise HTTPException(status_code=400, detail="Booking for this room is already checked out.")
 
     charges = BillBreakdown()
@@ -186,10 +188,12 @@ def checkout(room_number: str, request: CheckoutRequest, db: Session = Depends(g
         
         # Update billing status for all related services
         db.query(FoodOrder).filter(FoodOrder.room_id == room.id, FoodOrder.billing_status == "unbilled").update({"billing_status": "billed"})
+        bulk_written(db, FoodOrder)
         db.query(AssignedService).filter(AssignedService.room_id == room.id, AssignedService.billing_status == "unbilled").update({"billing_status": "billed"})
+        bulk_written(db, AssignedService)
 
         # Update booking and room status
-        booking.status = "checked_out"
+        booking.status = CHECKED_OUT
         room.status = "Available"
 
         db.commit()
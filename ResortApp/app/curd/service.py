@@ -10,6 +10,9 @@ from app.models.Package import PackageBooking, PackageBookingRoom
 from app.models.employee import Employee
 from app.models.room import Room
 from app.schemas.service import ServiceCreate, AssignedServiceCreate, AssignedServiceUpdate, ServiceInventoryItemBase
+import logging
+
+logger = logging.getLogger(__name__)
 
 def create_service(
     db: Session,
@@ -26,7 +29,6 @@ def create_service(
     Gracefully handles missing permissions on the service_inventory_items table
     by creating the service and skipping the association instead of failing.
     """
-    import traceback
 
     try:
         # 1. Create the service record
@@ -43,8 +45,7 @@ def create_service(
     except Exception as create_error:
         db.rollback()
         error_msg = f"Failed to create service: {str(create_error)}"
-        print(f"[ERROR create_service CRUD] {error_msg}")
-        print(traceback.format_exc())
+        logger.error("create_service CRUD: %s", error_msg, exc_info=True)
         raise ValueError(error_msg) from create_error
 
     # 2. Attach images (if any)
@@ -58,8 +59,7 @@ def create_service(
         except Exception as img_error:
             db.rollback()
             error_msg = f"Failed to add service images: {str(img_error)}"
-            print(f"[ERROR create_service CRUD] {error_msg}")
-            print(traceback.format_exc())
+            logger.error("create_service CRUD: %s", error_msg, exc_info=True)
             raise ValueError(error_msg) from img_error
 
     # 3. Link inventory items (best-effort; skip if insufficient privileges)
@@ -68,18 +68,16 @@ def create_service(
         permission_error = False
         inserted_count = 0
         try:
-            print(f"[DEBUG create_service] Attempting to link {len(inventory_items)} inventory items to service {db_service.id}")
+            logger.debug("create_service: Attempting to link %s inventory items to service %s", len(inventory_items), db_service.id)
             for item_data in inventory_items:
-                print(f"[DEBUG create_service] Processing inventory item: id={item_data.inventory_item_id}, quantity={item_data.quantity}")
+                logger.debug("create_service: Processing inventory item: id=%s, quantity=%s", item_data.inventory_item_id, item_data.quantity)
                 inventory_item = (
                     db.query(InventoryItem)
                     .filter(InventoryItem.id == item_data.inventory_item_id)
                     .first()
                 )
                 if not inventory_item:
-                    print(
-                        f"[WARNING] Inventory item {item_data.inventory_item_id} not found, skipping"
-                    )
+                    logger.warning("Inventory item %s not found, skipping", item_data.inventory_item_id)
                     continue
 
                 stmt = service_inventory_item.insert().values(
@@ -90,10 +88,10 @@ def create_service(
                 )
                 result = db.execute(stmt)
                 inserted_count += 1
-                print(f"[DEBUG create_service] Successfully inserted inventory link: service_id={db_service.id}, item_id={item_data.inventory_item_id}, quantity={item_data.quantity}")
+                logger.debug("create_service: Successfully inserted inventory link: service_id=%s, item_id=%s, quantity=%s", db_service.id, item_data.inventory_item_id, item_data.quantity)
 
             db.commit()
-            print(f"[DEBUG create_service] Successfully committed {inserted_count} inventory item links for service {db_service.id}")
+            logger.debug("create_service: Successfully committed %s inventory item links for service %s", inserted_count, db_service.id)
             
             # Verify the data was actually saved
             try:
@@ -102,28 +100,22 @@ def create_service(
                     service_inventory_item.c.quantity
                 ).where(service_inventory_item.c.service_id == db_service.id)
                 verify_rows = db.execute(verify_stmt).fetchall()
-                print(f"[DEBUG create_service] Verification: Found {len(verify_rows)} inventory item links in database for service {db_service.id}")
+                logger.debug("create_service: Verification: Found %s inventory item links in database for service %s", len(verify_rows), db_service.id)
                 for row in verify_rows:
                     item_id = row[0] if isinstance(row, tuple) else getattr(row, 'inventory_item_id', row[0])
                     qty = row[1] if isinstance(row, tuple) else getattr(row, 'quantity', row[1])
-                    print(f"[DEBUG create_service]   - Item ID: {item_id}, Quantity: {qty}")
+                    logger.debug("create_service: - Item ID: %s, Quantity: %s", item_id, qty)
             except Exception as verify_error:
-                print(f"[WARNING] Could not verify saved inventory items: {verify_error}")
+                logger.warning("Could not verify saved inventory items: %s", verify_error)
         except ProgrammingError as perm_error:
             permission_error = True
             inventory_insert_failed = True
             db.rollback()
-            print(
-                f"[ERROR] Insufficient privilege linking inventory items for service {db_service.id}: {perm_error}"
-            )
-            print(traceback.format_exc())
+            logger.error("Insufficient privilege linking inventory items for service %s: %s", db_service.id, perm_error, exc_info=True)
         except SQLAlchemyError as link_error:
             inventory_insert_failed = True
             db.rollback()
-            print(
-                f"[ERROR] Failed to link inventory items for service {db_service.id}: {link_error}"
-            )
-            print(traceback.format_exc())
+            logger.error("Failed to link inventory items for service %s: %s", db_service.id, link_error, exc_info=True)
 
         if inventory_insert_failed:
             msg = (
@@ -132,9 +124,9 @@ def create_service(
                 if permission_error
                 else "Some inventory items failed to link due to a database error."
             )
-            print(f"[WARNING] {msg} Service ID: {db_service.id}")
+            logger.warning("%s Service ID: %s", msg, db_service.id)
         else:
-            print(f"[SUCCESS] All {inserted_count} inventory items successfully linked to service {db_service.id}")
+            logger.debug("[SUCCESS] All %s inventory items successfully linked to service %s", inserted_count, db_service.id)
 
     # 4. Return the service with related images
     try:
@@ -146,10 +138,7 @@ def create_service(
         )
         return service or db_service
     except Exception as load_error:
-        print(
-            f"[WARNING] Failed to load service relationships for service {db_service.id}: {load_error}"
-        )
-        print(traceback.format_exc())
+        logger.warning("Failed to load service relationships for service %s: %s", db_service.id, load_error, exc_info=True)
         return db_service
 
 def update_service(
@@ -169,7 +158,6 @@ def update_service(
     and updating inventory assignments (best-effort if DB permissions allow).
     Returns tuple of (service, removed_image_paths).
     """
-    import traceback
 
     service = db.query(Service).options(joinedload(Service.images)).filter(Service.id == service_id).first()
     if not service:
@@ -207,15 +195,14 @@ def update_service(
     except Exception as update_error:
         db.rollback()
         error_msg = f"Failed to update service {service_id}: {str(update_error)}"
-        print(f"[ERROR update_service CRUD] {error_msg}")
-        print(traceback.format_exc())
+        logger.error("update_service CRUD: %s", error_msg, exc_info=True)
         raise ValueError(error_msg) from update_error
 
     # Handle inventory updates (best-effort)
     if inventory_items is not None:
         permission_error = False
         try:
-            print(f"[DEBUG update_service] Updating inventory items for service {service_id}")
+            logger.debug("update_service: Updating inventory items for service %s", service_id)
             # First, check what's currently in the database
             try:
                 before_stmt = select(
@@ -223,27 +210,27 @@ def update_service(
                     service_inventory_item.c.quantity
                 ).where(service_inventory_item.c.service_id == service_id)
                 before_rows = db.execute(before_stmt).fetchall()
-                print(f"[DEBUG update_service] Current inventory items in DB: {len(before_rows)}")
+                logger.debug("update_service: Current inventory items in DB: %s", len(before_rows))
             except Exception as check_error:
-                print(f"[WARNING] Could not check existing inventory items: {check_error}")
+                logger.warning("Could not check existing inventory items: %s", check_error)
             
             delete_stmt = service_inventory_item.delete().where(service_inventory_item.c.service_id == service_id)
             delete_result = db.execute(delete_stmt)
             deleted_count = delete_result.rowcount if hasattr(delete_result, 'rowcount') else 0
             db.commit()
-            print(f"[DEBUG update_service] Deleted {deleted_count} existing inventory item links")
+            logger.debug("update_service: Deleted %s existing inventory item links", deleted_count)
 
             if inventory_items:
                 inserted_count = 0
                 for item_data in inventory_items:
-                    print(f"[DEBUG update_service] Processing inventory item: id={item_data.inventory_item_id}, quantity={item_data.quantity}")
+                    logger.debug("update_service: Processing inventory item: id=%s, quantity=%s", item_data.inventory_item_id, item_data.quantity)
                     inventory_item = (
                         db.query(InventoryItem)
                         .filter(InventoryItem.id == item_data.inventory_item_id)
                         .first()
                     )
                     if not inventory_item:
-                        print(f"[WARNING] Inventory item {item_data.inventory_item_id} not found, skipping")
+                        logger.warning("Inventory item %s not found, skipping", item_data.inventory_item_id)
                         continue
 
                     insert_stmt = service_inventory_item.insert().values(
@@ -254,9 +241,9 @@ def update_service(
                     )
                     db.execute(insert_stmt)
                     inserted_count += 1
-                    print(f"[DEBUG update_service] Successfully inserted inventory link: service_id={service_id}, item_id={item_data.inventory_item_id}, quantity={item_data.quantity}")
+                    logger.debug("update_service: Successfully inserted inventory link: service_id=%s, item_id=%s, quantity=%s", service_id, item_data.inventory_item_id, item_data.quantity)
                 db.commit()
-                print(f"[DEBUG update_service] Successfully committed {inserted_count} inventory item links for service {service_id}")
+                logger.debug("update_service: Successfully committed %s inventory item links for service %s", inserted_count, service_id)
                 
                 # Verify the data was actually saved
                 try:
@@ -265,31 +252,25 @@ def update_service(
                         service_inventory_item.c.quantity
                     ).where(service_inventory_item.c.service_id == service_id)
                     verify_rows = db.execute(verify_stmt).fetchall()
-                    print(f"[DEBUG update_service] Verification: Found {len(verify_rows)} inventory item links in database for service {service_id}")
+                    logger.debug("update_service: Verification: Found %s inventory item links in database for service %s", len(verify_rows), service_id)
                     for row in verify_rows:
                         item_id = row[0] if isinstance(row, tuple) else getattr(row, 'inventory_item_id', row[0])
                         qty = row[1] if isinstance(row, tuple) else getattr(row, 'quantity', row[1])
-                        print(f"[DEBUG update_service]   - Item ID: {item_id}, Quantity: {qty}")
+                        logger.debug("update_service: - Item ID: %s, Quantity: %s", item_id, qty)
                 except Exception as verify_error:
-                    print(f"[WARNING] Could not verify saved inventory items: {verify_error}")
+                    logger.warning("Could not verify saved inventory items: %s", verify_error)
             else:
-                print(f"[DEBUG update_service] No inventory items to insert (empty list)")
+                logger.debug("update_service: No inventory items to insert (empty list)")
         except ProgrammingError as perm_error:
             permission_error = True
             db.rollback()
-            print(
-                f"[WARNING] Insufficient privilege updating inventory items for service {service_id}: {perm_error}"
-            )
-            print(traceback.format_exc())
+            logger.warning("Insufficient privilege updating inventory items for service %s: %s", service_id, perm_error, exc_info=True)
         except SQLAlchemyError as link_error:
             db.rollback()
-            print(f"[WARNING] Failed to update inventory items for service {service_id}: {link_error}")
-            print(traceback.format_exc())
+            logger.warning("Failed to update inventory items for service %s: %s", service_id, link_error, exc_info=True)
 
         if permission_error:
-            print(
-                f"[WARNING] Inventory items might be outdated for service {service_id} due to missing DB permissions"
-            )
+            logger.warning("Inventory items might be outdated for service %s due to missing DB permissions", service_id)
 
         try:
             db.refresh(service)
@@ -309,7 +290,6 @@ def get_services(db: Session, skip: int = 0, limit: int = 100):
     ).offset(skip).limit(limit).all()
 
 def delete_service(db: Session, service_id: int):
-    import traceback
 
     service = (
         db.query(Service)
@@ -335,8 +315,8 @@ def delete_service(db: Session, service_id: int):
             "Cannot delete service because it is still referenced by assigned services "
             "or other records. Please unassign or remove related records first."
         )
-        print(f"[WARNING delete_service CRUD] {message} Service ID: {service_id}")
-        print(fk_error)
+        logger.warning("delete_service CRUD: %s Service ID: %s", message, service_id)
+        logger.error("%s", fk_error)
         raise ValueError(message) from fk_error
     except ProgrammingError as perm_error:
         db.rollback()
@@ -344,12 +324,11 @@ def delete_service(db: Session, service_id: int):
             "Cannot delete service because the database user lacks permission "
             "to modify the service inventory mapping table. Please contact your administrator."
         )
-        print(f"[WARNING delete_service CRUD] Permission issue deleting service {service_id}: {perm_error}")
+        logger.warning("delete_service CRUD: Permission issue deleting service %s: %s", service_id, perm_error)
         raise ValueError(message) from perm_error
     except Exception as delete_error:
         db.rollback()
-        print(f"[ERROR delete_service CRUD] Failed to delete service {service_id}: {delete_error}")
-        print(traceback.format_exc())
+        logger.error("delete_service CRUD: Failed to delete service %s: %s", service_id, delete_error, exc_info=True)
         raise RuntimeError(f"Failed to delete service: {delete_error}") from delete_error
 
 def create_assigned_service(db: Session, assigned: AssignedServiceCreate):
@@ -360,7 +339,7 @@ def create_assigned_service(db: Session, assigned: AssignedServiceCreate):
         else:
             assigned_dict = assigned.dict()
         
-        print(f"[DEBUG] Creating assigned service with data: {assigned_dict}")
+        logger.debug("Creating assigned service with data: %s", assigned_dict)
         
         # Verify that required IDs exist
         service = db.query(Service).filter(Service.id == assigned_dict['service_id']).first()
@@ -375,7 +354,7 @@ def create_assigned_service(db: Session, assigned: AssignedServiceCreate):
         if not room:
             raise ValueError(f"Room with ID {assigned_dict['room_id']} not found")
         
-        print(f"[DEBUG] All references valid: Service={service.name}, Employee={employee.name}, Room={room.number}")
+        logger.debug("All references valid: Service=%s, Employee=%s, Room=%s", service.name, employee.name, room.number)
         
         # Load service inventory items if service has any
         service_inventory_items = []
@@ -384,12 +363,10 @@ def create_assigned_service(db: Session, assigned: AssignedServiceCreate):
         try:
             stmt = select(service_inventory_item).where(service_inventory_item.c.service_id == service.id)
             associations = db.execute(stmt).fetchall()
-            print(f"[DEBUG] Found {len(associations)} inventory item associations for service {service.id}")
+            logger.debug("Found %s inventory item associations for service %s", len(associations), service.id)
         except Exception as assoc_err:
             db.rollback()
-            print(f"[WARNING] Unable to read service inventory items for service {service.id}: {str(assoc_err)}")
-            import traceback
-            print(traceback.format_exc())
+            logger.warning("Unable to read service inventory items for service %s: %s", service.id, assoc_err, exc_info=True)
             associations = []
         
         for assoc in associations:
@@ -402,16 +379,16 @@ def create_assigned_service(db: Session, assigned: AssignedServiceCreate):
                     'quantity': assoc.quantity,
                     'unit': inv_item.unit
                 })
-                print(f"[DEBUG] Added inventory item: {inv_item.name} (ID: {inv_item.id}), Quantity: {assoc.quantity}")
+                logger.debug("Added inventory item: %s (ID: %s), Quantity: %s", inv_item.name, inv_item.id, assoc.quantity)
             else:
-                print(f"[WARNING] Inventory item ID {assoc.inventory_item_id} not found in database")
+                logger.warning("Inventory item ID %s not found in database", assoc.inventory_item_id)
         
-        print(f"[DEBUG] Service has {len(service_inventory_items)} inventory items from template")
+        logger.debug("Service has %s inventory items from template", len(service_inventory_items))
         
         # Add extra inventory items if provided
         extra_items = assigned_dict.get('extra_inventory_items', [])
         if extra_items:
-            print(f"[DEBUG] Processing {len(extra_items)} extra inventory items")
+            logger.debug("Processing %s extra inventory items", len(extra_items))
             for extra_item in extra_items:
                 inv_item = db.query(InventoryItem).filter(InventoryItem.id == extra_item['inventory_item_id']).first()
                 if inv_item:
@@ -421,11 +398,11 @@ def create_assigned_service(db: Session, assigned: AssignedServiceCreate):
                         'quantity': extra_item['quantity'],
                         'unit': inv_item.unit
                     })
-                    print(f"[DEBUG] Added EXTRA inventory item: {inv_item.name} (ID: {inv_item.id}), Quantity: {extra_item['quantity']}")
+                    logger.debug("Added EXTRA inventory item: %s (ID: %s), Quantity: %s", inv_item.name, inv_item.id, extra_item['quantity'])
                 else:
-                    print(f"[WARNING] Extra inventory item ID {extra_item['inventory_item_id']} not found in database")
+                    logger.warning("Extra inventory item ID %s not found in database", extra_item['inventory_item_id'])
         
-        print(f"[DEBUG] Total inventory items to assign (template + extra): {len(service_inventory_items)}")
+        logger.debug("Total inventory items to assign (template + extra): %s", len(service_inventory_items))
         
         # Create AssignedService instance (status will use default from model)
         try:
@@ -436,10 +413,10 @@ def create_assigned_service(db: Session, assigned: AssignedServiceCreate):
                 override_charges=assigned_dict.get('override_charges'),
                 billing_status=assigned_dict.get('billing_status', 'unbilled')  # Explicitly set billing status
             )
-            print(f"[DEBUG] AssignedService object created, status={db_assigned.status}, billing_status={db_assigned.billing_status}")
+            logger.debug("AssignedService object created, status=%s, billing_status=%s", db_assigned.status, db_assigned.billing_status)
             db.add(db_assigned)
             db.flush()  # Flush to get the ID without committing
-            print(f"[DEBUG] AssignedService flushed, ID={db_assigned.id}")
+            logger.debug("AssignedService flushed, ID=%s", db_assigned.id)
             
             # Deduct inventory items if service requires them
             if service_inventory_items:
@@ -453,7 +430,7 @@ def create_assigned_service(db: Session, assigned: AssignedServiceCreate):
                         lid = sel['location_id']
                         source_map[iid] = lid
                 
-                print(f"[DEBUG] Inventory Source Map: {source_map}")
+                logger.debug("Inventory Source Map: %s", source_map)
 
                 # Default fallback location (Central Warehouse)
                 default_location = db.query(Location).filter(
@@ -473,7 +450,7 @@ def create_assigned_service(db: Session, assigned: AssignedServiceCreate):
                     from app.models.employee_inventory import EmployeeInventoryAssignment
                     has_emp_inv_model = True
                 except ImportError:
-                    print("[WARNING] EmployeeInventoryAssignment model not found, skipping inventory assignment tracking")
+                    logger.warning("EmployeeInventoryAssignment model not found, skipping inventory assignment tracking")
                     EmployeeInventoryAssignment = None
                     has_emp_inv_model = False
 
@@ -483,7 +460,7 @@ def create_assigned_service(db: Session, assigned: AssignedServiceCreate):
                     
                     item = db.query(InventoryItem).filter(InventoryItem.id == item_id).first()
                     if not item:
-                        print(f"[WARNING] Inventory item {item_id} not found, skipping")
+                        logger.warning("Inventory item %s not found, skipping", item_id)
                         continue
                     
                     # Determine Source Location
@@ -495,7 +472,7 @@ def create_assigned_service(db: Session, assigned: AssignedServiceCreate):
                     
                     if not source_location and default_location:
                         source_location = default_location
-                        print(f"[DEBUG] Using default location {source_location.name} for item {item.name}")
+                        logger.debug("Using default location %s for item %s", source_location.name, item.name)
                     
                     if source_location:
                         # 1. Deduct from LocationStock
@@ -506,11 +483,11 @@ def create_assigned_service(db: Session, assigned: AssignedServiceCreate):
                         
                         if loc_stock:
                             if loc_stock.quantity < quantity:
-                                print(f"[WARNING] Insufficient stock at {source_location.name} for {item.name}. Available: {loc_stock.quantity}, Required: {quantity}. Proceeding anyway (negative stock).")
+                                logger.warning("Insufficient stock at %s for %s. Available: %s, Required: %s. Proceeding anyway (negative stock).", source_location.name, item.name, loc_stock.quantity, quantity)
                             loc_stock.quantity -= quantity
                             loc_stock.last_updated = datetime.utcnow()
                         else:
-                            print(f"[WARNING] No stock record at {source_location.name} for {item.name}. Creating negative entry.")
+                            logger.warning("No stock record at %s for %s. Creating negative entry.", source_location.name, item.name)
                             new_stock = LocationStock(
                                 location_id=source_location.id,
                                 item_id=item_id,
@@ -519,13 +496,13 @@ def create_assigned_service(db: Session, assigned: AssignedServiceCreate):
                             )
                             db.add(new_stock)
                     else:
-                        print(f"[WARNING] No source location determined for {item.name}. Skipping LocationStock update.")
+                        logger.warning("No source location determined for %s. Skipping LocationStock update.", item.name)
 
                     # 2. Deduct from Global Stock
                     if item.current_stock < quantity:
-                         print(f"[WARNING] Insufficient global stock for {item.name}. Available: {item.current_stock}, Required: {quantity}")
+                         logger.warning("Insufficient global stock for %s. Available: %s, Required: %s", item.name, item.current_stock, quantity)
                     item.current_stock -= quantity
-                    print(f"[DEBUG] Deducted {quantity} {inv_data['unit']} of {item.name}. New global stock: {item.current_stock}")
+                    logger.debug("Deducted %s %s of %s. New global stock: %s", quantity, inv_data['unit'], item.name, item.current_stock)
                     
                     # 3. Create Inventory Transaction
                     transaction = InventoryTransaction(
@@ -572,7 +549,7 @@ def create_assigned_service(db: Session, assigned: AssignedServiceCreate):
                                 created_by=None
                             )
                     except Exception as je_error:
-                         print(f"[WARNING] Failed to create COGS journal entry: {je_error}")
+                         logger.warning("Failed to create COGS journal entry: %s", je_error)
 
                     # 5. Create Employee Inventory Assignment
                     if has_emp_inv_model and EmployeeInventoryAssignment:
@@ -592,21 +569,19 @@ def create_assigned_service(db: Session, assigned: AssignedServiceCreate):
                         db.add(emp_inv_assignment)
 
             else:
-                print(f"[DEBUG] Service has no inventory items, skipping stock deduction")
+                logger.debug("Service has no inventory items, skipping stock deduction")
 
-            print(f"[DEBUG] Committing transaction")
+            logger.debug("Committing transaction")
             db.commit()
-            print(f"[DEBUG] Transaction committed")
+            logger.debug("Transaction committed")
             db.refresh(db_assigned)
-            print(f"[DEBUG] AssignedService refreshed, ID={db_assigned.id}")
+            logger.debug("AssignedService refreshed, ID=%s", db_assigned.id)
         except Exception as db_error:
             db.rollback()
-            print(f"[ERROR] Database error creating AssignedService: {str(db_error)}")
-            import traceback
-            print(traceback.format_exc())
+            logger.error("Database error creating AssignedService: %s", db_error, exc_info=True)
             raise
         
-        print(f"[DEBUG] AssignedService created with ID: {db_assigned.id}")
+        logger.debug("AssignedService created with ID: %s", db_assigned.id)
         
         # Load relationships for response
         try:
@@ -627,21 +602,17 @@ def create_assigned_service(db: Session, assigned: AssignedServiceCreate):
             if not db_assigned.room:
                 raise ValueError(f"Room relationship not loaded for room_id={assigned_dict['room_id']}")
             
-            print(f"[DEBUG] Relationships loaded: service={db_assigned.service.name}, employee={db_assigned.employee.name}, room={db_assigned.room.number}")
+            logger.debug("Relationships loaded: service=%s, employee=%s, room=%s", db_assigned.service.name, db_assigned.employee.name, db_assigned.room.number)
             return db_assigned
         except Exception as rel_error:
-            print(f"[ERROR] Error loading relationships: {str(rel_error)}")
-            import traceback
-            print(traceback.format_exc())
+            logger.error("Error loading relationships: %s", rel_error, exc_info=True)
             # Try to return without relationships as fallback
             db.refresh(db_assigned)
             return db_assigned
     except Exception as e:
         db.rollback()
-        import traceback
         error_msg = f"Error creating assigned service: {str(e)}"
-        print(f"[ERROR] {error_msg}")
-        print(traceback.format_exc())
+        logger.error("%s", error_msg, exc_info=True)
         raise ValueError(error_msg) from e
 
 def get_assigned_services(db: Session, skip: int = 0, limit: int = 100, employee_id: Optional[int] = None, status: Optional[str] = None):
@@ -675,14 +646,11 @@ def get_assigned_services(db: Session, skip: int = 0, limit: int = 100, employee
         
         return assigned_services
     except Exception as e:
-        import traceback
-        print(f"[ERROR] Error in get_assigned_services: {str(e)}")
-        print(traceback.format_exc())
+        logger.error("Error in get_assigned_services: %s", e, exc_info=True)
         # Return empty list on error to prevent 500
         return []
 
 def update_assigned_service_status(db: Session, assigned_id: int, update_data: AssignedServiceUpdate, commit: bool = True):
-    import traceback
     from app.models.inventory import InventoryItem, InventoryTransaction, Location
     from datetime import datetime
     
@@ -696,7 +664,7 @@ def update_assigned_service_status(db: Session, assigned_id: int, update_data: A
         if not employee:
             raise ValueError(f"Employee with ID {update_data.employee_id} not found")
         assigned.employee_id = update_data.employee_id
-        print(f"[DEBUG] Reassigned service {assigned_id} to employee {employee.name} (ID: {employee.id})")
+        logger.debug("Reassigned service %s to employee %s (ID: %s)", assigned_id, employee.name, employee.id)
     
     # Handle status update if provided
     old_status = assigned.status
@@ -712,13 +680,13 @@ def update_assigned_service_status(db: Session, assigned_id: int, update_data: A
     # Handle billing_status update if provided
     if update_data.billing_status is not None:
         assigned.billing_status = update_data.billing_status
-        print(f"[DEBUG] Updated billing_status for service {assigned_id}: {assigned.billing_status}")
+        logger.debug("Updated billing_status for service %s: %s", assigned_id, assigned.billing_status)
     
     # If status changed to completed, set completed time and handle inventory returns
     if new_status == "completed" and str(old_status) != "completed":
         # Set completed time (last_used_at)
         assigned.last_used_at = datetime.utcnow()
-        print(f"[DEBUG] Set completed time (last_used_at) for service {assigned_id}: {assigned.last_used_at}")
+        logger.debug("Set completed time (last_used_at) for service %s: %s", assigned_id, assigned.last_used_at)
         try:
             # Use a nested transaction (savepoint) so that if inventory logic fails,
             # it doesn't abort the main transaction/session.
@@ -733,7 +701,7 @@ def update_assigned_service_status(db: Session, assigned_id: int, update_data: A
                 
                 for assignment in assignments:
                     assignment.status = "completed"  # Ready for return
-                    print(f"[DEBUG] Marked inventory assignment {assignment.id} as completed (ready for return)")
+                    logger.debug("Marked inventory assignment %s as completed (ready for return)", assignment.id)
                 
                 # --- NEW: Textile/Laundry Automatic Collection Logic ---
                 # "Collect every washable thing... at time of refill"
@@ -755,7 +723,7 @@ def update_assigned_service_status(db: Session, assigned_id: int, update_data: A
                     ).first()
                     
                     if laundry_loc:
-                        print(f"[DEBUG] Found Laundry Location: {laundry_loc.name}")
+                        logger.debug("Found Laundry Location: %s", laundry_loc.name)
                         
                         for row in service_items_rows:
                             item_id = row[0] if isinstance(row, tuple) else row.inventory_item_id
@@ -765,7 +733,7 @@ def update_assigned_service_status(db: Session, assigned_id: int, update_data: A
                             inv_item = db.query(InventoryItem).filter(InventoryItem.id == item_id).first()
                             
                             if inv_item and (inv_item.track_laundry_cycle or (inv_item.category and inv_item.category.track_laundry)):
-                                print(f"[DEBUG] Auto-collecting Laundry Item: {inv_item.name} (Qty: {qty_defined})")
+                                logger.debug("Auto-collecting Laundry Item: %s (Qty: %s)", inv_item.name, qty_defined)
                                 
                                 # 4. "Receive" into Laundry (Increment Laundry Stock)
                                 # Note: Ideally we should track "Dirty Stock" separate from "Clean Stock" if it's the same Item ID.
@@ -793,15 +761,12 @@ def update_assigned_service_status(db: Session, assigned_id: int, update_data: A
                                 # Optional: If your system tracks stock PER LOCATION, you would add an entry to LocationStock here.
                                 # Assuming simplified global stock + transaction logs for now.
                     else:
-                        print("[WARNING] No 'Laundry' location found. Cannot auto-collect dirty linens.")
+                        logger.warning("No 'Laundry' location found. Cannot auto-collect dirty linens.")
                 # -------------------------------------------------------
                 
                 # Process inventory returns if provided
                 if update_data.inventory_returns and len(update_data.inventory_returns) > 0:
-                    with open("c:/releasing/orchid/debug_service.log", "a") as f:
-                        f.write(f"\n[{datetime.utcnow()}] Processing {len(update_data.inventory_returns)} returns for Svc {assigned_id}\n")
-                    
-                    print(f"[DEBUG] Processing {len(update_data.inventory_returns)} inventory returns")
+                    logger.debug("Processing %s inventory returns for service %s", len(update_data.inventory_returns), assigned_id)
                     
                     # Determine return location
                     # Determine global return location (default)
@@ -809,7 +774,7 @@ def update_assigned_service_status(db: Session, assigned_id: int, update_data: A
                     if update_data.return_location_id:
                         global_return_location = db.query(Location).filter(Location.id == update_data.return_location_id).first()
                         if global_return_location:
-                            print(f"[DEBUG] Default return location: {global_return_location.name}")
+                            logger.debug("Default return location: %s", global_return_location.name)
                     
                     if not global_return_location:
                         # Fallback to main warehouse
@@ -825,12 +790,11 @@ def update_assigned_service_status(db: Session, assigned_id: int, update_data: A
                             ).first()
                         
                         if global_return_location:
-                            print(f"[DEBUG] Using fallback default location: {global_return_location.name}")
+                            logger.debug("Using fallback default location: %s", global_return_location.name)
                     
                     for return_item in update_data.inventory_returns:
                         try:
-                            with open("c:/releasing/orchid/debug_service.log", "a") as f:
-                                f.write(f"  - Item {return_item.assignment_id}, Qty {return_item.quantity_returned}\n")
+                            logger.debug("  - Item %s, Qty %s", return_item.assignment_id, return_item.quantity_returned)
 
                             assignment = db.query(EmployeeInventoryAssignment).filter(
                                 EmployeeInventoryAssignment.id == return_item.assignment_id,
@@ -838,8 +802,7 @@ def update_assigned_service_status(db: Session, assigned_id: int, update_data: A
                             ).first()
                             
                             if not assignment:
-                                with open("c:/releasing/orchid/debug_service.log", "a") as f: f.write("    ! Assignment not found\n")
-                                print(f"[WARNING] Inventory assignment {return_item.assignment_id} not found for service {assigned_id}")
+                                logger.warning("Inventory assignment %s not found for service %s", return_item.assignment_id, assigned_id)
                                 continue
                             
                             # Update used quantity if provided
@@ -900,7 +863,7 @@ def update_assigned_service_status(db: Session, assigned_id: int, update_data: A
                                     except ImportError:
                                         pass
                                     except Exception as ls_error:
-                                        with open("c:/releasing/orchid/debug_service.log", "a") as f: f.write(f"    ! LocStock Error: {str(ls_error)}\n")
+                                        logger.error("LocationStock update failed for item %s: %s", item.id, ls_error)
                                 
                                 # Create return transaction
                                 try:
@@ -917,24 +880,21 @@ def update_assigned_service_status(db: Session, assigned_id: int, update_data: A
                                         created_by=None
                                     )
                                     db.add(transaction)
-                                    with open("c:/releasing/orchid/debug_service.log", "a") as f: f.write("    + Transaction Created\n")
+                                    logger.debug("    + Transaction Created")
                                 except Exception as tx_err:
-                                    with open("c:/releasing/orchid/debug_service.log", "a") as f: f.write(f"    ! Tx Error: {str(tx_err)}\n")
+                                    logger.error("Return transaction failed: %s", tx_err)
                                     raise tx_err
 
                             else:
-                                with open("c:/releasing/orchid/debug_service.log", "a") as f: f.write(f"    ! Item {assignment.item_id} not found\n")
+                                logger.warning("Inventory item %s not found", assignment.item_id)
                         except Exception as loop_err:
-                             with open("c:/releasing/orchid/debug_service.log", "a") as f: f.write(f"    ! Loop Error: {str(loop_err)}\n")
+                             logger.error("Return item processing failed: %s", loop_err)
                              raise loop_err
                 
         except ImportError:
-            with open("c:/releasing/orchid/debug_service.log", "a") as f: f.write("! ImportError\n")
-            print("[WARNING] EmployeeInventoryAssignment model not found, skipping inventory return processing")
+            logger.warning("EmployeeInventoryAssignment model not found, skipping inventory return processing")
         except Exception as e:
-            with open("c:/releasing/orchid/debug_service.log", "a") as f: f.write(f"! FATAL: {str(e)}\n{traceback.format_exc()}\n")
-            print(f"[ERROR] Error processing inventory returns: {str(e)}")
-            print(traceback.format_exc())
+            logger.error("Error processing inventory returns: %s", e, exc_info=True)
             # Don't fail the status update if return processing fails
     
     if commit:
@@ -1,3 +1,4 @@
+from sqlalchemy import select
 from sqlalchemy.orm import Session, joinedload
 from app.models.service_request import ServiceRequest
 from app.models.foodorder import FoodOrder
@@ -6,6 +7,9 @@ from app.models.employee import Employee
 from app.schemas.service_request import ServiceRequestCreate, ServiceRequestUpdate
 from typing import List, Optional
 from datetime import datetime
+import logging
+
+logger = logging.getLogger(__name__)
 # Notification system removed
 
 def create_service_request(db: Session, request_data: ServiceRequestCreate):
@@ -25,12 +29,8 @@ def create_service_request(db: Session, request_data: ServiceRequestCreate):
     
     return request
 
-def create_cleaning_service_request(db: Session, room_id: int, room_number: str, guest_name: str = None):
-    """
-    Create a cleaning service request after checkout.
-    This is automatically triggered when a room is checked out.
-    """
-    request = ServiceRequest(
+def _cleaning_request(room_id: int, room_number: str, guest_name: str = None) -> ServiceRequest:
+    return ServiceRequest(
         food_order_id=None,  # Cleaning requests don't have food orders
         room_id=room_id,
         employee_id=None,  # Will be assigned later
@@ -38,6 +38,74 @@ def create_cleaning_service_request(db: Session, room_id: int, room_number: str,
         description=f"Room cleaning required after checkout - Room {room_number}" + (f" (Guest: {guest_name})" if guest_name else ""),
         status="pending"
     )
+
+
+def _refill_items(verification, items_by_id: dict) -> list:
+    """What was consumed needs to be refilled (from the verification's consumables audit)"""
+    refill_items = []
+    if not verification or not verification.consumables_audit_data:
+        return refill_items
+    for item_id_str, item_data in verification.consumables_audit_data.items():
+        try:
+            item_id = int(item_id_str)
+            actual_consumed = item_data.get("actual", 0)
+            inv_item = items_by_id.get(item_id)
+            if inv_item and actual_consumed > 0:
+                refill_items.append({
+                    "item_id": item_id,
+                    "item_name": inv_item.name,
+                    "item_code": inv_item.item_code,
+                    "quantity_to_refill": actual_consumed,
+                    "unit": inv_item.unit or "pcs"
+                })
+        except (ValueError, KeyError):
+            continue
+    return refill_items
+
+
+def _refill_request(room_id: int, room_number: str, guest_name: str = None, refill_items: list = None) -> ServiceRequest:
+    import json
+
+    # Build description with refill requirements
+    description_parts = [f"Room inventory refill required after checkout - Room {room_number}"]
+    if guest_name:
+        description_parts.append(f"Previous Guest: {guest_name}")
+    
+    if refill_items:
+        description_parts.append("Refill Requirements:")
+        for item in refill_items:
+            description_parts.append(f"- {item['item_name']}: {item['quantity_to_refill']} {item['unit']}")
+    else:
+        description_parts.append("Standard inventory refill required")
+    
+    return ServiceRequest(
+        food_order_id=None,  # Refill requests don't have food orders
+        room_id=room_id,
+        employee_id=None,  # Will be assigned later
+        request_type="refill",
+        description=" | ".join(description_parts),
+        refill_data=json.dumps(refill_items) if refill_items else None,  # Store as JSON
+        status="pending"
+    )
+
+
+def _audited_item_ids(verifications) -> set:
+    item_ids = set()
+    for verification in verifications:
+        for item_id_str in (verification.consumables_audit_data or {}):
+            try:
+                item_ids.add(int(item_id_str))
+            except ValueError:
+                continue
+    return item_ids
+
+
+def create_cleaning_service_request(db: Session, room_id: int, room_number: str, guest_name: str = None):
+    """
+    Create a cleaning service request after checkout.
+    This is automatically triggered when a room is checked out.
+    """
+    request = _cleaning_request(room_id, room_number, guest_name)
     db.add(request)
     db.commit()
     db.refresh(request)
@@ -52,7 +120,6 @@ def create_refill_service_request(db: Session, room_id: int, room_number: str, g
     This is automatically triggered when a room is checked out to replenish inventory items.
     Refill requirements are calculated from the checkout consumables audit.
     """
-    import json
     refill_items = []
     
     # Get refill requirements from checkout verification if checkout_id is provided
@@ -66,55 +133,47 @@ def create_refill_service_request(db: Session, room_id: int, room_number: str, g
             CheckoutVerification.room_number == room_number
         ).first()
         
-        if verification and verification.consumables_audit_data:
-            # Extract consumables data and calculate refill requirements
-            consumables_data = verification.consumables_audit_data
-            
-            for item_id_str, item_data in consumables_data.items():
-                try:
-                    item_id = int(item_id_str)
-                    actual_consumed = item_data.get("actual", 0)
-                    
-                    # Get inventory item details
-                    inv_item = db.query(InventoryItem).filter(InventoryItem.id == item_id).first()
-                    if inv_item and actual_consumed > 0:
-                        # What was consumed needs to be refilled
-                        refill_items.append({
-                            "item_id": item_id,
-                            "item_name": inv_item.name,
-                            "item_code": inv_item.item_code,
-                            "quantity_to_refill": actual_consumed,
-                            "unit": inv_item.unit or "pcs"
-                        })
-                except (ValueError, KeyError):
-                    continue
+        item_ids = _audited_item_ids([verification]) if verification else set()
+        items_by_id = {item.id: item for item in db.query(InventoryItem).filter(InventoryItem.id.in_(item_ids))} if item_ids else {}
+        refill_items = _refill_items(verification, items_by_id)
     
-    # Build description with refill requirements
-    description_parts = [f"Room inventory refill required after checkout - Room {room_number}"]
-    if guest_name:
-        description_parts.append(f"Previous Guest: {guest_name}")
-    
-    if refill_items:
-        description_parts.append("Refill Requirements:")
-        for item in refill_items:
-            description_parts.append(f"- {item['item_name']}: {item['quantity_to_refill']} {item['unit']}")
-    else:
-        description_parts.append("Standard inventory refill required")
-    
-    request = ServiceRequest(
-        food_order_id=None,  # Refill requests don't have food orders
-        room_id=room_id,
-        employee_id=None,  # Will be assigned later
-        request_type="refill",
-        description=" | ".join(description_parts),
-        refill_data=json.dumps(refill_items) if refill_items else None,  # Store as JSON
-        status="pending"
-    )
+    request = _refill_request(room_id, room_number, guest_name, refill_items)
     db.add(request)
     db.commit()
     db.refresh(request)
     return request
 
+def create_checkout_service_requests(db: Session, rooms, guest_name: str = None, checkout_id: int = None, commit: bool = True):
+    """
+    Cleaning and refill requests for every room of a group checkout. Verifications
+    and audited items for all rooms are loaded in two queries; with commit=False the
+    requests are only added to the session so they land in the caller's transaction.
+    """
+    verifications = {}
+    items_by_id = {}
+    if checkout_id:
+        from app.models.checkout import CheckoutVerification
+        from app.models.inventory import InventoryItem
+        
+        for verification in db.query(CheckoutVerification).filter(
+            CheckoutVerification.checkout_id == checkout_id,
+            CheckoutVerification.room_number.in_([room.number for room in rooms])
+        ).order_by(CheckoutVerification.id):
+            verifications.setdefault(verification.room_number, verification)
+        item_ids = _audited_item_ids(verifications.values())
+        if item_ids:
+            items_by_id = {item.id: item for item in db.query(InventoryItem).filter(InventoryItem.id.in_(item_ids))}
+    
+    requests = []
+    for room in rooms:
+        requests.append(_cleaning_request(room.id, room.number, guest_name))
+        refill_items = _refill_items(verifications.get(room.number), items_by_id)
+        requests.append(_refill_request(room.id, room.number, guest_name, refill_items))
+    db.add_all(requests)
+    if commit:
+        db.commit()
+    return requests
+
 def create_return_items_service_request(db: Session, room_id: int, room_number: str, guest_name: str = None, checkout_id: int = None):
     """
     Create a return items service request after checkout.
@@ -196,30 +255,66 @@ def create_return_items_service_request(db: Session, room_id: int, room_number:
     db.refresh(request)
     return request
 
-def get_service_requests(db: Session, skip: int = 0, limit: int = 100, status: Optional[str] = None):
-    query = db.query(ServiceRequest).options(
+def service_request_page_statement(skip: int = 0, limit: int = 100, status: Optional[str] = None, fields=None):
+    """
+    One page of service requests as plain columns with room_number and
+    employee_name joined in: the rows carry every attribute service_request_to_dict reads.
+    With a fieldset only its columns are selected and joins it does not need are skipped.
+    """
+    from app.utils.api_optimization import sparse_columns, wants
+
+    room_number = Room.number.label("room_number")
+    employee_name = Employee.name.label("employee_name")
+    field_columns = {
+        "food_order_id": (ServiceRequest.food_order_id,),
+        "room_id": (ServiceRequest.room_id,),
+        "employee_id": (ServiceRequest.employee_id,),
+        "request_type": (ServiceRequest.request_type,),
+        "description": (ServiceRequest.description,),
+        "status": (ServiceRequest.status,),
+        "refill_data": (ServiceRequest.refill_data,),
+        "created_at": (ServiceRequest.created_at,),
+        "completed_at": (ServiceRequest.completed_at,),
+        "room_number": (room_number,),
+        "employee_name": (employee_name,),
+    }
+    stmt = select(*sparse_columns(fields, field_columns, always=(ServiceRequest.id,)))
+    if wants(fields, "room_number"):
+        stmt = stmt.outerjoin(Room, ServiceRequest.room_id == Room.id)
+    if wants(fields, "employee_name"):
+        stmt = stmt.outerjoin(Employee, ServiceRequest.employee_id == Employee.id)
+    if status:
+        stmt = stmt.where(ServiceRequest.status == status)
+    return stmt.offset(skip).limit(limit)
+
+def get_service_requests(db: Session, skip: int = 0, limit: int = 100, status: Optional[str] = None, fields=None):
+    """Service request rows for the list endpoint (see service_request_page_statement)"""
+    return db.execute(service_request_page_statement(skip, limit, status, fields)).all()
+
+def get_service_requests_by_ids(db: Session, request_ids) -> List[ServiceRequest]:
+    """Enriched service requests for the given ids (delta sync)"""
+    if not request_ids:
+        return []
+    requests = db.query(ServiceRequest).options(
         joinedload(ServiceRequest.food_order),
         joinedload(ServiceRequest.room),
         joinedload(ServiceRequest.employee)
-    )
-    
-    if status:
-        query = query.filter(ServiceRequest.status == status)
-    
-    requests = query.offset(skip).limit(limit).all()
-    
-    # Enrich with additional data
+    ).filter(ServiceRequest.id.in_(list(request_ids))).all()
     for req in requests:
-        if req.food_order:
-            req.food_order_amount = req.food_order.amount
-            req.food_order_status = req.food_order.status
-        if req.room:
-            req.room_number = req.room.number
-        # Always set employee_name, even if None
-        req.employee_name = req.employee.name if req.employee else None
-    
+        enrich_service_request(req)
     return requests
 
+def enrich_service_request(req: ServiceRequest):
+    """Copy food order / room / employee details onto the request for serialization"""
+    if req.food_order:
+        req.food_order_amount = req.food_order.amount
+        req.food_order_status = req.food_order.status
+    if req.room:
+        req.room_number = req.room.number
+    # Always set employee_name, even if None
+    req.employee_name = req.employee.name if req.employee else None
+    return req
+
 def get_service_request(db: Session, request_id: int):
     request = db.query(ServiceRequest).options(
         joinedload(ServiceRequest.food_order),
@@ -228,13 +323,7 @@ def get_service_request(db: Session, request_id: int):
     ).filter(ServiceRequest.id == request_id).first()
     
     if request:
-        if request.food_order:
-            request.food_order_amount = request.food_order.amount
-            request.food_order_status = request.food_order.status
-        if request.room:
-            request.room_number = request.room.number
-        # Always set employee_name, even if None
-        request.employee_name = request.employee.name if request.employee else None
+        enrich_service_request(request)
     
     return request
 
@@ -268,7 +357,7 @@ def update_service_request(db: Session, request_id: int, update_data: ServiceReq
                     elif food_order.billing_status != "paid":
                         food_order.billing_status = "unpaid"
                     
-                    print(f"[INFO] Food order {food_order.id} marked as completed (billing: {food_order.billing_status}) due to delivery service completion")
+                    logger.info("Food order %s marked as completed (billing: %s) due to delivery service completion", food_order.id, food_order.billing_status)
 
             # Sync with AssignedService: Heuristic to auto-complete duplicate manual assignments
             if is_completing:
@@ -306,17 +395,13 @@ def update_service_request(db: Session, request_id: int, update_data: ServiceReq
                                     assigned_time = svc.assigned_at or datetime.utcnow()
                                     time_diff = datetime.utcnow() - assigned_time
                                     if time_diff.total_seconds() < 172800: # 48 hours
-                                        print(f"[INFO] Auto-completing linked AssignedService {svc.id} ({svc.service.name}) matching ServiceRequest {request.id}")
+                                        logger.info("Auto-completing linked AssignedService %s (%s) matching ServiceRequest %s", svc.id, svc.service.name, request.id)
                                         update_assigned_service_status(db, svc.id, AssignedServiceUpdate(status='completed'), commit=False)
                         except Exception as nested_error:
-                            print(f"[WARNING] Nested transaction failed during AssignedService sync: {nested_error}")
-                            import traceback
-                            print(traceback.format_exc())
+                            logger.warning("Nested transaction failed during AssignedService sync: %s", nested_error, exc_info=True)
                             # Don't rollback - continue with main update even if sync fails
                 except Exception as sync_error:
-                    print(f"[WARNING] Failed to sync AssignedService status: {sync_error}")
-                    import traceback
-                    print(traceback.format_exc())
+                    logger.warning("Failed to sync AssignedService status: %s", sync_error, exc_info=True)
                     # Don't rollback - continue with main update even if sync fails
     
     if update_data.employee_id is not None:
@@ -1,8 +1,13 @@
+from typing import Dict, Iterable
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from app.models.user import User, Role
-from app.schemas.user import UserCreate
+from app.schemas.user import UserCreate, UserOut
 import bcrypt
 from app.utils import auth
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 def get_user_by_email(db: Session, email: str):
@@ -44,6 +49,48 @@ def authenticate_user(db: Session, email: str, password: str):
         if not auth.verify_password(password, user.hashed_password):
             return None
     except Exception as e:
-        print(f"Password verification error for {email}: {str(e)}")
+        logger.error("Password verification error for %s: %s", email, e)
         return None
     return user
+
+
+def user_refs_by_id(db: Session, user_ids: Iterable[int]) -> Dict[int, dict]:
+    """
+    UserOut-shaped dicts (role included) for the given user ids, from one projected query.
+
+    For list responses that embed the same few users on many rows: each distinct
+    user is validated once. Malformed emails missing a TLD get ".com" appended, as
+    the booking list always did; users that still fail validation are left out.
+    """
+    wanted = {uid for uid in user_ids if uid}
+    if not wanted:
+        return {}
+    rows = db.execute(
+        select(
+            User.id, User.name, User.email, User.phone, User.is_active,
+            Role.id.label("role_id"), Role.name.label("role_name"), Role.permissions.label("role_permissions"),
+        )
+        .outerjoin(Role, User.role_id == Role.id)
+        .where(User.id.in_(wanted))
+    ).all()
+
+    refs = {}
+    for row in rows:
+        email = row.email
+        if email and "@" in email and "." not in email.split("@")[1]:
+            email = email + ".com"
+        role = None
+        if row.role_id is not None:
+            role = {"id": row.role_id, "name": row.role_name, "permissions": row.role_permissions}
+        try:
+            refs[row.id] = UserOut.model_validate({
+                "id": row.id,
+                "name": row.name,
+                "email": email,
+                "phone": row.phone,
+                "is_active": True if row.is_active is None else row.is_active,
+                "role": role,
+            }).model_dump(mode="json")
+        except Exception as e:
+            logger.warning("Could not build user reference for user %s: %s", row.id, e)
+    return refs
@@ -1,24 +1,13 @@
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
-from dotenv import load_dotenv
-from pathlib import Path
+from app.utils.db_metrics import InstrumentedQueuePool, install_db_instrumentation
+from app.utils.env import load_env
 import os
 
-# Load .env file from the parent directory (ResortApp/.env)
-env_path = Path(__file__).parent.parent / ".env"
-if env_path.exists():
-    load_dotenv(dotenv_path=env_path, override=True)
-    print(f"Loaded .env from: {env_path.absolute()}")
-else:
-    print(f"Warning: .env file not found at {env_path.absolute()}")
-
-# Fallback: also try loading from current directory
-if not os.getenv("DATABASE_URL"):
-    load_dotenv(override=True)
+# Load .env file from the parent directory (ResortApp/.env); no-op if main.py already did
+load_env()
 
 SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL")
-if SQLALCHEMY_DATABASE_URL:
-    print(f"Database URL loaded: {SQLALCHEMY_DATABASE_URL[:50]}...")
 
 # Allow overriding with local postgres superuser (useful when regular user lacks perms)
 def _str_to_bool(value: str) -> bool:
@@ -39,6 +28,10 @@ if not SQLALCHEMY_DATABASE_URL:
     SQLALCHEMY_DATABASE_URL = "sqlite:///./orchid.db"
     print(f"Warning: DATABASE_URL not found in environment. Using default: {SQLALCHEMY_DATABASE_URL}")
 
+# Per-worker pool capacity; app/utils/admission.py keeps part of it free for front-desk traffic
+POOL_SIZE = 20
+POOL_MAX_OVERFLOW = 30
+
 # Add SSL parameters and connection pool settings to fix connection issues
 # Increased pool size for production stability
 # SQLite doesn't support sslmode, so we check if it's SQLite
@@ -55,8 +48,9 @@ else:
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
     connect_args=connect_args,
-    pool_size=20,  # Increased pool size for multiple workers (production)
-    max_overflow=30,  # Additional connections that can be created on demand
+    poolclass=InstrumentedQueuePool,  # Reports checkout wait time to /metrics
+    pool_size=POOL_SIZE,  # Increased pool size for multiple workers (production)
+    max_overflow=POOL_MAX_OVERFLOW,  # Additional connections that can be created on demand
     pool_pre_ping=True,  # Verify connections before use (fixes connection drops)
     pool_recycle=1800,  # Recycle connections after 30 minutes to prevent stale connections
     pool_timeout=30,  # Timeout for getting connection from pool
@@ -65,6 +59,10 @@ engine = create_engine(
         "isolation_level": "READ COMMITTED"  # Better concurrency with read committed
     } if SQLALCHEMY_DATABASE_URL and not SQLALCHEMY_DATABASE_URL.startswith("sqlite") else {}
 )
+
+# Request-scoped query counters (X-DB-Queries / X-DB-Time headers, N+1 detection)
+install_db_instrumentation(engine)
+
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
 Base = declarative_base()
 
@@ -76,3 +74,131 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# ---------------------------------------------------------------------------
+# Optional read replica (DATABASE_READ_URL) for report and analytics reads.
+# app/utils/read_replica.py decides per request whether the replica may serve it.
+# ---------------------------------------------------------------------------
+SQLALCHEMY_READ_DATABASE_URL = os.getenv("DATABASE_READ_URL")
+# session.info key set on replica sessions
+READ_REPLICA_INFO_KEY = "read_replica"
+
+_read_engine = None
+_ReadSessionLocal = None
+
+
+def get_read_engine():
+    """Replica engine, created on first use; None without DATABASE_READ_URL"""
+    global _read_engine, _ReadSessionLocal
+    if _read_engine is None and SQLALCHEMY_READ_DATABASE_URL:
+        if SQLALCHEMY_READ_DATABASE_URL.startswith("sqlite"):
+            read_kwargs = {"connect_args": {"check_same_thread": False}}
+        else:
+            read_kwargs = {
+                "connect_args": {
+                    "sslmode": "disable",
+                    "connect_timeout": 5,  # An unreachable replica falls back to the primary quickly
+                    "options": "-c statement_timeout=120000",  # Long report scans are what the replica is for
+                },
+                "execution_options": {"isolation_level": "READ COMMITTED", "postgresql_readonly": True},
+            }
+        _read_engine = create_engine(
+            SQLALCHEMY_READ_DATABASE_URL,
+            pool_size=int(os.getenv("READ_DB_POOL_SIZE", "10")),
+            max_overflow=int(os.getenv("READ_DB_MAX_OVERFLOW", "10")),
+            pool_pre_ping=True,
+            pool_recycle=1800,
+            pool_timeout=10,
+            **read_kwargs,
+        )
+        install_db_instrumentation(_read_engine)
+        _ReadSessionLocal = sessionmaker(
+            bind=_read_engine, autocommit=False, autoflush=False, info={READ_REPLICA_INFO_KEY: True}
+        )
+    return _read_engine
+
+
+def new_read_session():
+    """Session on the replica (DATABASE_READ_URL must be set)"""
+    get_read_engine()
+    return _ReadSessionLocal()
+
+
+# ---------------------------------------------------------------------------
+# Async access path (asyncpg for Postgres, aiosqlite for SQLite/tests)
+# Used by the async read endpoints in app/api/async_reads.py so hot reads don't
+# hold a Starlette threadpool thread while waiting on the database.
+# ---------------------------------------------------------------------------
+ASYNC_DB_ENABLED = _str_to_bool(os.getenv("ASYNC_DB_ENABLED", "true"))
+
+
+def _to_async_url(url: str) -> str:
+    """Map the sync driver URL onto its async driver equivalent"""
+    if url.startswith("sqlite+aiosqlite") or url.startswith("postgresql+asyncpg"):
+        return url
+    if url.startswith("sqlite"):
+        return "sqlite+aiosqlite" + url[len("sqlite"):]
+    for prefix in ("postgresql+psycopg2", "postgresql", "postgres"):
+        if url.startswith(prefix + "://"):
+            return "postgresql+asyncpg" + url[len(prefix):]
+    return url
+
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or _to_async_url(SQLALCHEMY_DATABASE_URL)
+
+_async_engine = None
+_AsyncSessionLocal = None
+
+
+def async_db_available() -> bool:
+    """True when the async path is enabled and its driver is installed"""
+    if not ASYNC_DB_ENABLED:
+        return False
+    try:
+        if ASYNC_DATABASE_URL.startswith("sqlite"):
+            import aiosqlite  # noqa: F401
+        else:
+            import asyncpg  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def get_async_engine():
+    """Create the async engine on first use so importing this module never opens a connection"""
+    global _async_engine, _AsyncSessionLocal
+    if _async_engine is None:
+        from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+
+        if ASYNC_DATABASE_URL.startswith("sqlite"):
+            async_kwargs = {}
+        else:
+            async_kwargs = {
+                "connect_args": {
+                    "timeout": 10,
+                    "server_settings": {"statement_timeout": "60000"},
+                },
+                "pool_size": int(os.getenv("ASYNC_DB_POOL_SIZE", "10")),
+                "max_overflow": int(os.getenv("ASYNC_DB_MAX_OVERFLOW", "10")),
+                "pool_timeout": 30,
+                "isolation_level": "READ COMMITTED",
+            }
+        _async_engine = create_async_engine(
+            ASYNC_DATABASE_URL,
+            pool_pre_ping=True,
+            pool_recycle=1800,
+            **async_kwargs,
+        )
+        install_db_instrumentation(_async_engine.sync_engine)
+        _AsyncSessionLocal = async_sessionmaker(
+            bind=_async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+        )
+    return _async_engine
+
+
+async def get_async_db():
+    """Dependency for getting an async database session"""
+    get_async_engine()
+    async with _AsyncSessionLocal() as session:
+        yield session
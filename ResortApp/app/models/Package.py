@@ -1,5 +1,6 @@
-from sqlalchemy import Column, Integer, String, Float, Date, ForeignKey, DateTime
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Float, Date, ForeignKey, DateTime, CheckConstraint, Index, text
+from sqlalchemy.orm import relationship, validates
+from app.utils.booking_status import ACTIVE_BOOKING_STATUSES, BOOKED, normalize_booking_status, sql_in_list
 from app.database import Base
 
 
@@ -38,6 +39,15 @@ class PackageImage(Base):
 
 class PackageBooking(Base):
     __tablename__ = "package_bookings"
+    __table_args__ = (
+        CheckConstraint(f"status IN ({sql_in_list()})", name="ck_package_bookings_status"),
+        Index(
+            "ix_package_bookings_active", "status", "id",
+            postgresql_where=text(f"status IN ({sql_in_list(ACTIVE_BOOKING_STATUSES)})"),
+            sqlite_where=text(f"status IN ({sql_in_list(ACTIVE_BOOKING_STATUSES)})"),
+        ),
+        Index("ix_package_bookings_check_in_check_out", "check_in", "check_out"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     package_id = Column(Integer, ForeignKey("packages.id"))
     user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
@@ -54,7 +64,7 @@ class PackageBooking(Base):
     id_card_image_url = Column(String, nullable=True)
     guest_photo_url = Column(String, nullable=True)
 
-    status = Column(String)
+    status = Column(String, default=BOOKED)
     advance_deposit = Column(Float, default=0.0)  # Advance payment made during booking
     food_preferences = Column(String, nullable=True)
     special_requests = Column(String, nullable=True)
@@ -71,9 +81,17 @@ class PackageBooking(Base):
         cascade="all, delete-orphan"
     )
 
+    @validates("status")
+    def _normalize_status(self, key, value):
+        return normalize_booking_status(value)
+
 
 class PackageBookingRoom(Base):
     __tablename__ = "package_booking_rooms"
+    __table_args__ = (
+        Index("ix_package_booking_rooms_room_id_booking_id", "room_id", "package_booking_id"),
+        Index("ix_package_booking_rooms_package_booking_id", "package_booking_id"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     package_booking_id = Column(Integer, ForeignKey("package_bookings.id", ondelete="CASCADE"))
     room_id = Column(Integer, ForeignKey("rooms.id"))
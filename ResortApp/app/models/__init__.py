@@ -12,6 +12,10 @@ from .food_item import FoodItem
 from .recipe import Recipe, RecipeIngredient
 from .payment import Payment
 from .suggestion import GuestSuggestion
+from .report_cache import ReportCacheEntry
+from .job import BackgroundJob
+from .change_log import ChangeLogEntry
+from .image_asset import ImageAsset
 from .service_request import ServiceRequest
 from .frontend import (
     HeaderBanner,
@@ -1,11 +1,22 @@
-from sqlalchemy import Column, Float, Integer, String, ForeignKey, Date, DateTime
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Float, Integer, String, ForeignKey, Date, DateTime, CheckConstraint, Index, text
+from sqlalchemy.orm import relationship, validates
+from app.utils.booking_status import ACTIVE_BOOKING_STATUSES, normalize_booking_status, sql_in_list
 from app.database import Base
 from .room import Room
 from .user import User
 
 class Booking(Base):
     __tablename__ = "bookings"
+    __table_args__ = (
+        CheckConstraint(f"status IN ({sql_in_list()})", name="ck_bookings_status"),
+        # Partial index: in-house / upcoming stays are a small slice of all bookings
+        Index(
+            "ix_bookings_active", "status", "id",
+            postgresql_where=text(f"status IN ({sql_in_list(ACTIVE_BOOKING_STATUSES)})"),
+            sqlite_where=text(f"status IN ({sql_in_list(ACTIVE_BOOKING_STATUSES)})"),
+        ),
+        Index("ix_bookings_check_in_check_out", "check_in", "check_out"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     status = Column(String, default="booked")
@@ -31,8 +42,16 @@ class Booking(Base):
         cascade="all, delete-orphan"
     )
 
+    @validates("status")
+    def _normalize_status(self, key, value):
+        return normalize_booking_status(value)
+
 class BookingRoom(Base):
     __tablename__ = "booking_rooms"
+    __table_args__ = (
+        Index("ix_booking_rooms_room_id_booking_id", "room_id", "booking_id"),
+        Index("ix_booking_rooms_booking_id", "booking_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     booking_id = Column(Integer, ForeignKey("bookings.id"))
@@ -0,0 +1,27 @@
+from datetime import datetime
+
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime
+from app.database import Base
+
+CREATED = "created"
+UPDATED = "updated"
+DELETED = "deleted"
+BULK = "bulk"  # ORM bulk update/delete: affected ids unknown, clients refetch the entity
+
+CHANGE_OPS = (CREATED, UPDATED, DELETED, BULK)
+
+
+class ChangeLogEntry(Base):
+    """One committed mutation of a synced entity; id is the monotonic version used as the sync cursor"""
+    __tablename__ = "change_log"
+    # AUTOINCREMENT on SQLite so pruning the newest rows can never hand out a version twice
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True)
+    entity = Column(String(50), nullable=False)  # sync entity name, e.g. "bookings"
+    entity_id = Column(Integer, nullable=True)  # NULL for BULK entries
+    op = Column(String(10), nullable=False)
+    changed_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    # Postgres: next transaction id when the entry was written; every transaction that
+    # took a lower id had an xid below it (see app.utils.change_log). NULL on SQLite
+    txid_horizon = Column(BigInteger, nullable=True)
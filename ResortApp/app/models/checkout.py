@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Float, String, ForeignKey, DateTime, Date, Enum, func, Boolean, Text, JSON
+from sqlalchemy import Column, Integer, Float, String, ForeignKey, DateTime, Date, Enum, func, Boolean, Text, JSON, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
@@ -93,6 +93,10 @@ class CheckoutPayment(Base):
 
 class Checkout(Base):
     __tablename__ = "checkouts"
+    __table_args__ = (
+        Index("ix_checkouts_room_number_checkout_date", "room_number", "checkout_date"),
+        Index("ix_checkouts_checkout_date", "checkout_date"),
+    )
     id = Column(Integer, primary_key=True, index=True)
 
     room_total = Column(Float, default=0.0)
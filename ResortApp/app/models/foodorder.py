@@ -1,10 +1,14 @@
-from sqlalchemy import Column, Integer, Float, String, ForeignKey, DateTime, Boolean
+from sqlalchemy import Column, Integer, Float, String, ForeignKey, DateTime, Boolean, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
 
 class FoodOrder(Base):
     __tablename__ = "food_orders"
+    __table_args__ = (
+        Index("ix_food_orders_room_id_created_at", "room_id", "created_at"),
+        Index("ix_food_orders_created_at", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     room_id = Column(Integer, ForeignKey("rooms.id"))
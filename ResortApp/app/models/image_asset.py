@@ -0,0 +1,27 @@
+from datetime import datetime
+
+from sqlalchemy import Column, Integer, String, Text, DateTime
+from app.database import Base
+
+PENDING = "pending"
+READY = "ready"
+FAILED = "failed"
+SKIPPED = "skipped"  # not a raster image (e.g. a PDF receipt) or no imaging library
+
+
+class ImageAsset(Base):
+    """An ingested upload and its resized WebP/JPEG variants (app.utils.images)"""
+    __tablename__ = "image_assets"
+
+    id = Column(Integer, primary_key=True, index=True)
+    original_url = Column(String(500), unique=True, index=True, nullable=False)  # as stored on the owning row
+    sha256 = Column(String(64), index=True, nullable=False)
+    bytes = Column(Integer, nullable=False)
+    content_type = Column(String(50), nullable=True)
+    width = Column(Integer, nullable=True)
+    height = Column(Integer, nullable=True)
+    status = Column(String(20), nullable=False, default=PENDING)
+    variants = Column(Text, nullable=True)  # JSON: {"variants": {...}, "srcset": {...}}
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    processed_at = Column(DateTime, nullable=True)
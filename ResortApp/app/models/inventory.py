@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, Date, Text, Boolean, Numeric
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, Date, Text, Boolean, Numeric, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
@@ -210,6 +210,10 @@ class PurchaseDetail(Base):
 
 class InventoryTransaction(Base):
     __tablename__ = "inventory_transactions"
+    __table_args__ = (
+        Index("ix_inventory_transactions_item_id_created_at", "item_id", "created_at"),
+        Index("ix_inventory_transactions_created_at", "created_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     item_id = Column(Integer, ForeignKey("inventory_items.id"), nullable=False)
@@ -0,0 +1,45 @@
+from datetime import datetime
+
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, Index, text
+from app.database import Base
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+JOB_STATUSES = (QUEUED, RUNNING, SUCCEEDED, FAILED, CANCELLED)
+ACTIVE_JOB_STATUSES = (QUEUED, RUNNING)
+
+_ACTIVE_PREDICATE = text("status IN ('queued', 'running')")
+
+
+class BackgroundJob(Base):
+    """Long-running admin operation executed by the in-process job pool (app.utils.jobs)"""
+    __tablename__ = "background_jobs"
+    __table_args__ = (
+        # At most one queued/running job per type, whichever worker submitted it
+        Index(
+            "uq_background_jobs_active_type", "job_type", unique=True,
+            postgresql_where=_ACTIVE_PREDICATE,
+            sqlite_where=_ACTIVE_PREDICATE,
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    job_type = Column(String(100), nullable=False, index=True)
+    status = Column(String(20), nullable=False, default=QUEUED, index=True)
+    params = Column(Text, nullable=True)  # JSON keyword arguments for the handler
+    progress_done = Column(Integer, nullable=False, default=0)
+    progress_total = Column(Integer, nullable=True)
+    progress_message = Column(String(255), nullable=True)
+    result = Column(Text, nullable=True)  # JSON, set when the job succeeds
+    error = Column(Text, nullable=True)
+    cancel_requested = Column(Boolean, nullable=False, default=False)
+    worker = Column(String(100), nullable=True)  # host:pid that ran it
+    created_by = Column(Integer, ForeignKey("users.id"), nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    heartbeat_at = Column(DateTime, nullable=True)  # refreshed while queued/running; stale = worker gone
@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, String, Text, Date, DateTime, Boolean
+from sqlalchemy.sql import func
+from app.database import Base
+
+class ReportCacheEntry(Base):
+    """Stored report result; entries for closed periods have no expiry"""
+    __tablename__ = "report_cache_entries"
+
+    id = Column(Integer, primary_key=True, index=True)
+    cache_key = Column(String(64), unique=True, index=True, nullable=False)  # sha256 of report + parameters
+    report = Column(String(100), index=True, nullable=False)
+    params = Column(Text, nullable=True)
+    period_start = Column(Date, nullable=True, index=True)  # NULL = open-ended
+    period_end = Column(Date, nullable=True, index=True)
+    payload = Column(Text, nullable=False)
+    is_final = Column(Boolean, default=False, nullable=False)  # period was closed when computed
+    expires_at = Column(DateTime, nullable=True)  # NULL for final entries
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
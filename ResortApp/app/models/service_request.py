@@ -1,10 +1,13 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
 
 class ServiceRequest(Base):
     __tablename__ = "service_requests"
+    __table_args__ = (
+        Index("ix_service_requests_room_id_created_at", "room_id", "created_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     food_order_id = Column(Integer, ForeignKey("food_orders.id"), nullable=True)  # Nullable for cleaning/other non-food requests
@@ -33,6 +33,8 @@ class User(Base):
     phone = Column(String, nullable=True)
     is_active = Column(Boolean, default=True)
     role_id = Column(Integer, ForeignKey("roles.id"))
+    # Carried in access tokens; bumping it revokes every token issued before
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
     bookings = relationship("Booking", back_populates="user")
     role = relationship("Role", back_populates="users")
     package_bookings = relationship("PackageBooking", back_populates="user")
@@ -20,6 +20,7 @@ class HeaderBannerCreate(HeaderBannerBase):
 
 class HeaderBanner(HeaderBannerBase):
     id: int
+    image_variants: dict | None = None  # resized WebP/JPEG URLs and srcset once processed
 
 
 # Check Availability
@@ -48,6 +49,7 @@ class GalleryCreate(GalleryBase):
 
 class Gallery(GalleryBase):
     id: int
+    image_variants: dict | None = None  # resized WebP/JPEG URLs and srcset once processed
 
 
 # Reviews
@@ -95,6 +97,7 @@ class SignatureExperienceUpdate(BaseSchema):
 
 class SignatureExperience(SignatureExperienceBase):
     id: int
+    image_variants: dict | None = None  # resized WebP/JPEG URLs and srcset once processed
 
 
 # Plan Your Wedding
@@ -113,6 +116,7 @@ class PlanWeddingUpdate(BaseSchema):
 
 class PlanWedding(PlanWeddingBase):
     id: int
+    image_variants: dict | None = None  # resized WebP/JPEG URLs and srcset once processed
 
 
 # Nearby Attractions
@@ -136,6 +140,7 @@ class NearbyAttractionUpdate(BaseSchema):
 
 class NearbyAttraction(NearbyAttractionBase):
     id: int
+    image_variants: dict | None = None  # resized WebP/JPEG URLs and srcset once processed
 
 
 # Nearby Attraction Banners
@@ -158,4 +163,5 @@ class NearbyAttractionBannerUpdate(BaseSchema):
 
 
 class NearbyAttractionBanner(NearbyAttractionBannerBase):
-    id: int
\ No newline at end of file
+    id: int
+    image_variants: dict | None = None  # resized WebP/JPEG URLs and srcset once processed
@@ -375,6 +375,7 @@ class InventoryTransactionOut(BaseModel):
     created_by: Optional[int] = None
     created_by_name: Optional[str] = None
     created_at: datetime
+    destination_location_name: Optional[str] = None  # Stock issues (ISS-...) only
     
     class Config:
         from_attributes = True
@@ -6,6 +6,7 @@ from typing import List, Optional
 class PackageImageOut(BaseModel):
     id: int
     image_url: str
+    image_variants: Optional[dict] = None  # resized WebP/JPEG URLs and srcset once processed
 
     class Config:
         from_attributes = True
@@ -20,6 +20,7 @@ class ServiceCreate(ServiceBase):
 class ServiceImageOut(BaseModel):
     id: int
     image_url: str
+    image_variants: Optional[dict] = None  # resized WebP/JPEG URLs and srcset once processed
 
     class Config:
         from_attributes = True
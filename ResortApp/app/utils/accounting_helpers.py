@@ -7,6 +7,9 @@ from typing import List, Optional
 from app.models.account import AccountLedger
 from app.curd.account import create_journal_entry
 from app.schemas.account import JournalEntryCreate, JournalEntryLineCreateInEntry
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 def find_ledger_by_name(db: Session, name: str, module: Optional[str] = None) -> Optional[AccountLedger]:
@@ -83,7 +86,7 @@ def create_booking_journal_entry(
             f"Debits: ₹{total_debits:.2f}, Credits: ₹{total_credits:.2f}, "
             f"Difference: ₹{abs(total_debits - total_credits):.2f}"
         )
-        print(f"[ERROR] {error_msg}")
+        logger.error("%s", error_msg)
         raise ValueError(error_msg)
     
     entry = JournalEntryCreate(
@@ -97,13 +100,13 @@ def create_booking_journal_entry(
     
     try:
         journal_entry = create_journal_entry(db, entry, created_by)
-        print(f"[INFO] Booking journal entry {journal_entry.entry_number} created successfully (Balanced: Debits=₹{total_debits:.2f}, Credits=₹{total_credits:.2f})")
+        logger.info("Booking journal entry %s created successfully (Balanced: Debits=₹%.2f, Credits=₹%.2f)", journal_entry.entry_number, total_debits, total_credits)
         return journal_entry.id
     except ValueError as ve:
-        print(f"[ERROR] Balance validation failed for booking {booking_id}: {str(ve)}")
+        logger.error("Balance validation failed for booking %s: %s", booking_id, ve)
         raise
     except Exception as e:
-        print(f"[ERROR] Error creating booking journal entry: {str(e)}")
+        logger.error("Error creating booking journal entry: %s", e)
         raise
 
 
@@ -199,7 +202,7 @@ def create_purchase_journal_entry(
             f"Debits: ₹{total_debits:.2f}, Credits: ₹{total_credits:.2f}, "
             f"Difference: ₹{abs(total_debits - total_credits):.2f}"
         )
-        print(f"[ERROR] {error_msg}")
+        logger.error("%s", error_msg)
         raise ValueError(error_msg)
     
     entry = JournalEntryCreate(
@@ -213,13 +216,13 @@ def create_purchase_journal_entry(
     
     try:
         journal_entry = create_journal_entry(db, entry, created_by)
-        print(f"[INFO] Purchase journal entry {journal_entry.entry_number} created successfully (Balanced: Debits=₹{total_debits:.2f}, Credits=₹{total_credits:.2f})")
+        logger.info("Purchase journal entry %s created successfully (Balanced: Debits=₹%.2f, Credits=₹%.2f)", journal_entry.entry_number, total_debits, total_credits)
         return journal_entry.id
     except ValueError as ve:
-        print(f"[ERROR] Balance validation failed for purchase {purchase_id}: {str(ve)}")
+        logger.error("Balance validation failed for purchase %s: %s", purchase_id, ve)
         raise
     except Exception as e:
-        print(f"[ERROR] Error creating purchase journal entry: {str(e)}")
+        logger.error("Error creating purchase journal entry: %s", e)
         raise
 
 
@@ -269,7 +272,7 @@ def create_consumption_journal_entry(
             f"Debits: ₹{total_debits:.2f}, Credits: ₹{total_credits:.2f}, "
             f"Difference: ₹{abs(total_debits - total_credits):.2f}"
         )
-        print(f"[ERROR] {error_msg}")
+        logger.error("%s", error_msg)
         raise ValueError(error_msg)
     
     entry = JournalEntryCreate(
@@ -283,13 +286,13 @@ def create_consumption_journal_entry(
     
     try:
         journal_entry = create_journal_entry(db, entry, created_by)
-        print(f"[INFO] Consumption journal entry {journal_entry.entry_number} created successfully (Balanced: Debits=₹{total_debits:.2f}, Credits=₹{total_credits:.2f})")
+        logger.info("Consumption journal entry %s created successfully (Balanced: Debits=₹%.2f, Credits=₹%.2f)", journal_entry.entry_number, total_debits, total_credits)
         return journal_entry.id
     except ValueError as ve:
-        print(f"[ERROR] Balance validation failed for consumption {consumption_id}: {str(ve)}")
+        logger.error("Balance validation failed for consumption %s: %s", consumption_id, ve)
         raise
     except Exception as e:
-        print(f"[ERROR] Error creating consumption journal entry: {str(e)}")
+        logger.error("Error creating consumption journal entry: %s", e)
         raise
 
 
@@ -339,7 +342,7 @@ def create_complimentary_journal_entry(
             f"Debits: ₹{total_debits:.2f}, Credits: ₹{total_credits:.2f}, "
             f"Difference: ₹{abs(total_debits - total_credits):.2f}"
         )
-        print(f"[ERROR] {error_msg}")
+        logger.error("%s", error_msg)
         raise ValueError(error_msg)
     
     entry = JournalEntryCreate(
@@ -353,13 +356,13 @@ def create_complimentary_journal_entry(
     
     try:
         journal_entry = create_journal_entry(db, entry, created_by)
-        print(f"[INFO] Complimentary journal entry {journal_entry.entry_number} created successfully (Balanced: Debits=₹{total_debits:.2f}, Credits=₹{total_credits:.2f})")
+        logger.info("Complimentary journal entry %s created successfully (Balanced: Debits=₹%.2f, Credits=₹%.2f)", journal_entry.entry_number, total_debits, total_credits)
         return journal_entry.id
     except ValueError as ve:
-        print(f"[ERROR] Balance validation failed for complimentary {complimentary_id}: {str(ve)}")
+        logger.error("Balance validation failed for complimentary %s: %s", complimentary_id, ve)
         raise
     except Exception as e:
-        print(f"[ERROR] Error creating complimentary journal entry: {str(e)}")
+        logger.error("Error creating complimentary journal entry: %s", e)
         raise
 
 
@@ -431,7 +434,7 @@ def create_food_order_journal_entry(
             f"Debits: ₹{total_debits:.2f}, Credits: ₹{total_credits:.2f}, "
             f"Difference: ₹{abs(total_debits - total_credits):.2f}"
         )
-        print(f"[ERROR] {error_msg}")
+        logger.error("%s", error_msg)
         raise ValueError(error_msg)
     
     entry = JournalEntryCreate(
@@ -445,13 +448,13 @@ def create_food_order_journal_entry(
     
     try:
         journal_entry = create_journal_entry(db, entry, created_by)
-        print(f"[INFO] Food order journal entry {journal_entry.entry_number} created successfully (Balanced: Debits=₹{total_debits:.2f}, Credits=₹{total_credits:.2f})")
+        logger.info("Food order journal entry %s created successfully (Balanced: Debits=₹%.2f, Credits=₹%.2f)", journal_entry.entry_number, total_debits, total_credits)
         return journal_entry.id
     except ValueError as ve:
-        print(f"[ERROR] Balance validation failed for food order {food_order_id}: {str(ve)}")
+        logger.error("Balance validation failed for food order %s: %s", food_order_id, ve)
         raise
     except Exception as e:
-        print(f"[ERROR] Error creating food order journal entry: {str(e)}")
+        logger.error("Error creating food order journal entry: %s", e)
         raise
 
 
@@ -524,7 +527,7 @@ def create_service_revenue_journal_entry(
             f"Debits: ₹{total_debits:.2f}, Credits: ₹{total_credits:.2f}, "
             f"Difference: ₹{abs(total_debits - total_credits):.2f}"
         )
-        print(f"[ERROR] {error_msg}")
+        logger.error("%s", error_msg)
         raise ValueError(error_msg)
     
     entry = JournalEntryCreate(
@@ -538,13 +541,13 @@ def create_service_revenue_journal_entry(
     
     try:
         journal_entry = create_journal_entry(db, entry, created_by)
-        print(f"[INFO] Service journal entry {journal_entry.entry_number} created successfully (Balanced: Debits=₹{total_debits:.2f}, Credits=₹{total_credits:.2f})")
+        logger.info("Service journal entry %s created successfully (Balanced: Debits=₹%.2f, Credits=₹%.2f)", journal_entry.entry_number, total_debits, total_credits)
         return journal_entry.id
     except ValueError as ve:
-        print(f"[ERROR] Balance validation failed for service {service_id}: {str(ve)}")
+        logger.error("Balance validation failed for service %s: %s", service_id, ve)
         raise
     except Exception as e:
-        print(f"[ERROR] Error creating service journal entry: {str(e)}")
+        logger.error("Error creating service journal entry: %s", e)
         raise
 
 
@@ -600,7 +603,7 @@ def create_expense_journal_entry(
             f"Debits: ₹{total_debits:.2f}, Credits: ₹{total_credits:.2f}, "
             f"Difference: ₹{abs(total_debits - total_credits):.2f}"
         )
-        print(f"[ERROR] {error_msg}")
+        logger.error("%s", error_msg)
         raise ValueError(error_msg)
     
     entry = JournalEntryCreate(
@@ -614,13 +617,13 @@ def create_expense_journal_entry(
     
     try:
         journal_entry = create_journal_entry(db, entry, created_by)
-        print(f"[INFO] Expense journal entry {journal_entry.entry_number} created successfully (Balanced: Debits=₹{total_debits:.2f}, Credits=₹{total_credits:.2f})")
+        logger.info("Expense journal entry %s created successfully (Balanced: Debits=₹%.2f, Credits=₹%.2f)", journal_entry.entry_number, total_debits, total_credits)
         return journal_entry.id
     except ValueError as ve:
-        print(f"[ERROR] Balance validation failed for expense {expense_id}: {str(ve)}")
+        logger.error("Balance validation failed for expense %s: %s", expense_id, ve)
         raise
     except Exception as e:
-        print(f"[ERROR] Error creating expense journal entry: {str(e)}")
+        logger.error("Error creating expense journal entry: %s", e)
         raise
 
 
@@ -640,7 +643,8 @@ def create_complete_checkout_journal_entry(
     payment_method: str = "cash",  # cash, card, upi, etc.
     payment_ledger_id: Optional[int] = None,  # Optional: specify payment ledger directly
     created_by: Optional[int] = None,
-    advance_amount: float = 0.0
+    advance_amount: float = 0.0,
+    commit: bool = True
 ) -> int:
     """
     Create comprehensive journal entry for complete checkout (Scenario 2: Guest Checkout)
@@ -667,29 +671,29 @@ def create_complete_checkout_journal_entry(
     
     # Relaxed validation: Only require ledgers for components that have non-zero amounts
     if room_total > 0 and not room_revenue:
-        print(f"[WARNING] Cannot create journal entry for checkout {checkout_id}: Missing 'Room Revenue (Taxable)' ledger")
+        logger.warning("Cannot create journal entry for checkout %s: Missing 'Room Revenue (Taxable)' ledger", checkout_id)
         return None
     
     if food_total > 0 and not food_revenue:
-        print(f"[WARNING] Cannot create journal entry for checkout {checkout_id}: Missing 'Food Revenue (Taxable)' ledger")
+        logger.warning("Cannot create journal entry for checkout %s: Missing 'Food Revenue (Taxable)' ledger", checkout_id)
         return None
         
     if service_total > 0 and not service_revenue:
         # Try finding generic service revenue if specific one missing
         service_revenue = find_ledger_by_name(db, "Service Revenue", "Service")
         if not service_revenue:
-            print(f"[WARNING] Cannot create journal entry for checkout {checkout_id}: Missing 'Service Revenue (Taxable)' ledger")
+            logger.warning("Cannot create journal entry for checkout %s: Missing 'Service Revenue (Taxable)' ledger", checkout_id)
             return None
 
     if package_total > 0 and not package_revenue:
          # Try finding generic package revenue
         package_revenue = find_ledger_by_name(db, "Package Revenue", "Booking")
         if not package_revenue:
-             print(f"[WARNING] Cannot create journal entry for checkout {checkout_id}: Missing 'Package Revenue (Taxable)' ledger")
+             logger.warning("Cannot create journal entry for checkout %s: Missing 'Package Revenue (Taxable)' ledger", checkout_id)
              return None
 
     if tax_amount > 0 and (not output_cgst or not output_sgst):
-        print(f"[WARNING] Cannot create journal entry for checkout {checkout_id}: Missing Tax ledgers (Output CGST/SGST)")
+        logger.warning("Cannot create journal entry for checkout %s: Missing Tax ledgers (Output CGST/SGST)", checkout_id)
         return None
     
     # Determine payment ledger (Bank Account or Cash)
@@ -714,7 +718,7 @@ def create_complete_checkout_journal_entry(
             payment_ledger = find_ledger_by_name(db, "Cash in Hand", "Asset")
     
     if not payment_ledger:
-        print(f"[WARNING] Cannot create journal entry for checkout {checkout_id}: Payment ledger (Bank Account or Cash) not found. Please set up Chart of Accounts.")
+        logger.warning("Cannot create journal entry for checkout %s: Payment ledger (Bank Account or Cash) not found. Please set up Chart of Accounts.", checkout_id)
         return None  # Return None instead of raising error
     
     # Calculate base amounts (excluding GST from totals)
@@ -811,14 +815,14 @@ def create_complete_checkout_journal_entry(
             ))
         else:
             # Fallback if advance ledger missing: reduce debit from bank? No, creates imbalance.
-            print(f"[WARNING] Advance ledger missing for checkout {checkout_id}. Journal Entry will be unbalanced!")
+            logger.warning("Advance ledger missing for checkout %s. Journal Entry will be unbalanced!", checkout_id)
             # Note: We continue, but validation will strictly fail below unless we do something.
             # If we strictly enforce balance, this will raise ValueError.
             pass
     
     # Validate that we have at least one line
     if not lines:
-        print(f"[WARNING] No journal entry lines to create for checkout {checkout_id}")
+        logger.warning("No journal entry lines to create for checkout %s", checkout_id)
         return None
     
     # Validate balance before creating entry
@@ -832,7 +836,7 @@ def create_complete_checkout_journal_entry(
             f"Debits: ₹{total_debits:.2f}, Credits: ₹{total_credits:.2f}, "
             f"Difference: ₹{abs(total_debits - total_credits):.2f}"
         )
-        print(f"[ERROR] {error_msg}")
+        logger.error("%s", error_msg)
         raise ValueError(error_msg)
     
     entry = JournalEntryCreate(
@@ -845,17 +849,15 @@ def create_complete_checkout_journal_entry(
     )
     
     try:
-        journal_entry = create_journal_entry(db, entry, created_by)
-        print(f"[INFO] Journal entry {journal_entry.entry_number} created successfully for checkout {checkout_id} (Balanced: Debits=₹{total_debits:.2f}, Credits=₹{total_credits:.2f})")
+        journal_entry = create_journal_entry(db, entry, created_by, commit=commit)
+        logger.info("Journal entry %s created successfully for checkout %s (Balanced: Debits=₹%.2f, Credits=₹%.2f)", journal_entry.entry_number, checkout_id, total_debits, total_credits)
         return journal_entry.id
     except ValueError as ve:
         # Re-raise validation errors
-        print(f"[ERROR] Balance validation failed for checkout {checkout_id}: {str(ve)}")
+        logger.error("Balance validation failed for checkout %s: %s", checkout_id, ve)
         raise
     except Exception as e:
-        print(f"[WARNING] Error creating journal entry for checkout {checkout_id}: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.warning("Error creating journal entry for checkout %s: %s", checkout_id, e, exc_info=True)
         return None
 
 
@@ -1049,7 +1051,7 @@ def create_rcm_journal_entry(
             f"Debits: ₹{total_debits:.2f}, Credits: ₹{total_credits:.2f}, "
             f"Difference: ₹{abs(total_debits - total_credits):.2f}"
         )
-        print(f"[ERROR] {error_msg}")
+        logger.error("%s", error_msg)
         raise ValueError(error_msg)
     
     entry = JournalEntryCreate(
@@ -1063,12 +1065,12 @@ def create_rcm_journal_entry(
     
     try:
         journal_entry = create_journal_entry(db, entry, created_by)
-        print(f"[INFO] RCM journal entry {journal_entry.entry_number} created successfully (Balanced: Debits=₹{total_debits:.2f}, Credits=₹{total_credits:.2f})")
+        logger.info("RCM journal entry %s created successfully (Balanced: Debits=₹%.2f, Credits=₹%.2f)", journal_entry.entry_number, total_debits, total_credits)
         return journal_entry.id
     except ValueError as ve:
-        print(f"[ERROR] Balance validation failed for RCM {ref_type} {ref_id}: {str(ve)}")
+        logger.error("Balance validation failed for RCM %s %s: %s", ref_type, ref_id, ve)
         raise
     except Exception as e:
-        print(f"[ERROR] Error creating RCM journal entry: {str(e)}")
+        logger.error("Error creating RCM journal entry: %s", e)
         raise
 
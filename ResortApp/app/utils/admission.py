@@ -0,0 +1,328 @@
+"""
+Admission control for expensive report endpoints.
+
+A handful of people opening the GST master summary, the comprehensive account
+report or the all-time dashboard at once can take most of a worker's DB pool
+and leave check-in / checkout waiting on pool_timeout. Routes tagged heavy
+therefore go through a cost-class limiter before their handler runs:
+
+  * per worker, heavy requests may hold at most ADMISSION_HEAVY_WORKER_LIMIT
+    units (one unit ~ one DB connection; the streamed export weighs as many
+    units as it opens connections);
+  * across the gunicorn workers of a host, at most ADMISSION_HEAVY_GLOBAL_LIMIT
+    units, taken as flock()ed slot files in ADMISSION_LOCK_DIR (the kernel
+    drops a dead worker's locks);
+  * a heavy request only starts while the worker's pool keeps
+    ADMISSION_INTERACTIVE_RESERVED_CONNECTIONS free for everything else.
+
+A request that cannot start waits, up to ADMISSION_HEAVY_MAX_WAIT seconds and
+behind at most ADMISSION_HEAVY_MAX_QUEUE others, then gets 429 with a
+Retry-After estimated from recent heavy run times. Front-desk routes
+(INTERACTIVE_PREFIXES) are never queued; they are counted separately in the
+admission_* metrics next to the heavy queue depth.
+
+Tag a route with the dependency (it authenticates first, so anonymous callers
+never take a slot):
+
+    @router.get("/master-summary", dependencies=[Depends(admit_heavy())])
+
+Admitted slots are released by AdmissionMiddleware once the response has been
+sent, so a StreamingResponse keeps its slot until the last chunk.
+"""
+import asyncio
+import logging
+import math
+import os
+import tempfile
+import time
+from typing import Callable, List, Optional
+
+from fastapi import Depends, HTTPException, Request
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.database import POOL_MAX_OVERFLOW, POOL_SIZE, engine
+from app.utils import metrics
+from app.utils.auth import get_current_user
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - no flock on Windows; limits stay per worker
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+def _str_to_bool(value: str) -> bool:
+    return str(value).strip().lower() in ("1", "true", "yes", "on")
+
+
+ADMISSION_ENABLED = _str_to_bool(os.getenv("ADMISSION_ENABLED", "true"))
+INTERACTIVE_RESERVED_CONNECTIONS = int(os.getenv("ADMISSION_INTERACTIVE_RESERVED_CONNECTIONS", "10"))
+# Never more than the pool can give heavy requests after the interactive reserve
+HEAVY_WORKER_LIMIT = max(1, min(int(os.getenv("ADMISSION_HEAVY_WORKER_LIMIT", "4")),
+                                POOL_SIZE + POOL_MAX_OVERFLOW - INTERACTIVE_RESERVED_CONNECTIONS))
+HEAVY_GLOBAL_LIMIT = int(os.getenv("ADMISSION_HEAVY_GLOBAL_LIMIT", "8"))  # 0 = per-worker limit only
+HEAVY_MAX_QUEUE = int(os.getenv("ADMISSION_HEAVY_MAX_QUEUE", "16"))
+HEAVY_MAX_WAIT = float(os.getenv("ADMISSION_HEAVY_MAX_WAIT", "20"))
+ADMISSION_LOCK_DIR = os.getenv("ADMISSION_LOCK_DIR") or os.path.join(
+    "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir(), "orchid_admission"
+)
+INTERACTIVE_PREFIXES = tuple(
+    p.strip() for p in os.getenv(
+        "ADMISSION_INTERACTIVE_PREFIXES",
+        "/api/auth,/api/bookings,/api/bill,/api/rooms,/api/food-orders,/api/service-requests,/api/payments",
+    ).split(",") if p.strip()
+)
+
+HEAVY = "heavy"
+INTERACTIVE = "interactive"
+# Host slots and the pool are not signalled on release by other workers; re-check this often
+POLL_INTERVAL = 0.1
+# Scope key for the tickets AdmissionMiddleware releases after the response
+TICKETS_SCOPE_KEY = "admission.tickets"
+
+
+class HostSlots:
+    """`count` slot files shared by every worker on the host; a held flock() is a taken slot"""
+
+    def __init__(self, name: str, count: int, directory: str):
+        self.name = name
+        self.count = count
+        self.directory = directory
+        self._pid = None
+        self._fds: List[int] = []
+        self._held = set()
+
+    def _slot_fds(self) -> List[int]:
+        # Descriptors inherited over fork share their lock with the parent: open our own
+        if self._pid != os.getpid():
+            os.makedirs(self.directory, exist_ok=True)
+            self._fds = [
+                os.open(os.path.join(self.directory, f"{self.name}.{n}.lock"), os.O_RDWR | os.O_CREAT, 0o666)
+                for n in range(self.count)
+            ]
+            self._held = set()
+            self._pid = os.getpid()
+        return self._fds
+
+    def try_acquire(self, weight: int) -> Optional[List[int]]:
+        """Take `weight` free slots without blocking; None if not enough are free"""
+        if fcntl is None or self.count <= 0:
+            return []
+        try:
+            fds = self._slot_fds()
+        except OSError as e:
+            logger.warning("Admission slots unavailable in %s (%s); limiting per worker only", self.directory, e)
+            self.count = 0
+            return []
+        weight = min(weight, self.count)
+        taken = []
+        for fd in fds:
+            if fd in self._held:
+                continue
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                continue
+            taken.append(fd)
+            self._held.add(fd)
+            if len(taken) == weight:
+                return taken
+        self.release(taken)
+        return None
+
+    def release(self, fds: List[int]):
+        for fd in fds:
+            self._held.discard(fd)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            except OSError:
+                pass
+
+
+class AdmissionRejected(HTTPException):
+    def __init__(self, cost_class: str, retry_after: int):
+        super().__init__(
+            status_code=429,
+            detail=f"Too many {cost_class} requests in progress; retry in {retry_after} seconds",
+            headers={"Retry-After": str(retry_after)},
+        )
+
+
+class Ticket:
+    """An admitted request's share of a limiter; release() is idempotent"""
+
+    __slots__ = ("limiter", "weight", "slots", "started", "released")
+
+    def __init__(self, limiter: "CostClassLimiter", weight: int, slots: List[int]):
+        self.limiter = limiter
+        self.weight = weight
+        self.slots = slots
+        self.started = time.monotonic()
+        self.released = False
+
+    def release(self):
+        if not self.released:
+            self.released = True
+            self.limiter._release(self)
+
+
+class CostClassLimiter:
+    """
+    Weighted concurrency limit for one cost class in this worker, optionally
+    bounded host-wide by HostSlots and by the pool headroom left for interactive
+    requests. Waiters are woken on local releases and poll for the rest.
+    """
+
+    def __init__(self, cost_class: str, worker_limit: int, max_queue: int, max_wait: float,
+                 host_slots: Optional[HostSlots] = None, reserved_connections: int = 0):
+        self.cost_class = cost_class
+        self.worker_limit = worker_limit
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.host_slots = host_slots
+        self.reserved_connections = reserved_connections
+        self.in_use = 0
+        self.waiting = 0
+        self._released: Optional[asyncio.Event] = None
+        # Smoothed time a request holds its slot, for Retry-After (until measured: a few seconds)
+        self._avg_hold = min(max_wait, 5.0)
+
+    def _pool_headroom(self, weight: int) -> bool:
+        if self.reserved_connections <= 0:
+            return True
+        try:
+            checked_out = engine.pool.checkedout()
+        except Exception:
+            # Non-queue pools (e.g. StaticPool in tests) don't expose this
+            return True
+        return checked_out + weight <= POOL_SIZE + POOL_MAX_OVERFLOW - self.reserved_connections
+
+    def _try_admit(self, weight: int) -> Optional[Ticket]:
+        if self.in_use + weight > self.worker_limit or not self._pool_headroom(weight):
+            return None
+        slots = self.host_slots.try_acquire(weight) if self.host_slots is not None else []
+        if slots is None:
+            return None
+        self.in_use += weight
+        return Ticket(self, weight, slots)
+
+    def retry_after(self) -> int:
+        queued_rounds = (self.waiting + 1) / max(self.worker_limit, 1)
+        return max(1, min(120, math.ceil(self._avg_hold * queued_rounds)))
+
+    def _reject(self, reason: str):
+        metrics.record_admission_rejected(self.cost_class, reason)
+        retry_after = self.retry_after()
+        logger.warning("Admission: %s request rejected (%s), %d running, %d queued, Retry-After %ds",
+                       self.cost_class, reason, self.in_use, self.waiting, retry_after)
+        raise AdmissionRejected(self.cost_class, retry_after)
+
+    async def admit(self, weight: int = 1) -> Ticket:
+        """Wait for capacity (up to max_wait) and return a Ticket; raises AdmissionRejected (429)"""
+        weight = max(1, min(weight, self.worker_limit))
+        ticket = self._try_admit(weight) if not self.waiting else None
+        if ticket is not None:
+            metrics.observe_admission_wait(self.cost_class, 0.0)
+            metrics.admission_in_flight_changed(self.cost_class, 1)
+            return ticket
+        if self.waiting >= self.max_queue:
+            self._reject("queue_full")
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        deadline = start + self.max_wait
+        self.waiting += 1
+        metrics.admission_queue_changed(self.cost_class, 1)
+        try:
+            while True:
+                ticket = self._try_admit(weight)
+                if ticket is not None:
+                    break
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    self._reject("timeout")
+                if self._released is None:
+                    self._released = asyncio.Event()
+                try:
+                    await asyncio.wait_for(self._released.wait(), min(remaining, POLL_INTERVAL))
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self.waiting -= 1
+            metrics.admission_queue_changed(self.cost_class, -1)
+        metrics.observe_admission_wait(self.cost_class, loop.time() - start)
+        metrics.admission_in_flight_changed(self.cost_class, 1)
+        return ticket
+
+    def _release(self, ticket: Ticket):
+        self.in_use -= ticket.weight
+        if self.host_slots is not None:
+            self.host_slots.release(ticket.slots)
+        held = time.monotonic() - ticket.started
+        self._avg_hold = 0.8 * self._avg_hold + 0.2 * held
+        metrics.admission_in_flight_changed(self.cost_class, -1)
+        # Wake every waiter; the ones that still don't fit go back to waiting
+        if self._released is not None:
+            self._released.set()
+            self._released = None
+
+
+heavy_limiter = CostClassLimiter(
+    HEAVY,
+    worker_limit=HEAVY_WORKER_LIMIT,
+    max_queue=HEAVY_MAX_QUEUE,
+    max_wait=HEAVY_MAX_WAIT,
+    host_slots=HostSlots(HEAVY, HEAVY_GLOBAL_LIMIT, ADMISSION_LOCK_DIR) if HEAVY_GLOBAL_LIMIT > 0 else None,
+    reserved_connections=INTERACTIVE_RESERVED_CONNECTIONS,
+)
+
+
+def admit_heavy(weight: int = 1, when: Optional[Callable[[Request], bool]] = None):
+    """
+    Route dependency admitting the request through heavy_limiter.
+
+    `weight` is the number of DB connections the handler holds at once; `when`
+    limits admission control to the requests it returns True for (e.g. only
+    the all-time dashboard period).
+    """
+    async def dependency(request: Request, current_user=Depends(get_current_user)):
+        if not ADMISSION_ENABLED or (when is not None and not when(request)):
+            yield
+            return
+        ticket = await heavy_limiter.admit(weight)
+        tickets = request.scope.get(TICKETS_SCOPE_KEY)
+        if tickets is not None:
+            # Released by AdmissionMiddleware after the whole response was sent
+            tickets.append(ticket)
+            yield
+            return
+        try:
+            yield
+        finally:
+            ticket.release()
+
+    return dependency
+
+
+class AdmissionMiddleware:
+    """Releases admitted tickets after the response and tracks interactive requests in flight"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        tickets = scope[TICKETS_SCOPE_KEY] = []
+        interactive = scope["path"].startswith(INTERACTIVE_PREFIXES)
+        if interactive:
+            metrics.admission_in_flight_changed(INTERACTIVE, 1)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            for ticket in tickets:
+                ticket.release()
+            if interactive:
+                metrics.admission_in_flight_changed(INTERACTIVE, -1)
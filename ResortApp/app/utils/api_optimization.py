@@ -1,9 +1,10 @@
 """
 API Optimization Utilities for Low Network Performance
 """
-from typing import Optional, Callable
+from typing import Dict, Iterable, List, Optional, Callable, Sequence, Union
 from functools import wraps
-from fastapi import Query, Response
+from fastapi import HTTPException, Query, Response
+from pydantic import BaseModel
 from fastapi.responses import JSONResponse
 
 # Standard limits for low network optimization
@@ -33,7 +34,16 @@ def get_optimized_query_params(
     optimized_limit = optimize_limit(limit, max_limit)
     return (skip, optimized_limit)
 
-# Field selection helper (for future use)
+def no_store(response: Response):
+    """
+    Dependency for polled endpoints (job status, sync feeds, queues): PerformanceMiddleware
+    gives GETs without a Cache-Control of their own a public max-age, so pollers could be served stale copies
+    """
+    response.headers["Cache-Control"] = "no-store"
+
+# Sparse fieldsets: ?fields=id,room_number,status
+FIELDS_QUERY_DESCRIPTION = "Comma-separated response fields to return (default: all)"
+
 def parse_fields(fields: Optional[str]) -> Optional[list]:
     """
     Parse comma-separated field list
@@ -43,6 +53,57 @@ def parse_fields(fields: Optional[str]) -> Optional[list]:
         return None
     return [f.strip() for f in fields.split(",") if f.strip()]
 
+def select_fields(fields: Optional[str], allowed: Union[type, Iterable[str]]) -> Optional[List[str]]:
+    """
+    Validated sparse fieldset from a `fields` query parameter.
+
+    allowed: the response model (its field names) or the names themselves.
+    Returns None when no fields were asked for (full rows), else the requested
+    names in request order without duplicates. Unknown names are a 400 that
+    lists the valid ones.
+    """
+    requested = parse_fields(fields)
+    if not requested:
+        return None
+    if isinstance(allowed, type) and issubclass(allowed, BaseModel):
+        allowed = allowed.model_fields
+    allowed = list(allowed)
+    unknown = [f for f in requested if f not in allowed]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(unknown)}. Available: {', '.join(allowed)}"
+        )
+    return list(dict.fromkeys(requested))
+
+def wants(fields: Optional[Sequence[str]], *names: str) -> bool:
+    """True if the fieldset (None = every field) includes any of `names`"""
+    return fields is None or any(name in fields for name in names)
+
+def sparse_columns(fields: Optional[Sequence[str]], field_columns: Dict[str, tuple], always: tuple = ()) -> list:
+    """
+    SQL columns to select for a fieldset: `always` plus the columns of each wanted
+    field (every field when fields is None), de-duplicated in order.
+
+    field_columns: response field -> tuple of column expressions it is built from
+    (several fields may share a column, computed fields list their inputs);
+    a column shared by several fields must be the same object in each tuple.
+    """
+    columns = {}
+    for column in always:
+        columns.setdefault(id(column), column)
+    for name, needed in field_columns.items():
+        if fields is None or name in fields:
+            for column in needed:
+                columns.setdefault(id(column), column)
+    return list(columns.values())
+
+def trim_fields(rows: List[dict], fields: Optional[Sequence[str]]) -> List[dict]:
+    """Rows cut down to the fieldset (unchanged when fields is None); keys a row lacks are skipped"""
+    if fields is None:
+        return rows
+    return [{name: row[name] for name in fields if name in row} for row in rows]
+
 
 def apply_api_optimizations(func: Callable) -> Callable:
     """
@@ -1,18 +1,46 @@
+from collections import OrderedDict
+from dataclasses import dataclass
 from datetime import datetime, timedelta
+from typing import Optional
 from jose import JWTError, jwt
 import bcrypt
-from app.models.user import User
-from sqlalchemy.orm import Session, joinedload
+from app.models.user import User, Role
+from sqlalchemy import select
+from sqlalchemy.orm import Session
 from fastapi import Depends, HTTPException, status
-from app.database import SessionLocal
+from app.database import get_db
+from app.utils import events
 from fastapi.security import OAuth2PasswordBearer
+import json
 import os
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _str_to_bool(value: str) -> bool:
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
 
 # ENV
 SECRET_KEY = os.getenv("SECRET_KEY", "dev-secret-key-change-in-production")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "24"))
 
+# Authenticated users are cached per worker (see PrincipalCache)
+AUTH_PRINCIPAL_CACHE_ENABLED = _str_to_bool(os.getenv("AUTH_PRINCIPAL_CACHE_ENABLED", "true"))
+# Upper bound on how long a change made on another worker can go unnoticed without the event bus
+AUTH_PRINCIPAL_TTL = float(os.getenv("AUTH_PRINCIPAL_TTL", "60"))
+AUTH_PRINCIPAL_CACHE_SIZE = 4096
+# Access token claim holding the user's token_version at issue time (absent in older tokens: 0)
+TOKEN_VERSION_CLAIM = "tv"
+# Claim restricting a token to one purpose (e.g. "events"); scoped tokens are refused everywhere else
+TOKEN_SCOPE_CLAIM = "scope"
+# session.info key holding the authenticated user's id, so session hooks can attribute writes
+SESSION_USER_KEY = "user_id"
+
 # Removed pwd_context - using bcrypt directly
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
@@ -53,68 +81,243 @@ def decode_token(token: str):
     return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+def create_scoped_token(principal, scope: str, expires_delta: timedelta) -> str:
+    """Short-lived token only accepted where authenticate_token() is called with the same scope"""
+    return create_access_token(
+        {"user_id": principal.id, TOKEN_VERSION_CLAIM: principal.token_version, TOKEN_SCOPE_CLAIM: scope},
+        expires_delta=expires_delta,
+    )
+
+
+# ------------------------------------------------------------ principals
+
+@dataclass(frozen=True)
+class PrincipalRole:
+    id: int
+    name: str
+    permissions: Optional[str] = None
+
+    @property
+    def permissions_list(self):
+        """Convert permissions JSON string to list (as Role.permissions_list)"""
+        if self.permissions is None:
+            return []
+        try:
+            return json.loads(self.permissions)
+        except (json.JSONDecodeError, TypeError):
+            return []
+
+
+@dataclass(frozen=True)
+class Principal:
+    """
+    The authenticated user as returned by get_current_user: the user's columns
+    and role, detached from any session so one instance can serve concurrent
+    requests. Handlers read it like the User it stands for (id, name, email,
+    role.name, ...); load the User through the handler's session to change it.
+    """
+    id: int
+    name: Optional[str]
+    email: Optional[str]
+    phone: Optional[str]
+    is_active: Optional[bool]
+    role_id: Optional[int]
+    token_version: int
+    role: Optional[PrincipalRole]
+
+
+def load_principal(db: Session, user_id: int) -> Optional[Principal]:
+    """User and role in one projected query; None if the user does not exist"""
+    row = db.execute(
+        select(
+            User.id, User.name, User.email, User.phone, User.is_active, User.role_id, User.token_version,
+            Role.name.label("role_name"), Role.permissions.label("role_permissions"),
+        )
+        .outerjoin(Role, User.role_id == Role.id)
+        .where(User.id == user_id)
+    ).first()
+    if row is None:
+        return None
+    role = None
+    if row.role_id is not None and row.role_name is not None:
+        role = PrincipalRole(id=row.role_id, name=row.role_name, permissions=row.role_permissions)
+    return Principal(
+        id=row.id, name=row.name, email=row.email, phone=row.phone, is_active=row.is_active,
+        role_id=row.role_id, token_version=row.token_version or 0, role=role,
+    )
+
+
+class PrincipalCache:
+    """
+    Per-worker cache of authenticated users: user id -> (principal, expiry).
+
+    Entries hold the user's token_version, so a token issued before the last
+    bump is rejected without a query. Committed changes to a user drop that
+    user's entry and any role change drops them all: through the event bus
+    (app.utils.events, every worker on PostgreSQL) and, for changes made
+    through this module, directly. Entries also expire after
+    AUTH_PRINCIPAL_TTL seconds, which bounds staleness for writes the event
+    bus does not see (raw SQL, EVENTS_ENABLED=false with several workers).
+    """
+
+    def __init__(self, ttl: float = AUTH_PRINCIPAL_TTL, max_size: int = AUTH_PRINCIPAL_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: "OrderedDict[int, tuple]" = OrderedDict()
+        # Bumped by every invalidation: a load that raced one is not stored
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._registered = False
+
+    def _register(self):
+        if not self._registered:
+            events.add_sink(self._on_events)
+            self._registered = True
+
+    def _on_events(self, batch):
+        for evt in batch:
+            topic = evt.get("topic")
+            if topic == "roles" or (topic == "users" and evt.get("id") is None):
+                self.invalidate()
+                return
+            if topic == "users":
+                self.invalidate(evt["id"])
+
+    def get(self, user_id: int) -> Optional[Principal]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            if entry[1] <= time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return entry[0]
+
+    def generation(self) -> int:
+        return self._generation
+
+    def put(self, principal: Principal, generation: int):
+        """Store a principal loaded after generation() returned `generation`"""
+        self._register()
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._entries[principal.id] = (principal, time.monotonic() + self.ttl)
+            self._entries.move_to_end(principal.id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: Optional[int] = None):
+        """Drop one user's entry, or every entry"""
+        with self._lock:
+            self._generation += 1
+            if user_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(user_id, None)
+
+
+principal_cache = PrincipalCache()
+
+
+def _fresh_principal(db: Session, user_id: int) -> Optional[Principal]:
+    generation = principal_cache.generation()
+    principal = load_principal(db, user_id)
+    # A user without a role is refused on every request; only cache usable principals
+    if principal is not None and principal.role is not None and AUTH_PRINCIPAL_CACHE_ENABLED:
+        principal_cache.put(principal, generation)
+    return principal
+
+
+def revoke_tokens(db: Session, user_id: int) -> Optional[int]:
+    """
+    Bump the user's token_version and commit: every access token issued to the
+    user so far stops working (all devices). Returns the new version, or None
+    if the user does not exist.
+    """
+    user = db.get(User, user_id)
+    if user is None:
+        return None
+    user.token_version = (user.token_version or 0) + 1
+    db.commit()
+    principal_cache.invalidate(user_id)
+    return user.token_version
 
 
 def get_current_user(
     token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
 ):
+    """
+    Principal for the request's bearer token.
+
+    Served from principal_cache when possible, so a request with a known token
+    runs no query; on a miss the user is loaded through the request's own
+    session (get_db is shared with the handler). Tokens whose version claim is
+    older than the user's token_version are rejected, and so are scoped tokens.
+    """
+    return authenticate_token(token, db)
+
+
+def authenticate_token(token: Optional[str], db: Session, scope: Optional[str] = None):
+    """Principal for `token`, which must carry exactly `scope` (None: an ordinary access token)"""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
     try:
-        # Debug Logging
-        # print(f"[AUTH DEBUG] Verifying token: {token[:10]}...")
-        
         # Check if token is None or empty
         if not token:
-            print("[AUTH DEBUG] Token is missing")
+            logger.debug("Token is missing")
             raise credentials_exception
         
         payload = decode_token(token)
-        # print(f"[AUTH DEBUG] Decoded payload: {payload}")
         
         user_id: int = payload.get("user_id")
         if user_id is None:
-            print("[AUTH DEBUG] user_id missing in payload")
+            logger.debug("user_id missing in payload")
+            raise credentials_exception
+        token_version = int(payload.get(TOKEN_VERSION_CLAIM, 0))
+        if payload.get(TOKEN_SCOPE_CLAIM) != scope:
+            logger.debug("Token scope %s not accepted here", payload.get(TOKEN_SCOPE_CLAIM))
             raise credentials_exception
             
     except HTTPException:
         raise
     except JWTError as e:
-        print(f"[AUTH DEBUG] JWT Error: {e}")
+        logger.error("JWT Error: %s", e)
         raise credentials_exception
     except Exception as e:
-        import traceback
-        print(f"[AUTH DEBUG] Token Decode Error: {str(e)}\n{traceback.format_exc()}")
+        logger.error("Token Decode Error: %s", e, exc_info=True)
         raise credentials_exception
 
     try:
-        user = db.query(User).options(joinedload(User.role)).filter(User.id == user_id).first()
-        if user is None:
-            print(f"[AUTH DEBUG] User ID {user_id} not found in database")
+        principal = principal_cache.get(user_id) if AUTH_PRINCIPAL_CACHE_ENABLED else None
+        # A token newer than the cached version: the cache missed a bump, reload
+        if principal is None or principal.token_version < token_version:
+            principal = _fresh_principal(db, user_id)
+        if principal is None:
+            logger.debug("User ID %s not found in database", user_id)
+            raise credentials_exception
+
+        if token_version != principal.token_version:
+            logger.debug("Token version %s revoked for user %s (current %s)",
+                         token_version, user_id, principal.token_version)
             raise credentials_exception
             
-        if user.role is None:
-            print(f"[AUTH DEBUG] User {user_id} has no role assigned")
+        if principal.role is None:
+            logger.debug("User %s has no role assigned", user_id)
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="User role not found. Please contact administrator."
             )
-            
-        # print(f"[AUTH DEBUG] User verified: {user.email}")
-        return user
+
+        db.info[SESSION_USER_KEY] = principal.id
+        return principal
         
     except HTTPException:
         raise
     except Exception as e:
-        import traceback
-        print(f"[AUTH DEBUG] DB Error during auth: {str(e)}\n{traceback.format_exc()}")
+        logger.error("DB Error during auth: %s", e, exc_info=True)
         raise credentials_exception
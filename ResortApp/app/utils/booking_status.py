@@ -0,0 +1,40 @@
+"""
+Canonical booking / package-booking status values.
+
+Statuses used to be written as "checked_in", "Checked-in", "checked out", ...
+and every query had to list the variants (or wrap the column in lower(), which
+no index can serve). The bookings tables now only hold the values below; the
+models normalize on assignment and a CHECK constraint enforces the set.
+"""
+from typing import Optional
+
+BOOKED = "booked"
+CHECKED_IN = "checked-in"
+CHECKED_OUT = "checked-out"
+CANCELLED = "cancelled"
+NO_SHOW = "no-show"
+
+BOOKING_STATUSES = (BOOKED, CHECKED_IN, CHECKED_OUT, CANCELLED, NO_SHOW)
+
+# Stays that currently hold a room
+ACTIVE_BOOKING_STATUSES = (BOOKED, CHECKED_IN)
+
+_ALIASES = {
+    "checkedin": CHECKED_IN,
+    "checkedout": CHECKED_OUT,
+    "canceled": CANCELLED,
+    "noshow": NO_SHOW,
+}
+
+
+def normalize_booking_status(value: Optional[str]) -> Optional[str]:
+    """'Checked_In' / 'checked in' / 'checkedin' -> 'checked-in'; unknown values are only trimmed and lower-cased"""
+    if value is None:
+        return None
+    status = str(value).strip().lower().replace("_", "-").replace(" ", "-")
+    return _ALIASES.get(status.replace("-", ""), status)
+
+
+def sql_in_list(statuses=BOOKING_STATUSES) -> str:
+    """Quoted SQL list of statuses, for CHECK constraints and partial-index predicates"""
+    return ", ".join(f"'{s}'" for s in statuses)
@@ -0,0 +1,37 @@
+"""
+Explicit notification of ORM bulk writes.
+
+query.update() / query.delete() (and Core update()/delete() through a Session)
+skip the flush, so the Session listeners that follow row changes (domain events,
+the sync change log, read-replica routing, report cache invalidation, the
+occupancy map) never see them. Call bulk_written() after such a statement on
+one of their models:
+
+    db.query(Room).filter(Room.id.in_(room_ids)).update({"status": "Available"}, synchronize_session=False)
+    bulk_written(db, Room)
+
+Those modules register an observer here when their listeners are installed.
+A Session-wide do_orm_execute hook is deliberately not used for this: with one
+installed, yield_per queries with selectinload sub-loads (the streamed report
+export) fail.
+"""
+from typing import Callable, Type
+
+from sqlalchemy.orm import Session
+
+UPDATED = "updated"
+DELETED = "deleted"
+
+# Callbacks receiving (session, model class, UPDATED | DELETED)
+bulk_write_observers = []
+
+
+def add_bulk_write_observer(observer: Callable[[Session, Type, str], None]):
+    if observer not in bulk_write_observers:
+        bulk_write_observers.append(observer)
+
+
+def bulk_written(db: Session, model: Type, op: str = UPDATED):
+    """Report a bulk UPDATE (op=UPDATED) or DELETE (op=DELETED) of `model` rows in the session's transaction"""
+    for observer in bulk_write_observers:
+        observer(db, model, op)
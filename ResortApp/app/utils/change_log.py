@@ -0,0 +1,257 @@
+"""
+Change log for delta sync (GET /sync?since=<cursor>).
+
+Every ORM flush that inserts, updates or deletes a synced model appends one
+change_log row per affected record, on the flush's own connection, so the
+entry commits or rolls back together with the mutation itself. Child rows
+(booking rooms, food order items) are logged as an update of their parent.
+The row id is a monotonic version: clients keep the highest id they have
+seen as their cursor and ask only for entries after it.
+
+Ids are handed out at insert time but become visible at commit, so a page may
+find a gap: an id of a transaction still in flight (its entries are about to
+appear) or of one that rolled back. A page stops before a gap until it is
+known to be closed, rather than move the cursor past entries not yet visible:
+- SQLite has one writer at a time, so a gap followed by a visible entry is
+  always closed.
+- On Postgres each entry records txid_horizon, the next transaction id right
+  after its id was taken. Whatever transaction took a lower id had an xid
+  below that horizon, so the gap before an entry is closed once the reader's
+  snapshot xmin (its oldest running transaction) has reached the horizon.
+
+Bulk query.update() / query.delete() on a synced model skips the flush and
+cannot tell which rows it touched: the call site reports it with
+bulk_writes.bulk_written(), which logs a single BULK entry, and clients
+refetch that entity in full.
+"""
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event, func, inspect, insert, text, update
+from sqlalchemy.orm import Session
+
+from app.models.change_log import ChangeLogEntry, CREATED, UPDATED, DELETED, BULK
+from app.utils.bulk_writes import add_bulk_write_observer
+
+logger = logging.getLogger(__name__)
+
+# model name -> (sync entity, parent foreign key for child rows)
+_SYNCED = {
+    "Booking": ("bookings", None),
+    "BookingRoom": ("bookings", "booking_id"),
+    "Room": ("rooms", None),
+    "FoodOrder": ("food_orders", None),
+    "FoodOrderItem": ("food_orders", "order_id"),
+    "ServiceRequest": ("service_requests", None),
+}
+SYNC_ENTITIES = tuple(sorted({entity for entity, _ in _SYNCED.values()}))
+
+# Entries returned per sync call; the client asks again while has_more is true
+SYNC_PAGE_SIZE = 500
+# Entries written before txid_horizon existed (Postgres): a gap before an entry
+# younger than this is treated as in flight
+SYNC_GAP_SECONDS = int(os.getenv("SYNC_GAP_SECONDS", "10"))
+CHANGE_LOG_RETENTION_DAYS = int(os.getenv("CHANGE_LOG_RETENTION_DAYS", "7"))
+
+
+# ---------------------------------------------------------------- capture
+
+def _record(changes: Dict[Tuple[str, int], str], entity: str, entity_id, op: str):
+    if entity_id is None:
+        return
+    key = (entity, entity_id)
+    # created/deleted outrank an update of the same record within one flush
+    if key not in changes or op != UPDATED:
+        changes[key] = op
+
+
+def _log_flush(session, flush_context):
+    changes: Dict[Tuple[str, int], str] = {}
+    for op, objects in ((CREATED, session.new), (UPDATED, session.dirty), (DELETED, session.deleted)):
+        for obj in objects:
+            synced = _SYNCED.get(type(obj).__name__)
+            if synced is None:
+                continue
+            if op == UPDATED and not session.is_modified(obj, include_collections=False):
+                continue
+            entity, parent_key = synced
+            values = inspect(obj).dict
+            if parent_key is None:
+                _record(changes, entity, values.get("id"), op)
+            else:
+                _record(changes, entity, values.get(parent_key), UPDATED)
+    if changes:
+        _write_entries(session, [
+            {"entity": entity, "entity_id": entity_id, "op": op, "changed_at": datetime.utcnow()}
+            for (entity, entity_id), op in changes.items()
+        ])
+
+
+def _log_bulk(session, model, op):
+    synced = _SYNCED.get(model.__name__)
+    if synced is None:
+        return
+    # The bulk statement may have matched no rows and so not given the transaction an xid yet
+    _write_entries(session, [{"entity": synced[0], "entity_id": None, "op": BULK, "changed_at": datetime.utcnow()}],
+                   assign_xid=True)
+
+
+def _write_entries(session, rows, assign_xid: bool = False):
+    conn = session.connection()
+    table = ChangeLogEntry.__table__
+    if conn.dialect.name != "postgresql":
+        conn.execute(insert(table), rows)
+        return
+    # The transaction's xid must predate its ids for the horizons of later entries to cover it;
+    # a flush that logged changes has written rows, so it already has one
+    if assign_xid:
+        conn.execute(text("SELECT txid_current()"))
+    ids = conn.execute(insert(table).returning(table.c.id), rows).scalars().all()
+    # A statement of its own: its snapshot is taken after the ids above were handed out
+    conn.execute(
+        update(table).where(table.c.id.in_(ids))
+        .values(txid_horizon=func.txid_snapshot_xmax(func.txid_current_snapshot()))
+    )
+
+
+_listeners_installed = False
+
+
+def install_change_log_listeners():
+    """Hook every ORM Session so mutations of synced models are written to the change log"""
+    global _listeners_installed
+    if _listeners_installed:
+        return
+    event.listen(Session, "after_flush", _log_flush)
+    add_bulk_write_observer(_log_bulk)
+    _listeners_installed = True
+
+
+# ------------------------------------------------------------------- read
+
+def current_cursor(db: Session) -> int:
+    return db.query(func.max(ChangeLogEntry.id)).scalar() or 0
+
+
+def cursor_expired(db: Session, since: int) -> bool:
+    """True if entries after `since` may have been pruned (or `since` is from another database)"""
+    oldest, newest = db.query(func.min(ChangeLogEntry.id), func.max(ChangeLogEntry.id)).one()
+    if newest is None:
+        return since > 0
+    return since > newest or since < oldest - 1
+
+
+def _snapshot_xmin(db: Session) -> Optional[int]:
+    """Oldest transaction still running as of now on Postgres; None on SQLite (one writer at a time)"""
+    if db.get_bind().dialect.name != "postgresql":
+        return None
+    return db.execute(text("SELECT txid_snapshot_xmin(txid_current_snapshot())")).scalar()
+
+
+def _committed_prefix(entries: List[ChangeLogEntry], since: int, xmin: Optional[int]) -> List[ChangeLogEntry]:
+    """Entries up to the first gap that may still be filled by a transaction in flight"""
+    legacy_horizon = datetime.utcnow() - timedelta(seconds=SYNC_GAP_SECONDS)
+    expected = since + 1
+    for index, entry in enumerate(entries):
+        if entry.id != expected and xmin is not None:
+            if entry.txid_horizon is not None:
+                closed = xmin >= entry.txid_horizon
+            else:
+                closed = entry.changed_at <= legacy_horizon
+            if not closed:
+                return entries[:index]
+        expected = entry.id + 1
+    return entries
+
+
+def changes_since(db: Session, since: int, entities: Iterable[str], limit: int = SYNC_PAGE_SIZE) -> dict:
+    """
+    Net changes per entity after cursor `since`:
+    {"cursor", "has_more", "reset": [entities to refetch in full],
+     "upserted": {entity: [ids]}, "deleted": {entity: [ids]}}
+    """
+    wanted = set(entities)
+    # Before the page: a transaction running when the page is read is then
+    # either still counted as running or started after this (at or above xmin)
+    xmin = _snapshot_xmin(db)
+    # All entities are read so id gaps belong to the log, not to the filter
+    page = (
+        db.query(ChangeLogEntry)
+        .filter(ChangeLogEntry.id > since)
+        .order_by(ChangeLogEntry.id)
+        .limit(limit)
+        .all()
+    )
+    visible = _committed_prefix(page, since, xmin)
+
+    reset = set()
+    first_op: Dict[Tuple[str, int], str] = {}
+    last_op: Dict[Tuple[str, int], str] = {}
+    for entry in visible:
+        if entry.entity not in wanted:
+            continue
+        if entry.op == BULK:
+            reset.add(entry.entity)
+            continue
+        key = (entry.entity, entry.entity_id)
+        first_op.setdefault(key, entry.op)
+        last_op[key] = entry.op
+
+    upserted = {entity: [] for entity in wanted}
+    deleted = {entity: [] for entity in wanted}
+    for (entity, entity_id), op in last_op.items():
+        if entity in reset:
+            continue
+        if op != DELETED:
+            upserted[entity].append(entity_id)
+        elif first_op[(entity, entity_id)] != CREATED:
+            # Created and deleted since the cursor: the client never saw it
+            deleted[entity].append(entity_id)
+
+    return {
+        "cursor": visible[-1].id if visible else since,
+        "has_more": len(visible) == limit,
+        "reset": sorted(reset),
+        "upserted": upserted,
+        "deleted": deleted,
+    }
+
+
+# ---------------------------------------------------------------- pruning
+
+def prune_change_log(db: Session, retention_days: int = CHANGE_LOG_RETENTION_DAYS) -> int:
+    """Delete entries older than the retention window; the newest entry is kept so the cursor survives"""
+    newest = current_cursor(db)
+    cutoff = datetime.utcnow() - timedelta(days=retention_days)
+    deleted = (
+        db.query(ChangeLogEntry)
+        .filter(ChangeLogEntry.changed_at < cutoff, ChangeLogEntry.id < newest)
+        .delete(synchronize_session=False)
+    )
+    db.commit()
+    return deleted
+
+
+async def run_change_log_pruner(start_after: Optional[asyncio.Event] = None):
+    """Background task: prune the change log hourly"""
+    from app.database import SessionLocal
+    from app.utils import metrics
+
+    if start_after is not None:
+        await start_after.wait()
+    while True:
+        db = SessionLocal()
+        try:
+            deleted = prune_change_log(db)
+            if deleted:
+                logger.info("Pruned %s change log entries", deleted)
+        except Exception as e:
+            metrics.record_background_error("change_log_pruner")
+            logger.error("Change log pruning failed: %s", e)
+            db.rollback()
+        finally:
+            db.close()
+        await asyncio.sleep(3600)
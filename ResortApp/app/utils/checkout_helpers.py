@@ -1,14 +1,28 @@
 """
 Helper functions for comprehensive checkout system
 """
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from collections import defaultdict
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy import func, select
 from datetime import datetime, date, time
 from typing import List, Dict, Optional
-from app.models.inventory import InventoryItem, InventoryTransaction, Location
+from app.models.inventory import (
+    InventoryItem, InventoryTransaction, Location, LocationStock, AssetMapping, StockIssue, StockIssueDetail
+)
 from app.models.room import Room
-from app.models.checkout import CheckoutVerification, CheckoutPayment
+from app.models.booking import Booking, BookingRoom
+from app.models.Package import PackageBooking, PackageBookingRoom
+from app.models.checkout import Checkout, CheckoutVerification, CheckoutPayment
+from app.utils.booking_status import CHECKED_IN
 from app.schemas.checkout import ConsumableAuditItem, AssetDamageItem, RoomVerificationData, SplitPaymentItem
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Locations unused room stock can go back to (auto-detected)
+STORAGE_LOCATION_TYPES = ["WAREHOUSE", "CENTRAL_WAREHOUSE", "BRANCH_STORE", "DEPARTMENT", "LAUNDRY"]
+# Locations housekeeping may pick explicitly as the return target
+RETURN_LOCATION_TYPES = ["WAREHOUSE", "CENTRAL_WAREHOUSE", "BRANCH_STORE", "STORAGE", "STORE", "SUB_STORE", "DEPARTMENT", "LAUNDRY"]
 
 
 def calculate_late_checkout_fee(booking_checkout_date: date, actual_checkout_time: Optional[datetime], 
@@ -312,3 +326,262 @@ def calculate_gst_breakdown(room_charges: float, food_charges: float, package_ch
         "total_gst": total_gst
     }
 
+
+def link_room_number(link):
+    """Safely extract room number from booking room link"""
+    try:
+        if not link:
+            return None
+        if not link.room:
+            return None
+        room_num = link.room.number
+        if room_num is None or (isinstance(room_num, str) and room_num.strip() == ""):
+            return None
+        return str(room_num).strip()
+    except (AttributeError, Exception):
+        return None
+
+
+def checked_out_room_numbers(checkouts) -> set:
+    """Room numbers already covered by the given checkout rows"""
+    checked_out_rooms = set()
+    for c in checkouts:
+        if c.room_number:
+            checked_out_rooms.update([r.strip() for r in c.room_number.split(',')])
+    return checked_out_rooms
+
+
+def rooms_needing_status_repair(links, checked_out_rooms: set) -> list:
+    """
+    Rooms of a checked-in booking that show as "Available" but were never checked out.
+    Booking is checked-in but room shows as Available - this is inconsistent, so the
+    caller sets them back to "Checked-in".
+    """
+    rooms = []
+    for link in links:
+        if link.room and link.room.status and link.room.status.lower() == "available":
+            # Check if room is effectively checked out
+            if link.room.number in checked_out_rooms:
+                continue # Do not repair, it is correctly checked out
+            rooms.append(link.room)
+    return rooms
+
+
+def active_room_options(booking, links, booking_type: str) -> List[dict]:
+    """
+    Checkout dropdown options for one checked-in booking: one entry per room plus a
+    grouped entry when the booking has more than one room still in house.
+    """
+    # Extract room numbers with proper null checks
+    # Also filter out rooms that are already checked out (status = "Available")
+    room_numbers = sorted([
+        room_num for link in links 
+        if (room_num := link_room_number(link)) is not None
+        and link.room 
+        and link.room.status 
+        and link.room.status.lower() not in ["available", "checked-out", "checked_out", "checked out"]  # Exclude already checked-out rooms
+    ])
+    options = []
+    if room_numbers:
+        # Add individual room options (one per room)
+        for room_num in room_numbers:
+            options.append({
+                "room_number": room_num,
+                "room_numbers": [room_num],  # Single room
+                "guest_name": booking.guest_name,
+                "booking_id": booking.id,
+                "booking_type": booking_type,
+                "checkout_mode": "single",
+                "display_label": f"Room {room_num} ({booking.guest_name})"
+            })
+        
+        # Add grouped booking option (all rooms together) - only if more than 1 room
+        if len(room_numbers) > 1:
+            group_label = "Booking" if booking_type == "regular" else "Package"
+            options.append({
+                "room_number": room_numbers[0],  # Primary room for checkout API
+                "room_numbers": room_numbers,  # All rooms in this booking
+                "guest_name": booking.guest_name,
+                "booking_id": booking.id,
+                "booking_type": booking_type,
+                "checkout_mode": "multiple",
+                "display_label": f"All Rooms in {group_label} #{booking.id}: {', '.join(room_numbers)} ({booking.guest_name})"
+            })
+    return options
+
+
+def active_stay_statements():
+    """
+    (regular, package) statements for checked-in bookings with their rooms
+    eager-loaded. selectinload rather than lazy loads, so the async
+    active-rooms handler can run them on an AsyncSession too.
+    """
+    return (
+        select(Booking)
+        .options(selectinload(Booking.booking_rooms).joinedload(BookingRoom.room))
+        .where(Booking.status == CHECKED_IN),
+        select(PackageBooking)
+        .options(selectinload(PackageBooking.rooms).joinedload(PackageBookingRoom.room))
+        .where(PackageBooking.status == CHECKED_IN),
+    )
+
+
+def stay_checkout_statements(active_bookings, active_package_bookings):
+    """
+    (regular, package) statements for the checkouts of the given bookings as
+    (booking id, room_number) rows: one query per booking kind, not one per
+    booking. None for a kind without bookings.
+    """
+    regular = package = None
+    if active_bookings:
+        regular = (
+            select(Checkout.booking_id, Checkout.room_number)
+            .where(Checkout.booking_id.in_([b.id for b in active_bookings]))
+        )
+    if active_package_bookings:
+        package = (
+            select(Checkout.package_booking_id, Checkout.room_number)
+            .where(Checkout.package_booking_id.in_([b.id for b in active_package_bookings]))
+        )
+    return regular, package
+
+
+def build_active_room_options(active_bookings, active_package_bookings, booking_checkouts, package_checkouts):
+    """
+    Checkout dropdown options, most recent booking first, from the results of
+    active_stay_statements and stay_checkout_statements.
+
+    Rooms of a checked-in booking that show as "Available" without a checkout
+    are set back to "Checked-in" on the way. Returns (options, repaired): the
+    caller commits once when repaired is true.
+    """
+    checkouts_by_booking = defaultdict(list)
+    for row in booking_checkouts:
+        checkouts_by_booking[row[0]].append(row)
+    checkouts_by_package = defaultdict(list)
+    for row in package_checkouts:
+        checkouts_by_package[row[0]].append(row)
+
+    stays = [(b, b.booking_rooms, "regular", checkouts_by_booking) for b in active_bookings]
+    stays += [(b, b.rooms, "package", checkouts_by_package) for b in active_package_bookings]
+
+    repaired = False
+    for booking, links, booking_type, checkouts in stays:
+        for room in rooms_needing_status_repair(links, checked_out_room_numbers(checkouts[booking.id])):
+            logger.debug("active-rooms: Repairing room %s: status was 'Available', setting to 'Checked-in' (%s booking %s is checked-in)", room.number, booking_type, booking.id)
+            room.status = "Checked-in"
+            repaired = True
+
+    options = []
+    for booking, links, booking_type, _ in stays:
+        options.extend(active_room_options(booking, links, booking_type))
+    return sorted(options, key=lambda x: x['booking_id'], reverse=True), repaired
+
+
+class RoomInventorySnapshot:
+    """
+    Everything checkout inventory verification needs for one room, loaded in a
+    handful of bulk queries: the checked items (with categories), every
+    location, the items' stock rows at all locations, the room's active asset
+    mappings and the stock issues into the room.
+
+    Stock rows are the session's own objects, so quantities changed while
+    processing one item are seen by the next.
+    """
+
+    def __init__(self, db: Session, room: Optional[Room], item_ids):
+        item_ids = list(item_ids)
+        self.room_loc_id = room.inventory_location_id if room else None
+        self.items = {}
+        self.stocks = {}
+        self.mapped_item_ids = set()
+        self.rental_item_ids = set()
+        # item_id -> source location of the latest issue into the room (None when that issue had none)
+        self.last_issue_source = {}
+
+        self.locations = db.query(Location).order_by(Location.id).all()
+        self.locations_by_id = {loc.id: loc for loc in self.locations}
+        if not item_ids:
+            return
+
+        for inv_item in db.query(InventoryItem).options(joinedload(InventoryItem.category)).filter(InventoryItem.id.in_(item_ids)):
+            self.items[inv_item.id] = inv_item
+        for stock in db.query(LocationStock).filter(LocationStock.item_id.in_(item_ids)):
+            self.stocks[(stock.location_id, stock.item_id)] = stock
+
+        if self.room_loc_id:
+            self.mapped_item_ids = {
+                item_id for (item_id,) in db.query(AssetMapping.item_id).filter(
+                    AssetMapping.location_id == self.room_loc_id,
+                    AssetMapping.item_id.in_(item_ids),
+                    AssetMapping.is_active == True
+                )
+            }
+            issued = (db.query(StockIssueDetail.item_id, StockIssueDetail.rental_price, StockIssue.source_location_id)
+                      .join(StockIssue, StockIssueDetail.issue_id == StockIssue.id)
+                      .filter(StockIssue.destination_location_id == self.room_loc_id, StockIssueDetail.item_id.in_(item_ids))
+                      .order_by(StockIssue.issue_date.desc())
+                      .all())
+            for item_id, rental_price, source_location_id in issued:
+                if rental_price and rental_price > 0:
+                    self.rental_item_ids.add(item_id)
+                self.last_issue_source.setdefault(item_id, source_location_id)
+
+    def stock(self, location_id, item_id) -> Optional[LocationStock]:
+        return self.stocks.get((location_id, item_id))
+
+    def add_stock(self, db: Session, location_id, item_id, quantity) -> LocationStock:
+        stock = LocationStock(location_id=location_id, item_id=item_id, quantity=quantity, last_updated=datetime.utcnow())
+        db.add(stock)
+        self.stocks[(location_id, item_id)] = stock
+        return stock
+
+    def largest_stock(self, item_id, min_quantity=0.0, location_types=None, exclude_location_id=None) -> Optional[LocationStock]:
+        best = None
+        for (location_id, stock_item_id), stock in self.stocks.items():
+            if stock_item_id != item_id or location_id == exclude_location_id:
+                continue
+            has_enough = stock.quantity >= min_quantity if min_quantity > 0 else stock.quantity > 0
+            if not has_enough:
+                continue
+            if location_types is not None:
+                location = self.locations_by_id.get(location_id)
+                if not location or location.location_type not in location_types:
+                    continue
+            if best is None or stock.quantity > best.quantity:
+                best = stock
+        return best
+
+    def return_location(self, item_id, requested_location_id=None, auto_detect=True):
+        """
+        (location id, name) that unused room stock goes back to: the location
+        housekeeping picked, else the storage location it was issued from, else
+        the storage location holding most of the item, else any location of the
+        original source's type, else the first storage location.
+        """
+        if requested_location_id:
+            location = self.locations_by_id.get(requested_location_id)
+            if location and (location.is_inventory_point or location.location_type in RETURN_LOCATION_TYPES):
+                return location.id, location.name
+            logger.debug("[CHECKOUT] Return location %s is not a valid inventory point. Falling back to auto-detect.", requested_location_id)
+        if not auto_detect:
+            return None, "Unknown"
+
+        original_id = self.last_issue_source.get(item_id)
+        original = self.locations_by_id.get(original_id) if original_id else None
+        if original and original.location_type in STORAGE_LOCATION_TYPES:
+            return original.id, original.name
+
+        best = self.largest_stock(item_id, location_types=STORAGE_LOCATION_TYPES, exclude_location_id=self.room_loc_id)
+        if best:
+            return best.location_id, self.locations_by_id[best.location_id].name
+
+        if original_id:
+            for location in self.locations:
+                if location.id != self.room_loc_id and (original is None or location.location_type == original.location_type):
+                    return location.id, location.name
+        for location in self.locations:
+            if location.location_type in STORAGE_LOCATION_TYPES:
+                return location.id, location.name
+        logger.warning("[CHECKOUT] No storage location found for item %s; unused stock cannot be returned", item_id)
+        return None, "Unknown"
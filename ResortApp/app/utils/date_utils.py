@@ -1,9 +1,10 @@
 """
 Date and Time Utilities for India/Kerala (IST - UTC+5:30)
 """
-from datetime import datetime, timezone, timedelta
+from datetime import date, datetime, time, timezone, timedelta
 from typing import Optional, Union
 import pytz
+from sqlalchemy import and_
 
 # IST timezone constant
 IST_TIMEZONE = pytz.timezone('Asia/Kolkata')
@@ -191,9 +192,25 @@ def ist_to_utc(ist_dt: datetime) -> datetime:
     return ist_dt.astimezone(timezone.utc)
 
 
+# Sargable day filters for DateTime columns: compare the column itself against
+# [day 00:00, next day 00:00) instead of func.date(column) / cast(column, Date),
+# so the (room_id, created_at) / (checkout_date) indexes can be used.
 
+def _as_date(day: Union[date, datetime, str]) -> date:
+    if isinstance(day, datetime):
+        return day.date()
+    if isinstance(day, date):
+        return day
+    return date.fromisoformat(str(day)[:10])
 
+def start_of_day(day: Union[date, datetime, str]) -> datetime:
+    """Naive midnight at the start of `day`"""
+    return datetime.combine(_as_date(day), time.min)
 
+def start_of_next_day(day: Union[date, datetime, str]) -> datetime:
+    """Naive midnight after `day` (exclusive upper bound)"""
+    return datetime.combine(_as_date(day) + timedelta(days=1), time.min)
 
-
-
+def on_day(column, day: Union[date, datetime, str]):
+    """column falls on `day`; replaces func.date(column) == day"""
+    return and_(column >= start_of_day(day), column < start_of_next_day(day))
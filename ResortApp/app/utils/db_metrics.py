@@ -0,0 +1,157 @@
+"""
+Request-scoped SQL instrumentation.
+
+Hooks SQLAlchemy engine events to count statements, DB time and rows for the
+current HTTP request, and flags N+1 patterns when the same normalized
+statement repeats too often inside one request.
+
+Configuration (environment variables):
+    DB_INSTRUMENTATION          - "1"/"true" to enable (default: enabled)
+    DB_N_PLUS_ONE_THRESHOLD     - repeats of one statement before flagging (default: 10)
+"""
+import logging
+import os
+import re
+from contextvars import ContextVar
+from collections import Counter
+from time import perf_counter
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+
+logger = logging.getLogger(__name__)
+
+
+def _str_to_bool(value: str) -> bool:
+    return str(value).strip().lower() in ("1", "true", "yes", "on")
+
+
+DB_INSTRUMENTATION_ENABLED = _str_to_bool(os.getenv("DB_INSTRUMENTATION", "true"))
+N_PLUS_ONE_THRESHOLD = int(os.getenv("DB_N_PLUS_ONE_THRESHOLD", "10"))
+
+# Literal patterns stripped when normalizing SQL so that the same statement
+# with different bound values groups together
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN\s*\((?:\s*(?:\?|%\(\w+\)s|:\w+|\$\d+)\s*,?)+\)", re.IGNORECASE)
+_POSTCOMPILE = re.compile(r"\(__\[POSTCOMPILE_\w+\]\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+class RequestDBStats:
+    """Per-request SQL counters"""
+
+    __slots__ = ("queries", "total_time", "rows", "statements")
+
+    def __init__(self):
+        self.queries = 0
+        self.total_time = 0.0
+        self.rows = 0
+        self.statements = Counter()
+
+    def record(self, statement: str, elapsed: float, rowcount: int):
+        self.queries += 1
+        self.total_time += elapsed
+        if rowcount and rowcount > 0:
+            self.rows += rowcount
+        self.statements[normalize_sql(statement)] += 1
+
+    def repeated_statements(self, threshold: int = None):
+        """Return [(normalized_sql, count)] for statements repeated more than threshold times"""
+        limit = N_PLUS_ONE_THRESHOLD if threshold is None else threshold
+        return [(sql, count) for sql, count in self.statements.most_common() if count > limit]
+
+
+_current_stats: ContextVar[Optional[RequestDBStats]] = ContextVar("request_db_stats", default=None)
+
+
+def normalize_sql(statement: str) -> str:
+    """
+    Collapse a SQL statement to its shape: literals and bound IN-lists are
+    replaced by placeholders and whitespace is squeezed.
+    """
+    sql = _STRING_LITERAL.sub("?", statement)
+    sql = _POSTCOMPILE.sub("(?)", sql)
+    sql = _IN_LIST.sub("IN (?)", sql)
+    sql = _NUMBER_LITERAL.sub("?", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+def start_request_stats() -> RequestDBStats:
+    """Begin collecting stats for the current request context"""
+    stats = RequestDBStats()
+    _current_stats.set(stats)
+    return stats
+
+
+def get_request_stats() -> Optional[RequestDBStats]:
+    return _current_stats.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_stats.get() is not None and context is not None:
+        context._db_query_start = perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats.get()
+    if stats is None:
+        return
+    start = getattr(context, "_db_query_start", None)
+    if start is None:
+        return
+    elapsed = perf_counter() - start
+    try:
+        rowcount = cursor.rowcount
+    except Exception:
+        rowcount = 0
+    stats.record(statement, elapsed, rowcount)
+
+
+# Callbacks receiving the seconds a caller waited for a pooled connection
+pool_wait_observers = []
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that reports how long each checkout waited for a connection"""
+
+    def _do_get(self):
+        start = perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            if pool_wait_observers:
+                waited = perf_counter() - start
+                for observer in pool_wait_observers:
+                    try:
+                        observer(waited)
+                    except Exception:
+                        pass
+
+
+def install_db_instrumentation(engine: Engine):
+    """Attach the cursor execute listeners to an engine (idempotent)"""
+    if not DB_INSTRUMENTATION_ENABLED:
+        return
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def report_request_stats(stats: RequestDBStats, method: str, route: str, response=None):
+    """
+    Add X-DB-* headers to the response and flag N+1 patterns for the route.
+    """
+    if response is not None:
+        response.headers["X-DB-Queries"] = str(stats.queries)
+        response.headers["X-DB-Time"] = str(round(stats.total_time * 1000, 2))
+        response.headers["X-DB-Rows"] = str(stats.rows)
+
+    for sql, count in stats.repeated_statements():
+        logger.warning(
+            "[DB] Possible N+1 in %s %s: statement executed %s times (total %s queries, %.1f ms): %s",
+            method, route, count, stats.queries, stats.total_time * 1000, sql[:200],
+        )
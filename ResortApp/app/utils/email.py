@@ -4,6 +4,9 @@ from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from typing import Optional, List, Dict
 from datetime import datetime
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 def get_smtp_config():
@@ -42,7 +45,7 @@ def send_email(
         
         # Skip sending if SMTP not configured
         if not config['username'] or not config['password']:
-            print(f"[Email] SMTP not configured. Would send email to {to_email}: {subject}")
+            logger.debug("[Email] SMTP not configured. Would send email to %s: %s", to_email, subject)
             return False
         
         # Create message
@@ -62,11 +65,11 @@ def send_email(
             server.login(config['username'], config['password'])
             server.send_message(msg)
         
-        print(f"[Email] Successfully sent email to {to_email}: {subject}")
+        logger.debug("[Email] Successfully sent email to %s: %s", to_email, subject)
         return True
         
     except Exception as e:
-        print(f"[Email] Failed to send email to {to_email}: {str(e)}")
+        logger.error("[Email] Failed to send email to %s: %s", to_email, e)
         return False
 
 
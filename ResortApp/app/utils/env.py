@@ -0,0 +1,33 @@
+"""
+Single .env loader shared by main.py and app.database, so the file is parsed
+once per process.
+"""
+from pathlib import Path
+import logging
+
+from dotenv import find_dotenv, load_dotenv
+
+logger = logging.getLogger(__name__)
+
+# ResortApp/.env
+ENV_PATH = Path(__file__).resolve().parent.parent.parent / ".env"
+
+_loaded = False
+
+
+def load_env():
+    """Load ResortApp/.env (values override the process environment); falls back to a .env in the cwd"""
+    global _loaded
+    if _loaded:
+        return
+    _loaded = True
+    if ENV_PATH.exists():
+        load_dotenv(dotenv_path=ENV_PATH, override=True)
+        logger.debug("Loaded .env from: %s", ENV_PATH)
+        return
+    fallback = find_dotenv(usecwd=True)
+    if fallback:
+        load_dotenv(dotenv_path=fallback, override=True)
+        logger.debug("Loaded .env from: %s", fallback)
+    else:
+        logger.debug(".env file not found at %s", ENV_PATH)
@@ -0,0 +1,339 @@
+"""
+Domain event bus: compact change events pushed to dashboard screens over SSE.
+
+Every ORM flush that inserts, updates or deletes a tracked model (bookings,
+rooms, food orders, service requests, checkouts, inventory, ...) records one
+event per row:
+
+    {"topic": "food_orders", "entity": "FoodOrder", "op": "updated", "id": 42,
+     "data": {"status": "completed", "room_id": 7, ...}, "ts": "..."}
+
+where data carries only the fields screens key on. Bulk query.update() /
+query.delete() on a tracked model skips the flush: the call site reports it
+with bulk_writes.bulk_written(), which records a single "bulk_updated" /
+"bulk_deleted" event without an id (clients refetch that topic).
+
+Events are delivered only if the transaction commits:
+  * PostgreSQL: each flush issues pg_notify() on the session's connection, so
+    the server delivers the notifications at commit (and drops them on
+    rollback) to every worker LISTENing on EVENT_CHANNEL;
+  * other databases: events wait on the session and go to this worker's
+    subscribers after commit (single-worker / development stand-in).
+
+Each worker runs one LISTEN connection (started with its first subscriber) and
+fans events out to the bounded queues of its SSE subscribers; a subscriber that
+falls behind gets a "resync" event instead of the events it missed.
+"""
+import asyncio
+import json
+import logging
+import os
+import select
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Iterable, List, Optional
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import event, inspect, text
+from sqlalchemy.orm import Session
+
+from app.database import engine
+from app.utils.bulk_writes import add_bulk_write_observer
+
+logger = logging.getLogger(__name__)
+
+
+def _str_to_bool(value: str) -> bool:
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+EVENTS_ENABLED = _str_to_bool(os.getenv("EVENTS_ENABLED", "true"))
+EVENT_CHANNEL = os.getenv("EVENT_CHANNEL", "resort_events")
+# Seconds between keep-alive comments on an idle stream (proxies drop silent connections)
+SSE_HEARTBEAT_SECONDS = float(os.getenv("SSE_HEARTBEAT_SECONDS", "15"))
+# Events buffered per subscriber before it is told to resync
+SUBSCRIBER_QUEUE_SIZE = 200
+
+# Postgres caps a NOTIFY payload at 8000 bytes
+_MAX_PAYLOAD = 7500
+
+# model name -> (topic, fields carried in the event)
+_TRACKED = {
+    "Booking": ("bookings", ("status", "check_in", "check_out")),
+    "PackageBooking": ("package_bookings", ("status", "check_in", "check_out")),
+    "Room": ("rooms", ("number", "status")),
+    "FoodOrder": ("food_orders", ("status", "room_id", "billing_status", "assigned_employee_id")),
+    "ServiceRequest": ("service_requests", ("status", "room_id", "request_type", "employee_id")),
+    "AssignedService": ("assigned_services", ("status", "room_id", "employee_id", "billing_status")),
+    "Checkout": ("checkouts", ("room_number", "booking_id", "package_booking_id", "grand_total")),
+    "CheckoutRequest": ("checkout_requests", ("status", "room_number", "booking_id", "package_booking_id")),
+    "InventoryItem": ("inventory", ("current_stock",)),
+    "LocationStock": ("inventory", ("item_id", "location_id", "quantity")),
+    "InventoryTransaction": ("inventory", ("item_id", "transaction_type", "quantity")),
+    "User": ("users", ("role_id", "is_active", "token_version")),
+    "Role": ("roles", ("name", "permissions")),
+}
+# Topics published explicitly with publish() rather than captured from flushes
+_PUBLISHED_TOPICS = ("kitchen",)
+# Topics for in-process sinks only (the principal cache): never sent to SSE clients
+_INTERNAL_TOPICS = frozenset({"users", "roles"})
+# Topics SSE clients may subscribe to
+TOPICS = tuple(sorted(({topic for topic, _ in _TRACKED.values()} | set(_PUBLISHED_TOPICS)) - _INTERNAL_TOPICS))
+
+_INFO_KEY = "domain_events"
+
+
+# ---------------------------------------------------------------- capture
+
+def _event(topic: str, entity: str, op: str, obj_id, data: dict) -> dict:
+    return {
+        "topic": topic,
+        "entity": entity,
+        "op": op,
+        "id": obj_id,
+        "data": jsonable_encoder(data),
+        "ts": datetime.utcnow().isoformat(),
+    }
+
+
+def _uses_notify(session) -> bool:
+    return session.get_bind().dialect.name == "postgresql"
+
+
+def _payloads(events: List[dict]) -> Iterable[str]:
+    """JSON arrays of events, each under the NOTIFY size limit"""
+    batch, size = [], 2
+    for evt in events:
+        encoded = json.dumps(evt, separators=(",", ":"), default=str)
+        if len(encoded) + 2 > _MAX_PAYLOAD:
+            evt = dict(evt, data={})
+            encoded = json.dumps(evt, separators=(",", ":"), default=str)
+        if batch and size + len(encoded) + 1 > _MAX_PAYLOAD:
+            yield "[" + ",".join(batch) + "]"
+            batch, size = [], 2
+        batch.append(encoded)
+        size += len(encoded) + 1
+    if batch:
+        yield "[" + ",".join(batch) + "]"
+
+
+def _emit(session, events: List[dict]):
+    if _uses_notify(session):
+        conn = session.connection()
+        for payload in _payloads(events):
+            conn.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": EVENT_CHANNEL, "payload": payload})
+    else:
+        session.info.setdefault(_INFO_KEY, []).extend(events)
+
+
+def publish(session, topic: str, entity: str, op: str, obj_id, data: dict):
+    """Publish an application event (e.g. a kitchen ticket) with the session's transaction: delivered only on commit"""
+    if not (EVENTS_ENABLED and _listeners_installed):
+        return
+    _emit(session, [_event(topic, entity, op, obj_id, data)])
+
+
+def _collect(session, flush_context):
+    events = []
+    for op, objects in (("created", session.new), ("updated", session.dirty), ("deleted", session.deleted)):
+        for obj in objects:
+            entity = type(obj).__name__
+            tracked = _TRACKED.get(entity)
+            if tracked is None:
+                continue
+            if op == "updated" and not session.is_modified(obj, include_collections=False):
+                continue
+            topic, fields = tracked
+            # Loaded values only: no lazy loads from inside the flush (expired fields are left out)
+            values = inspect(obj).dict
+            events.append(_event(topic, entity, op, values.get("id"), {f: values[f] for f in fields if f in values}))
+    if events:
+        _emit(session, events)
+
+
+def _collect_bulk(session, model, op):
+    entity = model.__name__
+    tracked = _TRACKED.get(entity)
+    if tracked is None:
+        return
+    _emit(session, [_event(tracked[0], entity, f"bulk_{op}", None, {})])
+
+
+def _after_commit(session):
+    if session.in_nested_transaction():
+        return
+    events = session.info.pop(_INFO_KEY, None)
+    if events:
+        _dispatch(events)
+
+
+def _after_rollback(session):
+    # A rolled-back SAVEPOINT keeps the outer transaction's events (an extra event only costs a refetch)
+    if session.in_nested_transaction():
+        return
+    session.info.pop(_INFO_KEY, None)
+
+
+_listeners_installed = False
+
+
+def install_event_listeners():
+    """Hook every ORM Session so committed changes to tracked models publish events"""
+    global _listeners_installed
+    if _listeners_installed or not EVENTS_ENABLED:
+        return
+    event.listen(Session, "after_flush", _collect)
+    add_bulk_write_observer(_collect_bulk)
+    event.listen(Session, "after_commit", _after_commit)
+    event.listen(Session, "after_rollback", _after_rollback)
+    _listeners_installed = True
+
+
+# ----------------------------------------------------------------- fan-out
+
+class Subscriber:
+    """One SSE client: a bounded queue on its event loop, filtered by topic"""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, topics: frozenset):
+        self.loop = loop
+        self.topics = topics
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self.overflowed = False
+
+    def wants(self, evt: dict) -> bool:
+        return evt.get("topic") in self.topics
+
+    def _offer(self, evt: dict):
+        try:
+            self.queue.put_nowait(evt)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+
+_subscribers = set()
+_sinks = []
+_subscribers_lock = threading.Lock()
+_listener: Optional[threading.Thread] = None
+
+
+def _dispatch(events: List[dict]):
+    """Hand events to every local sink and subscriber (callable from any thread)"""
+    with _subscribers_lock:
+        subscribers = list(_subscribers)
+        sinks = list(_sinks)
+    for sink in sinks:
+        try:
+            sink(events)
+        except Exception as e:
+            logger.error("Event sink %s failed: %s", getattr(sink, "__qualname__", sink), e)
+    for sub in subscribers:
+        for evt in events:
+            if sub.wants(evt):
+                try:
+                    sub.loop.call_soon_threadsafe(sub._offer, evt)
+                except RuntimeError:
+                    # Loop already closed; the stream's cleanup removes it
+                    break
+
+
+def subscribe(topics: Optional[Iterable[str]] = None) -> Subscriber:
+    """Register a subscriber on the running event loop (default: every public topic); pair with unsubscribe()"""
+    # Internal topics (user and role changes) are never delivered, even if asked for
+    sub = Subscriber(asyncio.get_running_loop(), frozenset(topics or TOPICS) - _INTERNAL_TOPICS)
+    with _subscribers_lock:
+        _subscribers.add(sub)
+    if engine.dialect.name == "postgresql":
+        _ensure_listener()
+    return sub
+
+
+def add_sink(sink: Callable[[List[dict]], None]):
+    """
+    Register an in-process consumer of every event this worker receives (from
+    any worker on PostgreSQL). Sinks run on the dispatching thread: keep them short.
+    """
+    with _subscribers_lock:
+        if sink in _sinks:
+            return
+        _sinks.append(sink)
+    if engine.dialect.name == "postgresql":
+        _ensure_listener()
+
+
+def unsubscribe(sub: Subscriber):
+    with _subscribers_lock:
+        _subscribers.discard(sub)
+
+
+def _ensure_listener():
+    global _listener
+    with _subscribers_lock:
+        if _listener is None or not _listener.is_alive():
+            _listener = threading.Thread(target=_listen_loop, name="event-listener", daemon=True)
+            _listener.start()
+
+
+def _listen_loop():
+    """LISTEN on EVENT_CHANNEL and dispatch notifications; reconnects with backoff"""
+    backoff = 1
+    while True:
+        raw = None
+        try:
+            raw = engine.raw_connection()
+            # Keep it out of the pool: it stays in LISTEN mode for the life of the worker
+            raw.detach()
+            conn = raw.dbapi_connection
+            conn.autocommit = True
+            with conn.cursor() as cursor:
+                cursor.execute(f"LISTEN {EVENT_CHANNEL}")
+            logger.info("Listening for domain events on %s", EVENT_CHANNEL)
+            backoff = 1
+            while True:
+                if select.select([conn], [], [], 30.0) == ([], [], []):
+                    continue
+                conn.poll()
+                while conn.notifies:
+                    notify = conn.notifies.pop(0)
+                    try:
+                        _dispatch(json.loads(notify.payload))
+                    except ValueError:
+                        logger.warning("Ignoring malformed event payload on %s", EVENT_CHANNEL)
+        except Exception as e:
+            logger.warning("Event listener connection lost (%s); reconnecting in %ss", e, backoff)
+            if raw is not None:
+                try:
+                    raw.close()
+                except Exception:
+                    pass
+            time.sleep(backoff)
+            backoff = min(backoff * 2, 30)
+
+
+# -------------------------------------------------------------------- SSE
+
+def _sse(event_name: str, data) -> str:
+    return f"event: {event_name}\ndata: {json.dumps(data, separators=(',', ':'), default=str)}\n\n"
+
+
+async def sse_stream(topics: Optional[Iterable[str]] = None):
+    """text/event-stream body: one SSE event (named after its topic) per domain event"""
+    sub = subscribe(topics)
+    try:
+        yield "retry: 5000\n\n"
+        yield _sse("ready", {"topics": sorted(sub.topics)})
+        while True:
+            try:
+                evt = await asyncio.wait_for(sub.queue.get(), timeout=SSE_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": ping\n\n"
+                continue
+            if sub.overflowed:
+                while not sub.queue.empty():
+                    sub.queue.get_nowait()
+                sub.overflowed = False
+                yield _sse("resync", {})
+                continue
+            yield _sse(evt["topic"], evt)
+    finally:
+        unsubscribe(sub)
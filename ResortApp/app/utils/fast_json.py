@@ -0,0 +1,60 @@
+"""
+Fast JSON path for large list responses.
+
+Returning a model list from a route makes FastAPI validate every row against
+the response_model, turn it into plain Python with jsonable_encoder and then
+json.dumps the result: three passes over data that list endpoints have usually
+just read from the database. The list endpoints instead select only the
+columns they return (no ORM objects are hydrated), assemble plain dicts in the
+response_model's shape and return them as a FastJSONResponse, which encodes
+them with orjson in one pass. The routes keep their response_model, so the
+OpenAPI schema is unchanged; a returned Response is sent as is.
+
+orjson is optional: without it FastJSONResponse falls back to the stdlib
+encoder with the same output.
+"""
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any
+
+from pydantic import BaseModel
+from starlette.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional; json fallback below
+    orjson = None
+
+# Aware UTC datetimes as "...Z" like pydantic; int dict keys (id -> row maps) allowed
+ORJSON_OPTIONS = (orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS) if orjson is not None else 0
+
+
+def _default(value: Any):
+    """Types orjson / json do not encode natively"""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if isinstance(value, (datetime, date, time)):  # json fallback only; orjson handles these
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse encoded with orjson (compact, UTF-8), for plain dict/list content"""
+
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(content, default=_default, option=ORJSON_OPTIONS)
+        return json.dumps(content, default=_default, ensure_ascii=False, allow_nan=False,
+                          separators=(",", ":")).encode("utf-8")
+
+
+def as_float(value, default=None):
+    """Numeric column value as the float the response schemas declare"""
+    if value is None:
+        return default
+    return float(value)
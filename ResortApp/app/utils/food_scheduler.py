@@ -1,20 +1,33 @@
 import asyncio
 import json
 from datetime import datetime
+from typing import Optional
 from sqlalchemy.orm import Session, joinedload
 from app.database import SessionLocal
 from app.models.Package import PackageBooking
 from app.models.service_request import ServiceRequest
 from app.models.room import Room
+from app.utils import metrics
+from app.utils.booking_status import CHECKED_IN
+import logging
 
-async def run_food_scheduler():
-    """Background task to check food schedules every minute"""
-    print("[SCHEDULER] Starting food schedule monitor...")
+logger = logging.getLogger(__name__)
+
+async def run_food_scheduler(start_after: Optional[asyncio.Event] = None):
+    """
+    Background task to check food schedules every minute.
+    start_after: optional event to wait for before the first DB check (fast-start mode
+    keeps worker boot free of DB connections until the first request arrives).
+    """
+    if start_after is not None:
+        await start_after.wait()
+    logger.info("[SCHEDULER] Starting food schedule monitor...")
     while True:
         try:
             check_food_schedules()
         except Exception as e:
-            print(f"[SCHEDULER] Error: {e}")
+            metrics.record_background_error("food_scheduler")
+            logger.error("[SCHEDULER] Error: %s", e)
         
         # Wait for next minute check
         # Align to next minute start for precision? No, simple sleep is fine for now
@@ -32,7 +45,7 @@ def check_food_schedules():
             db.query(PackageBooking)
             .options(joinedload(PackageBooking.package))
             .options(joinedload(PackageBooking.rooms))
-            .filter(PackageBooking.status.in_(['checked-in', 'checked_in']))
+            .filter(PackageBooking.status == CHECKED_IN)
             .all()
         )
         
@@ -75,7 +88,7 @@ def check_food_schedules():
                         
                         if not exists:
                             # Create Request
-                            print(f"[AUTO-SCHEDULER] Creating {meal} request for Room {room_id}")
+                            logger.debug("[AUTO-SCHEDULER] Creating %s request for Room %s", meal, room_id)
                             req = ServiceRequest(
                                 room_id=room_id,
                                 request_type="food_delivery",
@@ -88,11 +101,11 @@ def check_food_schedules():
                             
         if count > 0:
             db.commit()
-            print(f"[AUTO-SCHEDULER] Created {count} service requests for {current_time_str}")
+            logger.info("[AUTO-SCHEDULER] Created %s service requests for %s", count, current_time_str)
+        metrics.record_background_success("food_scheduler")
             
     except Exception as e:
-        print(f"Error in check_food_schedules: {e}")
-        import traceback
-        traceback.print_exc()
+        metrics.record_background_error("food_scheduler")
+        logger.error("Error in check_food_schedules: %s", e, exc_info=True)
     finally:
         db.close()
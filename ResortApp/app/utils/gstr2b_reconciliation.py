@@ -0,0 +1,204 @@
+"""
+GSTR-2B reconciliation engine.
+
+Both sides (the portal download and our purchase register) are reduced to
+DataFrames keyed on (GSTIN, normalized invoice number) and matched with pandas
+hash joins, so a 50k-row GSTR-2B file reconciles in a couple of seconds.
+No database access here; app/api/gst_reports.py supplies the purchase rows.
+
+pandas is a hard dependency of this module; import it lazily (inside the
+endpoint) so worker boot does not pay for it.
+"""
+import io
+from typing import Dict, Optional
+
+import pandas as pd
+
+# Result categories (status strings are what the dashboard already renders)
+MATCHED = "matched"
+AMOUNT_MISMATCH = "amount_mismatch"
+MISSING_IN_BOOKS = "not_found_in_system"
+MISSING_IN_2B = "not_found_in_gstr2b"
+
+# Separators vendors and the portal disagree on: "INV-001", "inv/001", "INV 001", "INV.001"
+INVOICE_SEPARATORS = r"[\s\-/\\._#:,]+"
+# Zeros that pad a number at the start of a segment or right after a letter prefix ("INV0012" -> "INV12");
+# stripped before the separators go, so each segment loses only its own padding
+LEADING_ZEROS = r"(?<![0-9])0+(?=[0-9])"
+NULL_STRINGS = ["", "NAN", "NONE", "NULL", "NAT", "<NA>"]
+
+# Portal downloads put a title block above the header; look this far for it
+HEADER_SCAN_ROWS = 15
+
+
+def normalize_invoice_numbers(values: pd.Series) -> pd.Series:
+    """
+    Upper-case, strip each segment's padding zeros, then the separators/whitespace
+    between segments ("GST/24-25/0012" -> "GST242512"); blanks become ''
+    """
+    s = values.astype("string").fillna("").str.upper()
+    s = s.str.replace(LEADING_ZEROS, "", regex=True)
+    s = s.str.replace(INVOICE_SEPARATORS, "", regex=True)
+    return s.mask(s.isin(NULL_STRINGS), "")
+
+
+def normalize_gstins(values: pd.Series) -> pd.Series:
+    """Upper-case and drop everything that is not alphanumeric; blanks become ''"""
+    s = values.astype("string").fillna("").str.upper().str.replace(r"[^0-9A-Z]", "", regex=True)
+    return s.mask(s.isin(NULL_STRINGS), "")
+
+
+def to_amounts(values: pd.Series) -> pd.Series:
+    """Parse amounts like '1,23,456.50' or '₹ 100' to floats (NaN when empty)"""
+    if pd.api.types.is_numeric_dtype(values):
+        return values.astype(float)
+    cleaned = values.astype("string").str.replace(r"[^0-9.\-]", "", regex=True)
+    return pd.to_numeric(cleaned, errors="coerce").astype(float)
+
+
+def _find_column(columns, *keyword_sets, exclude=()) -> Optional[str]:
+    """First column whose lower-cased name contains every keyword of one of the sets"""
+    for keywords in keyword_sets:
+        for col in columns:
+            name = str(col).lower()
+            if all(k in name for k in keywords) and not any(x in name for x in exclude):
+                return col
+    return None
+
+
+def detect_gstr2b_columns(columns) -> Dict[str, Optional[str]]:
+    """Map the roles we need to the columns of a GSTR-2B download (B2B sheet or flat CSV)"""
+    return {
+        "invoice": _find_column(
+            columns,
+            ("invoice", "number"), ("invoice", "no"), ("note", "number"), ("document", "number"), ("inv",),
+            exclude=("date", "value", "type"),
+        ),
+        "gstin": _find_column(columns, ("gstin",), ("gst", "no"), exclude=("name",)),
+        "supplier_name": _find_column(columns, ("trade",), ("legal", "name"), ("supplier", "name"), ("party",)),
+        "invoice_date": _find_column(columns, ("invoice", "date"), ("note", "date"), ("date",)),
+        "invoice_value": _find_column(columns, ("invoice", "value"), ("total", "value"), ("note", "value")),
+        "taxable_value": _find_column(columns, ("taxable",)),
+        "igst": _find_column(columns, ("integrated",), ("igst",)),
+        "cgst": _find_column(columns, ("central",), ("cgst",)),
+        "sgst": _find_column(columns, ("state", "tax"), ("sgst",), ("utgst",)),
+        "cess": _find_column(columns, ("cess",)),
+    }
+
+
+def _is_header(text: str) -> bool:
+    text = text.lower()
+    return "invoice" in text or "gstin" in text
+
+
+def read_gstr2b_file(contents: bytes, filename: str) -> pd.DataFrame:
+    """
+    Parse an uploaded GSTR-2B Excel/CSV file. Every cell is read as text so
+    invoice numbers keep their zeros; the first row that mentions an
+    invoice/GSTIN is taken as the header.
+    """
+    if filename.lower().endswith(".csv"):
+        text = contents.decode("utf-8-sig", errors="replace")
+        lines = text.splitlines()[:HEADER_SCAN_ROWS]
+        header_row = next((i for i, line in enumerate(lines) if _is_header(line)), 0)
+        return pd.read_csv(io.StringIO(text), dtype=str, skiprows=header_row, keep_default_na=False)
+
+    raw = pd.read_excel(io.BytesIO(contents), dtype=str, header=None, keep_default_na=False)
+    if raw.empty:
+        return raw
+    header_row = 0
+    for idx in range(min(HEADER_SCAN_ROWS, len(raw))):
+        if _is_header(" ".join(str(v) for v in raw.iloc[idx].tolist())):
+            header_row = idx
+            break
+    header = [str(v).strip() or f"column_{i}" for i, v in enumerate(raw.iloc[header_row].tolist())]
+    df = raw.iloc[header_row + 1:].reset_index(drop=True)
+    df.columns = header
+    return df
+
+
+def prepare_gstr2b(df: pd.DataFrame) -> pd.DataFrame:
+    """Portal rows -> invoice_number, gstin, supplier_name, invoice_date, amount, tax"""
+    cols = detect_gstr2b_columns(df.columns)
+    invoice_col = cols["invoice"] or df.columns[0]
+
+    def column(role, default=""):
+        col = cols[role]
+        return df[col] if col is not None else pd.Series(default, index=df.index)
+
+    tax = sum(to_amounts(column(role, None)).fillna(0) for role in ("igst", "cgst", "sgst", "cess"))
+    if cols["invoice_value"] is not None:
+        amount = to_amounts(df[cols["invoice_value"]])
+    elif cols["taxable_value"] is not None:
+        amount = to_amounts(df[cols["taxable_value"]]).fillna(0) + tax
+    else:
+        amount = pd.Series(float("nan"), index=df.index)
+
+    return pd.DataFrame({
+        "invoice_number": df[invoice_col].astype("string").str.strip(),
+        "gstin": column("gstin").astype("string").str.strip(),
+        "supplier_name": column("supplier_name").astype("string").str.strip(),
+        "invoice_date": column("invoice_date").astype("string").str.strip(),
+        "amount": amount,
+        "tax": tax,
+    })
+
+
+def _keyed(df: pd.DataFrame, id_col: str) -> pd.DataFrame:
+    """Add normalized keys, drop rows without an invoice number and collapse duplicates"""
+    df = df.assign(_gstin=normalize_gstins(df["gstin"]), _inv=normalize_invoice_numbers(df["invoice_number"]))
+    df = df[df["_inv"] != ""]
+    # Multi-rate invoices appear once per tax rate in GSTR-2B; books can hold split purchases
+    groups = df.groupby(["_gstin", "_inv"], sort=False)
+    grouped = groups.first()
+    grouped["amount"] = groups["amount"].sum(min_count=1)
+    grouped["tax"] = groups["tax"].sum()
+    grouped = grouped.reset_index()
+    grouped[id_col] = range(len(grouped))
+    return grouped
+
+
+def reconcile(portal: pd.DataFrame, books: pd.DataFrame, amount_tolerance: float = 1.0) -> Dict[str, pd.DataFrame]:
+    """
+    Match GSTR-2B rows against purchase register rows.
+
+    portal / books: frames with invoice_number, gstin, amount, tax columns (plus any
+    display columns). Pass 1 joins on (GSTIN, normalized invoice); pass 2 matches the
+    leftovers on invoice number alone where one side has no GSTIN. Matched pairs whose
+    amounts differ by more than `amount_tolerance` are reported as amount mismatches.
+
+    Returns frames keyed by MATCHED, AMOUNT_MISMATCH, MISSING_IN_BOOKS, MISSING_IN_2B.
+    Paired frames carry both sides' columns with _2b / _books suffixes.
+    """
+    p = _keyed(portal, "_pid")
+    b = _keyed(books, "_bid")
+
+    pass1 = p.merge(b, on=["_gstin", "_inv"], how="inner", suffixes=("_2b", "_books"))
+    pass1["_gstin_2b"] = pass1["_gstin_books"] = pass1["_gstin"]
+    pass1 = pass1.drop(columns=["_gstin"])
+
+    p_left = p[~p["_pid"].isin(pass1["_pid"])]
+    b_left = b[~b["_bid"].isin(pass1["_bid"])]
+    pass2 = p_left.merge(b_left, on="_inv", how="inner", suffixes=("_2b", "_books"))
+    pass2 = pass2[(pass2["_gstin_2b"] == "") | (pass2["_gstin_books"] == "")]
+    pass2 = pass2.drop_duplicates("_pid").drop_duplicates("_bid")
+
+    pairs = pd.concat([pass1, pass2], ignore_index=True)
+    pairs["difference"] = (pairs["amount_2b"] - pairs["amount_books"]).round(2)
+    mismatch = pairs["difference"].abs() > amount_tolerance  # NaN (no amount in file) compares False
+
+    return {
+        MATCHED: pairs[~mismatch],
+        AMOUNT_MISMATCH: pairs[mismatch],
+        MISSING_IN_BOOKS: p[~p["_pid"].isin(pairs["_pid"])],
+        MISSING_IN_2B: b[~b["_bid"].isin(pairs["_bid"])],
+    }
+
+
+def to_records(df: pd.DataFrame, columns: Dict[str, str], limit: Optional[int] = None) -> list:
+    """Rename/select columns ({source: output}) and convert to JSON-safe dicts"""
+    if limit is not None:
+        df = df.head(limit)
+    out = df[list(columns)].rename(columns=columns)
+    out = out.astype(object).where(out.notna(), None)
+    return out.to_dict("records")
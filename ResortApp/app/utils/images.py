@@ -0,0 +1,276 @@
+"""
+Image ingestion: streamed, content-addressed uploads with resized variants.
+
+ingest_image() streams an UploadFile to disk in chunks while hashing it and
+names the file after its SHA-256, so uploading the same photo again reuses the
+stored copy instead of writing another one. Raster images are then handed to a
+background worker pool that writes thumb / medium / full variants in WebP and
+JPEG next to the original (EXIF orientation applied, metadata stripped, never
+upscaled) and records them on an ImageAsset row keyed by the original's URL.
+
+List endpoints attach the variant URLs and srcset strings with
+attach_image_variants() / image_variants_for(). Until the variants are ready,
+and for files that are not images (e.g. PDF receipts), clients keep using the
+original URL. Pillow is optional: without it uploads are still streamed and
+deduplicated but no variants are made.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+
+from fastapi import HTTPException, UploadFile
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.image_asset import ImageAsset, READY, FAILED, SKIPPED
+
+try:
+    from PIL import Image, ImageOps, UnidentifiedImageError
+except ImportError:  # pragma: no cover - Pillow is in requirements; degrade to originals only
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+
+def _str_to_bool(value: str) -> bool:
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+IMAGE_VARIANTS_ENABLED = _str_to_bool(os.getenv("IMAGE_VARIANTS_ENABLED", "true"))
+IMAGE_WORKERS = int(os.getenv("IMAGE_WORKERS", "2"))
+MAX_IMAGE_UPLOAD_BYTES = int(os.getenv("MAX_IMAGE_UPLOAD_MB", "25")) * 1024 * 1024
+CHUNK_SIZE = 1024 * 1024
+
+# (name, max width): every variant keeps the original aspect ratio
+VARIANT_WIDTHS = (("thumb", 320), ("medium", 960), ("full", 1920))
+WEBP_QUALITY = 80
+JPEG_QUALITY = 82
+
+
+@dataclass
+class StoredImage:
+    path: str       # file on disk
+    filename: str
+    url: str        # value to store on the owning row
+    sha256: str
+    size: int
+    duplicate: bool  # identical content was already stored under this name
+
+
+def _extension(filename: Optional[str]) -> str:
+    ext = filename.rsplit(".", 1)[-1].lower() if filename and "." in filename else ""
+    return ext if ext.isalnum() and 0 < len(ext) <= 5 else "jpg"
+
+
+def ingest_image(upload: UploadFile, directory: str, prefix: str, url_base: Optional[str] = None) -> StoredImage:
+    """
+    Stream `upload` into `directory` as <prefix>_<sha256>.<ext> and queue its variants.
+
+    url_base: public URL of `directory` (the stored URL is url_base/filename);
+    None stores the bare filename, for files served through an endpoint.
+    Raises 413 if the upload exceeds MAX_IMAGE_UPLOAD_MB.
+    """
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = os.path.join(directory, f".{prefix}_{uuid.uuid4().hex}.part")
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(tmp_path, "wb") as out:
+            while True:
+                chunk = upload.file.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > MAX_IMAGE_UPLOAD_BYTES:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"File too large (max {MAX_IMAGE_UPLOAD_BYTES // (1024 * 1024)} MB)"
+                    )
+                digest.update(chunk)
+                out.write(chunk)
+        sha256 = digest.hexdigest()
+        filename = f"{prefix}_{sha256[:32]}.{_extension(upload.filename)}"
+        path = os.path.join(directory, filename)
+        duplicate = os.path.exists(path)
+        if duplicate:
+            os.remove(tmp_path)
+        else:
+            os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    url = f"{url_base.rstrip('/')}/{filename}" if url_base is not None else filename
+    stored = StoredImage(path=path, filename=filename, url=url, sha256=sha256, size=size, duplicate=duplicate)
+    schedule_variants(stored)
+    return stored
+
+
+def remove_image(path: Optional[str]):
+    """Delete a stored original and its variants (callers check the file is no longer referenced)"""
+    if not path:
+        return
+    stem = os.path.splitext(path)[0]
+    for candidate in [path] + [f"{stem}.{name}.{fmt}" for name, _ in VARIANT_WIDTHS for fmt in ("webp", "jpg")]:
+        try:
+            if os.path.exists(candidate):
+                os.remove(candidate)
+        except OSError as e:
+            logger.warning("Could not delete %s: %s", candidate, e)
+
+
+# --------------------------------------------------------------- variants
+
+def _variant_paths(path: str, url: str, name: str):
+    stem, url_stem = os.path.splitext(path)[0], os.path.splitext(url)[0]
+    return (
+        (f"{stem}.{name}.webp", f"{url_stem}.{name}.webp"),
+        (f"{stem}.{name}.jpg", f"{url_stem}.{name}.jpg"),
+    )
+
+
+def _flatten(im):
+    """RGB copy for JPEG: transparency composited onto white"""
+    if im.mode in ("RGBA", "LA") or (im.mode == "P" and "transparency" in im.info):
+        rgba = im.convert("RGBA")
+        background = Image.new("RGB", rgba.size, (255, 255, 255))
+        background.paste(rgba, mask=rgba.split()[-1])
+        return background
+    return im.convert("RGB")
+
+
+def build_variants(path: str, url: str) -> Optional[dict]:
+    """Write the variants of the image at `path`; None if it is not a raster image Pillow can read"""
+    if Image is None:
+        return None
+    try:
+        with Image.open(path) as source:
+            content_type = Image.MIME.get(source.format)
+            im = ImageOps.exif_transpose(source)
+            im.load()
+    except (UnidentifiedImageError, OSError):
+        return None
+    if im.mode not in ("RGB", "RGBA"):
+        im = im.convert("RGBA" if im.mode in ("LA", "P", "PA") else "RGB")
+
+    width, height = im.size
+    variants = {}
+    previous = None
+    for name, max_width in VARIANT_WIDTHS:
+        target_width = min(max_width, width)
+        if previous is not None and previous["width"] == target_width:
+            # Original narrower than this size: reuse the smaller variant
+            variants[name] = previous
+            continue
+        target_height = max(1, round(height * target_width / width))
+        resized = im if target_width == width else im.resize((target_width, target_height), Image.LANCZOS)
+        (webp_path, webp_url), (jpeg_path, jpeg_url) = _variant_paths(path, url, name)
+        resized.save(webp_path, "WEBP", quality=WEBP_QUALITY, method=4)
+        _flatten(resized).save(jpeg_path, "JPEG", quality=JPEG_QUALITY, optimize=True, progressive=True)
+        previous = variants[name] = {"width": target_width, "height": target_height, "webp": webp_url, "jpeg": jpeg_url}
+
+    distinct = list({v["width"]: v for v in variants.values()}.values())
+    return {
+        "width": width,
+        "height": height,
+        "content_type": content_type,
+        "variants": variants,
+        "srcset": {fmt: ", ".join(f"{v[fmt]} {v['width']}w" for v in distinct) for fmt in ("webp", "jpeg")},
+    }
+
+
+def _variants_on_disk(path: str, url: str, meta: dict) -> bool:
+    return all(
+        os.path.exists(file_path)
+        for name in meta.get("variants", {})
+        for file_path, _ in _variant_paths(path, url, name)
+    )
+
+
+def process_image(path: str, url: str, sha256: str, size: int):
+    """Worker: build variants for one stored file and record them (idempotent)"""
+    from app.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        asset = db.query(ImageAsset).filter(ImageAsset.original_url == url).first()
+        if asset is not None and asset.status == READY and asset.sha256 == sha256 \
+                and _variants_on_disk(path, url, json.loads(asset.variants or "{}")):
+            return
+        if asset is None:
+            asset = ImageAsset(original_url=url)
+            db.add(asset)
+        asset.sha256 = sha256
+        asset.bytes = size
+        try:
+            meta = build_variants(path, url)
+        except Exception as e:
+            logger.warning("Image variants failed for %s: %s", url, e)
+            asset.status, asset.error, asset.variants = FAILED, str(e), None
+        else:
+            if meta is None:
+                asset.status, asset.variants = SKIPPED, None
+            else:
+                asset.status, asset.error = READY, None
+                asset.width, asset.height, asset.content_type = meta["width"], meta["height"], meta["content_type"]
+                asset.variants = json.dumps({"variants": meta["variants"], "srcset": meta["srcset"]})
+        asset.processed_at = datetime.utcnow()
+        db.commit()
+    except IntegrityError:
+        # Another worker recorded the same URL first
+        db.rollback()
+    except Exception as e:
+        db.rollback()
+        logger.error("Could not record image variants for %s: %s", url, e)
+    finally:
+        db.close()
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=IMAGE_WORKERS, thread_name_prefix="image-variants")
+        return _executor
+
+
+def schedule_variants(stored: StoredImage):
+    if not IMAGE_VARIANTS_ENABLED or Image is None:
+        return
+    _get_executor().submit(process_image, stored.path, stored.url, stored.sha256, stored.size)
+
+
+# ------------------------------------------------------------------- read
+
+def image_variants_for(db: Session, urls: Iterable[Optional[str]]) -> Dict[str, dict]:
+    """original URL -> {"variants": {...}, "srcset": {...}} for every URL with ready variants (one query)"""
+    wanted = {url for url in urls if url}
+    if not wanted:
+        return {}
+    rows = (
+        db.query(ImageAsset.original_url, ImageAsset.variants)
+        .filter(ImageAsset.original_url.in_(wanted), ImageAsset.status == READY)
+        .all()
+    )
+    return {url: json.loads(variants) for url, variants in rows if variants}
+
+
+def attach_image_variants(db: Session, objects: Iterable, url_attr: str = "image_url"):
+    """Set `image_variants` on each object from its `url_attr` (None when not ready); returns the objects"""
+    objects = [obj for obj in objects if obj is not None]
+    found = image_variants_for(db, (getattr(obj, url_attr, None) for obj in objects))
+    for obj in objects:
+        obj.image_variants = found.get(getattr(obj, url_attr, None))
+    return objects
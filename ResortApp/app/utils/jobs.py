@@ -0,0 +1,416 @@
+"""
+In-process background jobs for long admin operations.
+
+A job is a row in background_jobs plus a handler registered for its type with
+@job_handler("inventory.reconcile_stock"). submit_job() inserts the row and
+hands it to this worker's thread pool, so the request returns at once (202)
+and clients poll GET /api/jobs/{id}; POST /api/jobs/{id}/cancel asks a job to
+stop.
+
+Only one job of a type may be queued or running at a time, across all workers:
+a partial unique index on job_type over the active statuses rejects the second
+insert and submit_job() raises JobConflict with the active job. Endpoints that
+can also run the work within the request use job_inline(), which takes the
+same slot with a running job row for the duration of the request. An active job
+whose heartbeat is older than JOB_STALE_SECONDS (its worker died) is marked
+failed so the type is not blocked forever.
+
+Handlers are called as handler(job, **params). `job.db` is a Session of their
+own (they commit their work as the endpoint did); `job.progress()` records
+progress and raises JobCancelled once a cancel was requested. Progress,
+heartbeats and cancel requests are exchanged with the database by one monitor
+thread per worker, so a handler never waits on the jobs table (on SQLite a
+handler holding the write lock would otherwise block its own progress writes).
+"""
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Optional
+
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.models.job import (
+    BackgroundJob, QUEUED, RUNNING, SUCCEEDED, FAILED, CANCELLED, ACTIVE_JOB_STATUSES,
+)
+
+logger = logging.getLogger(__name__)
+
+# Jobs run concurrently per worker process (each holds one DB connection)
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+# An active job without a heartbeat for this long is considered abandoned
+JOB_STALE_SECONDS = int(os.getenv("JOB_STALE_SECONDS", "600"))
+
+# Monitor tick: progress flush and cancel poll
+_MONITOR_INTERVAL = 1.0
+# Heartbeat refresh for jobs whose progress has not changed
+_HEARTBEAT_INTERVAL = 30.0
+
+_handlers: Dict[str, Callable] = {}
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+# job id -> context of every job submitted by this worker and not finished yet
+_local: Dict[int, "JobContext"] = {}
+_local_lock = threading.Lock()
+_monitor: Optional[threading.Thread] = None
+
+
+class JobCancelled(Exception):
+    """Raised inside a handler once its job was cancelled"""
+
+
+class JobConflict(Exception):
+    """A job of the same type is already queued or running"""
+
+    def __init__(self, job: dict):
+        self.job = job
+        super().__init__(f"A {job['job_type']} job is already {job['status']} (job {job['id']})")
+
+
+def job_handler(job_type: str):
+    """Register `func(job, **params)` as the handler for `job_type`"""
+    def decorator(func):
+        _handlers[job_type] = func
+        return func
+    return decorator
+
+
+class JobContext:
+    """Handle passed to a running handler"""
+
+    def __init__(self, job_id: int, user_id: Optional[int] = None):
+        self.job_id = job_id
+        self.user_id = user_id
+        self.db: Optional[Session] = None
+        self.done = 0
+        self.total: Optional[int] = None
+        self.message: Optional[str] = None
+        self.cancelled = threading.Event()
+        self._version = 0
+        self._flushed_version = 0
+        self._flushed_at = 0.0
+
+    def progress(self, done: int, total: Optional[int] = None, message: Optional[str] = None):
+        """Record progress; raises JobCancelled if the job should stop"""
+        self.check_cancelled()
+        self.done = done
+        if total is not None:
+            self.total = total
+        if message is not None:
+            self.message = message[:255]
+        self._version += 1
+
+    def check_cancelled(self):
+        if self.cancelled.is_set():
+            raise JobCancelled()
+
+
+def _worker_name() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"[:100]
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=JOB_WORKERS, thread_name_prefix="job")
+        return _executor
+
+
+def _loads(value):
+    return json.loads(value) if value else None
+
+
+def job_to_dict(job: BackgroundJob, include_result: bool = True) -> dict:
+    percent = None
+    if job.progress_total:
+        percent = round(min(job.progress_done or 0, job.progress_total) / job.progress_total * 100, 1)
+    elif job.status == SUCCEEDED:
+        percent = 100.0
+    data = {
+        "id": job.id,
+        "job_type": job.job_type,
+        "status": job.status,
+        "params": _loads(job.params) or {},
+        "progress": {
+            "done": job.progress_done or 0,
+            "total": job.progress_total,
+            "percent": percent,
+            "message": job.progress_message,
+        },
+        "error": job.error,
+        "cancel_requested": bool(job.cancel_requested),
+        "created_by": job.created_by,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+    }
+    if include_result:
+        data["result"] = _loads(job.result)
+    return data
+
+
+def _is_stale(job: BackgroundJob) -> bool:
+    cutoff = datetime.utcnow() - timedelta(seconds=JOB_STALE_SECONDS)
+    return job.heartbeat_at is None or job.heartbeat_at < cutoff
+
+
+def _abandon(db: Session, job: BackgroundJob):
+    db.execute(update(BackgroundJob).where(
+        BackgroundJob.id == job.id,
+        BackgroundJob.status.in_(ACTIVE_JOB_STATUSES),
+    ).values(status=FAILED, finished_at=datetime.utcnow(),
+             error="Abandoned: the worker running this job stopped responding"))
+    db.commit()
+    logger.warning("Job %s (%s) abandoned by worker %s", job.id, job.job_type, job.worker)
+
+
+def _insert_job(db: Session, job_type: str, params: Optional[dict], user_id: Optional[int], **values) -> BackgroundJob:
+    """Insert an active job row; raises JobConflict if one of the type is already active"""
+    if job_type not in _handlers:
+        raise ValueError(f"Unknown job type: {job_type}")
+    params_json = json.dumps(jsonable_encoder(params or {}), sort_keys=True)
+
+    active = None
+    for _ in range(3):
+        job = BackgroundJob(job_type=job_type, params=params_json, created_by=user_id,
+                            heartbeat_at=datetime.utcnow(), **values)
+        db.add(job)
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            active = db.query(BackgroundJob).filter(
+                BackgroundJob.job_type == job_type,
+                BackgroundJob.status.in_(ACTIVE_JOB_STATUSES),
+            ).first()
+            if active is not None and _is_stale(active):
+                _abandon(db, active)
+            elif active is not None:
+                raise JobConflict(job_to_dict(active, include_result=False))
+            continue
+        return job
+    if active is not None:
+        raise JobConflict(job_to_dict(active, include_result=False))
+    raise RuntimeError(f"Could not queue {job_type} job")
+
+
+def submit_job(db: Session, job_type: str, params: Optional[dict] = None, user_id: Optional[int] = None) -> dict:
+    """Queue `job_type` on this worker's pool; raises JobConflict if one is already active"""
+    job = _insert_job(db, job_type, params, user_id, status=QUEUED)
+    data = job_to_dict(job)
+    _track(JobContext(job.id, user_id))
+    _get_executor().submit(_run, job.id)
+    logger.info("Job %s (%s) queued", job.id, job_type)
+    return data
+
+
+def job_accepted(db: Session, job_type: str, params: Optional[dict] = None, current_user=None) -> JSONResponse:
+    """submit_job() as an endpoint response: 202 with the job, or 409 with the active one"""
+    try:
+        job = submit_job(db, job_type, params, user_id=getattr(current_user, "id", None))
+    except JobConflict as e:
+        raise HTTPException(status_code=409, detail={"message": str(e), "job": e.job})
+    return JSONResponse(status_code=202, content=job, headers={"Location": f"/api/jobs/{job['id']}"})
+
+
+def job_inline(db: Session, job_type: str, params: Optional[dict] = None, current_user=None):
+    """
+    Run `job_type`'s handler within the request on `db` and return its result.
+
+    The run holds the type's one-active-job slot like a queued job (409 with the
+    active job if there is one) and is recorded as a job row, so it shows up in
+    GET /api/jobs and can be cancelled. Handler errors are re-raised.
+    """
+    user_id = getattr(current_user, "id", None)
+    try:
+        job = _insert_job(db, job_type, params, user_id, status=RUNNING, started_at=datetime.utcnow(),
+                          worker=_worker_name())
+    except JobConflict as e:
+        raise HTTPException(status_code=409, detail={"message": str(e), "job": e.job})
+
+    ctx = JobContext(job.id, user_id)
+    ctx.db = db
+    _track(ctx)
+    try:
+        result = _handlers[job_type](ctx, **(params or {}))
+    except JobCancelled:
+        db.rollback()
+        _finish(ctx, CANCELLED)
+        raise HTTPException(status_code=409, detail=f"Job {job.id} was cancelled")
+    except Exception as e:
+        db.rollback()
+        _finish(ctx, FAILED, error=str(getattr(e, "detail", None) or e) or type(e).__name__)
+        raise
+    finally:
+        _untrack(job.id)
+    _finish(ctx, SUCCEEDED, result=result)
+    return result
+
+
+def cancel_job(db: Session, job_id: int) -> Optional[dict]:
+    """Cancel a queued job at once; ask a running one to stop at its next progress() call"""
+    job = db.get(BackgroundJob, job_id)
+    if job is None:
+        return None
+    if job.status == QUEUED:
+        db.execute(update(BackgroundJob).where(BackgroundJob.id == job_id, BackgroundJob.status == QUEUED)
+                   .values(status=CANCELLED, cancel_requested=True, finished_at=datetime.utcnow()))
+    elif job.status == RUNNING:
+        db.execute(update(BackgroundJob).where(BackgroundJob.id == job_id, BackgroundJob.status == RUNNING)
+                   .values(cancel_requested=True))
+    db.commit()
+    db.refresh(job)
+    return job_to_dict(job)
+
+
+def _claim(job_id: int):
+    """queued -> running; returns (job_type, params, user_id), or None if it was cancelled meanwhile"""
+    db = SessionLocal()
+    try:
+        now = datetime.utcnow()
+        claimed = db.execute(update(BackgroundJob).where(
+            BackgroundJob.id == job_id, BackgroundJob.status == QUEUED,
+        ).values(status=RUNNING, started_at=now, heartbeat_at=now, worker=_worker_name())).rowcount
+        db.commit()
+        if not claimed:
+            return None
+        job = db.get(BackgroundJob, job_id)
+        return job.job_type, _loads(job.params) or {}, job.created_by
+    finally:
+        db.close()
+
+
+def _finish(ctx: JobContext, status: str, result=None, error: Optional[str] = None):
+    db = SessionLocal()
+    try:
+        db.execute(update(BackgroundJob).where(BackgroundJob.id == ctx.job_id).values(
+            status=status,
+            finished_at=datetime.utcnow(),
+            heartbeat_at=datetime.utcnow(),
+            progress_done=ctx.done,
+            progress_total=ctx.total,
+            progress_message=ctx.message,
+            result=json.dumps(jsonable_encoder(result), default=str) if result is not None else None,
+            error=error,
+        ))
+        db.commit()
+    except Exception:
+        logger.error("Could not record the outcome of job %s", ctx.job_id, exc_info=True)
+    finally:
+        db.close()
+
+
+def _run(job_id: int):
+    ctx = _local.get(job_id) or JobContext(job_id)
+    try:
+        claimed = _claim(job_id)
+        if claimed is None:
+            return
+        job_type, params, ctx.user_id = claimed
+        handler = _handlers[job_type]
+
+        started = time.perf_counter()
+        ctx.db = SessionLocal()
+        try:
+            result = handler(ctx, **params)
+        except JobCancelled:
+            ctx.db.rollback()
+            logger.info("Job %s (%s) cancelled", job_id, job_type)
+            _finish(ctx, CANCELLED)
+            return
+        except HTTPException as e:
+            # Handlers shared with endpoints reject bad input this way (unknown room, ...)
+            ctx.db.rollback()
+            logger.warning("Job %s (%s) rejected: %s", job_id, job_type, e.detail)
+            _finish(ctx, FAILED, error=str(e.detail))
+            return
+        except Exception as e:
+            ctx.db.rollback()
+            logger.error("Job %s (%s) failed", job_id, job_type, exc_info=True)
+            _finish(ctx, FAILED, error=str(e) or type(e).__name__)
+            return
+        finally:
+            ctx.db.close()
+        _finish(ctx, SUCCEEDED, result=result)
+        logger.info("Job %s (%s) finished in %.1fs", job_id, job_type, time.perf_counter() - started)
+    except Exception:
+        logger.error("Job %s could not be run", job_id, exc_info=True)
+    finally:
+        _untrack(job_id)
+
+
+# ------------------------------------------------------------------ monitor
+
+def _track(ctx: JobContext):
+    global _monitor
+    with _local_lock:
+        _local[ctx.job_id] = ctx
+        if _monitor is None or not _monitor.is_alive():
+            _monitor = threading.Thread(target=_monitor_loop, name="job-monitor", daemon=True)
+            _monitor.start()
+
+
+def _untrack(job_id: int):
+    with _local_lock:
+        _local.pop(job_id, None)
+
+
+def _monitor_loop():
+    global _monitor
+    while True:
+        with _local_lock:
+            contexts = list(_local.values())
+            if not contexts:
+                _monitor = None
+                return
+        try:
+            _sync(contexts)
+        except Exception as e:
+            logger.debug("Job monitor sync failed: %s", e)
+        time.sleep(_MONITOR_INTERVAL)
+
+
+def _sync(contexts):
+    """Write changed progress / due heartbeats for local jobs and pick up cancel requests"""
+    now = time.monotonic()
+    db = SessionLocal()
+    try:
+        flushed = []
+        for ctx in contexts:
+            version = ctx._version
+            if version == ctx._flushed_version and now - ctx._flushed_at < _HEARTBEAT_INTERVAL:
+                continue
+            db.execute(update(BackgroundJob).where(
+                BackgroundJob.id == ctx.job_id,
+                BackgroundJob.status.in_(ACTIVE_JOB_STATUSES),
+            ).values(progress_done=ctx.done, progress_total=ctx.total, progress_message=ctx.message,
+                     heartbeat_at=datetime.utcnow()))
+            flushed.append((ctx, version))
+        if flushed:
+            db.commit()
+            for ctx, version in flushed:
+                ctx._flushed_version = version
+                ctx._flushed_at = now
+
+        cancelled = set(db.execute(select(BackgroundJob.id).where(
+            BackgroundJob.id.in_([ctx.job_id for ctx in contexts]),
+            BackgroundJob.cancel_requested.is_(True),
+        )).scalars())
+        for ctx in contexts:
+            if ctx.job_id in cancelled:
+                ctx.cancelled.set()
+    finally:
+        db.close()
@@ -0,0 +1,87 @@
+"""
+Kitchen order ticket (KOT) queue: the open food orders kitchen screens work from.
+
+Order intake publishes a ticket on the "kitchen" event topic inside the order's
+transaction (app.utils.events.publish), so it is delivered only if the order
+commits and, on PostgreSQL, reaches every worker. Status changes go out on the
+"food_orders" topic.
+
+The queue itself is always read from the database, so every worker returns the
+same tickets. Its cursor is the order id, which all workers agree on: kitchen
+screens poll GET /food-orders/kitchen-queue?after=<cursor> for the tickets of
+newer orders, drop the ones no longer in open_ids, and re-read with after=0
+when open_ids holds an order they have not seen (a scheduled order released
+to the kitchen). They can also listen to the "kitchen" / "food_orders" topics
+on GET /events/stream.
+"""
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy.orm import Session, joinedload
+
+from app.models.foodorder import FoodOrder, FoodOrderItem
+from app.utils import events
+
+logger = logging.getLogger(__name__)
+
+KITCHEN_TOPIC = "kitchen"
+# Orders still waiting on the kitchen
+OPEN_ORDER_STATUSES = ("pending", "in_progress")
+# How far back a reload looks for open orders
+KITCHEN_QUEUE_HOURS = int(os.getenv("KITCHEN_QUEUE_HOURS", "24"))
+
+
+def make_ticket(order: FoodOrder, items: Iterable[FoodOrderItem], item_names: Dict[int, str],
+                room_number: Optional[str]) -> dict:
+    """Kitchen ticket for an order, from in-memory state (no lazy loads)"""
+    return {
+        "order_id": order.id,
+        "room_id": order.room_id,
+        "room_number": room_number,
+        "order_type": order.order_type,
+        "status": order.status,
+        "delivery_request": order.delivery_request,
+        "employee_id": order.assigned_employee_id,
+        "created_at": order.created_at.isoformat() if order.created_at else None,
+        "items": [
+            {"food_item_id": item.food_item_id, "name": item_names.get(item.food_item_id), "quantity": item.quantity}
+            for item in items
+        ],
+    }
+
+
+def publish_ticket(db: Session, ticket: dict):
+    """Queue the ticket for delivery when db's transaction commits"""
+    events.publish(db, KITCHEN_TOPIC, "FoodOrder", "created", ticket["order_id"], ticket)
+
+
+def open_tickets(db: Session, after: int = 0) -> dict:
+    """Tickets of open orders with id > after, the ids of every open order and the cursor to pass next time"""
+    since = datetime.utcnow() - timedelta(hours=KITCHEN_QUEUE_HOURS)
+    open_filter = (
+        FoodOrder.status.in_(OPEN_ORDER_STATUSES),
+        FoodOrder.created_at >= since,
+        FoodOrder.is_deleted == False
+    )
+    open_ids = [row[0] for row in db.query(FoodOrder.id).filter(*open_filter).order_by(FoodOrder.id)]
+    orders = []
+    if open_ids and open_ids[-1] > after:
+        orders = (
+            db.query(FoodOrder)
+            .options(joinedload(FoodOrder.items).joinedload(FoodOrderItem.food_item), joinedload(FoodOrder.room))
+            .filter(*open_filter, FoodOrder.id > after)
+            .order_by(FoodOrder.id)
+            .all()
+        )
+    tickets = []
+    for order in orders:
+        names = {item.food_item_id: item.food_item.name for item in order.items if item.food_item}
+        tickets.append(make_ticket(order, order.items, names, order.room.number if order.room else None))
+    return {
+        "cursor": max([after] + open_ids[-1:]),
+        "open": len(open_ids),
+        "open_ids": open_ids,
+        "tickets": tickets,
+    }
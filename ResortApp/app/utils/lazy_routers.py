@@ -0,0 +1,86 @@
+"""
+Deferred router registration for FAST_START mode.
+
+Heavy API modules (checkout, inventory, GST reports, ...) are registered as a
+path prefix + module name instead of being imported at boot. The first request
+under that prefix imports the module and includes its router; the docs/openapi
+endpoints load everything so the schema stays complete.
+"""
+import importlib
+import logging
+import threading
+from time import perf_counter
+from typing import List, Optional, Tuple
+
+from anyio import to_thread
+
+logger = logging.getLogger(__name__)
+
+# Paths that need every router registered to render correctly
+SCHEMA_PATHS = ("/openapi.json", "/docs", "/redoc")
+
+
+class LazyRouterRegistry:
+    """Routers registered by path prefix, imported and included on first use"""
+
+    def __init__(self, app, api_prefix: str = "/api"):
+        self.app = app
+        self.api_prefix = api_prefix
+        self._pending: List[Tuple[str, str, Optional[list]]] = []
+        self._lock = threading.Lock()
+
+    def add(self, path_prefix: str, module_name: str, tags: Optional[list] = None):
+        """Defer `module_name`'s router until a request under api_prefix + path_prefix"""
+        self._pending.append((self.api_prefix + path_prefix, module_name, tags))
+
+    @property
+    def pending(self) -> bool:
+        return bool(self._pending)
+
+    def _matches(self, path: str, full_prefix: str) -> bool:
+        return path == full_prefix or path.startswith(full_prefix + "/")
+
+    def load_for_path(self, path: str):
+        """Import and include every pending router whose prefix covers `path`"""
+        if path in SCHEMA_PATHS:
+            return self.load_all()
+        if not any(self._matches(path, prefix) for prefix, _, _ in self._pending):
+            return
+        # Load in registration order so route precedence matches eager registration
+        with self._lock:
+            for entry in list(self._pending):
+                if self._matches(path, entry[0]):
+                    self._include(entry)
+
+    def load_all(self):
+        with self._lock:
+            for entry in list(self._pending):
+                self._include(entry)
+
+    def _include(self, entry):
+        full_prefix, module_name, tags = entry
+        started = perf_counter()
+        try:
+            module = importlib.import_module(module_name)
+            self.app.include_router(module.router, prefix=self.api_prefix, tags=tags)
+            # Regenerate the cached OpenAPI schema with the new routes
+            self.app.openapi_schema = None
+            logger.info("Loaded deferred router %s (%s) in %.0f ms", module_name, full_prefix, (perf_counter() - started) * 1000)
+        except Exception as e:
+            logger.error("Failed to load deferred router %s: %s", module_name, e, exc_info=True)
+        finally:
+            self._pending.remove(entry)
+
+
+class LazyRouterMiddleware:
+    """ASGI middleware that loads deferred routers before the request is routed"""
+
+    def __init__(self, app, registry: LazyRouterRegistry):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] in ("http", "websocket") and self.registry.pending:
+            # Imports are blocking; keep them off the event loop
+            await to_thread.run_sync(self.registry.load_for_path, scope["path"])
+        await self.app(scope, receive, send)
@@ -0,0 +1,137 @@
+"""
+Non-blocking structured logging.
+
+Application loggers (``app.*`` and ``main``) hand records to a QueueHandler;
+a background QueueListener thread does the actual formatting and I/O, so the
+request path never blocks on stdout or disk.
+
+Configuration (environment variables):
+    LOG_LEVEL   - DEBUG / INFO / WARNING / ERROR (default: INFO)
+    LOG_FORMAT  - "json" for one JSON object per line, "text" for plain lines (default: json)
+    LOG_FILE    - optional file path written in addition to stdout
+
+Usage in modules:
+    logger = logging.getLogger(__name__)
+    logger.debug("Loaded %s items for service %s", len(items), service_id)
+
+Always pass values as arguments instead of pre-formatting with f-strings, so a
+disabled debug call costs only the level check. Noisy per-row sites can also
+be sampled:
+    logger.debug("Row %s", row_id, extra={"sample_rate": 0.05})
+"""
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import sys
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").strip().upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json").strip().lower()
+LOG_FILE = os.getenv("LOG_FILE")
+
+# Loggers owned by this application; third-party loggers keep their own config
+APP_LOGGERS = ("app", "main")
+
+request_id_var: ContextVar[str] = ContextVar("request_id", default="-")
+
+_listener = None
+_queue_handler = None
+
+
+def new_request_id(incoming: str = None) -> str:
+    """Use the caller's X-Request-ID when present, otherwise generate one"""
+    request_id = (incoming or "").strip()[:64] or uuid.uuid4().hex[:16]
+    request_id_var.set(request_id)
+    return request_id
+
+
+class RequestIdFilter(logging.Filter):
+    """Stamp each record with the request id of the request that emitted it"""
+
+    def filter(self, record):
+        record.request_id = request_id_var.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Keep only a fraction of records that carry a ``sample_rate`` extra"""
+
+    def filter(self, record):
+        rate = getattr(record, "sample_rate", None)
+        if rate is None or rate >= 1:
+            return True
+        return random.random() < rate
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        payload = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+            "request_id": getattr(record, "request_id", "-"),
+            "pid": record.process,
+        }
+        if record.exc_info:
+            payload["exc"] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+def _build_output_handlers():
+    if LOG_FORMAT == "json":
+        formatter = JsonFormatter()
+    else:
+        formatter = logging.Formatter("%(asctime)s %(levelname)s [%(request_id)s] %(name)s: %(message)s")
+
+    handlers = [logging.StreamHandler(sys.stdout)]
+    if LOG_FILE:
+        handlers.append(logging.FileHandler(LOG_FILE, encoding="utf-8"))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    return handlers
+
+
+def _start_listener():
+    """(Re)create the queue and its writer thread for the current process"""
+    global _listener
+    log_queue = queue.SimpleQueue()
+    _queue_handler.queue = log_queue
+    _listener = QueueListener(log_queue, *_build_output_handlers(), respect_handler_level=True)
+    _listener.start()
+
+
+def _stop_listener():
+    if _listener is not None:
+        _listener.stop()
+
+
+def setup_logging():
+    """Install the queue-based handler on the application loggers (idempotent)"""
+    global _queue_handler
+    if _queue_handler is not None:
+        return
+
+    level = getattr(logging, LOG_LEVEL, logging.INFO)
+    _queue_handler = QueueHandler(queue.SimpleQueue())
+    _queue_handler.addFilter(SamplingFilter())
+    _queue_handler.addFilter(RequestIdFilter())
+
+    for name in APP_LOGGERS:
+        app_logger = logging.getLogger(name)
+        app_logger.setLevel(level)
+        app_logger.addHandler(_queue_handler)
+        app_logger.propagate = False
+
+    _start_listener()
+    atexit.register(_stop_listener)
+    # gunicorn preloads the app in the master and forks workers; threads don't
+    # survive fork, so each worker starts its own writer thread
+    if hasattr(os, "register_at_fork"):
+        os.register_at_fork(after_in_child=_start_listener)
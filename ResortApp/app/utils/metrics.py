@@ -0,0 +1,269 @@
+"""
+Prometheus metrics for the Resort Management System.
+
+Exposes per-route latency histograms, status codes, in-flight requests,
+DB pool usage, replica routing and lag, threadpool saturation, admission
+queues and background task health at /metrics.
+
+Under gunicorn each UvicornWorker is a separate process; set
+PROMETHEUS_MULTIPROC_DIR (done in gunicorn.conf.py) so every worker writes
+its samples to a shared directory and a scrape of any worker returns the
+aggregate across all of them.
+
+prometheus_client is optional: without it every function here is a no-op
+and /metrics returns 503.
+"""
+import os
+import time
+from typing import Optional
+
+try:
+    from prometheus_client import (
+        CONTENT_TYPE_LATEST,
+        CollectorRegistry,
+        Counter,
+        Gauge,
+        Histogram,
+        generate_latest,
+        multiprocess,
+    )
+    PROMETHEUS_AVAILABLE = True
+except ImportError:  # pragma: no cover - optional dependency
+    PROMETHEUS_AVAILABLE = False
+    CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+
+METRICS_ENABLED = PROMETHEUS_AVAILABLE and os.getenv("METRICS_ENABLED", "true").strip().lower() in ("1", "true", "yes", "on")
+MULTIPROCESS_MODE = bool(os.getenv("PROMETHEUS_MULTIPROC_DIR"))
+
+# Latency buckets tuned for an API where most calls are 10ms-2s and a few reports run 30s+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+POOL_WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0)
+
+# Engines whose pool occupancy is refreshed after every request
+_instrumented_engines = []
+
+# Label used for requests that did not match any route, so 404 scans cannot
+# blow up the label cardinality
+UNMATCHED_ROUTE = "__unmatched__"
+
+if METRICS_ENABLED:
+    HTTP_REQUESTS = Counter(
+        "http_requests_total",
+        "HTTP requests by route template and status code",
+        ["method", "route", "status"],
+    )
+    HTTP_LATENCY = Histogram(
+        "http_request_duration_seconds",
+        "HTTP request latency by route template",
+        ["method", "route"],
+        buckets=LATENCY_BUCKETS,
+    )
+    HTTP_IN_FLIGHT = Gauge(
+        "http_requests_in_flight",
+        "Requests currently being processed",
+        multiprocess_mode="livesum",
+    )
+    DB_POOL_WAIT = Histogram(
+        "db_pool_checkout_wait_seconds",
+        "Time spent waiting for a connection from the SQLAlchemy pool",
+        buckets=POOL_WAIT_BUCKETS,
+    )
+    DB_POOL_SIZE = Gauge(
+        "db_pool_size",
+        "Configured pool size (summed across live workers)",
+        multiprocess_mode="livesum",
+    )
+    DB_POOL_CHECKED_OUT = Gauge(
+        "db_pool_checked_out",
+        "Connections currently checked out of the pool (summed across live workers)",
+        multiprocess_mode="livesum",
+    )
+    DB_POOL_OVERFLOW = Gauge(
+        "db_pool_overflow",
+        "Overflow connections currently open (summed across live workers)",
+        multiprocess_mode="livesum",
+    )
+    THREADPOOL_IN_USE = Gauge(
+        "threadpool_threads_in_use",
+        "Threadpool tokens borrowed by sync endpoints (summed across live workers)",
+        multiprocess_mode="livesum",
+    )
+    THREADPOOL_CAPACITY = Gauge(
+        "threadpool_threads_capacity",
+        "Threadpool size available to sync endpoints (summed across live workers)",
+        multiprocess_mode="livesum",
+    )
+    DB_READ_ROUTES = Counter(
+        "db_read_routes_total",
+        "Sessions handed to read-only endpoints by target (replica, primary) and reason",
+        ["target", "reason"],
+    )
+    DB_REPLICA_LAG = Gauge(
+        "db_replica_lag_seconds",
+        "Read replica lag at the last check (max across live workers)",
+        multiprocess_mode="livemax",
+    )
+    ADMISSION_QUEUE_DEPTH = Gauge(
+        "admission_queue_depth",
+        "Requests waiting for admission by cost class (summed across live workers)",
+        ["cost_class"],
+        multiprocess_mode="livesum",
+    )
+    ADMISSION_IN_FLIGHT = Gauge(
+        "admission_in_flight",
+        "Requests currently being processed by cost class (summed across live workers)",
+        ["cost_class"],
+        multiprocess_mode="livesum",
+    )
+    ADMISSION_WAIT = Histogram(
+        "admission_wait_seconds",
+        "Time admitted requests spent queued by cost class",
+        ["cost_class"],
+        buckets=POOL_WAIT_BUCKETS,
+    )
+    ADMISSION_REJECTED = Counter(
+        "admission_rejected_total",
+        "Requests turned away with 429 by cost class and reason (queue_full, timeout)",
+        ["cost_class", "reason"],
+    )
+    BACKGROUND_TASK_LAST_SUCCESS = Gauge(
+        "background_task_last_success_timestamp_seconds",
+        "Unix time of the last successful background task run",
+        ["task"],
+        multiprocess_mode="max",
+    )
+    BACKGROUND_TASK_ERRORS = Counter(
+        "background_task_errors_total",
+        "Background task runs that raised an exception",
+        ["task"],
+    )
+
+
+def route_label(request) -> str:
+    """Templated route path (e.g. /api/bookings/{booking_id}) for a request"""
+    route = request.scope.get("route")
+    path = getattr(route, "path", None)
+    return path or UNMATCHED_ROUTE
+
+
+def request_started():
+    if METRICS_ENABLED:
+        HTTP_IN_FLIGHT.inc()
+        _update_threadpool_gauges()
+
+
+def request_finished(request, status_code: int, duration: float):
+    if not METRICS_ENABLED:
+        return
+    HTTP_IN_FLIGHT.dec()
+    _update_threadpool_gauges()
+    for engine in _instrumented_engines:
+        update_pool_gauges(engine.pool)
+    route = route_label(request)
+    HTTP_REQUESTS.labels(request.method, route, str(status_code)).inc()
+    HTTP_LATENCY.labels(request.method, route).observe(duration)
+
+
+def _update_threadpool_gauges():
+    try:
+        from anyio.to_thread import current_default_thread_limiter
+        limiter = current_default_thread_limiter()
+        THREADPOOL_IN_USE.set(limiter.borrowed_tokens)
+        THREADPOOL_CAPACITY.set(limiter.total_tokens)
+    except Exception:
+        # Only available inside the event loop
+        pass
+
+
+def observe_pool_wait(seconds: float):
+    if METRICS_ENABLED:
+        DB_POOL_WAIT.observe(seconds)
+
+
+def update_pool_gauges(pool):
+    if not METRICS_ENABLED:
+        return
+    try:
+        DB_POOL_SIZE.set(pool.size())
+        DB_POOL_CHECKED_OUT.set(pool.checkedout())
+        DB_POOL_OVERFLOW.set(max(pool.overflow(), 0))
+    except Exception:
+        # Non-queue pools (e.g. StaticPool in tests) don't expose these
+        pass
+
+
+def instrument_engine_pool(engine):
+    """Feed checkout wait times and pool occupancy from an engine into the metrics"""
+    if not METRICS_ENABLED:
+        return
+    from sqlalchemy import event
+    from app.utils.db_metrics import pool_wait_observers
+
+    if observe_pool_wait not in pool_wait_observers:
+        pool_wait_observers.append(observe_pool_wait)
+
+    def _on_checkout(*args):
+        update_pool_gauges(engine.pool)
+
+    # Checkins are picked up by the refresh at the end of each request, since
+    # the pool counters aren't decremented yet when the checkin event fires
+    event.listen(engine, "checkout", _on_checkout)
+    _instrumented_engines.append(engine)
+    update_pool_gauges(engine.pool)
+
+
+def record_read_route(target: str, reason: str):
+    if METRICS_ENABLED:
+        DB_READ_ROUTES.labels(target, reason).inc()
+
+
+def set_replica_lag(seconds: float):
+    if METRICS_ENABLED:
+        DB_REPLICA_LAG.set(seconds)
+
+
+def admission_queue_changed(cost_class: str, delta: int):
+    if METRICS_ENABLED:
+        ADMISSION_QUEUE_DEPTH.labels(cost_class).inc(delta)
+
+
+def admission_in_flight_changed(cost_class: str, delta: int):
+    if METRICS_ENABLED:
+        ADMISSION_IN_FLIGHT.labels(cost_class).inc(delta)
+
+
+def observe_admission_wait(cost_class: str, seconds: float):
+    if METRICS_ENABLED:
+        ADMISSION_WAIT.labels(cost_class).observe(seconds)
+
+
+def record_admission_rejected(cost_class: str, reason: str):
+    if METRICS_ENABLED:
+        ADMISSION_REJECTED.labels(cost_class, reason).inc()
+
+
+def record_background_success(task: str):
+    if METRICS_ENABLED:
+        BACKGROUND_TASK_LAST_SUCCESS.labels(task).set(time.time())
+
+
+def record_background_error(task: str):
+    if METRICS_ENABLED:
+        BACKGROUND_TASK_ERRORS.labels(task).inc()
+
+
+def render_metrics() -> Optional[bytes]:
+    """Prometheus text exposition, aggregated across workers in multiprocess mode"""
+    if not METRICS_ENABLED:
+        return None
+    if MULTIPROCESS_MODE:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest()
+
+
+def mark_worker_dead(pid: int):
+    """Called from gunicorn's child_exit hook so live gauges drop the dead worker"""
+    if PROMETHEUS_AVAILABLE and MULTIPROCESS_MODE:
+        multiprocess.mark_process_dead(pid)
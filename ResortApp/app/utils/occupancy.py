@@ -0,0 +1,245 @@
+"""
+Current-occupancy resolver: room number -> room -> current stay (booking or package booking).
+
+Every worker keeps an in-process map of rooms and their active stays. Each
+resolve checks one version token (system setting "occupancy_version") and
+rebuilds the map only when it moved, so room-scoped requests resolve their stay
+without the BookingRoom/PackageBookingRoom join queries.
+
+The token is bumped in its own short transaction right after a commit that
+changed bookings, booking rooms or rooms (flushed, or reported through
+bulk_writes.bulk_written()). Bumping inside the booking transaction would hold
+the setting's row lock until that commit and serialize every booking write on
+it. Other workers may keep serving the old map for the moment between the two
+commits.
+
+Precedence matches the original per-endpoint lookups: latest active regular
+booking, then (optionally) latest checked-out regular booking, then the same two
+for package bookings.
+"""
+import logging
+import threading
+import uuid
+from collections import namedtuple
+from typing import Optional
+
+from sqlalchemy import event, select, update
+from sqlalchemy.orm import Session
+
+from app.models.booking import Booking, BookingRoom
+from app.models.Package import PackageBooking, PackageBookingRoom
+from app.models.room import Room
+from app.models.settings import SystemSetting
+from app.database import engine
+from app.utils.booking_status import ACTIVE_BOOKING_STATUSES, CHECKED_OUT
+from app.utils.bulk_writes import add_bulk_write_observer
+
+logger = logging.getLogger(__name__)
+
+
+VERSION_SETTING = "occupancy_version"
+
+# booking_id is the latest active regular / package booking for the room (or None)
+RoomOccupancy = namedtuple("RoomOccupancy", ["room_id", "room_number", "booking_id", "package_booking_id"])
+
+# Model -> attributes whose change can move a room's current stay (inserts/deletes always count)
+_TRACKED = {
+    Booking: ("status",),
+    PackageBooking: ("status",),
+    BookingRoom: ("booking_id", "room_id"),
+    PackageBookingRoom: ("package_booking_id", "room_id"),
+    Room: ("number",),
+}
+
+
+class _Snapshot:
+    def __init__(self, version, by_number, by_room_id):
+        self.version = version
+        self.by_number = by_number
+        self.by_room_id = by_room_id
+
+
+_snapshot: Optional[_Snapshot] = None
+_lock = threading.Lock()
+
+
+def _current_version(db: Session) -> Optional[str]:
+    return db.query(SystemSetting.value).filter(SystemSetting.key == VERSION_SETTING).scalar()
+
+
+def _ensure_version_row(db: Session) -> str:
+    """Create the version setting on first use (outside any booking transaction)"""
+    token = uuid.uuid4().hex
+    try:
+        with db.get_bind().begin() as conn:
+            conn.execute(SystemSetting.__table__.insert().values(
+                key=VERSION_SETTING,
+                value=token,
+                description="Changes whenever room occupancy changes; invalidates cached occupancy maps",
+            ))
+        return token
+    except Exception:
+        # Another worker created it first
+        return _current_version(db)
+
+
+def _latest_by_room(db: Session, link_model, booking_model, fk) -> dict:
+    rows = db.execute(
+        select(link_model.room_id, booking_model.id)
+        .join(booking_model, fk == booking_model.id)
+        .where(booking_model.status.in_(ACTIVE_BOOKING_STATUSES))
+    ).all()
+    latest = {}
+    for room_id, booking_id in rows:
+        if room_id is not None and booking_id > latest.get(room_id, 0):
+            latest[room_id] = booking_id
+    return latest
+
+
+def _build_snapshot(db: Session, version: str) -> _Snapshot:
+    regular = _latest_by_room(db, BookingRoom, Booking, BookingRoom.booking_id)
+    packages = _latest_by_room(db, PackageBookingRoom, PackageBooking, PackageBookingRoom.package_booking_id)
+    by_number, by_room_id = {}, {}
+    for room_id, number in db.execute(select(Room.id, Room.number)).all():
+        entry = RoomOccupancy(room_id, number, regular.get(room_id), packages.get(room_id))
+        by_room_id[room_id] = entry
+        if number is not None:
+            by_number[str(number).strip()] = entry
+    return _Snapshot(version, by_number, by_room_id)
+
+
+def _snapshot_for(db: Session) -> _Snapshot:
+    global _snapshot
+    version = _current_version(db)
+    snapshot = _snapshot
+    if snapshot is not None and version is not None and snapshot.version == version:
+        return snapshot
+    with _lock:
+        if _snapshot is not None and version is not None and _snapshot.version == version:
+            return _snapshot
+        if version is None:
+            version = _ensure_version_row(db)
+        _snapshot = _build_snapshot(db, version)
+        logger.debug("Occupancy map rebuilt: %d rooms", len(_snapshot.by_room_id))
+        return _snapshot
+
+
+def room_occupancy(db: Session, room_number=None, room_id=None) -> Optional[RoomOccupancy]:
+    """Cached room/stay ids for a room number (or id); None when the room does not exist"""
+    snapshot = _snapshot_for(db)
+    if room_id is not None:
+        return snapshot.by_room_id.get(room_id)
+    return snapshot.by_number.get(str(room_number).strip()) if room_number is not None else None
+
+
+def _latest_checked_out(db: Session, link_model, booking_model, fk, room_id):
+    return (db.query(booking_model)
+            .join(link_model, fk == booking_model.id)
+            .filter(link_model.room_id == room_id, booking_model.status == CHECKED_OUT)
+            .order_by(booking_model.id.desc()).first())
+
+
+def resolve_room_stay(db: Session, room_number: str, include_checked_out: bool = False):
+    """
+    Room number -> (room, booking, is_package).
+
+    room is None when the number is unknown; booking is None when the room has
+    no current stay. With include_checked_out, the most recently checked-out
+    stay is returned when there is no active one (bill recalculation after a
+    checkout).
+    """
+    occupancy = room_occupancy(db, room_number=room_number)
+    if occupancy is None:
+        return None, None, False
+    room = db.get(Room, occupancy.room_id)
+    if room is None:
+        return None, None, False
+
+    if occupancy.booking_id is not None:
+        return room, db.get(Booking, occupancy.booking_id), False
+    if include_checked_out:
+        booking = _latest_checked_out(db, BookingRoom, Booking, BookingRoom.booking_id, room.id)
+        if booking is not None:
+            return room, booking, False
+    if occupancy.package_booking_id is not None:
+        return room, db.get(PackageBooking, occupancy.package_booking_id), True
+    if include_checked_out:
+        booking = _latest_checked_out(db, PackageBookingRoom, PackageBooking, PackageBookingRoom.package_booking_id, room.id)
+        if booking is not None:
+            return room, booking, True
+    return room, None, False
+
+
+def current_stay_for_room_id(db: Session, room_id):
+    """Room id -> (booking, is_package) of the active stay, or (None, False)"""
+    occupancy = room_occupancy(db, room_id=room_id)
+    if occupancy is None:
+        return None, False
+    if occupancy.booking_id is not None:
+        return db.get(Booking, occupancy.booking_id), False
+    if occupancy.package_booking_id is not None:
+        return db.get(PackageBooking, occupancy.package_booking_id), True
+    return None, False
+
+
+def _touches_occupancy(session) -> bool:
+    for obj in list(session.new) + list(session.deleted):
+        if type(obj) in _TRACKED:
+            return True
+    for obj in session.dirty:
+        attrs = _TRACKED.get(type(obj))
+        if attrs:
+            state = obj._sa_instance_state
+            if any(state.attrs[attr].history.has_changes() for attr in attrs):
+                return True
+    return False
+
+
+def _flag_flush(session, flush_context, instances):
+    if _touches_occupancy(session):
+        session.info["occupancy_changed"] = True
+
+
+def _flag_bulk(session, model, op):
+    if model in _TRACKED:
+        session.info["occupancy_changed"] = True
+
+
+def _bump_version():
+    try:
+        with engine.begin() as conn:
+            conn.execute(
+                update(SystemSetting).where(SystemSetting.key == VERSION_SETTING).values(value=uuid.uuid4().hex)
+            )
+    except Exception as e:
+        logger.warning("Occupancy version bump failed: %s", e)
+
+
+def _after_commit(session):
+    global _snapshot
+    # SAVEPOINT releases fire this too; bump once the outer transaction is committed
+    if session.in_nested_transaction():
+        return
+    if session.info.pop("occupancy_changed", None):
+        _bump_version()
+        _snapshot = None
+
+
+def _after_rollback(session):
+    if session.in_nested_transaction():
+        return
+    session.info.pop("occupancy_changed", None)
+
+
+_listeners_installed = False
+
+
+def install_occupancy_listeners():
+    global _listeners_installed
+    if _listeners_installed:
+        return
+    event.listen(Session, "before_flush", _flag_flush)
+    add_bulk_write_observer(_flag_bulk)
+    event.listen(Session, "after_commit", _after_commit)
+    event.listen(Session, "after_rollback", _after_rollback)
+    _listeners_installed = True
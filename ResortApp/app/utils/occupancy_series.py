@@ -0,0 +1,166 @@
+"""
+Date-range occupancy engine: per-night occupancy, ADR, RevPAR, arrivals,
+departures and in-house counts for every day of a window at once.
+
+Room stays (booking x room and package booking x room) overlapping the window
+are read in one query per booking type and turned into columns (first night,
+departure day, nightly rate, guests). Each stay adds +1 at its first night and
+-1 at its departure on a day axis; a cumulative sum over the axis gives the
+rooms in house every night, and the same pass with the nightly rate gives room
+revenue. The work is O(stays + days), whatever the window length.
+
+Cancelled and no-show stays are left out; checked-out stays count, so past
+nights report what was actually occupied. Nightly rates follow billing: the
+room's rate for regular bookings, the package price per room per night for
+room-type packages and the package price spread over every room and night for
+whole-property packages.
+"""
+from datetime import date, timedelta
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.models.booking import Booking, BookingRoom
+from app.models.Package import Package, PackageBooking, PackageBookingRoom
+from app.models.room import Room
+from app.utils.booking_status import BOOKED, CHECKED_IN, CHECKED_OUT
+
+# Stays that occupied (or will occupy) their rooms
+ROOM_NIGHT_STATUSES = (BOOKED, CHECKED_IN, CHECKED_OUT)
+
+# Longest window one request may ask for
+MAX_SERIES_DAYS = 366
+
+
+def _is_whole_property(booking_type, room_types) -> bool:
+    # Same rule as checkout billing: legacy packages without room types cover the whole property
+    if booking_type:
+        return booking_type.lower() in ("whole_property", "whole property")
+    return not room_types or not room_types.strip()
+
+
+def _regular_stays(db: Session, start: date, end: date):
+    return (db.query(BookingRoom.booking_id, Booking.check_in, Booking.check_out,
+                     Booking.adults, Booking.children, Room.price)
+            .join(Booking, BookingRoom.booking_id == Booking.id)
+            .join(Room, BookingRoom.room_id == Room.id)
+            .filter(Booking.status.in_(ROOM_NIGHT_STATUSES),
+                    Booking.check_in <= end,
+                    Booking.check_out >= start)
+            .all())
+
+
+def _package_stays(db: Session, start: date, end: date):
+    rows = (db.query(PackageBookingRoom.package_booking_id, PackageBooking.check_in, PackageBooking.check_out,
+                     PackageBooking.adults, PackageBooking.children,
+                     Package.price, Package.booking_type, Package.room_types)
+            .join(PackageBooking, PackageBookingRoom.package_booking_id == PackageBooking.id)
+            .outerjoin(Package, PackageBooking.package_id == Package.id)
+            .filter(PackageBooking.status.in_(ROOM_NIGHT_STATUSES),
+                    PackageBooking.check_in <= end,
+                    PackageBooking.check_out >= start)
+            .all())
+    rooms_per_booking = {}
+    for row in rows:
+        rooms_per_booking[row[0]] = rooms_per_booking.get(row[0], 0) + 1
+
+    stays = []
+    for booking_id, check_in, check_out, adults, children, price, booking_type, room_types in rows:
+        rate = float(price or 0)
+        if _is_whole_property(booking_type, room_types):
+            nights = max(1, (check_out - check_in).days)
+            rate = rate / nights / rooms_per_booking[booking_id]
+        stays.append((booking_id, check_in, check_out, adults, children, rate))
+    return stays
+
+
+def _columns(stays, booking_offset: int = 0):
+    """Stay tuples -> (booking key, check-in ordinal, check-out ordinal, guests, nightly rate) arrays"""
+    if not stays:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, empty, empty, np.zeros(0, dtype=np.float64)
+    booking_ids, check_ins, check_outs, adults, children, rates = zip(*stays)
+    return (
+        np.fromiter(booking_ids, dtype=np.int64) + booking_offset,
+        np.fromiter((d.toordinal() for d in check_ins), dtype=np.int64),
+        np.fromiter((d.toordinal() for d in check_outs), dtype=np.int64),
+        np.fromiter(((a or 0) + (c or 0) for a, c in zip(adults, children)), dtype=np.int64),
+        np.fromiter((float(r or 0) for r in rates), dtype=np.float64),
+    )
+
+
+def _day_counts(days: int, positions):
+    """How many of `positions` (day indexes, out-of-window ones ignored) fall on each day"""
+    positions = positions[(positions >= 0) & (positions < days)]
+    return np.bincount(positions, minlength=days)
+
+
+def occupancy_series(db: Session, start: date, end: date) -> list:
+    """One row per day from `start` to `end` inclusive (see the module docstring for the rules)"""
+    days = (end - start).days + 1
+    if days <= 0:
+        return []
+    total_rooms = db.query(func.count(Room.id)).scalar() or 0
+
+    regular = _columns(_regular_stays(db, start, end))
+    # Package booking ids share the key space with regular ones; shift them past every regular id
+    offset = int(regular[0].max()) + 1 if len(regular[0]) else 0
+    package = _columns(_package_stays(db, start, end), booking_offset=offset)
+    booking_keys, check_ins, check_outs, guests, rates = (np.concatenate(pair) for pair in zip(regular, package))
+
+    origin = start.toordinal()
+    first = check_ins - origin
+    departure = check_outs - origin
+
+    # Nights in the window: [max(first, 0), min(departure, days))
+    night_from = np.clip(first, 0, days)
+    night_to = np.clip(departure, 0, days)
+    has_nights = night_from < night_to
+    rooms_delta = np.zeros(days + 1, dtype=np.int64)
+    revenue_delta = np.zeros(days + 1, dtype=np.float64)
+    np.add.at(rooms_delta, night_from[has_nights], 1)
+    np.add.at(rooms_delta, night_to[has_nights], -1)
+    np.add.at(revenue_delta, night_from[has_nights], rates[has_nights])
+    np.add.at(revenue_delta, night_to[has_nights], -rates[has_nights])
+    occupied = np.cumsum(rooms_delta)[:days]
+    room_revenue = np.cumsum(revenue_delta)[:days]
+
+    # Guests belong to the booking, not to each of its rooms: count them on one stay per booking
+    _, booking_first_row = np.unique(booking_keys, return_index=True)
+    guest_rows = np.zeros(len(booking_keys), dtype=bool)
+    guest_rows[booking_first_row] = True
+    guest_rows &= has_nights
+    guests_delta = np.zeros(days + 1, dtype=np.int64)
+    np.add.at(guests_delta, night_from[guest_rows], guests[guest_rows])
+    np.add.at(guests_delta, night_to[guest_rows], -guests[guest_rows])
+    in_house_guests = np.cumsum(guests_delta)[:days]
+
+    arrivals = _day_counts(days, first)
+    departures = _day_counts(days, departure)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        adr = np.where(occupied > 0, room_revenue / occupied, 0.0)
+    if total_rooms:
+        occupancy_pct = occupied / total_rooms * 100
+        revpar = room_revenue / total_rooms
+    else:
+        occupancy_pct = np.zeros(days)
+        revpar = np.zeros(days)
+
+    return [
+        {
+            "date": (start + timedelta(days=i)).isoformat(),
+            "total_rooms": total_rooms,
+            "occupied_rooms": int(occupied[i]),
+            "vacant_rooms": max(0, total_rooms - int(occupied[i])),
+            "occupancy_percentage": round(float(occupancy_pct[i]), 2),
+            "arrivals": int(arrivals[i]),
+            "departures": int(departures[i]),
+            "in_house_guests": int(in_house_guests[i]),
+            "room_revenue": round(float(room_revenue[i]), 2),
+            "adr": round(float(adr[i]), 2),
+            "revpar": round(float(revpar[i]), 2),
+        }
+        for i in range(days)
+    ]
@@ -0,0 +1,232 @@
+"""
+Read-replica routing for report and analytics endpoints.
+
+With DATABASE_READ_URL set, read-only endpoints (GST registers, comprehensive
+reports, the reports module) take their session from get_read_db instead of
+get_db and are served by the replica, unless:
+
+  * the replica was more than READ_REPLICA_MAX_LAG seconds behind, or could
+    not be reached, at its last check (each worker checks at most every
+    READ_REPLICA_LAG_CHECK_INTERVAL seconds);
+  * the user committed a write in the last READ_REPLICA_STICKY_SECONDS (never
+    less than the lag threshold), so they always read their own writes.
+
+Then, and without DATABASE_READ_URL, get_read_db returns the request's primary
+session. Replica sessions refuse to flush.
+
+Writes are attributed through the request's primary session: get_current_user
+records the principal's id in session.info, and a commit that flushed or
+reported a bulk write (bulk_writes.bulk_written) marks that user. Marks are touched files in
+READ_REPLICA_STATE_DIR (tmpfs), so a write handled by one gunicorn worker sends
+the user's next report to the primary on every worker.
+
+Local testing: point DATABASE_READ_URL at a second Postgres instance streaming
+from the first, or at a copy of the SQLite file. SQLite copies report no lag;
+rows written after the copy show exactly which reads went where.
+"""
+import logging
+import os
+import tempfile
+import threading
+import time
+from typing import Optional, Tuple
+
+from fastapi import Depends
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from app.database import READ_REPLICA_INFO_KEY, SQLALCHEMY_READ_DATABASE_URL, get_db, get_read_engine, new_read_session
+from app.utils import metrics
+from app.utils.auth import SESSION_USER_KEY, get_current_user
+from app.utils.bulk_writes import add_bulk_write_observer
+
+logger = logging.getLogger(__name__)
+
+
+def _str_to_bool(value: str) -> bool:
+    return str(value).strip().lower() in ("1", "true", "yes", "on")
+
+
+READ_REPLICA_ENABLED = bool(SQLALCHEMY_READ_DATABASE_URL) and _str_to_bool(os.getenv("READ_REPLICA_ENABLED", "true"))
+READ_REPLICA_MAX_LAG = float(os.getenv("READ_REPLICA_MAX_LAG", "5"))
+READ_REPLICA_LAG_CHECK_INTERVAL = float(os.getenv("READ_REPLICA_LAG_CHECK_INTERVAL", "2"))
+# A write is on the replica after at most MAX_LAG seconds, or the replica is not used
+READ_REPLICA_STICKY_SECONDS = max(float(os.getenv("READ_REPLICA_STICKY_SECONDS", "10")), READ_REPLICA_MAX_LAG)
+READ_REPLICA_STATE_DIR = os.getenv("READ_REPLICA_STATE_DIR") or os.path.join(
+    "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir(), "orchid_recent_writes"
+)
+
+# session.info key: the session wrote something in its current transaction
+_WROTE_KEY = "read_replica.wrote"
+
+# Seconds since the last replayed transaction; 0 when all received WAL is replayed
+# (an idle primary sends nothing, which must not read as growing lag)
+_PG_LAG_SQL = text(
+    "SELECT CASE"
+    " WHEN NOT pg_is_in_recovery() THEN 0"
+    " WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0"
+    " ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)"
+    " END"
+)
+
+
+def measure_replica_lag(conn) -> float:
+    """Replication lag in seconds seen from a replica connection (0 for non-Postgres copies)"""
+    if conn.dialect.name != "postgresql":
+        return 0.0
+    return float(conn.execute(_PG_LAG_SQL).scalar() or 0.0)
+
+
+class ReplicaHealth:
+    """Last measured replica lag, re-measured by one thread at a time once it is older than the interval"""
+
+    def __init__(self, max_lag: float, check_interval: float):
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.lag: Optional[float] = None  # None: never measured or unreachable
+        self._checked_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def _refresh(self):
+        try:
+            with get_read_engine().connect() as conn:
+                lag = measure_replica_lag(conn)
+        except Exception as e:
+            if self.lag is not None or self._checked_at is None:
+                logger.warning("Read replica unreachable, reading from the primary: %s", e)
+            lag = None
+        else:
+            if self.lag is not None and self.lag <= self.max_lag < lag:
+                logger.warning("Read replica %.1fs behind (limit %.1fs), reading from the primary", lag, self.max_lag)
+            metrics.set_replica_lag(lag)
+        self.lag = lag
+        self._checked_at = time.monotonic()
+
+    def usable(self) -> Tuple[bool, str]:
+        """(replica may serve reads, reason)"""
+        stale = self._checked_at is None or time.monotonic() - self._checked_at >= self.check_interval
+        # Requests arriving during a check use the previous result
+        if stale and self._lock.acquire(blocking=False):
+            try:
+                self._refresh()
+            finally:
+                self._lock.release()
+        if self.lag is None:
+            return False, "unavailable"
+        if self.lag > self.max_lag:
+            return False, "lag"
+        return True, "ok"
+
+
+class RecentWrites:
+    """Users who committed a write in the last `window` seconds, shared across workers via file mtimes"""
+
+    def __init__(self, window: float, directory: str):
+        self.window = window
+        self.directory = directory
+        self._shared = True
+        self._local = {}  # user id -> time of this worker's last write mark
+
+    def _path(self, user_id) -> str:
+        return os.path.join(self.directory, str(int(user_id)))
+
+    def mark(self, user_id):
+        now = time.time()
+        self._local[user_id] = now
+        if len(self._local) > 1024:
+            cutoff = now - self.window
+            self._local = {k: v for k, v in self._local.items() if v >= cutoff}
+        if not self._shared:
+            return
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(self._path(user_id), "a"):
+                pass
+            os.utime(self._path(user_id))
+        except OSError as e:
+            logger.warning("Recent-write marks unavailable in %s (%s); tracking per worker only", self.directory, e)
+            self._shared = False
+
+    def recent(self, user_id) -> bool:
+        cutoff = time.time() - self.window
+        if self._local.get(user_id, 0) >= cutoff:
+            return True
+        if not self._shared:
+            return False
+        try:
+            return os.stat(self._path(user_id)).st_mtime >= cutoff
+        except OSError:
+            return False
+
+
+replica_health = ReplicaHealth(READ_REPLICA_MAX_LAG, READ_REPLICA_LAG_CHECK_INTERVAL)
+recent_writes = RecentWrites(READ_REPLICA_STICKY_SECONDS, READ_REPLICA_STATE_DIR)
+
+
+def get_read_db(db: Session = Depends(get_db), current_user=Depends(get_current_user)):
+    """
+    Session for read-only endpoints: a replica session when the replica is fit
+    to serve this user, otherwise the request's primary session (get_db).
+    """
+    if not READ_REPLICA_ENABLED:
+        yield db
+        return
+    if recent_writes.recent(current_user.id):
+        usable, reason = False, "recent_write"
+    else:
+        usable, reason = replica_health.usable()
+    metrics.record_read_route("replica" if usable else "primary", reason)
+    if not usable:
+        yield db
+        return
+    read_db = new_read_session()
+    try:
+        yield read_db
+    finally:
+        read_db.close()
+
+
+# ------------------------------------------------------------ listeners
+
+def _flag_flush(session, flush_context):
+    session.info[_WROTE_KEY] = True
+
+
+def _flag_bulk(session, model, op):
+    session.info[_WROTE_KEY] = True
+
+
+def _after_commit(session):
+    if session.in_nested_transaction():
+        return
+    if session.info.pop(_WROTE_KEY, False):
+        user_id = session.info.get(SESSION_USER_KEY)
+        if user_id is not None:
+            recent_writes.mark(user_id)
+
+
+def _after_rollback(session):
+    if session.in_nested_transaction():
+        return
+    session.info.pop(_WROTE_KEY, None)
+
+
+def _refuse_replica_flush(session, flush_context, instances):
+    if session.info.get(READ_REPLICA_INFO_KEY):
+        raise RuntimeError("Read replica sessions are read-only; use get_db for endpoints that write")
+
+
+_listeners_installed = False
+
+
+def install_read_routing_listeners():
+    """Hook every ORM Session so a user's commits keep their next reads on the primary"""
+    global _listeners_installed
+    if _listeners_installed or not READ_REPLICA_ENABLED:
+        return
+    event.listen(Session, "after_flush", _flag_flush)
+    add_bulk_write_observer(_flag_bulk)
+    event.listen(Session, "after_commit", _after_commit)
+    event.listen(Session, "after_rollback", _after_rollback)
+    event.listen(Session, "before_flush", _refuse_replica_flush)
+    _listeners_installed = True
@@ -0,0 +1,334 @@
+"""
+Result cache for period reports (GST registers, P&L, night audit, ...).
+
+Results are stored in report_cache_entries keyed by (report, parameters). A
+result whose whole period ends on or before the books-closed date (system
+setting "books_closed_until") is kept without expiry; anything that touches the
+open period lives REPORT_CACHE_OPEN_TTL seconds.
+
+Writes to the source tables (journal entries, purchases, checkouts, expenses,
+food orders, ...) drop every entry whose period contains the written date once
+the transaction commits, so a back-dated entry is never hidden by the cache.
+Every invalidation also rewrites the "report_cache_invalidated" system setting;
+a result is only kept if that stamp did not move while it was computed and
+stored, whichever worker did the invalidating.
+Bulk `query.update()` / Core statements bypass the ORM flush; reported through
+bulk_writes.bulk_written(), they drop every entry on commit since the dates
+they touched are unknown.
+"""
+import hashlib
+import json
+import logging
+import os
+import uuid
+from datetime import date, datetime, timedelta
+from functools import wraps
+from typing import Iterable, Optional
+
+from fastapi import Response
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import and_, delete, event, insert, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.database import READ_REPLICA_INFO_KEY, engine
+from app.models.report_cache import ReportCacheEntry
+from app.models.settings import SystemSetting
+from app.utils.bulk_writes import add_bulk_write_observer
+
+logger = logging.getLogger(__name__)
+
+
+def _str_to_bool(value: str) -> bool:
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+REPORT_CACHE_ENABLED = _str_to_bool(os.getenv("REPORT_CACHE_ENABLED", "true"))
+# Lifetime of results that include the open (not yet closed) period
+REPORT_CACHE_OPEN_TTL = int(os.getenv("REPORT_CACHE_OPEN_TTL", "60"))
+
+BOOKS_CLOSED_SETTING = "books_closed_until"
+# Rewritten with a fresh token by every invalidation
+INVALIDATION_STAMP_SETTING = "report_cache_invalidated"
+
+# Endpoint arguments that are not report parameters
+_IGNORED_PARAMS = ("db", "current_user")
+
+# model -> date columns that place a row in a reporting period
+_SOURCE_DATE_FIELDS = {
+    "JournalEntry": ("entry_date",),
+    "PurchaseMaster": ("purchase_date", "invoice_date"),
+    "Checkout": ("checkout_date",),
+    "Expense": ("date", "rcm_liability_date"),
+    "FoodOrder": ("created_at",),
+    "AssignedService": ("assigned_at",),
+    "InventoryTransaction": ("created_at",),
+    # A stay counts in every period it spans; invalidation covers min..max of the dates
+    "Booking": ("check_in", "check_out"),
+    "PackageBooking": ("check_in", "check_out"),
+}
+# child model -> relationship to the parent that carries the date
+_SOURCE_PARENTS = {
+    "JournalEntryLine": "entry",
+    "PurchaseDetail": "purchase_master",
+    "FoodOrderItem": "order",
+}
+
+_INFO_KEY = "report_cache_dates"
+
+
+def _to_date(value) -> Optional[date]:
+    if value is None or value == "":
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    try:
+        return date.fromisoformat(str(value)[:10])
+    except ValueError:
+        return None
+
+
+def report_period(params: dict):
+    """(start, end) dates a report covers, from start_date/end_date or a single report/audit date"""
+    single = _to_date(params.get("report_date") or params.get("audit_date"))
+    start = _to_date(params.get("start_date")) or single
+    end = _to_date(params.get("end_date")) or single
+    return start, end
+
+
+def get_books_closed_until(db: Session) -> Optional[date]:
+    value = db.query(SystemSetting.value).filter(SystemSetting.key == BOOKS_CLOSED_SETTING).scalar()
+    return _to_date(value)
+
+
+def set_books_closed_until(db: Session, closed_until: Optional[date]) -> Optional[date]:
+    """Close the books up to `closed_until` (None reopens every period)"""
+    previous = get_books_closed_until(db)
+    setting = db.query(SystemSetting).filter(SystemSetting.key == BOOKS_CLOSED_SETTING).first()
+    if setting is None:
+        setting = SystemSetting(
+            key=BOOKS_CLOSED_SETTING,
+            description="Accounting periods up to this date are closed; their reports are cached permanently",
+        )
+        db.add(setting)
+    setting.value = closed_until.isoformat() if closed_until else None
+    db.commit()
+
+    # Re-opened periods must not keep serving permanent results
+    if previous and (closed_until is None or closed_until < previous):
+        stmt = delete(ReportCacheEntry).where(ReportCacheEntry.is_final.is_(True))
+        if closed_until is not None:
+            stmt = stmt.where(ReportCacheEntry.period_end > closed_until)
+        _execute(stmt)
+    return closed_until
+
+
+def _execute(stmt):
+    try:
+        with engine.begin() as conn:
+            conn.execute(stmt)
+    except Exception as e:
+        logger.warning("Report cache write failed: %s", e)
+
+
+def _invalidation_stamp():
+    """The current invalidation stamp, read from the primary (None before the first invalidation)"""
+    try:
+        with engine.connect() as conn:
+            return conn.execute(
+                select(SystemSetting.value).where(SystemSetting.key == INVALIDATION_STAMP_SETTING)
+            ).scalar()
+    except Exception as e:
+        logger.warning("Report cache stamp read failed: %s", e)
+        # Compares unequal to every stamp, so nothing is kept
+        return object()
+
+
+def _cache_key(report: str, params_json: str) -> str:
+    return hashlib.sha256(f"{report}\n{params_json}".encode("utf-8")).hexdigest()
+
+
+def _read(cache_key: str) -> Optional[str]:
+    now = datetime.utcnow()
+    try:
+        with engine.connect() as conn:
+            return conn.execute(
+                select(ReportCacheEntry.payload).where(
+                    ReportCacheEntry.cache_key == cache_key,
+                    or_(ReportCacheEntry.expires_at.is_(None), ReportCacheEntry.expires_at > now),
+                )
+            ).scalar()
+    except Exception as e:
+        logger.warning("Report cache read failed: %s", e)
+        return None
+
+
+def _store(cache_key: str, report: str, params_json: str, period, payload: str, is_final: bool):
+    expires_at = None if is_final else datetime.utcnow() + timedelta(seconds=REPORT_CACHE_OPEN_TTL)
+    try:
+        with engine.begin() as conn:
+            conn.execute(delete(ReportCacheEntry).where(ReportCacheEntry.cache_key == cache_key))
+            conn.execute(insert(ReportCacheEntry).values(
+                cache_key=cache_key,
+                report=report,
+                params=params_json,
+                period_start=period[0],
+                period_end=period[1],
+                payload=payload,
+                is_final=is_final,
+                expires_at=expires_at,
+            ))
+    except Exception as e:
+        logger.warning("Report cache store failed for %s: %s", report, e)
+
+
+def cached_report(report: str):
+    """
+    Cache a sync report endpoint's JSON result by (report, query parameters).
+
+    Place it under the @router.get decorator. Hits are returned as the stored
+    JSON bytes (header X-Report-Cache: hit) without touching the report tables.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            db = kwargs.get("db")
+            if not REPORT_CACHE_ENABLED or db is None:
+                return func(*args, **kwargs)
+
+            params = {k: v for k, v in kwargs.items() if k not in _IGNORED_PARAMS}
+            params_json = json.dumps(jsonable_encoder(params), sort_keys=True, separators=(",", ":"))
+            cache_key = _cache_key(report, params_json)
+
+            payload = _read(cache_key)
+            if payload is not None:
+                return Response(content=payload, media_type="application/json", headers={"X-Report-Cache": "hit"})
+
+            stamp = _invalidation_stamp()
+            result = func(*args, **kwargs)
+            if isinstance(result, Response) or _invalidation_stamp() != stamp:
+                return result
+
+            period = report_period(params)
+            try:
+                closed_until = get_books_closed_until(db)
+                # Same rendering as FastAPI's JSONResponse
+                payload = json.dumps(jsonable_encoder(result), ensure_ascii=False, allow_nan=False, separators=(",", ":"))
+            except Exception as e:
+                logger.warning("Report %s not cached: %s", report, e)
+                return result
+            # A lagging replica may not have a just-committed back-dated entry yet: only keep it for the TTL
+            is_final = bool(closed_until and period[0] and period[1] and period[1] <= closed_until
+                            and not db.info.get(READ_REPLICA_INFO_KEY))
+            _store(cache_key, report, params_json, period, payload, is_final)
+            # An invalidation committed between the check above and the store did not see the new entry
+            if _invalidation_stamp() != stamp:
+                _execute(delete(ReportCacheEntry).where(ReportCacheEntry.cache_key == cache_key))
+            return result
+        return wrapper
+    return decorator
+
+
+def invalidate_report_cache(dates: Iterable[date]):
+    """Drop cached results whose period overlaps the span of `dates`"""
+    dates = [d for d in dates if d is not None]
+    if not dates:
+        return
+    low, high = min(dates), max(dates)
+    stamp = uuid.uuid4().hex
+    try:
+        with engine.begin() as conn:
+            conn.execute(delete(ReportCacheEntry).where(and_(
+                or_(ReportCacheEntry.period_start.is_(None), ReportCacheEntry.period_start <= high),
+                or_(ReportCacheEntry.period_end.is_(None), ReportCacheEntry.period_end >= low),
+            )))
+            stamped = conn.execute(
+                update(SystemSetting).where(SystemSetting.key == INVALIDATION_STAMP_SETTING).values(value=stamp)
+            ).rowcount
+    except Exception as e:
+        logger.warning("Report cache invalidation failed: %s", e)
+        return
+    if not stamped:
+        # First invalidation: a concurrent one creating the row as well stamps it just the same
+        _execute(insert(SystemSetting).values(
+            key=INVALIDATION_STAMP_SETTING, value=stamp,
+            description="Changed by every report cache invalidation; results computed across a change are not kept",
+        ))
+    logger.debug("Report cache invalidated for %s..%s", low, high)
+
+
+def _instance_dates(obj) -> set:
+    name = type(obj).__name__
+    parent_attr = _SOURCE_PARENTS.get(name)
+    if parent_attr:
+        parent = getattr(obj, parent_attr, None)
+        return _instance_dates(parent) if parent is not None else {date.today()}
+
+    dates = set()
+    state = obj._sa_instance_state
+    for field in _SOURCE_DATE_FIELDS.get(name, ()):
+        history = state.attrs[field].history
+        values = list(history.added) + list(history.unchanged) + list(history.deleted)
+        if not values and state.key is not None:
+            values = [getattr(obj, field, None)]
+        for value in values:
+            d = _to_date(value)
+            if d is not None:
+                dates.add(d)
+    if not dates:
+        # Server/ORM default ("now") fills the date in at insert time
+        dates.update({date.today(), datetime.utcnow().date()})
+    return dates
+
+
+def _collect_dates(session, flush_context, instances):
+    tracked = None
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        name = type(obj).__name__
+        if name not in _SOURCE_DATE_FIELDS and name not in _SOURCE_PARENTS:
+            continue
+        if tracked is None:
+            tracked = session.info.setdefault(_INFO_KEY, set())
+        try:
+            tracked.update(_instance_dates(obj))
+        except Exception as e:
+            logger.warning("Report cache: could not read dates of %s: %s", name, e)
+            tracked.update({date.min, date.max})
+
+
+def _collect_bulk(session, model, op):
+    if model.__name__ in _SOURCE_DATE_FIELDS or model.__name__ in _SOURCE_PARENTS:
+        session.info.setdefault(_INFO_KEY, set()).update({date.min, date.max})
+
+
+def _after_commit(session):
+    # SAVEPOINT releases fire this too; wait for the outer commit (the outer
+    # transaction still holds its locks and may yet roll back)
+    if session.in_nested_transaction():
+        return
+    dates = session.info.pop(_INFO_KEY, None)
+    if dates:
+        invalidate_report_cache(dates)
+
+
+def _after_rollback(session):
+    # A rolled-back SAVEPOINT keeps the outer transaction's dates (over-invalidating is harmless)
+    if session.in_nested_transaction():
+        return
+    session.info.pop(_INFO_KEY, None)
+
+
+_listeners_installed = False
+
+
+def install_invalidation_listeners():
+    """Hook every ORM Session so commits touching report source tables invalidate the cache"""
+    global _listeners_installed
+    if _listeners_installed:
+        return
+    event.listen(Session, "before_flush", _collect_dates)
+    add_bulk_write_observer(_collect_bulk)
+    event.listen(Session, "after_commit", _after_commit)
+    event.listen(Session, "after_rollback", _after_rollback)
+    _listeners_installed = True
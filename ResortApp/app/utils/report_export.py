@@ -0,0 +1,195 @@
+"""
+Concurrent, chunked export of multi-section reports.
+
+Each section runs on its own worker thread with its own Session (and so its own
+pooled connection), reads with yield_per, and hands serialized row chunks to the
+response through a small bounded queue. Memory stays bounded by
+workers * queue depth * chunk size, not by the size of the report.
+
+Sections are (name, query(db, *args) -> Query, serialize(obj) -> dict) tuples,
+see app.curd.comprehensive_report.REPORT_SECTIONS.
+"""
+import csv
+import io
+import json
+import os
+import queue
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+import logging
+
+logger = logging.getLogger(__name__)
+
+EXPORT_CHUNK_SIZE = int(os.getenv("REPORT_EXPORT_CHUNK_SIZE", "1000"))
+# Each worker holds one DB connection for the duration of its section
+EXPORT_MAX_WORKERS = int(os.getenv("REPORT_EXPORT_MAX_WORKERS", "4"))
+# Chunks a worker may buffer ahead of the client
+QUEUE_DEPTH = 2
+_PUT_TIMEOUT = 0.5
+# Added to the CSV zip when a section fails, so a short or empty file is not mistaken for no data
+ERRORS_FILE = "_errors.csv"
+
+
+def _dumps(value) -> str:
+    return json.dumps(value, default=str, separators=(",", ":"))
+
+
+def _put(out: queue.Queue, item, cancelled: threading.Event) -> bool:
+    """Blocking put that gives up once the client has gone away"""
+    while not cancelled.is_set():
+        try:
+            out.put(item, timeout=_PUT_TIMEOUT)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _produce(section, session_factory, args, out: queue.Queue, cancelled: threading.Event, chunk_size: int):
+    """Worker: stream one section's rows into `out` as ("rows", name, [dict]) then ("end", name, count, error)"""
+    count = 0
+    error = None
+    db = None
+    try:
+        db = session_factory()
+        chunk = []
+        for obj in section.query(db, *args).yield_per(chunk_size):
+            if cancelled.is_set():
+                return
+            chunk.append(section.serialize(obj))
+            if len(chunk) >= chunk_size:
+                if not _put(out, ("rows", section.name, chunk), cancelled):
+                    return
+                count += len(chunk)
+                chunk = []
+        if chunk:
+            if not _put(out, ("rows", section.name, chunk), cancelled):
+                return
+            count += len(chunk)
+    except Exception as e:
+        logger.error("Error exporting report section %s: %s", section.name, e, exc_info=True)
+        error = str(e) or type(e).__name__
+    finally:
+        if db is not None:
+            db.close()
+        # The consumer waits for one "end" per section, whatever happened here (a no-op once cancelled)
+        _put(out, ("end", section.name, count, error), cancelled)
+
+
+def stream_ndjson(sections, session_factory, args=(), meta=None, chunk_size=None, max_workers=None):
+    """
+    Yield the report as NDJSON. Sections are fetched concurrently, so their rows
+    interleave; every line carries its section name:
+        {"type": "meta", ...}
+        {"section": "checkouts", "data": {...}}
+        {"type": "section_end", "section": "checkouts", "count": 120, "error": null}
+        {"type": "summary", "counts": {...}}
+    """
+    chunk_size = chunk_size or EXPORT_CHUNK_SIZE
+    max_workers = max_workers or EXPORT_MAX_WORKERS
+    out = queue.Queue(maxsize=max_workers * QUEUE_DEPTH)
+    cancelled = threading.Event()
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="report-export")
+    try:
+        yield _dumps({"type": "meta", **(meta or {}), "sections": [s.name for s in sections]}) + "\n"
+        for section in sections:
+            executor.submit(_produce, section, session_factory, args, out, cancelled, chunk_size)
+
+        counts = {}
+        remaining = len(sections)
+        while remaining:
+            message = out.get()
+            if message[0] == "rows":
+                _, name, rows = message
+                yield "".join(f'{{"section":"{name}","data":{_dumps(row)}}}\n' for row in rows)
+            else:
+                _, name, count, error = message
+                counts[name] = count
+                remaining -= 1
+                yield _dumps({"type": "section_end", "section": name, "count": count, "error": error}) + "\n"
+        yield _dumps({"type": "summary", "counts": counts}) + "\n"
+    finally:
+        # Client disconnects close the generator; stop the workers and free their connections
+        cancelled.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+class _ZipSink(io.RawIOBase):
+    """Write-only, non-seekable target for ZipFile; the bytes are taken out as they are produced"""
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def take(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _csv_value(value):
+    if isinstance(value, (list, dict)):
+        return _dumps(value)
+    return value
+
+
+def stream_csv_zip(sections, session_factory, args=(), chunk_size=None, max_workers=None):
+    """
+    Yield a zip archive with one <section>.csv per section. Sections are fetched
+    concurrently (each prefetches up to QUEUE_DEPTH chunks) and written to the
+    archive in order. Nested values (rooms, items, lines) are JSON-encoded cells.
+    If any section fails, a final ERRORS_FILE lists each failed section, the rows
+    it exported before failing and the error.
+    """
+    chunk_size = chunk_size or EXPORT_CHUNK_SIZE
+    max_workers = max_workers or EXPORT_MAX_WORKERS
+    cancelled = threading.Event()
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="report-export")
+    queues = []
+    errors = []
+    try:
+        for section in sections:
+            section_queue = queue.Queue(maxsize=QUEUE_DEPTH)
+            queues.append((section.name, section_queue))
+            executor.submit(_produce, section, session_factory, args, section_queue, cancelled, chunk_size)
+
+        sink = _ZipSink()
+        with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_DEFLATED) as archive:
+            for name, section_queue in queues:
+                with archive.open(f"{name}.csv", mode="w", force_zip64=True) as entry:
+                    columns = None
+                    while True:
+                        message = section_queue.get()
+                        if message[0] == "end":
+                            if message[3]:
+                                logger.error("Report section %s exported partially: %s", name, message[3])
+                                errors.append((name, message[2], message[3]))
+                            break
+                        rows = message[2]
+                        buffer = io.StringIO()
+                        writer = csv.writer(buffer)
+                        if columns is None:
+                            columns = list(rows[0].keys())
+                            writer.writerow(columns)
+                        for row in rows:
+                            writer.writerow([_csv_value(row.get(col)) for col in columns])
+                        entry.write(buffer.getvalue().encode("utf-8"))
+                        yield sink.take()
+                yield sink.take()
+            if errors:
+                buffer = io.StringIO()
+                writer = csv.writer(buffer)
+                writer.writerow(["section", "rows_exported", "error"])
+                writer.writerows(errors)
+                archive.writestr(ERRORS_FILE, buffer.getvalue())
+        yield sink.take()
+    finally:
+        cancelled.set()
+        executor.shutdown(wait=False, cancel_futures=True)
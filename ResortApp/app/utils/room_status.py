@@ -2,8 +2,12 @@ from sqlalchemy.orm import Session
 from sqlalchemy.exc import OperationalError, DisconnectionError
 from app.models.room import Room
 from app.models.booking import Booking, BookingRoom
+from app.utils.booking_status import ACTIVE_BOOKING_STATUSES
 from datetime import date
 import time
+import logging
+
+logger = logging.getLogger(__name__)
 
 def update_room_statuses(db: Session):
     """
@@ -32,7 +36,7 @@ def update_room_statuses(db: Session):
                     # Normalize status values to handle both formats
                     active_booking = db.query(BookingRoom).join(Booking).filter(
                         BookingRoom.room_id == room.id,
-                        Booking.status.in_(['booked', 'checked-in', 'checked_in']),
+                        Booking.status.in_(ACTIVE_BOOKING_STATUSES),
                         Booking.check_in <= today,
                         Booking.check_out > today
                     ).first()
@@ -41,7 +45,7 @@ def update_room_statuses(db: Session):
                     from app.models.Package import PackageBooking, PackageBookingRoom
                     active_package_booking = db.query(PackageBookingRoom).join(PackageBooking).filter(
                         PackageBookingRoom.room_id == room.id,
-                        PackageBooking.status.in_(['booked', 'checked-in', 'checked_in']),
+                        PackageBooking.status.in_(ACTIVE_BOOKING_STATUSES),
                         PackageBooking.check_in <= today,
                         PackageBooking.check_out > today
                     ).first()
@@ -66,7 +70,7 @@ def update_room_statuses(db: Session):
                         # Check if booking has ended today or before
                         past_booking = db.query(BookingRoom).join(Booking).filter(
                             BookingRoom.room_id == room.id,
-                            Booking.status.in_(['booked', 'checked-in', 'checked_in']),
+                            Booking.status.in_(ACTIVE_BOOKING_STATUSES),
                             Booking.check_out <= today
                         ).first()
                         
@@ -80,7 +84,7 @@ def update_room_statuses(db: Session):
                         
                 except Exception as room_error:
                     # Log individual room errors but continue processing
-                    print(f"Error updating room {room.id}: {room_error}")
+                    logger.error("Error updating room %s: %s", room.id, room_error)
                     continue
             
             try:
@@ -88,28 +92,28 @@ def update_room_statuses(db: Session):
             except Exception as commit_err:
                 # Roll back any failed commit to avoid pending transaction errors
                 db.rollback()
-                print(f"Commit failed during room status update: {commit_err}")
+                logger.error("Commit failed during room status update: %s", commit_err)
                 return 0
             if updated_count > 0:
-                print(f"Updated room statuses for {updated_count} out of {len(rooms)} rooms")
+                logger.debug("Updated room statuses for %s out of %s rooms", updated_count, len(rooms))
             return updated_count
             
         except (OperationalError, DisconnectionError) as e:
             db.rollback()
             if attempt < max_retries - 1:
-                print(f"Database error (attempt {attempt + 1}/{max_retries}): {e}. Retrying...")
+                logger.error("Database error (attempt %s/%s): %s. Retrying...", attempt + 1, max_retries, e)
                 time.sleep(retry_delay * (attempt + 1))
                 # Try to refresh the session
                 db.expire_all()
                 continue
             else:
-                print(f"Error updating room statuses after {max_retries} attempts: {e}")
+                logger.error("Error updating room statuses after %s attempts: %s", max_retries, e)
                 # Don't raise - let the endpoint handle gracefully
                 return 0
         except Exception as e:
             db.rollback()
-            print(f"Error updating room statuses: {e}")
-            print(f"Error type: {type(e)}")
+            logger.error("Error updating room statuses: %s", e)
+            logger.error("Error type: %s", type(e))
             # Don't raise - allow room fetching to continue even if status update fails
             return 0
     
@@ -0,0 +1,264 @@
+"""
+Static asset serving for the React builds (admin dashboard and guest site).
+
+PrecompressedStaticFiles is a StaticFiles mount that:
+  * serves a pre-built `.br` / `.gz` sibling of the requested file when the
+    client accepts that encoding, so bundles are never compressed per request;
+  * marks content-hashed build files (main.a5521765.js, 213.b8d4b5a9.chunk.js,
+    logo.f30f5147bac11ff9932e.png) `immutable` for a year;
+  * sends files as ASGI `pathsend` when the server offers it (zero-copy
+    sendfile in the server) and in large chunks otherwise.
+
+SelectiveGZipMiddleware replaces GZipMiddleware for dynamic responses and
+leaves alone what compression cannot help: bodies that are already encoded
+(precompressed assets), already-compressed media types and streaming responses.
+
+The siblings are written at deploy time, after `npm run build`:
+    python -m app.utils.static_assets ../dasboard/build/static ../userend/build/static
+Brotli output needs the optional `brotli` package; gzip siblings are always written.
+"""
+import gzip
+import logging
+import os
+import re
+import sys
+from mimetypes import guess_type
+from typing import Dict, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.middleware.gzip import GZipMiddleware, GZipResponder, IdentityResponder
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional; gzip siblings still work
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# Preferred first: (Content-Encoding, file suffix)
+PRECOMPRESSED_ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+# Build tools put a hex content hash before the extension(s)
+HASHED_NAME = re.compile(r"\.[0-9a-f]{8,32}\.")
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# Without pathsend the file is read in chunks of this size (Starlette default: 64 KB)
+STATIC_CHUNK_SIZE = 256 * 1024
+
+# Files worth precompressing, and the smallest size that pays off
+COMPRESSIBLE_EXTENSIONS = {".js", ".css", ".map", ".json", ".svg", ".html", ".txt", ".ico", ".xml", ".webmanifest"}
+MIN_PRECOMPRESS_BYTES = 1024
+
+# Compressing these again only burns CPU
+INCOMPRESSIBLE_CONTENT_TYPES = (
+    "image/jpeg", "image/png", "image/gif", "image/webp", "image/avif",
+    "video/", "audio/", "font/woff", "font/woff2",
+    "application/zip", "application/gzip", "application/x-gzip", "application/pdf",
+    "application/x-brotli", "application/octet-stream",
+)
+
+
+def accepted_encodings(accept_encoding: str) -> set:
+    """Encodings the client accepts (q > 0) from an Accept-Encoding header"""
+    accepted = set()
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = params.strip()
+        if q.startswith("q="):
+            try:
+                if float(q[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(name)
+    return accepted
+
+
+class StaticFileResponse(FileResponse):
+    chunk_size = STATIC_CHUNK_SIZE
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """StaticFiles that prefers .br/.gz siblings and caches hashed build files forever"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # full path -> (original mtime, [(encoding, sibling path, sibling stat)]): one stat per
+        # sibling when a file is first served or rebuilt, not on every request
+        self._siblings: Dict[str, Tuple[int, list]] = {}
+
+    def _precompressed(self, full_path: str, stat_result: os.stat_result) -> list:
+        cached = self._siblings.get(full_path)
+        if cached is not None and cached[0] == stat_result.st_mtime_ns:
+            return cached[1]
+        found = []
+        for encoding, suffix in PRECOMPRESSED_ENCODINGS:
+            try:
+                sibling_stat = os.stat(full_path + suffix)
+            except OSError:
+                continue
+            # A sibling older than the file is from a previous build
+            if sibling_stat.st_mtime_ns >= stat_result.st_mtime_ns:
+                found.append((encoding, full_path + suffix, sibling_stat))
+        self._siblings[full_path] = (stat_result.st_mtime_ns, found)
+        return found
+
+    def file_response(
+        self,
+        full_path,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        request_headers = Headers(scope=scope)
+        full_path = os.fspath(full_path)
+        siblings = self._precompressed(full_path, stat_result)
+
+        chosen = None
+        if siblings:
+            accepted = accepted_encodings(request_headers.get("accept-encoding", ""))
+            chosen = next((s for s in siblings if s[0] in accepted), None)
+
+        if chosen is not None:
+            encoding, path, sibling_stat = chosen
+            response = StaticFileResponse(
+                path,
+                status_code=status_code,
+                stat_result=sibling_stat,
+                media_type=guess_type(full_path)[0] or "text/plain",
+                headers={"Content-Encoding": encoding},
+            )
+        else:
+            response = StaticFileResponse(full_path, status_code=status_code, stat_result=stat_result)
+
+        if siblings:
+            # Caches must key on the encoding the client asked for
+            MutableHeaders(raw=response.raw_headers).add_vary_header("Accept-Encoding")
+        if HASHED_NAME.search(os.path.basename(full_path)):
+            response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+
+# ---------------------------------------------------------------- gzip
+
+class _SelectiveMixin:
+    async def send_with_compression(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            await super().send_with_compression(message)
+            headers = Headers(raw=message["headers"])
+            content_type = headers.get("content-type", "").lower()
+            if (
+                content_type.startswith(INCOMPRESSIBLE_CONTENT_TYPES)
+                # No Content-Length: a StreamingResponse (exports, event streams); pass it through as produced
+                or "content-length" not in headers
+                # Already negotiated by the app (PrecompressedStaticFiles)
+                or "accept-encoding" in headers.get("vary", "").lower()
+            ):
+                self.content_type_is_excluded = True
+            return
+        await super().send_with_compression(message)
+
+
+class _SelectiveGZipResponder(_SelectiveMixin, GZipResponder):
+    pass
+
+
+class _SelectiveIdentityResponder(_SelectiveMixin, IdentityResponder):
+    pass
+
+
+class SelectiveGZipMiddleware(GZipMiddleware):
+    """GZipMiddleware that skips precompressed, already-compressed and streaming responses"""
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":  # pragma: no cover
+            await self.app(scope, receive, send)
+            return
+        if "gzip" in Headers(scope=scope).get("Accept-Encoding", ""):
+            responder = _SelectiveGZipResponder(self.app, self.minimum_size, compresslevel=self.compresslevel)
+        else:
+            responder = _SelectiveIdentityResponder(self.app, self.minimum_size)
+        await responder(scope, receive, send)
+
+
+# ------------------------------------------------------------- precompress
+
+def _write_if_smaller(path: str, data: bytes, original_size: int, mtime_ns: int) -> bool:
+    if len(data) >= original_size * 0.95:
+        # Not worth a Content-Encoding; drop a stale sibling from an earlier build
+        if os.path.exists(path):
+            os.remove(path)
+        return False
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    # Never older than the original, or it is treated as stale
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+    return True
+
+
+def precompress_directory(directory: str, force: bool = False) -> dict:
+    """Write .gz (and .br with brotli installed) siblings for compressible files under `directory`"""
+    written = {"files": 0, "gzip": 0, "br": 0, "bytes_in": 0, "bytes_out": 0}
+    for root, _, files in os.walk(directory):
+        for name in files:
+            if name.endswith((".gz", ".br", ".tmp")):
+                continue
+            if os.path.splitext(name)[1].lower() not in COMPRESSIBLE_EXTENSIONS:
+                continue
+            path = os.path.join(root, name)
+            st = os.stat(path)
+            if st.st_size < MIN_PRECOMPRESS_BYTES:
+                continue
+            targets = [("gzip", ".gz")] + ([("br", ".br")] if brotli is not None else [])
+            todo = [
+                (encoding, suffix) for encoding, suffix in targets
+                if force or not os.path.exists(path + suffix)
+                or os.stat(path + suffix).st_mtime_ns < st.st_mtime_ns
+            ]
+            if not todo:
+                continue
+            with open(path, "rb") as f:
+                data = f.read()
+            written["files"] += 1
+            written["bytes_in"] += len(data)
+            for encoding, suffix in todo:
+                if encoding == "gzip":
+                    compressed = gzip.compress(data, compresslevel=9, mtime=0)
+                else:
+                    compressed = brotli.compress(data, quality=11)
+                if _write_if_smaller(path + suffix, compressed, len(data), st.st_mtime_ns):
+                    written[encoding] += 1
+                    written["bytes_out"] += len(compressed)
+    return written
+
+
+def main(argv=None):
+    args = list(sys.argv[1:] if argv is None else argv)
+    force = "--force" in args
+    directories = [a for a in args if a != "--force"]
+    if not directories:
+        print("usage: python -m app.utils.static_assets [--force] DIR [DIR ...]")
+        return 2
+    if brotli is None:
+        print("brotli is not installed: writing .gz siblings only")
+    for directory in directories:
+        if not os.path.isdir(directory):
+            print(f"{directory}: not found, skipped")
+            continue
+        result = precompress_directory(directory, force=force)
+        print(f"{directory}: {result['files']} files, {result['gzip']} .gz, {result['br']} .br "
+              f"({result['bytes_in'] // 1024} KB in, {result['bytes_out'] // 1024} KB written)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,13 @@
+"""
+Performance benchmarks for the resort API.
+
+    datagen             - seeded synthetic data (rooms, bookings, orders, purchases, stock, journals)
+    scenarios           - concurrent load against the key endpoints, p50/p95/p99 and queries per request
+    query_plans         - before/after plans for the hot booking, order and inventory filters
+    checkout_inventory  - check-inventory request for a room with many inventory lines
+    group_checkout      - multi-room group checkout: wall time, SQL statements and COMMITs
+    startup_time        - worker cold-start time and import profile
+    async_vs_sync_load  - async read endpoints vs the sync threadpool path
+
+Run modules from ResortApp/, e.g. `python -m benchmarks.datagen --help`.
+"""
@@ -0,0 +1,147 @@
+"""
+Load test: async read endpoints vs the sync threadpool path.
+
+Starts the API twice with uvicorn (ASYNC_DB_ENABLED=false, then true) against
+the same DATABASE_URL and drives both with N concurrent httpx clients, then
+prints throughput and p50/p99 latency per mode.
+
+Usage (from ResortApp/):
+    python benchmarks/async_vs_sync_load.py --concurrency 200 --duration 30
+    python benchmarks/async_vs_sync_load.py --token <JWT>   # also hit authenticated endpoints
+
+Point DATABASE_URL at a Postgres copy with realistic data; sqlite numbers are
+not representative of the production pool.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+PUBLIC_PATHS = [
+    "/api/public/rooms",
+    "/api/public/packages",
+    "/api/public/food-items",
+    "/api/public/services",
+    "/api/public/bookings",
+    "/api/public/package-bookings",
+]
+
+AUTH_PATHS = [
+    "/api/dashboard/kpis",
+    "/api/bill/active-rooms",
+    "/api/service-requests",
+    "/api/food-orders",
+]
+
+
+def start_server(port: int, async_enabled: bool) -> subprocess.Popen:
+    env = dict(os.environ)
+    env["ASYNC_DB_ENABLED"] = "true" if async_enabled else "false"
+    env.setdefault("LOG_LEVEL", "WARNING")
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+def wait_ready(base_url: str, timeout: float = 60.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if httpx.get(f"{base_url}/health", timeout=2).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.5)
+    raise RuntimeError(f"Server at {base_url} did not become ready")
+
+
+async def run_load(base_url: str, paths, headers, concurrency: int, duration: float):
+    latencies = []
+    errors = 0
+    stop_at = time.perf_counter() + duration
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, headers=headers, limits=limits, timeout=30) as client:
+        async def worker(offset: int):
+            nonlocal errors
+            i = offset
+            while time.perf_counter() < stop_at:
+                path = paths[i % len(paths)]
+                i += 1
+                start = time.perf_counter()
+                try:
+                    resp = await client.get(path)
+                    if resp.status_code >= 400:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append(time.perf_counter() - start)
+
+        await asyncio.gather(*(worker(n) for n in range(concurrency)))
+
+    return latencies, errors
+
+
+def summarize(label: str, latencies, errors: int, duration: float) -> dict:
+    latencies = sorted(latencies)
+    count = len(latencies)
+    p50 = statistics.median(latencies) * 1000 if latencies else 0
+    p99 = latencies[min(count - 1, int(count * 0.99))] * 1000 if latencies else 0
+    result = {
+        "mode": label,
+        "requests": count,
+        "errors": errors,
+        "throughput_rps": count / duration if duration else 0,
+        "p50_ms": p50,
+        "p99_ms": p99,
+    }
+    print(f"{label:>5}: {count} req, {errors} errors, {result['throughput_rps']:.1f} req/s, "
+          f"p50 {p50:.1f} ms, p99 {p99:.1f} ms")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds per mode")
+    parser.add_argument("--warmup", type=float, default=3.0)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--token", help="Bearer token; enables the authenticated endpoints")
+    args = parser.parse_args()
+
+    paths = list(PUBLIC_PATHS)
+    headers = {}
+    if args.token:
+        paths += AUTH_PATHS
+        headers["Authorization"] = f"Bearer {args.token}"
+
+    base_url = f"http://127.0.0.1:{args.port}"
+    results = []
+    for label, async_enabled in (("sync", False), ("async", True)):
+        proc = start_server(args.port, async_enabled)
+        try:
+            wait_ready(base_url)
+            asyncio.run(run_load(base_url, paths, headers, min(args.concurrency, 20), args.warmup))
+            latencies, errors = asyncio.run(run_load(base_url, paths, headers, args.concurrency, args.duration))
+            results.append(summarize(label, latencies, errors, args.duration))
+        finally:
+            proc.terminate()
+            proc.wait(timeout=30)
+
+    if len(results) == 2 and results[0]["throughput_rps"]:
+        sync_r, async_r = results
+        print(f"async/sync throughput: {async_r['throughput_rps'] / sync_r['throughput_rps']:.2f}x, "
+              f"p99 {sync_r['p99_ms']:.1f} -> {async_r['p99_ms']:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+Checkout inventory verification benchmark.
+
+Seeds one guest room holding --items inventory lines (minibar consumables with
+room stock, issued rentals, mapped and unmapped fixed assets), then times
+POST /api/bill/checkout-request/{id}/check-inventory with housekeeping's full
+item list. The room is re-seeded before every run; only the request is timed.
+
+Prints the median wall time and the SQL statements per request.
+
+Usage (from ResortApp/):
+    python benchmarks/checkout_inventory.py
+    python benchmarks/checkout_inventory.py --items 60 --runs 20
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="scratch database URL (default: temporary sqlite file)")
+    parser.add_argument("--items", type=int, default=60, help="inventory lines in the room")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=7)
+    return parser.parse_args()
+
+
+args = parse_args()
+if not args.url:
+    args.url = "sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="checkout_inventory_"), "bench.db")
+# app.database reads DATABASE_URL at import
+os.environ["DATABASE_URL"] = args.url
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+os.environ["DB_INSTRUMENTATION"] = "true"
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+import main  # noqa: E402
+from app.database import Base, SessionLocal, engine  # noqa: E402
+from app.models import (  # noqa: E402
+    AssetMapping, Booking, BookingRoom, InventoryCategory, InventoryItem, Location, Role, Room, StockIssue,
+    StockIssueDetail, User,
+)
+from app.models.checkout import CheckoutRequest  # noqa: E402
+from app.models.inventory import LocationStock  # noqa: E402
+from app.utils import auth  # noqa: E402
+from app.api import auth as auth_api  # noqa: E402
+
+
+def seed(rnd: random.Random):
+    """Fresh room + items; returns (checkout request id, admin user id, check-inventory payload)"""
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    db = SessionLocal()
+    try:
+        role = Role(name="Admin", permissions="")
+        db.add(role)
+        db.flush()
+        admin = User(name="Bench Admin", email="admin@bench.local", hashed_password="x", role_id=role.id, is_active=True)
+        store = Location(name="Main Store", building="Main", room_area="Store", location_type="WAREHOUSE", is_inventory_point=True)
+        laundry = Location(name="Laundry", building="Main", room_area="Laundry", location_type="LAUNDRY", is_inventory_point=True)
+        room_loc = Location(name="Room 101", building="Main", room_area="Room 101", location_type="GUEST_ROOM", is_inventory_point=True)
+        db.add_all([admin, store, laundry, room_loc])
+        db.flush()
+        room = Room(number="101", price=4000, status="Occupied", inventory_location_id=room_loc.id)
+        minibar = InventoryCategory(name="Minibar", is_sellable=True)
+        rentals = InventoryCategory(name="Rental Linen", track_laundry=True)
+        fixtures = InventoryCategory(name="Room Fixtures", is_asset_fixed=True)
+        db.add_all([room, minibar, rentals, fixtures])
+        db.flush()
+        booking = Booking(guest_name="Bench Guest", check_in=date.today() - timedelta(days=2),
+                          check_out=date.today(), status="checked-in")
+        db.add(booking)
+        db.flush()
+        db.add(BookingRoom(booking_id=booking.id, room_id=room.id))
+
+        issue = StockIssue(issue_number="ISS-BENCH-001", issued_by=admin.id, source_location_id=store.id,
+                           destination_location_id=room_loc.id, issue_date=datetime.utcnow() - timedelta(days=2))
+        db.add(issue)
+        db.flush()
+
+        payload_items = []
+        for i in range(args.items):
+            kind = ("consumable", "consumable", "consumable", "consumable", "consumable", "consumable",
+                    "rental", "rental", "mapped", "fixed")[i % 10]
+            category = {"consumable": minibar, "rental": rentals}.get(kind, fixtures)
+            item = InventoryItem(name=f"{kind.title()} {i + 1}", item_code=f"CHK-{i + 1:03d}", category_id=category.id,
+                                 unit="pcs", unit_price=round(rnd.uniform(20, 900), 2), gst_rate=18.0,
+                                 selling_price=round(rnd.uniform(40, 1200), 2) if kind == "consumable" else None,
+                                 complimentary_limit=1 if kind == "consumable" else None,
+                                 is_asset_fixed=kind in ("mapped", "fixed"), current_stock=50.0)
+            db.add(item)
+            db.flush()
+            allocated = 0.0
+            if kind in ("consumable", "rental"):
+                allocated = float(rnd.randint(2, 4))
+                db.add(StockIssueDetail(issue_id=issue.id, item_id=item.id, issued_quantity=allocated, unit="pcs",
+                                        rental_price=150.0 if kind == "rental" else None))
+                db.add(LocationStock(location_id=room_loc.id, item_id=item.id, quantity=allocated))
+                db.add(LocationStock(location_id=store.id, item_id=item.id, quantity=40.0))
+            elif kind == "mapped":
+                db.add(AssetMapping(item_id=item.id, location_id=room_loc.id, quantity=1.0, is_active=True))
+                db.add(LocationStock(location_id=room_loc.id, item_id=item.id, quantity=1.0))
+
+            line = {"item_id": item.id, "used_qty": 0, "missing_qty": 0, "damage_qty": 0}
+            if kind == "consumable":
+                line["used_qty"] = rnd.randint(0, int(allocated))
+                line["missing_qty"] = 1 if rnd.random() < 0.1 else 0
+            elif kind == "rental":
+                line["damage_qty"] = 1 if rnd.random() < 0.2 else 0
+                line["return_location_id"] = laundry.id
+            elif kind == "fixed" and rnd.random() < 0.5:
+                line["damage_qty"] = 1
+            payload_items.append(line)
+
+        request = CheckoutRequest(booking_id=booking.id, room_number="101", guest_name="Bench Guest", status="pending")
+        db.add(request)
+        db.commit()
+        return request.id, admin.id, {"inventory_notes": "benchmark", "items": payload_items}
+    finally:
+        db.close()
+
+
+def main_bench():
+    client = TestClient(main.app)
+    timings, queries = [], []
+    for run in range(args.runs):
+        request_id, admin_id, payload = seed(random.Random(args.seed + run))
+
+        def current_user():
+            db = SessionLocal()
+            try:
+                return db.get(User, admin_id)
+            finally:
+                db.close()
+
+        main.app.dependency_overrides[auth.get_current_user] = current_user
+        main.app.dependency_overrides[auth_api.get_current_user] = current_user
+        started = time.perf_counter()
+        resp = client.post(f"/api/bill/checkout-request/{request_id}/check-inventory", json=payload)
+        timings.append(time.perf_counter() - started)
+        if resp.status_code != 200:
+            raise SystemExit(f"check-inventory failed: {resp.status_code} {resp.text[:300]}")
+        queries.append(int(resp.headers.get("X-DB-Queries", 0)))
+
+    print(f"{args.items} items, {args.runs} runs on {engine.dialect.name}")
+    print(f"  median {statistics.median(timings) * 1000:.1f} ms, min {min(timings) * 1000:.1f} ms")
+    print(f"  {statistics.median(queries):.0f} SQL statements per request")
+
+
+if __name__ == "__main__":
+    main_bench()
@@ -0,0 +1,548 @@
+"""
+Seeded synthetic data for benchmarks.
+
+Fills an empty database with a resort's worth of history:
+  - N rooms, each with a guest-room inventory location
+  - M years of stays per room (regular and package bookings), ending with
+    today's in-house guests and a month of upcoming reservations
+  - room-service food orders for every stayed night
+  - checkouts (with invoices, some B2B) for every past stay
+  - weekly vendor purchases, daily kitchen stock issues and per-stay room
+    amenity issues, with matching inventory transactions and location stock
+  - journal entries for every checkout and purchase
+  - an admin login (admin@bench.local / bench-admin) for the scenario runner,
+    with a kitchen employee record to assign new food orders to
+
+The same --seed always produces the same rows. Postgres sequences are moved
+past the generated ids, so the API can keep inserting afterwards.
+
+Usage (from ResortApp/):
+    python -m benchmarks.datagen --url sqlite:////tmp/bench.db --rooms 60 --years 2
+    python -m benchmarks.datagen --url postgresql://localhost/orchid_bench --rooms 120 --years 3 --reset
+
+Never point --url at a live database: --reset drops every table.
+"""
+import argparse
+import os
+import random
+import string
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if APP_DIR not in sys.path:
+    sys.path.insert(0, APP_DIR)
+
+BENCH_ADMIN_EMAIL = "admin@bench.local"
+BENCH_ADMIN_PASSWORD = "bench-admin"
+
+ADMIN_PERMISSIONS = (
+    "/dashboard,/bookings,/rooms,/services,/expenses,/food-orders,/food-categories,/food-items,/billing,"
+    "/packages,/users,/roles,/employees,/reports,/account,/userfrontend_data,/guestprofiles,/employee-management"
+)
+
+ROOM_TYPES = [("Deluxe", 3500), ("Super Deluxe", 4800), ("Cottage", 6200), ("Suite", 9500)]
+
+# (name, parent department, GST rate, HSN, unit, price range, minibar)
+INVENTORY_CATEGORIES = [
+    ("Vegetables", "Restaurant", 0.0, "0709", "kg", (20, 120), False),
+    ("Dairy", "Restaurant", 5.0, "0401", "liter", (40, 90), False),
+    ("Groceries", "Restaurant", 5.0, "1006", "kg", (40, 400), False),
+    ("Meat & Fish", "Restaurant", 0.0, "0207", "kg", (200, 900), False),
+    ("Beverages", "Restaurant", 12.0, "2202", "pcs", (20, 150), True),
+    ("Toiletries", "Hotel", 18.0, "3401", "pcs", (15, 120), False),
+    ("Linen", "Hotel", 12.0, "6302", "pcs", (250, 1200), False),
+    ("Cleaning Supplies", "Facility", 18.0, "3402", "liter", (60, 500), False),
+]
+
+FOOD_MENU = {
+    "Breakfast": [("Masala Dosa", 180), ("Poha", 140), ("Continental Breakfast", 450), ("Idli Vada", 160)],
+    "Starters": [("Paneer Tikka", 320), ("Chicken 65", 380), ("Veg Spring Roll", 240), ("Fish Fingers", 420)],
+    "Main Course": [("Dal Makhani", 280), ("Butter Chicken", 460), ("Veg Biryani", 320), ("Mutton Biryani", 540),
+                    ("Prawn Curry", 580), ("Paneer Butter Masala", 340)],
+    "Breads": [("Butter Naan", 70), ("Tandoori Roti", 40), ("Laccha Paratha", 80)],
+    "Desserts": [("Gulab Jamun", 120), ("Ice Cream", 150), ("Brownie Sundae", 260)],
+    "Drinks": [("Fresh Lime Soda", 110), ("Cold Coffee", 180), ("Masala Chai", 60)],
+}
+
+PACKAGES = [("Romantic Getaway", 12000, "Romance"), ("Wellness Retreat", 15000, "Wellness"),
+            ("Family Weekend", 18000, "Family")]
+
+ACCOUNT_GROUPS = [
+    ("Sales Accounts", "REVENUE"),
+    ("Duties & Taxes", "LIABILITY"),
+    ("Current Assets", "ASSET"),
+    ("Current Liabilities", "LIABILITY"),
+    ("Cash-in-hand", "ASSET"),
+    ("Bank Accounts", "ASSET"),
+]
+# key -> (name, group, module, balance type)
+LEDGERS = {
+    "room_revenue": ("Room Revenue (Taxable)", "Sales Accounts", "Booking", "credit"),
+    "food_revenue": ("Food Revenue (Taxable)", "Sales Accounts", "Food", "credit"),
+    "package_revenue": ("Package Revenue (Taxable)", "Sales Accounts", "Booking", "credit"),
+    "output_cgst": ("Output CGST", "Duties & Taxes", "Tax", "credit"),
+    "output_sgst": ("Output SGST", "Duties & Taxes", "Tax", "credit"),
+    "input_cgst": ("Input CGST", "Duties & Taxes", "Tax", "debit"),
+    "input_sgst": ("Input SGST", "Duties & Taxes", "Tax", "debit"),
+    "inventory": ("Inventory Asset (Stock)", "Current Assets", "Inventory", "debit"),
+    "payable": ("Accounts Payable (Vendor)", "Current Liabilities", "Purchase", "credit"),
+    "cash": ("Cash in Hand", "Cash-in-hand", "Asset", "debit"),
+    "bank": ("Bank Account (HDFC)", "Bank Accounts", "Asset", "debit"),
+}
+
+# Mon, Wed, Fri first
+PURCHASE_WEEKDAYS = (0, 2, 4, 1, 3, 5, 6)
+STAY_NIGHTS = [1, 1, 2, 2, 2, 3, 3, 4, 5, 7]
+FIRST_NAMES = ["Aarav", "Diya", "Kabir", "Meera", "Rohan", "Sara", "Vikram", "Ananya", "Arjun", "Isha", "Nikhil", "Priya"]
+LAST_NAMES = ["Sharma", "Iyer", "Menon", "Reddy", "Das", "Kapoor", "Nair", "Joshi", "Rao", "Patel"]
+
+BATCH_SIZE = 5000
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="scratch database URL (default: DATABASE_URL)")
+    parser.add_argument("--rooms", type=int, default=40)
+    parser.add_argument("--years", type=float, default=1.0, help="years of history before today")
+    parser.add_argument("--occupancy", type=float, default=0.7, help="target share of room-nights sold")
+    parser.add_argument("--package-share", type=float, default=0.25, help="share of stays booked as packages")
+    parser.add_argument("--orders-per-night", type=float, default=1.2, help="mean food orders per occupied room-night")
+    parser.add_argument("--purchases-per-week", type=int, default=3)
+    parser.add_argument("--inventory-items", type=int, default=150)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--reset", action="store_true", help="drop and recreate every table first")
+    return parser
+
+
+class _Rows:
+    """Row buffers per table plus id counters (ids are assigned here, not by the database)"""
+
+    def __init__(self):
+        self.tables = {}
+        self._ids = {}
+
+    def next_id(self, table) -> int:
+        self._ids[table.name] = self._ids.get(table.name, 0) + 1
+        return self._ids[table.name]
+
+    def add(self, table, **values) -> int:
+        if "id" not in values:
+            values["id"] = self.next_id(table)
+        self.tables.setdefault(table, []).append(values)
+        return values["id"]
+
+    def count(self, table) -> int:
+        return len(self.tables.get(table, ()))
+
+
+def _gstin(rnd: random.Random, state_code: str = "29") -> str:
+    """GSTIN in the shape gst_reports.validate_gstin accepts (state, PAN, entity, check, 'Z')"""
+    pan = "".join(rnd.choices(string.ascii_uppercase, k=5)) + "".join(rnd.choices(string.digits, k=4)) \
+        + rnd.choice(string.ascii_uppercase)
+    return f"{state_code}{pan}1{rnd.choice(string.digits + string.ascii_uppercase)}Z"
+
+
+def _at(day: date, hour: int, minute: int = 0) -> datetime:
+    return datetime(day.year, day.month, day.day) + timedelta(hours=hour, minutes=minute)
+
+
+class Generator:
+    def __init__(self, args):
+        from app import models
+
+        self.m = models
+        self.args = args
+        self.rnd = random.Random(args.seed)
+        self.rows = _Rows()
+        self.today = date.today()
+        self.start = self.today - timedelta(days=max(1, int(round(365 * args.years))))
+        self.horizon = self.today + timedelta(days=30)
+        # (location_id, item_id) -> quantity
+        self.stock = {}
+        # (day, destination location, [(item, qty)], department, notes), replayed in date order by inventory()
+        self._pending_issues = []
+
+    def t(self, model):
+        return model.__table__
+
+    # ----------------------------------------------------------------- masters
+
+    def masters(self):
+        m, rows, rnd = self.m, self.rows, self.rnd
+        from app.models.inventory import LocationStock
+        from app.utils.auth import get_password_hash
+
+        self.location_stock_table = LocationStock.__table__
+        role_id = rows.add(self.t(m.Role), name="Admin", permissions=ADMIN_PERMISSIONS)
+        self.admin_id = rows.add(self.t(m.User), name="Bench Admin", email=BENCH_ADMIN_EMAIL,
+                                 hashed_password=get_password_hash(BENCH_ADMIN_PASSWORD),
+                                 phone="9000000000", role_id=role_id, is_active=True)
+        self.employee_id = rows.add(self.t(m.Employee), name="Bench Steward", role="Kitchen", salary=25000.0,
+                                    join_date=date.today() - timedelta(days=365), user_id=self.admin_id)
+
+        group_ids = {}
+        for name, account_type in ACCOUNT_GROUPS:
+            group_ids[name] = rows.add(self.t(m.AccountGroup), name=name,
+                                       account_type=m.AccountType[account_type], is_active=True)
+        self.ledger = {}
+        for key, (name, group, module, balance_type) in LEDGERS.items():
+            self.ledger[key] = rows.add(self.t(m.AccountLedger), name=name, group_id=group_ids[group], module=module,
+                                        balance_type=balance_type, opening_balance=0.0, is_active=True)
+
+        loc = self.t(m.Location)
+        self.store_id = rows.add(loc, location_code="LOC-STORE", name="Main Store", building="Main Block",
+                                 room_area="Store", location_type="Warehouse", is_inventory_point=True)
+        self.kitchen_id = rows.add(loc, location_code="LOC-KITCHEN", name="Main Kitchen", building="Main Block",
+                                   room_area="Kitchen", location_type="Department", is_inventory_point=True)
+
+        self.room_list = []
+        for i in range(self.args.rooms):
+            room_type, price = ROOM_TYPES[i % len(ROOM_TYPES)]
+            number = str(101 + (i // 20) * 100 + i % 20)
+            location_id = rows.add(loc, location_code=f"LOC-RM-{number}", name=f"Room {number}",
+                                   building="Villas" if room_type == "Cottage" else "Main Block",
+                                   floor=str(i // 20), room_area=f"Room {number}", location_type="Guest Room",
+                                   is_inventory_point=True)
+            room_id = rows.add(self.t(m.Room), number=number, type=room_type, price=price, status="Available",
+                               adults=2, children=1, inventory_location_id=location_id,
+                               air_conditioning=True, wifi=True, bathroom=True)
+            self.room_list.append({"id": room_id, "number": number, "price": price, "location_id": location_id,
+                                   "row": rows.tables[self.t(m.Room)][-1]})
+
+        self.package_list = []
+        for title, price, theme in PACKAGES:
+            package_id = rows.add(self.t(m.Package), title=title, description=f"{title} package", price=price,
+                                  booking_type="room_type", theme=theme, default_adults=2, default_children=0)
+            self.package_list.append((package_id, price))
+
+        self.food_items = []
+        for category, dishes in FOOD_MENU.items():
+            category_id = rows.add(self.t(m.FoodCategory), name=category)
+            for name, price in dishes:
+                item_id = rows.add(self.t(m.FoodItem), name=name, description=name, price=price,
+                                   available="true", category_id=category_id)
+                self.food_items.append((item_id, price))
+
+        self.vendors = []
+        for i in range(1, 21):
+            gstin = _gstin(rnd, "29" if i % 5 else "27")
+            vendor_id = rows.add(self.t(m.Vendor), name=f"Vendor {i:02d}", company_name=f"Vendor {i:02d} Traders",
+                                 gst_registration_type="Regular", gst_number=gstin, legal_name=f"Vendor {i:02d} Traders",
+                                 billing_state="Karnataka" if gstin.startswith("29") else "Maharashtra",
+                                 is_active=True)
+            self.vendors.append((vendor_id, gstin))
+
+        self.items = []
+        self.kitchen_items, self.amenity_items = [], []
+        category_ids = []
+        for name, department, gst_rate, hsn, unit, price_range, minibar in INVENTORY_CATEGORIES:
+            category_ids.append(rows.add(self.t(m.InventoryCategory), name=name, parent_department=department,
+                                         gst_tax_rate=gst_rate, default_gst_rate=gst_rate, hsn_sac_code=hsn,
+                                         classification="Goods", is_sellable=minibar, is_active=True))
+        for i in range(self.args.inventory_items):
+            c = i % len(INVENTORY_CATEGORIES)
+            name, department, gst_rate, hsn, unit, (low, high), minibar = INVENTORY_CATEGORIES[c]
+            unit_price = round(rnd.uniform(low, high), 2)
+            item_id = rows.next_id(self.t(m.InventoryItem))
+            item = {"id": item_id, "unit": unit, "unit_price": unit_price, "gst_rate": gst_rate, "hsn": hsn}
+            # current_stock is filled in once every movement is known
+            rows.add(self.t(m.InventoryItem), id=item_id, name=f"{name} item {i + 1}", item_code=f"BENCH-{i + 1:04d}",
+                     category_id=category_ids[c], hsn_code=hsn, unit=unit, current_stock=0.0, min_stock_level=5.0,
+                     unit_price=unit_price, selling_price=round(unit_price * 1.5, 2) if minibar else None,
+                     gst_rate=gst_rate, is_sellable_to_guest=minibar, complimentary_limit=2 if minibar else None,
+                     is_active=True)
+            self.items.append(item)
+            (self.kitchen_items if department == "Restaurant" and not minibar else self.amenity_items).append(item)
+
+    # ------------------------------------------------------------------ stays
+
+    def stays(self):
+        rnd, args = self.rnd, self.args
+        occupancy = min(max(args.occupancy, 0.05), 0.98)
+        for room in self.room_list:
+            day = self.start + timedelta(days=rnd.randint(0, 3))
+            while day < self.horizon:
+                nights = rnd.choice(STAY_NIGHTS)
+                check_in, check_out = day, day + timedelta(days=nights)
+                if check_out <= self.today:
+                    status = "cancelled" if rnd.random() < 0.04 else "checked-out"
+                elif check_in <= self.today:
+                    status = "checked-in"
+                else:
+                    status = "booked"
+                self._stay(room, check_in, check_out, nights, status)
+                # Mean idle gap that keeps the room at the target occupancy
+                idle = rnd.expovariate(occupancy / (nights * (1 - occupancy)))
+                day = check_out + timedelta(days=int(round(idle)))
+
+    def _stay(self, room, check_in, check_out, nights, status):
+        m, rows, rnd = self.m, self.rows, self.rnd
+        guest = f"{rnd.choice(FIRST_NAMES)} {rnd.choice(LAST_NAMES)}"
+        mobile = f"9{rnd.randint(100000000, 999999999)}"
+        checked_in_at = _at(check_in, 14, rnd.randint(0, 59)) if status in ("checked-in", "checked-out") else None
+        is_package = rnd.random() < self.args.package_share
+        if is_package:
+            package_id, package_price = rnd.choice(self.package_list)
+            booking_id = rows.add(self.t(m.PackageBooking), package_id=package_id, guest_name=guest, guest_mobile=mobile,
+                                  check_in=check_in, check_out=check_out, checked_in_at=checked_in_at,
+                                  adults=2, children=0, status=status, advance_deposit=0.0)
+            rows.add(self.t(m.PackageBookingRoom), package_booking_id=booking_id, room_id=room["id"])
+            room_total = package_price * nights
+        else:
+            room_total = room["price"] * nights
+            booking_id = rows.add(self.t(m.Booking), guest_name=guest, guest_mobile=mobile, check_in=check_in,
+                                  check_out=check_out, checked_in_at=checked_in_at, adults=2, children=0,
+                                  status=status, total_amount=room_total,
+                                  advance_deposit=round(room_total * 0.2, 2) if rnd.random() < 0.3 else 0.0)
+            rows.add(self.t(m.BookingRoom), booking_id=booking_id, room_id=room["id"])
+        if status == "checked-in":
+            room["row"]["status"] = "Occupied"
+
+        if status not in ("checked-in", "checked-out"):
+            return
+        self._amenity_issue(room, check_in)
+        last_night = min(check_out, self.today + timedelta(days=1))
+        food_total = 0.0
+        night = check_in
+        while night < last_night:
+            food_total += self._food_orders(room, night, billed=status == "checked-out")
+            night += timedelta(days=1)
+        if status == "checked-out":
+            self._checkout(room, booking_id, is_package, guest, check_out, room_total, food_total)
+
+    def _food_orders(self, room, night, billed) -> float:
+        m, rows, rnd = self.m, self.rows, self.rnd
+        mean = self.args.orders_per_night
+        count = int(mean) + (1 if rnd.random() < mean - int(mean) else 0)
+        total = 0.0
+        for _ in range(count):
+            created_at = _at(night, rnd.randint(8, 22), rnd.randint(0, 59))
+            if created_at > datetime.now():
+                continue
+            lines = [(rnd.choice(self.food_items), rnd.randint(1, 3)) for _ in range(rnd.randint(1, 3))]
+            amount = float(sum(price * qty for (_, price), qty in lines))
+            gst = round(amount * 0.05, 2)
+            order_id = rows.add(self.t(m.FoodOrder), room_id=room["id"], amount=amount, status="completed",
+                                billing_status="billed" if billed else "unbilled",
+                                order_type=rnd.choice(["room_service", "dine_in"]), gst_amount=gst,
+                                total_with_gst=amount + gst, is_deleted=False, created_at=created_at)
+            for (food_item_id, _), qty in lines:
+                rows.add(self.t(m.FoodOrderItem), order_id=order_id, food_item_id=food_item_id, quantity=qty)
+            total += amount
+        return total
+
+    def _checkout(self, room, booking_id, is_package, guest, check_out, room_total, food_total):
+        m, rows, rnd = self.m, self.rows, self.rnd
+        room_tax = round(room_total * (0.18 if room["price"] > 7500 else 0.12), 2)
+        food_tax = round(food_total * 0.05, 2)
+        tax = room_tax + food_tax
+        grand_total = round(room_total + food_total + tax, 2)
+        checkout_date = _at(check_out, 10, rnd.randint(0, 119))
+        is_b2b = rnd.random() < 0.1
+        payment_method = rnd.choice(["cash", "card", "upi", "upi"])
+        checkout_id = rows.next_id(self.t(m.Checkout))
+        rows.add(self.t(m.Checkout), id=checkout_id, booking_id=None if is_package else booking_id,
+                 package_booking_id=booking_id if is_package else None,
+                 room_total=0.0 if is_package else room_total, package_total=room_total if is_package else 0.0,
+                 food_total=food_total, tax_amount=tax, grand_total=grand_total, guest_name=guest,
+                 room_number=room["number"], checkout_date=checkout_date, created_at=checkout_date,
+                 payment_method=payment_method, payment_status="paid", is_b2b=is_b2b,
+                 guest_gstin=_gstin(rnd, rnd.choice(["29", "29", "27", "33"])) if is_b2b else None,
+                 invoice_number=f"BENCH-INV-{checkout_id:07d}")
+
+        debit = self.ledger["cash"] if payment_method == "cash" else self.ledger["bank"]
+        revenue = self.ledger["package_revenue" if is_package else "room_revenue"]
+        self._journal("checkout", checkout_id, checkout_date, f"Checkout - Room {room['number']} ({guest})", [
+            (debit, revenue, room_total),
+            (debit, self.ledger["food_revenue"], food_total),
+            (debit, self.ledger["output_cgst"], round(tax / 2, 2)),
+            (debit, self.ledger["output_sgst"], round(tax - round(tax / 2, 2), 2)),
+        ])
+
+    def _journal(self, reference_type, reference_id, entry_date, description, lines):
+        m, rows = self.m, self.rows
+        lines = [line for line in lines if line[2]]
+        entry_id = rows.next_id(self.t(m.JournalEntry))
+        rows.add(self.t(m.JournalEntry), id=entry_id, entry_number=f"JE-BENCH-{entry_id:07d}", entry_date=entry_date,
+                 reference_type=reference_type, reference_id=reference_id, description=description,
+                 total_amount=round(sum(amount for _, _, amount in lines), 2), created_by=self.admin_id,
+                 is_reversed=False, created_at=entry_date)
+        for n, (debit_id, credit_id, amount) in enumerate(lines, 1):
+            rows.add(self.t(m.JournalEntryLine), entry_id=entry_id, debit_ledger_id=debit_id,
+                     credit_ledger_id=credit_id, amount=amount, line_number=n, created_at=entry_date)
+
+    # --------------------------------------------------------------- inventory
+
+    def _move(self, location_id, item_id, quantity):
+        key = (location_id, item_id)
+        self.stock[key] = self.stock.get(key, 0.0) + quantity
+
+    def _transaction(self, item, transaction_type, quantity, reference, created_at, department=None,
+                     purchase_master_id=None, notes=None):
+        self.rows.add(self.t(self.m.InventoryTransaction), item_id=item["id"], transaction_type=transaction_type,
+                      quantity=quantity, unit_price=item["unit_price"],
+                      total_amount=round(quantity * item["unit_price"], 2), reference_number=reference,
+                      purchase_master_id=purchase_master_id, department=department, notes=notes,
+                      created_by=self.admin_id, created_at=created_at)
+
+    def _issue(self, destination_id, lines, issued_at, department, notes):
+        m, rows = self.m, self.rows
+        lines = [(item, qty) for item, qty in lines if self.stock.get((self.store_id, item["id"]), 0.0) >= qty]
+        if not lines:
+            return
+        issue_id = rows.next_id(self.t(m.StockIssue))
+        issue_number = f"ISS-BENCH-{issue_id:07d}"
+        rows.add(self.t(m.StockIssue), id=issue_id, issue_number=issue_number, issued_by=self.admin_id,
+                 source_location_id=self.store_id, destination_location_id=destination_id, issue_date=issued_at,
+                 notes=notes, created_at=issued_at)
+        for item, qty in lines:
+            rows.add(self.t(m.StockIssueDetail), issue_id=issue_id, item_id=item["id"], issued_quantity=qty,
+                     unit=item["unit"], unit_price=item["unit_price"], cost=round(qty * item["unit_price"], 2))
+            self._transaction(item, "transfer_out", qty, issue_number, issued_at, department, notes=notes)
+            self._transaction(item, "transfer_in", qty, issue_number, issued_at, department, notes=notes)
+            self._move(self.store_id, item["id"], -qty)
+            self._move(destination_id, item["id"], qty)
+
+    def _amenity_issue(self, room, check_in):
+        if not self.amenity_items:
+            return
+        lines = [(item, float(self.rnd.randint(1, 2))) for item in self.rnd.sample(self.amenity_items, min(2, len(self.amenity_items)))]
+        self._pending_issues.append((check_in, room["location_id"], lines, "Housekeeping", f"Amenities for Room {room['number']}"))
+
+    def inventory(self):
+        """Purchases week by week, then the issues that happened in between (issues only draw existing stock)"""
+        m, rows, rnd = self.m, self.rows, self.rnd
+        day_issues = {}
+        for day, destination_id, lines, department, notes in self._pending_issues:
+            day_issues.setdefault(day, []).append((destination_id, lines, department, notes))
+
+        purchase_days = PURCHASE_WEEKDAYS[:max(1, min(7, self.args.purchases_per_week))]
+        day = self.start
+        while day <= self.today:
+            if day.weekday() in purchase_days:
+                self._purchase(day)
+            if self.kitchen_items:
+                lines = [(item, float(rnd.randint(1, 5))) for item in rnd.sample(self.kitchen_items, min(4, len(self.kitchen_items)))]
+                self._issue(self.kitchen_id, lines, _at(day, 7, rnd.randint(0, 59)), "Restaurant", "Daily kitchen issue")
+            for destination_id, lines, department, notes in day_issues.get(day, ()):
+                self._issue(destination_id, lines, _at(day, 13, rnd.randint(0, 59)), department, notes)
+            day += timedelta(days=1)
+
+        for (location_id, item_id), quantity in self.stock.items():
+            if quantity > 0:
+                rows.add(self.location_stock_table, location_id=location_id, item_id=item_id,
+                         quantity=round(quantity, 3), last_updated=datetime.now())
+        totals = {}
+        for (_, item_id), quantity in self.stock.items():
+            totals[item_id] = totals.get(item_id, 0.0) + quantity
+        for row in rows.tables[self.t(m.InventoryItem)]:
+            row["current_stock"] = round(totals.get(row["id"], 0.0), 3)
+
+    def _purchase(self, day):
+        m, rows, rnd = self.m, self.rows, self.rnd
+        vendor_id, gstin = rnd.choice(self.vendors)
+        purchase_id = rows.next_id(self.t(m.PurchaseMaster))
+        purchase_number = f"PO-BENCH-{purchase_id:06d}"
+        created_at = _at(day, 11, rnd.randint(0, 59))
+        sub_total = cgst = sgst = 0.0
+        details = []
+        for item in rnd.sample(self.items, min(rnd.randint(3, 8), len(self.items))):
+            qty = float(rnd.randint(10, 60))
+            amount = round(qty * item["unit_price"], 2)
+            tax = round(amount * item["gst_rate"] / 200, 2)
+            sub_total += amount
+            cgst += tax
+            sgst += tax
+            details.append((item, qty, amount, tax))
+            rows.add(self.t(m.PurchaseDetail), purchase_master_id=purchase_id, item_id=item["id"],
+                     hsn_code=item["hsn"], quantity=qty, unit=item["unit"], unit_price=item["unit_price"],
+                     gst_rate=item["gst_rate"], cgst_amount=tax, sgst_amount=tax, igst_amount=0.0, discount=0.0,
+                     total_amount=round(amount + 2 * tax, 2))
+        total = round(sub_total + cgst + sgst, 2)
+        rows.add(self.t(m.PurchaseMaster), id=purchase_id, purchase_number=purchase_number, vendor_id=vendor_id,
+                 purchase_date=day, invoice_number=f"INV/{vendor_id:02d}/{purchase_id:06d}", invoice_date=day,
+                 gst_number=gstin, payment_terms="Net 30",
+                 payment_status="paid" if day < self.today - timedelta(days=30) else rnd.choice(["pending", "paid"]),
+                 payment_method="Bank Transfer", sub_total=round(sub_total, 2), cgst=round(cgst, 2),
+                 sgst=round(sgst, 2), igst=0.0, discount=0.0, total_amount=total, status="received",
+                 destination_location_id=self.store_id, created_by=self.admin_id, created_at=created_at)
+        for item, qty, amount, tax in details:
+            self._transaction(item, "in", qty, purchase_number, created_at, purchase_master_id=purchase_id)
+            self._move(self.store_id, item["id"], qty)
+        self._journal("purchase", purchase_id, created_at, f"Purchase {purchase_number}", [
+            (self.ledger["inventory"], self.ledger["payable"], round(sub_total, 2)),
+            (self.ledger["input_cgst"], self.ledger["payable"], round(cgst, 2)),
+            (self.ledger["input_sgst"], self.ledger["payable"], round(sgst, 2)),
+        ])
+
+    # ------------------------------------------------------------------- write
+
+    def build(self):
+        self.masters()
+        self.stays()
+        self.inventory()
+        return self.rows
+
+    def write(self, engine):
+        from sqlalchemy import text
+
+        from app.database import Base
+
+        tables = self.rows.tables
+        with engine.begin() as conn:
+            for table in Base.metadata.sorted_tables:
+                rows = tables.get(table)
+                if not rows:
+                    continue
+                for start in range(0, len(rows), BATCH_SIZE):
+                    conn.execute(table.insert(), rows[start:start + BATCH_SIZE])
+            if engine.dialect.name == "postgresql":
+                for table in tables:
+                    if "id" in table.c:
+                        conn.execute(text(
+                            f"SELECT setval(pg_get_serial_sequence('{table.name}', 'id'), "
+                            f"COALESCE((SELECT MAX(id) FROM {table.name}), 1))"
+                        ))
+
+
+def generate(args, engine=None):
+    """Seed the database behind app.database (or `engine`); returns {table name: row count}"""
+    import app.models  # noqa: F401  (registers every table)
+    from app.database import Base, engine as app_engine
+
+    engine = engine or app_engine
+    if args.reset:
+        Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+
+    from sqlalchemy import func, select
+    from app.models import Room
+    with engine.connect() as conn:
+        if conn.execute(select(func.count(Room.id))).scalar():
+            raise SystemExit("Target database already has rooms; use --reset on a scratch database")
+
+    generator = Generator(args)
+    rows = generator.build()
+    generator.write(engine)
+    return {table.name: len(values) for table, values in rows.tables.items()}
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.url:
+        # app.database reads DATABASE_URL at import
+        os.environ["DATABASE_URL"] = args.url
+    started = time.perf_counter()
+    counts = generate(args)
+    elapsed = time.perf_counter() - started
+
+    print(f"Generated in {elapsed:.1f}s (seed {args.seed}):")
+    for name, count in sorted(counts.items(), key=lambda kv: -kv[1]):
+        print(f"  {name:28} {count:>9}")
+    print(f"Login: {BENCH_ADMIN_EMAIL} / {BENCH_ADMIN_PASSWORD}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+Dinner-rush benchmark: food order intake at a fixed arrival rate.
+
+Sends POST /api/food-orders open-loop at --rate orders per second for
+--duration seconds. Arrivals follow the schedule whether or not earlier
+orders have finished, so a slow server shows up as latency and backlog
+instead of a politely reduced rate. Each order has 1-4 dishes for a random
+in-house room; --room-service sets the share that are room-service orders,
+which also create a delivery request. The kitchen queue is read once at the
+end to check that every accepted order reached it.
+
+Reports achieved orders/s, latency percentiles (measured from the scheduled
+send time), SQL statements per order, and whether the run met --rate with p95
+under --max-p95-ms. Exits 1 if it did not.
+
+Usage (from ResortApp/):
+    python -m benchmarks.datagen --url sqlite:////tmp/bench.db --rooms 60 --reset
+    python -m benchmarks.food_order_rush --url sqlite:////tmp/bench.db --rate 50 --duration 30
+    python -m benchmarks.food_order_rush --base-url http://127.0.0.1:8011 --rate 80
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+
+import httpx
+
+from benchmarks.datagen import BENCH_ADMIN_EMAIL, BENCH_ADMIN_PASSWORD
+from benchmarks.scenarios import login, percentile, start_server, wait_ready
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="database URL for the server started by the runner (default: DATABASE_URL)")
+    parser.add_argument("--base-url", help="drive an already running server instead of starting one")
+    parser.add_argument("--port", type=int, default=8767)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers for the started server")
+    parser.add_argument("--rate", type=float, default=50.0, help="orders per second")
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds of arrivals")
+    parser.add_argument("--room-service", type=float, default=0.6, help="share of room-service orders")
+    parser.add_argument("--max-p95-ms", type=float, default=500.0, help="p95 latency the run must stay under")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--email", default=BENCH_ADMIN_EMAIL)
+    parser.add_argument("--password", default=BENCH_ADMIN_PASSWORD)
+    parser.add_argument("--json", help="write results to this file")
+    return parser
+
+
+def load_fixtures(client: httpx.Client) -> dict:
+    """Dishes, rooms and an employee to assign orders to, from the API"""
+    dishes = client.get("/api/food-items", params={"limit": 200})
+    dishes.raise_for_status()
+    rooms = client.get("/api/rooms", params={"limit": 50})
+    rooms.raise_for_status()
+    employees = client.get("/api/employees")
+    employees.raise_for_status()
+    fixtures = {
+        "dishes": [(d["id"], float(d.get("price") or 0)) for d in dishes.json()],
+        "rooms": [r["id"] for r in rooms.json()],
+        "employee_id": employees.json()[0]["id"] if employees.json() else None,
+    }
+    if not fixtures["dishes"] or not fixtures["rooms"] or fixtures["employee_id"] is None:
+        raise RuntimeError("Benchmark needs food items, rooms and an employee; run benchmarks.datagen first")
+    return fixtures
+
+
+def make_order(rnd: random.Random, fixtures: dict, room_service_share: float) -> dict:
+    lines = [(rnd.choice(fixtures["dishes"]), rnd.randint(1, 3)) for _ in range(rnd.randint(1, 4))]
+    room_service = rnd.random() < room_service_share
+    return {
+        "room_id": rnd.choice(fixtures["rooms"]),
+        "amount": round(sum(price * qty for (_, price), qty in lines), 2),
+        "assigned_employee_id": fixtures["employee_id"],
+        "order_type": "room_service" if room_service else "dine_in",
+        "delivery_request": "Bench rush" if room_service else None,
+        "items": [{"food_item_id": dish_id, "quantity": qty} for (dish_id, _), qty in lines],
+    }
+
+
+async def run_rush(base_url: str, headers: dict, orders: list, rate: float) -> dict:
+    latencies, queries, statuses, accepted = [], [], {}, []
+    limits = httpx.Limits(max_connections=200, max_keepalive_connections=200)
+
+    async with httpx.AsyncClient(base_url=base_url, headers=headers, limits=limits, timeout=60) as client:
+        async def send(order, scheduled):
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            try:
+                resp = await client.post("/api/food-orders", json=order)
+                status = resp.status_code
+                if status == 200:
+                    accepted.append(resp.json()["id"])
+                if resp.headers.get("X-DB-Queries"):
+                    queries.append(int(resp.headers["X-DB-Queries"]))
+            except httpx.HTTPError:
+                status = "error"
+            # From the scheduled send time: queueing behind a slow server counts
+            latencies.append(time.perf_counter() - scheduled)
+            statuses[status] = statuses.get(status, 0) + 1
+
+        start = time.perf_counter() + 0.5
+        await asyncio.gather(*(send(order, start + i / rate) for i, order in enumerate(orders)))
+        elapsed = time.perf_counter() - start
+    return {"latencies": latencies, "queries": queries, "statuses": statuses, "accepted": accepted, "elapsed": elapsed}
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    base_url = args.base_url or f"http://127.0.0.1:{args.port}"
+    rnd = random.Random(args.seed)
+    proc = None if args.base_url else start_server(args)
+    try:
+        wait_ready(base_url)
+        headers = login(base_url, args.email, args.password)
+        with httpx.Client(base_url=base_url, headers=headers, timeout=60) as client:
+            fixtures = load_fixtures(client)
+            before = client.get("/api/food-orders/kitchen-queue").json()["seq"]
+
+        orders = [make_order(rnd, fixtures, args.room_service) for _ in range(int(args.rate * args.duration))]
+        run = asyncio.run(run_rush(base_url, headers, orders, args.rate))
+
+        with httpx.Client(base_url=base_url, headers=headers, timeout=60) as client:
+            queued = {t["order_id"] for t in client.get("/api/food-orders/kitchen-queue",
+                                                        params={"after": before}).json()["tickets"]}
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait(timeout=30)
+
+    latencies = sorted(run["latencies"])
+    accepted = run["accepted"]
+    results = {
+        "orders": len(orders),
+        "accepted": len(accepted),
+        "statuses": {str(k): v for k, v in run["statuses"].items()},
+        "target_rate": args.rate,
+        "achieved_rate": round(len(accepted) / run["elapsed"], 2) if run["elapsed"] else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "queries_per_order": round(sum(run["queries"]) / len(run["queries"]), 2) if run["queries"] else None,
+        "missing_from_kitchen_queue": len(set(accepted) - queued),
+    }
+    passed = (
+        results["accepted"] == results["orders"]
+        and results["achieved_rate"] >= args.rate * 0.95
+        and results["p95_ms"] <= args.max_p95_ms
+        and results["missing_from_kitchen_queue"] == 0
+    )
+    results["passed"] = passed
+
+    print(f"{results['orders']} orders at {args.rate:.0f}/s against {base_url}")
+    print(f"  accepted {results['accepted']}  statuses {results['statuses']}")
+    print(f"  achieved {results['achieved_rate']:.1f} orders/s")
+    print(f"  latency p50 {results['p50_ms']:.1f} ms  p95 {results['p95_ms']:.1f} ms  p99 {results['p99_ms']:.1f} ms")
+    if results["queries_per_order"] is not None:
+        print(f"  SQL statements per order {results['queries_per_order']:.1f}")
+    print(f"  missing from kitchen queue {results['missing_from_kitchen_queue']}")
+    print("  PASS" if passed else f"  FAIL (needs {args.rate:.0f}/s with p95 <= {args.max_p95_ms:.0f} ms)")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    if not passed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
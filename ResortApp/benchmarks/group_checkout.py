@@ -0,0 +1,188 @@
+"""
+Group checkout benchmark.
+
+Seeds one booking holding --rooms rooms (each with food orders, assigned
+services, issued minibar stock and a completed checkout request) plus the
+ledgers the checkout journal entry needs, then times
+POST /api/bill/checkout/{room} with checkout_mode="multiple". The booking is
+re-seeded before every run; only the request is timed.
+
+Prints the median wall time, SQL statements and COMMITs per request.
+
+Usage (from ResortApp/):
+    python benchmarks/group_checkout.py
+    python benchmarks/group_checkout.py --rooms 40 --runs 10
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="scratch database URL (default: temporary sqlite file)")
+    parser.add_argument("--rooms", type=int, default=30, help="rooms in the group booking")
+    parser.add_argument("--items", type=int, default=8, help="minibar lines per room")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    return parser.parse_args()
+
+
+args = parse_args()
+if not args.url:
+    args.url = "sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="group_checkout_"), "bench.db")
+# app.database reads DATABASE_URL at import
+os.environ["DATABASE_URL"] = args.url
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+os.environ["DB_INSTRUMENTATION"] = "true"
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+import main  # noqa: E402
+from app.database import Base, SessionLocal, engine  # noqa: E402
+from app.models import (  # noqa: E402
+    AccountGroup, AccountLedger, AccountType, AssignedService, Booking, BookingRoom, FoodCategory, FoodItem,
+    FoodOrder, FoodOrderItem, InventoryCategory, InventoryItem, Location, Role, Room, Service, StockIssue,
+    StockIssueDetail, User,
+)
+from app.models.checkout import CheckoutRequest  # noqa: E402
+from app.models.inventory import LocationStock  # noqa: E402
+from app.utils import auth  # noqa: E402
+from app.api import auth as auth_api  # noqa: E402
+from benchmarks.datagen import ACCOUNT_GROUPS, LEDGERS  # noqa: E402
+
+
+def seed(rnd: random.Random):
+    """Fresh group booking; returns (primary room number, admin user id)"""
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    db = SessionLocal()
+    try:
+        role = Role(name="Admin", permissions="")
+        db.add(role)
+        db.flush()
+        admin = User(name="Bench Admin", email="admin@bench.local", hashed_password="x", role_id=role.id, is_active=True)
+        store = Location(name="Main Store", building="Main", room_area="Store", location_type="WAREHOUSE", is_inventory_point=True)
+        minibar = InventoryCategory(name="Minibar", is_sellable=True)
+        food_category = FoodCategory(name="Mains")
+        db.add_all([admin, store, minibar, food_category])
+        db.flush()
+
+        group_ids = {}
+        for name, account_type in ACCOUNT_GROUPS:
+            group = AccountGroup(name=name, account_type=AccountType[account_type], is_active=True)
+            db.add(group)
+            db.flush()
+            group_ids[name] = group.id
+        ledgers = list(LEDGERS.values()) + [("Service Revenue (Taxable)", "Sales Accounts", "Service", "credit")]
+        for name, group, module, balance_type in ledgers:
+            db.add(AccountLedger(name=name, group_id=group_ids[group], module=module, balance_type=balance_type,
+                                 opening_balance=0.0, is_active=True))
+
+        dishes = [FoodItem(name=f"Dish {i + 1}", price=rnd.randint(150, 900), available="true", category_id=food_category.id)
+                  for i in range(20)]
+        services = [Service(name=f"Service {i + 1}", charges=float(rnd.randint(200, 2500)), gst_rate=0.18) for i in range(5)]
+        items = [InventoryItem(name=f"Minibar {i + 1}", item_code=f"MB-{i + 1:03d}", category_id=minibar.id, unit="pcs",
+                               unit_price=round(rnd.uniform(20, 200), 2), selling_price=round(rnd.uniform(50, 400), 2),
+                               gst_rate=18.0, complimentary_limit=1, is_sellable_to_guest=True, current_stock=500.0)
+                 for i in range(args.items)]
+        db.add_all(dishes + services + items)
+        db.flush()
+
+        check_in = date.today() - timedelta(days=2)
+        booking = Booking(guest_name="Bench Wedding Group", check_in=check_in, check_out=date.today(), status="checked-in")
+        db.add(booking)
+        db.flush()
+
+        rooms = []
+        for n in range(args.rooms):
+            number = str(101 + n)
+            loc = Location(name=f"Room {number}", building="Main", room_area=f"Room {number}",
+                           location_type="GUEST_ROOM", is_inventory_point=True)
+            db.add(loc)
+            db.flush()
+            room = Room(number=number, price=rnd.choice([3500, 4500, 6000, 8000]), status="Occupied",
+                        inventory_location_id=loc.id)
+            db.add(room)
+            db.flush()
+            rooms.append(room)
+            db.add(BookingRoom(booking_id=booking.id, room_id=room.id))
+
+            issue = StockIssue(issue_number=f"ISS-BENCH-{n + 1:03d}", issued_by=admin.id, source_location_id=store.id,
+                               destination_location_id=loc.id, issue_date=datetime.combine(check_in, datetime.min.time()))
+            db.add(issue)
+            db.flush()
+            lines = []
+            for item in items:
+                db.add(StockIssueDetail(issue_id=issue.id, item_id=item.id, issued_quantity=2.0, unit="pcs",
+                                        is_payable=rnd.random() < 0.5))
+                db.add(LocationStock(location_id=loc.id, item_id=item.id, quantity=2.0))
+                lines.append({"item_id": item.id, "item_name": item.name, "item_code": item.item_code,
+                              "used_qty": rnd.randint(0, 2), "missing_qty": 1 if rnd.random() < 0.05 else 0,
+                              "damage_qty": 0})
+            db.add(CheckoutRequest(booking_id=booking.id, room_number=number, guest_name=booking.guest_name,
+                                   status="completed", inventory_checked=True, inventory_data=lines))
+
+            for _ in range(rnd.randint(1, 4)):
+                order = FoodOrder(room_id=room.id, amount=0, status="completed", billing_status="unbilled",
+                                  created_at=datetime.utcnow() - timedelta(hours=rnd.randint(1, 40)))
+                db.add(order)
+                db.flush()
+                total = 0
+                for dish in rnd.sample(dishes, rnd.randint(1, 3)):
+                    quantity = rnd.randint(1, 3)
+                    total += dish.price * quantity
+                    db.add(FoodOrderItem(order_id=order.id, food_item_id=dish.id, quantity=quantity))
+                order.amount = total
+            for service in rnd.sample(services, rnd.randint(0, 2)):
+                db.add(AssignedService(service_id=service.id, room_id=room.id, billing_status="unbilled"))
+
+        db.commit()
+        return rooms[0].number, admin.id
+    finally:
+        db.close()
+
+
+def main_bench():
+    client = TestClient(main.app)
+    commits = []
+    event.listen(engine, "commit", lambda conn: commits.append(1))
+    timings, queries, commit_counts = [], [], []
+    for run in range(args.runs):
+        room_number, admin_id = seed(random.Random(args.seed + run))
+
+        def current_user():
+            db = SessionLocal()
+            try:
+                return db.get(User, admin_id)
+            finally:
+                db.close()
+
+        main.app.dependency_overrides[auth.get_current_user] = current_user
+        main.app.dependency_overrides[auth_api.get_current_user] = current_user
+        commits.clear()
+        started = time.perf_counter()
+        resp = client.post(f"/api/bill/checkout/{room_number}", json={"payment_method": "card", "checkout_mode": "multiple"})
+        timings.append(time.perf_counter() - started)
+        if resp.status_code != 200:
+            raise SystemExit(f"group checkout failed: {resp.status_code} {resp.text[:300]}")
+        queries.append(int(resp.headers.get("X-DB-Queries", 0)))
+        # the auth override's own session commits nothing; every COMMIT here is the checkout's
+        commit_counts.append(len(commits))
+
+    print(f"{args.rooms} rooms x {args.items} minibar lines, {args.runs} runs on {engine.dialect.name}")
+    print(f"  median {statistics.median(timings) * 1000:.1f} ms, min {min(timings) * 1000:.1f} ms")
+    print(f"  {statistics.median(queries):.0f} SQL statements, {statistics.median(commit_counts):.0f} COMMITs per request")
+
+
+if __name__ == "__main__":
+    main_bench()
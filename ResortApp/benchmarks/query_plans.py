@@ -0,0 +1,227 @@
+"""
+Before/after query plans for the hot booking, order and inventory filters.
+
+Seeds a scratch database, then runs each access path twice:
+  before - legacy predicate (func.date / cast(..., Date) / lower(status) IN variants)
+           with the normalize_status_indexes indexes dropped
+  after  - sargable predicate with the indexes in place
+and prints the plan (EXPLAIN QUERY PLAN on sqlite, EXPLAIN ANALYZE on Postgres)
+and the median wall time per query.
+
+Usage (from ResortApp/):
+    python benchmarks/query_plans.py                      # scratch sqlite file
+    python benchmarks/query_plans.py --url postgresql://... --bookings 200000
+
+Never point --url at a live database: the tables are created and filled.
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="scratch database URL (default: temporary sqlite file)")
+    parser.add_argument("--rooms", type=int, default=200)
+    parser.add_argument("--bookings", type=int, default=50000)
+    parser.add_argument("--orders-per-booking", type=int, default=4)
+    parser.add_argument("--transactions", type=int, default=200000)
+    parser.add_argument("--runs", type=int, default=15, help="timed executions per query")
+    return parser.parse_args()
+
+
+args = parse_args()
+if not args.url:
+    args.url = "sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="query_plans_"), "bench.db")
+# app.database reads DATABASE_URL at import
+os.environ["DATABASE_URL"] = args.url
+
+from sqlalchemy import Date, func, select, text  # noqa: E402
+
+import app.models  # noqa: E402,F401  (registers every table)
+from app.database import Base, engine  # noqa: E402
+from app.models import (  # noqa: E402
+    Booking, BookingRoom, Checkout, FoodOrder, InventoryCategory, InventoryItem,
+    InventoryTransaction, PackageBooking, Room, ServiceRequest,
+)
+from app.utils.booking_status import (  # noqa: E402
+    ACTIVE_BOOKING_STATUSES, BOOKED, CANCELLED, CHECKED_IN, CHECKED_OUT,
+)
+from app.utils.date_utils import on_day, start_of_day, start_of_next_day  # noqa: E402
+
+NEW_INDEXES = [
+    ("bookings", "ix_bookings_active"),
+    ("bookings", "ix_bookings_check_in_check_out"),
+    ("package_bookings", "ix_package_bookings_active"),
+    ("package_bookings", "ix_package_bookings_check_in_check_out"),
+    ("booking_rooms", "ix_booking_rooms_room_id_booking_id"),
+    ("booking_rooms", "ix_booking_rooms_booking_id"),
+    ("package_booking_rooms", "ix_package_booking_rooms_room_id_booking_id"),
+    ("package_booking_rooms", "ix_package_booking_rooms_package_booking_id"),
+    ("food_orders", "ix_food_orders_room_id_created_at"),
+    ("food_orders", "ix_food_orders_created_at"),
+    ("service_requests", "ix_service_requests_room_id_created_at"),
+    ("inventory_transactions", "ix_inventory_transactions_item_id_created_at"),
+    ("inventory_transactions", "ix_inventory_transactions_created_at"),
+    ("checkouts", "ix_checkouts_room_number_checkout_date"),
+    ("checkouts", "ix_checkouts_checkout_date"),
+]
+
+
+def seed(conn):
+    rnd = random.Random(42)
+    today = date.today()
+    conn.execute(Room.__table__.insert(), [
+        {"id": i, "number": str(100 + i), "price": 3000, "status": "Available"} for i in range(1, args.rooms + 1)
+    ])
+    conn.execute(InventoryCategory.__table__.insert(), [{"id": 1, "name": "Bench"}])
+    conn.execute(InventoryItem.__table__.insert(), [
+        {"id": i, "name": f"Item {i}", "category_id": 1, "unit": "pcs"} for i in range(1, 501)
+    ])
+
+    bookings, links, orders, checkouts, requests = [], [], [], [], []
+    for booking_id in range(1, args.bookings + 1):
+        check_in = today - timedelta(days=rnd.randint(-30, 720))
+        check_out = check_in + timedelta(days=rnd.randint(1, 7))
+        if check_out < today:
+            status = rnd.choice([CHECKED_OUT] * 9 + [CANCELLED])
+        elif check_in <= today:
+            status = CHECKED_IN
+        else:
+            status = BOOKED
+        room_id = rnd.randint(1, args.rooms)
+        bookings.append({"id": booking_id, "status": status, "guest_name": f"Guest {booking_id}",
+                         "check_in": check_in, "check_out": check_out})
+        links.append({"booking_id": booking_id, "room_id": room_id})
+        for _ in range(args.orders_per_booking):
+            orders.append({"room_id": room_id, "amount": 500, "status": "completed", "billing_status": "billed",
+                           "created_at": datetime.combine(check_in, datetime.min.time()) + timedelta(hours=rnd.randint(1, 60))})
+        requests.append({"room_id": room_id, "request_type": "delivery", "status": "completed",
+                         "created_at": datetime.combine(check_in, datetime.min.time()) + timedelta(hours=rnd.randint(1, 60))})
+        if status == CHECKED_OUT:
+            checkouts.append({"booking_id": booking_id, "room_number": str(100 + room_id), "guest_name": f"Guest {booking_id}",
+                              "grand_total": 5000, "checkout_date": datetime.combine(check_out, datetime.min.time()) + timedelta(hours=11)})
+    for table, rows in ((Booking.__table__, bookings), (BookingRoom.__table__, links), (FoodOrder.__table__, orders),
+                        (ServiceRequest.__table__, requests), (Checkout.__table__, checkouts)):
+        for start in range(0, len(rows), 5000):
+            conn.execute(table.insert(), rows[start:start + 5000])
+
+    transactions = [{
+        "item_id": rnd.randint(1, 500), "transaction_type": rnd.choice(["in", "out"]), "quantity": 1,
+        "created_at": datetime.now() - timedelta(minutes=rnd.randint(0, 720 * 24 * 60)),
+    } for _ in range(args.transactions)]
+    for start in range(0, len(transactions), 5000):
+        conn.execute(InventoryTransaction.__table__.insert(), transactions[start:start + 5000])
+
+
+def scenarios():
+    """(name, legacy statement, sargable statement)"""
+    today = date.today()
+    month_start = today.replace(day=1) - timedelta(days=60)
+    room_number = "150"
+    return [
+        ("checkout for room today",
+         select(Checkout.id).where(Checkout.room_number == room_number, func.date(Checkout.checkout_date) == today),
+         select(Checkout.id).where(Checkout.room_number == room_number, on_day(Checkout.checkout_date, today))),
+        ("checkouts on a day (dashboard)",
+         select(func.count(Checkout.id)).where(func.cast(Checkout.checkout_date, Date) == today - timedelta(days=3)),
+         select(func.count(Checkout.id)).where(on_day(Checkout.checkout_date, today - timedelta(days=3)))),
+        ("active bookings (active rooms)",
+         select(Booking.id).where(func.lower(Booking.status).in_(["checked-in", "checked_in", "checked in", "booked"])),
+         select(Booking.id).where(Booking.status.in_(ACTIVE_BOOKING_STATUSES))),
+        ("active booking for room",
+         select(Booking.id).join(BookingRoom, BookingRoom.booking_id == Booking.id)
+         .where(BookingRoom.room_id == 50, func.lower(Booking.status).in_(["checked-in", "checked_in", "booked"]))
+         .order_by(Booking.id.desc()).limit(1),
+         select(Booking.id).join(BookingRoom, BookingRoom.booking_id == Booking.id)
+         .where(BookingRoom.room_id == 50, Booking.status.in_(ACTIVE_BOOKING_STATUSES))
+         .order_by(Booking.id.desc()).limit(1)),
+        ("room food orders since check-in (bill)",
+         select(FoodOrder.id).where(FoodOrder.room_id == 50, func.date(FoodOrder.created_at) >= today - timedelta(days=5)),
+         select(FoodOrder.id).where(FoodOrder.room_id == 50, FoodOrder.created_at >= start_of_day(today - timedelta(days=5)))),
+        ("food orders in a date range (reports)",
+         select(func.sum(FoodOrder.amount)).where(func.date(FoodOrder.created_at) >= month_start,
+                                                  func.date(FoodOrder.created_at) <= month_start + timedelta(days=30)),
+         select(func.sum(FoodOrder.amount)).where(FoodOrder.created_at >= start_of_day(month_start),
+                                                  FoodOrder.created_at < start_of_next_day(month_start + timedelta(days=30)))),
+        ("latest service requests for room",
+         select(ServiceRequest.id).where(ServiceRequest.room_id == 50).order_by(ServiceRequest.created_at.desc()).limit(20),
+         select(ServiceRequest.id).where(ServiceRequest.room_id == 50).order_by(ServiceRequest.created_at.desc()).limit(20)),
+        ("item stock movement in a range",
+         select(InventoryTransaction.id).where(InventoryTransaction.item_id == 7,
+                                               func.date(InventoryTransaction.created_at) >= month_start,
+                                               func.date(InventoryTransaction.created_at) <= month_start + timedelta(days=30)),
+         select(InventoryTransaction.id).where(InventoryTransaction.item_id == 7,
+                                               InventoryTransaction.created_at >= start_of_day(month_start),
+                                               InventoryTransaction.created_at < start_of_next_day(month_start + timedelta(days=30)))),
+    ]
+
+
+def explain(conn, stmt) -> str:
+    compiled = stmt.compile(engine, compile_kwargs={"literal_binds": True})
+    if engine.dialect.name == "sqlite":
+        rows = conn.execute(text(f"EXPLAIN QUERY PLAN {compiled}")).all()
+        return "\n".join(f"    {row[-1]}" for row in rows)
+    rows = conn.execute(text(f"EXPLAIN ANALYZE {compiled}")).all()
+    return "\n".join(f"    {row[0]}" for row in rows)
+
+
+def timed(conn, stmt) -> float:
+    samples = []
+    for _ in range(args.runs):
+        started = time.perf_counter()
+        conn.execute(stmt).all()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000
+
+
+def run_phase(label, pick):
+    results = {}
+    with engine.connect() as conn:
+        for name, legacy, sargable in scenarios():
+            stmt = pick(legacy, sargable)
+            plan = explain(conn, stmt)
+            results[name] = timed(conn, stmt)
+            print(f"[{label}] {name}: {results[name]:.2f} ms")
+            print(plan)
+    return results
+
+
+def main():
+    print(f"Seeding {args.url} ...")
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        seed(conn)
+        for table, index in NEW_INDEXES:
+            conn.execute(text(f"DROP INDEX IF EXISTS {index}"))
+        conn.execute(text("ANALYZE"))
+
+    before = run_phase("before", lambda legacy, sargable: legacy)
+
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                if any(index.name == name for _, name in NEW_INDEXES):
+                    index.create(conn, checkfirst=True)
+        conn.execute(text("ANALYZE"))
+
+    after = run_phase("after", lambda legacy, sargable: sargable)
+
+    print()
+    print(f"{'query':45} {'before ms':>10} {'after ms':>10} {'speedup':>8}")
+    for name in before:
+        speedup = before[name] / after[name] if after[name] else float("inf")
+        print(f"{name:45} {before[name]:10.2f} {after[name]:10.2f} {speedup:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+"""
+Scenario runner: concurrent load against the key endpoints with latency
+percentiles and SQL queries per request.
+
+Scenarios (weighted round-robin across --concurrency clients):
+    active_rooms       GET  /api/bill/active-rooms
+    bill_preview       GET  /api/bill/{room}?checkout_mode=single
+    checkout           POST /api/bill/checkout/{room}    (each in-house room once, --checkouts rooms)
+    stock_by_location  GET  /api/inventory/stock-by-location
+    dashboard_summary  GET  /api/dashboard/summary?period=month
+    gst_b2b / gst_hsn  GET  /api/gst-reports/...          (previous calendar month)
+    occupancy_series   GET  /api/reports/front-office/occupancy-series  (trailing 365 nights)
+
+Queries per request come from the X-DB-Queries header (DB_INSTRUMENTATION, on
+by default). Without --base-url the runner starts uvicorn on --url itself.
+
+Usage (from ResortApp/):
+    python -m benchmarks.datagen --url sqlite:////tmp/bench.db --rooms 60 --years 2 --reset
+    python -m benchmarks.scenarios --url sqlite:////tmp/bench.db --duration 30 --json results.json
+    python -m benchmarks.scenarios --url ... --baseline results.json   # exit 1 on regression
+
+The checkout scenario writes; re-generate the data before comparing runs.
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import subprocess
+import sys
+import time
+from datetime import date, timedelta
+from itertools import cycle
+
+import httpx
+
+from benchmarks.datagen import BENCH_ADMIN_EMAIL, BENCH_ADMIN_PASSWORD
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="database URL for the server started by the runner (default: DATABASE_URL)")
+    parser.add_argument("--base-url", help="drive an already running server instead of starting one")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers for the started server")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds of measured load")
+    parser.add_argument("--warmup", type=float, default=3.0)
+    parser.add_argument("--scenarios", help="comma-separated subset of scenario names")
+    parser.add_argument("--checkouts", type=int, default=5, help="in-house rooms reserved for the checkout scenario")
+    parser.add_argument("--email", default=BENCH_ADMIN_EMAIL)
+    parser.add_argument("--password", default=BENCH_ADMIN_PASSWORD)
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--baseline", help="results file from an earlier run; exit 1 on regression")
+    parser.add_argument("--latency-tolerance", type=float, default=0.25, help="allowed p95 growth vs baseline")
+    parser.add_argument("--query-tolerance", type=float, default=0.0, help="allowed queries/request growth vs baseline")
+    return parser
+
+
+# ---------------------------------------------------------------- scenarios
+
+class Scenario:
+    """One endpoint; `request()` returns (method, path, json body) or None when it has nothing left to do"""
+
+    def __init__(self, name: str, weight: int, request):
+        self.name = name
+        self.weight = weight
+        self.request = request
+        self.latencies = []
+        self.queries = []
+        self.errors = 0
+        self.statuses = {}
+
+
+def build_scenarios(fixtures: dict):
+    today = date.today()
+    month_end = today.replace(day=1) - timedelta(days=1)
+    period = f"start_date={month_end.replace(day=1)}&end_date={month_end}"
+    year = f"start_date={today - timedelta(days=364)}&end_date={today}"
+    preview_rooms = cycle(fixtures["preview_rooms"] or [None])
+    checkout_rooms = list(fixtures["checkout_rooms"])
+
+    def bill_preview():
+        room = next(preview_rooms)
+        return ("GET", f"/api/bill/{room}?checkout_mode=single", None) if room else None
+
+    def checkout():
+        if not checkout_rooms:
+            return None
+        room = checkout_rooms.pop()
+        return "POST", f"/api/bill/checkout/{room}", {"payment_method": "cash", "checkout_mode": "single"}
+
+    return [
+        Scenario("active_rooms", 3, lambda: ("GET", "/api/bill/active-rooms", None)),
+        Scenario("bill_preview", 3, bill_preview),
+        Scenario("checkout", 1, checkout),
+        Scenario("stock_by_location", 1, lambda: ("GET", "/api/inventory/stock-by-location", None)),
+        Scenario("dashboard_summary", 2, lambda: ("GET", "/api/dashboard/summary?period=month", None)),
+        Scenario("gst_b2b", 1, lambda: ("GET", f"/api/gst-reports/b2b-sales?{period}", None)),
+        Scenario("gst_hsn", 1, lambda: ("GET", f"/api/gst-reports/hsn-sac-summary?{period}", None)),
+        Scenario("occupancy_series", 1, lambda: ("GET", f"/api/reports/front-office/occupancy-series?{year}", None)),
+    ]
+
+
+def load_fixtures(client: httpx.Client, checkouts: int) -> dict:
+    """In-house rooms from the API: the first `checkouts` are checked out, the rest are previewed"""
+    resp = client.get("/api/bill/active-rooms")
+    resp.raise_for_status()
+    rooms = sorted({str(r.get("number") or r.get("room_number")) for r in resp.json()
+                    if r.get("number") or r.get("room_number")})
+    return {"checkout_rooms": rooms[:checkouts], "preview_rooms": rooms[checkouts:] or rooms}
+
+
+# ------------------------------------------------------------------- driver
+
+async def run_load(base_url: str, headers: dict, scenarios, concurrency: int, duration: float, record: bool):
+    schedule = cycle([s for s in scenarios for _ in range(s.weight)])
+    stop_at = time.perf_counter() + duration
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, headers=headers, limits=limits, timeout=60) as client:
+        async def worker():
+            idle = 0
+            while time.perf_counter() < stop_at:
+                scenario = next(schedule)
+                request = scenario.request()
+                if request is None:
+                    idle += 1
+                    if idle > len(scenarios) * 4:
+                        await asyncio.sleep(0.01)
+                    continue
+                idle = 0
+                method, path, body = request
+                start = time.perf_counter()
+                try:
+                    resp = await client.request(method, path, json=body)
+                    status = resp.status_code
+                    queries = resp.headers.get("X-DB-Queries")
+                except httpx.HTTPError:
+                    status, queries = "error", None
+                elapsed = time.perf_counter() - start
+                if not record:
+                    continue
+                scenario.latencies.append(elapsed)
+                scenario.statuses[status] = scenario.statuses.get(status, 0) + 1
+                if status == "error" or status >= 400:
+                    scenario.errors += 1
+                if queries is not None:
+                    scenario.queries.append(int(queries))
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+
+def percentile(sorted_values, pct: float) -> float:
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(scenarios, duration: float) -> dict:
+    results = {}
+    for s in scenarios:
+        if not s.latencies:
+            continue
+        latencies = sorted(s.latencies)
+        results[s.name] = {
+            "requests": len(latencies),
+            "errors": s.errors,
+            "statuses": {str(k): v for k, v in s.statuses.items()},
+            "throughput_rps": round(len(latencies) / duration, 2),
+            "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+            "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+            "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+            "queries_per_request": round(sum(s.queries) / len(s.queries), 2) if s.queries else None,
+            "max_queries": max(s.queries) if s.queries else None,
+        }
+    return results
+
+
+def print_results(results: dict):
+    print(f"{'scenario':20} {'req':>6} {'err':>4} {'req/s':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'q/req':>6} {'q max':>6}")
+    for name, r in results.items():
+        qpr = "-" if r["queries_per_request"] is None else f"{r['queries_per_request']:.1f}"
+        qmax = "-" if r["max_queries"] is None else str(r["max_queries"])
+        print(f"{name:20} {r['requests']:>6} {r['errors']:>4} {r['throughput_rps']:>7.1f} {r['p50_ms']:>8.1f} "
+              f"{r['p95_ms']:>8.1f} {r['p99_ms']:>8.1f} {qpr:>6} {qmax:>6}")
+
+
+def regressions(results: dict, baseline: dict, latency_tolerance: float, query_tolerance: float):
+    found = []
+    for name, r in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        if base["p95_ms"] and r["p95_ms"] > base["p95_ms"] * (1 + latency_tolerance):
+            found.append(f"{name}: p95 {base['p95_ms']:.1f} -> {r['p95_ms']:.1f} ms")
+        if base.get("queries_per_request") is not None and r["queries_per_request"] is not None \
+                and r["queries_per_request"] > base["queries_per_request"] * (1 + query_tolerance) + 0.5:
+            found.append(f"{name}: queries/request {base['queries_per_request']:.1f} -> {r['queries_per_request']:.1f}")
+        if r["errors"] > base.get("errors", 0):
+            found.append(f"{name}: errors {base.get('errors', 0)} -> {r['errors']}")
+    return found
+
+
+# ------------------------------------------------------------------- server
+
+def start_server(args) -> subprocess.Popen:
+    env = dict(os.environ)
+    if args.url:
+        env["DATABASE_URL"] = args.url
+    env.setdefault("LOG_LEVEL", "WARNING")
+    env.setdefault("DB_INSTRUMENTATION", "true")
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(args.port), "--workers", str(args.workers),
+         "--log-level", "warning"],
+        cwd=APP_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+def wait_ready(base_url: str, timeout: float = 90.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if httpx.get(f"{base_url}/health", timeout=2).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.5)
+    raise RuntimeError(f"Server at {base_url} did not become ready")
+
+
+def login(base_url: str, email: str, password: str) -> dict:
+    resp = httpx.post(f"{base_url}/api/auth/login", json={"email": email, "password": password}, timeout=30)
+    resp.raise_for_status()
+    return {"Authorization": f"Bearer {resp.json()['access_token']}"}
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    base_url = args.base_url or f"http://127.0.0.1:{args.port}"
+    proc = None if args.base_url else start_server(args)
+    try:
+        wait_ready(base_url)
+        headers = login(base_url, args.email, args.password)
+        with httpx.Client(base_url=base_url, headers=headers, timeout=60) as client:
+            fixtures = load_fixtures(client, args.checkouts)
+
+        scenarios = build_scenarios(fixtures)
+        if args.scenarios:
+            wanted = {name.strip() for name in args.scenarios.split(",")}
+            scenarios = [s for s in scenarios if s.name in wanted]
+        # Warm up without the write scenario so its rooms are all measured
+        warmup = [s for s in scenarios if s.name != "checkout"]
+        if warmup and args.warmup > 0:
+            asyncio.run(run_load(base_url, headers, warmup, min(args.concurrency, 4), args.warmup, record=False))
+        asyncio.run(run_load(base_url, headers, scenarios, args.concurrency, args.duration, record=True))
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait(timeout=30)
+
+    results = summarize(scenarios, args.duration)
+    print(f"{args.concurrency} clients, {args.duration:.0f}s against {base_url}")
+    print_results(results)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"concurrency": args.concurrency, "duration": args.duration, "scenarios": results}, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["scenarios"]
+        found = regressions(results, baseline, args.latency_tolerance, args.query_tolerance)
+        if found:
+            print("\nRegressions vs baseline:")
+            for line in found:
+                print(f"  {line}")
+            sys.exit(1)
+        print("\nNo regressions vs baseline")
+
+
+if __name__ == "__main__":
+    main()
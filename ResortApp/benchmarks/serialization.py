@@ -0,0 +1,332 @@
+"""
+List serialization benchmark: building and encoding 5k-row list responses.
+
+Seeds a scratch SQLite database with --rows rows for each list endpoint
+(bookings with rooms and users, food orders with items, service requests,
+checkouts, inventory transactions) and times two ways of producing the
+response body, in process and without HTTP:
+
+  orm   ORM objects (relationships eager-loaded, so no N+1 queries), then what
+        FastAPI does with a returned value: response_model validation,
+        serialization to JSON-able data and json.dumps (serialize_response +
+        JSONResponse)
+  fast  the projected column queries and dict assembly the list endpoints
+        use, encoded by FastJSONResponse (orjson when installed)
+
+Each side is split into "build" (queries and Python objects) and "encode"
+(validation and JSON); the median of --repeat runs is reported, with the body
+size. The endpoints themselves cap page sizes, so this calls the same
+building blocks directly with limit=--rows.
+
+Usage (from ResortApp/):
+    python -m benchmarks.serialization
+    python -m benchmarks.serialization --rows 5000 --repeat 7 --json serialization.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if APP_DIR not in sys.path:
+    sys.path.insert(0, APP_DIR)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=5000, help="rows per list")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per list and path; the median is reported")
+    parser.add_argument("--only", help="comma-separated lists to run (bookings,food_orders,service_requests,"
+                                       "checkouts,inventory_transactions)")
+    parser.add_argument("--json", help="write results to this file")
+    return parser
+
+
+def seed(engine, rows: int):
+    """rows of each listed entity plus the rooms, users, dishes and items they reference"""
+    from sqlalchemy import insert
+    from app.database import Base
+    from app.models.booking import Booking, BookingRoom
+    from app.models.checkout import Checkout
+    from app.models.employee import Employee
+    from app.models.food_category import FoodCategory
+    from app.models.food_item import FoodItem
+    from app.models.foodorder import FoodOrder, FoodOrderItem
+    from app.models.inventory import InventoryCategory, InventoryItem, InventoryTransaction, Location, StockIssue
+    from app.models.room import Room
+    from app.models.service_request import ServiceRequest
+    from app.models.user import Role, User
+
+    Base.metadata.create_all(engine)
+    room_count, user_count, dish_count, item_count = 60, 20, 40, 150
+    start = date.today() - timedelta(days=rows // 4)
+    stamp = datetime.combine(start, datetime.min.time())
+
+    tables = [
+        (Role, [{"id": 1, "name": "Admin", "permissions": '["/bookings", "/rooms"]'}]),
+        (User, [{"id": i, "name": f"User {i}", "email": f"user{i}@orchid-bench.in", "hashed_password": "x",
+                 "phone": f"98{i:08}", "is_active": True, "role_id": 1} for i in range(1, user_count + 1)]),
+        (Employee, [{"id": 1, "name": "Chef", "role": "Kitchen", "salary": 0, "user_id": 1}]),
+        (Location, [{"id": i, "name": f"Room {100 + i}", "building": "Main Block", "room_area": f"Room {100 + i}",
+                     "location_type": "Guest Room"} for i in range(1, room_count + 1)]),
+        (Room, [{"id": i, "number": str(100 + i), "type": "Deluxe", "price": 4500.0, "status": "Available",
+                 "adults": 2, "children": 1, "inventory_location_id": i} for i in range(1, room_count + 1)]),
+        (FoodCategory, [{"id": 1, "name": "Mains"}]),
+        (FoodItem, [{"id": i, "name": f"Dish {i}", "price": 100 + i, "available": "true", "category_id": 1}
+                    for i in range(1, dish_count + 1)]),
+        (InventoryCategory, [{"id": 1, "name": "Amenities"}]),
+        (InventoryItem, [{"id": i, "name": f"Item {i}", "item_code": f"IT-{i:04}", "category_id": 1, "unit": "pcs"}
+                         for i in range(1, item_count + 1)]),
+        (Booking, [{"id": i, "status": "checked-out", "guest_name": f"Guest {i}", "guest_mobile": f"99{i:08}",
+                    "guest_email": f"guest{i}@orchid-bench.in", "check_in": start + timedelta(days=i // 4),
+                    "check_out": start + timedelta(days=i // 4 + 2), "adults": 2, "children": i % 2,
+                    "user_id": (i % user_count) + 1 if i % 3 else None} for i in range(1, rows + 1)]),
+        (BookingRoom, [{"booking_id": i, "room_id": (i * 7 + n) % room_count + 1}
+                       for i in range(1, rows + 1) for n in range(1 + i % 2)]),
+        (FoodOrder, [{"id": i, "room_id": (i * 7) % room_count + 1, "amount": 250.0 + i % 400, "assigned_employee_id": 1,
+                      "status": "completed", "billing_status": "billed", "order_type": "room_service",
+                      "delivery_request": f"Order {i}", "created_at": stamp + timedelta(hours=6 * i)}
+                     for i in range(1, rows + 1)]),
+        (FoodOrderItem, [{"order_id": i, "food_item_id": (i + n) % dish_count + 1, "quantity": 1 + n}
+                         for i in range(1, rows + 1) for n in range(1 + i % 3)]),
+        (ServiceRequest, [{"id": i, "food_order_id": i, "room_id": (i % room_count) + 1, "employee_id": 1,
+                           "request_type": "delivery", "description": f"Deliver order {i}", "status": "completed",
+                           "refill_data": '[{"item_id": 1, "quantity": 2}]' if i % 5 == 0 else None,
+                           "created_at": stamp + timedelta(hours=6 * i), "completed_at": stamp + timedelta(hours=6 * i, minutes=20)}
+                          for i in range(1, rows + 1)]),
+        (Checkout, [{"id": i, "booking_id": i, "room_total": 9000.0, "food_total": 1200.0, "service_total": 0.0,
+                     "package_total": 0.0, "tax_amount": 1224.0, "discount_amount": 0.0, "grand_total": 11424.0,
+                     "guest_name": f"Guest {i}", "room_number": str(100 + (i % room_count) + 1),
+                     "payment_method": "card", "payment_status": "Paid", "created_at": stamp + timedelta(hours=6 * i),
+                     "bill_details": {"lines": [{"label": "Room", "amount": 9000.0}] * 20}}
+                    for i in range(1, rows + 1)]),
+        (StockIssue, [{"id": i, "issue_number": f"ISS-{i:06}", "issued_by": 1, "destination_location_id": i % room_count + 1}
+                      for i in range(1, rows // 10 + 1)]),
+        (InventoryTransaction, [{"id": i, "item_id": (i % item_count) + 1, "transaction_type": "out", "quantity": 2.0,
+                                 "unit_price": 35.0, "total_amount": 70.0, "created_by": 1,
+                                 "reference_number": f"ISS-{i // 10 + 1:06}" if i < rows else None,
+                                 "notes": "Room amenities", "created_at": stamp + timedelta(minutes=i)}
+                                for i in range(1, rows + 1)]),
+    ]
+    with engine.begin() as conn:
+        for model, values in tables:
+            conn.execute(insert(model), values)
+
+
+# --------------------------------------------------------------- the paths
+
+def _fastapi_body(field, content) -> bytes:
+    """What FastAPI does with a returned value: validate against response_model, serialize, json.dumps"""
+    from fastapi.responses import JSONResponse
+    from fastapi.routing import serialize_response
+
+    data = asyncio.run(serialize_response(field=field, response_content=content))
+    return JSONResponse(data).body
+
+
+def orm_bookings(db, rows):
+    from sqlalchemy.orm import joinedload, selectinload
+    from app.models.booking import Booking, BookingRoom
+    from app.models.user import User
+    from app.schemas.booking import BookingOut
+    from app.schemas.user import UserOut
+
+    bookings = (
+        db.query(Booking)
+        .options(selectinload(Booking.booking_rooms).joinedload(BookingRoom.room),
+                 joinedload(Booking.user).joinedload(User.role))
+        .order_by(Booking.id.desc()).limit(rows).all()
+    )
+    results = [
+        BookingOut(
+            id=b.id, guest_name=b.guest_name, guest_mobile=b.guest_mobile, guest_email=b.guest_email,
+            status=b.status, check_in=b.check_in, check_out=b.check_out, adults=b.adults, children=b.children,
+            id_card_image_url=b.id_card_image_url, guest_photo_url=b.guest_photo_url,
+            user=UserOut.model_validate(b.user) if b.user else None, is_package=False,
+            rooms=[br.room for br in b.booking_rooms if br.room],
+        )
+        for b in bookings
+    ]
+    return {"total": len(results), "bookings": results}
+
+
+def orm_food_orders(db, rows):
+    from sqlalchemy.orm import joinedload, selectinload
+    from app.curd.foodorder import pick_guest_for_room, populate_order_fields
+    from app.models.booking import Booking, BookingRoom
+    from app.models.foodorder import FoodOrder, FoodOrderItem
+    from app.models.Package import PackageBooking, PackageBookingRoom
+
+    orders = (
+        db.query(FoodOrder)
+        .options(joinedload(FoodOrder.employee), joinedload(FoodOrder.room),
+                 selectinload(FoodOrder.items).joinedload(FoodOrderItem.food_item))
+        .order_by(FoodOrder.id.desc()).limit(rows).all()
+    )
+    room_ids = {o.room_id for o in orders if o.room_id}
+    stays = [(room_id, b, False) for room_id, b in
+             db.query(BookingRoom.room_id, Booking).join(Booking).filter(BookingRoom.room_id.in_(room_ids))]
+    stays += [(room_id, b, True) for room_id, b in
+              db.query(PackageBookingRoom.room_id, PackageBooking).join(PackageBooking)
+              .filter(PackageBookingRoom.room_id.in_(room_ids))]
+    for order in orders:
+        populate_order_fields(order, pick_guest_for_room(order.room_id, stays, order.created_at))
+    return orders
+
+
+def orm_service_requests(db, rows):
+    from sqlalchemy.orm import joinedload
+    from app.api.service_request import service_request_to_dict
+    from app.curd.service_request import enrich_service_request
+    from app.models.service_request import ServiceRequest
+
+    requests = (
+        db.query(ServiceRequest)
+        .options(joinedload(ServiceRequest.food_order), joinedload(ServiceRequest.room),
+                 joinedload(ServiceRequest.employee))
+        .limit(rows).all()
+    )
+    return [service_request_to_dict(enrich_service_request(sr)) for sr in requests]
+
+
+def orm_checkouts(db, rows):
+    from app.models.checkout import Checkout
+
+    return db.query(Checkout).order_by(Checkout.id.desc()).limit(rows).all()
+
+
+def orm_inventory_transactions(db, rows):
+    from sqlalchemy.orm import joinedload
+    from app.models.inventory import InventoryTransaction
+
+    transactions = (
+        db.query(InventoryTransaction)
+        .options(joinedload(InventoryTransaction.item), joinedload(InventoryTransaction.user))
+        .order_by(InventoryTransaction.created_at.desc()).limit(rows).all()
+    )
+    return [
+        {**t.__dict__, "item_name": t.item.name if t.item else None,
+         "created_by_name": t.user.name if t.user else None}
+        for t in transactions
+    ]
+
+
+def fast_food_orders(db, rows):
+    from app.curd.foodorder import (
+        food_order_items_statement, food_order_page_statement, food_order_rows_to_dicts, stay_statements,
+    )
+
+    orders = db.execute(food_order_page_statement(0, rows)).all()
+    items = db.execute(food_order_items_statement([o.id for o in orders])).all()
+    regular_stmt, package_stmt = stay_statements({o.room_id for o in orders if o.room_id})
+    return food_order_rows_to_dicts(orders, items, db.execute(regular_stmt).all(), db.execute(package_stmt).all())
+
+
+def fast_service_requests(db, rows):
+    from app.api.service_request import service_request_to_dict
+    from app.curd.service_request import get_service_requests
+
+    return [service_request_to_dict(sr) for sr in get_service_requests(db, 0, rows)]
+
+
+def list_paths():
+    """name -> (response_model or None, orm builder, fast builder)"""
+    from typing import List
+    from app.api.booking import PaginatedBookingResponse, booking_list_rows
+    from app.api.checkout import checkout_list_rows
+    from app.api.inventory import transaction_list_rows
+    from app.schemas.checkout import CheckoutFull
+    from app.schemas.foodorder import FoodOrderOut
+    from app.schemas.inventory import InventoryTransactionOut
+
+    return {
+        "bookings": (PaginatedBookingResponse, orm_bookings,
+                     lambda db, rows: (lambda r: {"total": len(r), "bookings": r})(booking_list_rows(db, 0, rows))),
+        "food_orders": (List[FoodOrderOut], orm_food_orders, fast_food_orders),
+        "service_requests": (None, orm_service_requests, fast_service_requests),
+        "checkouts": (List[CheckoutFull], orm_checkouts, lambda db, rows: checkout_list_rows(db, 0, rows)),
+        "inventory_transactions": (List[InventoryTransactionOut], orm_inventory_transactions,
+                                   lambda db, rows: transaction_list_rows(db, 0, rows)),
+    }
+
+
+def time_path(session_factory, build, encode, rows: int, repeat: int) -> dict:
+    builds, encodes, size = [], [], 0
+    for _ in range(repeat):
+        db = session_factory()
+        try:
+            started = time.perf_counter()
+            content = build(db, rows)
+            built = time.perf_counter()
+            body = encode(content)
+            done = time.perf_counter()
+        finally:
+            db.close()
+        builds.append(built - started)
+        encodes.append(done - built)
+        size = len(body)
+    build_ms = statistics.median(builds) * 1000
+    encode_ms = statistics.median(encodes) * 1000
+    return {"build_ms": round(build_ms, 1), "encode_ms": round(encode_ms, 1),
+            "total_ms": round(build_ms + encode_ms, 1), "body_kb": round(size / 1024, 1)}
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    scratch = tempfile.mkdtemp(prefix="serialization_")
+    # app.database reads DATABASE_URL at import
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(scratch, 'bench.db')}"
+
+    import app.models  # noqa: F401  (registers every table)
+    from fastapi.responses import JSONResponse
+    from fastapi.utils import create_model_field
+    from app.database import SessionLocal, engine
+    from app.utils.fast_json import FastJSONResponse, orjson
+
+    try:
+        seed(engine, args.rows)
+        paths = list_paths()
+        wanted = [name.strip() for name in args.only.split(",")] if args.only else list(paths)
+
+        results = {"rows": args.rows, "repeat": args.repeat, "orjson": orjson is not None, "lists": {}}
+        print(f"{args.rows} rows per list, median of {args.repeat} runs, "
+              f"{'orjson' if orjson is not None else 'json fallback (orjson not installed)'}")
+        print(f"  {'list':<24}{'path':<6}{'build ms':>10}{'encode ms':>11}{'total ms':>10}{'body KB':>10}")
+        for name in wanted:
+            model, orm_build, fast_build = paths[name]
+            if model is not None:
+                field = create_model_field(name="Response", type_=model, mode="serialization")
+                orm_encode = lambda content, field=field: _fastapi_body(field, content)
+            else:
+                orm_encode = lambda content: JSONResponse(content).body
+            entry = {
+                "orm": time_path(SessionLocal, orm_build, orm_encode, args.rows, args.repeat),
+                "fast": time_path(SessionLocal, fast_build, lambda content: FastJSONResponse(content).body,
+                                  args.rows, args.repeat),
+            }
+            if entry["fast"]["total_ms"]:
+                entry["speedup"] = round(entry["orm"]["total_ms"] / entry["fast"]["total_ms"], 2)
+            results["lists"][name] = entry
+            for path in ("orm", "fast"):
+                r = entry[path]
+                print(f"  {name if path == 'orm' else '':<24}{path:<6}{r['build_ms']:>10.1f}{r['encode_ms']:>11.1f}"
+                      f"{r['total_ms']:>10.1f}{r['body_kb']:>10.0f}")
+            if "speedup" in entry:
+                print(f"  {'':<24}fast path {entry['speedup']:.1f}x")
+    finally:
+        engine.dispose()
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
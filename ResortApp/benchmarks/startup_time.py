@@ -0,0 +1,91 @@
+"""
+Worker cold-start benchmark.
+
+Imports `main` in a fresh interpreter (what every gunicorn/uvicorn worker does
+without preload) with FAST_START off and on, and reports:
+  - wall-clock time to import main
+  - DB connections opened before the first request
+  - the slowest modules by cumulative import time (python -X importtime)
+
+Usage (from ResortApp/):
+    python benchmarks/startup_time.py
+    python benchmarks/startup_time.py --runs 5 --top 30
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = (
+    "import time; t=time.perf_counter(); import main; "
+    "elapsed=time.perf_counter()-t; "
+    "print('IMPORT_SECONDS', elapsed); "
+    "print('POOL_CONNECTIONS', main.engine.pool.checkedin() + main.engine.pool.checkedout()); "
+    "print('ROUTES', len(main.app.routes))"
+)
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s+)(\S+)")
+
+
+def run_probe(fast_start: bool, importtime: bool = False):
+    env = dict(os.environ)
+    env["FAST_START"] = "true" if fast_start else "false"
+    env.setdefault("LOG_LEVEL", "WARNING")
+    cmd = [sys.executable]
+    if importtime:
+        cmd += ["-X", "importtime"]
+    cmd += ["-c", PROBE]
+    proc = subprocess.run(cmd, cwd=APP_DIR, env=env, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr[-2000:])
+    values = {}
+    for line in proc.stdout.splitlines():
+        parts = line.split()
+        if len(parts) == 2 and parts[0] in ("IMPORT_SECONDS", "POOL_CONNECTIONS", "ROUTES"):
+            values[parts[0]] = float(parts[1])
+    return values, proc.stderr
+
+
+def parse_importtime(stderr: str, top: int):
+    """(cumulative_us, self_us, module) for the slowest modules, deepest-first duplicates removed"""
+    rows = []
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, _, module = match.groups()
+            rows.append((int(cumulative_us), int(self_us), module))
+    rows.sort(reverse=True)
+    return rows[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3, help="fresh interpreters per mode")
+    parser.add_argument("--top", type=int, default=20, help="modules to list per mode")
+    args = parser.parse_args()
+
+    for label, fast_start in (("default", False), ("fast-start", True)):
+        timings = []
+        values = {}
+        for _ in range(args.runs):
+            values, _ = run_probe(fast_start)
+            timings.append(values["IMPORT_SECONDS"])
+        _, stderr = run_probe(fast_start, importtime=True)
+
+        print(f"== {label} (FAST_START={'true' if fast_start else 'false'}) ==")
+        print(f"import main: median {statistics.median(timings) * 1000:.0f} ms "
+              f"(min {min(timings) * 1000:.0f}, max {max(timings) * 1000:.0f}) over {args.runs} runs")
+        print(f"DB connections opened at import: {int(values.get('POOL_CONNECTIONS', 0))}")
+        print(f"routes registered at boot: {int(values.get('ROUTES', 0))}")
+        print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+        for cumulative_us, self_us, module in parse_importtime(stderr, args.top):
+            print(f"{cumulative_us / 1000:14.1f} {self_us / 1000:9.1f}  {module}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
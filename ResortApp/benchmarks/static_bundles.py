@@ -0,0 +1,174 @@
+"""
+Static bundle benchmark: JS/CSS throughput per server worker.
+
+Copies a React build (default ../dasboard/build) to a scratch directory and
+serves it from /admin-static twice:
+  on_the_fly     the build as produced by `npm run build`; bundles are
+                 gzip-compressed by the middleware on every request
+  precompressed  after `python -m app.utils.static_assets` wrote .br/.gz
+                 siblings; bundles are sent from disk as they are
+In each run --concurrency clients fetch every JS/CSS bundle in turn for
+--duration seconds with --accept-encoding, reading the raw (still encoded)
+bytes so client-side decompression does not count.
+
+Reports requests/s and wire MB/s per worker, latency percentiles, the bytes
+one page load transfers, and the Content-Encoding / Cache-Control seen.
+
+Usage (from ResortApp/):
+    python -m benchmarks.static_bundles
+    python -m benchmarks.static_bundles --workers 2 --accept-encoding gzip --duration 15
+    python -m benchmarks.static_bundles --build ../userend/build --json static.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import httpx
+
+from app.utils.static_assets import precompress_directory
+from benchmarks.scenarios import APP_DIR, percentile, start_server, wait_ready
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--build", default=os.path.join(APP_DIR, "..", "dasboard", "build"),
+                        help="React build directory (with static/ inside)")
+    parser.add_argument("--url", help="database URL for the started server (default: scratch SQLite)")
+    parser.add_argument("--port", type=int, default=8768)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers; results are divided by this")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per mode")
+    parser.add_argument("--accept-encoding", default="br, gzip")
+    parser.add_argument("--json", help="write results to this file")
+    return parser
+
+
+def bundle_paths(static_dir: str) -> list:
+    paths = []
+    for root, _, files in os.walk(static_dir):
+        for name in files:
+            if name.endswith((".js", ".css")):
+                paths.append(os.path.relpath(os.path.join(root, name), static_dir).replace(os.sep, "/"))
+    return sorted(paths)
+
+
+async def fetch_bundles(base_url: str, bundles: list, accept_encoding: str, concurrency: int, duration: float) -> dict:
+    latencies, statuses, encodings, cache_controls = [], {}, {}, {}
+    wire_bytes = 0
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    headers = {"Accept-Encoding": accept_encoding}
+
+    async with httpx.AsyncClient(base_url=base_url, headers=headers, limits=limits, timeout=60) as client:
+        deadline = time.perf_counter() + duration
+
+        async def worker(offset):
+            nonlocal wire_bytes
+            i = offset
+            while time.perf_counter() < deadline:
+                path = f"/admin-static/{bundles[i % len(bundles)]}"
+                i += 1
+                start = time.perf_counter()
+                async with client.stream("GET", path) as resp:
+                    async for chunk in resp.aiter_raw():
+                        wire_bytes += len(chunk)
+                latencies.append(time.perf_counter() - start)
+                statuses[resp.status_code] = statuses.get(resp.status_code, 0) + 1
+                encoding = resp.headers.get("content-encoding", "identity")
+                encodings[encoding] = encodings.get(encoding, 0) + 1
+                cache = resp.headers.get("cache-control", "")
+                cache_controls[cache] = cache_controls.get(cache, 0) + 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(n) for n in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+        # One page load: every bundle once
+        page_bytes = 0
+        for bundle in bundles:
+            async with client.stream("GET", f"/admin-static/{bundle}") as resp:
+                async for chunk in resp.aiter_raw():
+                    page_bytes += len(chunk)
+
+    return {
+        "latencies": latencies,
+        "elapsed": elapsed,
+        "wire_bytes": wire_bytes,
+        "page_bytes": page_bytes,
+        "statuses": statuses,
+        "encodings": encodings,
+        "cache_controls": cache_controls,
+    }
+
+
+def run_mode(args, build_dir: str, bundles: list, db_url: str) -> dict:
+    base_url = f"http://127.0.0.1:{args.port}"
+    os.environ["DASHBOARD_PATH"] = build_dir
+    server_args = argparse.Namespace(url=db_url, port=args.port, workers=args.workers)
+    proc = start_server(server_args)
+    try:
+        wait_ready(base_url)
+        run = asyncio.run(fetch_bundles(base_url, bundles, args.accept_encoding, args.concurrency, args.duration))
+    finally:
+        proc.terminate()
+        proc.wait(timeout=30)
+
+    latencies = sorted(run["latencies"])
+    requests = len(latencies)
+    return {
+        "requests": requests,
+        "statuses": {str(k): v for k, v in run["statuses"].items()},
+        "encodings": run["encodings"],
+        "cache_control": run["cache_controls"],
+        "requests_per_s_per_worker": round(requests / run["elapsed"] / args.workers, 1),
+        "wire_mb_per_s_per_worker": round(run["wire_bytes"] / run["elapsed"] / args.workers / 1e6, 2),
+        "page_kb": round(run["page_bytes"] / 1024, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+    }
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    scratch = tempfile.mkdtemp(prefix="static_bundles_")
+    try:
+        build_dir = os.path.join(scratch, "build")
+        shutil.copytree(args.build, build_dir)
+        bundles = bundle_paths(os.path.join(build_dir, "static"))
+        if not bundles:
+            raise RuntimeError(f"No .js/.css bundles under {args.build}/static")
+        db_url = args.url or f"sqlite:///{os.path.join(scratch, 'bench.db')}"
+        raw_kb = sum(os.path.getsize(os.path.join(build_dir, "static", b)) for b in bundles) / 1024
+
+        results = {"bundles": len(bundles), "raw_kb": round(raw_kb, 1), "accept_encoding": args.accept_encoding,
+                   "workers": args.workers, "concurrency": args.concurrency}
+        results["on_the_fly"] = run_mode(args, build_dir, bundles, db_url)
+        precompress_directory(os.path.join(build_dir, "static"))
+        results["precompressed"] = run_mode(args, build_dir, bundles, db_url)
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    print(f"{results['bundles']} bundles ({results['raw_kb']:.0f} KB raw), Accept-Encoding: {args.accept_encoding}, "
+          f"{args.workers} worker(s), {args.concurrency} clients")
+    for mode in ("on_the_fly", "precompressed"):
+        r = results[mode]
+        print(f"  {mode:<14} {r['requests_per_s_per_worker']:>8.1f} req/s/worker  "
+              f"{r['wire_mb_per_s_per_worker']:>7.2f} MB/s/worker  "
+              f"p50 {r['p50_ms']:.1f} ms  p95 {r['p95_ms']:.1f} ms  page {r['page_kb']:.0f} KB")
+        print(f"  {'':<14} encodings {r['encodings']}  statuses {r['statuses']}")
+    before = results["on_the_fly"]["requests_per_s_per_worker"]
+    after = results["precompressed"]["requests_per_s_per_worker"]
+    if before:
+        results["speedup"] = round(after / before, 2)
+        print(f"  precompressed serves {results['speedup']:.1f}x the bundles per worker")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -272,6 +272,12 @@ else
     print_warning "No package.json found in userend directory"
 fi
 
+# Precompress bundles so they are served as .br/.gz without per-request compression
+print_status "Precompressing frontend bundles..."
+cd "$APP_DIR/Resort_first/ResortApp"
+python -m app.utils.static_assets ../dasboard/build/static ../userend/userend/build/static ../userend/build/static \
+    || print_warning "Could not precompress frontend bundles; they will be compressed per request"
+
 print_section "CONFIGURING APPLICATION"
 
 # Create production environment file
@@ -500,6 +506,7 @@ server {
         alias $APP_DIR/Resort_first/dasboard/build/static/;
         expires 1y;
         add_header Cache-Control "public, immutable";
+        gzip_static on;
     }
 
     # User/Resort interface - /resort routes
@@ -513,6 +520,7 @@ server {
         alias $APP_DIR/Resort_first/userend/userend/build/static/;
         expires 1y;
         add_header Cache-Control "public, immutable";
+        gzip_static on;
     }
 
     # API routes - All API calls
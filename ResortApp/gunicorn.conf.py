@@ -2,8 +2,13 @@
 # Production deployment on Vultr
 
 import os
+import shutil
 import multiprocessing
 
+# Prometheus multiprocess mode: every worker writes samples here and /metrics
+# aggregates them. Must be set before the app (and prometheus_client) is imported.
+prometheus_multiproc_dir = os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/dev/shm/orchid_metrics")
+
 # Server socket
 bind = "0.0.0.0:8011"
 backlog = 2048
@@ -55,6 +60,13 @@ worker_tmp_dir = "/dev/shm"
 max_requests_jitter = 50
 
 
+def on_starting(server):
+    """Called just before the master process is initialized."""
+    # Start from a clean metrics directory so samples from previous runs don't leak in
+    shutil.rmtree(prometheus_multiproc_dir, ignore_errors=True)
+    os.makedirs(prometheus_multiproc_dir, exist_ok=True)
+
+
 def when_ready(server):
     """Called just after the server is started."""
     server.log.info("Orchid Resort Management System is ready to serve requests")
@@ -73,6 +85,16 @@ def pre_fork(server, worker):
 def post_fork(server, worker):
     """Called just after a worker has been forked."""
     server.log.info("Worker spawned (pid: %s)", worker.pid)
+    # With preload_app the engine was created in the master; drop any pooled
+    # connections inherited from it so workers never share a socket.
+    from app.database import engine
+    engine.dispose(close=False)
+
+
+def child_exit(server, worker):
+    """Called just after a worker has exited, in the master process."""
+    from app.utils.metrics import mark_worker_dead
+    mark_worker_dead(worker.pid)
 
 
 def pre_exec(server):
@@ -1,22 +1,33 @@
 from fastapi import FastAPI, Request, HTTPException
 # Force Reload Fix 11 (Variable Name Fix)
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse, FileResponse, JSONResponse
+from fastapi.responses import HTMLResponse, FileResponse, JSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 from starlette.middleware.base import BaseHTTPMiddleware
 from pathlib import Path
 import os
+import importlib
 import traceback
 from time import time
-from dotenv import load_dotenv
+from app.utils.env import load_env
 
 # Load environment variables
-load_dotenv()
+load_env()
 
-# Import all API routers
+# Queue-based structured logging for app.* loggers (LOG_LEVEL / LOG_FORMAT / LOG_FILE)
+import logging
+from app.utils.logging_config import setup_logging, new_request_id
+setup_logging()
+logger = logging.getLogger("main")
+
+# Fast-start mode (FAST_START=true): no create_all at boot (schema is managed by
+# Alembic), heavy routers are imported on the first request under their prefix,
+# and nothing touches the database before the first request.
+FAST_START = os.getenv("FAST_START", "false").strip().lower() in ("1", "true", "yes", "on")
+
+# Import all API routers (the heavy ones are loaded through include_api_router below)
 from app.api import (
     packages,
     room,
@@ -24,7 +35,6 @@ from app.api import (
     auth,
     frontend,
     booking,
-    checkout,
     dashboard,
     employee,
     expenses,
@@ -38,62 +48,55 @@ from app.api import (
     service,
     attendance,
     service_request,
-    account,
-    gst_reports,
     notification,
+    jobs,
+    events,
+    sync,
 )
-from app.api import reports_module
 
 # Import recipe router separately to catch any import errors
 recipe_module = None
 try:
     from app.api import recipe as recipe_module
-    print("[OK] Recipe router imported successfully")
-    print(f"   Router prefix: {recipe_module.router.prefix}")
-    print(f"   Number of routes: {len(recipe_module.router.routes)}")
 except Exception as e:
-    print(f"[ERROR] ERROR importing recipe router: {e}")
-    import traceback
-    traceback.print_exc()
+    logger.error("Error importing recipe router: %s", e, exc_info=True)
     recipe_module = None
 
-# Import inventory router separately to catch any import errors
-try:
-    from app.api import inventory
-    print("[OK] Inventory router imported successfully")
-except Exception as e:
-    print(f"[ERROR] ERROR importing inventory router: {e}")
-    import traceback
-    traceback.print_exc()
-    inventory = None
-
-# Import comprehensive reports router separately to catch any import errors
-try:
-    from app.api import comprehensive_reports
-    print("[OK] Comprehensive Reports router imported successfully")
-except Exception as e:
-    print(f"[ERROR] ERROR importing comprehensive_reports router: {e}")
-    import traceback
-    traceback.print_exc()
-    comprehensive_reports = None
-
 # Import public router separately to catch any import errors
 public_module = None
 try:
     from app.api import public as public_module
-    print("[OK] Public router imported successfully")
-    print(f"   Router prefix: {public_module.router.prefix}")
-    print(f"   Number of routes: {len(public_module.router.routes)}")
 except Exception as e:
-    print(f"[ERROR] ERROR importing public router: {e}")
-    import traceback
-    traceback.print_exc()
+    logger.error("Error importing public router: %s", e, exc_info=True)
     public_module = None
 
-from app.database import engine, Base
-
-# Create database tables
-Base.metadata.create_all(bind=engine)
+from app.database import engine, Base, async_db_available
+from app.utils.db_metrics import DB_INSTRUMENTATION_ENABLED, start_request_stats, report_request_stats
+from app.utils import metrics
+from app.utils.lazy_routers import LazyRouterRegistry, LazyRouterMiddleware
+from app.utils.static_assets import PrecompressedStaticFiles, SelectiveGZipMiddleware
+from app.utils.admission import AdmissionMiddleware
+metrics.instrument_engine_pool(engine)
+
+# Commits that touch report source tables drop the affected cached report periods
+from app.utils.report_cache import install_invalidation_listeners
+install_invalidation_listeners()
+# Booking/room changes bump the occupancy version so every worker rebuilds its room->stay map
+from app.utils.occupancy import install_occupancy_listeners
+install_occupancy_listeners()
+# Committed changes to bookings, orders, requests, checkouts and stock publish domain events (SSE)
+from app.utils.events import install_event_listeners
+install_event_listeners()
+# Mutations of bookings, rooms, food orders and service requests are written to the change log (delta sync)
+from app.utils.change_log import install_change_log_listeners
+install_change_log_listeners()
+# A user's commits keep their next report reads on the primary while the replica catches up
+from app.utils.read_replica import install_read_routing_listeners
+install_read_routing_listeners()
+
+# Create database tables (skipped in fast-start mode; run `alembic upgrade head` on deploy instead)
+if not FAST_START:
+    Base.metadata.create_all(bind=engine)
 
 app = FastAPI(
     title="Resort Management System",
@@ -102,19 +105,42 @@ app = FastAPI(
     redirect_slashes=False,  # Prevent automatic trailing slash redirects
 )
 
+lazy_routers = LazyRouterRegistry(app, api_prefix="/api")
+
+
+def include_api_router(module_name: str, path_prefix: str, tags: list):
+    """Include app.api.<module_name>, deferred to the first matching request in fast-start mode"""
+    if FAST_START:
+        lazy_routers.add(path_prefix, f"app.api.{module_name}", tags)
+        return
+    try:
+        module = importlib.import_module(f"app.api.{module_name}")
+        app.include_router(module.router, prefix="/api", tags=tags)
+    except Exception as e:
+        logger.error("Error importing/registering %s router: %s", module_name, e, exc_info=True)
+
+
+# Set by the first request; in fast-start mode background tasks wait for it
+first_request_seen = None
+
+
 @app.on_event("startup")
 async def startup_event():
     """Start background tasks"""
     from app.utils.food_scheduler import run_food_scheduler
+    from app.utils.change_log import run_change_log_pruner
     import asyncio
-    asyncio.create_task(run_food_scheduler())
+    global first_request_seen
+    first_request_seen = asyncio.Event()
+    asyncio.create_task(run_food_scheduler(start_after=first_request_seen if FAST_START else None))
+    asyncio.create_task(run_change_log_pruner(start_after=first_request_seen if FAST_START else None))
 
 # Exception handlers for proper error logging and responses
 @app.exception_handler(StarletteHTTPException)
 async def http_exception_handler(request: Request, exc: StarletteHTTPException):
     """Handle HTTP exceptions with proper logging and CORS headers"""
     import sys
-    print(f"HTTP Exception {exc.status_code} in {request.method} {request.url.path}: {exc.detail}")
+    logger.info("HTTP Exception %s in %s %s: %s", exc.status_code, request.method, request.url.path, exc.detail)
     headers = dict(exc.headers) if hasattr(exc, 'headers') and exc.headers else {}
     # Add CORS headers to error responses
     headers.update({
@@ -132,7 +158,7 @@ async def http_exception_handler(request: Request, exc: StarletteHTTPException):
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     """Handle validation errors with proper logging and CORS headers"""
     import sys
-    print(f"Validation error in {request.method} {request.url.path}: {exc.errors()}")
+    logger.info("Validation error in %s %s: %s", request.method, request.url.path, exc.errors())
     return JSONResponse(
         status_code=422,
         content={"detail": exc.errors()},
@@ -156,7 +182,7 @@ async def global_exception_handler(request: Request, exc: Exception):
     #     sys.stderr.write(f"ERROR (global handler): {error_detail}\n")
     # except Exception:
     #     pass
-    traceback.print_exc()
+    logger.error("Unhandled exception in %s %s", request.method, request.url.path, exc_info=exc)
     
     # Return 500 with error message and CORS headers
     return JSONResponse(
@@ -169,8 +195,12 @@ async def global_exception_handler(request: Request, exc: Exception):
         }
     )
 
-# Compression middleware (reduces response size by 70-90%)
-app.add_middleware(GZipMiddleware, minimum_size=500)  # Compress responses > 500 bytes
+# Innermost: releases report admission slots once a response has been fully sent
+app.add_middleware(AdmissionMiddleware)
+
+# Compression middleware (reduces response size by 70-90%); precompressed assets,
+# already-compressed media and streaming responses are passed through as-is
+app.add_middleware(SelectiveGZipMiddleware, minimum_size=500)  # Compress responses > 500 bytes
 
 # CORS middleware
 app.add_middleware(
@@ -185,14 +215,30 @@ app.add_middleware(
 class PerformanceMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request: Request, call_next):
         start_time = time()
-        response = await call_next(request)
+        if first_request_seen is not None and not first_request_seen.is_set():
+            first_request_seen.set()
+        request_id = new_request_id(request.headers.get("X-Request-ID"))
+        db_stats = start_request_stats() if DB_INSTRUMENTATION_ENABLED else None
+        metrics.request_started()
+        try:
+            response = await call_next(request)
+        except Exception:
+            metrics.request_finished(request, 500, time() - start_time)
+            raise
         process_time = time() - start_time
+        metrics.request_finished(request, response.status_code, process_time)
         
         # Add performance headers
         response.headers["X-Process-Time"] = str(round(process_time, 3))
+        response.headers["X-Request-ID"] = request_id
+        if db_stats is not None:
+            route = request.scope.get("route")
+            route_path = getattr(route, "path", request.url.path)
+            report_request_stats(db_stats, request.method, route_path, response)
         
         # Add caching headers for GET requests (5 minutes for dynamic, 1 hour for static)
-        if request.method == "GET":
+        # unless the endpoint chose its own (event streams must not be cached)
+        if request.method == "GET" and "cache-control" not in response.headers:
             # Cache static/semi-static endpoints longer
             if any(path in str(request.url.path) for path in ["/rooms", "/packages", "/services", "/food-items", "/inventory/items"]):
                 response.headers["Cache-Control"] = "public, max-age=300"  # 5 minutes
@@ -201,12 +247,17 @@ class PerformanceMiddleware(BaseHTTPMiddleware):
         
         # Log slow requests (> 1 second)
         if process_time > 1.0:
-            print(f"[PERF] Slow request: {request.method} {request.url.path} took {process_time:.2f}s")
+            db_info = f" ({db_stats.queries} queries, {db_stats.total_time:.2f}s in DB)" if db_stats is not None else ""
+            logger.warning("[PERF] Slow request: %s %s took %.2fs%s", request.method, request.url.path, process_time, db_info)
         
         return response
 
 app.add_middleware(PerformanceMiddleware)
 
+# Outermost, so deferred routers are in place before any routing happens
+if FAST_START:
+    app.add_middleware(LazyRouterMiddleware, registry=lazy_routers)
+
 # Static file directories
 app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
 app.mount("/static", StaticFiles(directory="static"), name="static")
@@ -216,32 +267,40 @@ landing_page_path = Path("../landingpage")
 if landing_page_path.exists():
     app.mount("/landing", StaticFiles(directory="../landingpage"), name="landing")
 
-# Mount dashboard build files (React build)
-dashboard_build_path = Path("../dasboard/build")
+# Mount dashboard build files (React build); bundles are served from their
+# precompressed .br/.gz siblings (python -m app.utils.static_assets <dir>)
+dashboard_build_path = Path(os.getenv("DASHBOARD_PATH", "../dasboard/build"))
 if dashboard_build_path.exists():
     app.mount(
         "/admin-static",
-        StaticFiles(directory="../dasboard/build/static"),
+        PrecompressedStaticFiles(directory=str(dashboard_build_path / "static")),
         name="admin-static",
     )
 
 # Mount user end build files
-userend_build_path = Path("../userend/build")
+userend_build_path = Path(os.getenv("USEREND_PATH", "../userend/build"))
 if userend_build_path.exists():
     app.mount(
         "/user-static",
-        StaticFiles(directory="../userend/build/static"),
+        PrecompressedStaticFiles(directory=str(userend_build_path / "static")),
         name="user-static",
     )
 
 # API Routes
+# Async read endpoints shadow their sync counterparts, so they must be registered first
+if async_db_available():
+    from app.api import async_reads
+    app.include_router(async_reads.router, prefix="/api", tags=["Async Reads"])
+else:
+    logger.info("Async DB path disabled; serving hot read endpoints from sync handlers")
+
 app.include_router(auth.router, prefix="/api", tags=["Authentication"])
 app.include_router(user.router, prefix="/api", tags=["Users"])
 app.include_router(room.router, prefix="/api", tags=["Rooms"])
 app.include_router(packages.router, prefix="/api", tags=["Packages"])
 app.include_router(frontend.router, prefix="/api", tags=["Frontend"])
 app.include_router(booking.router, prefix="/api", tags=["Booking"])
-app.include_router(checkout.router, prefix="/api", tags=["Checkout"])
+include_api_router("checkout", "/bill", ["Checkout"])
 app.include_router(dashboard.router, prefix="/api", tags=["Dashboard"])
 app.include_router(employee.router, prefix="/api", tags=["Employee"])
 app.include_router(expenses.router, prefix="/api", tags=["Expenses"])
@@ -252,19 +311,10 @@ app.include_router(food_orders.router, prefix="/api", tags=["Food Orders"])
 if recipe_module is not None:
     try:
         app.include_router(recipe_module.router, prefix="/api", tags=["Recipes"])
-        print(f"[OK] Recipe router registered with {len(recipe_module.router.routes)} routes")
-        # Print all recipe routes for debugging
-        for route in recipe_module.router.routes:
-            if hasattr(route, 'path') and hasattr(route, 'methods'):
-                methods = ', '.join(route.methods)
-                print(f"   Registered: {methods} /api{route.path}")
     except Exception as e:
-        print(f"[ERROR] ERROR registering recipe router: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.error("Error registering recipe router: %s", e, exc_info=True)
 else:
-    print("[ERROR] Recipe router not imported, skipping registration")
-    print("   This means there was an import error. Check the error message above.")
+    logger.error("Recipe router not imported, skipping registration")
 
 app.include_router(payment.router, prefix="/api", tags=["Payment"])
 app.include_router(report.router, prefix="/api", tags=["Report"])
@@ -272,58 +322,35 @@ app.include_router(reports.router, prefix="/api", tags=["Reports"])
 app.include_router(role.router, prefix="/api", tags=["Role"])
 app.include_router(service.router, prefix="/api", tags=["Service"])
 app.include_router(service_request.router, prefix="/api", tags=["Service Requests"])
-app.include_router(account.router, prefix="/api", tags=["Accounts"])
-app.include_router(gst_reports.router, prefix="/api", tags=["GST Reports"])
-app.include_router(reports_module.router, prefix="/api", tags=["Reports Module"])
+include_api_router("account", "/accounts", ["Accounts"])
+include_api_router("gst_reports", "/gst-reports", ["GST Reports"])
+include_api_router("reports_module", "/reports", ["Reports Module"])
 app.include_router(attendance.router, prefix="/api", tags=["Attendance"])
+app.include_router(jobs.router, prefix="/api", tags=["Jobs"])
+app.include_router(events.router, prefix="/api", tags=["Events"])
+app.include_router(sync.router, prefix="/api", tags=["Sync"])
 # Notification system removed for performance
 # app.include_router(notification.router, prefix="/api", tags=["Notifications"])
 
-# Include comprehensive reports router if it was imported successfully
-if comprehensive_reports is not None:
-    try:
-        app.include_router(comprehensive_reports.router, prefix="/api", tags=["Comprehensive Reports"])
-        print(f"[OK] Comprehensive Reports router registered with {len(comprehensive_reports.router.routes)} routes")
-    except Exception as e:
-        print(f"[ERROR] ERROR registering comprehensive_reports router: {e}")
-        import traceback
-        traceback.print_exc()
-else:
-    print("[ERROR] Comprehensive Reports router not imported, skipping registration")
-
-# Include inventory router if it was imported successfully
-if inventory is not None:
-    try:
-        app.include_router(inventory.router, prefix="/api", tags=["Inventory"])
-        print(f"[OK] Inventory router registered with {len(inventory.router.routes)} routes")
-    except Exception as e:
-        print(f"[ERROR] ERROR registering inventory router: {e}")
-        import traceback
-        traceback.print_exc()
-else:
-    print("[ERROR] Inventory router not imported, skipping registration")
+# Comprehensive reports and inventory (errors importing these are logged, not fatal)
+include_api_router("comprehensive_reports", "/reports/comprehensive", ["Comprehensive Reports"])
+include_api_router("inventory", "/inventory", ["Inventory"])
 
 # Include stock reconciliation router
 try:
     from app.api import stock_reconciliation
     app.include_router(stock_reconciliation.router, prefix="/api", tags=["Stock Reconciliation"])
-    print(f"[OK] Stock reconciliation router registered with {len(stock_reconciliation.router.routes)} routes")
 except Exception as e:
-    print(f"[ERROR] ERROR importing/registering stock reconciliation router: {e}")
-    import traceback
-    traceback.print_exc()
+    logger.error("Error importing/registering stock reconciliation router: %s", e, exc_info=True)
 
 # Include public router if it was imported successfully
 if public_module is not None:
     try:
         app.include_router(public_module.router, prefix="/api", tags=["Public"])
-        print(f"[OK] Public router registered with {len(public_module.router.routes)} routes")
     except Exception as e:
-        print(f"[ERROR] ERROR registering public router: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.error("Error registering public router: %s", e, exc_info=True)
 else:
-    print("[ERROR] Public router not imported, skipping registration")
+    logger.error("Public router not imported, skipping registration")
 
 
 # Root route - Landing Page
@@ -343,7 +370,7 @@ async def landing_page():
 @app.get("/admin/{path:path}", response_class=HTMLResponse)
 async def admin_dashboard(request: Request, path: str = ""):
     """Serve the React admin dashboard at www.teqmates.com/admin"""
-    dashboard_file = Path("../dasboard/build/index.html")
+    dashboard_file = dashboard_build_path / "index.html"
     if dashboard_file.exists():
         return FileResponse(dashboard_file)
     return HTMLResponse("<h1>Admin Dashboard</h1><p>Dashboard not found</p>")
@@ -354,7 +381,7 @@ async def admin_dashboard(request: Request, path: str = ""):
 @app.get("/resort/{path:path}", response_class=HTMLResponse)
 async def user_page(request: Request, path: str = ""):
     """Serve the user interface at www.teqmates.com/resort"""
-    userend_dir = Path("../userend/build").resolve()
+    userend_dir = userend_build_path.resolve()
     index_file = userend_dir / "index.html"
 
     if path:
@@ -407,6 +434,16 @@ async def health_check():
     return {"status": "healthy", "message": "Resort Management System is running"}
 
 
+# Prometheus metrics (aggregated across gunicorn workers via PROMETHEUS_MULTIPROC_DIR)
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """Prometheus scrape endpoint"""
+    payload = metrics.render_metrics()
+    if payload is None:
+        return JSONResponse(status_code=503, content={"detail": "Metrics are disabled (prometheus_client not installed)"})
+    return Response(content=payload, media_type=metrics.CONTENT_TYPE_LATEST)
+
+
 # API documentation redirect
 @app.get("/api-docs")
 async def api_docs():
@@ -0,0 +1,53 @@
+import os
+import shutil
+import sys
+import tempfile
+
+import pytest
+
+# The app is imported as top-level packages (app.*, main) from ResortApp/
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# app.database reads these at import: a scratch SQLite file, also configured as
+# the read replica so the replica routing listeners are installed too, and read
+# through aiosqlite by the async endpoints (app/api/async_reads.py)
+_SCRATCH_DIR = tempfile.mkdtemp(prefix="resort-tests-")
+_SCRATCH_URL = "sqlite:///" + os.path.join(_SCRATCH_DIR, "test.db")
+os.environ["DATABASE_URL"] = _SCRATCH_URL
+os.environ["DATABASE_READ_URL"] = _SCRATCH_URL
+os.environ["READ_REPLICA_STATE_DIR"] = os.path.join(_SCRATCH_DIR, "recent_writes")
+os.environ["ASYNC_DB_ENABLED"] = "true"
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+
+def pytest_sessionfinish(session, exitstatus):
+    shutil.rmtree(_SCRATCH_DIR, ignore_errors=True)
+
+
+@pytest.fixture(scope="session")
+def seeded_db():
+    """Scratch database filled by the benchmark data generator (admin@bench.local / bench-admin)"""
+    from benchmarks import datagen
+
+    args = datagen.build_parser().parse_args(["--rooms", "6", "--years", "0.25", "--inventory-items", "20"])
+    return datagen.generate(args)
+
+
+@pytest.fixture(scope="session")
+def client(seeded_db):
+    """TestClient for main.app, imported the way a worker boots it (every Session listener installed)"""
+    from fastapi.testclient import TestClient
+
+    import main
+
+    return TestClient(main.app)
+
+
+@pytest.fixture(scope="session")
+def auth_headers(client):
+    from benchmarks.datagen import BENCH_ADMIN_EMAIL, BENCH_ADMIN_PASSWORD
+
+    response = client.post("/api/auth/login", json={"email": BENCH_ADMIN_EMAIL, "password": BENCH_ADMIN_PASSWORD})
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
@@ -0,0 +1,105 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import checkout, dashboard, food_orders, public, service_request
+
+# Hot read endpoints main.app serves from app/api/async_reads.py
+ASYNC_READ_PATHS = (
+    "/api/dashboard/kpis",
+    "/api/bill/active-rooms",
+    "/api/service-requests",
+    "/api/food-orders",
+    "/api/public/rooms",
+    "/api/public/packages",
+    "/api/public/food-items",
+    "/api/public/food-categories",
+    "/api/public/services",
+    "/api/public/bookings",
+    "/api/public/package-bookings",
+)
+
+
+@pytest.fixture(scope="module")
+def sync_client(client):
+    """The sync routers the async ones shadow, mounted on their own app"""
+    app = FastAPI()
+    for module in (checkout, dashboard, food_orders, public, service_request):
+        app.include_router(module.router, prefix="/api")
+    return TestClient(app)
+
+
+@pytest.fixture(scope="module")
+def requests_seeded(seeded_db):
+    """A service request and a checkout request, which the data generator does not create"""
+    from app.database import SessionLocal
+    from app.models.checkout import CheckoutRequest
+    from app.models.inventory import InventoryItem
+    from app.models.room import Room
+    from app.models.service_request import ServiceRequest
+
+    db = SessionLocal()
+    try:
+        room = db.query(Room).order_by(Room.id).first()
+        item = db.query(InventoryItem).order_by(InventoryItem.id).first()
+        db.add(ServiceRequest(room_id=room.id, request_type="cleaning", description="Async read test"))
+        db.add(CheckoutRequest(
+            room_number=room.number, guest_name="Async Read Test", status="pending",
+            inventory_data=[{"item_id": item.id, "used_qty": 1, "is_fixed_asset": False}],
+        ))
+        db.commit()
+    finally:
+        db.close()
+
+
+def test_async_router_shadows_the_sync_routes(client):
+    from main import app
+
+    for path in ASYNC_READ_PATHS:
+        route = next(r for r in app.routes if getattr(r, "path", None) == path)
+        assert route.endpoint.__module__ == "app.api.async_reads", path
+
+
+@pytest.mark.parametrize("path", ASYNC_READ_PATHS)
+def test_async_reads_match_the_sync_handlers(client, sync_client, auth_headers, requests_seeded, path):
+    # Async first: active-rooms may repair room statuses, and both must see the repaired state
+    async_response = client.get(path, headers=auth_headers)
+    sync_response = sync_client.get(path, headers=auth_headers)
+    assert async_response.status_code == 200, async_response.text
+    assert sync_response.status_code == 200, sync_response.text
+    assert async_response.json() == sync_response.json()
+
+
+def test_async_reads_return_seeded_rows(client, auth_headers, requests_seeded):
+    for path in ("/api/dashboard/kpis", "/api/bill/active-rooms", "/api/food-orders", "/api/public/bookings"):
+        assert client.get(path, headers=auth_headers).json(), path
+
+    rows = client.get("/api/service-requests", headers=auth_headers).json()
+    checkout_row = next(r for r in rows if r["is_checkout_request"])
+    assert checkout_row["inventory_data_with_charges"][0]["item_name"]
+    assert any(not r["is_checkout_request"] for r in rows)
+
+
+def test_async_food_orders_release_due_scheduled_orders(client, auth_headers, seeded_db):
+    from app.database import SessionLocal
+    from app.models.foodorder import FoodOrder
+    from app.models.room import Room
+
+    scheduled_for = (datetime.now() + timedelta(minutes=10)).strftime("%Y-%m-%d %H:%M:%S")
+    db = SessionLocal()
+    try:
+        order = FoodOrder(
+            room_id=db.query(Room.id).order_by(Room.id).first()[0], amount=100, status="scheduled",
+            delivery_request=f"SCHEDULED_FOR: {scheduled_for} -- async read test",
+        )
+        db.add(order)
+        db.commit()
+        order_id = order.id
+    finally:
+        db.close()
+
+    response = client.get("/api/food-orders", headers=auth_headers, params={"limit": 5})
+    assert response.status_code == 200, response.text
+    assert next(o for o in response.json() if o["id"] == order_id)["status"] == "pending"
@@ -0,0 +1,153 @@
+import uuid
+from dataclasses import replace
+
+import pytest
+
+from app.database import SessionLocal
+from app.models.user import Role, User
+from app.utils import auth
+
+PASSWORD = "auth-test-password"
+CHECK_URL = "/api/auth/admin-only"
+
+
+@pytest.fixture
+def test_user(client):
+    """A user of its own role, so revoking it or editing the role leaves auth_headers alone"""
+    db = SessionLocal()
+    try:
+        role = Role(name=f"auth-test-{uuid.uuid4().hex[:8]}", permissions="[]")
+        db.add(role)
+        db.flush()
+        user = User(name=f"Auth Test {role.id}", email=f"auth-test-{role.id}@bench.local", role=role,
+                    hashed_password=auth.get_password_hash(PASSWORD), is_active=True)
+        db.add(user)
+        db.commit()
+        return user.id, role.id, user.email
+    finally:
+        db.close()
+
+
+def _login(client, email):
+    response = client.post("/api/auth/login", json={"email": email, "password": PASSWORD})
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def _update(model, obj_id, **values):
+    db = SessionLocal()
+    try:
+        obj = db.get(model, obj_id)
+        for key, value in values.items():
+            setattr(obj, key, value)
+        db.commit()
+    finally:
+        db.close()
+
+
+def test_logout_revokes_tokens_issued_before_it(client, test_user):
+    user_id, _, email = test_user
+    headers = _login(client, email)
+    assert client.get(CHECK_URL, headers=headers).status_code == 403  # authenticated, not an admin
+    assert auth.principal_cache.get(user_id) is not None
+
+    assert client.post("/api/auth/logout", headers=headers).status_code == 200
+    assert client.get(CHECK_URL, headers=headers).status_code == 401
+
+    fresh = _login(client, email)
+    assert client.get(CHECK_URL, headers=fresh).status_code == 403
+
+
+def test_revoke_rejects_the_users_cached_token(client, test_user):
+    user_id, _, email = test_user
+    headers = _login(client, email)
+    assert client.get(CHECK_URL, headers=headers).status_code == 403
+
+    db = SessionLocal()
+    try:
+        assert auth.revoke_tokens(db, user_id) == 1
+        assert auth.revoke_tokens(db, 999999) is None
+    finally:
+        db.close()
+    assert auth.principal_cache.get(user_id) is None
+    assert client.get(CHECK_URL, headers=headers).status_code == 401
+
+
+def test_user_and_role_changes_drop_cache_entries(client, auth_headers, test_user):
+    user_id, role_id, email = test_user
+    headers = _login(client, email)
+    client.get(CHECK_URL, headers=headers)
+    assert auth.principal_cache.get(user_id) is not None
+
+    # Deactivating the user drops only that user's entry
+    client.get(CHECK_URL, headers=auth_headers)
+    admin_id = auth.decode_token(auth_headers["Authorization"][7:])["user_id"]
+    _update(User, user_id, is_active=False)
+    assert auth.principal_cache.get(user_id) is None
+    assert auth.principal_cache.get(admin_id) is not None
+
+    # The reload sees the change
+    client.get(CHECK_URL, headers=headers)
+    assert auth.principal_cache.get(user_id).is_active is False
+
+    # Any role change drops every entry
+    _update(Role, role_id, permissions='["/reports"]')
+    assert auth.principal_cache.get(user_id) is None
+    assert auth.principal_cache.get(admin_id) is None
+    client.get(CHECK_URL, headers=headers)
+    assert auth.principal_cache.get(user_id).role.permissions_list == ["/reports"]
+
+
+def test_load_racing_an_invalidation_is_not_stored():
+    cache = auth.PrincipalCache(ttl=60)
+    principal = auth.Principal(id=1, name="a", email=None, phone=None, is_active=True, role_id=1,
+                               token_version=0, role=auth.PrincipalRole(id=1, name="r"))
+
+    generation = cache.generation()
+    # Loaded from the database, then invalidated (e.g. revoke_tokens) before the put
+    cache.invalidate(principal.id)
+    cache.put(principal, generation)
+    assert cache.get(principal.id) is None
+
+    cache.put(principal, cache.generation())
+    assert cache.get(principal.id) == principal
+
+    # Invalidating another user still rejects loads that started before it
+    generation = cache.generation()
+    cache.invalidate(2)
+    cache.put(replace(principal, token_version=1), generation)
+    assert cache.get(principal.id).token_version == 0
+
+
+def test_token_newer_than_the_cached_version_reloads(client, test_user):
+    user_id, _, email = test_user
+    headers = _login(client, email)
+    client.get(CHECK_URL, headers=headers)
+
+    db = SessionLocal()
+    try:
+        # Bumped behind the cache's back (no event, no invalidate), then a token of the new version
+        db.query(User).filter(User.id == user_id).update({"token_version": User.token_version + 1},
+                                                          synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+    assert auth.principal_cache.get(user_id).token_version == 0
+    newer = auth.create_access_token({"user_id": user_id, auth.TOKEN_VERSION_CLAIM: 1})
+    assert client.get(CHECK_URL, headers={"Authorization": f"Bearer {newer}"}).status_code == 403
+    assert auth.principal_cache.get(user_id).token_version == 1
+    # The old token is now refused from the cache
+    assert client.get(CHECK_URL, headers=headers).status_code == 401
+
+
+def test_stream_token_is_refused_as_a_bearer_token(client, auth_headers):
+    response = client.post("/api/events/stream-token", headers=auth_headers)
+    assert response.status_code == 200, response.text
+    stream_token = response.json()["token"]
+
+    assert client.get(CHECK_URL, headers={"Authorization": f"Bearer {stream_token}"}).status_code == 401
+    db = SessionLocal()
+    try:
+        assert auth.authenticate_token(stream_token, db, scope="events").role.name == "Admin"
+    finally:
+        db.close()
@@ -0,0 +1,36 @@
+import pandas as pd
+import pytest
+
+from app.utils.gstr2b_reconciliation import normalize_invoice_numbers
+
+
+def _norm(value):
+    return normalize_invoice_numbers(pd.Series([value])).iloc[0]
+
+
+@pytest.mark.parametrize("left, right", [
+    ("GST/24-25/0012", "GST/24-25/12"),
+    ("2024-25/001", "2024-25/1"),
+    ("INV-001", "inv/1"),
+    ("INV0012", "INV 12"),
+    (" inv.007 ", "INV#7"),
+])
+def test_padding_zeros_stripped_per_segment(left, right):
+    assert _norm(left) == _norm(right)
+
+
+@pytest.mark.parametrize("left, right", [
+    ("A/1/05", "A/10/5"),
+    ("INV/100", "INV/1"),
+    ("2024-25/10", "2024-25/1"),
+])
+def test_zeros_inside_a_segment_are_kept(left, right):
+    assert _norm(left) != _norm(right)
+
+
+def test_blank_and_null_values_become_empty():
+    assert normalize_invoice_numbers(pd.Series([None, "", "nan", " NULL "])).tolist() == ["", "", "", ""]
+
+
+def test_lone_zero_is_kept():
+    assert _norm("INV/0") == "INV0"
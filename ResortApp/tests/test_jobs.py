@@ -0,0 +1,41 @@
+from datetime import datetime
+
+from app.database import SessionLocal
+from app.models.job import BackgroundJob, RUNNING, SUCCEEDED
+
+RECONCILE_URL = "/api/inventory/reconcile-stock"
+
+
+def test_job_status_is_never_cached(client, auth_headers):
+    response = client.post(RECONCILE_URL, headers=auth_headers)
+    assert response.status_code == 200, response.text
+
+    jobs = client.get("/api/jobs", headers=auth_headers)
+    assert jobs.headers["Cache-Control"] == "no-store"
+    job = jobs.json()[0]
+    assert job["job_type"] == "inventory.reconcile_stock"
+    assert job["status"] == SUCCEEDED
+
+    status = client.get(f"/api/jobs/{job['id']}", headers=auth_headers)
+    assert status.headers["Cache-Control"] == "no-store"
+    assert status.json()["result"] == response.json()
+
+
+def test_inline_run_waits_for_the_active_job_of_its_type(client, auth_headers):
+    db = SessionLocal()
+    try:
+        active = BackgroundJob(job_type="inventory.reconcile_stock", status=RUNNING, params="{}",
+                               started_at=datetime.utcnow(), heartbeat_at=datetime.utcnow(), worker="elsewhere")
+        db.add(active)
+        db.commit()
+
+        response = client.post(RECONCILE_URL, headers=auth_headers, params={"fix_discrepancies": True})
+        assert response.status_code == 409, response.text
+        assert response.json()["detail"]["job"]["id"] == active.id
+
+        active.status = SUCCEEDED
+        active.finished_at = datetime.utcnow()
+        db.commit()
+        assert client.post(RECONCILE_URL, headers=auth_headers).status_code == 200
+    finally:
+        db.close()
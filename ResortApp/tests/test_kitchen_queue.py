@@ -0,0 +1,45 @@
+from app.database import SessionLocal
+from app.models.foodorder import FoodOrder
+from app.models.room import Room
+
+QUEUE_URL = "/api/food-orders/kitchen-queue"
+
+
+def _add_order(status="pending"):
+    db = SessionLocal()
+    try:
+        order = FoodOrder(room_id=db.query(Room.id).order_by(Room.id).first()[0], amount=50, status=status)
+        db.add(order)
+        db.commit()
+        return order.id
+    finally:
+        db.close()
+
+
+def test_queue_is_read_from_the_database_with_an_order_id_cursor(client, auth_headers):
+    first = _add_order()
+    response = client.get(QUEUE_URL, headers=auth_headers)
+    assert response.status_code == 200, response.text
+    assert response.headers["Cache-Control"] == "no-store"
+    queue = response.json()
+    assert queue["cursor"] >= first
+    assert first in queue["open_ids"]
+    assert first in [t["order_id"] for t in queue["tickets"]]
+
+    # Written outside this worker's event bus: still visible, and only the new one past the cursor
+    second = _add_order()
+    _add_order(status="completed")
+    page = client.get(QUEUE_URL, headers=auth_headers, params={"after": queue["cursor"]}).json()
+    assert [t["order_id"] for t in page["tickets"]] == [second]
+    assert page["cursor"] == second
+    assert page["open"] == queue["open"] + 1
+
+    db = SessionLocal()
+    try:
+        db.get(FoodOrder, first).status = "completed"
+        db.commit()
+    finally:
+        db.close()
+    page = client.get(QUEUE_URL, headers=auth_headers, params={"after": page["cursor"]}).json()
+    assert page["tickets"] == []
+    assert first not in page["open_ids"]
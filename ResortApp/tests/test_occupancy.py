@@ -0,0 +1,52 @@
+from sqlalchemy import select
+
+from app.database import SessionLocal, engine
+from app.models.booking import Booking
+from app.models.settings import SystemSetting
+from app.utils import occupancy
+from app.utils.bulk_writes import bulk_written
+
+
+def _version():
+    with engine.connect() as conn:
+        return conn.execute(select(SystemSetting.value).where(SystemSetting.key == occupancy.VERSION_SETTING)).scalar()
+
+
+def test_version_moves_after_commit_not_inside_the_booking_transaction(client):
+    db = SessionLocal()
+    try:
+        occupancy.room_occupancy(db, room_id=1)  # creates the version row
+        before = _version()
+
+        booking = db.query(Booking).order_by(Booking.id).first()
+        original_status = booking.status
+        booking.guest_name = booking.guest_name + " "
+        db.commit()
+        # Untracked column: nothing to bump
+        assert _version() == before
+
+        booking.status = "cancelled"
+        db.flush()
+        # The setting row is not written (or locked) by the booking transaction
+        assert _version() == before
+        db.commit()
+        assert _version() != before
+
+        booking.guest_name = booking.guest_name.rstrip()
+        booking.status = original_status
+        db.commit()
+    finally:
+        db.close()
+
+
+def test_bulk_writes_bump_the_version(client):
+    db = SessionLocal()
+    try:
+        occupancy.room_occupancy(db, room_id=1)
+        before = _version()
+        db.query(Booking).filter(Booking.id == -1).update({"status": "cancelled"}, synchronize_session=False)
+        bulk_written(db, Booking)
+        db.commit()
+        assert _version() != before
+    finally:
+        db.close()
@@ -0,0 +1,94 @@
+import sqlite3
+import uuid
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import database
+from app.database import READ_REPLICA_INFO_KEY, SessionLocal, engine
+from app.models.room import Room
+from app.utils import read_replica
+from app.utils.auth import SESSION_USER_KEY, decode_token
+
+REPORT_URL = "/api/reports/front-office/occupancy"
+
+
+@pytest.fixture
+def replica(client, tmp_path, monkeypatch):
+    """A second SQLite file copied from the primary as the replica; returns a dict setting its reported lag"""
+    path = str(tmp_path / "replica.db")
+    source, target = sqlite3.connect(engine.url.database), sqlite3.connect(path)
+    try:
+        source.backup(target)
+    finally:
+        source.close()
+        target.close()
+    read_engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    monkeypatch.setattr(database, "_read_engine", read_engine)
+    monkeypatch.setattr(database, "_ReadSessionLocal", sessionmaker(
+        bind=read_engine, autocommit=False, autoflush=False, info={READ_REPLICA_INFO_KEY: True}
+    ))
+    # Fresh routing state: no recent writes from earlier tests, lag measured on every request
+    monkeypatch.setattr(read_replica, "recent_writes", read_replica.RecentWrites(
+        read_replica.READ_REPLICA_STICKY_SECONDS, str(tmp_path / "recent_writes")
+    ))
+    monkeypatch.setattr(read_replica, "replica_health", read_replica.ReplicaHealth(read_replica.READ_REPLICA_MAX_LAG, 0))
+    lag = {"seconds": 0.0}
+    monkeypatch.setattr(read_replica, "measure_replica_lag", lambda conn: lag["seconds"])
+    yield lag
+    read_engine.dispose()
+
+
+def _add_room(user_id=None):
+    """Commit a room on the primary only; with user_id, as that user's request session would"""
+    db = SessionLocal()
+    try:
+        if user_id is not None:
+            db.info[SESSION_USER_KEY] = user_id
+        db.add(Room(number=f"R-{uuid.uuid4().hex[:8]}", type="Test", price=1000))
+        db.commit()
+        return db.query(Room).count()
+    finally:
+        db.close()
+
+
+def _report_rooms(client, auth_headers):
+    response = client.get(REPORT_URL, headers=auth_headers)
+    assert response.status_code == 200, response.text
+    return response.json()["total_rooms"]
+
+
+@pytest.fixture
+def cleanup_rooms(client):
+    yield
+    db = SessionLocal()
+    try:
+        db.query(Room).filter(Room.type == "Test").delete(synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+
+
+def test_reports_read_the_replica(client, auth_headers, replica, cleanup_rooms):
+    copied = _report_rooms(client, auth_headers)
+    # Written by no user (e.g. another service): not on the replica yet, and the report does not see it
+    assert _add_room() == copied + 1
+    assert _report_rooms(client, auth_headers) == copied
+
+
+def test_user_who_just_wrote_reads_the_primary(client, auth_headers, replica, cleanup_rooms):
+    copied = _report_rooms(client, auth_headers)
+    admin_id = decode_token(auth_headers["Authorization"][7:])["user_id"]
+    primary = _add_room(user_id=admin_id)
+    assert _report_rooms(client, auth_headers) == primary != copied
+
+
+def test_lagging_replica_sends_reports_to_the_primary(client, auth_headers, replica, cleanup_rooms):
+    copied = _report_rooms(client, auth_headers)
+    primary = _add_room()
+
+    replica["seconds"] = read_replica.READ_REPLICA_MAX_LAG + 1
+    assert _report_rooms(client, auth_headers) == primary
+    replica["seconds"] = read_replica.READ_REPLICA_MAX_LAG
+    assert _report_rooms(client, auth_headers) == copied
@@ -0,0 +1,90 @@
+from datetime import date
+
+from fastapi import Response
+from sqlalchemy import update
+
+from app.database import SessionLocal, engine
+from app.models.settings import SystemSetting
+from app.utils import report_cache
+
+
+def _report(name, during=None):
+    calls = []
+
+    @report_cache.cached_report(name)
+    def report(db=None, start_date=None, end_date=None):
+        calls.append(1)
+        if during:
+            during()
+        return {"total": len(calls)}
+
+    return report, calls
+
+
+def _run(report):
+    db = SessionLocal()
+    try:
+        return report(db=db, start_date=date(2021, 3, 1), end_date=date(2021, 3, 31))
+    finally:
+        db.close()
+
+
+def test_result_is_kept_until_its_period_is_written(client):
+    report, calls = _report("test_kept")
+    assert _run(report) == {"total": 1}
+    hit = _run(report)
+    assert isinstance(hit, Response) and hit.headers["X-Report-Cache"] == "hit"
+    assert len(calls) == 1
+
+    report_cache.invalidate_report_cache([date(2021, 3, 15)])
+    assert _run(report) == {"total": 2}
+
+
+def test_result_computed_across_another_workers_invalidation_is_dropped(client):
+    report_cache.invalidate_report_cache([date(2021, 3, 15)])  # the stamp row exists from here on
+
+    def other_worker_invalidates():
+        # Another process: only the stamp in system_settings changes, nothing in this one
+        with engine.begin() as conn:
+            conn.execute(
+                update(SystemSetting)
+                .where(SystemSetting.key == report_cache.INVALIDATION_STAMP_SETTING)
+                .values(value="other-worker")
+            )
+
+    report, calls = _report("test_dropped", during=other_worker_invalidates)
+    assert _run(report) == {"total": 1}
+    assert _run(report) == {"total": 2}
+    assert len(calls) == 2
+
+
+def test_package_booking_and_bulk_writes_invalidate(client):
+    from app.models.foodorder import FoodOrder
+    from app.models.Package import PackageBooking
+    from app.utils.bulk_writes import bulk_written
+
+    report, calls = _report("test_sources")
+    _run(report)
+    _run(report)
+    assert len(calls) == 1
+
+    db = SessionLocal()
+    try:
+        booking = db.query(PackageBooking).order_by(PackageBooking.id).first()
+        booking.check_in, booking.check_out = date(2021, 3, 10), date(2021, 3, 12)
+        db.commit()
+    finally:
+        db.close()
+    _run(report)
+    _run(report)
+    assert len(calls) == 2
+
+    db = SessionLocal()
+    try:
+        db.query(FoodOrder).filter(FoodOrder.id == -1).update({"billing_status": "billed"}, synchronize_session=False)
+        bulk_written(db, FoodOrder)
+        db.commit()
+    finally:
+        db.close()
+    _run(report)
+    assert len(calls) == 3
@@ -0,0 +1,59 @@
+import io
+import json
+import zipfile
+
+from app.curd.comprehensive_report import REPORT_SECTIONS
+from app.utils import bulk_writes, change_log, events, occupancy, read_replica, report_cache
+from app.utils.report_export import ERRORS_FILE
+
+EXPORT_URL = "/api/accounts/comprehensive-report/export"
+# Sections the data generator fills; the others (services, expenses, HR) stay empty
+SEEDED_SECTIONS = (
+    "checkouts", "bookings", "package_bookings", "food_orders",
+    "purchases", "inventory_transactions", "journal_entries",
+)
+
+
+def test_every_session_listener_is_installed(client):
+    # The export has to work alongside all of them, not just with a bare Session
+    assert events._listeners_installed
+    assert change_log._listeners_installed
+    assert occupancy._listeners_installed
+    assert report_cache._listeners_installed
+    assert read_replica._listeners_installed
+    assert len(bulk_writes.bulk_write_observers) == 5
+
+
+def test_ndjson_export_streams_every_section(client, auth_headers):
+    response = client.get(EXPORT_URL, headers=auth_headers)
+    assert response.status_code == 200, response.text
+
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    ends = {line["section"]: line for line in lines if line.get("type") == "section_end"}
+    assert set(ends) == {section.name for section in REPORT_SECTIONS}
+    assert {name: end["error"] for name, end in ends.items() if end["error"]} == {}
+
+    rows = {}
+    for line in lines:
+        if "section" in line and "data" in line:
+            rows[line["section"]] = rows.get(line["section"], 0) + 1
+    for name in SEEDED_SECTIONS:
+        assert rows.get(name, 0) > 0, name
+        assert ends[name]["count"] == rows[name]
+
+    package_booking = next(line["data"] for line in lines if line.get("section") == "package_bookings")
+    assert package_booking["total_amount"] > 0
+    purchase = next(line["data"] for line in lines if line.get("section") == "purchases" and line["data"]["details"])
+    assert purchase["details"][0]["total"] > 0
+
+
+def test_csv_export_writes_every_section(client, auth_headers):
+    response = client.get(EXPORT_URL, headers=auth_headers, params={"format": "csv"})
+    assert response.status_code == 200, response.text
+
+    archive = zipfile.ZipFile(io.BytesIO(response.content))
+    names = archive.namelist()
+    assert ERRORS_FILE not in names, archive.read(ERRORS_FILE).decode() if ERRORS_FILE in names else ""
+    assert names == [f"{section.name}.csv" for section in REPORT_SECTIONS]
+    for name in SEEDED_SECTIONS:
+        assert len(archive.read(f"{name}.csv").splitlines()) > 1, name
@@ -0,0 +1,39 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from app.utils.change_log import SYNC_GAP_SECONDS, _committed_prefix
+
+
+def _entry(id, txid_horizon=None, age=0):
+    return SimpleNamespace(id=id, txid_horizon=txid_horizon, changed_at=datetime.utcnow() - timedelta(seconds=age))
+
+
+def test_sqlite_gaps_are_closed():
+    # One writer at a time: an entry visible after a gap means the gap's transaction ended
+    entries = [_entry(11), _entry(13), _entry(20)]
+    assert _committed_prefix(entries, 10, None) == entries
+
+
+def test_postgres_gap_waits_for_transactions_below_the_horizon():
+    entries = [_entry(11, 500), _entry(13, 510), _entry(14, 511)]
+    # A transaction below 510 may still hold id 12, however old entry 13 is
+    assert _committed_prefix(entries, 10, xmin=505) == entries[:1]
+    assert _committed_prefix(entries, 10, xmin=510) == entries
+
+
+def test_postgres_gap_before_legacy_entry_uses_its_age():
+    entries = [_entry(11), _entry(13)]
+    assert _committed_prefix(entries, 10, xmin=900) == entries[:1]
+    entries = [_entry(11), _entry(13, age=SYNC_GAP_SECONDS + 5)]
+    assert _committed_prefix(entries, 10, xmin=900) == entries
+
+
+def test_sync_is_never_cached(client, auth_headers):
+    first = client.get("/api/sync", headers=auth_headers)
+    assert first.status_code == 200, first.text
+    assert first.headers["Cache-Control"] == "no-store"
+
+    page = client.get("/api/sync", headers=auth_headers, params={"since": first.json()["cursor"]})
+    assert page.status_code == 200, page.text
+    assert page.headers["Cache-Control"] == "no-store"
+    assert page.json()["reset"] == []
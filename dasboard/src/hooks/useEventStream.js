@@ -0,0 +1,105 @@
+/**
+ * Domain Event Stream Hook
+ * Subscribes to server-sent change events (GET /events/stream) so screens
+ * refresh when data changes instead of polling on a timer
+ */
+
+import { useEffect, useRef } from 'react';
+import API from '../services/api';
+import { getApiBaseUrl } from '../utils/env';
+
+// Delay before reconnecting with a fresh stream token once the server refused the old one
+const RECONNECT_DELAY_MS = 5000;
+
+/**
+ * Hook to receive domain events for the given topics
+ * onEvent(event) is called with {topic, entity, op, id, data, ts}; on "resync"
+ * (the client fell behind) it is called with {topic: 'resync'} and the screen
+ * should refetch everything it shows. Reconnects by itself, with a fresh
+ * stream token once the old one has expired; events missed while disconnected
+ * are reported as a resync once the stream is back.
+ */
+export const useEventStream = (topics, onEvent, enabled = true) => {
+    const handlerRef = useRef(onEvent);
+    handlerRef.current = onEvent;
+    const topicKey = (topics || []).join(',');
+
+    useEffect(() => {
+        if (!enabled || !localStorage.getItem('token') || typeof EventSource === 'undefined') {
+            return undefined;
+        }
+
+        const names = topicKey ? topicKey.split(',') : [];
+        let source = null;
+        let retryTimer = null;
+        let stopped = false;
+        let connectedBefore = false;
+
+        const handle = (e) => {
+            try {
+                handlerRef.current(JSON.parse(e.data));
+            } catch (err) {
+                console.warn('Ignoring malformed event', err);
+            }
+        };
+        const handleResync = () => handlerRef.current({ topic: 'resync' });
+        // The server sends "ready" on every (re)connection, including the ones
+        // EventSource makes by itself: any but the first may have missed events
+        const handleReady = () => {
+            if (connectedBefore) {
+                handleResync();
+            }
+            connectedBefore = true;
+        };
+
+        const scheduleConnect = () => {
+            if (!stopped) {
+                retryTimer = setTimeout(connect, RECONNECT_DELAY_MS);
+            }
+        };
+
+        // The query string shows up in access logs, so the stream is opened with a
+        // short-lived, stream-only token rather than the login token
+        async function connect() {
+            let token;
+            try {
+                ({ data: { token } } = await API.post('/events/stream-token'));
+            } catch (err) {
+                scheduleConnect();
+                return;
+            }
+            if (stopped) {
+                return;
+            }
+            const params = new URLSearchParams({ token });
+            if (topicKey) {
+                params.set('topics', topicKey);
+            }
+            source = new EventSource(`${getApiBaseUrl()}/events/stream?${params.toString()}`);
+            names.forEach((name) => source.addEventListener(name, handle));
+            source.addEventListener('resync', handleResync);
+            source.addEventListener('ready', handleReady);
+            // EventSource retries dropped connections itself, but gives up once the
+            // (by then expired) token is refused: start over with a new token
+            source.onerror = () => {
+                if (source.readyState === EventSource.CLOSED) {
+                    source.close();
+                    scheduleConnect();
+                }
+            };
+        }
+
+        connect();
+
+        return () => {
+            stopped = true;
+            clearTimeout(retryTimer);
+            if (source) {
+                names.forEach((name) => source.removeEventListener(name, handle));
+                source.removeEventListener('resync', handleResync);
+                source.removeEventListener('ready', handleReady);
+                source.close();
+            }
+        };
+    }, [topicKey, enabled]);
+};
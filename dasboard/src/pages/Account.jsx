@@ -1422,13 +1422,25 @@ export default function ReportsDashboard() {
                       onClick={async () => {
                         if (!window.confirm('Fix missing journal entries for all recent checkouts (last 7 days)?')) return;
                         try {
-                          const response = await API.post('/accounts/fix-missing-journal-entries?days=7');
-                          alert(`✅ ${response.data.message}\nFixed: ${response.data.fixed}, Failed: ${response.data.failed}`);
-                          if (response.data.fixed > 0) {
+                          // Runs as a background job; poll it instead of holding the request open
+                          const started = await API.post('/accounts/fix-missing-journal-entries?days=7&background=true');
+                          let job = started.data;
+                          while (job.status === 'queued' || job.status === 'running') {
+                            await new Promise((resolve) => setTimeout(resolve, 1500));
+                            job = (await API.get(`/jobs/${job.id}`)).data;
+                          }
+                          if (job.status !== 'succeeded') {
+                            alert(`Failed to fix journal entries: ${job.error || job.status}`);
+                            return;
+                          }
+                          const result = job.result;
+                          alert(`✅ ${result.message}\nFixed: ${result.fixed}, Failed: ${result.failed ?? 0}`);
+                          if (result.fixed > 0) {
                             fetchJournalEntries(); // Refresh the list
                           }
                         } catch (error) {
-                          alert('Failed to fix journal entries: ' + (error.response?.data?.detail || error.message));
+                          const detail = error.response?.data?.detail;
+                          alert('Failed to fix journal entries: ' + (detail?.message || detail || error.message));
                         }
                       }}
                       className="px-4 py-2 bg-yellow-600 text-white rounded hover:bg-yellow-700"
@@ -3112,6 +3124,39 @@ export default function ReportsDashboard() {
                                 </div>
                               )}
 
+                              {/* Amount Mismatches (Yellow) */}
+                              {gstr2bReconcileData.amount_mismatch && gstr2bReconcileData.amount_mismatch.length > 0 && (
+                                <div>
+                                  <h4 className="font-bold text-yellow-700 mb-2">
+                                    ⚠️ Amount Mismatch between GSTR-2B and Your System ({gstr2bReconcileData.amount_mismatch_count})
+                                  </h4>
+                                  <div className="bg-yellow-50 border border-yellow-300 rounded p-4 max-h-60 overflow-y-auto">
+                                    <table className="min-w-full text-xs">
+                                      <thead>
+                                        <tr className="bg-yellow-100">
+                                          <th className="p-2 text-left border">Invoice Number</th>
+                                          <th className="p-2 text-left border">Vendor</th>
+                                          <th className="p-2 text-right border">Amount (System)</th>
+                                          <th className="p-2 text-right border">Amount (GSTR-2B)</th>
+                                          <th className="p-2 text-right border">Difference</th>
+                                        </tr>
+                                      </thead>
+                                      <tbody>
+                                        {gstr2bReconcileData.amount_mismatch.map((item, idx) => (
+                                          <tr key={idx} className="bg-white">
+                                            <td className="p-2 border font-mono">{item.invoice_number}</td>
+                                            <td className="p-2 border">{item.vendor_name || "-"}</td>
+                                            <td className="p-2 border text-right">₹{item.total_amount?.toFixed(2)}</td>
+                                            <td className="p-2 border text-right">₹{item.gstr2b_amount?.toFixed(2)}</td>
+                                            <td className="p-2 border text-right text-yellow-700">₹{item.difference?.toFixed(2)}</td>
+                                          </tr>
+                                        ))}
+                                      </tbody>
+                                    </table>
+                                  </div>
+                                </div>
+                              )}
+
                               {/* Matched Invoices (Green) */}
                               {gstr2bReconcileData.matched && gstr2bReconcileData.matched.length > 0 && (
                                 <div>
@@ -1,7 +1,8 @@
-import React, { useEffect, useMemo, useState, useCallback, memo } from "react";
+import React, { useEffect, useMemo, useState, useCallback, useRef, memo } from "react";
 import { formatCurrency } from '../utils/currency';
 import API from "../services/api";
 import DashboardLayout from "../layout/DashboardLayout";
+import { useEventStream } from "../hooks/useEventStream";
 import {
   PieChart, Pie, Cell, Tooltip, Legend,
   LineChart, Line, XAxis, YAxis, CartesianGrid, ResponsiveContainer,
@@ -11,6 +12,9 @@ import {
 // Import the new bubble animation CSS
 import "../styles/bubble-animation.css"; 
 
+// Change events that affect the dashboard figures
+const LIVE_TOPICS = ["bookings", "package_bookings", "checkouts", "food_orders", "service_requests", "assigned_services", "rooms", "inventory"];
+
 const COLORS = ["#6366F1", "#22C55E", "#F59E0B", "#EF4444", "#06B6D4", "#A78BFA", "#F43F5E", "#10B981", "#60A5FA", "#FBBF24"];
 
 const Dashboard = () => {
@@ -196,7 +200,7 @@ const Dashboard = () => {
     // Initial fetch with loading indicator
     fetchDashboardData(true);
     
-    // Set up auto-refresh every 5 minutes (300,000 milliseconds)
+    // Fallback auto-refresh every 5 minutes (300,000 milliseconds) in case the event stream drops
     const refreshInterval = setInterval(() => {
       if (mounted) {
         // Refresh without showing loading indicator for smoother UX
@@ -210,6 +214,15 @@ const Dashboard = () => {
     };
   }, [fetchDashboardData]);
 
+  // ---------- Live Refresh on Change Events ----------
+  // Bursts of events (e.g. a checkout touching rooms, bills and stock) collapse into one refetch
+  const liveRefreshRef = useRef(null);
+  useEventStream(LIVE_TOPICS, () => {
+    clearTimeout(liveRefreshRef.current);
+    liveRefreshRef.current = setTimeout(() => fetchDashboardData(false), 2000);
+  });
+  useEffect(() => () => clearTimeout(liveRefreshRef.current), []);
+
   // ... (rest of the useMemo and helper functions)
   const safeDate = useCallback((d) => (d ? new Date(d) : null), []);
   const fmtCurrency = useCallback((n, decimals = 0) => formatCurrency(Number(n || 0), true, decimals), []);